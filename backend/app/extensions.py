@@ -10,6 +10,8 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 import functools
 
+from app.utils.auth_context import get_request_user_doc, verify_id_token_cached
+
 # Global Firestore client
 db = None
 limiter = None
@@ -135,6 +137,9 @@ def require_firebase_auth(fn):
     Extracts and verifies the Firebase ID token from the Authorization header.
     Allows OPTIONS requests (CORS preflight) to pass through without authentication.
     Includes retry logic for transient network errors.
+    Verified tokens are cached until shortly before their exp (see
+    app/utils/auth_context.py), so repeat calls with one token skip the
+    signature check.
     """
     @functools.wraps(fn)
     def wrapper(*args, **kwargs):
@@ -173,7 +178,7 @@ def require_firebase_auth(fn):
             
             for attempt in range(max_retries):
                 try:
-                    decoded = fb_auth.verify_id_token(id_token, clock_skew_seconds=5)
+                    decoded = verify_id_token_cached(id_token, fb_auth.verify_id_token)
                     request.firebase_user = decoded
                     print("[Auth] Token verified")
                     # Lifecycle signal: fire-and-forget lastActiveAt stamp.
@@ -307,8 +312,9 @@ def require_tier(allowed_tiers):
                 return jsonify({'error': 'Database not available'}), 500
             
             try:
-                user_ref = db.collection('users').document(user_id)
-                user_doc = user_ref.get()
+                # Request-scoped: the handler's own read of users/{uid}
+                # through get_request_user_doc reuses this snapshot.
+                user_doc = get_request_user_doc(user_id, db)
                 
                 if not user_doc.exists:
                     # New user defaults to free tier
@@ -0,0 +1,529 @@
+"""
+In-process accounting for MCP call limits and the daily PDL budget.
+
+MCPRateLimit used to cost two peek reads plus one Firestore transaction per
+window on every tool call, and MCPBudget.spend another transaction per cold
+query. This module lets each process admit and charge calls against local
+state and only talk to Firestore to move capacity in bulk:
+
+  - Slot leases. A window doc (mcp_rate_limits/{identity}_{tool}_{window})
+    counts slots *reserved* by any process, not calls served. A process with
+    no local slot for a key reserves a chunk in one transaction and admits
+    the next calls out of it without I/O. The doc count never passes the cap
+    from tier_caps, so the cap holds across every worker. The price is that
+    slots parked in one process are unavailable to another until used or
+    released, so chunks shrink as the window fills (a quarter of what is
+    left, at most MCP_RATE_LEASE_SIZE): near the cap every process is back
+    to one slot per transaction and nothing is left stranded.
+  - Credit leases. Same idea for mcp_budget/{day}: a process reserves PDL
+    credits under its own entry in `leases` ({holder: {credits,
+    expires_at}}), can_spend() answers from the lease and spend() charges
+    it locally. Each reservation pushes the holder's expiry out by
+    MCP_BUDGET_LEASE_TTL_SECONDS, and every reservation drops other
+    holders' expired entries, so a worker killed before it could release
+    (SIGKILL, OOM) strands its credits for one TTL, not for the rest of the
+    day. `leased_credits` is kept as the live total for dashboards.
+  - Denials are remembered locally for MCP_RATE_DENY_RECHECK_SECONDS (never
+    past the window end), so a client hammering a paywall costs no reads.
+  - Reconciliation. flush() writes back aggregated increments: spent
+    credits/USD per day, plus the unused part of leases that went idle
+    (MCP_LEASE_IDLE_SECONDS), belong to a past day, or were reserved under a
+    different tier cap. A daemon thread flushes every
+    MCP_ACCOUNTING_FLUSH_SECONDS (0 disables it) and everything is released
+    at interpreter exit.
+
+Windows stay Firestore's fixed windows (expires_at anchored at the first
+reservation), since those are what the tier_caps numbers are defined
+against; the local counters follow the window of the doc they leased from.
+
+Failure handling matches the code this replaced: a Firestore error while
+reserving admits the call (fail-open), and a failed flush keeps its deltas
+for the next one. Clock and store are injectable for tests.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+import uuid
+import weakref
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from firebase_admin import firestore
+
+logger = logging.getLogger(__name__)
+
+
+RATE_LIMIT_COLLECTION = "mcp_rate_limits"
+BUDGET_COLLECTION = "mcp_budget"
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def _day_id(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
+
+
+def _live_leases(data: dict, now: float) -> dict:
+    """The day doc's unexpired credit leases ({holder: {credits, expires_at}})."""
+    return {
+        holder: lease for holder, lease in (data.get("leases") or {}).items()
+        if float((lease or {}).get("expires_at", 0) or 0) > now
+    }
+
+
+def _chunk(room: int, need: int, lease_size: int) -> int:
+    """How much to reserve when `room` is left: at least `need`, otherwise a
+    quarter of the room capped at lease_size."""
+    return max(need, min(lease_size, room // 4))
+
+
+# ---------------------------------------------------------------------------
+# Firestore store
+# ---------------------------------------------------------------------------
+
+
+class FirestoreAccountingStore:
+    """The only code that touches Firestore. Every method is one
+    transaction (same pattern as the per-call transactions it replaces)
+    and takes `now` from the caller so tests control time."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def reserve_slots(
+        self, doc_id: str, cap: int, ttl: int, lease_size: int, now: float, meta: dict,
+    ) -> tuple[int, int, float]:
+        """Reserve a chunk of slots in the window doc.
+
+        Returns (granted, room_left, expires_at); granted == 0 means the
+        window is full."""
+        ref = self.db.collection(RATE_LIMIT_COLLECTION).document(doc_id)
+
+        @firestore.transactional
+        def _txn(transaction):
+            snap = ref.get(transaction=transaction)
+            data = (snap.to_dict() or {}) if snap.exists else {}
+            expires_at = float(data.get("expires_at", 0) or 0)
+            if expires_at > now:
+                count = int(data.get("count", 0))
+                room = cap - count
+                if room <= 0:
+                    return 0, 0, expires_at
+                granted = _chunk(room, 1, lease_size)
+                transaction.update(ref, {"count": count + granted})
+                return granted, room - granted, expires_at
+            expires_at = now + ttl
+            granted = _chunk(cap, 1, lease_size)
+            transaction.set(ref, {"count": granted, "expires_at": expires_at, **meta})
+            return granted, cap - granted, expires_at
+
+        return _txn(self.db.transaction())
+
+    def release_slots(self, doc_id: str, slots: int, expires_at: float, now: float) -> None:
+        """Hand unused slots back, only to the window they were taken from."""
+        ref = self.db.collection(RATE_LIMIT_COLLECTION).document(doc_id)
+
+        @firestore.transactional
+        def _txn(transaction):
+            snap = ref.get(transaction=transaction)
+            if not snap.exists:
+                return
+            data = snap.to_dict() or {}
+            current = float(data.get("expires_at", 0) or 0)
+            if current <= now or abs(current - expires_at) > 1e-6:
+                return
+            transaction.update(ref, {"count": max(int(data.get("count", 0)) - slots, 0)})
+
+        _txn(self.db.transaction())
+
+    def reserve_credits(
+        self, day: str, holder: str, need: int, lease_size: int, cap_usd: float,
+        credit_usd: float, now: float, ttl: float,
+    ) -> int:
+        """Reserve at least `need` credits for `holder` under the day's USD
+        cap, reclaiming expired leases. Returns the credits granted, 0 when
+        `need` does not fit."""
+        ref = self.db.collection(BUDGET_COLLECTION).document(day)
+
+        @firestore.transactional
+        def _txn(transaction):
+            snap = ref.get(transaction=transaction)
+            data = (snap.to_dict() or {}) if snap.exists else {}
+            spent_usd = float(data.get("spent_usd", 0.0))
+            leases = _live_leases(data, now)
+            leased = sum(int(lease.get("credits", 0)) for lease in leases.values())
+            room = int((cap_usd - spent_usd) / credit_usd + 1e-9) - leased if credit_usd > 0 else need
+            if room < need:
+                return 0
+            granted = min(_chunk(room, need, lease_size), room)
+            held = int(leases.get(holder, {}).get("credits", 0))
+            leases[holder] = {"credits": held + granted, "expires_at": now + ttl}
+            if snap.exists:
+                transaction.update(ref, {"leases": leases, "leased_credits": leased + granted})
+            else:
+                transaction.set(ref, {
+                    "credits": 0, "spent_usd": 0.0, "day": day,
+                    "leases": leases, "leased_credits": granted,
+                })
+            return granted
+
+        return _txn(self.db.transaction())
+
+    def settle_credits(
+        self, day: str, holder: str, spent: int, spent_usd: float, release: int, now: float,
+    ) -> None:
+        """Add aggregated spend to the day doc and drop `release` credits
+        from `holder`'s lease (already gone if it expired and was reclaimed)."""
+        ref = self.db.collection(BUDGET_COLLECTION).document(day)
+
+        @firestore.transactional
+        def _txn(transaction):
+            snap = ref.get(transaction=transaction)
+            if snap.exists:
+                d = snap.to_dict() or {}
+                leases = _live_leases(d, now)
+                if holder in leases:
+                    left = int(leases[holder].get("credits", 0)) - release
+                    if left > 0:
+                        leases[holder] = {**leases[holder], "credits": left}
+                    else:
+                        del leases[holder]
+                transaction.update(ref, {
+                    "credits": int(d.get("credits", 0)) + spent,
+                    "spent_usd": float(d.get("spent_usd", 0.0)) + spent_usd,
+                    "leases": leases,
+                    "leased_credits": sum(int(lease.get("credits", 0)) for lease in leases.values()),
+                })
+            else:
+                transaction.set(ref, {
+                    "credits": spent, "spent_usd": spent_usd, "day": day,
+                    "leases": {}, "leased_credits": 0,
+                })
+
+        _txn(self.db.transaction())
+
+
+# ---------------------------------------------------------------------------
+# Local state
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class SlotLease:
+    cap: int
+    expires_at: float
+    slots: int = 0            # reserved in Firestore, not yet used here
+    room: int = 0             # what the doc had left after our reservation
+    denied_until: float = 0.0
+    last_used: float = 0.0
+
+
+@dataclass
+class _Bucket:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    leases: dict = field(default_factory=dict)  # window -> SlotLease
+
+
+@dataclass
+class CreditLease:
+    credits: int = 0          # reserved under our `leases` entry, not yet charged
+    expires_at: float = 0.0   # when other holders may reclaim `credits`
+    spent: int = 0            # charged here, not yet written to the day doc
+    spent_usd: float = 0.0
+    covered: int = 0          # part of `spent` that came out of the lease
+    denied_until: float = 0.0
+    last_used: float = 0.0
+
+
+@dataclass
+class Admission:
+    hit: Optional[str]                        # window that refused, or None
+    retry_after_seconds: int = 0
+    remaining: dict = field(default_factory=dict)  # window -> int | None
+
+
+class MCPAccounting:
+    def __init__(
+        self,
+        store,
+        clock: Callable[[], float] = time.time,
+        lease_size: Optional[int] = None,
+        credit_lease_size: Optional[int] = None,
+        idle_seconds: Optional[float] = None,
+        deny_recheck_seconds: Optional[float] = None,
+        credit_lease_ttl: Optional[float] = None,
+    ):
+        self.store = store
+        self.clock = clock
+        self.lease_size = lease_size or int(_env_number("MCP_RATE_LEASE_SIZE", 10))
+        self.credit_lease_size = credit_lease_size or int(_env_number("MCP_BUDGET_LEASE_CREDITS", 25))
+        self.idle_seconds = (
+            idle_seconds if idle_seconds is not None
+            else _env_number("MCP_LEASE_IDLE_SECONDS", 30)
+        )
+        self.deny_recheck_seconds = (
+            deny_recheck_seconds if deny_recheck_seconds is not None
+            else _env_number("MCP_RATE_DENY_RECHECK_SECONDS", 10)
+        )
+        # Must outlive idle_seconds plus a flush interval, or a live process
+        # could lose credits it is about to hand back anyway.
+        self.credit_lease_ttl = (
+            credit_lease_ttl if credit_lease_ttl is not None
+            else _env_number("MCP_BUDGET_LEASE_TTL_SECONDS", 300)
+        )
+        # Identifies this process's entry in the day doc's `leases` map.
+        self.holder = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._buckets: dict[tuple[str, str], _Bucket] = {}
+        self._releases: dict[tuple[str, float], int] = {}  # (doc_id, expires_at) -> slots
+        self._budget_lock = threading.Lock()
+        self._credits: dict[str, CreditLease] = {}
+
+    # ── Call limits ──────────────────────────────────────────────────────
+
+    def admit(self, identity: str, tool: str, windows: list[tuple[str, int, int]]) -> Admission:
+        """Admit one call against every (window, cap, ttl_seconds) in order,
+        charging all of them only when all pass."""
+        with self._lock:
+            bucket = self._buckets.setdefault((identity, tool), _Bucket())
+        now = self.clock()
+        with bucket.lock:
+            remaining: dict = {}
+            held: list[SlotLease] = []
+            for window, cap, ttl in windows:
+                lease = self._lease_for(bucket, identity, tool, window, cap, ttl, now)
+                if lease is None:
+                    remaining[window] = None  # store unavailable: fail open
+                    continue
+                if lease.slots <= 0:
+                    remaining[window] = 0
+                    for w, _, _ in windows:
+                        other = bucket.leases.get(w)
+                        if w != window and other is not None and w not in remaining:
+                            remaining[w] = other.slots + other.room
+                    return Admission(
+                        hit=window,
+                        retry_after_seconds=max(int(lease.expires_at - now), 1),
+                        remaining=remaining,
+                    )
+                held.append((window, lease))
+            for window, lease in held:
+                lease.slots -= 1
+                lease.last_used = now
+                remaining[window] = lease.slots + lease.room
+            return Admission(hit=None, remaining=remaining)
+
+    def _lease_for(self, bucket, identity, tool, window, cap, ttl, now) -> Optional[SlotLease]:
+        lease = bucket.leases.get(window)
+        doc_id = f"{identity}_{tool}_{window}"
+        if lease is not None and lease.expires_at <= now:
+            del bucket.leases[window]
+            lease = None
+        if lease is not None and lease.cap != cap:
+            # Tier changed mid-window: slots reserved under the old cap go
+            # back and the next reservation is checked against the new one.
+            self._queue_release(doc_id, lease.slots, lease.expires_at)
+            bucket.leases.pop(window)
+            lease = None
+        if lease is not None and (lease.slots > 0 or lease.denied_until > now):
+            return lease
+        try:
+            granted, room, expires_at = self.store.reserve_slots(
+                doc_id, cap, ttl, self.lease_size, now,
+                {"tool": tool, "window": window, "identity": identity},
+            )
+        except Exception as e:
+            logger.warning("[MCP accounting] slot reservation failed for %s/%s: %s",
+                           tool, window, e)
+            return None
+        if lease is None or lease.expires_at != expires_at:
+            lease = SlotLease(cap=cap, expires_at=expires_at)
+            bucket.leases[window] = lease
+        lease.slots += granted
+        lease.room = room
+        lease.last_used = now
+        lease.denied_until = 0.0 if granted else min(expires_at, now + self.deny_recheck_seconds)
+        return lease
+
+    def _queue_release(self, doc_id: str, slots: int, expires_at: float) -> None:
+        if slots > 0:
+            with self._lock:
+                key = (doc_id, expires_at)
+                self._releases[key] = self._releases.get(key, 0) + slots
+
+    # ── Daily budget ─────────────────────────────────────────────────────
+
+    def can_spend(self, credits: int, cap_usd: float, credit_usd: float) -> bool:
+        """True when `credits` are covered by this process's lease for today,
+        reserving more from the day doc if needed."""
+        if credits <= 0:
+            return True
+        now = self.clock()
+        with self._budget_lock:
+            lease = self._credits.setdefault(_day_id(now), CreditLease())
+            if lease.credits and lease.expires_at <= now:
+                # Expired in the day doc: another holder may have reclaimed it.
+                lease.credits = 0
+            if lease.credits >= credits:
+                return True
+            if lease.denied_until > now:
+                return False
+            try:
+                granted = self.store.reserve_credits(
+                    _day_id(now), self.holder, credits - lease.credits,
+                    self.credit_lease_size, cap_usd, credit_usd, now, self.credit_lease_ttl,
+                )
+            except Exception as e:
+                logger.warning("[MCP accounting] budget reservation failed: %s", e)
+                return credits * credit_usd <= cap_usd
+            if not granted:
+                lease.denied_until = now + self.deny_recheck_seconds
+                return False
+            lease.credits += granted
+            lease.expires_at = now + self.credit_lease_ttl
+            lease.last_used = now
+            return True
+
+    def spend(self, credits: int, credit_usd: float) -> None:
+        """Charge credits locally; flush() writes them to the day doc."""
+        if credits <= 0:
+            return
+        now = self.clock()
+        with self._budget_lock:
+            lease = self._credits.setdefault(_day_id(now), CreditLease())
+            if lease.credits and lease.expires_at <= now:
+                lease.credits = 0
+            covered = min(lease.credits, credits)
+            lease.credits -= covered
+            lease.covered += covered
+            lease.spent += credits
+            lease.spent_usd += credits * credit_usd
+            lease.last_used = now
+
+    # ── Reconciliation ───────────────────────────────────────────────────
+
+    def flush(self, force: bool = False) -> None:
+        """Write aggregated spend and hand back idle leases. `force` releases
+        every unused slot and credit (shutdown)."""
+        now = self.clock()
+        self._flush_slots(now, force)
+        self._flush_credits(now, force)
+
+    def _flush_slots(self, now: float, force: bool) -> None:
+        with self._lock:
+            buckets = list(self._buckets.items())
+        for key, bucket in buckets:
+            with bucket.lock:
+                for window, lease in list(bucket.leases.items()):
+                    if lease.expires_at <= now:
+                        del bucket.leases[window]
+                    elif force or now - lease.last_used >= self.idle_seconds:
+                        self._queue_release(f"{key[0]}_{key[1]}_{window}", lease.slots, lease.expires_at)
+                        del bucket.leases[window]
+                if not bucket.leases:
+                    with self._lock:
+                        if self._buckets.get(key) is bucket:
+                            del self._buckets[key]
+        with self._lock:
+            releases, self._releases = self._releases, {}
+        for (doc_id, expires_at), slots in releases.items():
+            try:
+                self.store.release_slots(doc_id, slots, expires_at, now)
+            except Exception as e:
+                logger.warning("[MCP accounting] slot release failed for %s: %s", doc_id, e)
+                self._queue_release(doc_id, slots, expires_at)
+
+    def _flush_credits(self, now: float, force: bool) -> None:
+        today = _day_id(now)
+        with self._budget_lock:
+            pending = []
+            for day, lease in list(self._credits.items()):
+                unused = 0
+                if force or day != today or now - lease.last_used >= self.idle_seconds:
+                    unused, lease.credits = lease.credits, 0
+                if lease.spent or lease.covered or unused:
+                    pending.append((day, lease.spent, lease.spent_usd, lease.covered + unused, unused))
+                    lease.spent, lease.spent_usd, lease.covered = 0, 0.0, 0
+                if day != today and not lease.credits:
+                    del self._credits[day]
+        for day, spent, spent_usd, release, unused in pending:
+            try:
+                self.store.settle_credits(day, self.holder, spent, spent_usd, release, now)
+            except Exception as e:
+                logger.warning("[MCP accounting] budget flush failed for %s: %s", day, e)
+                with self._budget_lock:
+                    lease = self._credits.setdefault(day, CreditLease())
+                    lease.credits += unused
+                    lease.spent += spent
+                    lease.spent_usd += spent_usd
+                    lease.covered += release - unused
+
+
+# ---------------------------------------------------------------------------
+# Per-database registry + background flusher
+# ---------------------------------------------------------------------------
+
+
+_registry: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_registry_pid = os.getpid()
+_registry_lock = threading.Lock()
+_flusher: Optional[threading.Thread] = None
+
+
+def accounting_for(db) -> Optional[MCPAccounting]:
+    """The process-wide accounting for a Firestore client (None without one).
+
+    Keyed by client so tests with their own fake database never share
+    leases. A forked child starts empty: leases copied from the parent are
+    left to expire rather than spent twice."""
+    global _registry, _registry_pid
+    if db is None:
+        return None
+    with _registry_lock:
+        if _registry_pid != os.getpid():
+            _registry, _registry_pid = weakref.WeakKeyDictionary(), os.getpid()
+        acct = _registry.get(db)
+        if acct is None:
+            acct = MCPAccounting(FirestoreAccountingStore(db))
+            _registry[db] = acct
+        _ensure_flusher()
+        return acct
+
+
+def flush_all(force: bool = False) -> None:
+    with _registry_lock:
+        accounts = list(_registry.values())
+    for acct in accounts:
+        try:
+            acct.flush(force=force)
+        except Exception as e:
+            logger.warning("[MCP accounting] flush failed: %s", e)
+
+
+def _flush_loop(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        flush_all()
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    interval = _env_number("MCP_ACCOUNTING_FLUSH_SECONDS", 5)
+    if interval <= 0 or (_flusher is not None and _flusher.is_alive()):
+        return
+    if _flusher is None:
+        atexit.register(flush_all, True)
+    _flusher = threading.Thread(
+        target=_flush_loop, args=(interval,), daemon=True, name="mcp-accounting-flush",
+    )
+    _flusher.start()
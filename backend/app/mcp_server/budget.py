@@ -9,19 +9,25 @@ cached-only with a note in the response.
 Credit-to-USD conversion is configurable via MCP_PDL_CREDIT_USD (default
 $0.20). At those defaults, $20 / day = 100 PDL credits = ~20 cold
 find_contacts queries at 5 results each.
+
+can_spend/spend run against a credit lease this process holds on the day
+doc (its entry in `leases`, which expires if the process dies); spend is written back in aggregated increments by
+accounting.MCPAccounting.flush, so the doc's spend lags by a few seconds
+while leases keep the cap exact.
 """
 from __future__ import annotations
 
 import logging
 import os
+import time
 from datetime import datetime, timezone
 
-from firebase_admin import firestore
+from app.mcp_server.accounting import BUDGET_COLLECTION, _live_leases, accounting_for
 
 logger = logging.getLogger(__name__)
 
 
-COLLECTION = "mcp_budget"
+COLLECTION = BUDGET_COLLECTION
 
 
 def _today_id() -> str:
@@ -43,8 +49,9 @@ def _daily_cap_usd() -> float:
 
 
 class MCPBudget:
-    def __init__(self, db):
+    def __init__(self, db, accounting=None):
         self.db = db
+        self.accounting = accounting if accounting is not None else accounting_for(db)
 
     def _doc_ref(self, day: str | None = None):
         if self.db is None:
@@ -62,56 +69,41 @@ class MCPBudget:
         if not snap.exists:
             return {"credits": 0, "spent_usd": 0.0}
         d = snap.to_dict() or {}
+        # Expired leases are only dropped on the next reservation; don't
+        # count them against what is left.
+        leases = _live_leases(d, time.time())
         return {
             "credits": int(d.get("credits", 0)),
             "spent_usd": float(d.get("spent_usd", 0.0)),
+            "leased_credits": sum(int(lease.get("credits", 0)) for lease in leases.values()),
         }
 
     def can_spend(self, credits: int) -> bool:
         """Return False when the projected spend would cross the daily cap."""
         if credits <= 0:
             return True
-        current = self._read()
-        projected_usd = current["spent_usd"] + credits * _credit_usd()
-        return projected_usd <= _daily_cap_usd()
+        if self.accounting is None:
+            return credits * _credit_usd() <= _daily_cap_usd()
+        return self.accounting.can_spend(credits, _daily_cap_usd(), _credit_usd())
 
     def spend(self, credits: int) -> None:
-        """Atomically add credits to today's budget doc."""
-        if credits <= 0 or self.db is None:
-            return
-        ref = self._doc_ref()
-        if ref is None:
+        """Charge credits to today's budget (written back on the next flush)."""
+        if credits <= 0 or self.accounting is None:
             return
-        usd_delta = credits * _credit_usd()
-
-        @firestore.transactional
-        def _txn(transaction):
-            snap = ref.get(transaction=transaction)
-            if snap.exists:
-                d = snap.to_dict() or {}
-                new_credits = int(d.get("credits", 0)) + credits
-                new_usd = float(d.get("spent_usd", 0.0)) + usd_delta
-                transaction.update(ref, {"credits": new_credits, "spent_usd": new_usd})
-            else:
-                transaction.set(ref, {
-                    "credits": credits,
-                    "spent_usd": usd_delta,
-                    "day": _today_id(),
-                })
-
-        try:
-            _txn(self.db.transaction())
-        except Exception as e:
-            logger.warning("[MCP budget] Firestore txn failed: %s", e)
+        self.accounting.spend(credits, _credit_usd())
 
     def status(self) -> dict:
+        if self.accounting is not None:
+            self.accounting.flush()
         current = self._read()
         cap = _daily_cap_usd()
+        leased = current.get("leased_credits", 0)
         return {
             "day": _today_id(),
             "credits": current["credits"],
             "spent_usd": round(current["spent_usd"], 4),
+            "leased_credits": leased,
             "cap_usd": cap,
-            "remaining_usd": round(max(cap - current["spent_usd"], 0.0), 4),
+            "remaining_usd": round(max(cap - current["spent_usd"] - leased * _credit_usd(), 0.0), 4),
             "credit_usd": _credit_usd(),
         }
@@ -21,6 +21,8 @@ import logging
 from datetime import datetime, timezone
 from typing import Any, Optional
 
+from app.services.dashboard_aggregates import apply_contact_update, record_contact_change, record_contact_changes
+
 logger = logging.getLogger(__name__)
 
 
@@ -181,6 +183,7 @@ def persist_contacts(
     written: dict[str, str] = {}
     saved = 0
     skipped = 0
+    agg_changes = []
 
     for c in contacts:
         existing_id = _match_existing(c, index)
@@ -210,6 +213,7 @@ def persist_contacts(
         except Exception as e:
             logger.warning("[MCP persist] write failed for contact: %s", e)
             continue
+        agg_changes.append((doc_id, None, doc))
 
         for key in (email, linkedin, nc_key):
             if key:
@@ -223,6 +227,7 @@ def persist_contacts(
                     index["name_company"].add(key)
                 index["by_key"][key] = doc_id
         saved += 1
+    record_contact_changes(uid, agg_changes, db)
 
     logger.info(
         "[MCP persist] uid=%s saved=%d skipped=%d source=%s",
@@ -266,10 +271,11 @@ def attach_gmail_draft_to_contact(
     if thread_id:
         updates["gmailThreadId"] = thread_id
     try:
-        (
-            db.collection("users").document(uid).collection("contacts")
-            .document(contact_doc_id).update(updates)
-        )
+        ref = db.collection("users").document(uid).collection("contacts").document(contact_doc_id)
+        snap = ref.get()
+        before = (snap.to_dict() or {}) if snap.exists else {}
+        ref.update(updates)
+        record_contact_change(uid, contact_doc_id, before, apply_contact_update(before, updates), db)
         logger.info(
             "[MCP persist] uid=%s contact=%s attached gmailDraftId=%s",
             uid, contact_doc_id, draft_id,
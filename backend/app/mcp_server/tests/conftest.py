@@ -200,6 +200,9 @@ def fake_db(monkeypatch):
     # budget.py works against our fake txn handle.
     from firebase_admin import firestore as fb_firestore
     monkeypatch.setattr(fb_firestore, "transactional", _fake_transactional)
+    # No background accounting flusher: it would outlive the patch above
+    # and touch this fake after the test ends.
+    monkeypatch.setenv("MCP_ACCOUNTING_FLUSH_SECONDS", "0")
     return FakeFirestore()
 
 
@@ -0,0 +1,260 @@
+"""Tests for in-process MCP accounting (app/mcp_server/accounting.py).
+
+Pins:
+  1. Leased admission never lets the Firestore window doc past the tier
+     cap, even with several processes leasing from the same doc, and idle
+     leases are handed back so another process can use them.
+  2. Most calls are admitted without a Firestore round trip; repeated
+     denials are answered locally until the recheck interval.
+  3. Budget spend is charged locally and reconciled in one aggregated
+     write; two processes together never lease past the USD cap, and a
+     process that dies holding a credit lease loses it after the lease TTL.
+
+"Processes" are separate MCPAccounting instances over the same in-memory
+FakeFirestore, with a shared fake clock.
+"""
+from __future__ import annotations
+
+import pytest
+
+from app.mcp_server.accounting import (
+    BUDGET_COLLECTION,
+    RATE_LIMIT_COLLECTION,
+    FirestoreAccountingStore,
+    MCPAccounting,
+)
+from app.mcp_server.budget import MCPBudget
+from app.mcp_server.rate_limit import MCPRateLimit
+
+
+DAY = 86400
+T0 = 1_780_000_000.0  # 2026-05-28 UTC
+
+
+class FakeClock:
+    def __init__(self, t: float = T0):
+        self.t = t
+
+    def __call__(self) -> float:
+        return self.t
+
+    def advance(self, seconds: float) -> None:
+        self.t += seconds
+
+
+class CountingStore(FirestoreAccountingStore):
+    def __init__(self, db):
+        super().__init__(db)
+        self.calls: list[str] = []
+
+    def reserve_slots(self, *a, **k):
+        self.calls.append("reserve_slots")
+        return super().reserve_slots(*a, **k)
+
+    def release_slots(self, *a, **k):
+        self.calls.append("release_slots")
+        return super().release_slots(*a, **k)
+
+    def reserve_credits(self, *a, **k):
+        self.calls.append("reserve_credits")
+        return super().reserve_credits(*a, **k)
+
+    def settle_credits(self, *a, **k):
+        self.calls.append("settle_credits")
+        return super().settle_credits(*a, **k)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _process(fake_db, clock, **kw):
+    store = CountingStore(fake_db)
+    return MCPAccounting(store, clock=clock, idle_seconds=30, deny_recheck_seconds=10, **kw), store
+
+
+def _doc(fake_db, collection, doc_id):
+    return fake_db.store.get(collection, {}).get(doc_id)
+
+
+ELITE = {"uid": "u1", "tier": "elite"}
+FREE = {"uid": "u1", "tier": "free"}
+
+
+# ── 1. Call limits ───────────────────────────────────────────────────────────
+
+
+class TestRateLimit:
+    def test_free_day_cap_is_exact(self, fake_db, clock):
+        acct, _ = _process(fake_db, clock)
+        limiter = MCPRateLimit(fake_db, accounting=acct)
+        results = [limiter.check_and_increment("uid:u1", "find_contacts", FREE) for _ in range(11)]
+        assert [r.ok for r in results] == [True] * 10 + [False]
+        assert results[-1].hit_cap_type == "day"
+        assert results[9].remaining_day == 0
+        assert _doc(fake_db, RATE_LIMIT_COLLECTION, "uid:u1_find_contacts_day")["count"] == 10
+
+    def test_calls_are_admitted_from_leased_slots(self, fake_db, clock):
+        acct, store = _process(fake_db, clock)
+        limiter = MCPRateLimit(fake_db, accounting=acct)
+        for _ in range(100):
+            assert limiter.check_and_increment("uid:u1", "get_company_intel", ELITE).ok
+        # 200/hour cap, leases of 10: one transaction per ten calls.
+        assert store.calls.count("reserve_slots") == 10
+
+    def test_processes_together_never_pass_the_cap(self, fake_db, clock):
+        procs = [_process(fake_db, clock)[0] for _ in range(3)]
+        admitted = 0
+        for i in range(60):
+            acct = procs[i % 3]
+            if acct.admit("uid:u1", "draft_outreach", [("hour", 20, 3600)]).hit is None:
+                admitted += 1
+            doc = _doc(fake_db, RATE_LIMIT_COLLECTION, "uid:u1_draft_outreach_hour")
+            assert doc["count"] <= 20
+        assert admitted <= 20
+
+        # Idle leases go back, and the slots become usable elsewhere.
+        clock.advance(31)
+        for acct in procs:
+            acct.flush()
+        while procs[0].admit("uid:u1", "draft_outreach", [("hour", 20, 3600)]).hit is None:
+            admitted += 1
+        assert admitted == 20
+
+    def test_denials_are_answered_locally_until_recheck(self, fake_db, clock):
+        acct, store = _process(fake_db, clock)
+        window = [("day", 2, DAY)]
+        assert [acct.admit("ip:x", "draft_outreach", window).hit for _ in range(2)] == [None, None]
+        store.calls.clear()
+        for _ in range(5):
+            denied = acct.admit("ip:x", "draft_outreach", window)
+            assert denied.hit == "day"
+            assert denied.retry_after_seconds == DAY
+        assert store.calls == ["reserve_slots"]
+        clock.advance(11)
+        acct.admit("ip:x", "draft_outreach", window)
+        assert store.calls == ["reserve_slots", "reserve_slots"]
+
+    def test_day_denial_does_not_charge_hour(self, fake_db, clock):
+        acct, _ = _process(fake_db, clock)
+        fake_db.collection(RATE_LIMIT_COLLECTION).document("ip:x_find_contacts_day").set(
+            {"count": 3, "expires_at": T0 + 100},
+        )
+        out = acct.admit("ip:x", "find_contacts", [("day", 3, DAY), ("hour", 10, 3600)])
+        assert (out.hit, out.retry_after_seconds) == ("day", 100)
+        assert _doc(fake_db, RATE_LIMIT_COLLECTION, "ip:x_find_contacts_hour") is None
+
+    def test_window_rollover_starts_a_fresh_lease(self, fake_db, clock):
+        acct, _ = _process(fake_db, clock)
+        window = [("hour", 1, 3600)]
+        assert acct.admit("ip:x", "t", window).hit is None
+        assert acct.admit("ip:x", "t", window).hit == "hour"
+        clock.advance(3601)
+        assert acct.admit("ip:x", "t", window).hit is None
+
+    def test_cap_change_returns_old_slots(self, fake_db, clock):
+        acct, _ = _process(fake_db, clock)
+        limiter = MCPRateLimit(fake_db, accounting=acct)
+        limiter.check_and_increment("uid:u1", "get_company_intel", ELITE)  # leases 10 of 200
+        limiter.check_and_increment("uid:u1", "get_company_intel", FREE)   # cap drops to 50
+        acct.flush()
+        # 1 elite call + 1 free call (out of a fresh chunk of 10).
+        assert _doc(fake_db, RATE_LIMIT_COLLECTION, "uid:u1_get_company_intel_hour")["count"] == 11
+
+    def test_store_failure_fails_open(self, fake_db, clock):
+        class Broken(FirestoreAccountingStore):
+            def reserve_slots(self, *a, **k):
+                raise RuntimeError("unavailable")
+
+        acct = MCPAccounting(Broken(fake_db), clock=clock)
+        out = acct.admit("ip:x", "t", [("day", 1, DAY)])
+        assert out.hit is None and out.remaining == {"day": None}
+
+
+# ── 2. Daily budget ──────────────────────────────────────────────────────────
+
+
+class TestBudget:
+    def test_spend_is_reconciled_in_one_write(self, fake_db, clock, monkeypatch):
+        monkeypatch.setenv("MCP_BUDGET_DAILY_USD", "20")
+        monkeypatch.setenv("MCP_PDL_CREDIT_USD", "0.20")
+        acct, store = _process(fake_db, clock, credit_lease_size=25)
+        budget = MCPBudget(fake_db, accounting=acct)
+        for _ in range(4):
+            assert budget.can_spend(5)
+            budget.spend(5)
+        assert store.calls == ["reserve_credits"]
+        day = "2026-05-28"
+        assert _doc(fake_db, BUDGET_COLLECTION, day) == {
+            "credits": 0, "spent_usd": 0.0, "day": day, "leased_credits": 25,
+            "leases": {acct.holder: {"credits": 25, "expires_at": T0 + 300}},
+        }
+        acct.flush()
+        doc = _doc(fake_db, BUDGET_COLLECTION, day)
+        assert doc["credits"] == 20
+        assert doc["spent_usd"] == pytest.approx(4.0)
+        assert doc["leased_credits"] == 5
+        assert doc["leases"][acct.holder]["credits"] == 5
+        assert store.calls == ["reserve_credits", "settle_credits"]
+
+    def test_processes_never_lease_past_the_cap(self, fake_db, clock, monkeypatch):
+        monkeypatch.setenv("MCP_BUDGET_DAILY_USD", "20")
+        monkeypatch.setenv("MCP_PDL_CREDIT_USD", "0.20")
+        budgets = [MCPBudget(fake_db, accounting=_process(fake_db, clock)[0]) for _ in range(2)]
+        spent = 0
+        for i in range(40):
+            b = budgets[i % 2]
+            if b.can_spend(5):
+                b.spend(5)
+                spent += 5
+        assert spent <= 100
+        for b in budgets:
+            b.accounting.flush(force=True)
+        doc = _doc(fake_db, BUDGET_COLLECTION, "2026-05-28")
+        assert doc["credits"] == spent
+        assert doc["spent_usd"] <= 20.0 + 1e-9
+        assert doc["leased_credits"] == 0
+
+    def test_killed_holder_lease_is_reclaimed_after_ttl(self, fake_db, clock, monkeypatch):
+        """A worker that dies without flushing (SIGKILL skips atexit) strands
+        its lease only until the TTL, then the next reserve reclaims it."""
+        monkeypatch.setenv("MCP_BUDGET_DAILY_USD", "20")
+        monkeypatch.setenv("MCP_PDL_CREDIT_USD", "0.20")
+        dead, _ = _process(fake_db, clock, credit_lease_size=100)
+        assert MCPBudget(fake_db, accounting=dead).can_spend(100)
+        survivor = MCPBudget(fake_db, accounting=_process(fake_db, clock)[0])
+        assert survivor.can_spend(5) is False
+        clock.advance(301)
+        assert survivor.can_spend(5) is True
+        doc = _doc(fake_db, BUDGET_COLLECTION, "2026-05-28")
+        assert set(doc["leases"]) == {survivor.accounting.holder}
+        assert doc["leased_credits"] == doc["leases"][survivor.accounting.holder]["credits"]
+
+    def test_expired_local_lease_is_not_spent(self, fake_db, clock):
+        acct, _ = _process(fake_db, clock, credit_lease_ttl=60)
+        budget = MCPBudget(fake_db, accounting=acct)
+        assert budget.can_spend(5)
+        clock.advance(61)
+        budget.spend(5)
+        lease = acct._credits["2026-05-28"]
+        assert lease.covered == 0 and lease.spent == 5
+
+    def test_over_budget_doc_refuses(self, fake_db, clock):
+        fake_db.collection(BUDGET_COLLECTION).document("2026-05-28").set(
+            {"credits": 200, "spent_usd": 100.0, "day": "2026-05-28"},
+        )
+        acct, _ = _process(fake_db, clock)
+        assert MCPBudget(fake_db, accounting=acct).can_spend(5) is False
+
+    def test_unused_lease_from_yesterday_is_released(self, fake_db, clock):
+        acct, _ = _process(fake_db, clock)
+        budget = MCPBudget(fake_db, accounting=acct)
+        assert budget.can_spend(5)
+        budget.spend(5)
+        clock.advance(DAY)
+        acct.flush()
+        doc = _doc(fake_db, BUDGET_COLLECTION, "2026-05-28")
+        assert doc["credits"] == 5
+        assert doc["leased_credits"] == 0
+        assert acct._credits == {}
@@ -195,3 +195,37 @@ def test_persist_is_noop_when_uid_missing(fake_db):
     written = persist_contacts(uid="", db=fake_db, contacts=[{"FirstName": "A"}])
     assert written == {}
     assert fake_db.store == {}
+
+
+def test_writes_are_reported_to_dashboard_aggregates(fake_db, monkeypatch):
+    """New contacts and draft attachments are reported to the dashboard
+    aggregates so the dashboard doesn't wait for the periodic rebuild."""
+    from app.mcp_server import persist
+
+    calls = []
+    batches = []
+
+    def _record_batch(uid, changes, db=None):
+        batches.append(len(changes))
+        calls.extend((uid, cid, before, after) for cid, before, after in changes)
+
+    monkeypatch.setattr(persist, "record_contact_changes", _record_batch)
+    monkeypatch.setattr(persist, "record_contact_change",
+                        lambda uid, cid, before, after, db=None: calls.append((uid, cid, before, after)))
+
+    written = persist.persist_contacts(uid="u1", db=fake_db, contacts=[
+        {"FirstName": "A", "LastName": "A", "Company": "X", "Email": "a@x.com"},
+    ])
+    contact_id = written["a@x.com"]
+    assert [(c[1], c[2], c[3]["email"]) for c in calls] == [(contact_id, None, "a@x.com")]
+    assert batches == [1]
+
+    persist.attach_gmail_draft_to_contact(
+        uid="u1", db=fake_db, contact_doc_id=contact_id, draft_id="d1",
+        draft_url="https://mail/d1", thread_id="t1", recipient_email="a@x.com",
+        subject="s", body="b",
+    )
+    _, cid, before, after = calls[-1]
+    assert cid == contact_id
+    assert "gmailDraftId" not in before
+    assert after["gmailDraftId"] == "d1" and after["company"] == "X"
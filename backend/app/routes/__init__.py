@@ -1,20 +1,105 @@
 """
 Routes package - all API route blueprints
+
+ROUTE_MODULES is the registry wsgi.create_app registers from: each entry
+names a route module, its blueprints and the URL prefixes its rules live
+under, in registration order. Modules that share an exact prefix load as
+one group, so a module living under another's namespace lists its own
+subpaths (e.g. /api/contacts/find-similar, not /api/contacts); a request
+under such a subpath still loads both. Modules are imported lazily (see
+app/utils/lazy_blueprints.py), so importing this package must stay cheap:
+blueprints are still available as `from app.routes import users_bp`, but
+are resolved on first attribute access. tests/test_startup.py checks the
+prefixes against the rules each module actually registers.
 """
-from app.routes.health import health_bp
-from app.routes.gmail_oauth import gmail_oauth_bp
-from app.routes.emails import emails_bp
-from app.routes.contacts import contacts_bp
-from app.routes.runs import runs_bp
-from app.routes.enrichment import enrichment_bp
-from app.routes.resume import resume_bp
-from app.routes.coffee_chat_prep import coffee_chat_bp
-from app.routes.billing import billing_bp
-from app.routes.users import users_bp
-from app.routes.firm_search import firm_search_bp
-from app.routes.dashboard import dashboard_bp
-from app.routes.timeline import timeline_bp
-from app.routes.linkedin_import import linkedin_import_bp
+import importlib
+
+from app.utils.lazy_blueprints import RouteModule
+
+# Registered eagerly at boot: health checks must answer before anything
+# else loads, and wsgi.py mounts legacy aliases onto gmail_oauth views.
+CORE_ROUTE_MODULES = (
+    RouteModule("health", ("health_bp",), ("/ping", "/health", "/healthz")),
+    RouteModule("gmail_oauth", ("gmail_oauth_bp",), ("/api/google",)),
+)
+
+ROUTE_MODULES = (
+    RouteModule("emails", ("emails_bp",), ("/api/emails",)),
+    RouteModule("linkedin_import", ("linkedin_import_bp",), ("/api/contacts/import-linkedin",)),  # before contacts_bp to avoid route conflicts
+    RouteModule("contacts", ("contacts_bp",), ("/api/contacts",)),
+    RouteModule("shares", ("shares_bp",), ("/api/shares",)),
+    RouteModule("runs", ("runs_bp",), ("/api/admin/metering", "/api/contacts/invalidate-cache", "/api/prompt-search")),
+    RouteModule("runs_similar", ("runs_similar_bp",), ("/api/contacts/find-similar",)),
+    RouteModule("enrichment", ("enrichment_bp",), (
+        "/api/autocomplete", "/api/enrich-job-title", "/api/enrich-linkedin-onboarding",
+        "/api/extract-direction", "/api/parse-linkedin-pdf", "/api/school", "/api/search/detect-school",
+        "/api/users/me/sync-linkedin",
+    )),
+    RouteModule("resume", ("resume_bp",), ("/api/parse-resume", "/api/resume")),
+    RouteModule("resume_builder", ("resume_builder_bp",), ("/api/resume-builder",)),
+    RouteModule("coffee_chat_prep", ("coffee_chat_bp",), ("/api/coffee-chat-prep",)),
+    RouteModule("billing", ("billing_bp",), (
+        "/api/active-promos", "/api/billing", "/api/check-credits", "/api/complete-upgrade",
+        "/api/create-checkout-session", "/api/create-portal-session", "/api/credits", "/api/debug",
+        "/api/stripe-webhook", "/api/subscription-status", "/api/tier-config", "/api/tier-info",
+        "/api/update-subscription", "/api/user",
+    )),
+    RouteModule("users", ("users_bp",), ("/api/users",)),
+    RouteModule("outbox", ("outbox_bp",), ("/api/outbox",)),
+    RouteModule("firm_search", ("firm_search_bp",), ("/api/firm-search",)),
+    RouteModule("school_affinity", ("school_affinity_bp",), ("/api/companies",)),
+    RouteModule("dashboard", ("dashboard_bp",), ("/api/dashboard",)),
+    RouteModule("timeline", ("timeline_bp",), ("/api/timeline",)),
+    RouteModule("search_history", ("search_history_bp",), ("/api/search-history",)),
+    RouteModule("parse_prompt", ("parse_prompt_bp",), ("/api/search/parse-prompt",)),
+    RouteModule("contact_import", ("contact_import_bp",), ("/api/contacts/import",)),
+    RouteModule("job_board", ("job_board_bp",), ("/api/job-board",)),
+    RouteModule("auto_apply", ("auto_apply_bp",), ("/api/job-board/auto-apply", "/api/users/application-profile")),
+    RouteModule("alumni_discovery_routes", ("alumni_discovery_bp",), (
+        "/api/job-board/discover-alumni", "/api/job-board/discovery-negative-cache",
+        "/api/job-board/referral-draft/from-discovery", "/api/job-board/referral-draft/from-find-recruiter",
+    )),
+    RouteModule("scout_assistant", ("scout_assistant_bp", "scout_admin_bp"), ("/api/scout-assistant", "/api/admin/scout-assistant")),
+    RouteModule("auth_extension", ("auth_extension_bp",), ("/api/auth",)),
+    RouteModule("email_template", ("email_template_bp",), ("/api/email-template",)),
+    RouteModule("admin", ("admin_bp",), ("/api/admin",)),
+    RouteModule("gmail_webhook", ("gmail_webhook_bp",), ("/api/gmail",)),
+    RouteModule("nudges", ("nudges_bp",), ("/api/nudge-preferences", "/api/nudges")),
+    RouteModule("queue", ("queue_bp",), ("/api/queue",)),
+    RouteModule("jobs", ("jobs_bp",), ("/api/jobs",)),
+    RouteModule("extension_logs", ("extension_logs_bp",), ("/api/extension",)),
+    RouteModule("search_suggestions", ("search_suggestions_bp",), ("/api/search-suggestions",)),
+    RouteModule("briefing", ("briefing_bp",), ("/api/briefing",)),
+    RouteModule("agent", ("agent_bp",), ("/api/agent",)),
+    RouteModule("loops", ("loops_bp",), ("/api/agent/loops",)),
+    RouteModule("loop_notifications", ("loop_notifications_bp",), ("/api/loops", "/api/users/me/loop-alert-email")),
+    RouteModule("metrics", ("metrics_bp",), ("/api/metrics",)),
+    RouteModule("referrals", ("referrals_bp",), ("/api/referrals",)),
+    RouteModule("interview_prep_public", ("interview_prep_public_bp",), ("/api/tools/interview-prep",)),
+    RouteModule("cover_letter_public", ("cover_letter_public_bp",), ("/api/tools/cover-letter",)),
+    RouteModule("resume_workshop_public", ("resume_workshop_public_bp",), ("/api/tools/resume-review",)),
+    RouteModule("meeting_prep_public", ("meeting_prep_public_bp",), ("/api/tools/meeting-prep",)),
+    RouteModule("find_hiring_manager_public", ("find_hiring_manager_public_bp",), ("/api/tools/find-hiring-manager",)),
+    RouteModule("find_companies_public", ("find_companies_public_bp",), ("/api/tools/find-companies",)),
+    RouteModule("find_jobs_public", ("find_jobs_public_bp",), ("/api/tools/find-jobs",)),
+    RouteModule("find_people_public", ("find_people_public_bp",), ("/api/tools/find-people",)),
+    RouteModule("lifecycle", ("lifecycle_bp",), ("/api/lifecycle",)),              # /api/lifecycle/tick + unsubscribe
+    RouteModule("beehiiv_webhook", ("beehiiv_webhook_bp",), ("/api/beehiiv",)),   # inbound unsub sync
+    RouteModule("mobile_handoff", ("mobile_handoff_bp", "web_handoff_bp"), ("/api/mobile", "/api/web")),
+    RouteModule("waitlist", ("waitlist_bp",), ("/api/waitlist",)),                # iOS app waitlist
+)
+
+_BLUEPRINT_MODULES = {
+    bp: m.module for m in CORE_ROUTE_MODULES + ROUTE_MODULES for bp in m.blueprints
+}
+
+
+def __getattr__(name):
+    module = _BLUEPRINT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f"{__name__}.{module}"), name)
+
 
 __all__ = [
     'health_bp',
@@ -32,4 +117,3 @@ __all__ = [
     'timeline_bp',
     'linkedin_import_bp',
 ]
-
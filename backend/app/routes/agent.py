@@ -13,6 +13,7 @@ import logging
 from flask import Blueprint, current_app, jsonify, request
 
 from app.extensions import get_db, require_firebase_auth, require_tier
+from app.utils.auth_context import get_request_user_doc
 from app.services.agent_brief_parser import parse_brief
 from app.services.brief_proposer import propose_brief
 from app.utils.exceptions import ValidationError
@@ -124,7 +125,7 @@ def propose_brief_route():
     """
     uid = request.firebase_user["uid"]
     db = get_db()
-    snap = db.collection("users").document(uid).get()
+    snap = get_request_user_doc(uid, db)
     user_data = snap.to_dict() if snap.exists else {}
     resume_text = user_data.get("resumeText") or ""
     profile = user_data.get("professionalInfo") or {}
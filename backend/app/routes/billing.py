@@ -38,6 +38,7 @@ from app.config import (
     FREE_DRAFTS_PER_MONTH,
 )
 from ..extensions import get_db
+from ..utils.auth_context import get_request_user_doc
 
 billing_bp = Blueprint('billing', __name__, url_prefix='/api')
 
@@ -349,7 +350,7 @@ def check_credits():
         if db and user_id:
             # Try using user ID first (more reliable)
             user_ref = db.collection('users').document(user_id)
-            user_doc = user_ref.get()
+            user_doc = get_request_user_doc(user_id, db)
             
             if not user_doc.exists and user_email:
                 # Fallback to email-based lookup
@@ -552,7 +553,7 @@ def complete_upgrade():
         user_ref = db.collection('users').document(user_id)
         
         # Check if user exists first
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
         if not user_doc.exists:
             print(f"   ⚠️  User document doesn't exist, creating new one")
         
@@ -679,7 +680,7 @@ def subscription_status():
             return jsonify({'subscribed': False}), 200
         
         user_ref = db.collection('users').document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
         
         if not user_doc.exists:
             return jsonify({'subscribed': False, 'tier': 'free'}), 200
@@ -725,7 +726,7 @@ def get_user_subscription():
             }), 200
 
         user_ref = db.collection('users').document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
 
         if not user_doc.exists:
             return jsonify({
@@ -786,7 +787,7 @@ def check_feature():
             return jsonify({'allowed': False, 'reason': 'User not found'}), 200
         
         user_ref = db.collection('users').document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
         
         if not user_doc.exists:
             return jsonify({'allowed': False, 'reason': 'User not found'}), 200
@@ -827,7 +828,7 @@ def increment_usage():
             return jsonify({'error': 'Database not available'}), 500
         
         user_ref = db.collection('users').document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
         
         if not user_doc.exists:
             return jsonify({'error': 'User not found'}), 404
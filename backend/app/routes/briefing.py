@@ -3,13 +3,23 @@ Morning Briefing endpoint — Sprint 3A.
 
 Single aggregation endpoint that returns replies, follow-ups, roadmap progress,
 recruiting deadlines, and pipeline stats in one call.
+
+Sections load concurrently on a small shared pool. The tier-independent
+loaders start alongside the user-doc read, and reply drafts come back in
+one get_all. The assembled payload is kept per user for a few seconds (see
+services/briefing_snapshot.py); briefing_viewed is still logged on every
+view.
 """
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 from flask import Blueprint, jsonify, request
 
 from app.extensions import get_db, require_firebase_auth
+from app.utils.auth_context import get_request_user_doc
+from app.services.briefing_snapshot import briefing_generation, get_snapshot, store_snapshot
 from app.services.nudge_service import _get_eligible_contacts, DEFAULT_FOLLOWUP_DAYS
 from app.services.outbox_service import get_outbox_stats
 from app.services.networking_roadmap import (
@@ -24,21 +34,44 @@ logger = logging.getLogger(__name__)
 
 briefing_bp = Blueprint("briefing_bp", __name__)
 
+# Section loaders are short Firestore calls; the pool bounds how many a
+# burst of briefing loads can have in flight per worker.
+_loader_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("BRIEFING_LOADER_WORKERS", "8")),
+    thread_name_prefix="briefing",
+)
 
-def _get_unread_replies(db, uid: str, tier: str) -> list:
-    """Get contacts with unread replies, including reply draft data for Pro/Elite."""
-    contacts_ref = db.collection("users").document(uid).collection("contacts")
-    results = []
 
+def _unread_reply_docs(db, uid: str) -> list:
+    contacts_ref = db.collection("users").document(uid).collection("contacts")
     try:
-        docs = list(
+        return list(
             contacts_ref
             .where("hasUnreadReply", "==", True)
             .limit(10)
             .stream()
         )
     except Exception:
-        docs = []
+        return []
+
+
+def _get_unread_replies(db, uid: str, tier: str, docs=None) -> list:
+    """Get contacts with unread replies, including reply draft data for Pro/Elite.
+
+    `docs` is the already-fetched unread-replies query result, if any."""
+    if docs is None:
+        docs = _unread_reply_docs(db, uid)
+    results = []
+
+    drafts = {}
+    if tier in ("pro", "elite") and docs:
+        drafts_ref = db.collection("users").document(uid).collection("replyDrafts")
+        try:
+            for draft_doc in db.get_all([drafts_ref.document(doc.id) for doc in docs]):
+                if draft_doc.exists:
+                    drafts[draft_doc.id] = draft_doc.to_dict() or {}
+        except Exception:
+            pass
 
     for doc in docs:
         data = doc.to_dict() or {}
@@ -54,16 +87,10 @@ def _get_unread_replies(db, uid: str, tier: str) -> list:
         }
 
         # Include reply draft for Pro/Elite
-        if tier in ("pro", "elite"):
-            try:
-                draft_ref = db.collection("users").document(uid).collection("replyDrafts").document(doc.id)
-                draft_doc = draft_ref.get()
-                if draft_doc.exists:
-                    draft_data = draft_doc.to_dict() or {}
-                    entry["replyDraftBody"] = draft_data.get("draftBody") or ""
-                    entry["replyDraftStatus"] = draft_data.get("status") or "pending"
-            except Exception:
-                pass
+        draft_data = drafts.get(doc.id)
+        if draft_data is not None:
+            entry["replyDraftBody"] = draft_data.get("draftBody") or ""
+            entry["replyDraftStatus"] = draft_data.get("status") or "pending"
 
         results.append(entry)
 
@@ -168,83 +195,100 @@ def get_briefing():
         return jsonify({"error": "Internal server error", "detail": str(e)}), 500
 
 
-def _get_briefing_inner():
-    uid = request.firebase_user['uid']
-    db = get_db()
-
-    # Get user data for tier and profile info
-    user_doc = db.collection("users").document(uid).get()
-    user_data = user_doc.to_dict() if user_doc.exists else {}
-    tier = user_data.get("subscriptionTier") or user_data.get("tier", "free")
-
-    # Determine if new user (for empty states)
-    created_at = user_data.get("createdAt")
-    is_new_user = False
-    if created_at:
-        try:
-            # createdAt may be a Firestore timestamp object or an ISO string
-            if hasattr(created_at, 'timestamp'):
-                # Firestore DatetimeWithNanoseconds
-                created_dt = created_at.replace(tzinfo=timezone.utc) if created_at.tzinfo is None else created_at
-            else:
-                created_dt = datetime.fromisoformat(str(created_at).replace("Z", "+00:00"))
-            is_new_user = (datetime.now(timezone.utc) - created_dt).days <= 7
-        except Exception:
-            pass
-
-    # Aggregate all sections
-    replies = _get_unread_replies(db, uid, tier)
-    follow_ups = _get_follow_ups(db, uid)
-
-    # Roadmap progress (Pro/Elite only)
-    roadmap_progress = None
-    has_roadmap = False
-    if tier in ("pro", "elite"):
-        roadmap_progress = compute_roadmap_progress(uid)
-        has_roadmap = roadmap_progress is not None
-
-    # Pipeline stats
+def _get_pipeline_stats(uid: str) -> dict:
     try:
         pipeline_stats = get_outbox_stats(uid)
         total = pipeline_stats.get("total", 0)
         done_count = pipeline_stats.get("doneCount", 0)
         needs_attention = pipeline_stats.get("needsAttentionCount", 0)
-        stats_summary = {
+        return {
             "active": total - done_count,
             "needsAttention": needs_attention,
             "done": done_count,
             "totalContacts": total,
         }
     except Exception:
-        stats_summary = {"active": 0, "needsAttention": 0, "done": 0, "totalContacts": 0}
+        return {"active": 0, "needsAttention": 0, "done": 0, "totalContacts": 0}
 
-    # Deadlines
-    deadlines = _get_deadlines(user_data)
 
-    # Determine content sections for metrics
-    sections_with_content = []
-    if replies:
-        sections_with_content.append("replies")
-    if follow_ups:
-        sections_with_content.append("followUps")
-    if roadmap_progress:
-        sections_with_content.append("roadmapProgress")
-    if deadlines:
-        sections_with_content.append("deadlines")
+def _load_user(db, uid: str) -> dict:
+    user_doc = get_request_user_doc(uid, db)
+    return user_doc.to_dict() if user_doc.exists else {}
 
-    # Log briefing_viewed metric
-    log_event(uid, "briefing_viewed", {"sections_with_content": sections_with_content})
 
-    return jsonify({
+def _is_new_user(user_data: dict) -> bool:
+    created_at = user_data.get("createdAt")
+    if not created_at:
+        return False
+    try:
+        # createdAt may be a Firestore timestamp object or an ISO string
+        if hasattr(created_at, 'timestamp'):
+            # Firestore DatetimeWithNanoseconds
+            created_dt = created_at.replace(tzinfo=timezone.utc) if created_at.tzinfo is None else created_at
+        else:
+            created_dt = datetime.fromisoformat(str(created_at).replace("Z", "+00:00"))
+        return (datetime.now(timezone.utc) - created_dt).days <= 7
+    except Exception:
+        return False
+
+
+def _build_briefing(db, uid: str) -> dict:
+    # Tier-independent sections start with the user-doc read.
+    user_future = _loader_pool.submit(_load_user, db, uid)
+    unread_future = _loader_pool.submit(_unread_reply_docs, db, uid)
+    follow_ups_future = _loader_pool.submit(_get_follow_ups, db, uid)
+    stats_future = _loader_pool.submit(_get_pipeline_stats, uid)
+
+    # Get user data for tier and profile info
+    user_data = user_future.result()
+    tier = user_data.get("subscriptionTier") or user_data.get("tier", "free")
+
+    # Roadmap progress (Pro/Elite only)
+    roadmap_future = None
+    if tier in ("pro", "elite"):
+        roadmap_future = _loader_pool.submit(compute_roadmap_progress, uid)
+
+    replies = _get_unread_replies(db, uid, tier, docs=unread_future.result())
+    follow_ups = follow_ups_future.result()
+    stats_summary = stats_future.result()
+    roadmap_progress = roadmap_future.result() if roadmap_future is not None else None
+
+    return {
         "replies": replies,
         "followUps": follow_ups,
         "roadmapProgress": roadmap_progress,
-        "deadlines": deadlines,
+        "deadlines": _get_deadlines(user_data),
         "pipelineStats": stats_summary,
         "meta": {
             "tier": tier,
-            "hasRoadmap": has_roadmap,
+            "hasRoadmap": roadmap_progress is not None,
             "hasContacts": stats_summary["totalContacts"] > 0,
-            "isNewUser": is_new_user,
+            "isNewUser": _is_new_user(user_data),
         },
-    })
+    }
+
+
+def _get_briefing_inner():
+    uid = request.firebase_user['uid']
+
+    briefing = get_snapshot(uid)
+    if briefing is None:
+        generation = briefing_generation(uid)
+        briefing = _build_briefing(get_db(), uid)
+        store_snapshot(uid, generation, briefing)
+
+    # Determine content sections for metrics
+    sections_with_content = []
+    if briefing["replies"]:
+        sections_with_content.append("replies")
+    if briefing["followUps"]:
+        sections_with_content.append("followUps")
+    if briefing["roadmapProgress"]:
+        sections_with_content.append("roadmapProgress")
+    if briefing["deadlines"]:
+        sections_with_content.append("deadlines")
+
+    # Log briefing_viewed metric
+    log_event(uid, "briefing_viewed", {"sections_with_content": sections_with_content})
+
+    return jsonify(briefing)
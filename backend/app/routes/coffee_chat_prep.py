@@ -12,6 +12,7 @@ from flask import Blueprint, jsonify, request
 
 from app.config import COFFEE_CHAT_CREDITS, TIER_CONFIGS
 from ..extensions import get_db, require_firebase_auth
+from ..utils.auth_context import get_request_user_doc
 from app.services.feature_flags import PDL_OUTAGE_ACTIVE
 from app.services.auth import check_and_reset_credits, deduct_credits_atomic, refund_credits_atomic, check_and_reset_usage, can_access_feature
 from app.utils.exceptions import ValidationError, OfferloopException, InsufficientCreditsError, AuthorizationError
@@ -394,7 +395,7 @@ def create_coffee_chat_prep():
         user_data = {}
         if db and user_id:
             user_ref = db.collection("users").document(user_id)
-            user_doc = user_ref.get()
+            user_doc = get_request_user_doc(user_id, db)
             if user_doc.exists:
                 user_data = user_doc.to_dict() or {}
                 credits_available = check_and_reset_credits(user_ref, user_data)
@@ -7,7 +7,9 @@ from flask import Blueprint, request, jsonify
 from firebase_admin import firestore
 
 from ..extensions import require_firebase_auth
+from ..utils.auth_context import get_request_user_doc
 from app.services.gmail_client import _load_user_gmail_creds, _gmail_service, check_for_replies
+from app.services.dashboard_aggregates import apply_contact_update, record_contact_change, record_contact_changes
 from ..extensions import get_db
 from app.utils.exceptions import NotFoundError, ValidationError, OfferloopException
 from app.utils.validation import ContactCreateRequest, ContactUpdateRequest, validate_request
@@ -120,6 +122,7 @@ def create_contact():
         
         doc_ref = db.collection('users').document(user_id).collection('contacts').add(contact)
         contact['id'] = doc_ref[1].id
+        record_contact_change(user_id, contact['id'], None, contact, db)
         
         return jsonify({'contact': contact}), 201
         
@@ -171,6 +174,8 @@ def update_contact(contact_id):
             ref.update(update)
         
         out = ref.get().to_dict()
+        if update:
+            record_contact_change(user_id, contact_id, doc.to_dict(), out, db)
         out['id'] = contact_id
         
         return jsonify({'contact': out})
@@ -194,11 +199,13 @@ def delete_contact(contact_id):
             raise OfferloopException("Database not initialized", error_code="DATABASE_ERROR")
         
         ref = db.collection('users').document(user_id).collection('contacts').document(contact_id)
-        
-        if not ref.get().exists:
+        doc = ref.get()
+
+        if not doc.exists:
             raise NotFoundError("Contact")
 
         ref.delete()
+        record_contact_change(user_id, contact_id, doc.to_dict(), None, db)
 
         return jsonify({'message': 'Contact deleted successfully'})
         
@@ -242,10 +249,12 @@ def check_contact_replies(contact_id):
         reply_status = check_for_replies(gmail_service, thread_id, email)
         
         # Update contact with reply status
-        contact_ref.update({
+        reply_update = {
             'hasUnreadReply': reply_status['isUnread'],
             'lastChecked': datetime.now().isoformat()
-        })
+        }
+        contact_ref.update(reply_update)
+        record_contact_change(user_id, contact_id, contact_data, apply_contact_update(contact_data, reply_update), db)
         
         return jsonify(reply_status)
         
@@ -305,6 +314,7 @@ def batch_check_replies():
         
         gmail_service = _gmail_service(creds)
         results = {}
+        agg_changes = []
         
         for contact_id in contact_ids[:20]:  # Limit to 20 at a time
             try:
@@ -329,13 +339,16 @@ def batch_check_replies():
                     results[contact_id] = reply_status
                     
                     # Update in Firestore
-                    contact_ref.update({
+                    reply_update = {
                         'hasUnreadReply': reply_status['isUnread'],
                         'lastChecked': datetime.now().isoformat()
-                    })
+                    }
+                    contact_ref.update(reply_update)
+                    agg_changes.append((contact_id, contact_data, apply_contact_update(contact_data, reply_update)))
             except Exception as e:
                 print(f"Error checking contact {contact_id}: {e}")
                 continue
+        record_contact_changes(user_id, agg_changes, db)
         
         return jsonify({'results': results})
         
@@ -493,6 +506,7 @@ def bulk_create_contacts():
         created = 0
         skipped = 0
         created_contacts = []
+        agg_changes = []
         today = datetime.now().strftime('%m/%d/%Y')
         
         for idx, rc in enumerate(raw_contacts):
@@ -639,8 +653,10 @@ def bulk_create_contacts():
             
             doc_ref = contacts_ref.add(contact)
             contact['id'] = doc_ref[1].id
+            agg_changes.append((contact['id'], None, contact))
             created_contacts.append(contact)
             created += 1
+        record_contact_changes(user_id, agg_changes, db)
         
         return jsonify({
             'created': created,
@@ -709,14 +725,18 @@ def bulk_delete_contacts():
         not_found = []
         
         contacts_ref = db.collection('users').document(user_id).collection('contacts')
+        agg_changes = []
         
         for contact_id in contact_ids:
             contact_ref = contacts_ref.document(contact_id)
-            if contact_ref.get().exists:
+            contact_doc = contact_ref.get()
+            if contact_doc.exists:
                 contact_ref.delete()
+                agg_changes.append((contact_id, contact_doc.to_dict(), None))
                 deleted_count += 1
             else:
                 not_found.append(contact_id)
+        record_contact_changes(user_id, agg_changes, db)
 
         return jsonify({
             'deleted': deleted_count,
@@ -742,7 +762,7 @@ def refresh_warmth_scores():
         uid = request.firebase_user['uid']
 
         # Load user profile
-        user_doc = db.collection('users').document(uid).get()
+        user_doc = get_request_user_doc(uid, db)
         if not user_doc.exists:
             return jsonify({'error': 'User not found'}), 404
         user_data = user_doc.to_dict()
@@ -5,6 +5,7 @@ from flask import Blueprint, jsonify, request
 from firebase_admin import firestore
 
 from app.extensions import require_firebase_auth, require_tier, get_db
+from app.utils.auth_context import get_request_user_doc
 from email_templates import (
     get_available_presets,
     EMAIL_STYLE_PRESETS,
@@ -114,7 +115,7 @@ def get_default():
         return jsonify({"error": str(e)}), 500
 
     uid = request.firebase_user["uid"]
-    user_doc = db.collection("users").document(uid).get()
+    user_doc = get_request_user_doc(uid, db)
 
     if not user_doc.exists:
         return jsonify({
@@ -21,11 +21,34 @@ from app.services.gmail_client import get_gmail_service_for_user, get_user_gmail
 from app.services.resume_parser import extract_text_from_pdf_bytes
 from app.utils.url_validator import validate_fetch_url, UnsafeURLError
 from app.utils.seniority import classify_seniority
+from app.utils.scoring_profile import contact_features
 from app.utils.warmth_scoring import score_contacts_for_email
 from app.utils.users import get_outreach_email, merge_persona_fields
 from ..extensions import get_db
+from ..utils.auth_context import get_request_user_doc
 from email_templates import get_template_instructions
 from app.services.eml_builder import build_eml, eml_filename
+from app.services.dashboard_aggregates import apply_contact_update, record_contact_change, record_contact_changes
+
+
+# Drafts per Gmail batch HTTP call. Gmail accepts up to 100 but starts
+# rate-limiting draft creates well before that.
+GMAIL_DRAFT_BATCH_SIZE = int(os.getenv("GMAIL_DRAFT_BATCH_SIZE", "20"))
+# Max values in a Firestore "in" filter.
+_FIRESTORE_IN_LIMIT = 30
+# Max operations per Firestore WriteBatch.
+_FIRESTORE_BATCH_LIMIT = 500
+
+
+def _warmth_fields(warmth_info, job_title):
+    """warmthTier / warmthScore / seniorityBucket for a drafted contact."""
+    update = {
+        "seniorityBucket": classify_seniority(job_title),
+    }
+    if warmth_info:
+        update["warmthTier"] = warmth_info.get("tier", "unknown")
+        update["warmthScore"] = warmth_info.get("score", 0)
+    return update
 
 
 def _persist_warmth_on_send(db, uid, contact_email, warmth_info, job_title):
@@ -43,13 +66,7 @@ def _persist_warmth_on_send(db, uid, contact_email, warmth_info, job_title):
         matches = list(contacts_ref.where("email", "==", email_clean).limit(1).stream())
         if not matches:
             return
-        update = {
-            "seniorityBucket": classify_seniority(job_title),
-        }
-        if warmth_info:
-            update["warmthTier"] = warmth_info.get("tier", "unknown")
-            update["warmthScore"] = warmth_info.get("score", 0)
-        matches[0].reference.update(update)
+        matches[0].reference.update(_warmth_fields(warmth_info, job_title))
     except Exception as exc:
         import logging
         logging.getLogger("emails").debug(
@@ -176,6 +193,108 @@ def _normalize_drive_url(url: str) -> str:
     return url
 
 
+def _build_resume_part(data, ctype, filename):
+    """Resume attachment, base64-encoded once and attached to every draft."""
+    filename = filename or "Resume.pdf"
+    # If filename missing extension, try to pull one from the cached content-type
+    if "." not in filename and ctype and "/" in ctype:
+        ext = mimetypes.guess_extension(ctype.split(";")[0].strip()) or ".pdf"
+        filename += ext
+
+    # Infer MIME type
+    ctype_clean = (ctype or "").split(";", 1)[0].strip()
+    if "/" in ctype_clean:
+        main, sub = ctype_clean.split("/", 1)
+    else:
+        main, sub = _infer_mime_type(filename)
+
+    part = MIMEBase(main, sub)
+    part.set_payload(data)
+    encoders.encode_base64(part)
+    part.add_header("Content-Disposition", f'attachment; filename="{filename}"')
+    return part
+
+
+def _execute_gmail_requests(gmail, requests_by_id):
+    """Run Gmail API requests through the batch HTTP endpoint,
+    GMAIL_DRAFT_BATCH_SIZE per call. Returns {request_id: (response, error)};
+    ids with no callback (e.g. the whole batch failed) map to an error.
+    A single request skips the batch envelope."""
+    items = list(requests_by_id.items())
+    out = {}
+    if len(items) == 1:
+        rid, req = items[0]
+        try:
+            out[rid] = (req.execute(), None)
+        except Exception as e:
+            out[rid] = (None, e)
+        return out
+
+    def callback(request_id, response, exception):
+        out[request_id] = (response, exception)
+
+    for start in range(0, len(items), GMAIL_DRAFT_BATCH_SIZE):
+        chunk = items[start:start + GMAIL_DRAFT_BATCH_SIZE]
+        batch = gmail.new_batch_http_request(callback=callback)
+        for rid, req in chunk:
+            batch.add(req, request_id=rid)
+        try:
+            batch.execute()
+        except Exception as e:
+            print(f"❌ Gmail batch of {len(chunk)} failed: {e}")
+            for rid, _ in chunk:
+                out.setdefault(rid, (None, e))
+    for rid, _ in items:
+        out.setdefault(rid, (None, RuntimeError("no response in Gmail batch")))
+    return out
+
+
+def _save_drafted_contacts(db, uid, writes):
+    """Upsert drafted contacts by email with batched reads and writes.
+
+    `writes` is [(email, contact_data)] in draft order. Existing contacts are
+    found with "in" queries instead of one lookup per draft, and everything
+    is committed in one WriteBatch. Several drafts to the same address
+    collapse into one write (later fields win), as sequential upserts would.
+    """
+    contacts_ref = db.collection("users").document(uid).collection("contacts")
+    merged = {}
+    for email, data in writes:
+        merged.setdefault(email, {}).update(data)
+
+    emails = list(merged)
+    existing = {}
+    for start in range(0, len(emails), _FIRESTORE_IN_LIMIT):
+        chunk = emails[start:start + _FIRESTORE_IN_LIMIT]
+        for snap in contacts_ref.where("email", "in", chunk).stream():
+            existing.setdefault((snap.to_dict() or {}).get("email"), snap)
+
+    ops = []
+    changes = []
+    for email, data in merged.items():
+        snap = existing.get(email)
+        if snap is not None:
+            # Update existing contact (same email = one contact doc)
+            before = snap.to_dict() or {}
+            ops.append(("update", snap.reference, data))
+            changes.append((snap.id, before, apply_contact_update(before, data)))
+        else:
+            # Create new contact only when no existing contact with this email
+            data = {**data, "email": email, "createdAt": datetime.utcnow().isoformat()}
+            ref = contacts_ref.document()
+            ops.append(("set", ref, data))
+            changes.append((ref.id, None, data))
+
+    for start in range(0, len(ops), _FIRESTORE_BATCH_LIMIT):
+        batch = db.batch()
+        for op, ref, data in ops[start:start + _FIRESTORE_BATCH_LIMIT]:
+            getattr(batch, op)(ref, data)
+        batch.commit()
+    record_contact_changes(uid, changes, db)
+    print(f"✅ Saved {len(changes)} drafted contacts "
+          f"({sum(1 for _, before, _ in changes if before is not None)} updated)")
+
+
 @emails_bp.post("/generate-and-draft")
 @require_firebase_auth
 def generate_and_draft():
@@ -196,7 +315,7 @@ def generate_and_draft():
           f"(len={len(resume_text) if resume_text else 0})")
     if not resume_text or len(resume_text.strip()) < 50:
         print("[EmailGen] resume_text missing or too short, checking Firestore cache...")
-        _user_doc = db.collection("users").document(uid).get()
+        _user_doc = get_request_user_doc(uid, db)
         _user_data = _user_doc.to_dict() or {}
         _cached_text = _user_data.get("resumeText")
         if _cached_text and len(_cached_text.strip()) >= 50:
@@ -211,7 +330,7 @@ def generate_and_draft():
             _resume_url = user_profile.get("resumeUrl")
             _url_source = "userProfile" if _resume_url else None
         if not _resume_url:
-            _user_doc = db.collection("users").document(uid).get()
+            _user_doc = get_request_user_doc(uid, db)
             _user_data = _user_doc.to_dict() or {}
             _resume_url = _user_data.get("resumeUrl")
             _url_source = "firestore" if _resume_url else None
@@ -262,7 +381,7 @@ def generate_and_draft():
         print(f"📧 Skipping email generation for {len(contacts_with_emails)} contacts that already have emails")
     
     # Load email template: prefer request body override, fall back to Firestore stored default
-    user_doc = db.collection("users").document(uid).get()
+    user_doc = get_request_user_doc(uid, db)
     user_data = user_doc.to_dict() or {}
     # Prefer the user's .edu for the outreach identity (signature + mailto). This
     # flows into both this endpoint's signature builder and the LLM body via
@@ -342,6 +461,7 @@ def generate_and_draft():
 
     # Only generate emails for contacts that don't have them
     results = {}
+    warmth_data = {}
     if contacts_needing_emails:
         # Log if fit context is being used
         if fit_context:
@@ -352,7 +472,8 @@ def generate_and_draft():
         
         # 1) Generate emails with fit context and user's template/signoff
         auth_display_name = (getattr(request, "firebase_user", None) or {}).get("name") or ""
-        warmth_data = score_contacts_for_email(user_data, contacts_to_generate)
+        features = contact_features(contacts_to_generate)
+        warmth_data = score_contacts_for_email(user_data, contacts_to_generate, features=features)
         print(f"[EmailGen] Calling batch_generate_emails: resume_text={'present (' + str(len(resume_text)) + ' chars)' if resume_text else 'None/empty'}, "
               f"contacts={len(contacts_to_generate)}")
         generated_results = batch_generate_emails(
@@ -371,6 +492,7 @@ def generate_and_draft():
             dream_companies=dream_companies,
             warmth_data=warmth_data,
             uid=uid,
+            contact_features=features,
         )
         print(f"🧪 batch_generate_emails returned: type={type(generated_results)}, "
           f"len={len(generated_results) if hasattr(generated_results, '__len__') else 'n/a'}, "
@@ -449,6 +571,19 @@ def generate_and_draft():
             print(f"Could not download resume from {resume_url}: {e}")
             _cached_resume_data = None
 
+    _resume_part = None
+    if _cached_resume_data is not None:
+        try:
+            _resume_part = _build_resume_part(_cached_resume_data, _cached_resume_ctype, resume_filename)
+        except Exception as e:
+            print(f"Could not attach resume: {e}")
+
+    # Drafts are assembled in the loop and submitted together afterwards:
+    # one batched create, one batched lookup for missing ids, one Firestore
+    # commit for the contacts.
+    pending_drafts = []
+    contact_writes = []
+
     print(f"👥 Contacts received: {len(contacts)}")
     for i, c in enumerate(contacts):
         # ✅ FIX: Check if contact already has email, otherwise use newly generated email
@@ -599,39 +734,23 @@ def generate_and_draft():
             # Save the contact so My Network / surfaces show the drafted email.
             # No gmailDraftId/gmailDraftUrl and inOutbox stays False: reply
             # tracking requires Gmail.
-            try:
-                contacts_ref = db.collection("users").document(uid).collection("contacts")
-                to_addr_clean = (to_addr or "").strip().lower()
-                existing_contacts = list(contacts_ref.where("email", "==", to_addr_clean).limit(1).stream())
-
-                contact_data = {
-                    "emailSubject": r["subject"],
-                    "emailBody": body,
-                    "draftToEmail": to_addr_clean,
-                    "emailGeneratedAt": datetime.utcnow().isoformat(),
-                    "lastActivityAt": datetime.utcnow().isoformat(),
-                    "updatedAt": datetime.utcnow().isoformat(),
-                    "pipelineStage": "draft_created",
-                    "inOutbox": False,
-                }
-                contact_data.update(_base_contact_fields(r, c, body))
-
-                if existing_contacts:
-                    existing_contacts[0].reference.update(contact_data)
-                else:
-                    contact_data["email"] = to_addr_clean
-                    contact_data["createdAt"] = datetime.utcnow().isoformat()
-                    contacts_ref.document().set(contact_data)
-
-                # Persist warmth tier + seniority bucket for Phase 2 aggregation,
-                # same as the Gmail draft branch below.
-                _w_info = warmth_data.get(i) if warmth_data else None
-                _persist_warmth_on_send(
-                    db, uid, to_addr_clean, _w_info,
-                    c.get("Title") or c.get("jobTitle") or "",
-                )
-            except Exception as e:
-                print(f"[{i}] Failed to save fallback contact: {e}")
+            to_addr_clean = (to_addr or "").strip().lower()
+            contact_data = {
+                "emailSubject": r["subject"],
+                "emailBody": body,
+                "draftToEmail": to_addr_clean,
+                "emailGeneratedAt": datetime.utcnow().isoformat(),
+                "lastActivityAt": datetime.utcnow().isoformat(),
+                "updatedAt": datetime.utcnow().isoformat(),
+                "pipelineStage": "draft_created",
+                "inOutbox": False,
+            }
+            contact_data.update(_base_contact_fields(r, c, body))
+            # Warmth tier + seniority bucket for Phase 2 aggregation, same as
+            # the Gmail draft branch below.
+            _w_info = warmth_data.get(i) if warmth_data else None
+            contact_data.update(_warmth_fields(_w_info, c.get("Title") or c.get("jobTitle") or ""))
+            contact_writes.append((to_addr_clean, contact_data))
             continue
 
         # --- Build MIME message ---
@@ -644,56 +763,70 @@ def generate_and_draft():
         alt.attach(MIMEText(html_body, "html", "utf-8"))
         msg.attach(alt)
 
-        # --- Attach resume if available (uses pre-downloaded bytes) ---
-        if _cached_resume_data is not None:
-            try:
-                data = _cached_resume_data
-                filename = resume_filename or "Resume.pdf"
-                # If filename missing extension, try to pull one from the cached content-type
-                if "." not in filename and _cached_resume_ctype and "/" in _cached_resume_ctype:
-                    ext = mimetypes.guess_extension(_cached_resume_ctype.split(";")[0].strip()) or ".pdf"
-                    filename += ext
-
-                # Infer MIME type
-                ctype_clean = (_cached_resume_ctype or "").split(";", 1)[0].strip()
-                if "/" in ctype_clean:
-                    main, sub = ctype_clean.split("/", 1)
-                else:
-                    main, sub = _infer_mime_type(filename)
-
-                part = MIMEBase(main, sub)
-                part.set_payload(data)
-                encoders.encode_base64(part)
-                part.add_header("Content-Disposition", f'attachment; filename="{filename}"')
-                msg.attach(part)
-            except Exception as e:
-                print(f"[{i}] Could not attach resume: {e}")
-
-        # --- Create Gmail draft ---
-        try:
-            raw = base64.urlsafe_b64encode(msg.as_bytes()).decode("utf-8")
-            draft = gmail.users().drafts().create(
+        # --- Attach resume if available (encoded once, before the loop) ---
+        if _resume_part is not None:
+            msg.attach(_resume_part)
+
+        pending_drafts.append({
+            "index": i,
+            "contact": c,
+            "email": r,
+            "to": to_addr,
+            "body": body,
+            "raw": base64.urlsafe_b64encode(msg.as_bytes()).decode("utf-8"),
+        })
+
+    # --- Create Gmail drafts (batched) ---
+    if pending_drafts:
+        responses = _execute_gmail_requests(gmail, {
+            str(d["index"]): gmail.users().drafts().create(
                 userId="me",
-                body={"message": {"raw": raw}}
-            ).execute()
-            print(f"📤 [{i}] Draft created: {draft}")
-            draft_id = draft.get("id")
-            draft_ids.append(draft_id)
-            
+                body={"message": {"raw": d["raw"]}}
+            )
+            for d in pending_drafts
+        })
+        for d in pending_drafts:
+            draft, err = responses[str(d["index"])]
+            if err is not None or not draft:
+                print(f"❌ [{d['index']}] Draft creation failed for {d['to']}: {err}")
+                d["draft"] = None
+                continue
+            print(f"📤 [{d['index']}] Draft created: {draft}")
+            d["draft"] = draft
             # Extract message ID and threadId from draft (Gmail creates a thread when draft is created)
-            message_id = draft.get("message", {}).get("id")
-            thread_id = draft.get("message", {}).get("threadId")
-            
-            if not message_id or not thread_id:
-                # If message ID or threadId not in draft response, get it from the draft message
-                try:
-                    draft_message = gmail.users().drafts().get(userId="me", id=draft_id, format="full").execute()
-                    if not message_id:
-                        message_id = draft_message.get("message", {}).get("id")
-                    if not thread_id:
-                        thread_id = draft_message.get("message", {}).get("threadId")
-                except Exception as e:
-                    print(f"⚠️ [{i}] Could not get message/threadId from draft: {e}")
+            d["message_id"] = draft.get("message", {}).get("id")
+            d["thread_id"] = draft.get("message", {}).get("threadId")
+
+        # If message ID or threadId not in draft response, get them from the
+        # draft messages in a second batched pass.
+        missing = {
+            str(d["index"]): gmail.users().drafts().get(userId="me", id=d["draft"].get("id"), format="minimal")
+            for d in pending_drafts
+            if d["draft"] and not (d["message_id"] and d["thread_id"])
+        }
+        if missing:
+            lookups = _execute_gmail_requests(gmail, missing)
+            for d in pending_drafts:
+                rid = str(d["index"])
+                if rid not in lookups:
+                    continue
+                draft_message, err = lookups[rid]
+                if err is not None or not draft_message:
+                    print(f"⚠️ [{d['index']}] Could not get message/threadId from draft: {err}")
+                    continue
+                if not d["message_id"]:
+                    d["message_id"] = draft_message.get("message", {}).get("id")
+                if not d["thread_id"]:
+                    d["thread_id"] = draft_message.get("message", {}).get("threadId")
+
+        for d in pending_drafts:
+            if not d["draft"]:
+                continue
+            i, c, r = d["index"], d["contact"], d["email"]
+            draft_id = d["draft"].get("id")
+            message_id = d["message_id"]
+            thread_id = d["thread_id"]
+            draft_ids.append(draft_id)
 
             # Use message ID format for more reliable draft URL (Option A from fix doc)
             # Format: https://mail.google.com/mail/u/0/#drafts?compose=<messageId>
@@ -711,7 +844,7 @@ def generate_and_draft():
 
             created.append({
                 "index": i,
-                "to": to_addr,
+                "to": d["to"],
                 "draftId": draft_id,
                 "messageId": message_id,
                 "threadId": thread_id,
@@ -722,72 +855,54 @@ def generate_and_draft():
                 "activelyHiring": c.get("_actively_hiring"),
                 "recentHiringSignal": c.get("_recent_hiring_signal"),
             })
-            
+
             # Save/update contact in Firestore with draft info (even if no threadId yet)
             # Drafts may not have threadId until they're sent or replied to
-            try:
-                contacts_ref = db.collection("users").document(uid).collection("contacts")
-                # Find existing contact by email (normalized to lowercase)
-                to_addr_clean = (to_addr or "").strip().lower()
-                existing_contacts = list(contacts_ref.where("email", "==", to_addr_clean).limit(1).stream())
-                
-                contact_data = {
-                    "gmailDraftId": draft_id,
-                    "gmailMessageId": message_id,  # Save message ID for more reliable URL
-                    "gmailDraftUrl": gmail_url,
-                    "emailSubject": r["subject"],
-                    "emailBody": body,
-                    "draftToEmail": to_addr_clean,
-                    "draftCreatedAt": datetime.utcnow().isoformat(),
-                    "emailGeneratedAt": datetime.utcnow().isoformat(),
-                    "lastActivityAt": datetime.utcnow().isoformat(),
-                    "hasUnreadReply": False,
-                    "draftStillExists": True,
-                    "updatedAt": datetime.utcnow().isoformat(),
-                    "pipelineStage": "draft_created",
-                    "inOutbox": True,
-                }
+            to_addr_clean = (d["to"] or "").strip().lower()
+            contact_data = {
+                "gmailDraftId": draft_id,
+                "gmailMessageId": message_id,  # Save message ID for more reliable URL
+                "gmailDraftUrl": gmail_url,
+                "emailSubject": r["subject"],
+                "emailBody": d["body"],
+                "draftToEmail": to_addr_clean,
+                "draftCreatedAt": datetime.utcnow().isoformat(),
+                "emailGeneratedAt": datetime.utcnow().isoformat(),
+                "lastActivityAt": datetime.utcnow().isoformat(),
+                "hasUnreadReply": False,
+                "draftStillExists": True,
+                "updatedAt": datetime.utcnow().isoformat(),
+                "pipelineStage": "draft_created",
+                "inOutbox": True,
+            }
 
-                # Store personalization metadata, word count, lead-hook usage,
-                # and contact identity fields (shared with the fallback branch
-                # below via _base_contact_fields).
-                # New fields (leadType, commonalityTypes, warmthTierFinal, wordCountFinal,
-                # leadHookUsedInBody) added 2026-04-28. Old contacts only have
-                # personalizationLabel + personalizationType. No backfill — filter
-                # analysis by emailGeneratedAt >= 2026-04-28 for clean P0 measurement.
-                contact_data.update(_base_contact_fields(r, c, body))
-
-                # Add threadId if we have it
-                if thread_id:
-                    contact_data["gmailThreadId"] = thread_id
-
-                if existing_contacts:
-                    # Update existing contact (same email = one contact doc)
-                    contact_doc = existing_contacts[0]
-                    contact_doc.reference.update(contact_data)
-                    print(f"✅ [{i}] Updated contact {contact_doc.id} with draftId {draft['id']}" + (f" and threadId {thread_id}" if thread_id else ""))
-                else:
-                    # Create new contact only when no existing contact with this email
-                    contact_data["email"] = to_addr_clean
-                    contact_data["createdAt"] = datetime.utcnow().isoformat()
-                    new_contact_ref = contacts_ref.document()
-                    new_contact_ref.set(contact_data)
-                    print(f"✅ [{i}] Created new contact {new_contact_ref.id} with draftId {draft['id']}" + (f" and threadId {thread_id}" if thread_id else ""))
-
-                # Persist warmth tier + seniority bucket for Phase 2 aggregation.
-                # warmth_data is keyed by index within contacts_needing_emails,
-                # but we also need to handle contacts_with_emails (no warmth data).
-                _w_info = warmth_data.get(i) if warmth_data else None
-                _persist_warmth_on_send(
-                    db, uid, to_addr_clean, _w_info,
-                    c.get("Title") or c.get("jobTitle") or "",
-                )
-            except Exception as e:
-                print(f"⚠️ [{i}] Failed to save contact to Firestore: {e}")
-                import traceback
-                traceback.print_exc()
+            # Store personalization metadata, word count, lead-hook usage,
+            # and contact identity fields (shared with the fallback branch
+            # above via _base_contact_fields).
+            # New fields (leadType, commonalityTypes, warmthTierFinal, wordCountFinal,
+            # leadHookUsedInBody) added 2026-04-28. Old contacts only have
+            # personalizationLabel + personalizationType. No backfill — filter
+            # analysis by emailGeneratedAt >= 2026-04-28 for clean P0 measurement.
+            contact_data.update(_base_contact_fields(r, c, d["body"]))
+
+            # Add threadId if we have it
+            if thread_id:
+                contact_data["gmailThreadId"] = thread_id
+
+            # Warmth tier + seniority bucket for Phase 2 aggregation.
+            # warmth_data is keyed by index within contacts_needing_emails,
+            # but we also need to handle contacts_with_emails (no warmth data).
+            _w_info = warmth_data.get(i) if warmth_data else None
+            contact_data.update(_warmth_fields(_w_info, c.get("Title") or c.get("jobTitle") or ""))
+            contact_writes.append((to_addr_clean, contact_data))
+
+    if contact_writes:
+        try:
+            _save_drafted_contacts(db, uid, contact_writes)
         except Exception as e:
-            print(f"❌ [{i}] Draft creation failed for {to_addr}: {e}")
+            print(f"⚠️ Failed to save drafted contacts to Firestore: {e}")
+            import traceback
+            traceback.print_exc()
 
     skipped_count = len(contacts) - len(created)
     return jsonify({
@@ -819,7 +934,7 @@ def download_eml():
         return jsonify({"error": "to, subject and body are required"}), 400
 
     db = get_db()
-    user_data = (db.collection("users").document(uid).get().to_dict() or {})
+    user_data = (get_request_user_doc(uid, db).to_dict() or {})
 
     resume_bytes = None
     resume_ctype = None
@@ -1138,7 +1253,9 @@ def _mark_contact_sent_by_draft(uid, draft_id, message_id, thread_id):
             update["gmailMessageId"] = message_id
         if thread_id:
             update["gmailThreadId"] = thread_id
+        before = matches[0].to_dict() or {}
         matches[0].reference.update(update)
+        record_contact_change(uid, matches[0].id, before, apply_contact_update(before, update), db)
     except Exception as exc:
         import logging
         logging.getLogger("emails").warning(
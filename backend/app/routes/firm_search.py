@@ -12,6 +12,7 @@ import time
 import traceback
 
 from app.extensions import get_db, require_firebase_auth, require_tier
+from app.utils.auth_context import get_request_user_doc
 from app.services.company_search import (
     search_firms,
     get_available_industries,
@@ -54,11 +55,12 @@ def company_batch_cap_for_tier(tier):
 firm_search_bp = Blueprint('firm_search', __name__, url_prefix='/api/firm-search')
 
 
-def get_user_credits_and_tier(db, uid):
-    """Get user's current credits and tier."""
+def get_user_credits_and_tier(db, uid, fresh=False):
+    """Get user's current credits and tier. fresh=True skips the request's
+    cached user doc (e.g. to re-check the balance after a failed deduction)."""
     try:
         user_ref = db.collection('users').document(uid)
-        user_doc = user_ref.get()
+        user_doc = user_ref.get() if fresh else get_request_user_doc(uid, db)
         
         if user_doc.exists:
             user_data = user_doc.to_dict()
@@ -233,7 +235,7 @@ def search_firms_route():
         success, new_credit_balance = deduct_credits_atomic(uid, actual_credits_to_charge, "firm_search")
         if not success:
             # If deduction failed, user may have spent credits elsewhere
-            current_credits, _, _ = get_user_credits_and_tier(db, uid)
+            current_credits, _, _ = get_user_credits_and_tier(db, uid, fresh=True)
             raise InsufficientCreditsError(actual_credits_to_charge, current_credits)
         
         # Save to history
@@ -506,7 +508,7 @@ def search_firms_async():
                 if not ok:
                     fail_search_progress(search_id, "Insufficient credits")
                     # Re-fetch actual balance instead of using stale pre-flight snapshot
-                    current_balance, _, _ = get_user_credits_and_tier(db, uid)
+                    current_balance, _, _ = get_user_credits_and_tier(db, uid, fresh=True)
                     _store_async_result(search_id, {
                         'success': False,
                         'error': 'Insufficient credits',
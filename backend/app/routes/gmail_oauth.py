@@ -12,6 +12,7 @@ from app.config import GMAIL_SCOPES, OAUTH_REDIRECT_URI, get_frontend_redirect_u
 from ..extensions import require_firebase_auth
 from app.services.gmail_client import _gmail_client_config, _save_user_gmail_creds, _load_user_gmail_creds, _gmail_service
 from ..extensions import get_db
+from ..utils.auth_context import get_request_user_doc
 
 gmail_oauth_bp = Blueprint('gmail_oauth', __name__, url_prefix='/api/google')
 
@@ -100,7 +101,7 @@ def google_oauth_start():
     # This ensures we use the correct email for the logged-in user
     user_email = None
     try:
-        user_doc = db.collection("users").document(uid).get()
+        user_doc = get_request_user_doc(uid, db)
         if user_doc.exists:
             user_data = user_doc.to_dict() or {}
             user_email = user_data.get("email")
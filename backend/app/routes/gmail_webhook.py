@@ -18,6 +18,7 @@ from google.cloud.firestore_v1 import ArrayUnion, transactional
 
 from app.config import GMAIL_WEBHOOK_SECRET
 from app.extensions import get_db
+from app.services.dashboard_aggregates import apply_contact_update, record_contact_change
 from app.services.gmail_client import (
     find_uid_by_gmail_address,
     get_gmail_service_for_user,
@@ -509,6 +510,7 @@ def _process_gmail_notification(email_address, history_id):
 
                 logger.info(f"[gmail_webhook] uid={uid} contact_id={contact_doc.id} UPDATING sent message: stage draft_created->waiting_on_reply, fields={list(update_fields.keys())}")
                 contact_ref.update(update_fields)
+                record_contact_change(uid, contact_doc.id, contact_data, apply_contact_update(contact_data, update_fields), db)
 
                 # Metrics: email_actually_sent
                 try:
@@ -665,6 +667,7 @@ def _process_gmail_notification(email_address, history_id):
             updates = _build_reply_updates(contact_data, message_snippet, now_iso)
             logger.info(f"[gmail_webhook] uid={uid} contact_id={contact_id} UPDATING reply: stage->replied, hasUnreadReply->True, fields={list(updates.keys())}")
             contact_ref.update(updates)
+            record_contact_change(uid, contact_id, contact_data, apply_contact_update(contact_data, updates), db)
 
             # Metrics: reply_received
             try:
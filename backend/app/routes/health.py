@@ -1,10 +1,12 @@
 """
 Health check routes
 """
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify
 from app.services.gmail_client import get_gmail_service
 import firebase_admin
 from app.extensions import get_db
+from app.utils.auth_context import auth_cache_stats
+from app.utils.lazy_blueprints import route_load_failures
 
 health_bp = Blueprint('health', __name__)
 
@@ -41,8 +43,11 @@ def health():
     except Exception:
         gmail_available = False
     
+    failed_routes = route_load_failures(current_app)
+
     return jsonify({
-        'status': 'healthy',
+        'status': 'unhealthy' if failed_routes else 'healthy',
+        'failed_route_modules': failed_routes,
         'tiers': ['free', 'pro'],
         'email_system': 'interesting_mutual_interests_v2',
         'services': {
@@ -53,11 +58,15 @@ def health():
                 'status': firebase_status,
                 'error': firebase_error
             }
-        }
-    })
+        },
+        'auth_cache': auth_cache_stats(),
+    }), 503 if failed_routes else 200
 
 
 @health_bp.get("/healthz")
 def healthz():
     """Kubernetes health check endpoint"""
+    failed_routes = route_load_failures(current_app)
+    if failed_routes:
+        return jsonify({"status": "unhealthy", "failed_route_modules": failed_routes}), 503
     return jsonify({"status": "ok"}), 200
@@ -14,6 +14,7 @@ import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse, parse_qs
 
@@ -27,6 +28,7 @@ from app.services.openai_client import get_async_openai_client, get_openai_clien
 from app.services.ats_scorer import calculate_ats_score
 from app.services.recruiter_finder import find_recruiters, determine_job_type, find_hiring_manager
 from app.utils.users import get_outreach_email
+from app.utils.auth_context import get_request_user_doc, invalidate_request_user_doc
 from app.services.resume_optimizer_v2 import optimize_resume_v2 as run_resume_optimization
 from app.services.career_stage import (
     derive_career_stage,
@@ -108,6 +110,8 @@ def _set_cached_user_profile(uid: str, profile: dict):
 def _clear_user_profile_cache(uid: Optional[str] = None):
     """Clear user profile cache. If uid is None, clear all."""
     if uid:
+        # The profile is rebuilt from the request's users/{uid} snapshot.
+        invalidate_request_user_doc(uid)
         if uid in _user_profile_cache:
             del _user_profile_cache[uid]
             logger.info(f"[JobBoard]  Cleared cache for {uid[:8]}...")
@@ -962,8 +966,7 @@ def get_user_career_profile(uid: str) -> dict:
         return {}
     
     try:
-        user_ref = db.collection("users").document(uid)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(uid, db)
         
         if not user_doc.exists:
             return {}
@@ -2787,6 +2790,72 @@ METRO_AREAS = {
     },
 }
 
+# -----------------------------------------------------------------------------
+# Location index
+# -----------------------------------------------------------------------------
+# Dedup and the location gate run over hundreds of jobs per search and
+# thousands per feed rerank. Scanning METRO_AREAS per job made that
+# O(jobs x metros); these are built once at import instead.
+
+# Member city -> the metro's city name ("Palo Alto" -> "San Francisco").
+# A city listed under two metros keeps the first, matching the old scan order.
+def _build_city_to_metro_city() -> Dict[str, str]:
+    index: Dict[str, str] = {}
+    for metro_name, metro_cities in METRO_AREAS.items():
+        for city in metro_cities:
+            index.setdefault(city, metro_name.split(",")[0].strip())
+    return index
+
+
+_CITY_TO_METRO_CITY = _build_city_to_metro_city()
+
+# Metro -> lowercased "greater <city> area" phrase for the location gate.
+_METRO_GREATER_AREA = {
+    metro: f"greater {metro.split(',')[0].lower()} area" for metro in METRO_AREAS
+}
+
+_CITY_ABBREVS = {
+    "nyc": "new york",
+    "sf": "san francisco",
+    "la": "los angeles",
+}
+
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=8192)
+def _job_city_from_location(location: str) -> Optional[str]:
+    """City part of a job location: text before the first comma, else the
+    first word. None for empty input."""
+    if not location:
+        return None
+    if "," in location:
+        return location.split(",")[0].strip()
+    words = location.split()
+    return words[0].strip() if words else None
+
+
+@lru_cache(maxsize=8192)
+def canonical_job_city(location: str) -> Optional[str]:
+    """Fingerprint city for a (stripped) job location: the metro's city when
+    the job's city belongs to a metro, otherwise the city as-is."""
+    city = _job_city_from_location(location)
+    if not city:
+        return None
+    return _CITY_TO_METRO_CITY.get(city, city)
+
+
+@lru_cache(maxsize=16384)
+def _normalize_fingerprint_part(s: str) -> str:
+    """Lowercase, strip punctuation, collapse whitespace."""
+    if not s:
+        return ""
+    s = s.lower().strip()
+    s = _PUNCT_RE.sub('', s)
+    s = _WHITESPACE_RE.sub(' ', s)
+    return s.strip()
+
 
 def _infer_job_domain(job: dict, intent_contract: dict) -> Optional[str]:
     """
@@ -3005,19 +3074,11 @@ def apply_hard_gate_location(job: dict, intent_contract: dict) -> Tuple[bool, st
     if job_remote or "remote" in job_location_raw.lower():
         return True, "remote_job"
     
-    # PHASE 4A: Extract job city from location string
-    job_city = None
+    # PHASE 4A: Extract job city from location string ("City, State" or
+    # first word)
+    job_city = _job_city_from_location(job_location_raw)
     job_loc_lower = job_location_raw.lower()
     
-    # Handle "City, State" format
-    if "," in job_location_raw:
-        job_city = job_location_raw.split(",")[0].strip()
-    else:
-        # Try to extract city name (first word or two)
-        words = job_location_raw.split()
-        if len(words) >= 1:
-            job_city = words[0]  # Take first word as city
-    
     # Check if job location matches any preferred location (exact or partial)
     for pref_loc in preferred_locations:
         pref_loc_lower = pref_loc.lower()
@@ -3035,8 +3096,7 @@ def apply_hard_gate_location(job: dict, intent_contract: dict) -> Tuple[bool, st
                 return True, f"location_metro_match:job_city={job_city},metro={pref_loc}"
             
             # Check if job location mentions "Greater [Metro] Area"
-            metro_name = pref_loc.split(",")[0]  # Extract city name from "City, State"
-            if f"greater {metro_name.lower()} area" in job_loc_lower:
+            if _METRO_GREATER_AREA[pref_loc] in job_loc_lower:
                 logger.info(f"[Location] job_location={job_location_raw} matched metro={pref_loc} (Greater Area)")
                 return True, f"location_metro_greater_area:metro={pref_loc}"
         
@@ -3052,12 +3112,7 @@ def apply_hard_gate_location(job: dict, intent_contract: dict) -> Tuple[bool, st
                 return True, f"location_partial_match:{pref_loc}"
         
         # Handle common city abbreviations
-        city_abbrevs = {
-            "nyc": "new york",
-            "sf": "san francisco",
-            "la": "los angeles",
-        }
-        for abbrev, full_name in city_abbrevs.items():
+        for abbrev, full_name in _CITY_ABBREVS.items():
             if abbrev in pref_loc_lower and full_name in job_loc_lower:
                 return True, f"location_abbrev_match:{pref_loc}"
             if abbrev in job_loc_lower and full_name in pref_loc_lower:
@@ -3842,56 +3897,29 @@ def compute_job_fingerprint(job: dict) -> Optional[str]:
     if not company_name or not job_title:
         return None
     
-    # Extract city from location string
-    city = None
-    if location:
-        # Handle "City, State" format
-        if "," in location:
-            city = location.split(",")[0].strip()
-        else:
-            # Take first word as city
-            words = location.split()
-            if words:
-                city = words[0].strip()
-    
-    # Normalize city to metro if available
-    normalized_city = None
-    if city:
-        # Check if city is in any metro area and normalize to metro name
-        for metro_name, metro_cities in METRO_AREAS.items():
-            if city in metro_cities:
-                # Extract city name from metro (e.g., "San Francisco, CA" -> "San Francisco")
-                metro_city = metro_name.split(",")[0].strip()
-                normalized_city = metro_city
-                break
-        
-        # If not in a metro area, use the city as-is
-        if not normalized_city:
-            normalized_city = city
-    
-    # Normalize inputs: lowercase, strip whitespace, remove punctuation
-    def normalize_string(s: str) -> str:
-        if not s:
-            return ""
-        # Lowercase and strip
-        s = s.lower().strip()
-        # Remove punctuation (keep alphanumeric and spaces)
-        s = re.sub(r'[^\w\s]', '', s)
-        # Normalize whitespace (multiple spaces to single space)
-        s = re.sub(r'\s+', ' ', s)
-        return s.strip()
-    
-    normalized_company = normalize_string(company_name)
-    normalized_title = normalize_string(job_title)
-    normalized_city_str = normalize_string(normalized_city) if normalized_city else ""
-    
+    return _fingerprint_hash(company_name, job_title, location)
+
+
+@lru_cache(maxsize=8192)
+def _fingerprint_hash(company_name: str, job_title: str, location: str) -> str:
+    # City normalized to its metro via the precomputed location index
+    # (e.g. "Palo Alto, CA" -> "San Francisco"); non-metro cities as-is.
+    normalized_city = canonical_job_city(location)
+
+    normalized_company = _normalize_fingerprint_part(company_name)
+    normalized_title = _normalize_fingerprint_part(job_title)
+    normalized_city_str = _normalize_fingerprint_part(normalized_city) if normalized_city else ""
+
     # Create fingerprint: "company|title|city"
     fingerprint_string = f"{normalized_company}|{normalized_title}|{normalized_city_str}"
-    
-    # Generate SHA-256 hash
-    fingerprint_hash = hashlib.sha256(fingerprint_string.encode('utf-8')).hexdigest()
-    
-    return fingerprint_hash
+    return hashlib.sha256(fingerprint_string.encode('utf-8')).hexdigest()
+
+
+def compute_job_fingerprints(jobs: List[dict]) -> List[Optional[str]]:
+    """Batch form of compute_job_fingerprint: one fingerprint (or None) per
+    job, in order. Repeated company/title/location triples (the same posting
+    from several sources) hit the fingerprint memo instead of re-hashing."""
+    return [compute_job_fingerprint(job) for job in jobs]
 
 
 def deduplicate_jobs(jobs: List[dict]) -> Tuple[List[dict], dict]:
@@ -3917,9 +3945,7 @@ def deduplicate_jobs(jobs: List[dict]) -> Tuple[List[dict], dict]:
     fingerprint_groups: Dict[str, List[Tuple[dict, int]]] = {}  # (job, original_index)
     jobs_without_fingerprint: List[dict] = []
     
-    for idx, job in enumerate(jobs):
-        fingerprint = compute_job_fingerprint(job)
-        
+    for idx, (job, fingerprint) in enumerate(zip(jobs, compute_job_fingerprints(jobs))):
         # Skip if fingerprint computation failed (missing required fields)
         if not fingerprint:
             # Fail-safe: include job if fingerprint can't be computed
@@ -4688,8 +4714,8 @@ def get_or_cache_sanitized_resume(user_id: str, raw_resume: Dict[str, Any], db)
         JSON string of sanitized resume, or None if caching disabled
     """
     try:
-        user_ref = db.collection("users").document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
+        user_ref = user_doc.reference
         
         if not user_doc.exists:
             return None
@@ -4737,6 +4763,7 @@ def get_or_cache_sanitized_resume(user_id: str, raw_resume: Dict[str, Any], db)
                 "resumeParsedSanitized": resume_json,
                 "resumeParsedHash": resume_hash
             })
+            invalidate_request_user_doc(user_id)
             logger.info(f"[JobBoard]  Cached sanitized resume")
         except Exception as cache_error:
             logger.error(f"[JobBoard]  Failed to cache sanitized resume: {cache_error}")
@@ -6958,8 +6985,8 @@ def optimize_resume():
                 "credits_refunded": False
             }), 500
             
-        user_ref = db.collection("users").document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
+        user_ref = user_doc.reference
         
         if not user_doc.exists:
             return jsonify({
@@ -7334,7 +7361,7 @@ def get_resume_capabilities_endpoint():
         uid = request.firebase_user.get('uid')
         
         db = get_db()
-        user_doc = db.collection('users').document(uid).get()
+        user_doc = get_request_user_doc(uid, db)
         
         if not user_doc.exists:
             return jsonify({"error": "User not found"}), 404
@@ -7468,8 +7495,8 @@ def optimize_resume_v2():
         if not db:
             return jsonify({"error": "Database not available"}), 500
         
-        user_ref = db.collection("users").document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
+        user_ref = user_doc.reference
         
         if not user_doc.exists:
             return jsonify({"error": "User not found"}), 404
@@ -7950,8 +7977,8 @@ def find_recruiter_endpoint():
         if not db:
             return jsonify({"error": "Database not available"}), 500
             
-        user_ref = db.collection('users').document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
+        user_ref = user_doc.reference
         
         if not user_doc.exists:
             return jsonify({"error": "User not found"}), 404
@@ -8516,8 +8543,8 @@ def find_employee_endpoint():
             }), 422
 
         # Credits.
-        user_ref = db.collection('users').document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
+        user_ref = user_doc.reference
         if not user_doc.exists:
             return jsonify({"error": "User not found"}), 404
 
@@ -8983,8 +9010,8 @@ def find_hiring_manager_endpoint():
         if not db:
             return jsonify({"error": "Database not available"}), 500
             
-        user_ref = db.collection('users').document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
+        user_ref = user_doc.reference
         
         if not user_doc.exists:
             return jsonify({"error": "User not found"}), 404
@@ -9434,8 +9461,8 @@ def generate_cover_letter():
         if not db:
             return jsonify({"error": "Database not available"}), 500
             
-        user_ref = db.collection("users").document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
+        user_ref = user_doc.reference
         
         if not user_doc.exists:
             return jsonify({"error": "User not found"}), 404
@@ -9590,7 +9617,7 @@ def generate_cover_letter_pdf_endpoint():
             user_id = request.firebase_user.get("uid")
             db = get_db()
             if db and user_id:
-                user_doc = db.collection("users").document(user_id).get()
+                user_doc = get_request_user_doc(user_id, db)
                 if user_doc.exists:
                     user_data = user_doc.to_dict() or {}
                     raw_resume = user_data.get("resumeParsed") or {}
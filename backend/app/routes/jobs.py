@@ -3,6 +3,7 @@ Jobs API routes, feed, search, feedback, and filters.
 """
 from flask import Blueprint, jsonify, request
 from backend.app.extensions import require_firebase_auth, get_db
+from backend.app.utils.auth_context import get_request_user_doc
 from backend.app.utils.job_ranking import (
     prefilter_candidates,
     rank_with_gpt,
@@ -327,7 +328,7 @@ def _get_feed_impl(_perf_t0=None):
 
     # Load user profile
     user_ref = db.collection("users").document(uid)
-    user_doc = user_ref.get()
+    user_doc = get_request_user_doc(uid, db)
     if not user_doc.exists:
         return jsonify({"error": "User not found"}), 404
 
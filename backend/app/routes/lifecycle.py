@@ -16,6 +16,7 @@ import logging
 from flask import Blueprint, request, jsonify, render_template_string
 
 from app.extensions import require_firebase_auth, get_db
+from app.utils.auth_context import get_request_user_doc
 from app.services.lifecycle_emails import (
     process_all_pending_emails,
     capture_pricing_lead,
@@ -149,7 +150,7 @@ def pricing_view():
         return jsonify({'ok': False, 'error': 'db_unavailable'}), 500
 
     try:
-        snap = db.collection('users').document(uid).get()
+        snap = get_request_user_doc(uid, db)
     except Exception as exc:
         logger.exception("pricing_view db read failed for uid=%s", uid)
         return jsonify({'ok': False, 'error': str(exc)}), 500
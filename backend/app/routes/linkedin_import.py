@@ -7,11 +7,13 @@ import re
 from datetime import datetime
 
 from ..extensions import require_firebase_auth, get_db
+from ..utils.auth_context import get_request_user_doc
 from ..config import PDL_BASE_URL, PEOPLE_DATA_LABS_API_KEY
 from ..services.reply_generation import batch_generate_emails, PURPOSES_INCLUDE_RESUME, email_body_mentions_resume, regenerate_with_feedback
 from ..utils.warmth_scoring import score_contacts_for_email
 from ..utils.users import get_outreach_email
 from ..services.gmail_client import create_gmail_draft_for_user, download_resume_from_url
+from ..services.dashboard_aggregates import record_contact_change
 from ..services.hunter import get_verified_email, get_smart_company_domain
 from ..services.pdl_client import _choose_best_email, _pdl_email_is_fresh
 from ..services.resume_parser import extract_text_from_pdf_bytes
@@ -475,7 +477,7 @@ def import_from_linkedin():
         print(f"[LinkedInImport] Step 5: Loading user data...")
         db = get_db()
         user_ref = db.collection('users').document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
         user_data = user_doc.to_dict() if user_doc.exists else {}
         user_profile = {
             'name': user_data.get('name', ''),
@@ -798,6 +800,7 @@ def import_from_linkedin():
         contacts_ref = db.collection('users').document(user_id).collection('contacts')
         doc_ref = contacts_ref.add(contact_data)
         contact_id = doc_ref[1].id
+        record_contact_change(user_id, contact_id, None, contact_data, db)
         print(f"[LinkedInImport]   - ✅ Contact saved with ID: {contact_id}")
         
         # Step 7: Deduct credit
@@ -18,7 +18,9 @@ import logging
 from flask import Blueprint, current_app, jsonify, request
 
 from app.extensions import get_db, require_firebase_auth
+from app.utils.auth_context import get_request_user_doc
 from app.services.agent_brief_parser import parse_brief
+from app.services.dashboard_aggregates import apply_contact_update, record_contact_change
 from app.services.loop_budget import (
     estimate_cycle_cost,
     usage_breakdown_this_month,
@@ -116,7 +118,7 @@ def _user_tier() -> str:
     if not db:
         return "free"
     try:
-        doc = db.collection("users").document(uid).get()
+        doc = get_request_user_doc(uid, db)
         if not doc.exists:
             return "free"
         data = doc.to_dict() or {}
@@ -351,7 +353,7 @@ def approve_contact_send(loop_id, contact_id):
         }), 400
 
     # 3. Load user state for the gate (timezone).
-    user_snap = db.collection("users").document(uid).get()
+    user_snap = get_request_user_doc(uid, db)
     user_data = (user_snap.to_dict() or {}) if user_snap.exists else {}
     user_tz = user_data.get("timezone") or user_data.get("tz")
 
@@ -448,6 +450,7 @@ def approve_contact_send(loop_id, contact_id):
         "autoSendError": _fs.DELETE_FIELD,
     })
     contact_ref.update(contact_update)
+    record_contact_change(uid, contact_id, contact, apply_contact_update(contact, contact_update), db)
 
     # 8. Atomically bump the Loop's first-N counter. Increment lets two
     #    parallel approve-send calls both stick without read-modify-write
@@ -11,6 +11,7 @@ import logging
 from flask import Blueprint, jsonify, request
 
 from app.extensions import require_firebase_auth, get_db
+from app.utils.auth_context import get_request_user_doc
 
 logger = logging.getLogger(__name__)
 
@@ -149,7 +150,7 @@ def create_nudge_draft(nudge_id: str):
         import base64
         from email.mime.text import MIMEText
 
-        user_data = (db.collection("users").document(uid).get().to_dict() or {})
+        user_data = (get_request_user_doc(uid, db).to_dict() or {})
         user_email = user_data.get("email", "")
 
         gmail_service = get_gmail_service_for_user(user_email, user_id=uid)
@@ -22,6 +22,7 @@ from flask import Blueprint, jsonify, request
 
 from app.config import TIER_CONFIGS
 from app.extensions import get_db, require_firebase_auth
+from app.utils.auth_context import get_request_user_doc
 from app.services.queue_service import (
     QUEUE_GENERATION_CREDITS,
     VALID_DISMISS_REASONS,
@@ -43,7 +44,7 @@ queue_bp = Blueprint("queue", __name__, url_prefix="/api/queue")
 
 
 def _load_user_doc(db, uid: str) -> dict:
-    snap = db.collection("users").document(uid).get()
+    snap = get_request_user_doc(uid, db)
     return snap.to_dict() or {} if snap.exists else {}
 
 
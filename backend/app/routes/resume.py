@@ -16,6 +16,7 @@ from app.services.resume_scoring import MIN_JOB_DESCRIPTION_CHARS, score_resume_
 from ..extensions import require_firebase_auth
 from app.utils.users import parse_resume_info, validate_parsed_resume
 from ..extensions import get_db
+from ..utils.auth_context import get_request_user_doc
 
 resume_bp = Blueprint('resume', __name__, url_prefix='/api')
 
@@ -366,7 +367,7 @@ def delete_resume():
             return jsonify({'error': 'Database not available'}), 500
         
         user_ref = db.collection('users').document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
         
         if not user_doc.exists:
             return jsonify({'error': 'User not found'}), 404
@@ -493,7 +494,7 @@ def tailor_resume_route():
             return jsonify({'error': 'Provide a jobUrl or jobDescription.'}), 400
 
         user_ref = db.collection('users').document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
         if not user_doc.exists:
             return jsonify({'error': 'User not found'}), 404
 
@@ -639,7 +640,7 @@ def score_resume():
         if not parsed:
             user_data = {}
             if db:
-                user_doc = db.collection('users').document(uid).get()
+                user_doc = get_request_user_doc(uid, db)
                 user_data = user_doc.to_dict() or {}
             parsed = user_data.get('resumeParsed')
 
@@ -17,6 +17,7 @@ from app.services.resume_renderer import (
 from app.services.resume_capabilities import build_resume_metadata
 from app.routes.resume import save_resume_to_firebase
 from ..extensions import require_firebase_auth, get_db
+from ..utils.auth_context import get_request_user_doc
 
 resume_builder_bp = Blueprint('resume_builder', __name__, url_prefix='/api/resume-builder')
 
@@ -32,7 +33,7 @@ def _check_and_count_attempt(uid: str):
     """
     db = get_db()
     ref = db.collection('users').document(uid)
-    doc = ref.get()
+    doc = get_request_user_doc(uid, db)
     used = (doc.to_dict() or {}).get('resumeBuilderGenerations', 0) if doc.exists else 0
     if used >= GENERATION_CAP:
         return jsonify({
@@ -53,7 +54,7 @@ def _check_and_count_editor_attempt(uid: str):
 
     db = get_db()
     ref = db.collection('users').document(uid)
-    doc = ref.get()
+    doc = get_request_user_doc(uid, db)
     data = (doc.to_dict() or {}) if doc.exists else {}
     today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
     used = data.get('resumeEditorCount', 0) if data.get('resumeEditorDate') == today else 0
@@ -120,7 +121,7 @@ def current():
     resume: null when the user has no stored resume yet."""
     uid = request.firebase_user['uid']
     db = get_db()
-    doc = db.collection('users').document(uid).get()
+    doc = get_request_user_doc(uid, db)
     parsed = (doc.to_dict() or {}).get('resumeParsed') if doc.exists else None
     if not isinstance(parsed, dict) or not parsed:
         return jsonify({'success': True, 'resume': None, 'html': None})
@@ -142,7 +143,7 @@ def from_linkedin():
     if capped:
         return capped
     db = get_db()
-    doc = db.collection('users').document(uid).get()
+    doc = get_request_user_doc(uid, db)
     linkedin_parsed = (doc.to_dict() or {}).get('linkedinResumeParsed') if doc.exists else None
     if not linkedin_parsed or not linkedin_parsed.get('name'):
         return jsonify({'error': 'No LinkedIn profile data on file. Enrich first.'}), 400
@@ -10,9 +10,11 @@ from typing import Dict, Tuple, Optional
 from app.services.pdl_client import get_contact_identity, search_contacts_from_prompt
 from app.services.prompt_parser import parse_search_prompt_structured
 from app.services import coresignal_client
+from app.services.dashboard_aggregates import record_contact_changes
 from flask import Blueprint, request, jsonify
 
 from app.extensions import require_firebase_auth, get_db
+from app.utils.auth_context import get_request_user_doc
 from app.services.feature_flags import PDL_OUTAGE_ACTIVE
 from app.services.metering import attach_request_context, spend_summary, spend_by_user
 from app.services.reply_generation import batch_generate_emails, PURPOSES_INCLUDE_RESUME, email_body_mentions_resume, regenerate_with_feedback
@@ -22,6 +24,7 @@ from app.routes.gmail_oauth import build_gmail_oauth_url_for_user
 from app.services.auth import check_and_reset_credits, deduct_credits_atomic
 from app.config import TIER_CONFIGS, CREDIT_COSTS
 from app.utils.exceptions import OfferloopException, InsufficientCreditsError, ExternalAPIError
+from app.utils.scoring_profile import contact_features
 from app.utils.warmth_scoring import score_contacts_for_email, score_and_sort_contacts, build_briefing_line
 from app.utils.email_quality import check_email_quality, has_specificity_signal
 from app.services.email_request_builder import (
@@ -166,7 +169,7 @@ def prompt_search():
         if db and user_id:
             try:
                 user_ref = db.collection("users").document(user_id)
-                user_doc = user_ref.get()
+                user_doc = get_request_user_doc(user_id, db)
                 if user_doc.exists:
                     user_data = user_doc.to_dict()
                     # Firestore user doc is the source of truth for identity;
@@ -587,15 +590,21 @@ def prompt_search():
             except Exception as e:
                 print(f"[Runs] Could not download/extract resume: {e}")
 
-        # 1A: Score, sort by warmth (dream companies first), and attach fields
+        # 1A: Score, sort by warmth (dream companies first), and attach fields.
+        # One ContactFeatures per contact, shared with personalization below.
+        features = contact_features(contacts)
         try:
-            contacts = score_and_sort_contacts(user_profile, contacts, search_context=parsed_query_payload)
+            contacts = score_and_sort_contacts(
+                user_profile, contacts, search_context=parsed_query_payload, features=features
+            )
             warmth_data = {
                 i: {"tier": c.get("warmth_tier", ""), "score": c.get("warmth_score", 0), "label": c.get("warmth_label", ""), "signals": c.get("warmth_signals", [])}
                 for i, c in enumerate(contacts)
             }
         except Exception:
-            warmth_data = score_contacts_for_email(user_profile, contacts, search_context=parsed_query_payload)
+            warmth_data = score_contacts_for_email(
+                user_profile, contacts, search_context=parsed_query_payload, features=features
+            )
 
         # 1B: Attach briefing lines (deterministic, no LLM)
         for contact in contacts:
@@ -628,6 +637,7 @@ def prompt_search():
                     warmth_data=warmth_data,
                     uid=user_id,
                     enrichment_data=enrichment_data,
+                    contact_features=features,
                 )
             except Exception as e:
                 print(f"[Runs] Email generation failed (prompt-search): {e}")
@@ -932,6 +942,7 @@ def prompt_search():
                 today = datetime.now().strftime("%m/%d/%Y")
                 saved_count = 0
                 skipped_count = 0
+                agg_changes = []
                 for contact in contacts:
                     if _contact_already_exists(contact, existing_emails_set, existing_name_company_set, existing_linkedins_set):
                         skipped_count += 1
@@ -1025,7 +1036,8 @@ def prompt_search():
                         contact_doc["draftToEmail"] = contact.get("_sentRecipientEmail") or contact_doc["draftToEmail"]
                         if contact.get("gmailThreadId"):
                             contact_doc["gmailThreadId"] = contact["gmailThreadId"]
-                    contacts_ref.add(contact_doc)
+                    doc_ref = contacts_ref.add(contact_doc)
+                    agg_changes.append((doc_ref[1].id, None, contact_doc))
                     saved_count += 1
                     # Avoid duplicates within same batch
                     if email:
@@ -1034,6 +1046,7 @@ def prompt_search():
                         existing_linkedins_set.add(linkedin)
                     if first_name and last_name and company:
                         existing_name_company_set.add(f"{first_name}_{last_name}_{company}".lower().strip())
+                record_contact_changes(user_id, agg_changes, db)
                 print(f"✅ Prompt-search: saved {saved_count} new contacts to Firestore, skipped {skipped_count} duplicates")
             except Exception as save_error:
                 print(f"⚠️ Error saving contacts (prompt-search): {save_error}")
@@ -33,6 +33,7 @@ from typing import Optional
 from flask import Blueprint, request, jsonify
 
 from app.extensions import require_firebase_auth, get_db
+from app.utils.auth_context import get_request_user_doc
 from app.config import TIER_CONFIGS
 from app.services.auth import check_and_reset_credits, deduct_credits_atomic
 from app.services.pdl_client import get_contact_identity, search_contacts_from_prompt
@@ -281,7 +282,7 @@ def find_similar():
         if db and user_id:
             try:
                 user_ref = db.collection("users").document(user_id)
-                user_doc = user_ref.get()
+                user_doc = get_request_user_doc(user_id, db)
                 if user_doc.exists:
                     user_data = user_doc.to_dict()
                     credits_available = check_and_reset_credits(user_ref, user_data)
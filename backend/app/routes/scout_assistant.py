@@ -9,7 +9,6 @@ import asyncio
 import json
 import os
 import queue
-import threading
 
 from flask import Blueprint, jsonify, request, g, Response
 from cachetools import TTLCache
@@ -20,7 +19,8 @@ from app.services.scout.chat_persistence import (
     list_chats as chat_list_chats,
 )
 from app.extensions import require_firebase_auth, get_db
-from app.utils.async_runner import run_async
+from app.utils.auth_context import get_request_user_doc
+from app.utils.async_runner import run_async, submit
 
 scout_assistant_bp = Blueprint("scout_assistant", __name__, url_prefix="/api/scout-assistant")
 
@@ -37,7 +37,7 @@ _user_context_cache = TTLCache(maxsize=500, ttl=60)
 
 
 def _sse_stream_from_queue(q, heartbeat_interval_s: float = 15.0,
-                            real_timeout_s: float = 180.0):
+                            real_timeout_s: float = 180.0, on_close=None):
     """Yield SSE frames from a thread-safe queue with keepalive heartbeats.
 
     Browsers and proxies drop SSE connections after ~60s of idle. We poll the
@@ -49,7 +49,9 @@ def _sse_stream_from_queue(q, heartbeat_interval_s: float = 15.0,
     common case, this is the safety net.
 
     Stops when the producer puts `None` on the queue, when the client
-    disconnects (GeneratorExit), or on real timeout.
+    disconnects (GeneratorExit), or on real timeout. `on_close` runs on every
+    exit so the producer task can be cancelled instead of outliving the
+    connection.
     """
     elapsed_silence_s = 0.0
     try:
@@ -73,6 +75,67 @@ def _sse_stream_from_queue(q, heartbeat_interval_s: float = 15.0,
             yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
     except GeneratorExit:
         return
+    finally:
+        if on_close is not None:
+            on_close()
+
+
+class _SSEWriter:
+    """asyncio.Queue-shaped front for the thread-safe SSE queue.
+
+    Producers run on the shared loop, so `put` must never block: the queue is
+    unbounded (a stream's output is capped by the model's max tokens) and
+    writes after the client has gone are dropped.
+    """
+
+    def __init__(self, q: "queue.Queue"):
+        self._q = q
+        self.closed = False
+
+    async def put(self, item) -> None:
+        self.put_nowait(item)
+
+    def put_nowait(self, item) -> None:
+        if not self.closed:
+            self._q.put_nowait(item)
+
+
+def _sse_response(produce, error_message: str = "Something went wrong"):
+    """Run `produce(writer)` as a task on the shared async loop and stream
+    what it writes as SSE.
+
+    No thread or event loop is created per stream; the request thread only
+    drains the queue. A producer crash becomes an `error` event, the stream
+    always ends with `None`, and a client disconnect cancels the producer.
+    """
+    q: queue.Queue = queue.Queue()
+    writer = _SSEWriter(q)
+
+    async def _main():
+        try:
+            await produce(writer)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            print(f"[ScoutAssistant] Stream producer error: {exc}")
+            writer.put_nowait({"event": "error", "data": {"message": error_message}})
+        finally:
+            writer.put_nowait(None)
+
+    future = submit(_main())
+
+    def _close():
+        writer.closed = True
+        future.cancel()
+
+    return Response(
+        _sse_stream_from_queue(q, on_close=_close),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
 
 
 def _resume_to_text(user_data: dict) -> str:
@@ -144,7 +207,7 @@ def _fetch_user_context(uid: str) -> dict:
     db = get_db()
     user_data = {}
     try:
-        user_doc = db.collection("users").document(uid).get()
+        user_doc = get_request_user_doc(uid, db)
         if user_doc.exists:
             user_data = user_doc.to_dict() or {}
     except Exception as e:
@@ -546,6 +609,7 @@ def scout_assistant_briefing_stream():
     # Lazy imports: keep the module import cycle clean and let the route file
     # boot even when the LLM/Apify deps are unavailable in some environments.
     from app.services.openai_client import create_async_openai_client
+    from app.utils.async_runner import shared_loop_resource
     from app.services.scout.profile_coverage import compute_coverage
     from app.services.scout.strategist import build_strategist_prompt
     from app.services.scout import strategy as strategy_mod
@@ -591,119 +655,97 @@ def scout_assistant_briefing_stream():
         tier=tier,
     )
 
-    q: queue.Queue = queue.Queue(maxsize=200)
-
-    def _run_streaming():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            async def _run():
-                client = create_async_openai_client()
-                if client is None:
-                    q.put({
-                        "event": "error",
-                        "data": {"message": "OpenAI client not configured."},
-                    })
-                    return
+    async def _produce(out):
+        async def _run():
+            client = shared_loop_resource("openai", create_async_openai_client)
+            if client is None:
+                await out.put({
+                    "event": "error",
+                    "data": {"message": "OpenAI client not configured."},
+                })
+                return
 
-                accumulated_parts: list[str] = []
-                try:
-                    stream = await client.chat.completions.create(
-                        model=_BRIEFING_MODEL,
-                        temperature=_BRIEFING_TEMPERATURE,
-                        max_tokens=_BRIEFING_MAX_OUTPUT_TOKENS,
-                        messages=[
-                            {"role": "system", "content": system_prompt},
+            accumulated_parts: list[str] = []
+            try:
+                stream = await client.chat.completions.create(
+                    model=_BRIEFING_MODEL,
+                    temperature=_BRIEFING_TEMPERATURE,
+                    max_tokens=_BRIEFING_MAX_OUTPUT_TOKENS,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {
+                            "role": "user",
+                            "content": (
+                                "Produce my briefing now. Follow the "
+                                "output shape rules in the system prompt: "
+                                "5-7 numbered steps, each with 3-5 "
+                                "rationale bullets that cite specific "
+                                "facts about me. Lead with Loop "
+                                "recommendations - that's how I get value "
+                                "from Offerloop. Name Loops by name and "
+                                "tell me what each Loop will do for me."
+                            ),
+                        },
+                    ],
+                    stream=True,
+                )
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta if chunk.choices else None
+                    if not delta:
+                        continue
+                    token = getattr(delta, "content", None)
+                    if token:
+                        accumulated_parts.append(token)
+                        await out.put({"event": "token", "data": {"text": token}})
+
+                # Final structured payload. coverage is included so the
+                # gauge UI can render without a second round-trip; the
+                # active_strategy is serialized to JSON-safe primitives
+                # (datetimes -> ISO strings) so the strategy card can
+                # render checkboxes + completed_at timestamps inline.
+                await out.put({
+                    "event": "done",
+                    "data": {
+                        "message": "".join(accumulated_parts),
+                        "coverage": coverage or {},
+                        "active_strategy": _serialize_active_strategy(active_strategy),
+                    },
+                })
+                # Phase 5 observability: success event. Lazy import keeps
+                # the route boot-resilient when events_service is down.
+                if uid:
+                    try:
+                        from app.services.events_service import log_event
+                        log_event(
+                            uid,
+                            "scout.briefing.generated",
                             {
-                                "role": "user",
-                                "content": (
-                                    "Produce my briefing now. Follow the "
-                                    "output shape rules in the system prompt: "
-                                    "5-7 numbered steps, each with 3-5 "
-                                    "rationale bullets that cite specific "
-                                    "facts about me. Lead with Loop "
-                                    "recommendations - that's how I get value "
-                                    "from Offerloop. Name Loops by name and "
-                                    "tell me what each Loop will do for me."
-                                ),
+                                "coverage_pct": (coverage or {}).get("coverage_pct", 0),
+                                "tier": tier,
+                                "tokens_out": len("".join(accumulated_parts)),
+                                "had_active_strategy": bool(active_strategy),
                             },
-                        ],
-                        stream=True,
-                    )
-                    async for chunk in stream:
-                        delta = chunk.choices[0].delta if chunk.choices else None
-                        if not delta:
-                            continue
-                        token = getattr(delta, "content", None)
-                        if token:
-                            accumulated_parts.append(token)
-                            q.put({"event": "token", "data": {"text": token}})
-
-                    # Final structured payload. coverage is included so the
-                    # gauge UI can render without a second round-trip; the
-                    # active_strategy is serialized to JSON-safe primitives
-                    # (datetimes -> ISO strings) so the strategy card can
-                    # render checkboxes + completed_at timestamps inline.
-                    q.put({
-                        "event": "done",
-                        "data": {
-                            "message": "".join(accumulated_parts),
-                            "coverage": coverage or {},
-                            "active_strategy": _serialize_active_strategy(active_strategy),
-                        },
-                    })
-                    # Phase 5 observability: success event. Lazy import keeps
-                    # the route boot-resilient when events_service is down.
-                    if uid:
-                        try:
-                            from app.services.events_service import log_event
-                            log_event(
-                                uid,
-                                "scout.briefing.generated",
-                                {
-                                    "coverage_pct": (coverage or {}).get("coverage_pct", 0),
-                                    "tier": tier,
-                                    "tokens_out": len("".join(accumulated_parts)),
-                                    "had_active_strategy": bool(active_strategy),
-                                },
-                            )
-                        except Exception:
-                            pass
-                except Exception as e:
-                    print(f"[ScoutBriefing] OpenAI stream error: {e}")
-                    q.put({
-                        "event": "error",
-                        "data": {"message": "Briefing failed - try again."},
-                    })
+                        )
+                    except Exception:
+                        pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[ScoutBriefing] OpenAI stream error: {e}")
+                await out.put({
+                    "event": "error",
+                    "data": {"message": "Briefing failed - try again."},
+                })
 
-            loop.run_until_complete(
-                asyncio.wait_for(_run(), timeout=_BRIEFING_GENERATE_TIMEOUT_S)
-            )
+        try:
+            await asyncio.wait_for(_run(), timeout=_BRIEFING_GENERATE_TIMEOUT_S)
         except asyncio.TimeoutError:
-            q.put({
+            await out.put({
                 "event": "error",
                 "data": {"message": "Briefing took too long. Try again."},
             })
-        except Exception as e:
-            print(f"[ScoutBriefing] runner error: {e}")
-            q.put({
-                "event": "error",
-                "data": {"message": "Something went wrong."},
-            })
-        finally:
-            q.put(None)
-            loop.close()
 
-    threading.Thread(target=_run_streaming, daemon=True).start()
-
-    return Response(
-        _sse_stream_from_queue(q),
-        mimetype="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    return _sse_response(_produce)
 
 
 @scout_assistant_bp.route("/chat/stream", methods=["POST", "OPTIONS"])
@@ -769,70 +811,23 @@ def scout_assistant_chat_stream():
 
     user_context = _fetch_user_context(uid) if uid else {}
 
-    # Use a thread-safe queue to bridge async streaming to Flask's sync generator
-    q = queue.Queue(maxsize=100)
-
-    def _run_streaming():
-        """Run the async streaming in a background thread with its own event loop."""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            async_queue = asyncio.Queue()
-
-            async def _run():
-                """Producer: run handle_chat_stream which pushes events to async_queue.
-                Consumer: drain async_queue to the thread-safe queue."""
-
-                async def _produce():
-                    try:
-                        await scout_assistant_service.handle_chat_stream(
-                            message=message,
-                            conversation_history=conversation_history,
-                            current_page=current_page,
-                            user_name=user_name,
-                            tier=tier,
-                            credits=credits,
-                            max_credits=max_credits,
-                            user_context=user_context,
-                            user_memory=user_memory,
-                            uid=uid,
-                            chat_id=chat_id_in,
-                            queue=async_queue,
-                        )
-                    except Exception as exc:
-                        print(f"[ScoutAssistant] Stream producer error: {exc}")
-                        await async_queue.put({"event": "error", "data": {"message": "Something went wrong"}})
-                        await async_queue.put(None)
-
-                async def _consume():
-                    while True:
-                        item = await async_queue.get()
-                        q.put(item)
-                        if item is None:
-                            break
-
-                # Run producer and consumer concurrently
-                await asyncio.gather(_produce(), _consume())
-
-            loop.run_until_complete(_run())
-        except Exception as exc:
-            print(f"[ScoutAssistant] Streaming thread error: {exc}")
-            q.put({"event": "error", "data": {"message": "Something went wrong"}})
-            q.put(None)
-        finally:
-            loop.close()
-
-    thread = threading.Thread(target=_run_streaming, daemon=True)
-    thread.start()
+    async def _produce(out):
+        await scout_assistant_service.handle_chat_stream(
+            message=message,
+            conversation_history=conversation_history,
+            current_page=current_page,
+            user_name=user_name,
+            tier=tier,
+            credits=credits,
+            max_credits=max_credits,
+            user_context=user_context,
+            user_memory=user_memory,
+            uid=uid,
+            chat_id=chat_id_in,
+            queue=out,
+        )
 
-    return Response(
-        _sse_stream_from_queue(q),
-        mimetype="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    return _sse_response(_produce)
 
 
 @scout_assistant_bp.route("/search-help", methods=["POST", "OPTIONS"])
@@ -965,7 +960,7 @@ def scout_assistant_list_chats():
     # The token's tier claim is informational; treat the user doc as the
     # source of truth so a stale token does not show the wrong sidebar.
     try:
-        snap = get_db().collection("users").document(uid).get()
+        snap = get_request_user_doc(uid)
         data = snap.to_dict() or {}
         tier = data.get("subscriptionTier") or data.get("tier") or tier or "free"
     except Exception as e:
@@ -3,6 +3,7 @@ from datetime import datetime
 from flask import Blueprint, request, jsonify
 
 from ..extensions import require_firebase_auth, require_tier, get_db
+from ..utils.auth_context import get_request_user_doc
 
 shares_bp = Blueprint("shares", __name__, url_prefix="/api/shares")
 
@@ -51,7 +52,7 @@ def create_share():
         return jsonify({"error": "Recipient email required."}), 400
 
     # Sender's own profile (for fromName)
-    me = db.collection("users").document(from_uid).get()
+    me = get_request_user_doc(from_uid, db)
     me_data = me.to_dict() if me and me.exists else {}
     from_name = me_data.get("name") or me_data.get("email") or "Someone"
 
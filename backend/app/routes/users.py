@@ -3,6 +3,7 @@ User management routes
 """
 from flask import Blueprint, jsonify, request
 from app.extensions import require_firebase_auth, get_db
+from app.utils.auth_context import get_request_user_doc
 from app.routes.job_board import (
     get_user_career_profile,
     normalize_intent,
@@ -225,7 +226,7 @@ def update_user_preferences():
         
         # Get current user data
         user_ref = db.collection("users").document(user_id)
-        user_doc = user_ref.get()
+        user_doc = get_request_user_doc(user_id, db)
         
         if not user_doc.exists:
             return jsonify({"error": "User not found"}), 404
@@ -582,7 +583,7 @@ def email_preferences():
     user_ref = db.collection("users").document(uid)
 
     if request.method == 'GET':
-        snap = user_ref.get()
+        snap = get_request_user_doc(uid, db)
         stored = (snap.to_dict() or {}) if snap.exists else {}
         raw_prefs = stored.get("emailPreferences") or {}
         # Fall back to legacy newsletterSubscribed for recruitingPlaybook so
@@ -598,7 +599,7 @@ def email_preferences():
     if not incoming:
         return jsonify({"error": "no valid preference fields"}), 400
 
-    snap = user_ref.get()
+    snap = get_request_user_doc(uid, db)
     stored = (snap.to_dict() or {}) if snap.exists else {}
     current = stored.get("emailPreferences") or {}
     merged = {**current, **incoming}
@@ -676,7 +677,7 @@ def get_pro_trial_status():
 
     db = get_db()
     user_ref = db.collection('users').document(user_id)
-    snap = user_ref.get()
+    snap = get_request_user_doc(user_id, db)
     if not snap.exists:
         return jsonify({'error': 'user_not_found'}), 404
     user_data = snap.to_dict() or {}
@@ -18,9 +18,11 @@ from app.extensions import get_db
 from app.services.pdl_client import search_contacts_from_prompt, get_contact_identity
 from app.services.reply_generation import batch_generate_emails
 from app.services.auth import deduct_credits_atomic
+from app.services.dashboard_aggregates import apply_contact_update, record_contact_changes
 from app.services.loop_budget import CREDIT_COSTS
 from app.services.outbox_service import build_hm_outbox_contact_doc
 from app.utils.exceptions import RateLimitError
+from app.utils.scoring_profile import contact_features
 from app.utils.warmth_scoring import score_contacts_for_email
 from email_templates import get_template_instructions, roles_mode_template_instructions
 
@@ -738,8 +740,9 @@ def execute_find_and_draft(
 
     # Warmth scoring — returns a dict keyed by index, NOT the contact list
     warmth_data = {}
+    features = contact_features(filtered)
     try:
-        warmth_data = score_contacts_for_email(user_profile, filtered)
+        warmth_data = score_contacts_for_email(user_profile, filtered, features=features)
     except Exception:
         logger.warning("Warmth scoring failed, continuing without")
 
@@ -774,6 +777,7 @@ def execute_find_and_draft(
             # when the freeform sentence is sparse.
             loop_brief_text=config.get("briefText") or "",
             loop_brief_parsed=config.get("briefParsed") or None,
+            contact_features=features,
         )
     except Exception as e:
         logger.exception("Email generation failed for agent uid=%s", uid)
@@ -793,6 +797,10 @@ def execute_find_and_draft(
     # enriched in place and NOT appended to saved_contacts, so they cost no
     # discovery credits and don't inflate contactsFound / the activity feed.
     adopted_count = 0
+    # One suppression lookup for the cycle instead of one per Gmail draft.
+    from app.services.gmail_client import suppressed_recipients
+    suppressed = suppressed_recipients(uid, filtered)
+    agg_changes = []
 
     for idx, contact in enumerate(filtered):
         email = (contact.get("Email") or contact.get("WorkEmail") or contact.get("email") or "").strip()
@@ -881,6 +889,7 @@ def execute_find_and_draft(
             )
             if update:
                 contacts_ref.document(existing_id).update(update)
+                agg_changes.append((existing_id, existing_data, apply_contact_update(existing_data, update)))
             adopted_count += 1
             logger.info(
                 "agent_adopt uid=%s contact_id=%s loop=%s filled=%s",
@@ -909,6 +918,7 @@ def execute_find_and_draft(
                     tier="elite",
                     user_email=user_email,
                     user_id=uid,
+                    suppressed=suppressed,
                 )
                 if draft_result and isinstance(draft_result, dict):
                     contact_doc["gmailDraftId"] = draft_result.get("draft_id", "")
@@ -933,6 +943,8 @@ def execute_find_and_draft(
 
         doc_ref = contacts_ref.add(contact_doc)
         contact_id = doc_ref[1].id if isinstance(doc_ref, tuple) else ""
+        if contact_id:
+            agg_changes.append((contact_id, None, contact_doc))
         saved_contacts.append({
             "id": contact_id,
             "contactId": contact_id,  # explicit field for activity-feed deep links
@@ -947,6 +959,7 @@ def execute_find_and_draft(
             "gmailDraftUrl": contact_doc.get("gmailDraftUrl", ""),
             "gmailThreadId": contact_doc.get("gmailThreadId", ""),
         })
+    record_contact_changes(uid, agg_changes, db)
 
     # Per-contact credit cost — see CREDIT_COSTS in loop_budget.py.
     # Charge ONLY for contacts we actually drafted an email to. A found contact
@@ -1561,6 +1574,9 @@ def execute_find_hiring_managers(
     # See execute_find_and_draft — adopted HMs are enriched in place and not
     # appended to `saved`, so they cost nothing and don't inflate hmsFound.
     hm_adopted = 0
+    from app.services.gmail_client import suppressed_recipients
+    suppressed = suppressed_recipients(uid, hms)
+    agg_changes = []
 
     for idx, hm in enumerate(hms):
         # Get email data from the emails list if available
@@ -1620,6 +1636,7 @@ def execute_find_hiring_managers(
             )
             if update:
                 contacts_ref.document(existing_id).update(update)
+                agg_changes.append((existing_id, existing_data, apply_contact_update(existing_data, update)))
             hm_adopted += 1
             logger.info(
                 "agent_adopt_hm uid=%s contact_id=%s loop=%s filled=%s",
@@ -1638,6 +1655,7 @@ def execute_find_hiring_managers(
                     tier="elite",
                     user_email=user_email,
                     user_id=uid,
+                    suppressed=suppressed,
                 )
                 if draft and isinstance(draft, dict):
                     contact_doc["gmailDraftId"] = draft.get("draft_id", "")
@@ -1659,6 +1677,7 @@ def execute_find_hiring_managers(
 
         ref = contacts_ref.add(contact_doc)
         contact_id = ref[1].id
+        agg_changes.append((contact_id, None, contact_doc))
         saved.append({
             "id": contact_id,
             "contactId": contact_id,  # explicit field for activity-feed deep links
@@ -1674,6 +1693,7 @@ def execute_find_hiring_managers(
             "gmailDraftUrl": contact_doc.get("gmailDraftUrl", ""),
             "gmailThreadId": contact_doc.get("gmailThreadId", ""),
         })
+    record_contact_changes(uid, agg_changes, db)
 
     # Per-HM credit cost — see CREDIT_COSTS in loop_budget.py.
     # auto_send_credits is the Phase 9 per-send overhead (+1 per actually
@@ -1709,6 +1729,7 @@ def execute_follow_up(
     contacts_ref = db.collection("users").document(uid).collection("contacts")
     now_iso = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
     sent = []
+    agg_changes = []
 
     for cid in contact_ids[:5]:  # max 5 follow-ups per cycle
         try:
@@ -1743,6 +1764,7 @@ def execute_follow_up(
             if news_hook:
                 update_fields["followUpNewsHook"] = news_hook
             contacts_ref.document(cid).update(update_fields)
+            agg_changes.append((cid, contact, apply_contact_update(contact, update_fields)))
             sent.append({
                 "id": cid,
                 "name": f"{contact.get('firstName', '')} {contact.get('lastName', '')}".strip(),
@@ -1750,6 +1772,7 @@ def execute_follow_up(
             })
         except Exception as e:
             logger.warning("Follow-up failed for contact %s: %s", cid, e)
+    record_contact_changes(uid, agg_changes, db)
 
     logger.info("Agent follow_up: uid=%s sent %d nudges", uid, len(sent))
     return {"followUpsSent": len(sent), "contacts": sent, "creditsSpent": 0}
@@ -889,6 +889,7 @@ def persist_discovered_contact(
     parallel tabs racing on the same alum end up with one doc.
     """
     from app.extensions import get_db
+    from app.services.dashboard_aggregates import record_contact_change
     from app.services.pdl_client import get_contact_identity
     from google.cloud import firestore as gcf
 
@@ -899,6 +900,7 @@ def persist_discovered_contact(
     identity_key = get_contact_identity(pdl_contact)
     contacts_col = db.collection("users").document(uid).collection("contacts")
     new_ref = contacts_col.document()  # pre-allocated id; only used if insert wins
+    written: dict = {}
 
     @gcf.transactional
     def _txn(transaction):
@@ -906,16 +908,20 @@ def persist_discovered_contact(
         existing = list(query.get(transaction=transaction))
         if existing:
             return existing[0].id, False
-        transaction.set(new_ref, _build_contact_doc(
+        written["doc"] = _build_contact_doc(
             pdl_contact,
             identity_key=identity_key,
             job_id=job_id,
             company=company,
             matched_on=matched_on,
-        ))
+        )
+        transaction.set(new_ref, written["doc"])
         return new_ref.id, True
 
-    return _txn(db.transaction())
+    contact_id, was_new = _txn(db.transaction())
+    if was_new:
+        record_contact_change(uid, contact_id, None, written["doc"], db)
+    return contact_id, was_new
 
 
 def persist_find_recruiter_contact(
@@ -933,6 +939,7 @@ def persist_find_recruiter_contact(
     tabs collapse to one doc.
     """
     from app.extensions import get_db
+    from app.services.dashboard_aggregates import record_contact_change
     from app.services.pdl_client import get_contact_identity
     from google.cloud import firestore as gcf
 
@@ -943,6 +950,7 @@ def persist_find_recruiter_contact(
     identity_key = get_contact_identity(pdl_recruiter)
     contacts_col = db.collection("users").document(uid).collection("contacts")
     new_ref = contacts_col.document()
+    written: dict = {}
 
     @gcf.transactional
     def _txn(transaction):
@@ -967,9 +975,13 @@ def persist_find_recruiter_contact(
             "discovered_at": doc["discoveredVia"]["discovered_at"],
         }
         transaction.set(new_ref, doc)
+        written["doc"] = doc
         return new_ref.id, True
 
-    return _txn(db.transaction())
+    contact_id, was_new = _txn(db.transaction())
+    if was_new:
+        record_contact_change(uid, contact_id, None, written["doc"], db)
+    return contact_id, was_new
 
 
 def _build_contact_doc(
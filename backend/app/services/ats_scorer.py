@@ -18,8 +18,9 @@ Usage:
 """
 
 import re
-from typing import TypedDict, List, Dict
-from .skills_taxonomy import get_canonical_skill, SKILL_SYNONYMS, VARIATION_TO_CANONICAL
+from functools import lru_cache
+from typing import TypedDict, List, Dict, FrozenSet
+from .skills_taxonomy import get_canonical_skill, SKILL_SYNONYMS, VARIATION_TO_CANONICAL, SKILL_MATCHER, SkillMatcher
 
 # Type definitions
 class KeywordResult(TypedDict):
@@ -45,6 +46,13 @@ KEYWORD_WEIGHT = 0.35
 FORMATTING_WEIGHT = 0.20
 RELEVANCE_WEIGHT = 0.45
 
+# In a resume, a skill is also found by its canonical name, even where another
+# skill's variation took that name over in VARIATION_TO_CANONICAL.
+_RESUME_SKILL_MATCHER = SkillMatcher(
+    list(VARIATION_TO_CANONICAL.items())
+    + [(canonical, canonical) for canonical in set(VARIATION_TO_CANONICAL.values())]
+)
+
 # Stop words to filter out
 STOP_WORDS = {
     "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", 
@@ -83,17 +91,7 @@ def assess_job_description_quality(job_description: str) -> dict:
         }
     
     # Extract only skills that exist in our taxonomy
-    from .skills_taxonomy import VARIATION_TO_CANONICAL
-    
-    jd_lower = job_description.lower()
-    found_skills = set()
-    
-    # Check for each known skill
-    for variation, canonical in VARIATION_TO_CANONICAL.items():
-        # Use word boundary matching to avoid partial matches
-        pattern = r'\b' + re.escape(variation) + r'\b'
-        if re.search(pattern, jd_lower):
-            found_skills.add(canonical)
+    found_skills = set(_jd_skills(job_description))
     
     technical_count = len(found_skills)
     
@@ -122,26 +120,18 @@ def extract_keywords_from_jd(job_description: str) -> List[str]:
     
     Returns list of canonical skill names found in the JD.
     """
-    from .skills_taxonomy import VARIATION_TO_CANONICAL
-    
     if not job_description:
         return []
     
-    jd_lower = job_description.lower()
-    found_skills = set()
-    
-    # Check for each known skill variation
-    for variation, canonical in VARIATION_TO_CANONICAL.items():
-        # Use word boundary matching
-        # Escape special regex characters in the variation
-        escaped = re.escape(variation)
-        pattern = r'\b' + escaped + r'\b'
-        
-        if re.search(pattern, jd_lower):
-            found_skills.add(canonical)
-    
     # Return as sorted list for consistency
-    return sorted(list(found_skills))
+    return sorted(_jd_skills(job_description))
+
+
+@lru_cache(maxsize=64)
+def _jd_skills(job_description: str) -> FrozenSet[str]:
+    # calculate_ats_score needs the JD's skills twice (quality check and
+    # keyword score); the JD is scanned once.
+    return frozenset(SKILL_MATCHER.canonical_skills(job_description))
 
 
 def normalize_skill(skill: str) -> str:
@@ -170,8 +160,6 @@ def calculate_keyword_score(resume_text: str, job_description: str) -> KeywordRe
     
     Only considers skills from our taxonomy to avoid garbage keywords.
     """
-    from .skills_taxonomy import VARIATION_TO_CANONICAL
-    
     # Extract skills from JD (only taxonomy-recognized skills)
     jd_skills = extract_keywords_from_jd(job_description)
     
@@ -185,30 +173,15 @@ def calculate_keyword_score(resume_text: str, job_description: str) -> KeywordRe
             "warning": "Could not extract technical skills from job description"
         }
     
-    # Check which skills appear in resume
-    resume_lower = resume_text.lower()
+    # Check which skills appear in resume: a skill counts when its canonical
+    # form or any of its variations does, so one scan of the resume answers
+    # every JD skill.
+    resume_skills = _RESUME_SKILL_MATCHER.canonical_skills(resume_text)
     matched = []
     missing = []
     
     for skill in jd_skills:
-        # Check for the canonical skill and all its variations
-        skill_found = False
-        
-        # Check canonical form
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, resume_lower):
-            skill_found = True
-        
-        # Check all variations that map to this canonical skill
-        if not skill_found:
-            for variation, canonical in VARIATION_TO_CANONICAL.items():
-                if canonical == skill:
-                    pattern = r'\b' + re.escape(variation) + r'\b'
-                    if re.search(pattern, resume_lower):
-                        skill_found = True
-                        break
-        
-        if skill_found:
+        if skill in resume_skills:
             matched.append(skill)
         else:
             missing.append(skill)
@@ -20,6 +20,10 @@ flow that don't depend on a specific ATS's markup:
     fields that the ATS-native selector pass missed (Zscaler's custom EEO
     Sex field, GDPR consent checkboxes, multi-select checkbox groups).
 
+The classifier passes read the whole form through one evaluate in
+form_schema.py; the per-field inspection helpers here are its fallback
+and stay the reference for what each fact means.
+
 Tenant-specific fillers (greenhouse.py, lever.py, ashby.py) call into these
 helpers; they only own the standard-field selectors, the custom-question
 classifier pass, and the success-URL patterns for their platform.
@@ -847,7 +851,15 @@ def extract_invalid_field_questions(page) -> List[Dict[str, Any]]:
     required field the ATS rejected. For each: resolve label via
     resolve_label_text, classify type, harvest combobox options if needed.
     Returns the pending_questions payload the runner persists for the
-    Needs Attention drawer."""
+    Needs Attention drawer.
+
+    Reads a single form snapshot (form_schema.py); the per-field scan below
+    only runs when the snapshot script fails."""
+    from app.services.auto_apply import form_schema
+
+    snapshot = form_schema.invalid_field_questions(page, form_schema.read_form_schema(page))
+    if snapshot is not None:
+        return snapshot
     try:
         invalid_ids = page.evaluate(
             """() => {
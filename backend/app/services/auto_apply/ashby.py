@@ -37,6 +37,7 @@ import os
 from typing import Any, Callable, Dict, List, Optional
 
 from app.services.auto_apply import _form_filler_common as common
+from app.services.auto_apply import form_schema
 
 
 logger = logging.getLogger(__name__)
@@ -548,64 +549,56 @@ def _fill_custom_questions(
     # the `_fieldEntry_*` / `ashby-application-form-field-entry` class.
     # We also accept the class as a fallback for tenants on older
     # Ashby renders.
-    field_blocks = page.query_selector_all(
-        '[data-field-path], '
-        '.ashby-application-form-field-entry, '
-        '[data-testid="application-form-field"]'
+    #
+    # One evaluate snapshots every control plus these wrappers (label and
+    # member inputs); both passes read from it instead of inspecting the
+    # form one round trip per field. See form_schema.py.
+    schema = form_schema.read_form_schema(
+        page,
+        block_selector=_FIELD_BLOCK_SELECTOR,
+        block_label_selector=_BLOCK_LABEL_SELECTOR,
     )
     # Skip wrappers for system fields we already filled — match by the
     # `data-field-path` attribute which carries `_systemfield_name` etc.
     SYSTEM_PREFIX = "_systemfield_"
-    for block in field_blocks:
+    for block in form_schema.blocks(page, schema, _FIELD_BLOCK_SELECTOR, _resolve_block_label):
         # Skip system-field wrappers — those are handled by
         # `_fill_standard_fields`. We check the wrapper's data-field-path
         # rather than the first input's id because radio-group wrappers
         # carry the canonical field path while their inputs have synthetic
         # ids like `ENTRY-UUID_FIELD-UUID-labeled-radio-0`.
-        try:
-            field_path = block.get_attribute("data-field-path") or ""
-        except Exception:
-            field_path = ""
-        if field_path.startswith(SYSTEM_PREFIX):
-            continue
-        try:
-            inputs = block.query_selector_all(
-                'input:not([type="hidden"]):not([type="file"]), select, textarea'
-            )
-        except Exception:
+        if block.field_path.startswith(SYSTEM_PREFIX):
             continue
+        inputs = block.fields
         if not inputs:
             continue
-        label_text = _resolve_block_label(block)
-        try:
-            first_type = (inputs[0].get_attribute("type") or "").lower()
-        except Exception:
-            first_type = ""
-        if first_type == "checkbox" and len(inputs) > 1:
+        label_text = block.label
+        if inputs[0].input_type == "checkbox" and len(inputs) > 1:
             for inp in inputs:
                 _classify_input(
-                    page, inp, label_text,
+                    page, schema, inp, label_text,
                     classified_fields, meta_by_id, unmapped,
                 )
         else:
             _classify_input(
-                page, inputs[0], label_text,
+                page, schema, inputs[0], label_text,
                 classified_fields, meta_by_id, unmapped,
             )
 
     # Pass 2: wider scan.
     already_classified = {f["field_id"] for f in classified_fields}
-    extra_ids = common.collect_unclassified_required_ids(page, already_classified)
+    extra_ids = form_schema.required_ids(page, schema, already_classified)
     for field_id in extra_ids:
         # Skip system fields — those are standard and handled separately.
         if field_id.startswith(SYSTEM_PREFIX):
             continue
         selector = common.id_selector(field_id)
-        if not page.query_selector(selector):
+        facts = form_schema.describe_field(page, schema, selector, field_id=field_id, with_label=True)
+        if facts is None:
             continue
-        label_text = common.resolve_label_text(page, field_id) or field_id
-        field_type = common.detect_field_type(page, selector)
-        options = common.detect_options(page, selector)
+        label_text = facts["label"] or field_id
+        field_type = facts["field_type"]
+        options = facts["options"]
         if field_type == "select" and not options:
             options = common.harvest_combobox_options(page, selector)
         is_combobox = field_type in ("select", "radio")
@@ -699,7 +692,8 @@ def _fill_custom_questions(
 
 def _classify_input(
     page,
-    input_el,
+    schema: form_schema.FormSchema,
+    input_el: form_schema.FormField,
     label_text: str,
     classified_fields: List[Dict[str, Any]],
     meta_by_id: Dict[str, Dict[str, Any]],
@@ -713,13 +707,13 @@ def _classify_input(
     `ENTRY-UUID_FIELD-UUID-labeled-radio-N` and all radios in a group
     share the same `name`. For radios we use the group's name as the
     field_id so the resolver/dispatch treats the group as one logical
-    question, not one per option."""
-    try:
-        el_id = input_el.get_attribute("id") or ""
-        name = input_el.get_attribute("name") or ""
-        el_type = (input_el.get_attribute("type") or "").lower()
-    except Exception:
-        return
+    question, not one per option.
+
+    `input_el` is the snapshot entry (or a bare live reference when the
+    snapshot failed); type/options/required come from `describe_field`."""
+    el_id = input_el.id
+    name = input_el.name
+    el_type = input_el.input_type
 
     if el_type == "radio" and name:
         # Use the group name as the field_id; selecting any one radio by
@@ -738,17 +732,22 @@ def _classify_input(
     else:
         return
 
-    if not page.query_selector(selector):
+    by_id = bool(el_id) and not field_id.startswith("name:")
+    facts = form_schema.describe_field(
+        page, schema, selector,
+        field_id=el_id if by_id else "", name="" if by_id else name,
+    )
+    if facts is None:
         return
-    field_type = common.detect_field_type(page, selector)
-    options = common.detect_options(page, selector)
-    required = common.detect_required(page, selector)
+    field_type = facts["field_type"]
+    options = facts["options"]
+    required = facts["required"]
     is_combobox = field_type in ("select", "radio")
 
     # For radio groups, harvest the option labels by walking the group's
     # siblings — `detect_options` only catches react-select-style options.
     if field_type == "radio" and not options and name:
-        options = common.harvest_radio_options(page, name)
+        options = form_schema.radio_options(page, schema, name)
 
     classified_fields.append({
         "field_id": field_id,
@@ -774,6 +773,14 @@ def _classify_input(
     }
 
 
+_FIELD_BLOCK_SELECTOR = (
+    '[data-field-path], '
+    '.ashby-application-form-field-entry, '
+    '[data-testid="application-form-field"]'
+)
+_BLOCK_LABEL_SELECTOR = '[data-testid="field-label"], label, legend'
+
+
 def _resolve_block_label(block) -> str:
     """Read the question text from an Ashby form-field wrapper.
 
@@ -781,9 +788,7 @@ def _resolve_block_label(block) -> str:
     `data-testid="field-label"` for the visible question text.
     Falls back to wrapping `<legend>` or the block's first text line."""
     try:
-        lbl = block.query_selector(
-            '[data-testid="field-label"], label, legend'
-        )
+        lbl = block.query_selector(_BLOCK_LABEL_SELECTOR)
         if lbl:
             text = (lbl.inner_text() or "").strip()
             if text:
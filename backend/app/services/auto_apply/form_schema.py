@@ -0,0 +1,560 @@
+"""
+Single-roundtrip form introspection for the ATS form-fillers.
+
+Over a remote browser (Browserbase / Browserless) every `page.evaluate`,
+`query_selector` and ElementHandle call is a CDP round trip. The classifier
+passes used to inspect a form one field at a time — label, type, options,
+required flag, radio labels, each its own evaluate — so a 30–60 field
+application spent most of its runtime waiting on introspection.
+
+`read_form_schema` runs one in-page script that returns, for every
+input/select/textarea in the document, the facts the per-field helpers in
+`_form_filler_common` compute (same DOM logic, evaluated in place):
+
+  - field_type / options / required  (detect_field_type / detect_options /
+    detect_required)
+  - label                             (resolve_label_text)
+  - marked_required                   (the collect_unclassified_required_ids
+    selector: own `required` / `aria-required="true"`)
+  - invalid / validation_message      (aria-invalid + the browser's or the
+    ATS's error text)
+
+plus the groupings the fillers walk: radio-group option labels
+(harvest_radio_options), Greenhouse `question_X-label` labels, and Lever /
+Ashby question blocks.
+
+Lookups mirror the selectors the fillers use: `[id="…"]` / `[name="…"]`
+resolve to the FIRST element in document order with that attribute. When
+that element isn't a form control the snapshot has no entry and
+`describe_field` falls back to the live per-field helpers, as it does for
+everything if the snapshot script itself fails.
+
+Dynamic state is not in the snapshot: react-select listboxes only render
+once opened, so callers still run `harvest_combobox_options` for selects
+that came back without options.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.services.auto_apply import _form_filler_common as common
+
+
+logger = logging.getLogger(__name__)
+
+
+BLOCK_INPUT_SELECTOR = 'input:not([type="hidden"]):not([type="file"]), select, textarea'
+
+
+_SCHEMA_JS = r"""(args) => {
+    const controls = Array.from(document.querySelectorAll('input, select, textarea'));
+    const indexOf = new Map(controls.map((el, i) => [el, i]));
+    const firstById = new Map();
+    document.querySelectorAll('[id]').forEach((el) => {
+        if (!firstById.has(el.id)) firstById.set(el.id, el);
+    });
+    const firstByName = new Map();
+    document.querySelectorAll('[name]').forEach((el) => {
+        const n = el.getAttribute('name');
+        if (!firstByName.has(n)) firstByName.set(n, el);
+    });
+
+    const detectType = (el) => {
+        const tag = el.tagName?.toLowerCase() || '';
+        if (tag === 'textarea') return 'textarea';
+        if (tag === 'select') return 'select';
+        if (el.getAttribute && el.getAttribute('role') === 'combobox') return 'select';
+        const type = (el.getAttribute && el.getAttribute('type') || 'text').toLowerCase();
+        if (type === 'number') return 'number';
+        if (type === 'date') return 'date';
+        if (type === 'radio') return 'radio';
+        if (type === 'checkbox') return 'checkbox';
+        return 'text';
+    };
+
+    const detectOptions = (el) => {
+        const tag = el.tagName?.toLowerCase();
+        if (tag === 'select') {
+            return Array.from(el.options || [])
+                .map(o => (o.textContent || '').trim())
+                .filter(Boolean);
+        }
+        const ownsId = el.getAttribute && (el.getAttribute('aria-owns') || el.getAttribute('aria-controls'));
+        if (ownsId) {
+            const listbox = document.getElementById(ownsId);
+            if (listbox) {
+                return Array.from(listbox.querySelectorAll('[role="option"]'))
+                    .map(o => (o.textContent || '').trim())
+                    .filter(Boolean);
+            }
+        }
+        return null;
+    };
+
+    const detectRequired = (el) => {
+        if (el.required) return true;
+        const aria = el.getAttribute && el.getAttribute('aria-required');
+        if (aria === 'true') return true;
+        let parent = el.parentElement;
+        for (let i = 0; i < 4 && parent; i++) {
+            if (parent.getAttribute && parent.getAttribute('aria-required') === 'true') return true;
+            parent = parent.parentElement;
+        }
+        return false;
+    };
+
+    const generic = new Set([
+        'i agree', 'i acknowledge', 'i consent', 'i confirm',
+        'agree', 'acknowledge', 'consent', 'yes', 'no', 'ok',
+    ]);
+    const isGeneric = (s) => generic.has((s || '').toLowerCase().replace(/[*\s]+/g, ' ').trim());
+    const rich = (s) => (s || '').trim().length > 6 && !isGeneric(s);
+
+    const resolveLabel = (el) => {
+        const fid = el.id;
+        const desc = el.getAttribute && el.getAttribute('description');
+        if (rich(desc)) return desc.trim();
+
+        const fs = el.closest && el.closest('fieldset');
+        if (fs) {
+            const legend = fs.querySelector('legend');
+            if (legend) {
+                const t = (legend.textContent || '').trim();
+                if (rich(t)) return t;
+            }
+        }
+
+        const escaped = (window.CSS && CSS.escape) ? CSS.escape(fid) : fid;
+        const direct = document.querySelector(`label[for="${escaped}"]`);
+        let labelText = direct ? (direct.textContent || '').trim() : '';
+
+        if (!rich(labelText)) {
+            const labelledBy = el.getAttribute && el.getAttribute('aria-labelledby');
+            if (labelledBy) {
+                const l = document.getElementById(labelledBy);
+                if (l) {
+                    const t = (l.textContent || '').trim();
+                    if (rich(t)) return t;
+                }
+            }
+            let parent = el.parentElement;
+            for (let i = 0; i < 6 && parent; i++) {
+                const qd = parent.querySelector && parent.querySelector('.question-description, [class*="description"]');
+                if (qd) {
+                    const t = (qd.textContent || '').trim();
+                    if (rich(t)) return t.slice(0, 400);
+                }
+                const lbl = parent.querySelector && parent.querySelector('label, .label, legend, [class*="label"]');
+                if (lbl) {
+                    const t = (lbl.textContent || '').trim();
+                    if (rich(t)) return t;
+                }
+                parent = parent.parentElement;
+            }
+        }
+        return labelText || '';
+    };
+
+    const radioLabel = (r) => {
+        let text = '';
+        if (r.id) {
+            const escaped = (window.CSS && CSS.escape) ? CSS.escape(r.id) : r.id;
+            const lbl = document.querySelector(`label[for="${escaped}"]`);
+            if (lbl) text = (lbl.textContent || '').trim();
+        }
+        if (!text) {
+            const wrap = r.closest && r.closest('label');
+            if (wrap) text = (wrap.textContent || '').trim();
+        }
+        if (!text) {
+            const span = r.closest && r.closest('span');
+            const next = span && span.nextElementSibling;
+            if (next && (next.tagName || '').toLowerCase() === 'label') {
+                text = (next.textContent || '').trim();
+            }
+        }
+        if (!text) text = (r.value || '').toString();
+        return text;
+    };
+
+    const errorText = (el) => {
+        const parts = [];
+        if (el.validationMessage) parts.push(el.validationMessage);
+        const refs = ((el.getAttribute('aria-errormessage') || '') + ' ' +
+                      (el.getAttribute('aria-describedby') || '')).split(/\s+/).filter(Boolean);
+        for (const ref of refs) {
+            const node = document.getElementById(ref);
+            const t = node ? (node.textContent || '').trim() : '';
+            if (t && !parts.includes(t)) parts.push(t);
+        }
+        return parts.join(' ').slice(0, 300);
+    };
+
+    const radioGroups = {};
+    const fields = controls.map((el) => {
+        const id = el.id || '';
+        const name = el.getAttribute('name') || '';
+        const type = (el.getAttribute('type') || '').toLowerCase();
+        const f = {
+            id, name, type,
+            tag: (el.tagName || '').toLowerCase(),
+            primaryId: !!id && firstById.get(id) === el,
+            primaryName: !!name && firstByName.get(name) === el,
+            fieldType: 'text', options: null, required: false,
+            markedRequired: false, label: '', invalid: false, validationMessage: '',
+        };
+        try {
+            f.fieldType = detectType(el);
+            f.options = detectOptions(el);
+            f.required = detectRequired(el);
+            f.markedRequired = el.matches('[aria-required="true"], [required]');
+            if (f.primaryId) f.label = resolveLabel(el);
+            f.invalid = el.getAttribute('aria-invalid') === 'true';
+            if (f.invalid || (el.willValidate && el.validity && !el.validity.valid)) {
+                f.validationMessage = errorText(el);
+            }
+            if (type === 'radio' && name) {
+                const text = radioLabel(el);
+                (radioGroups[name] = radioGroups[name] || []);
+                if (text) radioGroups[name].push(text);
+            }
+        } catch (e) {}
+        return f;
+    });
+
+    const invalidIds = [];
+    const seenInvalid = new Set();
+    document.querySelectorAll('[aria-invalid="true"]').forEach((el) => {
+        const id = el.id || el.name || '';
+        if (id && !seenInvalid.has(id)) {
+            seenInvalid.add(id);
+            invalidIds.push(id);
+        }
+    });
+
+    const questionLabels = args.questionLabelSelector
+        ? Array.from(document.querySelectorAll(args.questionLabelSelector)).map((l) => ({
+            for: l.getAttribute('for') || '',
+            text: (l.innerText || '').trim(),
+        }))
+        : [];
+
+    const blockLabel = (block) => {
+        try {
+            const lbl = args.blockLabelSelector && block.querySelector(args.blockLabelSelector);
+            if (lbl) {
+                const text = (lbl.innerText || '').trim();
+                if (text) return text.replace(/\*/g, '').trim();
+            }
+        } catch (e) {}
+        const first = (block.innerText || '').trim().split(/\r\n|\r|\n/)[0] || '';
+        return first.replace(/\*/g, '').trim();
+    };
+
+    const blocks = args.blockSelector
+        ? Array.from(document.querySelectorAll(args.blockSelector)).map((block) => ({
+            label: blockLabel(block),
+            fieldPath: block.getAttribute('data-field-path') || '',
+            inputs: Array.from(block.querySelectorAll(args.blockInputSelector))
+                .map((el) => indexOf.get(el))
+                .filter((i) => i !== undefined),
+        }))
+        : [];
+
+    // Ids / names whose first element isn't a form control: lookups for
+    // these still go live; anything in neither list doesn't exist.
+    const otherIds = [];
+    firstById.forEach((el, id) => { if (!indexOf.has(el)) otherIds.push(id); });
+    const otherNames = [];
+    firstByName.forEach((el, n) => { if (!indexOf.has(el)) otherNames.push(n); });
+
+    return { fields, radioGroups, invalidIds, questionLabels, blocks, otherIds, otherNames };
+}"""
+
+
+@dataclass
+class FormField:
+    """One input/select/textarea as seen by the snapshot (or a bare live
+    reference — id/name/type only — when the snapshot is unavailable)."""
+    id: str = ""
+    name: str = ""
+    input_type: str = ""
+    tag: str = ""
+    field_type: str = "text"
+    options: Optional[List[str]] = None
+    required: bool = False
+    marked_required: bool = False
+    label: str = ""
+    invalid: bool = False
+    validation_message: str = ""
+
+
+@dataclass
+class FormBlock:
+    label: str
+    field_path: str
+    fields: List[FormField]
+
+
+@dataclass
+class FormSchema:
+    ok: bool = False
+    fields: List[FormField] = field(default_factory=list)
+    question_labels: List[Tuple[str, str]] = field(default_factory=list)
+    blocks: List[FormBlock] = field(default_factory=list)
+    invalid_ids: List[str] = field(default_factory=list)
+    radio_groups: Dict[str, List[str]] = field(default_factory=dict)
+    _by_id: Dict[str, FormField] = field(default_factory=dict, repr=False)
+    _by_name: Dict[str, FormField] = field(default_factory=dict, repr=False)
+    _other_ids: frozenset = field(default_factory=frozenset, repr=False)
+    _other_names: frozenset = field(default_factory=frozenset, repr=False)
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "FormSchema":
+        schema = cls(ok=True)
+        for raw in payload.get("fields") or []:
+            options = raw.get("options")
+            f = FormField(
+                id=str(raw.get("id") or ""),
+                name=str(raw.get("name") or ""),
+                input_type=str(raw.get("type") or ""),
+                tag=str(raw.get("tag") or ""),
+                field_type=raw.get("fieldType") or "text",
+                options=[str(x) for x in options] if isinstance(options, list) and options else None,
+                required=bool(raw.get("required")),
+                marked_required=bool(raw.get("markedRequired")),
+                label=(raw.get("label") or "").replace("*", "").strip(),
+                invalid=bool(raw.get("invalid")),
+                validation_message=str(raw.get("validationMessage") or ""),
+            )
+            schema.fields.append(f)
+            if raw.get("primaryId"):
+                schema._by_id[f.id] = f
+            if raw.get("primaryName"):
+                schema._by_name[f.name] = f
+        schema.radio_groups = {
+            str(k): [str(x) for x in v]
+            for k, v in (payload.get("radioGroups") or {}).items()
+        }
+        schema._other_ids = frozenset(str(x) for x in payload.get("otherIds") or [])
+        schema._other_names = frozenset(str(x) for x in payload.get("otherNames") or [])
+        schema.invalid_ids = [str(x) for x in payload.get("invalidIds") or []]
+        schema.question_labels = [
+            (str(q.get("for") or ""), str(q.get("text") or ""))
+            for q in payload.get("questionLabels") or []
+        ]
+        for b in payload.get("blocks") or []:
+            schema.blocks.append(FormBlock(
+                label=str(b.get("label") or ""),
+                field_path=str(b.get("fieldPath") or ""),
+                fields=[schema.fields[i] for i in b.get("inputs") or [] if 0 <= i < len(schema.fields)],
+            ))
+        return schema
+
+    def find(self, *, field_id: str = "", name: str = "") -> Optional[FormField]:
+        """The control `[id=field_id]` (or `[name=name]`) selects, if it is one."""
+        if field_id:
+            return self._by_id.get(field_id)
+        if name:
+            return self._by_name.get(name)
+        return None
+
+    def absent(self, *, field_id: str = "", name: str = "") -> bool:
+        """True when the snapshot proves no element carries the id / name."""
+        if not self.ok:
+            return False
+        if field_id:
+            return field_id not in self._by_id and field_id not in self._other_ids
+        if name:
+            return name not in self._by_name and name not in self._other_names
+        return False
+
+    def required_ids(
+        self, handled: set, already_classified: set, *, include_ids: Tuple[str, ...] = (),
+    ) -> List[str]:
+        """collect_unclassified_required_ids over the snapshot: own
+        required/aria-required controls (plus `input#<include_ids>`), keyed
+        `id || name`, document order, minus `handled` and already classified."""
+        out: List[str] = []
+        seen = set()
+        for f in self.fields:
+            if not (f.marked_required or (f.tag == "input" and f.id in include_ids)):
+                continue
+            key = f.id or f.name
+            if not key or key in handled or key in seen:
+                continue
+            seen.add(key)
+            out.append(key)
+        return [k for k in out if k not in already_classified]
+
+
+def read_form_schema(
+    page,
+    *,
+    block_selector: str = "",
+    block_label_selector: str = "",
+    block_input_selector: str = BLOCK_INPUT_SELECTOR,
+    question_label_selector: str = "",
+) -> FormSchema:
+    """Snapshot the whole form in one evaluate. Returns an empty schema
+    (ok=False) if the script fails; callers then use the live helpers."""
+    try:
+        payload = page.evaluate(_SCHEMA_JS, {
+            "blockSelector": block_selector,
+            "blockLabelSelector": block_label_selector,
+            "blockInputSelector": block_input_selector,
+            "questionLabelSelector": question_label_selector,
+        })
+    except Exception as exc:
+        logger.warning("form schema snapshot failed, using per-field inspection: %s", exc)
+        return FormSchema()
+    if not isinstance(payload, dict):
+        return FormSchema()
+    return FormSchema.from_payload(payload)
+
+
+# ---------- accessors with live fallback ----------
+
+def question_labels(page, schema: FormSchema, selector: str) -> List[Tuple[str, str]]:
+    """(for-id, text) for every label matching `selector`."""
+    if schema.ok:
+        return schema.question_labels
+    out = []
+    for label in page.query_selector_all(selector):
+        try:
+            out.append((label.get_attribute("for") or "", (label.inner_text() or "").strip()))
+        except Exception:
+            continue
+    return out
+
+
+def blocks(
+    page, schema: FormSchema, selector: str, label_of: Callable[[Any], str],
+) -> List[FormBlock]:
+    """Question blocks with their inputs. `label_of(handle)` is the filler's
+    own block-label resolver, used only on the live path."""
+    if schema.ok:
+        return schema.blocks
+    out = []
+    for handle in page.query_selector_all(selector):
+        try:
+            field_path = handle.get_attribute("data-field-path") or ""
+            inputs = handle.query_selector_all(BLOCK_INPUT_SELECTOR)
+            refs = [
+                FormField(
+                    id=inp.get_attribute("id") or "",
+                    name=inp.get_attribute("name") or "",
+                    input_type=(inp.get_attribute("type") or "").lower(),
+                )
+                for inp in inputs
+            ]
+        except Exception:
+            continue
+        out.append(FormBlock(label=label_of(handle) if refs else "", field_path=field_path, fields=refs))
+    return out
+
+
+def describe_field(
+    page, schema: FormSchema, selector: str, *, field_id: str = "", name: str = "",
+    with_label: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """field_type / options / required (and label) for the element
+    `selector` targets — from the snapshot when it has the element, else via
+    the per-field helpers. None when the element doesn't exist."""
+    f = schema.find(field_id=field_id, name=name)
+    if f is not None:
+        return {
+            "field_type": f.field_type,
+            "options": f.options,
+            "required": f.required,
+            "label": f.label if with_label else "",
+        }
+    if schema.absent(field_id=field_id, name=name) or not page.query_selector(selector):
+        return None
+    return {
+        "field_type": common.detect_field_type(page, selector),
+        "options": common.detect_options(page, selector),
+        "required": common.detect_required(page, selector),
+        "label": common.resolve_label_text(page, field_id) if (with_label and field_id) else "",
+    }
+
+
+def radio_options(page, schema: FormSchema, name: str) -> Optional[List[str]]:
+    """harvest_radio_options from the snapshot."""
+    if not name:
+        return None
+    if schema.ok:
+        return schema.radio_groups.get(name) or None
+    return common.harvest_radio_options(page, name)
+
+
+def required_ids(
+    page, schema: FormSchema, already_classified: set, *, collect=None,
+    handled: Optional[set] = None, include_ids: Tuple[str, ...] = (),
+) -> List[str]:
+    """Pass-2 ids from the snapshot, or via `collect(page, already_classified)`."""
+    if schema.ok:
+        return schema.required_ids(
+            handled if handled is not None else COMMON_HANDLED_IDS,
+            already_classified, include_ids=include_ids,
+        )
+    return (collect or common.collect_unclassified_required_ids)(page, already_classified)
+
+
+def invalid_field_questions(page, schema: FormSchema, harvest=None) -> Optional[List[Dict[str, Any]]]:
+    """extract_invalid_field_questions from a post-submit snapshot. Returns
+    None when the snapshot failed so the caller can run the live version."""
+    if not schema.ok:
+        return None
+    harvest = harvest or common.harvest_combobox_options
+    results: List[Dict[str, Any]] = []
+    for fid in schema.invalid_ids:
+        try:
+            sel = common.id_selector(fid)
+            facts = describe_field(page, schema, sel, field_id=fid, with_label=True)
+            if facts is None:
+                continue
+            label = facts["label"] or fid
+            options = facts["options"]
+            if facts["field_type"] == "select" and not options:
+                options = harvest(page, sel)
+            entry = {
+                "field_id": fid,
+                "label": label,
+                "field_type": facts["field_type"],
+                "options": options,
+                "required": True,
+            }
+            f = schema.find(field_id=fid)
+            if f is not None and f.validation_message:
+                entry["validation_message"] = f.validation_message
+            results.append(entry)
+            print(
+                f"[auto_apply.classify] post-submit aria-invalid: "
+                f"field_id={fid!r} label={label!r} field_type={facts['field_type']!r}",
+                flush=True,
+            )
+        except Exception as exc:
+            logger.warning("invalid_field_questions per-field failed: %s", exc)
+            continue
+    return results
+
+
+# Mirrors the `handled` set in collect_unclassified_required_ids.
+COMMON_HANDLED_IDS = frozenset({
+    'first_name', 'last_name', 'preferred_name',
+    'preferred_first_name', 'preferred_last_name',
+    'name', 'full_name',
+    'email', 'resume', 'cover_letter', 'cover',
+    'country', 'candidate-location', 'location',
+})
+
+# Mirrors the `handled` set in greenhouse._collect_unclassified_required_ids.
+GREENHOUSE_HANDLED_IDS = frozenset({
+    'first_name', 'last_name', 'preferred_name',
+    'preferred_first_name', 'preferred_last_name',
+    'email', 'resume', 'cover_letter',
+    'country', 'candidate-location',
+})
@@ -31,6 +31,8 @@ import os
 import re
 from typing import Any, Callable, Dict, List, Optional
 
+from app.services.auto_apply import form_schema
+
 # NOTE: this module currently keeps its own copies of helpers that also
 # live in `_form_filler_common.py` (id_selector, check_checkbox,
 # fill_combobox, react_force_text, resolve_label_text, etc.). They are
@@ -984,30 +986,32 @@ def _fill_custom_questions(
     classified_fields: List[Dict[str, Any]] = []
     meta_by_id: Dict[str, Dict[str, Any]] = {}
 
+    # One evaluate snapshots every control on the form (type, options,
+    # required, label) plus the question_X-label wrappers; both passes
+    # below read from it instead of inspecting fields one round trip at
+    # a time. See form_schema.py.
+    question_selector = 'label[id^="question_"][id$="-label"]'
+    schema = form_schema.read_form_schema(page, question_label_selector=question_selector)
+
     # Pass 1: Greenhouse-native custom questions with the standard
     # `label[id="question_X-label"]` wrapper. These are the most reliable
     # to classify because the label markup is explicit.
-    labels = page.query_selector_all('label[id^="question_"][id$="-label"]')
-    for label in labels:
-        try:
-            label_text = (label.inner_text() or "").strip()
-            field_id = label.get_attribute("for")
-        except Exception:
-            continue
+    for field_id, label_text in form_schema.question_labels(page, schema, question_selector):
         if not field_id:
             continue
         # Attribute selector tolerates array-style ids like "question_X[]".
         selector = _id_selector(field_id)
-        if not page.query_selector(selector):
+        facts = form_schema.describe_field(page, schema, selector, field_id=field_id)
+        if facts is None:
             unmapped.append(_unmapped_entry(
                 page, selector, field_id, label_text,
                 reason="field not interactable",
             ))
             continue
 
-        field_type = _detect_field_type(page, selector)
-        options = _detect_options(page, selector)
-        required = _detect_required(page, selector)
+        field_type = facts["field_type"]
+        options = facts["options"]
+        required = facts["required"]
         is_combobox = field_type in ("select", "radio")
 
         classified_fields.append({
@@ -1041,14 +1045,20 @@ def _fill_custom_questions(
     # fails — avoids the "field stuck in error state" problem where
     # Greenhouse's per-field aria-invalid flag persists across resubmits.
     already_classified = {f["field_id"] for f in classified_fields}
-    extra_ids = _collect_unclassified_required_ids(page, already_classified)
+    extra_ids = form_schema.required_ids(
+        page, schema, already_classified,
+        collect=_collect_unclassified_required_ids,
+        handled=form_schema.GREENHOUSE_HANDLED_IDS,
+        include_ids=("phone",),
+    )
     for field_id in extra_ids:
         selector = _id_selector(field_id)
-        if not page.query_selector(selector):
+        facts = form_schema.describe_field(page, schema, selector, field_id=field_id, with_label=True)
+        if facts is None:
             continue
-        label_text = _resolve_label_text(page, field_id) or field_id
-        field_type = _detect_field_type(page, selector)
-        options = _detect_options(page, selector)
+        label_text = facts["label"] or field_id
+        field_type = facts["field_type"]
+        options = facts["options"]
         if field_type == "select" and not options:
             options = _harvest_combobox_options(page, selector)
         is_combobox = field_type in ("select", "radio")
@@ -1568,7 +1578,15 @@ def _extract_invalid_field_questions(page) -> List[Dict[str, Any]]:
     persists for the Needs Attention drawer.
 
     Source of truth for "required" here is the form: if Greenhouse rejected
-    it, it was required."""
+    it, it was required.
+
+    Reads a single form snapshot; the per-field scan below only runs when
+    the snapshot script fails."""
+    snapshot = form_schema.invalid_field_questions(
+        page, form_schema.read_form_schema(page), harvest=_harvest_combobox_options,
+    )
+    if snapshot is not None:
+        return snapshot
     try:
         invalid_ids = page.evaluate(
             """() => {
@@ -41,6 +41,7 @@ import os
 from typing import Any, Callable, Dict, List, Optional
 
 from app.services.auto_apply import _form_filler_common as common
+from app.services.auto_apply import form_schema
 
 
 logger = logging.getLogger(__name__)
@@ -478,36 +479,35 @@ def _fill_custom_questions(
     classified_fields: List[Dict[str, Any]] = []
     meta_by_id: Dict[str, Dict[str, Any]] = {}
 
+    # One evaluate snapshots every control plus the question blocks (label
+    # and member inputs); both passes read from it instead of inspecting
+    # the form one round trip per field. See form_schema.py.
+    schema = form_schema.read_form_schema(
+        page,
+        block_selector=_QUESTION_BLOCK_SELECTOR,
+        block_label_selector=_BLOCK_LABEL_SELECTOR,
+    )
+
     # Pass 1: walk .application-question blocks. Each block has one logical
     # question, but may contain multiple inputs (radio group, multi-select).
-    question_blocks = page.query_selector_all('.application-question, .application-additional-question')
-    for block in question_blocks:
-        try:
-            label_text = _resolve_block_label(block)
-            inputs = block.query_selector_all(
-                'input:not([type="hidden"]):not([type="file"]), select, textarea'
-            )
-        except Exception:
-            continue
+    for block in form_schema.blocks(page, schema, _QUESTION_BLOCK_SELECTOR, _resolve_block_label):
+        inputs = block.fields
         if not inputs:
             continue
+        label_text = block.label
         # For radio / single-input questions, use the first interactive input
         # as the field_id. For checkbox groups (multi-select), enumerate.
         first = inputs[0]
-        try:
-            first_type = (first.get_attribute("type") or "").lower()
-        except Exception:
-            first_type = ""
-        if first_type == "checkbox" and len(inputs) > 1:
+        if first.input_type == "checkbox" and len(inputs) > 1:
             # Multi-select: one field per option, all share the question label.
             for inp in inputs:
                 _classify_input(
-                    page, inp, label_text,
+                    page, schema, inp, label_text,
                     classified_fields, meta_by_id, unmapped,
                 )
         else:
             _classify_input(
-                page, first, label_text,
+                page, schema, first, label_text,
                 classified_fields, meta_by_id, unmapped,
             )
 
@@ -516,14 +516,15 @@ def _fill_custom_questions(
     # specific markup that didn't render with the .application-question
     # wrapper.
     already_classified = {f["field_id"] for f in classified_fields}
-    extra_ids = common.collect_unclassified_required_ids(page, already_classified)
+    extra_ids = form_schema.required_ids(page, schema, already_classified)
     for field_id in extra_ids:
         selector = common.id_selector(field_id)
-        if not page.query_selector(selector):
+        facts = form_schema.describe_field(page, schema, selector, field_id=field_id, with_label=True)
+        if facts is None:
             continue
-        label_text = common.resolve_label_text(page, field_id) or field_id
-        field_type = common.detect_field_type(page, selector)
-        options = common.detect_options(page, selector)
+        label_text = facts["label"] or field_id
+        field_type = facts["field_type"]
+        options = facts["options"]
         if field_type == "select" and not options:
             options = common.harvest_combobox_options(page, selector)
         is_combobox = field_type in ("select", "radio")
@@ -616,7 +617,8 @@ def _fill_custom_questions(
 
 def _classify_input(
     page,
-    input_el,
+    schema: form_schema.FormSchema,
+    input_el: form_schema.FormField,
     label_text: str,
     classified_fields: List[Dict[str, Any]],
     meta_by_id: Dict[str, Dict[str, Any]],
@@ -625,12 +627,12 @@ def _classify_input(
     """Classify one input element. Lever inputs without `id` are addressable
     by `name`; we synthesize a stable field_id of the form
     `name:<the-name>` and select via attribute. The orchestration treats
-    that as opaque, so the resolver works the same way."""
-    try:
-        el_id = input_el.get_attribute("id") or ""
-        name = input_el.get_attribute("name") or ""
-    except Exception:
-        return
+    that as opaque, so the resolver works the same way.
+
+    `input_el` is the snapshot entry (or a bare live reference when the
+    snapshot failed); type/options/required come from `describe_field`."""
+    el_id = input_el.id
+    name = input_el.name
     if el_id:
         field_id = el_id
         selector = common.id_selector(field_id)
@@ -640,17 +642,20 @@ def _classify_input(
         selector = f'[name="{safe_name}"]'
     else:
         return
-    if not page.query_selector(selector):
+    facts = form_schema.describe_field(
+        page, schema, selector, field_id=el_id, name="" if el_id else name,
+    )
+    if facts is None:
         return
-    field_type = common.detect_field_type(page, selector)
-    options = common.detect_options(page, selector)
-    required = common.detect_required(page, selector)
+    field_type = facts["field_type"]
+    options = facts["options"]
+    required = facts["required"]
     is_combobox = field_type in ("select", "radio")
 
     # For radio groups, harvest the option labels by walking the group's
     # siblings — `detect_options` only catches react-select-style options.
     if field_type == "radio" and not options and name:
-        options = common.harvest_radio_options(page, name)
+        options = form_schema.radio_options(page, schema, name)
 
     classified_fields.append({
         "field_id": field_id,
@@ -681,6 +686,10 @@ def _classify_input(
 # so the Ashby filler can share it. See `_form_filler_common.py`.
 
 
+_QUESTION_BLOCK_SELECTOR = '.application-question, .application-additional-question'
+_BLOCK_LABEL_SELECTOR = '.application-label, .application-question-label, legend, label'
+
+
 def _resolve_block_label(block) -> str:
     """Read the question text from a Lever `.application-question` block.
 
@@ -688,9 +697,7 @@ def _resolve_block_label(block) -> str:
     current markup), then wrapping `<label>`, then `<legend>` for fieldset
     groups, then the block's own text content as last resort."""
     try:
-        lbl = block.query_selector(
-            '.application-label, .application-question-label, legend, label'
-        )
+        lbl = block.query_selector(_BLOCK_LABEL_SELECTOR)
         if lbl:
             text = (lbl.inner_text() or "").strip()
             if text:
@@ -0,0 +1,281 @@
+"""Prerendered HTML for crawlers (SEO/AEO).
+
+Bots get server-rendered HTML from Prerender.io instead of the SPA shell.
+The original middleware ran `any(bot in ua for bot in BOT_AGENTS)` on every
+request and, for each crawler hit, made a blocking 10s round trip to
+Prerender. A crawler sweep over the SEO pages could park every gunicorn
+thread on upstream I/O and starve real users.
+
+This module keeps that work off the hot path:
+
+  * UA matching is one precompiled alternation regex.
+  * Rendered HTML is cached in memory, keyed by the normalized URL (host
+    lowercased, fragment and tracking params dropped, query sorted).
+    Entries are fresh for PRERENDER_CACHE_TTL seconds, then served stale
+    for up to PRERENDER_STALE_TTL more while one background refresh runs.
+    The cache is an LRU bounded by PRERENDER_CACHE_MAX_BYTES.
+  * Upstream fetches (foreground misses and background refreshes alike)
+    share a semaphore of PRERENDER_MAX_CONCURRENCY slots. When every slot
+    is taken, a miss falls through to the SPA right away instead of
+    queueing a worker thread behind the upstream.
+  * Concurrent misses for the same URL don't stampede the upstream: the
+    first one fetches, the rest fall through to the SPA.
+
+Only PRERENDER_CACHEABLE_STATUSES (200, 301, 404) are cached and served.
+Any other status (5xx, or a 401/403/429 about our Prerender account rather
+than the page) and any upstream failure falls through to the SPA.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+BOT_AGENTS = [
+    'googlebot', 'bingbot', 'yandex', 'duckduckbot', 'slurp',
+    'baiduspider', 'facebookexternalhit', 'twitterbot', 'linkedinbot',
+    'embedly', 'quora link preview', 'showyoubot', 'outbrain',
+    'pinterest', 'developers.google.com/+/web/snippet', 'slackbot',
+    'vkshare', 'w3c_validator', 'redditbot', 'applebot', 'whatsapp',
+    'flipboard', 'tumblr', 'bitlybot', 'skypeuripreview', 'nuzzel',
+    'discordbot', 'google page speed', 'qwantify', 'pinterestbot',
+    'bitrix link preview', 'xing-contenttabreceiver', 'chrome-lighthouse',
+    'telegrambot', 'gptbot', 'claudebot', 'anthropic-ai', 'perplexitybot',
+    'ccbot', 'chatgpt-user', 'google-extended', 'bytespider'
+]
+
+# Longest first so the alternation never stops on a shorter prefix; the
+# result is the same substring test as the old any() loop, in one pass.
+BOT_UA_RE = re.compile(
+    "|".join(re.escape(b) for b in sorted(BOT_AGENTS, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+
+PRERENDER_SERVICE_URL = os.getenv("PRERENDER_SERVICE_URL", "https://service.prerender.io/")
+PRERENDER_TIMEOUT = float(os.getenv("PRERENDER_TIMEOUT", "10"))
+PRERENDER_CACHE_TTL = int(os.getenv("PRERENDER_CACHE_TTL", str(6 * 3600)))
+PRERENDER_STALE_TTL = int(os.getenv("PRERENDER_STALE_TTL", str(24 * 3600)))
+PRERENDER_CACHE_MAX_BYTES = int(os.getenv("PRERENDER_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+PRERENDER_MAX_CONCURRENCY = int(os.getenv("PRERENDER_MAX_CONCURRENCY", "4"))
+PRERENDER_CACHEABLE_STATUSES = frozenset(
+    int(s) for s in os.getenv("PRERENDER_CACHEABLE_STATUSES", "200,301,404").split(",") if s.strip()
+)
+
+_TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "_escaped_fragment_"}
+
+
+def is_bot_user_agent(user_agent: Optional[str]) -> bool:
+    return bool(user_agent) and BOT_UA_RE.search(user_agent) is not None
+
+
+def should_prerender(method: str, path: str, user_agent: Optional[str]) -> bool:
+    """GET page routes from crawlers only — no API, assets or files."""
+    if method != "GET":
+        return False
+    if path.startswith("/api/") or path.startswith("/assets/"):
+        return False
+    if "." in path.split("/")[-1]:  # skip files like .js .css .png
+        return False
+    return is_bot_user_agent(user_agent)
+
+
+def normalize_url(url: str) -> str:
+    """Cache key for a page URL: one entry per page, not per campaign link."""
+    parts = urlsplit(url)
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+@dataclass
+class RenderedPage:
+    body: bytes
+    status: int
+    content_type: str
+    fetched_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+
+class RenderedPageCache:
+    """Byte-bounded LRU of rendered pages with fresh/stale windows."""
+
+    def __init__(
+        self,
+        ttl: int = PRERENDER_CACHE_TTL,
+        stale_ttl: int = PRERENDER_STALE_TTL,
+        max_bytes: int = PRERENDER_CACHE_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._entries: "OrderedDict[str, RenderedPage]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[Optional[RenderedPage], bool]:
+        """(page, is_fresh). Expired-beyond-stale entries are dropped."""
+        now = self.clock()
+        with self._lock:
+            page = self._entries.get(key)
+            if page is None:
+                return None, False
+            age = now - page.fetched_at
+            if age >= self.ttl + self.stale_ttl:
+                self._drop(key)
+                return None, False
+            self._entries.move_to_end(key)
+            return page, age < self.ttl
+
+    def put(self, key: str, page: RenderedPage) -> None:
+        if page.size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = page
+            self._bytes += page.size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+
+    def _drop(self, key: str) -> None:
+        page = self._entries.pop(key)
+        self._bytes -= page.size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+
+def _requests_fetch(url: str, headers: dict, timeout: float):
+    import requests
+    resp = requests.get(url, headers=headers, timeout=timeout)
+    return resp.status_code, resp.content, resp.headers.get("Content-Type", "text/html")
+
+
+class BotRenderer:
+    """Serves crawler requests from the cache, fetching from Prerender on miss.
+
+    `fetch(url, headers, timeout) -> (status, body, content_type)` is the
+    upstream transport; it defaults to requests.get.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str],
+        service_url: str = PRERENDER_SERVICE_URL,
+        cache: Optional[RenderedPageCache] = None,
+        max_concurrency: int = PRERENDER_MAX_CONCURRENCY,
+        timeout: float = PRERENDER_TIMEOUT,
+        fetch: Callable = _requests_fetch,
+    ):
+        self.token = token
+        self.service_url = service_url if service_url.endswith("/") else service_url + "/"
+        self.cache = cache if cache is not None else RenderedPageCache()
+        self.timeout = timeout
+        self.fetch = fetch
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._inflight: set[str] = set()
+        self._inflight_lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=max(1, max_concurrency),
+                                             thread_name_prefix="prerender-refresh")
+        self.stats = {"fresh_hits": 0, "stale_hits": 0, "misses": 0,
+                      "fetches": 0, "fetch_errors": 0, "shed": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token)
+
+    def render(self, url: str, user_agent: str) -> Optional[RenderedPage]:
+        """Rendered page for `url`, or None to fall through to the SPA."""
+        if not self.enabled:
+            return None
+        key = normalize_url(url)
+        page, fresh = self.cache.get(key)
+        if page is not None:
+            if fresh:
+                self.stats["fresh_hits"] += 1
+            else:
+                self.stats["stale_hits"] += 1
+                self._refresh_in_background(key, url, user_agent)
+            return page
+
+        self.stats["misses"] += 1
+        if not self._claim(key):
+            self.stats["shed"] += 1
+            return None
+        try:
+            return self._fetch_and_store(key, url, user_agent)
+        finally:
+            self._release(key)
+
+    def _claim(self, key: str) -> bool:
+        """Take an upstream slot and mark `key` in flight; never blocks."""
+        with self._inflight_lock:
+            if key in self._inflight:
+                return False
+            if not self._slots.acquire(blocking=False):
+                return False
+            self._inflight.add(key)
+            return True
+
+    def _release(self, key: str) -> None:
+        with self._inflight_lock:
+            self._inflight.discard(key)
+        self._slots.release()
+
+    def _refresh_in_background(self, key: str, url: str, user_agent: str) -> None:
+        if not self._claim(key):
+            return
+
+        def run():
+            try:
+                self._fetch_and_store(key, url, user_agent)
+            finally:
+                self._release(key)
+
+        self._refresher.submit(run)
+
+    def _fetch_and_store(self, key: str, url: str, user_agent: str) -> Optional[RenderedPage]:
+        self.stats["fetches"] += 1
+        try:
+            status, body, content_type = self.fetch(
+                f"{self.service_url}{url}",
+                {"X-Prerender-Token": self.token, "User-Agent": user_agent},
+                self.timeout,
+            )
+        except Exception as e:
+            self.stats["fetch_errors"] += 1
+            logger.warning("Prerender failed for %s: %s", url, e)
+            return None
+        if status not in PRERENDER_CACHEABLE_STATUSES:
+            self.stats["fetch_errors"] += 1
+            logger.warning("Prerender returned %s for %s, falling through to SPA", status, url)
+            return None
+        page = RenderedPage(body=body, status=status, content_type=content_type or "text/html",
+                            fetched_at=self.cache.clock())
+        self.cache.put(key, page)
+        return page
+
+    def cache_stats(self) -> dict:
+        return {**self.stats, "entries": len(self.cache), "bytes": self.cache.bytes}
@@ -0,0 +1,103 @@
+"""
+Short-lived per-user snapshot of the /api/briefing payload.
+
+The briefing is the first page every user loads. Building it costs:
+  - a user-doc read,
+  - the unread-replies query plus a batched reply-draft read,
+  - the follow-up query,
+  - outbox stats,
+  - roadmap progress (Pro/Elite only).
+
+Users bounce between the briefing and other pages, so each worker keeps
+the built payload in memory for BRIEFING_SNAPSHOT_TTL_SECONDS. Setting it
+to 0 disables the snapshot.
+
+Writes that change what the briefing shows call invalidate_briefing(uid):
+  - every contact write reported through
+    dashboard_aggregates.record_contact_change (replies, drafts, sends,
+    follow-up state),
+  - reply-draft writes in reply_coach and outbox_service.
+
+Invalidation only reaches the worker that handled the write, so another
+worker can serve a snapshot that is up to one TTL old. That is why the TTL
+is short.
+
+A per-user generation counter stops a slow build from storing its result
+if an invalidation arrived while it was running.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Optional
+
+BRIEFING_SNAPSHOT_TTL_SECONDS = int(os.getenv("BRIEFING_SNAPSHOT_TTL_SECONDS", "30"))
+
+# Past this many tracked users the tables are reset. A reset bumps the
+# epoch, so builds that were in flight at the time can't store.
+_MAX_TRACKED_USERS = 5000
+
+_lock = threading.Lock()
+_snapshots: dict[str, tuple[float, tuple, dict]] = {}  # uid -> (stored_at, generation, payload)
+_generations: dict[str, int] = {}
+_epoch = 0
+
+
+def briefing_generation(uid: str) -> tuple:
+    """Token to pass to store_snapshot. Take it before building."""
+    with _lock:
+        return (_epoch, _generations.get(uid, 0))
+
+
+def get_snapshot(uid: str) -> Optional[dict]:
+    """The cached payload for uid, or None if it is missing, expired or invalidated."""
+    if BRIEFING_SNAPSHOT_TTL_SECONDS <= 0 or not uid:
+        return None
+    with _lock:
+        entry = _snapshots.get(uid)
+        if entry is None:
+            return None
+        stored_at, generation, payload = entry
+        if (time.monotonic() - stored_at >= BRIEFING_SNAPSHOT_TTL_SECONDS
+                or generation != (_epoch, _generations.get(uid, 0))):
+            del _snapshots[uid]
+            return None
+        return payload
+
+
+def store_snapshot(uid: str, generation: tuple, payload: dict) -> bool:
+    """Cache payload unless uid was invalidated after `generation` was taken."""
+    if BRIEFING_SNAPSHOT_TTL_SECONDS <= 0 or not uid:
+        return False
+    with _lock:
+        if generation != (_epoch, _generations.get(uid, 0)):
+            return False
+        if len(_snapshots) >= _MAX_TRACKED_USERS:
+            _reset_locked()
+            return False
+        _snapshots[uid] = (time.monotonic(), generation, payload)
+        return True
+
+
+def invalidate_briefing(uid: str) -> None:
+    """Drop uid's snapshot and fence off builds already in flight. Never raises."""
+    if not uid:
+        return
+    with _lock:
+        _snapshots.pop(uid, None)
+        if len(_generations) >= _MAX_TRACKED_USERS:
+            _reset_locked()
+        _generations[uid] = _generations.get(uid, 0) + 1
+
+
+def clear_briefing_snapshots() -> None:
+    with _lock:
+        _reset_locked()
+
+
+def _reset_locked() -> None:
+    global _epoch
+    _snapshots.clear()
+    _generations.clear()
+    _epoch += 1
@@ -0,0 +1,658 @@
+"""Background spreadsheet contact import.
+
+POST /api/contacts/import used to do the whole import inside the request:
+stream every existing contact for dedup, enrich LinkedIn-only rows one PDL
+call at a time, add() each contact individually, then generate emails and
+Gmail drafts. Large files took minutes, hit request timeouts and pinned a
+gunicorn thread throughout.
+
+The route now parses and validates the upload, creates an import job doc
+and enqueues the "contact_import" RQ job (app/services/rq_queue.py). The
+job streams the rows through a pipeline, IMPORT_BATCH_SIZE rows at a time:
+
+  1. validate / credit budget / dedup  (sequential, in row order)
+  2. PDL enrichment for LinkedIn-only rows, IMPORT_ENRICH_CONCURRENCY at a
+     time (still capped at ENRICHMENT_CAP per import)
+  3. post-enrichment dedup and contact build
+  4. one atomic credit deduction for the batch (deduct_credits_atomic), then
+     one WriteBatch commit for its contacts; a failed commit refunds
+  5. progress written to the job doc
+
+Drafting (email generation + Gmail drafts) runs once after all batches, as
+before, and its contact updates are committed in write batches too.
+
+Job doc: users/{uid}/import_jobs/{job_id}
+    status    queued | running | completed | failed
+    total     row count
+    progress  {processed, created, duplicate, invalid, no_credits, enriched}
+    result    counts from the synchronous endpoint's response body plus at
+              most RESULT_CONTACT_ID_LIMIT created contact ids; the client
+              reloads the contact list instead of reading contacts from here
+    error     set when status == failed
+"""
+from __future__ import annotations
+
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Optional
+
+from app.services.dashboard_aggregates import apply_contact_update, record_contact_changes
+
+logger = logging.getLogger(__name__)
+
+# Cost per imported contact (find + draft + search bundle — matches
+# CREDIT_COSTS['find_contact'] in app/config.py and prompt_search rate).
+CREDITS_PER_CONTACT = 10
+
+# Max contacts to enrich via PDL per import (LinkedIn URL -> email lookup)
+ENRICHMENT_CAP = 50
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "100"))
+IMPORT_ENRICH_CONCURRENCY = int(os.getenv("IMPORT_ENRICH_CONCURRENCY", "8"))
+# Firestore caps a WriteBatch at 500 operations.
+_MAX_BATCH_WRITES = 450
+# The job doc is a single Firestore document (1MB cap), so the result only
+# carries a bounded list of created ids, never the contacts themselves.
+RESULT_CONTACT_ID_LIMIT = 100
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+def _now_iso() -> str:
+    return datetime.now().isoformat()
+
+
+def import_job_ref(db, uid: str, job_id: str):
+    return db.collection("users").document(uid).collection("import_jobs").document(job_id)
+
+
+# ---------------------------------------------------------------------------
+# Enrichment
+# ---------------------------------------------------------------------------
+
+@dataclass
+class EnrichResult:
+    email: str = ""
+    pdl_id: str = ""
+    ok: bool = False
+
+
+def enrich_from_linkedin(linkedin: str) -> EnrichResult:
+    """PDL /person/enrich for one LinkedIn URL, then the import email
+    waterfall. Never raises; failures come back with ok=False."""
+    import requests
+
+    from app.config import PDL_BASE_URL, PEOPLE_DATA_LABS_API_KEY
+    from app.routes.linkedin_import import (
+        extract_contact_from_pdl_person_enhanced,
+        normalize_linkedin_url,
+        resolve_email_for_linkedin_import,
+    )
+
+    pdl_url = normalize_linkedin_url(linkedin) or linkedin
+    if pdl_url and not pdl_url.startswith('http'):
+        pdl_url = f'https://www.linkedin.com/in/{pdl_url.split("/in/")[-1].rstrip("/")}' if '/in/' in pdl_url else None
+    if not pdl_url or 'linkedin.com' not in pdl_url:
+        return EnrichResult()
+    try:
+        response = requests.get(
+            f"{PDL_BASE_URL}/person/enrich",
+            params={'api_key': PEOPLE_DATA_LABS_API_KEY, 'profile': pdl_url, 'pretty': True},
+            timeout=15,
+        )
+        if response.status_code != 200:
+            if response.status_code == 402:
+                logger.warning("[ContactImport] PDL 402 quota exceeded")
+            return EnrichResult()
+        person_json = response.json()
+        person_data = person_json.get('data') if isinstance(person_json, dict) else None
+        if not person_data:
+            return EnrichResult()
+        pdl_contact = extract_contact_from_pdl_person_enhanced(person_data)
+        if not pdl_contact:
+            return EnrichResult()
+        # Capture pdlId for queue dedup even if email resolution fails.
+        result = EnrichResult(pdl_id=pdl_contact.get('pdlId') or '')
+        email_result = resolve_email_for_linkedin_import(pdl_contact, person_data)
+        resolved_email = (email_result.get('email') or '').strip()
+        if resolved_email and '@' in resolved_email:
+            result.email = resolved_email
+            result.ok = True
+        return result
+    except Exception as e:
+        logger.warning(f"[ContactImport] Enrichment error for LinkedIn {linkedin[:50]!r}: {e}")
+        return EnrichResult()
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+def _is_valid_contact(contact: dict) -> bool:
+    """True if contact has at least name, email, or LinkedIn URL."""
+    has_name = contact.get('firstName') and contact.get('lastName')
+    has_email = bool(contact.get('email', '').strip())
+    has_linkedin = bool(contact.get('linkedinUrl', '').strip())
+    return bool(has_name or has_email or has_linkedin)
+
+
+@dataclass
+class ImportStats:
+    total: int = 0
+    processed: int = 0
+    created: int = 0
+    duplicate: int = 0
+    invalid: int = 0
+    no_credits: int = 0
+    enriched: int = 0
+    enrichment_failed: int = 0
+    enrichment_capped: int = 0
+    credits_remaining: int = 0
+    drafts_created: int = 0
+    drafts_failed: int = 0
+    email_gen_failed: bool = False
+    email_gen_error: Optional[str] = None
+    created_contacts: list = field(default_factory=list)
+    for_drafting: list = field(default_factory=list)
+
+    def progress(self) -> dict:
+        return {
+            "processed": self.processed,
+            "created": self.created,
+            "duplicate": self.duplicate,
+            "invalid": self.invalid,
+            "no_credits": self.no_credits,
+            "enriched": self.enriched,
+        }
+
+    def result(self) -> dict:
+        """The response body of the old synchronous endpoint, minus the
+        contact docs (see RESULT_CONTACT_ID_LIMIT)."""
+        out = {
+            'success': True,
+            'created': self.created,
+            'skipped': {
+                'duplicate': self.duplicate,
+                'invalid': self.invalid,
+                'no_credits': self.no_credits,
+                'total': self.duplicate + self.invalid + self.no_credits,
+            },
+            'enrichment': {
+                'enriched': self.enriched,
+                'failed': self.enrichment_failed,
+                'capped': self.enrichment_capped,
+            },
+            'drafts': {
+                'created': self.drafts_created,
+                'failed': self.drafts_failed,
+                'total_eligible': len(self.for_drafting),
+            },
+            'contactIds': [c['id'] for c in self.created_contacts[:RESULT_CONTACT_ID_LIMIT]],
+            'contactIdsTruncated': len(self.created_contacts) > RESULT_CONTACT_ID_LIMIT,
+            'credits': {
+                'spent': self.created * CREDITS_PER_CONTACT,
+                'remaining': self.credits_remaining,
+            },
+        }
+        # Warnings for partial failures so the frontend can inform the user
+        warnings = []
+        if self.email_gen_failed:
+            warnings.append(f"Email generation failed — {len(self.for_drafting)} contacts were saved without email drafts.")
+        elif self.drafts_failed > 0:
+            warnings.append(f"{self.drafts_failed} email draft(s) could not be created. Contacts were saved.")
+        if warnings:
+            out['warnings'] = warnings
+        return out
+
+
+class _DedupIndex:
+    """Case-insensitive email / LinkedIn / (first, last, company) keys."""
+
+    FIELDS = ['email', 'linkedinUrl', 'firstName', 'lastName', 'company']
+
+    def __init__(self):
+        self.emails: set = set()
+        self.linkedins: set = set()
+        self.name_company: set = set()
+
+    @classmethod
+    def load(cls, contacts_ref) -> "_DedupIndex":
+        index = cls()
+        try:
+            # Projection: only the dedup fields come over the wire.
+            for doc in contacts_ref.select(cls.FIELDS).stream():
+                index.add(doc.to_dict() or {})
+        except Exception as e:
+            logger.warning(f"[ContactImport] Failed to pre-load contacts for dedup: {e}")
+        return index
+
+    def add(self, c: dict) -> None:
+        e = (c.get('email') or '').strip().lower()
+        if e:
+            self.emails.add(e)
+        li = (c.get('linkedinUrl') or '').strip().lower()
+        if li:
+            self.linkedins.add(li)
+        key = self._name_key(c)
+        if key:
+            self.name_company.add(key)
+
+    @staticmethod
+    def _name_key(c: dict):
+        fn = (c.get('firstName') or '').strip().lower()
+        ln = (c.get('lastName') or '').strip().lower()
+        co = (c.get('company') or '').strip().lower()
+        return (fn, ln, co) if fn and ln and co else None
+
+    def is_duplicate(self, c: dict) -> bool:
+        email = (c.get('email') or '').strip().lower()
+        if email and email in self.emails:
+            return True
+        linkedin = (c.get('linkedinUrl') or '').strip().lower()
+        if linkedin and linkedin in self.linkedins:
+            return True
+        key = self._name_key(c)
+        return bool(key and key in self.name_company)
+
+
+def _build_contact(contact_data: dict, uid: str, today: str) -> dict:
+    # Same schema as existing contacts
+    return {
+        'firstName': contact_data.get('firstName', '').strip(),
+        'lastName': contact_data.get('lastName', '').strip(),
+        'email': contact_data.get('email', '').strip(),
+        'linkedinUrl': contact_data.get('linkedinUrl', '').strip(),
+        'company': contact_data.get('company', ''),
+        'jobTitle': contact_data.get('jobTitle', ''),
+        'college': contact_data.get('college', ''),
+        'location': contact_data.get('location', ''),
+        'phone': contact_data.get('phone', ''),
+        'firstContactDate': today,
+        'status': 'Not Contacted',
+        'lastContactDate': today,
+        'userId': uid,
+        'createdAt': today,
+        'importedAt': datetime.now().isoformat(),
+        'importSource': 'spreadsheet',
+        'emailSource': contact_data.get('emailSource', 'imported'),
+        # pdlId for agentic queue dedup (from PDL enrichment path above).
+        'pdlId': contact_data.get('pdlId', '') or '',
+    }
+
+
+def _charge(uid: str, count: int, deduct: Callable) -> tuple[int, int]:
+    """Deduct credits for up to `count` contacts in one atomic call.
+
+    Returns (contacts_paid_for, remaining_credits). If the balance moved
+    since the job started, retries once for what is still affordable.
+    """
+    if count <= 0:
+        return 0, 0
+    ok, remaining = deduct(uid, count * CREDITS_PER_CONTACT, "contact_import")
+    if ok:
+        return count, remaining
+    affordable = min(count, max(0, remaining) // CREDITS_PER_CONTACT)
+    if affordable <= 0:
+        return 0, remaining
+    ok, remaining = deduct(uid, affordable * CREDITS_PER_CONTACT, "contact_import")
+    return (affordable, remaining) if ok else (0, remaining)
+
+
+def import_rows(
+    uid: str,
+    rows: list[dict],
+    credits: int,
+    *,
+    db,
+    enrich: Callable[[str], EnrichResult] = enrich_from_linkedin,
+    deduct: Optional[Callable] = None,
+    refund: Optional[Callable] = None,
+    on_progress: Optional[Callable[[ImportStats], None]] = None,
+) -> ImportStats:
+    """Create contacts for parsed spreadsheet rows. See module docstring."""
+    if deduct is None or refund is None:
+        from app.services.auth import deduct_credits_atomic, refund_credits_atomic
+        deduct = deduct or deduct_credits_atomic
+        refund = refund or refund_credits_atomic
+
+    contacts_ref = db.collection('users').document(uid).collection('contacts')
+    today = datetime.now().strftime('%m/%d/%Y')
+    stats = ImportStats(total=len(rows), credits_remaining=credits)
+    index = _DedupIndex.load(contacts_ref)
+    budget = credits // CREDITS_PER_CONTACT
+    enrich_slots = 0
+
+    logger.info(f"[ContactImport] Starting import: {len(rows)} rows, {len(index.emails)} existing emails, {credits} credits available")
+
+    with ThreadPoolExecutor(max_workers=max(1, IMPORT_ENRICH_CONCURRENCY),
+                            thread_name_prefix="import-enrich") as pool:
+        for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+            chunk = rows[start:start + IMPORT_BATCH_SIZE]
+
+            # 1. Validate, credit budget, dedup BEFORE enrichment so
+            # duplicates never spend PDL quota.
+            accepted = []
+            for contact_data in chunk:
+                if not _is_valid_contact(contact_data):
+                    stats.invalid += 1
+                    continue
+                if budget <= 0:
+                    stats.no_credits += 1
+                    continue
+                if index.is_duplicate(contact_data):
+                    stats.duplicate += 1
+                    continue
+                needs_enrich = False
+                if not contact_data.get('email', '').strip() and contact_data.get('linkedinUrl', '').strip():
+                    if enrich_slots < ENRICHMENT_CAP:
+                        enrich_slots += 1
+                        needs_enrich = True
+                    else:
+                        stats.enrichment_capped += 1
+                budget -= 1
+                index.add(contact_data)
+                accepted.append((dict(contact_data), needs_enrich))
+
+            # 2. Bounded-concurrency enrichment, results in row order.
+            to_enrich = [c['linkedinUrl'].strip() for c, needs in accepted if needs]
+            enriched = iter(pool.map(enrich, to_enrich)) if to_enrich else iter(())
+
+            # 3. Post-enrichment dedup + build.
+            pending = []
+            for contact_data, needs in accepted:
+                if needs:
+                    result = next(enriched)
+                    if result.pdl_id:
+                        contact_data['pdlId'] = result.pdl_id
+                    if result.ok:
+                        contact_data['email'] = result.email
+                        contact_data['emailSource'] = 'enriched'
+                        stats.enriched += 1
+                        if result.email.lower() in index.emails:
+                            stats.duplicate += 1
+                            budget += 1
+                            continue
+                        index.emails.add(result.email.lower())
+                    else:
+                        stats.enrichment_failed += 1
+                pending.append(_build_contact(contact_data, uid, today))
+
+            # 4. One credit deduction, one write batch.
+            paid, remaining = _charge(uid, len(pending), deduct)
+            if pending:
+                stats.credits_remaining = remaining
+            if paid < len(pending):
+                stats.no_credits += len(pending) - paid
+                budget = 0
+                pending = pending[:paid]
+            if pending:
+                refs = [contacts_ref.document() for _ in pending]
+                batch = db.batch()
+                for ref, contact in zip(refs, pending):
+                    batch.set(ref, contact)
+                try:
+                    batch.commit()
+                except Exception:
+                    refund(uid, paid * CREDITS_PER_CONTACT, "contact_import_refund")
+                    raise
+                record_contact_changes(uid, [(ref.id, None, contact) for ref, contact in zip(refs, pending)], db)
+                for ref, contact in zip(refs, pending):
+                    contact['id'] = ref.id
+                    stats.created_contacts.append(contact)
+                    if contact['email']:
+                        stats.for_drafting.append({'doc_id': ref.id, 'contact': contact})
+                stats.created += len(pending)
+
+            stats.processed += len(chunk)
+            if on_progress:
+                on_progress(stats)
+
+    return stats
+
+
+def _commit_in_batches(db, ops: list) -> None:
+    for start in range(0, len(ops), _MAX_BATCH_WRITES):
+        batch = db.batch()
+        for ref, data in ops[start:start + _MAX_BATCH_WRITES]:
+            batch.update(ref, data)
+        batch.commit()
+
+
+def draft_imported_contacts(uid: str, stats: ImportStats, *, db, user_email: str = "",
+                            auth_display_name: str = "") -> None:
+    """Phase 2: batch generate emails + create Gmail drafts."""
+    from app.services.gmail_client import create_gmail_draft_for_user, download_resume_from_url
+    from app.services.reply_generation import batch_generate_emails
+    from app.utils.scoring_profile import contact_features
+    from app.utils.users import get_outreach_email, merge_persona_fields
+    from app.utils.warmth_scoring import score_contacts_for_email
+
+    if not stats.for_drafting:
+        return
+    user_ref = db.collection('users').document(uid)
+    try:
+        user_doc = user_ref.get()
+        user_data_after = user_doc.to_dict() if user_doc.exists else {}
+        resume_text = (user_data_after.get('resumeText') or '').strip()
+        user_profile = {
+            'name': user_data_after.get('name', ''),
+            # Prefer the user's .edu for the outreach identity (signature
+            # + mailto); falls back to the primary account email.
+            'email': get_outreach_email(user_data_after) or user_email or '',
+            'university': user_data_after.get('university', ''),
+            'major': user_data_after.get('major', ''),
+            'year': user_data_after.get('year', ''),
+        }
+        # Professional persona fields (userType, currentRole/currentCompany)
+        merge_persona_fields(user_profile, user_data_after)
+        career_interests = user_data_after.get('careerInterests') or []
+        if isinstance(career_interests, str):
+            career_interests = [career_interests] if career_interests else []
+
+        email_contacts = []
+        for item in stats.for_drafting:
+            c = item['contact']
+            email_contacts.append({
+                'FirstName': c.get('firstName', ''),
+                'LastName': c.get('lastName', ''),
+                'Company': c.get('company', ''),
+                'Title': c.get('jobTitle', ''),
+                'Email': c.get('email', ''),
+                'LinkedIn': c.get('linkedinUrl', ''),
+            })
+
+        email_results = {}
+        try:
+            features = contact_features(email_contacts)
+            warmth_data = score_contacts_for_email(user_data_after or {}, email_contacts, features=features)
+            email_results = batch_generate_emails(
+                contacts=email_contacts,
+                resume_text=resume_text or None,
+                user_profile=user_profile,
+                career_interests=career_interests,
+                fit_context=None,
+                pre_parsed_user_info=(user_data_after or {}).get("resumeParsed"),
+                email_template_purpose='networking',
+                resume_filename=user_data_after.get('resumeFileName'),
+                signoff_config=None,
+                auth_display_name=auth_display_name or "",
+                warmth_data=warmth_data,
+                uid=uid,
+                contact_features=features,
+            )
+            logger.info(f"[ContactImport] Email generation succeeded for {len(email_results)} of {len(email_contacts)} contacts")
+        except Exception as e:
+            stats.email_gen_failed = True
+            stats.email_gen_error = str(e)
+            logger.error(f"[ContactImport] Email generation failed: {e}", exc_info=True)
+
+        user_info = {
+            'name': user_profile.get('name', ''),
+            'email': user_profile.get('email', ''),
+            'phone': user_data_after.get('phone', ''),
+            'linkedin': user_data_after.get('linkedin', ''),
+        }
+        resume_content = None
+        resume_filename = None
+        resume_url = user_data_after.get('resumeUrl')
+        if resume_url:
+            try:
+                resume_content, resume_filename = download_resume_from_url(resume_url)
+                stored_filename = user_data_after.get('resumeFileName')
+                if stored_filename:
+                    resume_filename = stored_filename
+                elif not resume_filename:
+                    resume_filename = 'resume.pdf'
+            except Exception as e:
+                logger.warning(f"[ContactImport] Resume download failed (drafts will have no attachment): {e}")
+
+        contacts_ref = db.collection('users').document(uid).collection('contacts')
+        updates = []
+        for idx, item in enumerate(stats.for_drafting):
+            r = email_results.get(idx) or email_results.get(str(idx))
+            if not r or not isinstance(r, dict):
+                stats.drafts_failed += 1
+                continue
+            subject = (r.get('subject') or '').strip()
+            body = (r.get('body') or '').strip()
+            if not subject or not body:
+                stats.drafts_failed += 1
+                continue
+
+            update_data = {
+                'emailSubject': subject,
+                'emailBody': body,
+                'draftCreatedAt': datetime.now().isoformat(),
+                'emailGeneratedAt': datetime.now().isoformat(),
+            }
+            contact_for_draft = {
+                'FirstName': item['contact'].get('firstName', ''),
+                'LastName': item['contact'].get('lastName', ''),
+                'Email': item['contact'].get('email', ''),
+            }
+            try:
+                draft_result = create_gmail_draft_for_user(
+                    contact=contact_for_draft,
+                    email_subject=subject,
+                    email_body=body,
+                    tier='free',
+                    user_email=user_email,
+                    user_id=uid,
+                    user_info=user_info,
+                    resume_content=resume_content,
+                    resume_filename=resume_filename,
+                )
+                if draft_result and isinstance(draft_result, dict):
+                    update_data['gmailDraftId'] = draft_result.get('draft_id', '')
+                    update_data['gmailDraftUrl'] = draft_result.get('draft_url', '')
+                    if draft_result.get('message_id'):
+                        update_data['gmailMessageId'] = draft_result.get('message_id', '')
+                    stats.drafts_created += 1
+                else:
+                    stats.drafts_failed += 1
+            except Exception as e:
+                stats.drafts_failed += 1
+                logger.warning(f"[ContactImport] Gmail draft failed for contact {item['doc_id']}: {e}")
+            updates.append((item, update_data))
+
+        _commit_in_batches(db, [(contacts_ref.document(item['doc_id']), data) for item, data in updates])
+        record_contact_changes(uid, [
+            (item['doc_id'], item['contact'], apply_contact_update(item['contact'], data))
+            for item, data in updates
+        ], db)
+    except Exception as e:
+        stats.email_gen_failed = True
+        stats.email_gen_error = str(e)
+        logger.error(f"[ContactImport] Draft phase error: {e}", exc_info=True)
+
+
+# ---------------------------------------------------------------------------
+# Job entry points
+# ---------------------------------------------------------------------------
+
+def start_import_job(uid: str, rows: list[dict], *, user_email: str = "",
+                     auth_display_name: str = "", db=None) -> str:
+    """Create the job doc and enqueue the import. Returns the job id."""
+    from app.services.rq_queue import enqueue
+
+    if db is None:
+        from app.extensions import get_db
+        db = get_db()
+    job_id = uuid.uuid4().hex
+    ref = import_job_ref(db, uid, job_id)
+    ref.set({
+        "status": JOB_QUEUED,
+        "total": len(rows),
+        "progress": ImportStats().progress(),
+        "createdAt": _now_iso(),
+        "updatedAt": _now_iso(),
+    })
+    try:
+        enqueue("contact_import", uid=uid, job_id=job_id, rows=rows,
+                user_email=user_email, auth_display_name=auth_display_name)
+    except Exception as e:
+        ref.update({"status": JOB_FAILED, "error": f"enqueue failed: {e}", "updatedAt": _now_iso()})
+        raise
+    return job_id
+
+
+def run_import_job(uid: str, job_id: str, rows: list[dict], user_email: str = "",
+                   auth_display_name: str = "", db=None, **deps) -> dict:
+    """RQ entry point (JOB_REGISTRY["contact_import"])."""
+    if db is None:
+        from app.extensions import get_db
+        db = get_db()
+    ref = import_job_ref(db, uid, job_id)
+    ref.update({"status": JOB_RUNNING, "startedAt": _now_iso(), "updatedAt": _now_iso()})
+
+    def on_progress(stats: ImportStats):
+        ref.update({"progress": stats.progress(), "updatedAt": _now_iso()})
+
+    try:
+        user_doc = db.collection('users').document(uid).get()
+        credits = (user_doc.to_dict() or {}).get('credits', 0) if user_doc.exists else 0
+        stats = import_rows(uid, rows, credits, db=db, on_progress=on_progress, **deps)
+        draft_imported_contacts(uid, stats, db=db, user_email=user_email,
+                                auth_display_name=auth_display_name)
+    except Exception as e:
+        logger.error(f"[ContactImport] job {job_id} failed: {e}", exc_info=True)
+        ref.update({"status": JOB_FAILED, "error": str(e), "updatedAt": _now_iso()})
+        raise
+
+    logger.info(f"[ContactImport] Import complete: created={stats.created}, duplicates={stats.duplicate}, "
+                f"enriched={stats.enriched}, drafts={stats.drafts_created}/{len(stats.for_drafting)}, "
+                f"drafts_failed={stats.drafts_failed}, email_gen_failed={stats.email_gen_failed}")
+    result = stats.result()
+    try:
+        ref.update({
+            "status": JOB_COMPLETED,
+            "progress": stats.progress(),
+            "result": result,
+            "completedAt": _now_iso(),
+            "updatedAt": _now_iso(),
+        })
+    except Exception as e:
+        # Contacts are already saved; don't leave the job "running" forever
+        # because the summary couldn't be written.
+        logger.error(f"[ContactImport] job {job_id} result write failed: {e}", exc_info=True)
+        ref.update({"status": JOB_FAILED, "error": f"result write failed: {e}",
+                    "progress": stats.progress(), "updatedAt": _now_iso()})
+        raise
+    return result
+
+
+def get_import_job(uid: str, job_id: str, db=None) -> Optional[dict]:
+    if db is None:
+        from app.extensions import get_db
+        db = get_db()
+    snap = import_job_ref(db, uid, job_id).get()
+    if not snap.exists:
+        return None
+    return {"jobId": job_id, **(snap.to_dict() or {})}
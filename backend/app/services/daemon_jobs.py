@@ -0,0 +1,217 @@
+"""
+daemon_jobs — job bodies for the scanners that used to live inline in wsgi.py.
+
+Each function is one iteration of what was a `while True: ...; sleep()`
+daemon thread. Scheduling (interval, boot delay, enable flags) now lives in
+job_scheduler.PERIODIC_JOBS and execution goes through rq_queue.run_job, so
+the same body runs either on the RQ worker or in-process on the web service.
+
+Contract: docs/designs/tracker-daemon-contract.md. The heartbeat docs under
+`system/` are unchanged, so the watchdog thresholds below still apply.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+
+def run_tracker_scanners() -> None:
+    """Nudge, queue and aggregation scanners (every 6 hours).
+
+    Each scanner runs inside its own try/except so one scanner's failure does
+    NOT prevent the others from running in the same iteration. Ownership:
+    Flywheel owns the cadence; each scanner is owned by its feature team.
+    """
+    tracker_logger = logging.getLogger("tracker_scanner")
+
+    # ---- Nudge scanner (Flywheel Phase 1) -----------------------
+    # Isolated: a crash here MUST NOT block other scanners below.
+    if os.getenv("NUDGES_ENABLED", "true").lower() == "true":
+        try:
+            from app.services.nudge_service import scan_and_generate_nudges
+            scan_and_generate_nudges()
+        except Exception:
+            logging.getLogger("nudge_scanner").exception("Nudge scanner iteration failed")
+    else:
+        tracker_logger.info("Nudge scanner disabled via NUDGES_ENABLED=false")
+
+    # ---- Queue scanner (Agentic Queue Phase 2) ------------------
+    # Tuesday-gated per docs/designs/tracker-daemon-contract.md.
+    # Isolated: a crash here must NOT block the aggregation scanner.
+    if os.getenv("QUEUE_SCANNER_ENABLED", "true").lower() == "true":
+        try:
+            from app.services.queue_service import scan_and_generate_queues
+            scan_and_generate_queues()
+        except Exception:
+            logging.getLogger("queue_scanner").exception("Queue scanner iteration failed")
+    else:
+        tracker_logger.info("Queue scanner disabled via QUEUE_SCANNER_ENABLED=false")
+
+    # ---- Aggregation scanner (AI Flywheel Phase 2) --------------
+    # Sunday 3-9am UTC window, gated internally. Full contact scan
+    # for analytics/email_outcomes segments. See the daemon contract.
+    if os.getenv("AGGREGATION_SCANNER_ENABLED", "true").lower() == "true":
+        try:
+            from app.services.email_baseline import aggregate_email_outcomes
+            aggregate_email_outcomes()
+        except Exception:
+            logging.getLogger("aggregation_scanner").exception("Aggregation scanner iteration failed")
+    else:
+        tracker_logger.info("Aggregation scanner disabled via AGGREGATION_SCANNER_ENABLED=false")
+
+
+def renew_gmail_watches() -> dict:
+    """Re-arm Gmail push watches that expire within a day (every 6 days).
+
+    Raises on a failure to list users so the job framework retries the whole
+    cycle; per-user failures are counted and logged instead.
+    """
+    watch_logger = logging.getLogger("watch_renewal")
+    from app.extensions import get_db
+    from app.services.gmail_client import renew_gmail_watch
+
+    db = get_db()
+    now_ms = int(time.time() * 1000)
+    one_day_ms = 86400 * 1000
+    renewed = 0
+    failed = 0
+    # Materialize the user list here so a mid-iteration Firestore page-fetch
+    # failure aborts the cycle (and gets retried) rather than failing partway
+    # through the loop and skipping later users for 6 days. The per-user try
+    # below only guards the body.
+    user_docs = list(db.collection("users").stream())
+    for user_doc in user_docs:
+        uid = user_doc.id
+        try:
+            gmail_ref = db.collection("users").document(uid).collection("integrations").document("gmail")
+            gmail_doc = gmail_ref.get()
+            if not gmail_doc.exists:
+                continue
+            data = gmail_doc.to_dict() or {}
+            if not (data.get("token") or data.get("refresh_token")):
+                continue
+            watch_exp = data.get("watchExpiration")
+            if watch_exp is not None:
+                try:
+                    watch_exp = int(watch_exp)
+                except (TypeError, ValueError):
+                    watch_exp = None
+            if watch_exp is not None and (watch_exp - now_ms) >= one_day_ms:
+                continue
+            try:
+                renew_gmail_watch(uid)
+                renewed += 1
+            except Exception as e:
+                failed += 1
+                watch_logger.error("Watch renewal failed uid=%s: %s", uid, e)
+        except Exception:
+            failed += 1
+            watch_logger.exception("Watch renewal aborted for uid=%s", uid)
+    watch_logger.info("Watch renewal complete: renewed=%d failed=%d", renewed, failed)
+    # Heartbeat: mark cycle success for the daemon watchdog at
+    # system/gmail_watch. Failure to write must not break the cycle.
+    try:
+        db.collection("system").document("gmail_watch").set({
+            "lastSuccessAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "renewedCount": renewed,
+            "failedCount": failed,
+        })
+    except Exception:
+        watch_logger.exception("Failed to write gmail_watch heartbeat")
+    return {"renewed": renewed, "failed": failed}
+
+
+# Staleness thresholds in seconds.
+# Nudge: 8h (2h slack on 6h cadence)
+# Queue: 7d (slightly over one-week Tuesday cadence)
+# Aggregation: 8d (slightly over one-week Sunday cadence)
+# Gmail watch: 6.5d (6-day renewal cadence + 12h slack). MUST stay
+# under 7d — Gmail push watches expire at exactly 7d, so this must
+# fire BEFORE expiry to leave time for investigation / manual re-arm.
+# A 7d threshold means the alert lands the same moment watches die.
+DAEMON_STALENESS_SECONDS = {
+    "nudge_scanner": 8 * 3600,
+    "queue_scanner": 7 * 24 * 3600,
+    "aggregation_scanner": 8 * 24 * 3600,
+    "gmail_watch": 6 * 24 * 3600 + 12 * 3600,
+}
+
+
+def check_daemon_health() -> list[str]:
+    """Read each scanner's health doc and flag stale ones (every hour).
+
+    TODOS.md P1: "Daemon Thread Healthcheck & Auto-Restart". Returns the
+    list of stale scanner names.
+    """
+    watchdog_logger = logging.getLogger("daemon_watchdog")
+    from app.extensions import get_db
+
+    db = get_db()
+    now = datetime.now(timezone.utc)
+    stale_scanners = []
+
+    for scanner_name, threshold_seconds in DAEMON_STALENESS_SECONDS.items():
+        try:
+            doc = db.collection("system").document(scanner_name).get()
+            if not doc.exists:
+                # Scanner hasn't run yet — only warn if it should have had
+                # enough time (> threshold).
+                watchdog_logger.debug("No health doc for %s (may not have run yet)", scanner_name)
+                continue
+
+            data = doc.to_dict() or {}
+            last_success = data.get("lastSuccessAt")
+            if not last_success:
+                continue
+
+            # Parse ISO timestamp
+            if isinstance(last_success, str):
+                last_success = datetime.fromisoformat(last_success.replace("Z", "+00:00"))
+
+            age_seconds = (now - last_success).total_seconds()
+            if age_seconds > threshold_seconds:
+                stale_scanners.append(scanner_name)
+                watchdog_logger.critical(
+                    "STALE: %s last succeeded %.1f hours ago (threshold: %.1f hours)",
+                    scanner_name,
+                    age_seconds / 3600,
+                    threshold_seconds / 3600,
+                )
+                # Emit a PostHog event so staleness is queryable outside
+                # logs. sync=True because the process can die between
+                # async flushes.
+                try:
+                    from app.utils.posthog_client import track_event
+                    track_event(
+                        None,
+                        "daemon_stale",
+                        {
+                            "scanner": scanner_name,
+                            "age_hours": age_seconds / 3600,
+                            "threshold_hours": threshold_seconds / 3600,
+                        },
+                        sync=True,
+                    )
+                except Exception:
+                    watchdog_logger.exception("Failed to emit daemon_stale event")
+        except Exception:
+            watchdog_logger.exception("Error checking health for %s", scanner_name)
+
+    if not stale_scanners:
+        watchdog_logger.info("All daemons healthy")
+    else:
+        # Write a watchdog status doc so external monitors (Render health
+        # checks, future alerting) can read it.
+        try:
+            db.collection("system").document("watchdog").set({
+                "lastCheckAt": now.isoformat().replace("+00:00", "Z"),
+                "staleScanners": stale_scanners,
+                "healthy": len(stale_scanners) == 0,
+            })
+        except Exception:
+            watchdog_logger.exception("Failed to write watchdog status")
+    return stale_scanners
@@ -0,0 +1,544 @@
+"""Per-user dashboard aggregates, maintained incrementally.
+
+The dashboard endpoints used to stream the whole contacts subcollection on
+every page load, so latency and read cost grew with the user's network.
+They now read one precomputed doc:
+
+    users/{uid}/aggregates/dashboard
+      version, builtAt
+      totalSent, totalReplies
+      months     {YYYY-MM: {outreach, replies}}
+      firms      {key: {name, contacts, replies}}     sent contacts per company
+      companies  {key: {name, count}}                 every contact per company
+      locations  {key: {name, city, state, contacts}}
+      unreadCount                                     contacts with an unread reply
+      awaitingCount                                   sent, no reply yet
+
+Map keys for companies and locations are short hashes, so arbitrary company
+names never end up in Firestore field paths. The doc holds no contact ids:
+its size is bounded by the user's companies and months, not their contacts.
+The recommendations endpoint fetches the few ids it shows with bounded
+queries (unread_reply_contacts, follow_up_contacts) when the counts say
+there are any.
+
+Each contact contributes a fixed set of counters (contact_contribution).
+Write sites that create, draft, send, reply to or delete a contact call
+record_contact_change(uid, contact_id, before, after) with the contact data
+before and after the write; sites that write many contacts at once collect
+(contact_id, before, after) and call record_contact_changes once, so a
+batch costs one write to this (single, hot) doc instead of one per contact.
+The difference between the contributions is applied as set(merge=True) of
+Increments. Nothing is written when the change doesn't touch dashboard
+fields, and failures are logged, never raised to the write path. Every call
+also invalidates the user's briefing snapshot (services/briefing_snapshot.py),
+since these are the same write sites.
+
+rebuild_dashboard_aggregates() recomputes the doc from scratch. It is the
+repair routine. load_dashboard_aggregates() also runs it when the doc is
+missing, on an older schema version, or older than DASHBOARD_AGG_REBUILD_SECONDS,
+which bounds drift from writers that don't report changes. The manual
+rebuild endpoint is held to one run per user per DASHBOARD_AGG_REBUILD_COOLDOWN
+seconds (judged by builtAt, so it holds across processes), and concurrent
+loads of a stale doc in one process rebuild it once.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.services.briefing_snapshot import invalidate_briefing
+
+logger = logging.getLogger(__name__)
+
+AGGREGATES_VERSION = 2
+DASHBOARD_AGG_REBUILD_SECONDS = int(os.getenv("DASHBOARD_AGG_REBUILD_SECONDS", str(24 * 3600)))
+DASHBOARD_AGG_REBUILD_COOLDOWN = int(os.getenv("DASHBOARD_AGG_REBUILD_COOLDOWN", "300"))
+# Firestore caps field transforms (Increments) per document per commit.
+MAX_TRANSFORMS_PER_WRITE = 500
+# Upper bound on contacts the recommendation id queries read.
+RECOMMENDATION_SCAN_LIMIT = int(os.getenv("DASHBOARD_REC_SCAN_LIMIT", "50"))
+
+REPLY_THREAD_STATUSES = ("new_reply", "waiting_on_you")
+FOLLOW_UP_AFTER_DAYS = 3
+
+
+def aggregates_ref(db, uid: str):
+    return db.collection("users").document(uid).collection("aggregates").document("dashboard")
+
+
+def _key(*parts: str) -> str:
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def month_key(date_str) -> Optional[str]:
+    """ISO date string -> 'YYYY-MM', or None if it doesn't parse."""
+    try:
+        dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        return dt.strftime('%Y-%m')
+    except Exception:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Per-contact contribution
+# ---------------------------------------------------------------------------
+
+def contact_contribution(contact_id: str, data: Optional[dict]) -> dict:
+    """What one contact adds to the aggregates doc.
+
+    Returns {"counters": {path: n}, "labels": {path: value}} where paths are
+    tuples of field names. Counters are summed across contacts, and labels
+    are names stored beside counters.
+    """
+    counters: Counter = Counter()
+    labels: dict = {}
+    if not data:
+        return {"counters": counters, "labels": labels}
+
+    status = data.get("threadStatus")
+    status_str = status if isinstance(status, str) else ""
+    company = data.get("company") or ""
+
+    # Stats: a contact counts as sent once it has a draft or a thread.
+    sent = bool(
+        data.get("gmailDraftId") or data.get("gmail_draft_id") or data.get("gmailDraftUrl")
+        or data.get("gmailThreadId") or data.get("gmail_thread_id")
+    )
+    if sent:
+        replied = bool(
+            data.get("hasUnreadReply") or status in REPLY_THREAD_STATUSES
+            or (status_str and "reply" in status_str.lower())
+        )
+        counters[("totalSent",)] += 1
+        if replied:
+            counters[("totalReplies",)] += 1
+        sent_date = data.get("draftCreatedAt") or data.get("lastActivityAt") or data.get("createdAt")
+        month = month_key(sent_date) if sent_date else None
+        if month:
+            counters[("months", month, "outreach")] += 1
+            if replied:
+                counters[("months", month, "replies")] += 1
+        if company:
+            k = _key(company)
+            labels[("firms", k, "name")] = company
+            counters[("firms", k, "contacts")] += 1
+            if replied:
+                counters[("firms", k, "replies")] += 1
+
+    if company:
+        k = _key(company)
+        labels[("companies", k, "name")] = company
+        counters[("companies", k, "count")] += 1
+
+    location = data.get("location") or ""
+    if company and location:
+        parts = location.split(",")
+        if len(parts) >= 2:
+            city, state = parts[0].strip(), parts[1].strip()
+            k = _key(company, city, state)
+            labels[("locations", k, "name")] = company
+            labels[("locations", k, "city")] = city
+            labels[("locations", k, "state")] = state
+            counters[("locations", k, "contacts")] += 1
+
+    # Recommendations use narrower draft/reply definitions than the stats.
+    if is_unread_reply(data):
+        counters[("unreadCount",)] += 1
+    if awaiting_since(data):
+        counters[("awaitingCount",)] += 1
+
+    return {"counters": counters, "labels": labels}
+
+
+def is_unread_reply(data: dict) -> bool:
+    return bool(data.get("hasUnreadReply") or data.get("threadStatus") == "new_reply")
+
+
+def awaiting_since(data: dict) -> Optional[str]:
+    """Last activity of a contact that was sent and has no reply, else None."""
+    rec_sent = bool(data.get("gmailDraftId") or data.get("gmailDraftUrl") or data.get("gmailThreadId"))
+    rec_replied = bool(data.get("hasUnreadReply") or data.get("threadStatus") in REPLY_THREAD_STATUSES)
+    last_activity = data.get("lastActivityAt") or data.get("draftCreatedAt")
+    if rec_sent and not rec_replied and isinstance(last_activity, str) and last_activity:
+        return last_activity
+    return None
+
+
+def apply_contact_update(before: Optional[dict], update: dict) -> dict:
+    """`before` with a Firestore update applied: DELETE_FIELD removes the
+    key instead of standing in as its value."""
+    from firebase_admin import firestore as _fs
+
+    after = dict(before or {})
+    for k, v in update.items():
+        if v is _fs.DELETE_FIELD:
+            after.pop(k, None)
+        else:
+            after[k] = v
+    return after
+
+
+def _nest(flat: dict) -> dict:
+    out: dict = {}
+    for path, value in flat.items():
+        node = out
+        for part in path[:-1]:
+            node = node.setdefault(part, {})
+        node[path[-1]] = value
+    return out
+
+
+def fold_contributions(contributions) -> dict:
+    """Aggregates doc body (without version/builtAt) from contributions."""
+    counters: Counter = Counter()
+    flat: dict = {}
+    for c in contributions:
+        counters.update(c["counters"])
+        flat.update(c["labels"])
+    flat.update(counters)
+    doc = {"totalSent": 0, "totalReplies": 0, "unreadCount": 0, "awaitingCount": 0,
+           "months": {}, "firms": {}, "companies": {}, "locations": {}}
+    doc.update(_nest(flat))
+    return doc
+
+
+def changes_delta(changes) -> list[dict]:
+    """set(merge=True) payloads applying every (contact_id, before, after)
+    in `changes`; [] if they cancel out or touch nothing. One payload unless
+    the batch needs more than MAX_TRANSFORMS_PER_WRITE Increments."""
+    from google.cloud.firestore_v1 import Increment
+
+    counters: Counter = Counter()
+    labels: dict = {}
+    for contact_id, before, after in changes:
+        old = contact_contribution(contact_id, before)
+        new = contact_contribution(contact_id, after)
+        counters.update(new["counters"])
+        counters.subtract(old["counters"])
+        labels.update(new["labels"])
+
+    # Labels are fixed per key (the key hashes them), so they only need
+    # writing alongside a counter change that may create the map entry.
+    by_parent: dict = {}
+    for path, diff in sorted(counters.items()):
+        if diff:
+            by_parent.setdefault(path[:-1], {})[path] = Increment(diff)
+    payloads, flat, transforms = [], {}, 0
+    for parent, increments in by_parent.items():
+        if flat and transforms + len(increments) > MAX_TRANSFORMS_PER_WRITE:
+            payloads.append(_nest(flat))
+            flat, transforms = {}, 0
+        flat.update(increments)
+        transforms += len(increments)
+        flat.update({p: v for p, v in labels.items() if p[:-1] == parent})
+    if flat:
+        payloads.append(_nest(flat))
+    return payloads
+
+
+# ---------------------------------------------------------------------------
+# Write side
+# ---------------------------------------------------------------------------
+
+def record_contact_change(uid: str, contact_id: str, before: Optional[dict],
+                          after: Optional[dict], db=None) -> bool:
+    """Apply one contact's create/update/delete to the aggregates doc.
+
+    `before` is None for a create, `after` is None for a delete. Returns
+    True if a write was issued. Never raises.
+    """
+    if not contact_id:
+        return False
+    return record_contact_changes(uid, [(contact_id, before, after)], db)
+
+
+def record_contact_changes(uid: str, changes, db=None) -> bool:
+    """Apply a batch of (contact_id, before, after) changes in one write.
+
+    Returns True if a write was issued. Never raises.
+    """
+    changes = [c for c in changes if c[0]]
+    if not uid or not changes:
+        return False
+    invalidate_briefing(uid)
+    try:
+        payloads = changes_delta(changes)
+        if not payloads:
+            return False
+        if db is None:
+            from app.extensions import get_db
+            db = get_db()
+        ref = aggregates_ref(db, uid)
+        for payload in payloads:
+            ref.set(payload, merge=True)
+        return True
+    except Exception as e:
+        logger.warning("dashboard aggregates update failed uid=%s contacts=%d: %s", uid, len(changes), e)
+        return False
+
+
+# Striped so the lock table stays fixed-size however many users load.
+_rebuild_locks = [threading.Lock() for _ in range(64)]
+
+
+def _rebuild_lock(uid: str) -> threading.Lock:
+    return _rebuild_locks[int(_key(uid), 16) % len(_rebuild_locks)]
+
+
+def rebuild_dashboard_aggregates(uid: str, db=None) -> dict:
+    """Recompute users/{uid}/aggregates/dashboard from the contacts."""
+    if db is None:
+        from app.extensions import get_db
+        db = get_db()
+    contacts = db.collection("users").document(uid).collection("contacts").stream()
+    doc = fold_contributions(contact_contribution(c.id, c.to_dict()) for c in contacts)
+    doc["version"] = AGGREGATES_VERSION
+    doc["builtAt"] = datetime.now(timezone.utc).isoformat()
+    aggregates_ref(db, uid).set(doc)
+    return doc
+
+
+def request_rebuild(uid: str, db=None) -> Optional[dict]:
+    """The manual rebuild: None if the doc was built less than
+    DASHBOARD_AGG_REBUILD_COOLDOWN seconds ago (by anyone, in any process),
+    else the rebuilt doc."""
+    if db is None:
+        from app.extensions import get_db
+        db = get_db()
+    with _rebuild_lock(uid):
+        snap = aggregates_ref(db, uid).get()
+        built = _built_at(snap.to_dict() if snap.exists else None)
+        if built and datetime.now(timezone.utc) - built < timedelta(seconds=DASHBOARD_AGG_REBUILD_COOLDOWN):
+            return None
+        return rebuild_dashboard_aggregates(uid, db)
+
+
+def _built_at(doc: Optional[dict]) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(doc["builtAt"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _is_current(doc: dict, now: datetime) -> bool:
+    built = _built_at(doc)
+    if doc.get("version") != AGGREGATES_VERSION or built is None:
+        return False
+    return now - built < timedelta(seconds=DASHBOARD_AGG_REBUILD_SECONDS)
+
+
+def load_dashboard_aggregates(uid: str, db=None) -> dict:
+    """The aggregates doc, rebuilt first if missing or stale."""
+    if db is None:
+        from app.extensions import get_db
+        db = get_db()
+    ref = aggregates_ref(db, uid)
+    snap = ref.get()
+    doc = snap.to_dict() if snap.exists else None
+    if doc and _is_current(doc, datetime.now(timezone.utc)):
+        return doc
+    # Concurrent dashboard requests all see the stale doc; the first one
+    # rebuilds and the rest re-read its result.
+    with _rebuild_lock(uid):
+        snap = ref.get()
+        doc = snap.to_dict() if snap.exists else None
+        if doc and _is_current(doc, datetime.now(timezone.utc)):
+            return doc
+        return rebuild_dashboard_aggregates(uid, db)
+
+
+def _contacts_ref(db, uid: str):
+    return db.collection("users").document(uid).collection("contacts")
+
+
+def unread_reply_contacts(db, uid: str, agg: dict, limit: int = RECOMMENDATION_SCAN_LIMIT) -> dict:
+    """{contactId: data} for up to `limit` contacts with an unread reply, in
+    contact-id order. No reads when the aggregates count none."""
+    if not agg.get("unreadCount"):
+        return {}
+    from google.cloud.firestore_v1.base_query import FieldFilter
+
+    ref = _contacts_ref(db, uid)
+    found = {}
+    for field, value in (("hasUnreadReply", True), ("threadStatus", "new_reply")):
+        for snap in ref.where(filter=FieldFilter(field, "==", value)).limit(limit).stream():
+            found[snap.id] = snap.to_dict() or {}
+    return dict(sorted(found.items())[:limit])
+
+
+def follow_up_contacts(db, uid: str, agg: dict, now: Optional[datetime] = None,
+                       limit: int = 3) -> dict:
+    """{contactId: data} for up to `limit` sent, unanswered contacts whose last
+    activity is FOLLOW_UP_AFTER_DAYS+ old, most recently active first. Reads
+    at most 2 * RECOMMENDATION_SCAN_LIMIT contacts; none when the aggregates
+    count no awaiting contacts."""
+    if not agg.get("awaitingCount"):
+        return {}
+    from google.cloud.firestore_v1 import Query
+    from google.cloud.firestore_v1.base_query import FieldFilter
+
+    now = now or datetime.utcnow()
+    cutoff = (now - timedelta(days=FOLLOW_UP_AFTER_DAYS)).isoformat()
+    ref = _contacts_ref(db, uid)
+    found = {}
+    # awaiting_since() reads lastActivityAt, falling back to draftCreatedAt.
+    for field in ("lastActivityAt", "draftCreatedAt"):
+        query = (ref.where(filter=FieldFilter(field, "<=", cutoff))
+                 .order_by(field, direction=Query.DESCENDING)
+                 .limit(RECOMMENDATION_SCAN_LIMIT))
+        for snap in query.stream():
+            data = snap.to_dict() or {}
+            if field == "draftCreatedAt" and data.get("lastActivityAt"):
+                continue
+            if awaiting_since(data):
+                found[snap.id] = data
+    ranked = sorted(found.items(), key=lambda kv: (awaiting_since(kv[1]), kv[0]), reverse=True)
+    out = {}
+    for contact_id, data in ranked:
+        if _days_ago(awaiting_since(data), now) is not None:
+            out[contact_id] = data
+            if len(out) >= limit:
+                break
+    return out
+
+
+def _days_ago(last_activity: str, now: datetime) -> Optional[int]:
+    """Whole days since `last_activity` if it is FOLLOW_UP_AFTER_DAYS+ ago."""
+    try:
+        last_date = datetime.fromisoformat(last_activity.replace('Z', '+00:00'))
+        days_ago = (now - last_date.replace(tzinfo=None)).days
+    except Exception:
+        return None
+    return days_ago if days_ago >= FOLLOW_UP_AFTER_DAYS else None
+
+
+# ---------------------------------------------------------------------------
+# Read side: endpoint payloads from the aggregates doc
+# ---------------------------------------------------------------------------
+
+def dashboard_stats(agg: dict, now: Optional[datetime] = None) -> dict:
+    now = now or datetime.now()
+    months = agg.get("months") or {}
+    months_data = []
+    for i in range(5, -1, -1):  # Last 6 months
+        month_date = now - timedelta(days=30 * i)
+        bucket = months.get(month_date.strftime('%Y-%m')) or {}
+        months_data.append({
+            "month": month_date.strftime('%b'),
+            "outreach": bucket.get("outreach", 0),
+            "replies": bucket.get("replies", 0),
+        })
+
+    total_sent = agg.get("totalSent", 0)
+    total_replies = agg.get("totalReplies", 0)
+    response_rate = (total_replies / total_sent * 100) if total_sent > 0 else 0
+
+    firms = [f for f in (agg.get("firms") or {}).values() if f.get("contacts", 0) > 0]
+    firms.sort(key=lambda f: (-f["contacts"], f.get("name", "")))
+    top_firms = [
+        {
+            "name": f.get("name", ""),
+            "contacts": f["contacts"],
+            "replyRate": f.get("replies", 0) / f["contacts"] * 100,
+        }
+        for f in firms[:5]
+    ]
+    return {
+        "outreachByMonth": months_data,
+        "replyStats": {
+            "totalReplies": total_replies,
+            "responseRate": round(response_rate, 1),
+            "totalSent": total_sent,
+        },
+        "topFirms": top_firms,
+    }
+
+
+def recommendations(agg: dict, follow_ups: dict, unread: dict,
+                    now: Optional[datetime] = None) -> list[dict]:
+    """Recommendations payload. `follow_ups` and `unread` are the
+    {contactId: data} maps from follow_up_contacts() and
+    unread_reply_contacts()."""
+    now = now or datetime.utcnow()
+    recs = []
+    for contact_id, data in follow_ups.items():
+        days_ago = _days_ago(awaiting_since(data) or "", now)
+        if days_ago is None:
+            continue
+        contact_name = (
+            f"{data.get('firstName', '')} {data.get('lastName', '')}".strip() or
+            data.get('email', '').split('@')[0]
+        )
+        company = data.get('company', 'Unknown Company')
+        recs.append({
+            "type": "follow_up",
+            "title": f"Follow up with {contact_name} at {company}",
+            "description": f"You reached out {days_ago} days ago - a follow-up could help",
+            "action": "Draft follow-up",
+            "contactId": contact_id,
+            "priority": "high",
+        })
+
+    unread_count = agg.get("unreadCount", 0)
+    if unread_count > 0 and unread:
+        unread_items = sorted(unread.items())
+        company_names = [d.get("company", "contacts") for _, d in unread_items[:2]]
+        companies_str = " and ".join(company_names) if len(company_names) <= 2 else f"{company_names[0]} and {unread_count - 1} others"
+        recs.append({
+            "type": "unread_replies",
+            "title": f"You have {unread_count} unread {'reply' if unread_count == 1 else 'replies'} to review",
+            "description": f"Recent responses from {companies_str}",
+            "action": "View replies",
+            "contactIds": [cid for cid, _ in unread_items],
+            "priority": "high",
+        })
+
+    companies = [c for c in (agg.get("companies") or {}).values() if c.get("count", 0) > 0]
+    companies.sort(key=lambda c: (-c["count"], c.get("name", "")))
+    top_firms = companies[:5]
+    if len(top_firms) >= 3:
+        recs.append({
+            "type": "explore_firms",
+            "title": "Students like you often target these firms next",
+            "description": f"Based on your search history: {', '.join([f['name'] for f in top_firms[:3]])}",
+            "action": "Explore firms",
+            "priority": "medium",
+        })
+
+    recs.sort(key=lambda x: {"high": 0, "medium": 1, "low": 2}.get(x.get("priority", "low"), 2))
+    return recs[:3]
+
+
+# Note: This is a simplified mapping. For production, use a geocoding service
+STATE_COORDS = {
+    "NY": {"x": 82, "y": 35},
+    "CA": {"x": 15, "y": 42},
+    "MA": {"x": 85, "y": 32},
+    "IL": {"x": 62, "y": 38},
+    "TX": {"x": 54, "y": 68},
+    "FL": {"x": 78, "y": 72},
+}
+
+
+def firm_locations(agg: dict, limit: int = 20) -> list[dict]:
+    locations = []
+    for loc in (agg.get("locations") or {}).values():
+        if loc.get("contacts", 0) <= 0:
+            continue
+        state = loc.get("state", "")
+        # Get first 2 letters of state (handle "New York" -> "NY")
+        state_abbr = state[:2].upper() if len(state) <= 2 else state.split()[0][:2] if " " in state else state[:2]
+        locations.append({
+            "name": loc.get("name", ""),
+            "city": loc.get("city", ""),
+            "state": state,
+            "contacts": loc["contacts"],
+            "coordinates": STATE_COORDS.get(state_abbr, {"x": 50, "y": 40}),  # Default center
+        })
+    locations.sort(key=lambda x: (-x["contacts"], x["name"], x["city"], x["state"]))
+    return locations[:limit]
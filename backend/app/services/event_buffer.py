@@ -0,0 +1,255 @@
+"""
+Buffered, batched Firestore writes for product and metrics events.
+
+events_service.log_event and metrics_events.log_event run on request paths
+(search, email generation, Gmail webhooks, the /api/metrics/events route).
+A synchronous create/add per event put a Firestore round trip inside every
+one of those requests, and that cost grows with engagement.
+
+Each event source owns an EventBuffer:
+
+  - put() appends the write to a bounded in-process queue and returns.
+    A daemon flusher thread commits it with WriteBatch once the queue
+    reaches EVENT_BUFFER_FLUSH_SIZE or the oldest write has waited
+    EVENT_BUFFER_FLUSH_SECONDS.
+  - Document ids are fixed at put() time. Writes with an idempotency key
+    use batch.create, so a duplicate key is still a silent skip; if a
+    batch fails on an existing doc, its writes are replayed one by one so
+    only the duplicates are dropped. Writes without a key get a generated
+    id and batch.set, which keeps a retried flush harmless.
+  - Backpressure: when EVENT_BUFFER_MAX_PENDING writes are waiting, new
+    events are dropped (events are best-effort; request latency is not)
+    and counted in stats()["dropped"]. Commit failures are counted in
+    stats()["failed"].
+  - flush_all() drains every buffer. It runs at interpreter exit (atexit)
+    and at the end of every RQ job (rq_queue.run_job), because forked RQ
+    work horses leave through os._exit and skip atexit.
+  - EVENT_BUFFER_ENABLED=false writes each event inline, as before.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import secrets
+import string
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EVENT_BUFFER_ENABLED = os.getenv("EVENT_BUFFER_ENABLED", "true").lower() == "true"
+EVENT_BUFFER_MAX_PENDING = int(os.getenv("EVENT_BUFFER_MAX_PENDING", "5000"))
+EVENT_BUFFER_FLUSH_SIZE = int(os.getenv("EVENT_BUFFER_FLUSH_SIZE", "200"))  # Firestore caps batches at 500
+EVENT_BUFFER_FLUSH_SECONDS = float(os.getenv("EVENT_BUFFER_FLUSH_SECONDS", "2.0"))
+
+_AUTO_ID_CHARS = string.ascii_letters + string.digits
+
+
+def auto_id() -> str:
+    """20-char id in the same alphabet Firestore uses for add()."""
+    return "".join(secrets.choice(_AUTO_ID_CHARS) for _ in range(20))
+
+
+@dataclass
+class PendingWrite:
+    path: Tuple[str, ...]                       # collection path, e.g. ("users", uid, "events")
+    doc_id: str
+    data: dict
+    create: bool = False                        # True = idempotency key; skip if it exists
+    on_commit: Optional[Callable[[], None]] = None
+
+
+def _already_exists(exc: Exception) -> bool:
+    text = str(exc)
+    return "ALREADY_EXISTS" in text or "already exists" in text.lower()
+
+
+class EventBuffer:
+    """Bounded queue of event writes with a background batch flusher."""
+
+    def __init__(
+        self,
+        name: str,
+        get_db: Callable[[], object],
+        *,
+        max_pending: Optional[int] = None,
+        flush_size: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.name = name
+        self._get_db = get_db
+        self.max_pending = EVENT_BUFFER_MAX_PENDING if max_pending is None else max_pending
+        self.flush_size = max(1, min(500, EVENT_BUFFER_FLUSH_SIZE if flush_size is None else flush_size))
+        self.flush_seconds = EVENT_BUFFER_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self.enabled = EVENT_BUFFER_ENABLED if enabled is None else enabled
+        self._reset_state()
+        _BUFFERS.add(self)
+
+    def _reset_state(self) -> None:
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()      # one committer at a time
+        self._items: "deque[Tuple[float, PendingWrite]]" = deque()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"enqueued": 0, "written": 0, "duplicates": 0,
+                       "dropped": 0, "failed": 0, "flushes": 0}
+        self._last_drop_log = 0.0
+
+    # -- producer side -----------------------------------------------------
+
+    def put(self, write: PendingWrite) -> bool:
+        """Queue a write. Returns False if it was dropped (buffer full)."""
+        if not self.enabled:
+            self._commit([write])
+            return True
+        with self._cond:
+            if len(self._items) >= self.max_pending:
+                self._stats["dropped"] += 1
+                now = time.monotonic()
+                if now - self._last_drop_log > 10:
+                    self._last_drop_log = now
+                    logger.warning("event buffer %s full (%d pending); dropping events (dropped=%d)",
+                                   self.name, len(self._items), self._stats["dropped"])
+                return False
+            self._items.append((time.monotonic(), write))
+            self._stats["enqueued"] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=f"event-buffer-{self.name}", daemon=True,
+                )
+                self._thread.start()
+            # First item arms the age timer; a full batch flushes now.
+            if len(self._items) == 1 or len(self._items) >= self.flush_size:
+                self._cond.notify()
+        return True
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {**self._stats, "pending": len(self._items)}
+
+    def clear(self) -> None:
+        """Drop pending writes and zero the counters (tests)."""
+        with self._cond:
+            self._items.clear()
+            for key in self._stats:
+                self._stats[key] = 0
+
+    # -- flushing ----------------------------------------------------------
+
+    def _take(self) -> list:
+        with self._cond:
+            n = min(self.flush_size, len(self._items))
+            return [self._items.popleft()[1] for _ in range(n)]
+
+    def flush(self) -> int:
+        """Commit everything queued so far. Returns the number of writes taken."""
+        taken = 0
+        with self._flush_lock:
+            while True:
+                chunk = self._take()
+                if not chunk:
+                    return taken
+                taken += len(chunk)
+                self._commit(chunk)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._items:
+                        age = time.monotonic() - self._items[0][0]
+                        if len(self._items) >= self.flush_size or age >= self.flush_seconds:
+                            break
+                        self._cond.wait(self.flush_seconds - age)
+                    else:
+                        self._cond.wait()
+            try:
+                self.flush()
+            except Exception:  # never let the flusher die
+                logger.exception("event buffer %s flush crashed", self.name)
+
+    def _commit(self, writes: list) -> None:
+        try:
+            db = self._get_db()
+            batch = db.batch()
+            refs = []
+            for w in writes:
+                ref = self._collection(db, w.path).document(w.doc_id)
+                refs.append(ref)
+                if w.create:
+                    batch.create(ref, w.data)
+                else:
+                    batch.set(ref, w.data)
+            batch.commit()
+        except Exception as e:
+            if _already_exists(e) and len(writes) > 1:
+                # One duplicate key fails the whole batch; replay singly so
+                # only the duplicates are skipped.
+                for w in writes:
+                    self._commit([w])
+                return
+            with self._cond:
+                self._stats["flushes"] += 1
+                if _already_exists(e):
+                    self._stats["duplicates"] += len(writes)
+                else:
+                    self._stats["failed"] += len(writes)
+            if _already_exists(e):
+                logger.debug("Idempotent skip for event %s/%s", "/".join(writes[0].path), writes[0].doc_id)
+            else:
+                logger.error("event buffer %s: failed to write %d events: %s", self.name, len(writes), e)
+            return
+
+        with self._cond:
+            self._stats["flushes"] += 1
+            self._stats["written"] += len(writes)
+        for w in writes:
+            if w.on_commit is not None:
+                try:
+                    w.on_commit()
+                except Exception:
+                    logger.debug("event buffer %s: on_commit failed", self.name, exc_info=True)
+
+    @staticmethod
+    def _collection(db, path: Tuple[str, ...]):
+        ref = db.collection(path[0])
+        for i in range(1, len(path), 2):
+            ref = ref.document(path[i]).collection(path[i + 1])
+        return ref
+
+
+_BUFFERS: "weakref.WeakSet[EventBuffer]" = weakref.WeakSet()
+
+
+def flush_all() -> None:
+    """Drain every buffer in this process. Safe to call any time."""
+    for buf in list(_BUFFERS):
+        try:
+            buf.flush()
+        except Exception:
+            logger.exception("event buffer %s: final flush failed", buf.name)
+
+
+def buffer_stats() -> Dict[str, dict]:
+    return {buf.name: buf.stats() for buf in list(_BUFFERS)}
+
+
+def _after_fork_in_child() -> None:
+    # The parent still owns (and will flush) what it had queued; the child
+    # starts empty with fresh locks and no flusher thread.
+    for buf in list(_BUFFERS):
+        buf._reset_state()
+
+
+atexit.register(flush_all)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -2,9 +2,13 @@
 Event logging service for the personalization data layer.
 
 Writes behavioral events to users/{uid}/events/{event_id} with:
-- Idempotency via transaction.create (duplicate key → silent skip)
+- Idempotency via create (duplicate key → silent skip)
 - 90-day TTL via expiresAt field (Firestore TTL policy)
 - Frontend vs backend allowlist enforcement
+
+Writes go through EVENTS_BUFFER (app/services/event_buffer.py): log_event
+validates and queues, and a background flusher commits in batches, so the
+calling request doesn't wait on Firestore.
 """
 
 import hashlib
@@ -14,12 +18,16 @@ from typing import Any, Optional
 
 from app.extensions import get_db
 from app.models.events import EventType, FRONTEND_ALLOWLIST
+from app.services.event_buffer import EventBuffer, PendingWrite, auto_id
 from app.services.feature_flags import is_enabled, EVENTS_LOGGING_ENABLED
 
 logger = logging.getLogger("events_service")
 
 EVENT_TTL_DAYS = 90
 
+# get_db is looked up at flush time so tests can patch it here.
+EVENTS_BUFFER = EventBuffer("user_events", lambda: get_db())
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -48,18 +56,20 @@ def log_event(
     source: str = "backend",
 ) -> Optional[str]:
     """
-    Write a single event to Firestore.
+    Queue a single event for Firestore.
 
     Args:
         uid: Firebase user ID.
         event_type: One of EventType values.
         payload: Event-specific data (no raw email text — privacy rule).
-        idempotency_key: Client-generated UUID or derived key. If the key
-            already exists, the write is silently skipped.
+        idempotency_key: Client-generated UUID or derived key, used as the
+            document ID. If the key already exists, the write is silently
+            skipped when the buffer flushes.
         source: "frontend" or "backend".
 
     Returns:
-        The event document ID on success, None if skipped or disabled.
+        The event document ID once queued, None if invalid, disabled or
+        dropped because the buffer is full.
     """
     if not is_enabled(EVENTS_LOGGING_ENABLED, uid=uid):
         return None
@@ -95,31 +105,23 @@ def log_event(
         "expiresAt": _expires_at(),
     }
 
-    db = get_db()
-    events_ref = db.collection("users").document(uid).collection("events")
-
-    # Use idempotency key as document ID if provided
-    doc_id = idempotency_key or None
-
-    try:
-        if doc_id:
-            doc_ref = events_ref.document(doc_id)
-            # doc_ref.create() raises AlreadyExists if the doc exists → idempotent
-            doc_ref.create(doc_data)
-            _stamp_lifecycle_signal(uid, et)
-            return doc_ref.id
-        else:
-            # Auto-generate ID
-            _, ref = events_ref.add(doc_data)
-            _stamp_lifecycle_signal(uid, et)
-            return ref.id
-    except Exception as e:
-        err_str = str(e)
-        if "ALREADY_EXISTS" in err_str or "already exists" in err_str.lower():
-            logger.debug("Idempotent skip for event %s key=%s uid=%s", event_type_str, doc_id, uid)
-            return None
-        logger.error("Failed to log event %s for uid=%s: %s", event_type_str, uid, e)
+    # Idempotency key becomes the document ID and is written with create
+    # (duplicate → skipped at flush); otherwise the ID is generated now so
+    # the caller gets it back immediately.
+    doc_id = idempotency_key or auto_id()
+    queued = EVENTS_BUFFER.put(PendingWrite(
+        path=("users", uid, "events"),
+        doc_id=doc_id,
+        data=doc_data,
+        create=bool(idempotency_key),
+        # Stamped only once the event is actually written, never for a
+        # duplicate key.
+        on_commit=lambda: _stamp_lifecycle_signal(uid, et),
+    ))
+    if not queued:
+        logger.debug("Event buffer full; dropped %s for uid=%s", event_type_str, uid)
         return None
+    return doc_id
 
 
 def _stamp_lifecycle_signal(uid: str, event_type: EventType) -> None:
@@ -1070,6 +1070,30 @@ def _select_recipient_email(contact):
     return None, None
 
 
+def suppressed_recipients(user_id, contacts):
+    """Prefetch the suppression gate for a batch of contacts.
+
+    Returns the bounced addresses among the recipients _select_recipient_email
+    picks for `contacts`, from one suppression lookup, to pass as
+    `suppressed=` to the draft/send functions. Returns None when the lookup
+    fails, so each contact falls back to its own check.
+    """
+    try:
+        from app.services.suppression import suppressed_emails
+        return suppressed_emails(user_id, [_select_recipient_email(c)[0] for c in contacts])
+    except Exception as supp_err:
+        print(f"[GmailClient] Suppression prefetch failed (checking per contact): {supp_err}")
+        return None
+
+
+def _recipient_suppressed(user_id, recipient_email, suppressed=None):
+    """The suppression gate: the prefetched set when given, else a lookup."""
+    if suppressed is not None:
+        return recipient_email.strip().lower() in suppressed
+    from app.services.suppression import is_suppressed
+    return is_suppressed(user_id, recipient_email)
+
+
 def _build_outreach_mime(recipient_email, gmail_account_email, email_subject, email_body,
                          user_info=None, resume_content=None, resume_filename=None, resume_url=None):
     """Build the multipart outreach message (HTML body, signature, resume attachment).
@@ -1193,7 +1217,7 @@ def _build_outreach_mime(recipient_email, gmail_account_email, email_subject, em
     return message
 
 
-def create_gmail_draft_for_user(contact, email_subject, email_body, tier='free', user_email=None, resume_url=None, resume_content=None, resume_filename=None, user_info=None, user_id=None):
+def create_gmail_draft_for_user(contact, email_subject, email_body, tier='free', user_email=None, resume_url=None, resume_content=None, resume_filename=None, user_info=None, user_id=None, suppressed=None):
     """
     Create Gmail draft in the user's account with optional resume attachment and HTML formatting
 
@@ -1208,6 +1232,8 @@ def create_gmail_draft_for_user(contact, email_subject, email_body, tier='free',
         resume_filename: Filename for the resume attachment
         user_info: User profile information
         user_id: User ID for Gmail credentials
+        suppressed: Bounced addresses prefetched by suppressed_recipients()
+            for a batch; None checks this recipient on its own
     """
     # Import clean_email_text from utils (will be created)
     from app.utils.contact import clean_email_text
@@ -1245,8 +1271,7 @@ def create_gmail_draft_for_user(contact, email_subject, email_body, tier='free',
         # the existing "no_email" shape so downstream callers treat it as
         # "no real draft" without crashing.
         try:
-            from app.services.suppression import is_suppressed
-            if is_suppressed(user_id, recipient_email):
+            if _recipient_suppressed(user_id, recipient_email, suppressed):
                 print(f"[GmailClient] SUPPRESSED — skipping draft for {recipient_email} (previous bounce)")
                 return f"suppressed_{tier}_draft_{contact.get('FirstName', 'unknown').lower()}"
         except Exception as supp_err:
@@ -1492,6 +1517,7 @@ def create_drafts_parallel(contacts_with_emails, resume_bytes=None, resume_filen
     max_workers = min(10, len(contacts_with_emails))
     results = []
     results_lock = threading.Lock()
+    suppressed = suppressed_recipients(user_id, [item['contact'] for item in contacts_with_emails])
     
     def create_single_draft(item):
         """Create a single draft with resume attached when available."""
@@ -1506,7 +1532,8 @@ def create_drafts_parallel(contacts_with_emails, resume_bytes=None, resume_filen
                 resume_bytes,
                 resume_filename,
                 user_info,
-                user_id
+                user_id,
+                suppressed=suppressed,
             )
             return item.get('index', 0), result, None
         except Exception as e:
@@ -1537,7 +1564,7 @@ def create_drafts_parallel(contacts_with_emails, resume_bytes=None, resume_filen
     return [result for _, result, _ in results]
 
 
-def send_gmail_email_for_user(contact, email_subject, email_body, tier='free', user_email=None, resume_url=None, resume_content=None, resume_filename=None, user_info=None, user_id=None):
+def send_gmail_email_for_user(contact, email_subject, email_body, tier='free', user_email=None, resume_url=None, resume_content=None, resume_filename=None, user_info=None, user_id=None, suppressed=None):
     """Send an outreach email from the user's Gmail account.
 
     This is the shared send path: it builds the exact same message as the draft
@@ -1550,7 +1577,9 @@ def send_gmail_email_for_user(contact, email_subject, email_body, tier='free', u
 
     Returns a dict {message_id, thread_id, recipient_email} on success, or a
     "mock_..." string when Gmail is unavailable or no recipient address exists
-    (same sentinel convention as the draft path, so callers can skip it).
+    (same sentinel convention as the draft path, so callers can skip it), or
+    a "suppressed_..." string when the address has bounced before.
+    `suppressed` is the same prefetched set create_gmail_draft_for_user takes.
     """
     from app.utils.contact import clean_email_text
 
@@ -1582,6 +1611,14 @@ def send_gmail_email_for_user(contact, email_subject, email_body, tier='free', u
             print(f"[GmailClient] No valid email found for contact - cannot send, returning mock")
             return f"mock_{tier}_send_{contact.get('FirstName', 'unknown').lower()}_no_email"
 
+        # Same suppression gate as the draft path: never send to a bounced address.
+        try:
+            if _recipient_suppressed(user_id, recipient_email, suppressed):
+                print(f"[GmailClient] SUPPRESSED — skipping send to {recipient_email} (previous bounce)")
+                return f"suppressed_{tier}_send_{contact.get('FirstName', 'unknown').lower()}"
+        except Exception as supp_err:
+            print(f"[GmailClient] Suppression check failed (proceeding with send): {supp_err}")
+
         # Build the same multipart message the draft path builds.
         message = _build_outreach_mime(
             recipient_email=recipient_email,
@@ -1649,6 +1686,7 @@ def send_emails_parallel(contacts_with_emails, resume_bytes=None, resume_filenam
     max_workers = min(5, len(contacts_with_emails))
     results = []
     results_lock = threading.Lock()
+    suppressed = suppressed_recipients(user_id, [item['contact'] for item in contacts_with_emails])
 
     def send_single(item):
         """Send a single email with resume attached when available."""
@@ -1663,7 +1701,8 @@ def send_emails_parallel(contacts_with_emails, resume_bytes=None, resume_filenam
                 resume_bytes,
                 resume_filename,
                 user_info,
-                user_id
+                user_id,
+                suppressed=suppressed,
             )
             return item.get('index', 0), result, None
         except Exception as e:
@@ -1,16 +1,44 @@
 """
 Reddit scraper service - fetch interview-related posts from Reddit
+
+Every interview-prep generation searches a few subreddits for the company
+and then pulls the top comments of the best posts. Popular companies bring
+the same threads up for many users, and each generation runs in its own
+event loop on a background thread. So the fetch layer is shared across
+calls (per worker process):
+
+  - REDDIT_LIMITER is a thread-safe token bucket. Every request to Reddit,
+    from any generation, takes a token first, and a 429 pauses the bucket
+    for everyone. This replaces the fixed sleeps after each request.
+  - Listings (subreddit + query) and comment trees (post id) are kept in
+    a TTL cache (REDDIT_CACHE_TTL_SECONDS), shared across users.
+  - Concurrent requests for the same key are coalesced: the first caller
+    fetches and the others wait for its result, even from another loop.
+  - Within one generation, the queries of a subreddit and the comment
+    fetches run concurrently via gather (comments capped at
+    REDDIT_COMMENT_CONCURRENCY).
 """
 import aiohttp
 import asyncio
+import concurrent.futures
+import os
+import threading
 import time
 import logging
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from urllib.parse import quote_plus
 
 logger = logging.getLogger(__name__)
 
+REDDIT_BASE_URL = "https://www.reddit.com"
+REDDIT_REQUESTS_PER_SECOND = float(os.getenv("REDDIT_REQUESTS_PER_SECOND", "1.6"))
+REDDIT_BURST = int(os.getenv("REDDIT_BURST", "4"))
+REDDIT_COMMENT_CONCURRENCY = int(os.getenv("REDDIT_COMMENT_CONCURRENCY", "5"))
+REDDIT_CACHE_TTL_SECONDS = int(os.getenv("REDDIT_CACHE_TTL_SECONDS", "3600"))
+REDDIT_RATE_LIMIT_BACKOFF_SECONDS = 2.0
+
 # Target subreddits - select based on role_category from job posting
 SUBREDDIT_MAP = {
     "Software Engineering": ['cscareerquestions', 'leetcode', 'experienceddevs', 'programming', 'webdev'],
@@ -47,10 +75,210 @@ def build_search_queries(job_details: Dict) -> List[str]:
     return queries[:5]
 
 
+# ---------------------------------------------------------------------------
+# Shared fetch layer: rate limit, cache, coalescing
+# ---------------------------------------------------------------------------
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every event loop in the process."""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def reserve(self) -> float:
+        """Take a token; returns how long to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def penalize(self, seconds: float) -> None:
+        """Hand out no tokens for `seconds` (Reddit answered 429)."""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class _TTLCache:
+    """LRU of JSON-derived values with a fixed TTL."""
+
+    def __init__(self, ttl: int, max_entries: int = 2000, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._clock() - entry[0] >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+REDDIT_LIMITER = TokenBucket(REDDIT_REQUESTS_PER_SECOND, REDDIT_BURST)
+REDDIT_CACHE = _TTLCache(REDDIT_CACHE_TTL_SECONDS)
+
+# key -> concurrent Future of the fetch in flight. concurrent (not asyncio)
+# futures, because the callers waiting on it may live in other event loops.
+_inflight: Dict[Any, concurrent.futures.Future] = {}
+_inflight_lock = threading.Lock()
+
+
+async def _coalesced(key, fetch: Callable[[], Awaitable[Tuple[Any, bool]]]) -> Any:
+    """Cached value for key, else one shared fetch.
+
+    fetch() returns (value, cacheable); failed fetches return an empty
+    value with cacheable=False so the next caller tries again.
+    """
+    cached = REDDIT_CACHE.get(key)
+    if cached is not None:
+        return cached
+    with _inflight_lock:
+        fut = _inflight.get(key)
+        owner = fut is None
+        if owner:
+            fut = _inflight[key] = concurrent.futures.Future()
+    if not owner:
+        # shield: a waiter timing out must not cancel the shared fetch.
+        return await asyncio.shield(asyncio.wrap_future(fut))
+
+    value = None
+    try:
+        value, cacheable = await fetch()
+        if cacheable:
+            REDDIT_CACHE.put(key, value)
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        if value is None:
+            # Cancelled or crashed: waiters must not hang on us.
+            fut.set_exception(RuntimeError(f"reddit fetch for {key!r} did not complete"))
+        else:
+            fut.set_result(value)
+    return value
+
+
+async def _get_json(session: aiohttp.ClientSession, url: str) -> Tuple[int, Any]:
+    await REDDIT_LIMITER.acquire()
+    async with session.get(url) as resp:
+        if resp.status == 429:
+            logger.warning(f"⚠️ Reddit rate limited, pausing requests for {REDDIT_RATE_LIMIT_BACKOFF_SECONDS:.0f}s...")
+            REDDIT_LIMITER.penalize(REDDIT_RATE_LIMIT_BACKOFF_SECONDS)
+            return resp.status, None
+        if resp.status != 200:
+            return resp.status, None
+        return resp.status, await resp.json()
+
+
+async def _search_listing(session: aiohttp.ClientSession, subreddit: str, query: str) -> List[Dict]:
+    """Raw t3 children of one subreddit search (cached per subreddit + query)."""
+    async def fetch():
+        url = f"{REDDIT_BASE_URL}/r/{subreddit}/search.json?q={quote_plus(query)}&sort=top&t=year&limit=25"
+        try:
+            status, data = await _get_json(session, url)
+        except Exception as e:
+            logger.error(f"❌ Error fetching query '{query[:40]}' in r/{subreddit}: {e}")
+            return [], False
+        if status != 200:
+            return [], False
+        return (data or {}).get("data", {}).get("children", []), True
+
+    try:
+        return await _coalesced(("search", subreddit.lower(), query.lower()), fetch)
+    except Exception as e:
+        logger.error(f"❌ Error fetching query '{query[:40]}' in r/{subreddit}: {e}")
+        return []
+
+
+async def _top_comments(session: aiohttp.ClientSession, post_id: str, permalink: str) -> List[Dict]:
+    """Top 3 comments of a post, structured (cached per post id)."""
+    async def fetch():
+        url = f"{REDDIT_BASE_URL}{permalink}.json?limit=3&sort=top"  # OPTIMIZED: Only 3 comments
+        try:
+            status, data = await _get_json(session, url)
+        except Exception as e:
+            logger.error(f"❌ Error fetching comments for post {post_id}: {e}")
+            return [], False
+        if status != 200 or not data or len(data) <= 1:
+            return [], status == 200
+        comments = data[1].get("data", {}).get("children", [])
+        return [
+            {
+                'body': c.get("data", {}).get("body", "")[:2500],
+                'upvotes': c.get("data", {}).get("ups", 0)
+            }
+            for c in comments[:3]  # OPTIMIZED: Only top 3 comments (was 15)
+            if c.get("kind") == "t1"
+        ], True
+
+    try:
+        return await _coalesced(("comments", post_id or permalink), fetch)
+    except Exception as e:
+        logger.error(f"❌ Error fetching comments for post {post_id}: {e}")
+        return []
+
+
+def clear_reddit_cache() -> None:
+    REDDIT_CACHE.clear()
+
+
+def _structure_post(post_data: Dict, top_comments: List[Dict]) -> Dict:
+    return {
+        'post_id': post_data.get('id'),
+        'post_title': post_data.get('title', ''),
+        'post_body': post_data.get('selftext', '')[:5000] if post_data.get('selftext') else '',
+        'top_comments': top_comments,
+        'upvotes': post_data.get('ups', 0),
+        'date': datetime.fromtimestamp(post_data.get('created_utc', 0)).isoformat() if post_data.get('created_utc') else None,
+        'subreddit': post_data.get('subreddit', ''),
+        'url': f"https://www.reddit.com{post_data.get('permalink', '')}"
+    }
+
+
 async def fetch_post_comments(session: aiohttp.ClientSession, post_id: str, subreddit: str) -> List[Dict]:
     """Fetch top comments for a specific post"""
-    url = f"https://www.reddit.com/r/{subreddit}/comments/{post_id}.json"
+    url = f"{REDDIT_BASE_URL}/r/{subreddit}/comments/{post_id}.json"
     try:
+        await REDDIT_LIMITER.acquire()
         async with session.get(url) as resp:
             if resp.status == 200:
                 data = await resp.json()
@@ -123,60 +351,43 @@ async def search_reddit(job_details: Dict, timeout_seconds: int = 90) -> List[Di
             if (datetime.now() - start_time).total_seconds() > timeout_seconds:
                 logger.warning(f"⏱️ Reddit timeout reached during subreddit {subreddit_idx+1}/{len(subreddits)}")
                 break
-                
-            for query_idx, query in enumerate(queries):
+
+            # The queries of a subreddit run concurrently; results are folded
+            # in query order so the early exit keeps the same posts.
+            subreddit_start = time.time()
+            search_requests += len(queries)
+            listings = await asyncio.gather(*(_search_listing(session, subreddit, q) for q in queries))
+            for query_idx, (query, posts) in enumerate(zip(queries, listings)):
                 # EARLY EXIT: Stop if we have enough posts
                 if len(all_posts) >= MAX_POSTS_NEEDED:
                     logger.info(f"✅ Reddit early exit: found {len(all_posts)} posts, skipping remaining queries")
                     break
-                    
-                if (datetime.now() - start_time).total_seconds() > timeout_seconds:
-                    logger.warning(f"⏱️ Reddit timeout reached during query {query_idx+1}/{len(queries)}")
-                    break
-                
-                query_start = time.time()
-                url = f"https://www.reddit.com/r/{subreddit}/search.json?q={quote_plus(query)}&sort=top&t=year&limit=25"
-                search_requests += 1
-                
-                try:
-                    async with session.get(url) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            posts = data.get("data", {}).get("children", [])
-                            new_posts = 0
-                            for post in posts:
-                                if post.get("kind") != "t3":
-                                    continue
-                                post_data = post.get("data", {})
-                                post_id = post_data.get("id")
-                                if post_id and post_id not in seen_ids:
-                                    seen_ids.add(post_id)
-                                    
-                                    # Filter posts from last 12 months
-                                    created_utc = post_data.get('created_utc', 0)
-                                    if created_utc:
-                                        post_date = datetime.fromtimestamp(created_utc)
-                                        if post_date < datetime.now() - timedelta(days=365):
-                                            continue
-                                    
-                                    title = post_data.get('title', '')
-                                    if not title:
-                                        continue
-                                    
-                                    all_posts.append(post)
-                                    new_posts += 1
-                            
-                            query_time = time.time() - query_start
-                            logger.debug(f"  Query {query_idx+1}/{len(queries)} '{query[:40]}...' in r/{subreddit}: {query_time:.2f}s ({new_posts} new posts, total={len(all_posts)})")
-                        elif resp.status == 429:
-                            # Rate limited - wait longer
-                            logger.warning(f"⚠️ Reddit rate limited on query {query_idx+1}, waiting 2s...")
-                            await asyncio.sleep(2)
-                        await asyncio.sleep(0.6)  # Rate limit: stay safe
-                except Exception as e:
-                    query_time = time.time() - query_start
-                    logger.error(f"❌ Error fetching query {query_idx+1} in r/{subreddit}: {e} ({query_time:.2f}s)")
-                    continue
+
+                new_posts = 0
+                for post in posts:
+                    if post.get("kind") != "t3":
+                        continue
+                    post_data = post.get("data", {})
+                    post_id = post_data.get("id")
+                    if post_id and post_id not in seen_ids:
+                        seen_ids.add(post_id)
+                        
+                        # Filter posts from last 12 months
+                        created_utc = post_data.get('created_utc', 0)
+                        if created_utc:
+                            post_date = datetime.fromtimestamp(created_utc)
+                            if post_date < datetime.now() - timedelta(days=365):
+                                continue
+                        
+                        title = post_data.get('title', '')
+                        if not title:
+                            continue
+                        
+                        all_posts.append(post)
+                        new_posts += 1
+
+                logger.debug(f"  Query {query_idx+1}/{len(queries)} '{query[:40]}...' in r/{subreddit}: ({new_posts} new posts, total={len(all_posts)})")
+            logger.debug(f"  r/{subreddit}: {len(queries)} queries in {time.time() - subreddit_start:.2f}s")
         
         search_time = time.time() - search_start
         logger.info(f"📊 Reddit search phase: {search_requests} requests, {len(all_posts)} posts found in {search_time:.2f}s")
@@ -188,70 +399,35 @@ async def search_reddit(job_details: Dict, timeout_seconds: int = 90) -> List[Di
         
         # OPTIMIZED: Fetch comments for top 15 posts, only top 3 comments each
         comments_start = time.time()
-        posts_with_comments = []
-        comment_requests = 0
         comments_to_fetch = min(15, len(top_posts))  # Fetch comments for top 15 or all if less
-        
-        for post_idx, post in enumerate(top_posts[:comments_to_fetch]):
-            if (datetime.now() - start_time).total_seconds() > timeout_seconds:
-                logger.warning(f"⏱️ Reddit timeout reached during comment fetching ({post_idx}/{comments_to_fetch})")
-                break
-                
-            post_data = post.get("data", {})
-            permalink = post_data.get("permalink", "")
-            if permalink:
-                comment_start = time.time()
-                comments_url = f"https://www.reddit.com{permalink}.json?limit=3&sort=top"  # OPTIMIZED: Only 3 comments
-                comment_requests += 1
-                
-                try:
-                    async with session.get(comments_url) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            if len(data) > 1:
-                                comments = data[1].get("data", {}).get("children", [])
-                                post_data["top_comments"] = [
-                                    {
-                                        'body': c.get("data", {}).get("body", "")[:2500],
-                                        'upvotes': c.get("data", {}).get("ups", 0)
-                                    }
-                                    for c in comments[:3]  # OPTIMIZED: Only top 3 comments (was 15)
-                                    if c.get("kind") == "t1"
-                                ]
-                                comment_time = time.time() - comment_start
-                                logger.debug(f"  Comments for post {post_idx+1}/{comments_to_fetch}: {comment_time:.2f}s ({len(post_data.get('top_comments', []))} comments)")
-                    await asyncio.sleep(0.6)
-                except Exception as e:
-                    comment_time = time.time() - comment_start
-                    logger.error(f"❌ Error fetching comments for post {post_idx+1}: {e} ({comment_time:.2f}s)")
-            
-            # Structure the post data (after fetching comments)
-            structured_post = {
-                'post_id': post_data.get('id'),
-                'post_title': post_data.get('title', ''),
-                'post_body': post_data.get('selftext', '')[:5000] if post_data.get('selftext') else '',
-                'top_comments': post_data.get('top_comments', []),
-                'upvotes': post_data.get('ups', 0),
-                'date': datetime.fromtimestamp(post_data.get('created_utc', 0)).isoformat() if post_data.get('created_utc') else None,
-                'subreddit': post_data.get('subreddit', ''),
-                'url': f"https://www.reddit.com{post_data.get('permalink', '')}"
-            }
-            posts_with_comments.append(structured_post)
-        
-        # Add remaining posts without comments (if we stopped early due to timeout)
-        for post in top_posts[comments_to_fetch:]:
-            post_data = post.get("data", {})
-            structured_post = {
-                'post_id': post_data.get('id'),
-                'post_title': post_data.get('title', ''),
-                'post_body': post_data.get('selftext', '')[:5000] if post_data.get('selftext') else '',
-                'top_comments': [],  # No comments fetched
-                'upvotes': post_data.get('ups', 0),
-                'date': datetime.fromtimestamp(post_data.get('created_utc', 0)).isoformat() if post_data.get('created_utc') else None,
-                'subreddit': post_data.get('subreddit', ''),
-                'url': f"https://www.reddit.com{post_data.get('permalink', '')}"
-            }
-            posts_with_comments.append(structured_post)
+        semaphore = asyncio.Semaphore(max(1, REDDIT_COMMENT_CONCURRENCY))
+
+        async def _comments_for(post_data: Dict) -> List[Dict]:
+            async with semaphore:
+                return await _top_comments(session, post_data.get("id"), post_data["permalink"])
+
+        comment_tasks = {
+            post_idx: asyncio.ensure_future(_comments_for(post.get("data", {})))
+            for post_idx, post in enumerate(top_posts[:comments_to_fetch])
+            if post.get("data", {}).get("permalink")
+        }
+        comment_requests = len(comment_tasks)
+        if comment_tasks:
+            remaining = timeout_seconds - (datetime.now() - start_time).total_seconds()
+            _, pending = await asyncio.wait(comment_tasks.values(), timeout=max(0.0, remaining))
+            if pending:
+                logger.warning(f"⏱️ Reddit timeout reached during comment fetching ({len(comment_tasks) - len(pending)}/{comments_to_fetch})")
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        # Posts whose comments weren't fetched (no permalink, past the top 15,
+        # or cut off by the timeout) keep an empty comment list.
+        posts_with_comments = []
+        for post_idx, post in enumerate(top_posts):
+            task = comment_tasks.get(post_idx)
+            top_comments = task.result() if task is not None and task.done() and not task.cancelled() else []
+            posts_with_comments.append(_structure_post(post.get("data", {}), top_comments))
         
         comments_time = time.time() - comments_start
         logger.info(f"💬 Reddit comments phase: {comment_requests} requests in {comments_time:.2f}s")
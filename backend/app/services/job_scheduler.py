@@ -0,0 +1,160 @@
+"""
+job_scheduler — periodic scheduling for the registered background jobs.
+
+Before this module, wsgi.py started one `while True: work(); sleep()` daemon
+thread per scanner inside every web process. Each loop is now a registered
+rq_queue job plus a PeriodicJob entry here (interval, boot delay, enable
+flag, retries). A single scheduler thread fires due jobs through
+rq_queue.enqueue, so where the work runs is a deploy decision:
+
+  BACKGROUND_JOBS_MODE=web     (default) scheduler runs in the web process.
+                               With REDIS_URL the jobs still execute on the
+                               RQ worker; without it they run in threads here,
+                               exactly like the old daemons.
+  BACKGROUND_JOBS_MODE=worker  the web process starts no scheduler; worker.py
+                               runs it next to the RQ worker instead, which
+                               frees gunicorn workers from scan work entirely.
+
+Idempotency: every fire uses the interval slot (floor(now / interval)) as
+the job's idempotency key, and the claim is held until the slot ends (not
+just for the job's timeout), so several processes running the scheduler
+can't double-fire the same slot when Redis is available.
+
+Periodic jobs go on their own RQ queue, which worker.py drains in a
+separate process from the Loop queue, so a 2h tracker scan never delays a
+user's Loop cycle or contact import.
+
+The env flags (NUDGES_ENABLED, AGENT_DAEMON_ENABLED, ...) keep their old
+names and meanings.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from app.services import rq_queue
+from app.services.rq_queue import enqueue
+
+logger = logging.getLogger(__name__)
+
+ONE_HOUR = 3600
+ONE_DAY = 24 * ONE_HOUR
+
+# How often the scheduler thread wakes up to look for due jobs.
+TICK_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class PeriodicJob:
+    name: str                   # rq_queue.JOB_REGISTRY key
+    interval_seconds: int
+    boot_delay_seconds: int
+    enabled_env: Optional[str] = None
+    retries: int = 0
+    timeout_seconds: int = ONE_HOUR
+
+    def enabled(self) -> bool:
+        if not self.enabled_env:
+            return True
+        return os.getenv(self.enabled_env, "true").lower() == "true"
+
+    def slot(self, now: float) -> int:
+        return int(now // self.interval_seconds)
+
+    def slot_remaining(self, now: float) -> int:
+        """Seconds until the slot containing `now` ends."""
+        return max(1, math.ceil((self.slot(now) + 1) * self.interval_seconds - now))
+
+
+# Boot delays match the old daemon threads: stabilization before the first
+# run, then a fixed cadence. The tracker scan gates each sub-scanner on its
+# own flag internally (see daemon_jobs.run_tracker_scanners).
+PERIODIC_JOBS: list[PeriodicJob] = [
+    PeriodicJob("tracker_scan", 6 * ONE_HOUR, 300, timeout_seconds=2 * ONE_HOUR),
+    PeriodicJob("gmail_watch_renewal", 6 * ONE_DAY, 600, "WATCH_RENEWAL_ENABLED", retries=2),
+    PeriodicJob("daemon_watchdog", ONE_HOUR, 600, "WATCHDOG_ENABLED", timeout_seconds=600),
+    PeriodicJob("agent_cycles", ONE_HOUR, 600, "AGENT_DAEMON_ENABLED"),
+    PeriodicJob("loop_scheduler", ONE_HOUR, 600, "LOOP_SCHEDULER_ENABLED", retries=1, timeout_seconds=900),
+    PeriodicJob("agent_followups", ONE_HOUR, 600, "AGENT_FOLLOWUP_ENABLED"),
+    PeriodicJob("agent_digests", ONE_DAY, ONE_HOUR, "AGENT_DIGEST_ENABLED"),
+    PeriodicJob("fj_modified", ONE_DAY, 1800, "FJ_MODIFIED_DAEMON_ENABLED", retries=2),
+    PeriodicJob("fj_expired", ONE_DAY, 1800, "FJ_EXPIRED_DAEMON_ENABLED", retries=2),
+]
+
+
+class Scheduler:
+    """Tracks the next due time per job. Pure bookkeeping plus `fire`, so tests
+    can drive it with a fake clock and a fake fire function."""
+
+    def __init__(
+        self,
+        jobs: Optional[list[PeriodicJob]] = None,
+        *,
+        clock: Callable[[], float] = time.time,
+        fire: Optional[Callable[[PeriodicJob, float], Optional[str]]] = None,
+    ):
+        self.jobs = [j for j in (PERIODIC_JOBS if jobs is None else jobs) if j.enabled()]
+        self.clock = clock
+        self.fire = fire or fire_periodic_job
+        started = clock()
+        self.next_run = {j.name: started + j.boot_delay_seconds for j in self.jobs}
+
+    def tick(self) -> list[str]:
+        """Fire every job whose next run time has passed. Returns the names
+        fired. A failed enqueue is logged and retried on the next tick."""
+        now = self.clock()
+        fired = []
+        for job in self.jobs:
+            if now < self.next_run[job.name]:
+                continue
+            try:
+                self.fire(job, now)
+            except Exception:
+                logger.exception("job_scheduler: failed to fire %s", job.name)
+                continue
+            self.next_run[job.name] = now + job.interval_seconds
+            fired.append(job.name)
+        return fired
+
+    def run_forever(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        logger.info(
+            "job_scheduler: started with %d job(s): %s",
+            len(self.jobs), ", ".join(j.name for j in self.jobs),
+        )
+        while not stop.is_set():
+            self.tick()
+            stop.wait(TICK_SECONDS)
+
+
+def fire_periodic_job(job: PeriodicJob, now: float) -> Optional[str]:
+    return enqueue(
+        job.name,
+        idempotency_key=f"slot-{job.slot(now)}",
+        retries=job.retries,
+        timeout=job.timeout_seconds,
+        claim_ttl=job.slot_remaining(now),
+    )
+
+
+def scheduler_runs_in_web() -> bool:
+    return os.getenv("BACKGROUND_JOBS_MODE", "web").lower() != "worker"
+
+
+def start_scheduler_thread(app=None) -> threading.Thread:
+    """Start the scheduler daemon thread. Pass the Flask app from the web
+    process so in-process job runs get an app context."""
+    if app is not None:
+        rq_queue.set_app(app)
+    t = threading.Thread(
+        target=Scheduler().run_forever,
+        daemon=True,
+        name="job-scheduler",
+    )
+    t.start()
+    return t
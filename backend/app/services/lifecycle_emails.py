@@ -19,6 +19,8 @@ Sequences:
 Architecture:
   - Idempotency via `lifecycle_email_log` Firestore collection (composite key).
   - Rate limit = 2 lifecycle emails / user / 7 days.
+  - Sequences 6-20 are declarative campaigns evaluated in one pass over
+    `users` (see lifecycle_engine). Counts use Firestore aggregation queries.
   - HMAC-signed unsubscribe tokens.
   - Cron entry = /api/lifecycle/tick (secret-guarded).
   - Discount codes appear inline only when STRIPE_COUPONS env vars are populated.
@@ -51,6 +53,7 @@ from app.config import (
     STRIPE_SECRET_KEY,
 )
 from app.extensions import get_db
+from app.services.lifecycle_engine import Campaign, Candidate, run_campaigns
 from app.services.notification_adapter import send as notify_send, Channel
 
 logger = logging.getLogger(__name__)
@@ -62,6 +65,9 @@ logger = logging.getLogger(__name__)
 
 MAX_LIFECYCLE_EMAILS_PER_7_DAYS = 2
 
+# Firestore get_all accepts large ref lists, but keep each RPC bounded.
+_LOG_GET_ALL_CHUNK = 300
+
 PUBLIC_BASE_URL = os.getenv('PUBLIC_BASE_URL', 'https://offerloop.ai')
 
 # Who the emails are signed by. Single-name to keep the voice personal. These
@@ -91,6 +97,14 @@ def _parse_ts_or_dt(val) -> Optional[datetime]:
         return None
 
 
+def _agg_count(query) -> int:
+    """Server-side COUNT aggregation. Billed as one read per 1000 index
+    entries instead of one read per matched document."""
+    snap = query.count().get()
+    # Firestore returns [[AggregationResult]] shape
+    return int(snap[0][0].value)
+
+
 # ---------------------------------------------------------------------------
 # Idempotency + rate-limit helpers
 # ---------------------------------------------------------------------------
@@ -118,7 +132,7 @@ def _rate_limit_exceeded(user_or_lead_id: str) -> bool:
             .where('sent_at', '>=', seven_days_ago)
             .limit(MAX_LIFECYCLE_EMAILS_PER_7_DAYS + 1))
     try:
-        count = sum(1 for _ in q.stream())
+        count = _agg_count(q)
     except Exception as e:
         logger.warning(f"rate-limit query failed for {user_or_lead_id}: {e}")
         return False
@@ -304,7 +318,7 @@ def _count_saved_contacts(uid: str) -> int:
         return 0
     try:
         ref = db.collection('users').document(uid).collection('contacts').limit(1000)
-        return sum(1 for _ in ref.stream())
+        return _agg_count(ref)
     except Exception:
         return 0
 
@@ -674,10 +688,82 @@ def process_winbacks() -> dict:
     return {'ok': True, 'sent_count': sent_count}
 
 
+# ---------------------------------------------------------------------------
+# User-scan campaigns (sequences 6-20)
+#
+# Every campaign below used to stream the whole `users` collection on its
+# own. They are now declared as lifecycle_engine.Campaign entries and
+# evaluated together in one pass (see run_user_scan_campaigns). Each
+# `_select_*` is a pure predicate over the user doc; `_compose_*` builds the
+# email for one candidate; `_prepare_*` does any extra reads once per run.
+# The `process_*` entry points still exist and run a single campaign.
+# ---------------------------------------------------------------------------
+
 # ---------------------------------------------------------------------------
 # Sequence 6: Onboarding drop-off (users signed up but never confirmed profile)
 # ---------------------------------------------------------------------------
 
+def _select_onboarding_dropoff(uid: str, user: dict, now: datetime) -> Optional[str]:
+    # Already confirmed onboarding: nothing to nudge
+    if user.get('profileConfirmedAt'):
+        return None
+
+    # Paying users already invested. No onboarding nudge.
+    tier = user.get('subscriptionTier') or user.get('tier') or 'free'
+    if tier in ('pro', 'elite'):
+        return None
+
+    signup_at = _parse_ts_or_dt(user.get('signupAt'))
+    if not signup_at:
+        return None
+
+    # Launch-date safety filter (see process_onboarding_dropoffs)
+    if signup_at < ONBOARDING_DROPOFF_LAUNCH_DATE:
+        return None
+
+    hours_since_signup = (now - signup_at).total_seconds() / 3600
+
+    # Day 1: signup 24-48h ago, still no profile confirmation
+    if 24 < hours_since_signup < 48:
+        return 'day_1'
+    # Day 3: signup 72-96h ago, still no profile confirmation
+    if 72 < hours_since_signup < 96:
+        return 'day_3'
+    return None
+
+
+def _compose_onboarding_dropoff(cand: Candidate, now: datetime) -> Optional[dict]:
+    if cand.step == 'day_1':
+        return {
+            'subject': "you're 60 seconds from being set up",
+            'body_paragraphs': [
+                f"Hey, {SIGNATURE_NAME} here.",
+                "Saw you signed up but didn't finish setting up your profile. It takes about 60 seconds and unlocks alumni and hiring-manager search dialed to the companies you're targeting.",
+                "The rest of Offerloop is only useful once your profile is in.",
+            ],
+            'cta_label': "Finish setting up",
+            'cta_url': f'{PUBLIC_BASE_URL}/onboarding?utm_source=lifecycle&utm_campaign=onboarding_dropoff&utm_content=day_1',
+        }
+    return {
+        'subject': "anything i can help with?",
+        'body_paragraphs': [
+            f"Hey, {SIGNATURE_NAME} again.",
+            "One more nudge. If the onboarding flow is confusing, if something isn't working, or if you're just not sure Offerloop fits what you're recruiting for, reply to this email. I read every reply and answer.",
+            "If Offerloop isn't the right thing right now, no worries. Reply 'stop' and I'll take you off the list.",
+        ],
+        'cta_label': None,
+        'cta_url': None,
+    }
+
+
+ONBOARDING_DROPOFF = Campaign(
+    name='onboarding_dropoff',
+    select=_select_onboarding_dropoff,
+    compose=_compose_onboarding_dropoff,
+    counters=('day_1', 'day_3'),
+)
+
+
 def process_onboarding_dropoffs() -> dict:
     """Scan for signed-up users who never confirmed their profile.
     Day 1 nudge, Day 3 personal follow-up.
@@ -688,83 +774,96 @@ def process_onboarding_dropoffs() -> dict:
     remove this filter, expect a wave of confused replies from long-time
     users being told to "finish setup."
     """
-    db = get_db()
-    if not db:
-        return {'ok': False, 'error': 'db_unavailable'}
-
-    sent = {'day_1': 0, 'day_3': 0}
-    now = datetime.now(timezone.utc)
-
-    for snap in db.collection('users').stream():
-        user = snap.to_dict() or {}
-        uid = snap.id
-        email = user.get('email')
-        if not email:
-            continue
+    return _run_single_campaign(ONBOARDING_DROPOFF)
 
-        # Already confirmed onboarding: nothing to nudge
-        if user.get('profileConfirmedAt'):
-            continue
 
-        # Paying users already invested. No onboarding nudge.
-        tier = user.get('subscriptionTier') or user.get('tier') or 'free'
-        if tier in ('pro', 'elite'):
-            continue
+# ---------------------------------------------------------------------------
+# Sequence 7: First-search activation (confirmed profile but never searched)
+# ---------------------------------------------------------------------------
 
-        signup_at = _parse_ts_or_dt(user.get('signupAt'))
-        if not signup_at:
-            continue
+def _select_first_search_activation(uid: str, user: dict, now: datetime) -> Optional[str]:
+    # Must have confirmed profile (didn't drop off during onboarding)
+    profile_confirmed_at = _parse_ts_or_dt(user.get('profileConfirmedAt'))
+    if not profile_confirmed_at:
+        return None
 
-        # Launch-date safety filter (see docstring)
-        if signup_at < ONBOARDING_DROPOFF_LAUNCH_DATE:
-            continue
+    # Skip users who already ran their first search
+    if _parse_ts_or_dt(user.get('firstSearchAt')):
+        return None
 
-        hours_since_signup = (now - signup_at).total_seconds() / 3600
+    # Paying users already invested. Skip.
+    tier = user.get('subscriptionTier') or user.get('tier') or 'free'
+    if tier in ('pro', 'elite'):
+        return None
 
-        # Day 1: signup 24-48h ago, still no profile confirmation
-        if 24 < hours_since_signup < 48 and not already_sent(uid, 'onboarding_dropoff', 'day_1'):
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='onboarding_dropoff',
-                step='day_1',
-                subject="you're 60 seconds from being set up",
-                body_paragraphs=[
-                    f"Hey, {SIGNATURE_NAME} here.",
-                    "Saw you signed up but didn't finish setting up your profile. It takes about 60 seconds and unlocks alumni and hiring-manager search dialed to the companies you're targeting.",
-                    "The rest of Offerloop is only useful once your profile is in.",
-                ],
-                cta_label="Finish setting up",
-                cta_url=f'{PUBLIC_BASE_URL}/onboarding?utm_source=lifecycle&utm_campaign=onboarding_dropoff&utm_content=day_1',
-            )
-            if res.get('sent'):
-                sent['day_1'] += 1
+    # Belt-and-suspenders launch-date filter on signupAt
+    signup_at = _parse_ts_or_dt(user.get('signupAt'))
+    if not signup_at or signup_at < FIRST_SEARCH_ACTIVATION_LAUNCH_DATE:
+        return None
 
-        # Day 3: signup 72-96h ago, still no profile confirmation
-        elif 72 < hours_since_signup < 96 and not already_sent(uid, 'onboarding_dropoff', 'day_3'):
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='onboarding_dropoff',
-                step='day_3',
-                subject="anything i can help with?",
-                body_paragraphs=[
-                    f"Hey, {SIGNATURE_NAME} again.",
-                    "One more nudge. If the onboarding flow is confusing, if something isn't working, or if you're just not sure Offerloop fits what you're recruiting for, reply to this email. I read every reply and answer.",
-                    "If Offerloop isn't the right thing right now, no worries. Reply 'stop' and I'll take you off the list.",
-                ],
-                cta_label=None,
-                cta_url=None,
-            )
-            if res.get('sent'):
-                sent['day_3'] += 1
+    hours_since_confirm = (now - profile_confirmed_at).total_seconds() / 3600
+
+    # Day 2: 48-72h after profileConfirmedAt
+    if 48 < hours_since_confirm < 72:
+        return 'day_2'
+    # Day 5: 120-144h after profileConfirmedAt
+    if 120 < hours_since_confirm < 144:
+        return 'day_5'
+    return None
+
+
+def _compose_first_search_activation(cand: Candidate, now: datetime) -> Optional[dict]:
+    user = cand.user
+    # Personalization: use user's targetIndustries or targetCompanies to
+    # concretize the example. Falls back to a generic phrasing if we
+    # don't have either signal (rare — onboarding collects at least one).
+    industries = user.get('targetIndustries') or []
+    primary_industry = (industries[0] if industries else '').lower()
+    companies = user.get('targetCompanies') or user.get('dreamCompanies') or []
+    primary_company = companies[0] if companies else None
+
+    if cand.step == 'day_2':
+        if primary_industry:
+            second_line = f"The one thing to do this week: search Find for one hiring manager or alumni at a {primary_industry} firm you actually care about."
+        else:
+            second_line = "The one thing to do this week: search Find for one hiring manager or alumni at a firm you actually care about."
+        return {
+            'subject': "the one thing to do this week",
+            'body_paragraphs': [
+                f"Hey, {SIGNATURE_NAME} here.",
+                second_line,
+                "One search takes about 30 seconds. Either what Offerloop returns is dialed enough that the rest of the workflow makes sense, or it isn't, and you'll know in that first minute. Better than sitting on it.",
+            ],
+            'cta_label': "Run your first search",
+            'cta_url': f'{PUBLIC_BASE_URL}/find?utm_source=lifecycle&utm_campaign=first_search_activation&utm_content=day_2',
+        }
+
+    if primary_company and primary_industry:
+        example_line = f"Try this specifically: type '{primary_industry} analyst at {primary_company}' (or whatever role you're targeting) in Find. That's the exact query pattern our most active users start with."
+    elif primary_industry:
+        example_line = f"Try this specifically: type '{primary_industry} analyst at [company you're targeting]' in Find. Fill in the company that matters to you. That's the exact query pattern our most active users start with."
+    else:
+        example_line = "Try this specifically: type '[role you're recruiting for] at [company you're targeting]' in Find. Concrete title, concrete firm. That's how our most active users start."
+    return {
+        'subject': "one specific thing to try",
+        'body_paragraphs': [
+            f"Hey, {SIGNATURE_NAME} again.",
+            "Your profile is set up but you haven't tried a search yet. That's usually the hardest step for new users so I'll drop something specific.",
+            example_line,
+            "If the results feel off or you're not sure what to search for, reply and tell me what you're recruiting for. I'll suggest a search that actually fits.",
+        ],
+        'cta_label': "Try the search",
+        'cta_url': f'{PUBLIC_BASE_URL}/find?utm_source=lifecycle&utm_campaign=first_search_activation&utm_content=day_5',
+    }
 
-    return {'ok': True, 'sent': sent}
 
+FIRST_SEARCH_ACTIVATION = Campaign(
+    name='first_search_activation',
+    select=_select_first_search_activation,
+    compose=_compose_first_search_activation,
+    counters=('day_2', 'day_5'),
+)
 
-# ---------------------------------------------------------------------------
-# Sequence 7: First-search activation (confirmed profile but never searched)
-# ---------------------------------------------------------------------------
 
 def process_first_search_activations() -> dict:
     """Scan for users who confirmed profile but haven't run a first search.
@@ -777,104 +876,76 @@ def process_first_search_activations() -> dict:
     stamp at all, but the signup-date filter is belt-and-suspenders in case
     a future backfill ever populates that field.
     """
-    db = get_db()
-    if not db:
-        return {'ok': False, 'error': 'db_unavailable'}
+    return _run_single_campaign(FIRST_SEARCH_ACTIVATION)
 
-    sent = {'day_2': 0, 'day_5': 0}
-    now = datetime.now(timezone.utc)
 
-    for snap in db.collection('users').stream():
-        user = snap.to_dict() or {}
-        uid = snap.id
-        email = user.get('email')
-        if not email:
-            continue
+# ---------------------------------------------------------------------------
+# Sequence 8: First-send activation (searched but never sent an email)
+# ---------------------------------------------------------------------------
 
-        # Must have confirmed profile (didn't drop off during onboarding)
-        profile_confirmed_at = _parse_ts_or_dt(user.get('profileConfirmedAt'))
-        if not profile_confirmed_at:
-            continue
+def _select_first_send_activation(uid: str, user: dict, now: datetime) -> Optional[str]:
+    # Must have run a search (past the profile-confirm and first-search steps)
+    first_search_at = _parse_ts_or_dt(user.get('firstSearchAt'))
+    if not first_search_at:
+        return None
 
-        # Skip users who already ran their first search
-        if _parse_ts_or_dt(user.get('firstSearchAt')):
-            continue
+    # Skip users who already sent an email
+    if _parse_ts_or_dt(user.get('firstEmailSentAt')):
+        return None
 
-        # Paying users already invested. Skip.
-        tier = user.get('subscriptionTier') or user.get('tier') or 'free'
-        if tier in ('pro', 'elite'):
-            continue
+    # Paying users skip
+    tier = user.get('subscriptionTier') or user.get('tier') or 'free'
+    if tier in ('pro', 'elite'):
+        return None
 
-        # Belt-and-suspenders launch-date filter on signupAt
-        signup_at = _parse_ts_or_dt(user.get('signupAt'))
-        if not signup_at or signup_at < FIRST_SEARCH_ACTIVATION_LAUNCH_DATE:
-            continue
+    # Launch-date safety filter on signupAt
+    signup_at = _parse_ts_or_dt(user.get('signupAt'))
+    if not signup_at or signup_at < FIRST_SEND_ACTIVATION_LAUNCH_DATE:
+        return None
 
-        hours_since_confirm = (now - profile_confirmed_at).total_seconds() / 3600
+    hours_since_search = (now - first_search_at).total_seconds() / 3600
 
-        # Personalization: use user's targetIndustries or targetCompanies to
-        # concretize the example. Falls back to a generic phrasing if we
-        # don't have either signal (rare — onboarding collects at least one).
-        industries = user.get('targetIndustries') or []
-        primary_industry = (industries[0] if industries else '').lower()
-        companies = user.get('targetCompanies') or user.get('dreamCompanies') or []
-        primary_company = companies[0] if companies else None
-
-        # Day 2: 48-72h after profileConfirmedAt
-        if 48 < hours_since_confirm < 72 and not already_sent(uid, 'first_search_activation', 'day_2'):
-            if primary_industry:
-                second_line = f"The one thing to do this week: search Find for one hiring manager or alumni at a {primary_industry} firm you actually care about."
-            else:
-                second_line = "The one thing to do this week: search Find for one hiring manager or alumni at a firm you actually care about."
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='first_search_activation',
-                step='day_2',
-                subject="the one thing to do this week",
-                body_paragraphs=[
-                    f"Hey, {SIGNATURE_NAME} here.",
-                    second_line,
-                    "One search takes about 30 seconds. Either what Offerloop returns is dialed enough that the rest of the workflow makes sense, or it isn't, and you'll know in that first minute. Better than sitting on it.",
-                ],
-                cta_label="Run your first search",
-                cta_url=f'{PUBLIC_BASE_URL}/find?utm_source=lifecycle&utm_campaign=first_search_activation&utm_content=day_2',
-            )
-            if res.get('sent'):
-                sent['day_2'] += 1
+    # Day 3: 72-96h after first search
+    if 72 < hours_since_search < 96:
+        return 'day_3'
+    # Day 7: 168-192h after first search
+    if 168 < hours_since_search < 192:
+        return 'day_7'
+    return None
 
-        # Day 5: 120-144h after profileConfirmedAt
-        elif 120 < hours_since_confirm < 144 and not already_sent(uid, 'first_search_activation', 'day_5'):
-            if primary_company and primary_industry:
-                example_line = f"Try this specifically: type '{primary_industry} analyst at {primary_company}' (or whatever role you're targeting) in Find. That's the exact query pattern our most active users start with."
-            elif primary_industry:
-                example_line = f"Try this specifically: type '{primary_industry} analyst at [company you're targeting]' in Find. Fill in the company that matters to you. That's the exact query pattern our most active users start with."
-            else:
-                example_line = "Try this specifically: type '[role you're recruiting for] at [company you're targeting]' in Find. Concrete title, concrete firm. That's how our most active users start."
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='first_search_activation',
-                step='day_5',
-                subject="one specific thing to try",
-                body_paragraphs=[
-                    f"Hey, {SIGNATURE_NAME} again.",
-                    "Your profile is set up but you haven't tried a search yet. That's usually the hardest step for new users so I'll drop something specific.",
-                    example_line,
-                    "If the results feel off or you're not sure what to search for, reply and tell me what you're recruiting for. I'll suggest a search that actually fits.",
-                ],
-                cta_label="Try the search",
-                cta_url=f'{PUBLIC_BASE_URL}/find?utm_source=lifecycle&utm_campaign=first_search_activation&utm_content=day_5',
-            )
-            if res.get('sent'):
-                sent['day_5'] += 1
 
-    return {'ok': True, 'sent': sent}
+def _compose_first_send_activation(cand: Candidate, now: datetime) -> Optional[dict]:
+    if cand.step == 'day_3':
+        return {
+            'subject': "the send is the whole game",
+            'body_paragraphs': [
+                f"Hey, {SIGNATURE_NAME} here.",
+                "Saw you ran a search but haven't sent an email yet. That's the most common freeze point for first-time cold outreach — the search gives you the contacts, but hitting send feels like a real thing you can't take back.",
+                "The move that actually works is stupidly short. Two sentences, one question. Something like: 'Hey {first_name}, I'm a {school} student recruiting for {industry}. Would you be open to a 15-min call so I can ask how you got to {company}?' That's it. That's the whole thing. Most replies come back within 48 hours.",
+                "Offerloop drafts something like that for you in one click. Try one send this week and see what comes back.",
+            ],
+            'cta_label': "Draft your first email",
+            'cta_url': f'{PUBLIC_BASE_URL}/find?utm_source=lifecycle&utm_campaign=first_send_activation&utm_content=day_3',
+        }
+    return {
+        'subject': "what's the block?",
+        'body_paragraphs': [
+            f"Hey, {SIGNATURE_NAME} again.",
+            "You ran a search a week ago and still haven't sent an email. There's usually one specific thing holding people up: not sure what to say, not sure who to send to first, worried about looking dumb, or the whole thing feels performative.",
+            "Whatever it is, reply and tell me. I'll help figure out the shortest first send that gets you a reply.",
+        ],
+        'cta_label': None,
+        'cta_url': None,
+    }
 
 
-# ---------------------------------------------------------------------------
-# Sequence 8: First-send activation (searched but never sent an email)
-# ---------------------------------------------------------------------------
+FIRST_SEND_ACTIVATION = Campaign(
+    name='first_send_activation',
+    select=_select_first_send_activation,
+    compose=_compose_first_send_activation,
+    counters=('day_3', 'day_7'),
+)
+
 
 def process_first_send_activations() -> dict:
     """Scan for users who ran a first search but never sent an email.
@@ -893,86 +964,154 @@ def process_first_send_activations() -> dict:
     to protect the backfilled users. Belt-and-suspenders alongside the
     natural firstSearchAt-must-be-set filter.
     """
-    db = get_db()
-    if not db:
-        return {'ok': False, 'error': 'db_unavailable'}
-
-    sent = {'day_3': 0, 'day_7': 0}
-    now = datetime.now(timezone.utc)
-
-    for snap in db.collection('users').stream():
-        user = snap.to_dict() or {}
-        uid = snap.id
-        email = user.get('email')
-        if not email:
-            continue
+    return _run_single_campaign(FIRST_SEND_ACTIVATION)
 
-        # Must have run a search (past the profile-confirm and first-search steps)
-        first_search_at = _parse_ts_or_dt(user.get('firstSearchAt'))
-        if not first_search_at:
-            continue
 
-        # Skip users who already sent an email
-        if _parse_ts_or_dt(user.get('firstEmailSentAt')):
-            continue
+# ---------------------------------------------------------------------------
+# Sequence 9: Welcome + onboarding drip (six emails over 30 days)
+# ---------------------------------------------------------------------------
 
-        # Paying users skip
-        tier = user.get('subscriptionTier') or user.get('tier') or 'free'
-        if tier in ('pro', 'elite'):
-            continue
+def _select_welcome_drip(uid: str, user: dict, now: datetime) -> Optional[str]:
+    signup_at = _parse_ts_or_dt(user.get('signupAt'))
+    if not signup_at:
+        return None
 
-        # Launch-date safety filter on signupAt
-        signup_at = _parse_ts_or_dt(user.get('signupAt'))
-        if not signup_at or signup_at < FIRST_SEND_ACTIVATION_LAUNCH_DATE:
-            continue
+    # Launch-date safety filter (mandatory — see process_welcome_drips)
+    if signup_at < WELCOME_DRIP_LAUNCH_DATE:
+        return None
 
-        hours_since_search = (now - first_search_at).total_seconds() / 3600
+    hours_since_signup = (now - signup_at).total_seconds() / 3600
+    tier = user.get('subscriptionTier') or user.get('tier') or 'free'
+
+    # Day 0: fires within first 6h of signup (catches any cron lag).
+    if 0 <= hours_since_signup < 6:
+        return 'day_0'
+    # Day 1: 24-30h after signup
+    if 24 < hours_since_signup < 30:
+        return 'day_1'
+    # Day 3: 72-78h — industry-personalized cold email pattern
+    if 72 < hours_since_signup < 78:
+        return 'day_3'
+    # Day 7: 168-174h — 5 things
+    if 168 < hours_since_signup < 174:
+        return 'day_7'
+    # Day 14: 336-342h — Pro upgrade nudge. Skip if already paying.
+    if 336 < hours_since_signup < 342 and tier not in ('pro', 'elite'):
+        return 'day_14'
+    # Day 30: 720-726h — month-1 recap + month-2 direction
+    if 720 < hours_since_signup < 726:
+        return 'day_30'
+    return None
+
+
+def _compose_welcome_drip(cand: Candidate, now: datetime) -> Optional[dict]:
+    step = cand.step
+    if step == 'day_0':
+        # A/B test on subject line: curious opener (A) vs value-forward (B).
+        # Variant is deterministic per uid so re-runs stay consistent.
+        variant = _ab_variant(cand.uid, 'welcome_day_0_subject')
+        day_0_subject = (
+            "you just signed up, a question"
+            if variant == 'A'
+            else "welcome to Offerloop, quick question"
+        )
+        return {
+            'subject': day_0_subject,
+            'body_paragraphs': [
+                f"I'm {SIGNATURE_NAME}, one of the co-founders of Offerloop.",
+                "What industry are you recruiting for, and what school are you at? Reply with those two things and I'll send back the specific playbook for your situation over the next 30 days.",
+                "No script, no automated funnel. I read every reply.",
+            ],
+            'cta_label': None,
+            'cta_url': None,
+            'variant': variant,
+        }
+
+    if step == 'day_1':
+        return {
+            'subject': "your recruiting workspace is ready",
+            'body_paragraphs': [
+                f"Hey, {SIGNATURE_NAME} here.",
+                "Your Find tab is set up with alumni and hiring-manager search dialed to the industries you told us about. One search takes about 30 seconds and pulls verified emails plus context on each contact.",
+                "Try one now. If nothing comes back or the results feel off, reply and tell me what you're targeting. I'll help figure out the right query.",
+            ],
+            'cta_label': "Run your first search",
+            'cta_url': f'{PUBLIC_BASE_URL}/find?utm_source=lifecycle&utm_campaign=welcome_drip&utm_content=day_1',
+        }
 
-        # Day 3: 72-96h after first search
-        if 72 < hours_since_search < 96 and not already_sent(uid, 'first_send_activation', 'day_3'):
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='first_send_activation',
-                step='day_3',
-                subject="the send is the whole game",
-                body_paragraphs=[
-                    f"Hey, {SIGNATURE_NAME} here.",
-                    "Saw you ran a search but haven't sent an email yet. That's the most common freeze point for first-time cold outreach — the search gives you the contacts, but hitting send feels like a real thing you can't take back.",
-                    "The move that actually works is stupidly short. Two sentences, one question. Something like: 'Hey {first_name}, I'm a {school} student recruiting for {industry}. Would you be open to a 15-min call so I can ask how you got to {company}?' That's it. That's the whole thing. Most replies come back within 48 hours.",
-                    "Offerloop drafts something like that for you in one click. Try one send this week and see what comes back.",
-                ],
-                cta_label="Draft your first email",
-                cta_url=f'{PUBLIC_BASE_URL}/find?utm_source=lifecycle&utm_campaign=first_send_activation&utm_content=day_3',
-            )
-            if res.get('sent'):
-                sent['day_3'] += 1
+    if step == 'day_3':
+        industries = cand.user.get('targetIndustries') or []
+        primary_industry = (industries[0] if industries else '').lower()
+        if primary_industry:
+            subject = f"the cold email that works in {primary_industry}"
+            second_line = f"Every industry has its own cold-email pattern. For {primary_industry}, the one that works reliably is: subject line under five words, first sentence names a shared connection or specific project, body has one specific ask."
+        else:
+            subject = "the cold email that actually works"
+            second_line = "The cold-email pattern that reliably works: subject line under five words, first sentence names a shared connection or specific project, body has one specific ask."
+        return {
+            'subject': subject,
+            'body_paragraphs': [
+                f"Hey, {SIGNATURE_NAME} again.",
+                second_line,
+                "Template that works: 'Subject: Quick question about your work. Body: Hey {first_name}, I'm a {school} student recruiting for the industry. Saw your background at {company}. Would you be open to a 15-min call about how you got there? Best, {your_name}'",
+                "Two sentences, one specific ask. Send Tuesday through Thursday mornings. Offerloop drafts something like this for you in one click.",
+            ],
+            'cta_label': "Try one send",
+            'cta_url': f'{PUBLIC_BASE_URL}/find?utm_source=lifecycle&utm_campaign=welcome_drip&utm_content=day_3',
+        }
+
+    if step == 'day_7':
+        return {
+            'subject': "5 things that separate students who land offers",
+            'body_paragraphs': [
+                f"Hey, {SIGNATURE_NAME} here.",
+                "Watched a lot of student recruiters over the last year. Here's what separates the ones who land offers from the ones who grind and get nothing back:",
+                "1. Send Tuesday through Thursday between 6am and 8am local. Your email sits at the top when they open their inbox.",
+                "2. Reply to something they wrote or posted before cold-emailing them. Gives you a legit shared reference in sentence one.",
+                "3. Mention a specific project or deal they worked on, not the company. Everyone else names the company.",
+                "4. Ask for 15 minutes, not 'your time'. Specific ask converts about two-to-one.",
+                "5. Send from your school email. Response rate roughly doubles.",
+                "If any of these feel weird or you want to know why they work, reply and I'll explain.",
+            ],
+            'cta_label': None,
+            'cta_url': None,
+        }
+
+    if step == 'day_14':
+        return {
+            'subject': "should you go pro?",
+            'body_paragraphs': [
+                f"Hey, {SIGNATURE_NAME} here.",
+                "You're two weeks in. Honest read on whether Pro is worth it:",
+                "If you're running 5+ searches a week, want 8 contacts per search instead of 3, or you want the hiring-manager search unlocked, Pro is $9.99/mo and pays for itself with one landed coffee chat.",
+                "If you're doing 1-2 searches, stay on Free. You don't need it yet.",
+                "The trial is 7 days free and you can cancel anytime. If you want to try it or you're unsure whether it fits your situation, reply and I'll help you decide.",
+            ],
+            'cta_label': "See Pro",
+            'cta_url': f'{PUBLIC_BASE_URL}/pricing?utm_source=lifecycle&utm_campaign=welcome_drip&utm_content=day_14',
+        }
 
-        # Day 7: 168-192h after first search
-        elif 168 < hours_since_search < 192 and not already_sent(uid, 'first_send_activation', 'day_7'):
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='first_send_activation',
-                step='day_7',
-                subject="what's the block?",
-                body_paragraphs=[
-                    f"Hey, {SIGNATURE_NAME} again.",
-                    "You ran a search a week ago and still haven't sent an email. There's usually one specific thing holding people up: not sure what to say, not sure who to send to first, worried about looking dumb, or the whole thing feels performative.",
-                    "Whatever it is, reply and tell me. I'll help figure out the shortest first send that gets you a reply.",
-                ],
-                cta_label=None,
-                cta_url=None,
-            )
-            if res.get('sent'):
-                sent['day_7'] += 1
+    return {
+        'subject': "your first month",
+        'body_paragraphs': [
+            f"Hey, {SIGNATURE_NAME} here.",
+            "It's been 30 days since you signed up. Whether you're deep in the pipeline right now or Offerloop's been sitting in a tab, here's the honest read on month two:",
+            "The users who land offers by the end of month two usually run 3 searches a week, send 5 emails, and follow up on any reply within 24 hours. That's basically it. That's the pattern.",
+            "If you've fallen off or you're not sure what to do next, reply and tell me where you're stuck. I'll suggest the next specific move for your situation.",
+            "If you're already crushing it, keep the streak.",
+        ],
+        'cta_label': "Back to your workspace",
+        'cta_url': f'{PUBLIC_BASE_URL}/find?utm_source=lifecycle&utm_campaign=welcome_drip&utm_content=day_30',
+    }
 
-    return {'ok': True, 'sent': sent}
 
+WELCOME_DRIP = Campaign(
+    name='welcome_drip',
+    select=_select_welcome_drip,
+    compose=_compose_welcome_drip,
+    counters=('day_0', 'day_1', 'day_3', 'day_7', 'day_14', 'day_30'),
+)
 
-# ---------------------------------------------------------------------------
-# Sequence 9: Welcome + onboarding drip (six emails over 30 days)
-# ---------------------------------------------------------------------------
 
 def process_welcome_drips() -> dict:
     """Six-email drip from Deena starting the moment someone signs up.
@@ -989,178 +1128,54 @@ def process_welcome_drips() -> dict:
     of them retro-enroll. Only signups from launch day forward flow
     through the drip.
     """
-    db = get_db()
-    if not db:
-        return {'ok': False, 'error': 'db_unavailable'}
+    return _run_single_campaign(WELCOME_DRIP)
 
-    sent = {'day_0': 0, 'day_1': 0, 'day_3': 0, 'day_7': 0, 'day_14': 0, 'day_30': 0}
-    now = datetime.now(timezone.utc)
 
-    for snap in db.collection('users').stream():
-        user = snap.to_dict() or {}
-        uid = snap.id
-        email = user.get('email')
-        if not email:
-            continue
+# ---------------------------------------------------------------------------
+# Sequence 10: Coffee chat prep discovery (got a reply, hasn't tried Meeting Prep)
+# ---------------------------------------------------------------------------
 
-        signup_at = _parse_ts_or_dt(user.get('signupAt'))
-        if not signup_at:
-            continue
+def _select_coffee_chat_discovery(uid: str, user: dict, now: datetime) -> Optional[str]:
+    first_reply_at = _parse_ts_or_dt(user.get('firstReplyReceivedAt'))
+    if not first_reply_at:
+        return None
 
-        # Launch-date safety filter (mandatory — see docstring)
-        if signup_at < WELCOME_DRIP_LAUNCH_DATE:
-            continue
+    # Skip users who already used Meeting Prep
+    if (user.get('coffeeChatPrepsUsed') or 0) > 0:
+        return None
 
-        hours_since_signup = (now - signup_at).total_seconds() / 3600
-        tier = user.get('subscriptionTier') or user.get('tier') or 'free'
-        industries = user.get('targetIndustries') or []
-        primary_industry = (industries[0] if industries else '').lower()
+    signup_at = _parse_ts_or_dt(user.get('signupAt'))
+    if not signup_at or signup_at < COFFEE_CHAT_DISCOVERY_LAUNCH_DATE:
+        return None
 
-        # Day 0: fires within first 6h of signup (catches any cron lag).
-        # A/B test on subject line: curious opener (A) vs value-forward (B).
-        # Variant is deterministic per uid so re-runs stay consistent.
-        if 0 <= hours_since_signup < 6 and not already_sent(uid, 'welcome_drip', 'day_0'):
-            variant = _ab_variant(uid, 'welcome_day_0_subject')
-            day_0_subject = (
-                "you just signed up, a question"
-                if variant == 'A'
-                else "welcome to Offerloop, quick question"
-            )
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='welcome_drip',
-                step='day_0',
-                subject=day_0_subject,
-                body_paragraphs=[
-                    f"I'm {SIGNATURE_NAME}, one of the co-founders of Offerloop.",
-                    "What industry are you recruiting for, and what school are you at? Reply with those two things and I'll send back the specific playbook for your situation over the next 30 days.",
-                    "No script, no automated funnel. I read every reply.",
-                ],
-                cta_label=None,
-                cta_url=None,
-                variant=variant,
-            )
-            if res.get('sent'):
-                sent['day_0'] += 1
+    hours_since_reply = (now - first_reply_at).total_seconds() / 3600
 
-        # Day 1: 24-30h after signup
-        elif 24 < hours_since_signup < 30 and not already_sent(uid, 'welcome_drip', 'day_1'):
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='welcome_drip',
-                step='day_1',
-                subject="your recruiting workspace is ready",
-                body_paragraphs=[
-                    f"Hey, {SIGNATURE_NAME} here.",
-                    "Your Find tab is set up with alumni and hiring-manager search dialed to the industries you told us about. One search takes about 30 seconds and pulls verified emails plus context on each contact.",
-                    "Try one now. If nothing comes back or the results feel off, reply and tell me what you're targeting. I'll help figure out the right query.",
-                ],
-                cta_label="Run your first search",
-                cta_url=f'{PUBLIC_BASE_URL}/find?utm_source=lifecycle&utm_campaign=welcome_drip&utm_content=day_1',
-            )
-            if res.get('sent'):
-                sent['day_1'] += 1
+    # Day 0: fire within 24h of first reply (positive-signal, hot moment)
+    if 0 <= hours_since_reply < 24:
+        return 'day_0'
+    return None
 
-        # Day 3: 72-78h — industry-personalized cold email pattern
-        elif 72 < hours_since_signup < 78 and not already_sent(uid, 'welcome_drip', 'day_3'):
-            if primary_industry:
-                subject = f"the cold email that works in {primary_industry}"
-                second_line = f"Every industry has its own cold-email pattern. For {primary_industry}, the one that works reliably is: subject line under five words, first sentence names a shared connection or specific project, body has one specific ask."
-            else:
-                subject = "the cold email that actually works"
-                second_line = "The cold-email pattern that reliably works: subject line under five words, first sentence names a shared connection or specific project, body has one specific ask."
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='welcome_drip',
-                step='day_3',
-                subject=subject,
-                body_paragraphs=[
-                    f"Hey, {SIGNATURE_NAME} again.",
-                    second_line,
-                    "Template that works: 'Subject: Quick question about your work. Body: Hey {first_name}, I'm a {school} student recruiting for the industry. Saw your background at {company}. Would you be open to a 15-min call about how you got there? Best, {your_name}'",
-                    "Two sentences, one specific ask. Send Tuesday through Thursday mornings. Offerloop drafts something like this for you in one click.",
-                ],
-                cta_label="Try one send",
-                cta_url=f'{PUBLIC_BASE_URL}/find?utm_source=lifecycle&utm_campaign=welcome_drip&utm_content=day_3',
-            )
-            if res.get('sent'):
-                sent['day_3'] += 1
 
-        # Day 7: 168-174h — 5 things
-        elif 168 < hours_since_signup < 174 and not already_sent(uid, 'welcome_drip', 'day_7'):
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='welcome_drip',
-                step='day_7',
-                subject="5 things that separate students who land offers",
-                body_paragraphs=[
-                    f"Hey, {SIGNATURE_NAME} here.",
-                    "Watched a lot of student recruiters over the last year. Here's what separates the ones who land offers from the ones who grind and get nothing back:",
-                    "1. Send Tuesday through Thursday between 6am and 8am local. Your email sits at the top when they open their inbox.",
-                    "2. Reply to something they wrote or posted before cold-emailing them. Gives you a legit shared reference in sentence one.",
-                    "3. Mention a specific project or deal they worked on, not the company. Everyone else names the company.",
-                    "4. Ask for 15 minutes, not 'your time'. Specific ask converts about two-to-one.",
-                    "5. Send from your school email. Response rate roughly doubles.",
-                    "If any of these feel weird or you want to know why they work, reply and I'll explain.",
-                ],
-                cta_label=None,
-                cta_url=None,
-            )
-            if res.get('sent'):
-                sent['day_7'] += 1
+def _compose_coffee_chat_discovery(cand: Candidate, now: datetime) -> Optional[dict]:
+    return {
+        'subject': "you got a reply, time to prep",
+        'body_paragraphs': [
+            f"Hey, {SIGNATURE_NAME} here.",
+            "Saw you got a reply on Offerloop, which means you have a real conversation coming up. Meeting Prep pulls together talking points, questions to ask, and background research on the person you're meeting so you don't fumble the actual call.",
+            "Free tier gets 3 preps lifetime, so save them for the meetings that matter most. Worth using one before your first coffee chat.",
+        ],
+        'cta_label': "Try Meeting Prep",
+        'cta_url': f'{PUBLIC_BASE_URL}/coffee-chat-prep?utm_source=lifecycle&utm_campaign=coffee_chat_discovery&utm_content=day_0',
+    }
 
-        # Day 14: 336-342h — Pro upgrade nudge. Skip if already paying.
-        elif 336 < hours_since_signup < 342 and tier not in ('pro', 'elite') and not already_sent(uid, 'welcome_drip', 'day_14'):
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='welcome_drip',
-                step='day_14',
-                subject="should you go pro?",
-                body_paragraphs=[
-                    f"Hey, {SIGNATURE_NAME} here.",
-                    "You're two weeks in. Honest read on whether Pro is worth it:",
-                    "If you're running 5+ searches a week, want 8 contacts per search instead of 3, or you want the hiring-manager search unlocked, Pro is $9.99/mo and pays for itself with one landed coffee chat.",
-                    "If you're doing 1-2 searches, stay on Free. You don't need it yet.",
-                    "The trial is 7 days free and you can cancel anytime. If you want to try it or you're unsure whether it fits your situation, reply and I'll help you decide.",
-                ],
-                cta_label="See Pro",
-                cta_url=f'{PUBLIC_BASE_URL}/pricing?utm_source=lifecycle&utm_campaign=welcome_drip&utm_content=day_14',
-            )
-            if res.get('sent'):
-                sent['day_14'] += 1
 
-        # Day 30: 720-726h — month-1 recap + month-2 direction
-        elif 720 < hours_since_signup < 726 and not already_sent(uid, 'welcome_drip', 'day_30'):
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='welcome_drip',
-                step='day_30',
-                subject="your first month",
-                body_paragraphs=[
-                    f"Hey, {SIGNATURE_NAME} here.",
-                    "It's been 30 days since you signed up. Whether you're deep in the pipeline right now or Offerloop's been sitting in a tab, here's the honest read on month two:",
-                    "The users who land offers by the end of month two usually run 3 searches a week, send 5 emails, and follow up on any reply within 24 hours. That's basically it. That's the pattern.",
-                    "If you've fallen off or you're not sure what to do next, reply and tell me where you're stuck. I'll suggest the next specific move for your situation.",
-                    "If you're already crushing it, keep the streak.",
-                ],
-                cta_label="Back to your workspace",
-                cta_url=f'{PUBLIC_BASE_URL}/find?utm_source=lifecycle&utm_campaign=welcome_drip&utm_content=day_30',
-            )
-            if res.get('sent'):
-                sent['day_30'] += 1
+COFFEE_CHAT_DISCOVERY = Campaign(
+    name='coffee_chat_discovery',
+    select=_select_coffee_chat_discovery,
+    compose=_compose_coffee_chat_discovery,
+    counters=('day_0',),
+)
 
-    return {'ok': True, 'sent': sent}
-
-
-# ---------------------------------------------------------------------------
-# Sequence 10: Coffee chat prep discovery (got a reply, hasn't tried Meeting Prep)
-# ---------------------------------------------------------------------------
 
 def process_coffee_chat_discoveries() -> dict:
     """One-shot email for users who got their first reply but never opened
@@ -1172,59 +1187,54 @@ def process_coffee_chat_discoveries() -> dict:
 
     Safety: COFFEE_CHAT_DISCOVERY_LAUNCH_DATE gates on signupAt.
     """
-    db = get_db()
-    if not db:
-        return {'ok': False, 'error': 'db_unavailable'}
+    return _run_single_campaign(COFFEE_CHAT_DISCOVERY)
 
-    sent = {'day_0': 0}
-    now = datetime.now(timezone.utc)
 
-    for snap in db.collection('users').stream():
-        user = snap.to_dict() or {}
-        uid = snap.id
-        email = user.get('email')
-        if not email:
-            continue
+# ---------------------------------------------------------------------------
+# Sequence 11: Job board discovery (has been active but never opened Job Board)
+# ---------------------------------------------------------------------------
 
-        first_reply_at = _parse_ts_or_dt(user.get('firstReplyReceivedAt'))
-        if not first_reply_at:
-            continue
+def _select_job_board_discovery(uid: str, user: dict, now: datetime) -> Optional[str]:
+    profile_confirmed_at = _parse_ts_or_dt(user.get('profileConfirmedAt'))
+    if not profile_confirmed_at:
+        return None
 
-        # Skip users who already used Meeting Prep
-        if (user.get('coffeeChatPrepsUsed') or 0) > 0:
-            continue
+    # Skip users who already visited Job Board
+    if _parse_ts_or_dt(user.get('jobBoardVisitedAt')):
+        return None
 
-        signup_at = _parse_ts_or_dt(user.get('signupAt'))
-        if not signup_at or signup_at < COFFEE_CHAT_DISCOVERY_LAUNCH_DATE:
-            continue
+    signup_at = _parse_ts_or_dt(user.get('signupAt'))
+    if not signup_at or signup_at < JOB_BOARD_DISCOVERY_LAUNCH_DATE:
+        return None
 
-        hours_since_reply = (now - first_reply_at).total_seconds() / 3600
+    hours_since_confirm = (now - profile_confirmed_at).total_seconds() / 3600
 
-        # Day 0: fire within 24h of first reply (positive-signal, hot moment)
-        if 0 <= hours_since_reply < 24 and not already_sent(uid, 'coffee_chat_discovery', 'day_0'):
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='coffee_chat_discovery',
-                step='day_0',
-                subject="you got a reply, time to prep",
-                body_paragraphs=[
-                    f"Hey, {SIGNATURE_NAME} here.",
-                    "Saw you got a reply on Offerloop, which means you have a real conversation coming up. Meeting Prep pulls together talking points, questions to ask, and background research on the person you're meeting so you don't fumble the actual call.",
-                    "Free tier gets 3 preps lifetime, so save them for the meetings that matter most. Worth using one before your first coffee chat.",
-                ],
-                cta_label="Try Meeting Prep",
-                cta_url=f'{PUBLIC_BASE_URL}/coffee-chat-prep?utm_source=lifecycle&utm_campaign=coffee_chat_discovery&utm_content=day_0',
-            )
-            if res.get('sent'):
-                sent['day_0'] += 1
+    # Day 10: fires 240-264h after profileConfirmedAt (10-11 days)
+    if 240 < hours_since_confirm < 264:
+        return 'day_10'
+    return None
 
-    return {'ok': True, 'sent': sent}
 
+def _compose_job_board_discovery(cand: Candidate, now: datetime) -> Optional[dict]:
+    return {
+        'subject': "the other half of Offerloop",
+        'body_paragraphs': [
+            f"Hey, {SIGNATURE_NAME} here.",
+            "Most students focus on the outreach side of Offerloop but the Job Board is where actual openings live. Every job listing has real hiring team contacts pre-attached, so you can email the hiring manager the same day the role posts.",
+            "It takes about a minute to see if anything on your target list is hiring right now. Worth a look.",
+        ],
+        'cta_label': "See Job Board",
+        'cta_url': f'{PUBLIC_BASE_URL}/job-board?utm_source=lifecycle&utm_campaign=job_board_discovery&utm_content=day_10',
+    }
+
+
+JOB_BOARD_DISCOVERY = Campaign(
+    name='job_board_discovery',
+    select=_select_job_board_discovery,
+    compose=_compose_job_board_discovery,
+    counters=('day_10',),
+)
 
-# ---------------------------------------------------------------------------
-# Sequence 11: Job board discovery (has been active but never opened Job Board)
-# ---------------------------------------------------------------------------
 
 def process_job_board_discoveries() -> dict:
     """One-shot email at profileConfirmedAt + 10 days for users who haven't
@@ -1233,59 +1243,62 @@ def process_job_board_discoveries() -> dict:
 
     Safety: JOB_BOARD_DISCOVERY_LAUNCH_DATE gates on signupAt.
     """
-    db = get_db()
-    if not db:
-        return {'ok': False, 'error': 'db_unavailable'}
+    return _run_single_campaign(JOB_BOARD_DISCOVERY)
 
-    sent = {'day_10': 0}
-    now = datetime.now(timezone.utc)
 
-    for snap in db.collection('users').stream():
-        user = snap.to_dict() or {}
-        uid = snap.id
-        email = user.get('email')
-        if not email:
-            continue
+# ---------------------------------------------------------------------------
+# Sequence 12: Free ceiling (free user hit 90% of monthly credits)
+# ---------------------------------------------------------------------------
 
-        profile_confirmed_at = _parse_ts_or_dt(user.get('profileConfirmedAt'))
-        if not profile_confirmed_at:
-            continue
+def _select_free_ceiling(uid: str, user: dict, now: datetime) -> Optional[str]:
+    tier = user.get('subscriptionTier') or user.get('tier') or 'free'
+    if tier != 'free':
+        return None
 
-        # Skip users who already visited Job Board
-        if _parse_ts_or_dt(user.get('jobBoardVisitedAt')):
-            continue
+    max_credits = user.get('maxCredits') or 0
+    credits = user.get('credits')
+    if not max_credits or credits is None:
+        return None
+    # 90% or more consumed
+    if credits > 0.1 * max_credits:
+        return None
 
-        signup_at = _parse_ts_or_dt(user.get('signupAt'))
-        if not signup_at or signup_at < JOB_BOARD_DISCOVERY_LAUNCH_DATE:
-            continue
+    signup_at = _parse_ts_or_dt(user.get('signupAt'))
+    if not signup_at or signup_at < FREE_CEILING_LAUNCH_DATE:
+        return None
 
-        hours_since_confirm = (now - profile_confirmed_at).total_seconds() / 3600
+    # Month-scoped idempotency: uid can retrigger next month, but only once per month
+    return f"month_{now.strftime('%Y_%m')}"
 
-        # Day 10: fires 240-264h after profileConfirmedAt (10-11 days)
-        if 240 < hours_since_confirm < 264 and not already_sent(uid, 'job_board_discovery', 'day_10'):
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='job_board_discovery',
-                step='day_10',
-                subject="the other half of Offerloop",
-                body_paragraphs=[
-                    f"Hey, {SIGNATURE_NAME} here.",
-                    "Most students focus on the outreach side of Offerloop but the Job Board is where actual openings live. Every job listing has real hiring team contacts pre-attached, so you can email the hiring manager the same day the role posts.",
-                    "It takes about a minute to see if anything on your target list is hiring right now. Worth a look.",
-                ],
-                cta_label="See Job Board",
-                cta_url=f'{PUBLIC_BASE_URL}/job-board?utm_source=lifecycle&utm_campaign=job_board_discovery&utm_content=day_10',
-            )
-            if res.get('sent'):
-                sent['day_10'] += 1
 
-    return {'ok': True, 'sent': sent}
+def _compose_free_ceiling(cand: Candidate, now: datetime) -> Optional[dict]:
+    user = cand.user
+    max_credits = user.get('maxCredits') or 0
+    credits = user.get('credits')
+    used = max_credits - credits
+    used_pct = int(round(100 * used / max_credits)) if max_credits else 0
+    month_key = now.strftime('%Y_%m')
+    return {
+        'subject': f"you've used {used_pct}% of your credits",
+        'body_paragraphs': [
+            f"Hey, {SIGNATURE_NAME} here.",
+            f"You've used {used} of your {max_credits} credits this month, which means you've been getting real value from Offerloop. Free tier resets on the 1st of next month, so you have a decision to make.",
+            "If you want to keep going before then, Pro is $9.99/mo and gets you 2,000 credits (about 6x what you had this month) plus 8 contacts per search instead of 3. The trial is 7 days free.",
+            "If you'd rather just wait for the reset, that's a legitimate move too. Just wanted to flag where you are.",
+        ],
+        'cta_label': "See Pro",
+        'cta_url': f'{PUBLIC_BASE_URL}/pricing?utm_source=lifecycle&utm_campaign=free_ceiling&utm_content={month_key}',
+    }
 
 
-# ---------------------------------------------------------------------------
-# Sequence 12: Free ceiling (free user hit 90% of monthly credits)
-# ---------------------------------------------------------------------------
+FREE_CEILING = Campaign(
+    name='free_ceiling',
+    select=_select_free_ceiling,
+    compose=_compose_free_ceiling,
+    counters=('month',),
+    counter='month',
+)
+
 
 def process_free_ceilings() -> dict:
     """One email when a free user has used 90%+ of their monthly credit
@@ -1294,64 +1307,7 @@ def process_free_ceilings() -> dict:
 
     Safety: FREE_CEILING_LAUNCH_DATE gates on signupAt.
     """
-    db = get_db()
-    if not db:
-        return {'ok': False, 'error': 'db_unavailable'}
-
-    sent = {'month': 0}
-    now = datetime.now(timezone.utc)
-    month_key = now.strftime('%Y_%m')
-
-    for snap in db.collection('users').stream():
-        user = snap.to_dict() or {}
-        uid = snap.id
-        email = user.get('email')
-        if not email:
-            continue
-
-        tier = user.get('subscriptionTier') or user.get('tier') or 'free'
-        if tier != 'free':
-            continue
-
-        max_credits = user.get('maxCredits') or 0
-        credits = user.get('credits')
-        if not max_credits or credits is None:
-            continue
-        # 90% or more consumed
-        if credits > 0.1 * max_credits:
-            continue
-
-        signup_at = _parse_ts_or_dt(user.get('signupAt'))
-        if not signup_at or signup_at < FREE_CEILING_LAUNCH_DATE:
-            continue
-
-        used = max_credits - credits
-        used_pct = int(round(100 * used / max_credits)) if max_credits else 0
-
-        # Month-scoped idempotency: uid can retrigger next month, but only once per month
-        step = f'month_{month_key}'
-        if already_sent(uid, 'free_ceiling', step):
-            continue
-
-        res = _send_lifecycle_email(
-            user_or_lead_id=uid,
-            recipient_email=email,
-            campaign='free_ceiling',
-            step=step,
-            subject=f"you've used {used_pct}% of your credits",
-            body_paragraphs=[
-                f"Hey, {SIGNATURE_NAME} here.",
-                f"You've used {used} of your {max_credits} credits this month, which means you've been getting real value from Offerloop. Free tier resets on the 1st of next month, so you have a decision to make.",
-                "If you want to keep going before then, Pro is $9.99/mo and gets you 2,000 credits (about 6x what you had this month) plus 8 contacts per search instead of 3. The trial is 7 days free.",
-                "If you'd rather just wait for the reset, that's a legitimate move too. Just wanted to flag where you are.",
-            ],
-            cta_label="See Pro",
-            cta_url=f'{PUBLIC_BASE_URL}/pricing?utm_source=lifecycle&utm_campaign=free_ceiling&utm_content={month_key}',
-        )
-        if res.get('sent'):
-            sent['month'] += 1
-
-    return {'ok': True, 'sent': sent}
+    return _run_single_campaign(FREE_CEILING)
 
 
 # ---------------------------------------------------------------------------
@@ -1376,8 +1332,9 @@ def _count_weekly_stats(uid: str, week_start_iso: str) -> dict:
         return stats
     try:
         contacts_ref = db.collection('users').document(uid).collection('contacts')
-        added = list(contacts_ref.where('createdAt', '>=', week_start_iso).limit(500).stream())
-        stats['contacts_added'] = len(added)
+        stats['contacts_added'] = _agg_count(
+            contacts_ref.where('createdAt', '>=', week_start_iso).limit(500)
+        )
 
         emailed = list(contacts_ref.where('emailGeneratedAt', '>=', week_start_iso).limit(500).stream())
         stats['emails_sent'] = len(emailed)
@@ -1435,115 +1392,108 @@ def _weekly_nudge(stats: dict) -> tuple[str, str, str]:
     )
 
 
-def process_weekly_win_reports() -> dict:
-    """Sunday recap: 3 real numbers + peer median (if available) + next-week nudge.
-
-    Fires only:
-    - On Sunday, UTC 18:00–22:00 (11am–3pm Pacific, 2pm–6pm Eastern).
-    - Once per user per ISO week (idempotency key includes iso_year/iso_week).
-    - User signed up >= 7 days ago (so a full week of data exists).
-    - profileConfirmedAt is set (they got past onboarding).
-    - Total activity for the week > 0 (skip send-nothing weeks; activation
-      campaigns already cover users with zero movement).
-    - signupAt >= WEEKLY_WIN_REPORT_LAUNCH_DATE (protects the ~270 backfilled users).
-
-    Peer comparison line only appears when we have >= 5 comparable users with
-    non-zero activity; below that we skip the line rather than compare against
-    a fragile sample.
-    """
-    db = get_db()
-    if not db:
-        return {'ok': False, 'error': 'db_unavailable'}
-
-    now = datetime.now(timezone.utc)
-
+def _weekly_window(now: datetime) -> bool:
     # Day-of-week + time-of-day gate. Sunday = weekday 6. Send window 18:00–22:00 UTC.
-    if now.weekday() != 6 or not (18 <= now.hour < 22):
-        return {'ok': True, 'sent': {'weekly': 0}, 'skipped': 'not_send_window'}
+    return now.weekday() == 6 and 18 <= now.hour < 22
+
 
+def _select_weekly_win_report(uid: str, user: dict, now: datetime) -> Optional[str]:
+    signup_at = _parse_ts_or_dt(user.get('signupAt'))
+    if not signup_at or signup_at < WEEKLY_WIN_REPORT_LAUNCH_DATE:
+        return None
+    if (now - signup_at).days < 7:
+        return None
+    if not _parse_ts_or_dt(user.get('profileConfirmedAt')):
+        return None
     iso_year, iso_week, _ = now.isocalendar()
-    step = f'week_{iso_year}_{iso_week:02d}'
+    return f'week_{iso_year}_{iso_week:02d}'
+
 
+def _prepare_weekly_win_report(cands: list, now: datetime) -> list:
     # The "week" we're reporting on is the Monday–Sunday that just closed.
     # At UTC Sunday 18:00 we're still inside that week, so start-of-week is
     # the Monday of the current ISO week.
-    week_start = _week_start_utc(now)
-    week_start_iso = week_start.isoformat().replace('+00:00', 'Z')
+    week_start_iso = _week_start_utc(now).isoformat().replace('+00:00', 'Z')
 
-    eligible: list[tuple[str, dict, str, dict]] = []  # (uid, user, email, stats)
-
-    for snap in db.collection('users').stream():
-        user = snap.to_dict() or {}
-        uid = snap.id
-        email = user.get('email')
-        if not email:
-            continue
-
-        signup_at = _parse_ts_or_dt(user.get('signupAt'))
-        if not signup_at or signup_at < WEEKLY_WIN_REPORT_LAUNCH_DATE:
-            continue
-        if (now - signup_at).days < 7:
-            continue
-        if not _parse_ts_or_dt(user.get('profileConfirmedAt')):
-            continue
-        if already_sent(uid, 'weekly_win_report', step):
-            continue
-
-        stats = _count_weekly_stats(uid, week_start_iso)
+    eligible = []
+    for cand in cands:
+        stats = _count_weekly_stats(cand.uid, week_start_iso)
         if stats['contacts_added'] + stats['emails_sent'] + stats['replies_received'] == 0:
             continue
-
-        eligible.append((uid, user, email, stats))
+        cand.data['stats'] = stats
+        eligible.append(cand)
 
     peer_line = None
     if len(eligible) >= 5:
-        peer_contacts = _median([s['contacts_added'] for _, _, _, s in eligible])
-        peer_emails = _median([s['emails_sent'] for _, _, _, s in eligible])
-        peer_replies = _median([s['replies_received'] for _, _, _, s in eligible])
+        peer_contacts = _median([c.data['stats']['contacts_added'] for c in eligible])
+        peer_emails = _median([c.data['stats']['emails_sent'] for c in eligible])
+        peer_replies = _median([c.data['stats']['replies_received'] for c in eligible])
         peer_line = (
             f"For reference, the median student on Offerloop this week added {peer_contacts} "
             f"contact{'s' if peer_contacts != 1 else ''}, sent {peer_emails} "
             f"email{'s' if peer_emails != 1 else ''}, and got {peer_replies} "
             f"repl{'ies' if peer_replies != 1 else 'y'}."
         )
+    for cand in eligible:
+        cand.data['peer_line'] = peer_line
+    return eligible
 
-    sent = {'weekly': 0}
-    for uid, _user, email, stats in eligible:
-        contacts = stats['contacts_added']
-        emails = stats['emails_sent']
-        replies = stats['replies_received']
 
-        stat_lines = [
-            f"Contacts added: {contacts}",
-            f"Emails sent: {emails}",
-            f"Replies received: {replies}",
-        ]
-        stats_block = " · ".join(stat_lines)
+def _compose_weekly_win_report(cand: Candidate, now: datetime) -> Optional[dict]:
+    stats = cand.data['stats']
+    stats_block = " · ".join([
+        f"Contacts added: {stats['contacts_added']}",
+        f"Emails sent: {stats['emails_sent']}",
+        f"Replies received: {stats['replies_received']}",
+    ])
 
-        nudge_para, cta_label, cta_url = _weekly_nudge(stats)
+    nudge_para, cta_label, cta_url = _weekly_nudge(stats)
 
-        paragraphs = [
-            f"Hey, {SIGNATURE_NAME} here. Quick recap of your last 7 days on Offerloop.",
-            stats_block,
-        ]
-        if peer_line:
-            paragraphs.append(peer_line)
-        paragraphs.append(nudge_para)
+    paragraphs = [
+        f"Hey, {SIGNATURE_NAME} here. Quick recap of your last 7 days on Offerloop.",
+        stats_block,
+    ]
+    if cand.data.get('peer_line'):
+        paragraphs.append(cand.data['peer_line'])
+    paragraphs.append(nudge_para)
 
-        res = _send_lifecycle_email(
-            user_or_lead_id=uid,
-            recipient_email=email,
-            campaign='weekly_win_report',
-            step=step,
-            subject="your week on Offerloop",
-            body_paragraphs=paragraphs,
-            cta_label=cta_label,
-            cta_url=cta_url,
-        )
-        if res.get('sent'):
-            sent['weekly'] += 1
+    return {
+        'subject': "your week on Offerloop",
+        'body_paragraphs': paragraphs,
+        'cta_label': cta_label,
+        'cta_url': cta_url,
+    }
+
+
+WEEKLY_WIN_REPORT = Campaign(
+    name='weekly_win_report',
+    select=_select_weekly_win_report,
+    prepare=_prepare_weekly_win_report,
+    compose=_compose_weekly_win_report,
+    window=_weekly_window,
+    counters=('weekly',),
+    counter='weekly',
+    report_eligible='total',
+)
+
+
+def process_weekly_win_reports() -> dict:
+    """Sunday recap: 3 real numbers + peer median (if available) + next-week nudge.
 
-    return {'ok': True, 'sent': sent, 'eligible': len(eligible)}
+    Fires only:
+    - On Sunday, UTC 18:00–22:00 (11am–3pm Pacific, 2pm–6pm Eastern).
+    - Once per user per ISO week (idempotency key includes iso_year/iso_week).
+    - User signed up >= 7 days ago (so a full week of data exists).
+    - profileConfirmedAt is set (they got past onboarding).
+    - Total activity for the week > 0 (skip send-nothing weeks; activation
+      campaigns already cover users with zero movement).
+    - signupAt >= WEEKLY_WIN_REPORT_LAUNCH_DATE (protects the ~270 backfilled users).
+
+    Peer comparison line only appears when we have >= 5 comparable users with
+    non-zero activity; below that we skip the line rather than compare against
+    a fragile sample.
+    """
+    return _run_single_campaign(WEEKLY_WIN_REPORT)
 
 
 # ---------------------------------------------------------------------------
@@ -1573,11 +1523,12 @@ def _count_month_stats(uid: str, start_iso: str, end_iso: str) -> dict:
     try:
         contacts_ref = db.collection('users').document(uid).collection('contacts')
 
-        added = list(contacts_ref
-                     .where('createdAt', '>=', start_iso)
-                     .where('createdAt', '<', end_iso)
-                     .limit(2000).stream())
-        stats['contacts_added'] = len(added)
+        stats['contacts_added'] = _agg_count(
+            contacts_ref
+            .where('createdAt', '>=', start_iso)
+            .where('createdAt', '<', end_iso)
+            .limit(2000)
+        )
 
         emailed = list(contacts_ref
                        .where('emailGeneratedAt', '>=', start_iso)
@@ -1623,93 +1574,92 @@ def _untried_feature(user: dict) -> tuple[str, str, str]:
     )
 
 
-def process_pro_monthly_recaps() -> dict:
-    """1st-of-month recap for Pro and Elite users covering the calendar month
-    that just ended.
+def _monthly_recap_window(now: datetime) -> bool:
+    # Day-of-month + time-of-day gate. Only on the 1st, UTC 15:00-19:00.
+    return now.day == 1 and 15 <= now.hour < 19
 
-    Fires only:
-    - On the 1st of the month, UTC 15:00-19:00 (8am-12pm Pacific, 11am-3pm Eastern).
-    - Once per user per calendar month (idempotency key uses YYYY_MM of the
-      reported month).
-    - subscriptionTier is 'pro' or 'elite'.
-    - profileConfirmedAt is set (they got past onboarding).
-    - signupAt >= PRO_MONTHLY_RECAP_LAUNCH_DATE (protects backfilled users).
 
-    Users with zero activity for the month are skipped; the free_ceiling and
-    activation campaigns already cover that funnel stage.
-    """
-    db = get_db()
-    if not db:
-        return {'ok': False, 'error': 'db_unavailable'}
+def _select_pro_monthly_recap(uid: str, user: dict, now: datetime) -> Optional[str]:
+    tier = user.get('subscriptionTier') or user.get('tier') or 'free'
+    if tier not in ('pro', 'elite'):
+        return None
 
-    now = datetime.now(timezone.utc)
+    signup_at = _parse_ts_or_dt(user.get('signupAt'))
+    if not signup_at or signup_at < PRO_MONTHLY_RECAP_LAUNCH_DATE:
+        return None
+    if not _parse_ts_or_dt(user.get('profileConfirmedAt')):
+        return None
+    _, _, month_key = _prev_month_bounds_utc(now)
+    return f'monthly_recap_{month_key}'
 
-    # Day-of-month + time-of-day gate. Only on the 1st, UTC 15:00-19:00.
-    if now.day != 1 or not (15 <= now.hour < 19):
-        return {'ok': True, 'sent': {'monthly': 0}, 'skipped': 'not_send_window'}
 
-    start, end, month_key = _prev_month_bounds_utc(now)
+def _prepare_pro_monthly_recap(cands: list, now: datetime) -> list:
+    start, end, _ = _prev_month_bounds_utc(now)
     start_iso = start.isoformat().replace('+00:00', 'Z')
     end_iso = end.isoformat().replace('+00:00', 'Z')
-    step = f'monthly_recap_{month_key}'
-
-    sent = {'monthly': 0}
-    eligible_count = 0
-
-    for snap in db.collection('users').stream():
-        user = snap.to_dict() or {}
-        uid = snap.id
-        email = user.get('email')
-        if not email:
-            continue
-
-        tier = user.get('subscriptionTier') or user.get('tier') or 'free'
-        if tier not in ('pro', 'elite'):
-            continue
-
-        signup_at = _parse_ts_or_dt(user.get('signupAt'))
-        if not signup_at or signup_at < PRO_MONTHLY_RECAP_LAUNCH_DATE:
-            continue
-        if not _parse_ts_or_dt(user.get('profileConfirmedAt')):
-            continue
-        if already_sent(uid, 'pro_monthly_recap', step):
-            continue
 
-        stats = _count_month_stats(uid, start_iso, end_iso)
+    eligible = []
+    for cand in cands:
+        stats = _count_month_stats(cand.uid, start_iso, end_iso)
         if stats['contacts_added'] + stats['emails_sent'] + stats['replies_received'] == 0:
             continue
+        cand.data['stats'] = stats
+        eligible.append(cand)
+    return eligible
 
-        eligible_count += 1
 
-        month_name = start.strftime('%B')
-        stats_block = " · ".join([
-            f"Contacts added: {stats['contacts_added']}",
-            f"Emails sent: {stats['emails_sent']}",
-            f"Replies received: {stats['replies_received']}",
-        ])
-        feature_para, cta_label, cta_url = _untried_feature(user)
+def _compose_pro_monthly_recap(cand: Candidate, now: datetime) -> Optional[dict]:
+    start, _, _ = _prev_month_bounds_utc(now)
+    stats = cand.data['stats']
+    month_name = start.strftime('%B')
+    stats_block = " · ".join([
+        f"Contacts added: {stats['contacts_added']}",
+        f"Emails sent: {stats['emails_sent']}",
+        f"Replies received: {stats['replies_received']}",
+    ])
+    feature_para, cta_label, cta_url = _untried_feature(cand.user)
 
-        paragraphs = [
+    return {
+        'subject': f"your {month_name} on Offerloop",
+        'body_paragraphs': [
             f"Hey, {SIGNATURE_NAME} here. Quick recap of your {month_name} on Offerloop.",
             stats_block,
             feature_para,
             "If any of this is off or you have thoughts on what would make next month more useful, just reply. Real inbox on this end.",
-        ]
+        ],
+        'cta_label': cta_label,
+        'cta_url': cta_url,
+    }
 
-        res = _send_lifecycle_email(
-            user_or_lead_id=uid,
-            recipient_email=email,
-            campaign='pro_monthly_recap',
-            step=step,
-            subject=f"your {month_name} on Offerloop",
-            body_paragraphs=paragraphs,
-            cta_label=cta_label,
-            cta_url=cta_url,
-        )
-        if res.get('sent'):
-            sent['monthly'] += 1
 
-    return {'ok': True, 'sent': sent, 'eligible': eligible_count}
+PRO_MONTHLY_RECAP = Campaign(
+    name='pro_monthly_recap',
+    select=_select_pro_monthly_recap,
+    prepare=_prepare_pro_monthly_recap,
+    compose=_compose_pro_monthly_recap,
+    window=_monthly_recap_window,
+    counters=('monthly',),
+    counter='monthly',
+    report_eligible='total',
+)
+
+
+def process_pro_monthly_recaps() -> dict:
+    """1st-of-month recap for Pro and Elite users covering the calendar month
+    that just ended.
+
+    Fires only:
+    - On the 1st of the month, UTC 15:00-19:00 (8am-12pm Pacific, 11am-3pm Eastern).
+    - Once per user per calendar month (idempotency key uses YYYY_MM of the
+      reported month).
+    - subscriptionTier is 'pro' or 'elite'.
+    - profileConfirmedAt is set (they got past onboarding).
+    - signupAt >= PRO_MONTHLY_RECAP_LAUNCH_DATE (protects backfilled users).
+
+    Users with zero activity for the month are skipped; the free_ceiling and
+    activation campaigns already cover that funnel stage.
+    """
+    return _run_single_campaign(PRO_MONTHLY_RECAP)
 
 
 # ---------------------------------------------------------------------------
@@ -1747,84 +1697,87 @@ def _fetch_stripe_renewal_end(subscription_id: str) -> Optional[datetime]:
         return None
 
 
-def process_renewal_reminders() -> dict:
-    """Send one email ~3 days before the subscription's current_period_end.
-
-    Fires only:
-    - UTC 15:00-19:00 window (avoids odd-hour sends across ticks).
-    - subscriptionTier is 'pro' or 'elite' and stripeSubscriptionId is set.
-    - Live Stripe query says current_period_end is 2-4 days from now and
-      cancel_at_period_end is false.
-    - signupAt >= RENEWAL_REMINDER_LAUNCH_DATE.
-    - Once per renewal cycle (idempotency key is the ISO date of period_end).
-    """
-    db = get_db()
-    if not db:
-        return {'ok': False, 'error': 'db_unavailable'}
-
-    now = datetime.now(timezone.utc)
-    if not (15 <= now.hour < 19):
-        return {'ok': True, 'sent': {'renewal': 0}, 'skipped': 'not_send_window'}
+def _renewal_window(now: datetime) -> bool:
+    return 15 <= now.hour < 19
 
-    window_lo = now + timedelta(days=2)
-    window_hi = now + timedelta(days=4)
 
-    sent = {'renewal': 0}
-    eligible_count = 0
+# The renewal step is keyed on Stripe's period_end, which isn't known until
+# prepare() asks Stripe. select() hands back this placeholder (never logged)
+# so the batched dedup prefetch can't match it.
+_RENEWAL_PENDING_STEP = 'renewal_pending'
 
-    for snap in db.collection('users').stream():
-        user = snap.to_dict() or {}
-        uid = snap.id
-        email = user.get('email')
-        if not email:
-            continue
 
-        tier = user.get('subscriptionTier') or user.get('tier') or 'free'
-        if tier not in ('pro', 'elite'):
-            continue
+def _select_renewal_reminder(uid: str, user: dict, now: datetime) -> Optional[str]:
+    tier = user.get('subscriptionTier') or user.get('tier') or 'free'
+    if tier not in ('pro', 'elite'):
+        return None
+    if not user.get('stripeSubscriptionId'):
+        return None
+    signup_at = _parse_ts_or_dt(user.get('signupAt'))
+    if not signup_at or signup_at < RENEWAL_REMINDER_LAUNCH_DATE:
+        return None
+    return _RENEWAL_PENDING_STEP
 
-        sub_id = user.get('stripeSubscriptionId')
-        if not sub_id:
-            continue
 
-        signup_at = _parse_ts_or_dt(user.get('signupAt'))
-        if not signup_at or signup_at < RENEWAL_REMINDER_LAUNCH_DATE:
-            continue
+def _prepare_renewal_reminder(cands: list, now: datetime) -> list:
+    window_lo = now + timedelta(days=2)
+    window_hi = now + timedelta(days=4)
 
-        period_end = _fetch_stripe_renewal_end(sub_id)
+    eligible = []
+    for cand in cands:
+        period_end = _fetch_stripe_renewal_end(cand.user.get('stripeSubscriptionId'))
         if not period_end or not (window_lo <= period_end < window_hi):
             continue
-
-        step = f'renewal_{period_end.date().isoformat()}'
-        if already_sent(uid, 'renewal_reminder', step):
+        cand.step = f'renewal_{period_end.date().isoformat()}'
+        if already_sent(cand.uid, 'renewal_reminder', cand.step):
             continue
+        cand.data['period_end'] = period_end
+        eligible.append(cand)
+    return eligible
 
-        eligible_count += 1
 
-        renew_date = period_end.strftime('%B %-d')
-        tier_label = 'Elite' if tier == 'elite' else 'Pro'
-        price_line = '$34.99' if tier == 'elite' else '$9.99'
+def _compose_renewal_reminder(cand: Candidate, now: datetime) -> Optional[dict]:
+    tier = cand.user.get('subscriptionTier') or cand.user.get('tier') or 'free'
+    renew_date = cand.data['period_end'].strftime('%B %-d')
+    tier_label = 'Elite' if tier == 'elite' else 'Pro'
+    price_line = '$34.99' if tier == 'elite' else '$9.99'
 
-        paragraphs = [
+    return {
+        'subject': f"your Offerloop {tier_label} renews on {renew_date}",
+        'body_paragraphs': [
             f"Hey, {SIGNATURE_NAME} here. Quick heads up: your Offerloop {tier_label} plan renews on {renew_date} for {price_line}.",
             "Nothing you need to do. Sending this so it's not a surprise on the card statement.",
             "If you want to switch plans or cancel, you can do it from your account settings in under a minute. If you're staying, thanks for being on Pro; the product gets better every month because paying users tell me what's broken.",
-        ]
+        ],
+        'cta_label': "Manage your subscription",
+        'cta_url': f'{PUBLIC_BASE_URL}/account-settings?utm_source=lifecycle&utm_campaign=renewal_reminder&utm_content={cand.step}',
+    }
 
-        res = _send_lifecycle_email(
-            user_or_lead_id=uid,
-            recipient_email=email,
-            campaign='renewal_reminder',
-            step=step,
-            subject=f"your Offerloop {tier_label} renews on {renew_date}",
-            body_paragraphs=paragraphs,
-            cta_label="Manage your subscription",
-            cta_url=f'{PUBLIC_BASE_URL}/account-settings?utm_source=lifecycle&utm_campaign=renewal_reminder&utm_content={step}',
-        )
-        if res.get('sent'):
-            sent['renewal'] += 1
 
-    return {'ok': True, 'sent': sent, 'eligible': eligible_count}
+RENEWAL_REMINDER = Campaign(
+    name='renewal_reminder',
+    select=_select_renewal_reminder,
+    prepare=_prepare_renewal_reminder,
+    compose=_compose_renewal_reminder,
+    window=_renewal_window,
+    counters=('renewal',),
+    counter='renewal',
+    report_eligible='total',
+)
+
+
+def process_renewal_reminders() -> dict:
+    """Send one email ~3 days before the subscription's current_period_end.
+
+    Fires only:
+    - UTC 15:00-19:00 window (avoids odd-hour sends across ticks).
+    - subscriptionTier is 'pro' or 'elite' and stripeSubscriptionId is set.
+    - Live Stripe query says current_period_end is 2-4 days from now and
+      cancel_at_period_end is false.
+    - signupAt >= RENEWAL_REMINDER_LAUNCH_DATE.
+    - Once per renewal cycle (idempotency key is the ISO date of period_end).
+    """
+    return _run_single_campaign(RENEWAL_REMINDER)
 
 
 # ---------------------------------------------------------------------------
@@ -1860,6 +1813,46 @@ _DORMANCY_TIERS = [
 ]
 
 
+def _select_dormancy_nudge(uid: str, user: dict, now: datetime) -> Optional[str]:
+    signup_at = _parse_ts_or_dt(user.get('signupAt'))
+    if not signup_at or signup_at < DORMANCY_NUDGE_LAUNCH_DATE:
+        return None
+
+    # Prefer lastActiveAt; fall back to signupAt so users who signed up and
+    # never came back still enter the ladder.
+    last_active = _parse_ts_or_dt(user.get('lastActiveAt')) or signup_at
+    days_since = (now - last_active).days
+    if days_since < 14:
+        return None
+
+    for lo, hi, step, _subject, _paras in _DORMANCY_TIERS:
+        if days_since >= lo and (hi is None or days_since < hi):
+            return step
+    return None
+
+
+def _compose_dormancy_nudge(cand: Candidate, now: datetime) -> Optional[dict]:
+    for _lo, _hi, step, subject, para_template in _DORMANCY_TIERS:
+        if step != cand.step:
+            continue
+        return {
+            'subject': subject,
+            'body_paragraphs': [p.format(SIGNATURE_NAME=SIGNATURE_NAME) for p in para_template],
+            'cta_label': "Open Offerloop",
+            'cta_url': f'{PUBLIC_BASE_URL}/find?utm_source=lifecycle&utm_campaign=dormancy_nudge&utm_content={step}',
+        }
+    return None
+
+
+DORMANCY_NUDGE = Campaign(
+    name='dormancy_nudge',
+    select=_select_dormancy_nudge,
+    compose=_compose_dormancy_nudge,
+    counters=('14d', '30d', '60d'),
+    report_eligible='per_counter',
+)
+
+
 def process_dormancy_nudges() -> dict:
     """Three-tier dormancy ladder at 14d, 30d, 60d since lastActiveAt.
 
@@ -1874,60 +1867,62 @@ def process_dormancy_nudges() -> dict:
     - Not unsubscribed and not rate-limited (enforced downstream by
       _send_lifecycle_email).
     """
-    db = get_db()
-    if not db:
-        return {'ok': False, 'error': 'db_unavailable'}
+    return _run_single_campaign(DORMANCY_NUDGE)
 
-    now = datetime.now(timezone.utc)
-    sent = {'14d': 0, '30d': 0, '60d': 0}
-    eligible = {'14d': 0, '30d': 0, '60d': 0}
 
-    for snap in db.collection('users').stream():
-        user = snap.to_dict() or {}
-        uid = snap.id
-        email = user.get('email')
-        if not email:
-            continue
+# ---------------------------------------------------------------------------
+# Sequence 18: Pro to Elite upgrade nudge (80% of Pro monthly credits used)
+# ---------------------------------------------------------------------------
 
-        signup_at = _parse_ts_or_dt(user.get('signupAt'))
-        if not signup_at or signup_at < DORMANCY_NUDGE_LAUNCH_DATE:
-            continue
+def _select_pro_upgrade_nudge(uid: str, user: dict, now: datetime) -> Optional[str]:
+    tier = user.get('subscriptionTier') or user.get('tier') or 'free'
+    if tier != 'pro':
+        return None
 
-        # Prefer lastActiveAt; fall back to signupAt so users who signed up and
-        # never came back still enter the ladder.
-        last_active = _parse_ts_or_dt(user.get('lastActiveAt')) or signup_at
-        days_since = (now - last_active).days
-        if days_since < 14:
-            continue
+    max_credits = user.get('maxCredits') or 0
+    credits = user.get('credits')
+    if not max_credits or credits is None:
+        return None
+    # 80% or more consumed (400 or fewer credits remaining on a 2,000 cap).
+    if credits > 0.2 * max_credits:
+        return None
 
-        for lo, hi, step, subject, para_template in _DORMANCY_TIERS:
-            in_window = days_since >= lo and (hi is None or days_since < hi)
-            if not in_window:
-                continue
-            if already_sent(uid, 'dormancy_nudge', step):
-                break
-            eligible[step] += 1
-            body = [p.format(SIGNATURE_NAME=SIGNATURE_NAME) for p in para_template]
-            res = _send_lifecycle_email(
-                user_or_lead_id=uid,
-                recipient_email=email,
-                campaign='dormancy_nudge',
-                step=step,
-                subject=subject,
-                body_paragraphs=body,
-                cta_label="Open Offerloop",
-                cta_url=f'{PUBLIC_BASE_URL}/find?utm_source=lifecycle&utm_campaign=dormancy_nudge&utm_content={step}',
-            )
-            if res.get('sent'):
-                sent[step] += 1
-            break
+    signup_at = _parse_ts_or_dt(user.get('signupAt'))
+    if not signup_at or signup_at < PRO_UPGRADE_NUDGE_LAUNCH_DATE:
+        return None
 
-    return {'ok': True, 'sent': sent, 'eligible': eligible}
+    return f"month_{now.strftime('%Y_%m')}"
 
 
-# ---------------------------------------------------------------------------
-# Sequence 18: Pro to Elite upgrade nudge (80% of Pro monthly credits used)
-# ---------------------------------------------------------------------------
+def _compose_pro_upgrade_nudge(cand: Candidate, now: datetime) -> Optional[dict]:
+    user = cand.user
+    max_credits = user.get('maxCredits') or 0
+    credits = user.get('credits')
+    used = max_credits - credits
+    used_pct = int(round(100 * used / max_credits)) if max_credits else 0
+    month_key = now.strftime('%Y_%m')
+
+    return {
+        'subject': f"you've used {used_pct}% of your Pro credits",
+        'body_paragraphs': [
+            f"Hey, {SIGNATURE_NAME} here.",
+            f"You've used {used} of your {max_credits} Pro credits this month ({used_pct}%). That's power-user pace; most Pro users don't get anywhere near their ceiling.",
+            "If this is a normal month for you, Elite is $34.99/mo and gets you 5,000 credits (2.5x Pro), Priority Queue for reply detection, and personalized templates. If it's an outlier month, ignore this and the credits reset on your next billing cycle.",
+        ],
+        'cta_label': "See Elite",
+        'cta_url': f'{PUBLIC_BASE_URL}/pricing?utm_source=lifecycle&utm_campaign=pro_upgrade_nudge&utm_content={month_key}',
+    }
+
+
+PRO_UPGRADE_NUDGE = Campaign(
+    name='pro_upgrade_nudge',
+    select=_select_pro_upgrade_nudge,
+    compose=_compose_pro_upgrade_nudge,
+    counters=('month',),
+    counter='month',
+    report_eligible='total',
+)
+
 
 def process_pro_upgrade_nudges() -> dict:
     """One email per calendar month when a Pro user has used 80%+ of their Pro
@@ -1943,66 +1938,7 @@ def process_pro_upgrade_nudges() -> dict:
     Skips Elite users (already on the higher tier) and any user with no
     stripeSubscriptionId (comped / trial / weird state).
     """
-    db = get_db()
-    if not db:
-        return {'ok': False, 'error': 'db_unavailable'}
-
-    now = datetime.now(timezone.utc)
-    month_key = now.strftime('%Y_%m')
-    step = f'month_{month_key}'
-    sent = {'month': 0}
-    eligible_count = 0
-
-    for snap in db.collection('users').stream():
-        user = snap.to_dict() or {}
-        uid = snap.id
-        email = user.get('email')
-        if not email:
-            continue
-
-        tier = user.get('subscriptionTier') or user.get('tier') or 'free'
-        if tier != 'pro':
-            continue
-
-        max_credits = user.get('maxCredits') or 0
-        credits = user.get('credits')
-        if not max_credits or credits is None:
-            continue
-        # 80% or more consumed (400 or fewer credits remaining on a 2,000 cap).
-        if credits > 0.2 * max_credits:
-            continue
-
-        signup_at = _parse_ts_or_dt(user.get('signupAt'))
-        if not signup_at or signup_at < PRO_UPGRADE_NUDGE_LAUNCH_DATE:
-            continue
-
-        if already_sent(uid, 'pro_upgrade_nudge', step):
-            continue
-
-        used = max_credits - credits
-        used_pct = int(round(100 * used / max_credits)) if max_credits else 0
-        eligible_count += 1
-
-        paragraphs = [
-            f"Hey, {SIGNATURE_NAME} here.",
-            f"You've used {used} of your {max_credits} Pro credits this month ({used_pct}%). That's power-user pace; most Pro users don't get anywhere near their ceiling.",
-            "If this is a normal month for you, Elite is $34.99/mo and gets you 5,000 credits (2.5x Pro), Priority Queue for reply detection, and personalized templates. If it's an outlier month, ignore this and the credits reset on your next billing cycle.",
-        ]
-
-        res = _send_lifecycle_email(
-            user_or_lead_id=uid,
-            recipient_email=email,
-            campaign='pro_upgrade_nudge',
-            step=step,
-            subject=f"you've used {used_pct}% of your Pro credits",
-            body_paragraphs=paragraphs,
-            cta_label="See Elite",
-            cta_url=f'{PUBLIC_BASE_URL}/pricing?utm_source=lifecycle&utm_campaign=pro_upgrade_nudge&utm_content={month_key}',
-        )
-        if res.get('sent'):
-            sent['month'] += 1
-
-    return {'ok': True, 'sent': sent, 'eligible': eligible_count}
+    return _run_single_campaign(PRO_UPGRADE_NUDGE)
 
 
 # ---------------------------------------------------------------------------
@@ -2017,15 +1953,69 @@ def _count_recent_replies(uid: str, since_iso: str, cap: int = 10) -> int:
         return 0
     try:
         contacts_ref = db.collection('users').document(uid).collection('contacts')
-        docs = list(contacts_ref
-                    .where('replyReceivedAt', '>=', since_iso)
-                    .limit(cap).stream())
-        return len(docs)
+        return _agg_count(contacts_ref.where('replyReceivedAt', '>=', since_iso).limit(cap))
     except Exception as e:
         logger.debug("recent reply count failed for %s: %s", uid, e)
         return 0
 
 
+def _select_referral_milestone(uid: str, user: dict, now: datetime) -> Optional[str]:
+    signup_at = _parse_ts_or_dt(user.get('signupAt'))
+    if not signup_at or signup_at < REFERRAL_MILESTONE_LAUNCH_DATE:
+        return None
+    if not _parse_ts_or_dt(user.get('profileConfirmedAt')):
+        return None
+    return 'reached'  # one-per-user total
+
+
+def _prepare_referral_milestone(cands: list, now: datetime) -> list:
+    since_iso = (now - timedelta(days=30)).isoformat().replace('+00:00', 'Z')
+    eligible = []
+    for cand in cands:
+        reply_count = _count_recent_replies(cand.uid, since_iso, cap=3)
+        if reply_count < 3:
+            continue
+        cand.data['reply_count'] = reply_count
+        eligible.append(cand)
+    return eligible
+
+
+def _compose_referral_milestone(cand: Candidate, now: datetime) -> Optional[dict]:
+    from app.services.referral_service import get_or_create_referral_code
+
+    # Guarantee the user has a referral code before we build the link.
+    # get_or_create_referral_code is idempotent and safe to call.
+    try:
+        code = get_or_create_referral_code(get_db(), cand.uid)
+    except Exception as e:
+        logger.debug("referral code lookup failed for %s: %s", cand.uid, e)
+        return None
+    ref_link = f'{PUBLIC_BASE_URL}/signin?ref={code}&utm_source=lifecycle&utm_campaign=referral_milestone'
+
+    return {
+        'subject': "you're getting real replies",
+        'body_paragraphs': [
+            f"Hey, {SIGNATURE_NAME} here.",
+            f"Noticed you've gotten {cand.data['reply_count']}+ replies in the last month. That's real traction and the compound effect from here is real: reply rates trend up as more people at the same company see you in the loop.",
+            "If it's working for you, it'd probably work for one of your friends who's recruiting. Your personal referral link is below. There's no gimmick or reward on my side; I just want more USC / Michigan / NYU / Georgetown students in the network so replies land warmer for everyone.",
+            f"Your link: {ref_link}",
+        ],
+        'cta_label': "Share Offerloop",
+        'cta_url': ref_link,
+    }
+
+
+REFERRAL_MILESTONE = Campaign(
+    name='referral_milestone',
+    select=_select_referral_milestone,
+    prepare=_prepare_referral_milestone,
+    compose=_compose_referral_milestone,
+    counters=('reached',),
+    counter='reached',
+    report_eligible='total',
+)
+
+
 def process_referral_milestones() -> dict:
     """One email when a user has received 3+ replies in the past 30 days.
     Fires exactly once per user total (no step suffix beyond the campaign name)
@@ -2037,70 +2027,81 @@ def process_referral_milestones() -> dict:
     - profileConfirmedAt set (real onboarded user).
     - 3+ replies in the past 30 days (queried from contacts subcollection).
     """
-    db = get_db()
-    if not db:
-        return {'ok': False, 'error': 'db_unavailable'}
-
-    now = datetime.now(timezone.utc)
-    since = now - timedelta(days=30)
-    since_iso = since.isoformat().replace('+00:00', 'Z')
-    step = 'reached'  # one-per-user total
-    sent = {'reached': 0}
-    eligible_count = 0
+    return _run_single_campaign(REFERRAL_MILESTONE)
 
-    from app.services.referral_service import get_or_create_referral_code
 
-    for snap in db.collection('users').stream():
-        user = snap.to_dict() or {}
-        uid = snap.id
-        email = user.get('email')
-        if not email:
-            continue
+# ---------------------------------------------------------------------------
+# Single-pass runner for the user-scan campaigns
+# ---------------------------------------------------------------------------
 
-        signup_at = _parse_ts_or_dt(user.get('signupAt'))
-        if not signup_at or signup_at < REFERRAL_MILESTONE_LAUNCH_DATE:
-            continue
-        if not _parse_ts_or_dt(user.get('profileConfirmedAt')):
-            continue
-        if already_sent(uid, 'referral_milestone', step):
-            continue
+# Emission order doubles as priority under the shared 2-per-7-days rate
+# limit: earlier campaigns claim a user's send budget first. Matches the
+# order the standalone scans used to run in.
+USER_SCAN_CAMPAIGNS = [
+    ONBOARDING_DROPOFF,
+    FIRST_SEARCH_ACTIVATION,
+    FIRST_SEND_ACTIVATION,
+    WELCOME_DRIP,
+    COFFEE_CHAT_DISCOVERY,
+    JOB_BOARD_DISCOVERY,
+    FREE_CEILING,
+    WEEKLY_WIN_REPORT,
+    PRO_MONTHLY_RECAP,
+    RENEWAL_REMINDER,
+    DORMANCY_NUDGE,
+    PRO_UPGRADE_NUDGE,
+    REFERRAL_MILESTONE,
+]
 
-        reply_count = _count_recent_replies(uid, since_iso, cap=3)
-        if reply_count < 3:
-            continue
 
-        eligible_count += 1
+def _sent_log_keys(keys: list[str]) -> set[str]:
+    """Batched existence check against lifecycle_email_log. One get_all per
+    chunk instead of one get() per (user, campaign, step)."""
+    db = get_db()
+    if not db or not keys:
+        return set()
+    log_ref = db.collection('lifecycle_email_log')
+    found: set[str] = set()
+    unique = list(dict.fromkeys(keys))
+    for i in range(0, len(unique), _LOG_GET_ALL_CHUNK):
+        refs = [log_ref.document(k) for k in unique[i:i + _LOG_GET_ALL_CHUNK]]
+        for snap in db.get_all(refs):
+            if snap.exists:
+                found.add(snap.id)
+    return found
+
+
+def _engine_send(cand: Candidate, campaign: Campaign, content: dict) -> dict:
+    return _send_lifecycle_email(
+        user_or_lead_id=cand.uid,
+        recipient_email=cand.email,
+        campaign=campaign.name,
+        step=cand.step,
+        **content,
+    )
 
-        # Guarantee the user has a referral code before we build the link.
-        # get_or_create_referral_code is idempotent and safe to call.
-        try:
-            code = get_or_create_referral_code(db, uid)
-        except Exception as e:
-            logger.debug("referral code lookup failed for %s: %s", uid, e)
-            continue
-        ref_link = f'{PUBLIC_BASE_URL}/signin?ref={code}&utm_source=lifecycle&utm_campaign=referral_milestone'
 
-        paragraphs = [
-            f"Hey, {SIGNATURE_NAME} here.",
-            f"Noticed you've gotten {reply_count}+ replies in the last month. That's real traction and the compound effect from here is real: reply rates trend up as more people at the same company see you in the loop.",
-            "If it's working for you, it'd probably work for one of your friends who's recruiting. Your personal referral link is below. There's no gimmick or reward on my side; I just want more USC / Michigan / NYU / Georgetown students in the network so replies land warmer for everyone.",
-            f"Your link: {ref_link}",
-        ]
+def run_user_scan_campaigns(campaigns: Optional[list] = None, now: Optional[datetime] = None) -> dict:
+    """Stream `users` once and evaluate every campaign against each snapshot.
+    Returns {campaign_name: result} in the same shape the per-campaign
+    process_* functions have always returned."""
+    campaigns = USER_SCAN_CAMPAIGNS if campaigns is None else campaigns
+    db = get_db()
+    if not db:
+        return {c.name: {'ok': False, 'error': 'db_unavailable'} for c in campaigns}
+
+    users = ((snap.id, snap.to_dict()) for snap in db.collection('users').stream())
+    return run_campaigns(
+        campaigns,
+        users,
+        now=now or datetime.now(timezone.utc),
+        send=_engine_send,
+        sent_keys=_sent_log_keys,
+    )
 
-        res = _send_lifecycle_email(
-            user_or_lead_id=uid,
-            recipient_email=email,
-            campaign='referral_milestone',
-            step=step,
-            subject="you're getting real replies",
-            body_paragraphs=paragraphs,
-            cta_label="Share Offerloop",
-            cta_url=ref_link,
-        )
-        if res.get('sent'):
-            sent['reached'] += 1
 
-    return {'ok': True, 'sent': sent, 'eligible': eligible_count}
+def _run_single_campaign(campaign: Campaign) -> dict:
+    return run_user_scan_campaigns([campaign])[campaign.name]
 
 
 # ---------------------------------------------------------------------------
@@ -2108,25 +2109,15 @@ def process_referral_milestones() -> dict:
 # ---------------------------------------------------------------------------
 
 def process_all_pending_emails() -> dict:
-    return {
+    results = {
         'pricing_abandon': process_pricing_leads(),
         'checkout_abandon': process_checkout_abandons(),
         'trial_ending': process_trial_endings(),
         'winback': process_winbacks(),
-        'onboarding_dropoff': process_onboarding_dropoffs(),
-        'first_search_activation': process_first_search_activations(),
-        'first_send_activation': process_first_send_activations(),
-        'welcome_drip': process_welcome_drips(),
-        'coffee_chat_discovery': process_coffee_chat_discoveries(),
-        'job_board_discovery': process_job_board_discoveries(),
-        'free_ceiling': process_free_ceilings(),
-        'weekly_win_report': process_weekly_win_reports(),
-        'pro_monthly_recap': process_pro_monthly_recaps(),
-        'renewal_reminder': process_renewal_reminders(),
-        'dormancy_nudge': process_dormancy_nudges(),
-        'pro_upgrade_nudge': process_pro_upgrade_nudges(),
-        'referral_milestone': process_referral_milestones(),
     }
+    # Sequences 6-20 share a single pass over `users`.
+    results.update(run_user_scan_campaigns())
+    return results
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,181 @@
+"""
+Single-pass evaluator for the user-scan lifecycle campaigns.
+
+Most time-based sequences in lifecycle_emails are "walk every user, check a
+few fields, maybe send one email". Run one after another, each of them
+streamed the full `users` collection, so a tick cost (users x campaigns)
+document reads. This engine loads each user once and evaluates every
+campaign's predicate against that same snapshot, then emits the resulting
+sends campaign by campaign.
+
+A campaign is declared as data (see `Campaign`):
+  - select(uid, user, now) -> step | None
+      Pure predicate over the user doc. Returns the log step to send (e.g.
+      'day_3') or None. Must not touch Firestore so campaigns can be tested
+      against a plain in-memory user list.
+  - prepare(candidates, now) -> candidates
+      Optional. Runs once per campaign after the pass, for campaigns that
+      need extra reads (contact stats, Stripe) or cross-user context (peer
+      medians). Only sees candidates that survived dedup.
+  - compose(candidate, now) -> dict | None
+      Email content for one send: subject, body_paragraphs, cta_label,
+      cta_url, variant. None skips the candidate.
+
+Ordering matters: campaigns are emitted in the order given, so the shared
+per-user rate limit in the send funnel keeps the same priority it had when
+each sequence ran as its own scan.
+
+Dedup is resolved in one batched lookup across every (uid, campaign, step)
+candidate before any campaign sends. The send funnel still re-checks on the
+way out, so a stale answer can only ever skip a send, never double it.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Candidate:
+    uid: str
+    user: dict
+    email: str
+    step: str
+    # Scratch space for prepare() to hand values to compose().
+    data: dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Campaign:
+    name: str
+    select: Callable[[str, dict, datetime], Optional[str]]
+    compose: Callable[[Candidate, datetime], Optional[dict]]
+    # Keys of the result's `sent` dict. When `counter` is None each step
+    # counts under its own name; otherwise every step counts under `counter`.
+    counters: tuple
+    counter: Optional[str] = None
+    prepare: Optional[Callable[[list, datetime], list]] = None
+    # Send-window gate. Closed windows skip the campaign without selecting.
+    window: Optional[Callable[[datetime], bool]] = None
+    # 'total' -> result['eligible'] is an int; 'per_counter' -> dict keyed
+    # like `sent`. None -> no eligible key (matches the legacy shapes).
+    report_eligible: Optional[str] = None
+    # Hard cap on sends for this campaign in a single run. None = no cap.
+    max_sends_per_run: Optional[int] = None
+
+    def counter_for(self, step: str) -> str:
+        return self.counter or step
+
+
+def log_key(uid: str, campaign: str, step: str) -> str:
+    return f"{uid}:{campaign}:{step}"
+
+
+def select_candidates(
+    campaigns: list,
+    users: Iterable[tuple],
+    now: datetime,
+) -> dict:
+    """One pass over (uid, user_dict) pairs. Returns {campaign.name: [Candidate]}
+    for every campaign whose send window is open."""
+    active = [c for c in campaigns if c.window is None or c.window(now)]
+    selected: dict = {c.name: [] for c in active}
+    for uid, user in users:
+        user = user or {}
+        email = user.get('email')
+        if not email:
+            continue
+        for campaign in active:
+            try:
+                step = campaign.select(uid, user, now)
+            except Exception as e:
+                logger.warning("lifecycle select failed campaign=%s uid=%s: %s", campaign.name, uid, e)
+                continue
+            if step:
+                selected[campaign.name].append(Candidate(uid=uid, user=user, email=email, step=step))
+    return selected
+
+
+def run_campaigns(
+    campaigns: list,
+    users: Iterable[tuple],
+    *,
+    now: datetime,
+    send: Callable[[Candidate, Campaign, dict], dict],
+    sent_keys: Callable[[list], set],
+) -> dict:
+    """Evaluate `campaigns` over `users` in one pass and emit the sends.
+
+    `send(candidate, campaign, content)` returns the send-funnel result dict
+    ({'sent': bool, 'reason': str}). `sent_keys(keys)` returns the subset of
+    log keys that already exist. Both are injected so tests can run the
+    whole engine without Firestore.
+    """
+    selected = select_candidates(campaigns, users, now)
+
+    all_keys = [
+        log_key(cand.uid, name, cand.step)
+        for name, cands in selected.items()
+        for cand in cands
+    ]
+    try:
+        done = sent_keys(all_keys) if all_keys else set()
+    except Exception as e:
+        # The funnel re-checks already_sent per send, so a failed prefetch
+        # only costs extra reads, never a duplicate email.
+        logger.warning("lifecycle dedup prefetch failed: %s", e)
+        done = set()
+
+    results: dict = {}
+    for campaign in campaigns:
+        sent = {k: 0 for k in campaign.counters}
+        if campaign.name not in selected:
+            results[campaign.name] = {'ok': True, 'sent': sent, 'skipped': 'not_send_window'}
+            continue
+
+        pending = [
+            cand for cand in selected[campaign.name]
+            if log_key(cand.uid, campaign.name, cand.step) not in done
+        ]
+        if campaign.prepare and pending:
+            try:
+                pending = campaign.prepare(pending, now)
+            except Exception as e:
+                # One campaign's batch fetch must not cost the later ones
+                # their tick.
+                logger.warning("lifecycle prepare failed campaign=%s: %s", campaign.name, e)
+                results[campaign.name] = {'ok': False, 'sent': sent, 'error': f'prepare_failed: {e}'}
+                continue
+
+        result: dict = {'ok': True, 'sent': sent}
+        if campaign.report_eligible == 'total':
+            result['eligible'] = len(pending)
+        elif campaign.report_eligible == 'per_counter':
+            eligible = {k: 0 for k in campaign.counters}
+            for cand in pending:
+                eligible[campaign.counter_for(cand.step)] += 1
+            result['eligible'] = eligible
+
+        sent_total = 0
+        capped = 0
+        for cand in pending:
+            if campaign.max_sends_per_run is not None and sent_total >= campaign.max_sends_per_run:
+                capped += 1
+                continue
+            try:
+                content = campaign.compose(cand, now)
+            except Exception as e:
+                logger.warning("lifecycle compose failed campaign=%s uid=%s: %s", campaign.name, cand.uid, e)
+                continue
+            if not content:
+                continue
+            res = send(cand, campaign, content)
+            if res.get('sent'):
+                sent[campaign.counter_for(cand.step)] += 1
+                sent_total += 1
+        if capped:
+            result['capped'] = capped
+        results[campaign.name] = result
+    return results
@@ -31,6 +31,7 @@ from urllib.parse import quote_plus
 
 from app.config import TIER_CONFIGS
 from app.extensions import get_db
+from app.services.dashboard_aggregates import apply_contact_update, record_contact_changes
 from app.services.agent_service import (
     DEFAULT_AGENT_CONFIG,
     _generate_short_code,
@@ -941,6 +942,7 @@ def _backfill_draft_urls_for_contacts(uid: str, contact_map: dict) -> None:
     from app.services.gmail_client import find_draft_for_recipient
 
     contacts_ref = db.collection("users").document(uid).collection("contacts")
+    agg_changes = []
     for cid, cdata in needs_backfill:
         match = find_draft_for_recipient(
             user_email=user_email,
@@ -948,6 +950,7 @@ def _backfill_draft_urls_for_contacts(uid: str, contact_map: dict) -> None:
             recipient_email=cdata.get("email"),
             subject=cdata.get("emailSubject"),
         )
+        before = dict(cdata)
         update = {"gmailDraftBackfilled": True}
         if match:
             update["gmailDraftId"] = match.get("draft_id") or ""
@@ -963,8 +966,10 @@ def _backfill_draft_urls_for_contacts(uid: str, contact_map: dict) -> None:
         cdata["gmailDraftBackfilled"] = True
         try:
             contacts_ref.document(cid).update(update)
+            agg_changes.append((cid, before, apply_contact_update(before, update)))
         except Exception as e:
             logger.warning("Draft URL backfill write failed for %s: %s", cid, e)
+    record_contact_changes(uid, agg_changes, db)
 
 
 def _backfill_thread_ids_for_contacts(uid: str, contact_map: dict) -> None:
@@ -1015,6 +1020,7 @@ def _backfill_thread_ids_for_contacts(uid: str, contact_map: dict) -> None:
     from app.services.gmail_client import find_sent_thread_for_recipient
 
     contacts_ref = db.collection("users").document(uid).collection("contacts")
+    agg_changes = []
     for cid, cdata in needs_backfill:
         match = find_sent_thread_for_recipient(
             user_email=user_email,
@@ -1022,6 +1028,7 @@ def _backfill_thread_ids_for_contacts(uid: str, contact_map: dict) -> None:
             recipient_email=cdata.get("email"),
             subject=cdata.get("emailSubject"),
         )
+        before = dict(cdata)
         update = {"gmailThreadBackfilled": True}
         if match and match.get("thread_id"):
             update["gmailThreadId"] = match["thread_id"]
@@ -1031,8 +1038,10 @@ def _backfill_thread_ids_for_contacts(uid: str, contact_map: dict) -> None:
         cdata["gmailThreadBackfilled"] = True
         try:
             contacts_ref.document(cid).update(update)
+            agg_changes.append((cid, before, apply_contact_update(before, update)))
         except Exception as e:
             logger.warning("Thread id backfill write failed for %s: %s", cid, e)
+    record_contact_changes(uid, agg_changes, db)
 
 
 # Names that almost certainly came from a scraper hitting a broken page.
@@ -4,6 +4,7 @@ One-off migration utilities for contact schema and pipeline stages.
 from datetime import datetime
 
 from app.extensions import get_db
+from app.services.dashboard_aggregates import apply_contact_update, record_contact_changes
 
 
 # Pipeline stage enum values (canonical)
@@ -157,6 +158,7 @@ def deduplicate_contacts(uid: str) -> dict:
     deleted_count = 0
     merged_log = []
     errors = []
+    agg_changes = []
 
     for email, group in by_email.items():
         if len(group) <= 1:
@@ -189,6 +191,7 @@ def deduplicate_contacts(uid: str) -> dict:
             merge_updates["updatedAt"] = datetime.utcnow().isoformat()
             try:
                 keep_doc.reference.update(merge_updates)
+                agg_changes.append((keep_id, keep_data, apply_contact_update(keep_data, merge_updates)))
             except Exception as e:
                 errors.append(f"merge {keep_id}: {e}")
                 continue
@@ -197,6 +200,7 @@ def deduplicate_contacts(uid: str) -> dict:
         for dup_doc in duplicates:
             try:
                 dup_doc.reference.delete()
+                agg_changes.append((dup_doc.id, dup_doc.to_dict() or {}, None))
                 deleted_count += 1
             except Exception as e:
                 errors.append(f"delete {dup_doc.id}: {e}")
@@ -205,6 +209,7 @@ def deduplicate_contacts(uid: str) -> dict:
         merged_log.append(
             f"email={email}: kept {keep_id}, merged from {duplicate_ids}, deleted {duplicate_ids}"
         )
+    record_contact_changes(uid, agg_changes, db)
 
     return {
         "merged_count": merged_count,
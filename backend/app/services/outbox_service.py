@@ -12,6 +12,8 @@ from datetime import datetime, timedelta, timezone
 from google.cloud.firestore_v1 import transactional
 
 from app.extensions import get_db
+from app.services.briefing_snapshot import invalidate_briefing
+from app.services.dashboard_aggregates import apply_contact_update, record_contact_change
 from app.services.gmail_client import (
     _load_user_gmail_creds,
     _gmail_service,
@@ -566,6 +568,7 @@ def clear_unread_reply(uid, contact_id):
         "updatedAt": _now_iso(),
     }
     ref.update(updates)
+    record_contact_change(uid, contact_id, data, apply_contact_update(data, updates))
     data.update(updates)
     return _contact_to_dict(contact_id, data)
 
@@ -911,6 +914,7 @@ def sync_contact_thread(uid, contact_id):
 
     # Collect all updates, write once at the end
     all_updates = {}
+    before = dict(data)
 
     # 1. Check draft status
     if data.get("gmailDraftId"):
@@ -942,6 +946,7 @@ def sync_contact_thread(uid, contact_id):
             all_updates["lastSyncError"] = None
         ref.update(all_updates)
         data.update(all_updates)
+        record_contact_change(uid, contact_id, before, data)
 
     return _contact_to_dict(contact_id, data)
 
@@ -1062,6 +1067,7 @@ def send_reply_for_contact(uid, contact_id, body):
         get_db().collection("users").document(uid).collection("replyDrafts").document(contact_id).delete()
     except Exception:
         pass
+    invalidate_briefing(uid)
 
     try:
         from app.utils.metrics_events import log_event
@@ -465,52 +465,152 @@ def build_text_index(doc: fitz.Document) -> list[TextUnit]:
 # ---------------------------------------------------------------------------
 
 
+# Matching runs once per patch against every unit of the document, so the
+# per-unit work is done once in TextMatchIndex:
+#   - unit text is normalized once;
+#   - exact hits are a dict lookup, and substring hits are found through a
+#     trigram index (target inside a unit) and a unit-prefix index (unit
+#     inside the target) instead of scanning every unit;
+#   - fuzzy candidates are visited in order of shared trigrams, and each
+#     one is pruned with real_quick_ratio()/quick_ratio() (upper bounds of
+#     ratio()) before the full ratio is computed. Each unit keeps its own
+#     SequenceMatcher so its character tables are built once per document.
+# Results are the same as scanning every unit in order: the first unit with
+# an exact or substring match wins, otherwise the first unit with the best
+# ratio. When nothing reaches the threshold the reported ratio is the best
+# among the units that were fully compared (it is only logged).
+
+_GRAM = 3
+
+
+def _grams(text: str) -> set[str]:
+    return {text[i:i + _GRAM] for i in range(len(text) - _GRAM + 1)}
+
+
+class TextMatchIndex:
+    """Text units of one document, indexed for find_match."""
+
+    def __init__(self, text_units: list[TextUnit]):
+        self.units = text_units
+        self.norms = [normalize_text(u.full_text) for u in text_units]
+        self._exact: dict[str, int] = {}
+        self._postings: dict[str, list[int]] = {}
+        self._prefixes: dict[str, list[int]] = {}
+        self._short: list[int] = []  # units shorter than one gram
+        for idx, norm in enumerate(self.norms):
+            self._exact.setdefault(norm, idx)
+            if len(norm) < _GRAM:
+                self._short.append(idx)
+                continue
+            self._prefixes.setdefault(norm[:_GRAM], []).append(idx)
+            for gram in _grams(norm):
+                self._postings.setdefault(gram, []).append(idx)
+        self._matchers: dict[int, SequenceMatcher] = {}
+        self._cache: dict[tuple[str, float], tuple[TextUnit | None, float]] = {}
+
+    def _first_substring_hit(self, target: str, target_grams: set[str]) -> int | None:
+        hits: list[int] = []
+        exact = self._exact.get(target)
+        if exact is not None:
+            hits.append(exact)
+        # Target inside a unit: the unit has every trigram of the target.
+        if len(target) >= _GRAM:
+            postings = [self._postings.get(g, ()) for g in target_grams]
+            rarest = min(postings, key=len)
+            hits.extend(i for i in rarest if target in self.norms[i])
+        else:
+            hits.extend(i for i, norm in enumerate(self.norms) if target in norm)
+        # Unit inside the target: the unit's first trigram occurs in the target.
+        for pos in range(len(target) - _GRAM + 1):
+            for i in self._prefixes.get(target[pos:pos + _GRAM], ()):
+                if self.norms[i] in target:
+                    hits.append(i)
+        hits.extend(i for i in self._short if self.norms[i] in target)
+        return min(hits) if hits else None
+
+    def _matcher(self, idx: int) -> SequenceMatcher:
+        sm = self._matchers.get(idx)
+        if sm is None:
+            sm = self._matchers[idx] = SequenceMatcher(None, "", self.norms[idx])
+        return sm
+
+    def _best_fuzzy(self, target: str, target_grams: set[str], threshold: float) -> tuple[int | None, float]:
+        shared: dict[int, int] = {}
+        for gram in target_grams:
+            for i in self._postings.get(gram, ()):
+                shared[i] = shared.get(i, 0) + 1
+        order = sorted(shared, key=lambda i: (-shared[i], i))
+        order += [i for i in range(len(self.norms)) if i not in shared]
+
+        best_idx: int | None = None
+        best_ratio = 0.0
+
+        def beaten(bound: float, idx: int) -> bool:
+            # True when a unit whose ratio is at most `bound` can't win.
+            if bound < threshold or bound < best_ratio:
+                return True
+            return bound == best_ratio and (best_idx is None or idx > best_idx)
+
+        for idx in order:
+            sm = self._matcher(idx)
+            sm.set_seq1(target)
+            if beaten(sm.real_quick_ratio(), idx) or beaten(sm.quick_ratio(), idx):
+                continue
+            ratio = sm.ratio()
+            if ratio > best_ratio or (ratio == best_ratio and best_idx is not None and idx < best_idx):
+                best_ratio, best_idx = ratio, idx
+        return best_idx, best_ratio
+
+    def find(self, target_text: str, threshold: float = 0.85) -> tuple[TextUnit | None, float]:
+        """Best matching unit for target_text. Returns (unit, ratio)."""
+        normalized_target = normalize_text(target_text)
+        if not normalized_target or not self.units:
+            return (None, 0.0)
+        key = (normalized_target, threshold)
+        if key in self._cache:
+            return self._cache[key]
+
+        target_grams = _grams(normalized_target)
+        idx = self._first_substring_hit(normalized_target, target_grams)
+        if idx is not None:
+            logger.debug("[pdf_patcher] find_match: exact/substring match for %r", target_text[:50])
+            result: tuple[TextUnit | None, float] = (self.units[idx], 1.0)
+        else:
+            best_idx, best_ratio = self._best_fuzzy(normalized_target, target_grams, threshold)
+            if best_idx is not None and best_ratio >= threshold:
+                logger.info(
+                    "[pdf_patcher] Fuzzy match at %.2f: %r",
+                    best_ratio,
+                    target_text[:50],
+                )
+                result = (self.units[best_idx], best_ratio)
+            else:
+                logger.warning(
+                    "[pdf_patcher] No match (best=%.2f): %r",
+                    best_ratio,
+                    target_text[:80],
+                )
+                result = (None, best_ratio)
+        self._cache[key] = result
+        return result
+
+    def find_all(self, targets: list[tuple[str, float]]) -> list[tuple[TextUnit | None, float]]:
+        """find() for each (target_text, threshold); repeated targets are matched once."""
+        return [self.find(text, threshold) for text, threshold in targets]
+
+
 def find_match(
     target_text: str,
-    text_units: list[TextUnit],
+    text_units: list[TextUnit] | TextMatchIndex,
     threshold: float = 0.85,
 ) -> tuple[TextUnit | None, float]:
-    """Find the best matching text unit using fuzzy matching. Returns (unit, ratio)."""
-    normalized_target = normalize_text(target_text)
-    if not normalized_target:
-        return (None, 0.0)
-
-    best_match: TextUnit | None = None
-    best_ratio = 0.0
-
-    for unit in text_units:
-        unit_norm = normalize_text(unit.full_text)
-
-        # Try exact match first (fastest)
-        if normalized_target == unit_norm:
-            logger.debug("[pdf_patcher] find_match: exact match for %r", target_text[:50])
-            return (unit, 1.0)
-
-        # Substring: target in unit or unit in target (handles merged bullets)
-        if normalized_target in unit_norm or unit_norm in normalized_target:
-            logger.debug("[pdf_patcher] find_match: substring match for %r", target_text[:50])
-            return (unit, 1.0)
-
-        # Fuzzy match
-        ratio = SequenceMatcher(None, normalized_target, unit_norm).ratio()
-        if ratio > best_ratio:
-            best_ratio = ratio
-            best_match = unit
-
-    if best_ratio >= threshold:
-        logger.info(
-            "[pdf_patcher] Fuzzy match at %.2f: %r",
-            best_ratio,
-            target_text[:50],
-        )
-        return (best_match, best_ratio)
+    """Find the best matching text unit using fuzzy matching. Returns (unit, ratio).
 
-    logger.warning(
-        "[pdf_patcher] No match (best=%.2f): %r",
-        best_ratio,
-        target_text[:80],
-    )
-    return (None, best_ratio)
+    Pass a TextMatchIndex when matching several targets against the same
+    document; a plain unit list is indexed on every call.
+    """
+    index = text_units if isinstance(text_units, TextMatchIndex) else TextMatchIndex(text_units)
+    return index.find(target_text, threshold)
 
 
 # ---------------------------------------------------------------------------
@@ -992,14 +1092,19 @@ def patch_pdf(
         text_index = build_text_index(doc)
 
         # Phase 1: Match all patches against the ORIGINAL text index (no rebuild between patches)
+        matches = TextMatchIndex(text_index).find_all([
+            (
+                patch.get("original_text", ""),
+                0.75 if patch.get("type", "bullet_rewrite") == "skill_append" else 0.85,
+            )
+            for patch in patches
+        ])
         match_results: list[dict[str, Any]] = []
-        for patch_idx, patch in enumerate(patches):
+        for patch_idx, (patch, (match, _)) in enumerate(zip(patches, matches)):
             patch_type = patch.get("type", "bullet_rewrite")
             original_text = patch.get("original_text", "")
             replacement_text = patch.get("replacement_text", "")
 
-            threshold = 0.75 if patch_type == "skill_append" else 0.85
-            match, _ = find_match(original_text, text_index, threshold=threshold)
             if match is None:
                 logger.warning(
                     "[pdf_patcher] patch_pdf: no match for original_text=%r",
@@ -296,34 +296,107 @@ def _school_name_matches(school_name: str, aliases: list[str]) -> bool:
     - Multi-word aliases (e.g. "columbia university") use substring matching
       since they're already specific enough.
     - Exact match always passes.
+
+    Evaluated by the compiled per-alias-set matcher (see SchoolMatcher).
     """
     if not school_name:
         return False
-    for alias in aliases:
-        if not alias:
-            continue
-        # Exact match
-        if alias == school_name:
+    return school_matcher(aliases).matches(school_name)
+
+
+def _alias_matches(school_name: str, alias: str) -> bool:
+    """One alias against one school name: the per-alias rules above."""
+    if alias == school_name:
+        return True
+    if len(alias.split()) == 1 and len(alias) < 15:
+        # Single word like "columbia" — require word boundary match
+        if not re.search(r'\b' + re.escape(alias) + r'\b', school_name):
+            return False
+        # Extra guard: if school_name has a geographic prefix that changes meaning, reject
+        # e.g. "british columbia" contains "columbia" but is NOT Columbia University
+        if school_name != alias and alias in school_name:
+            before = school_name[:school_name.index(alias)].strip()
+            if before and before.split()[-1] in _GEOGRAPHIC_QUALIFIERS:
+                return False
+        return True
+    # Multi-word alias: substring is fine (already specific)
+    return alias in school_name or school_name in alias
+
+
+class SchoolMatcher:
+    """All aliases for a school, compiled once.
+
+    Alumni searches check hundreds of PDL results, several education records
+    each, against dozens of aliases. Instead of one regex per alias per
+    record, this keeps:
+      - a set for exact matches,
+      - one combined word-boundary regex over the single-word aliases,
+      - one combined substring regex over the multi-word aliases plus a
+        joined haystack for the reverse (school_name in alias) check,
+      - a bounded memo of school-name verdicts (PDL repeats the same school
+        strings across a result page).
+    The combined patterns only decide whether any alias can match; a hit is
+    confirmed per candidate alias with _alias_matches, so verdicts are exactly
+    those of the per-alias loop.
+    """
+
+    _MEMO_MAX = 4096
+
+    def __init__(self, aliases):
+        aliases = [a for a in aliases if a]
+        self._exact = set(aliases)
+        self._word_aliases = [a for a in aliases if len(a.split()) == 1 and len(a) < 15]
+        self._substr_aliases = [a for a in aliases if not (len(a.split()) == 1 and len(a) < 15)]
+        self._word_re = re.compile(r'\b(?:' + '|'.join(
+            re.escape(a) for a in sorted(self._word_aliases, key=len, reverse=True)
+        ) + r')\b') if self._word_aliases else None
+        self._substr_re = re.compile('|'.join(
+            re.escape(a) for a in self._substr_aliases
+        )) if self._substr_aliases else None
+        self._substr_haystack = "\x00".join(self._substr_aliases)
+        self._memo: dict = {}
+
+    def matches(self, school_name: str) -> bool:
+        if not school_name:
+            return False
+        hit = self._memo.get(school_name)
+        if hit is None:
+            hit = self._evaluate(school_name)
+            if len(self._memo) >= self._MEMO_MAX:
+                self._memo.clear()
+            self._memo[school_name] = hit
+        return hit
+
+    def _evaluate(self, school_name: str) -> bool:
+        if school_name in self._exact:
             return True
-        # For short/single-word aliases, use word-boundary regex to prevent false positives
-        alias_words = alias.split()
-        if len(alias_words) == 1 and len(alias) < 15:
-            # Single word like "columbia" — require word boundary match
-            pattern = r'\b' + re.escape(alias) + r'\b'
-            if re.search(pattern, school_name):
-                # Extra guard: if school_name has a geographic prefix that changes meaning, reject
-                # e.g. "british columbia" contains "columbia" but is NOT Columbia University
-                if school_name != alias and alias in school_name:
-                    # Check if what's before/after the alias is a common geographic qualifier
-                    before = school_name[:school_name.index(alias)].strip()
-                    if before and before.split()[-1] in _GEOGRAPHIC_QUALIFIERS:
-                        continue
+        if self._substr_re is not None:
+            if self._substr_re.search(school_name):
                 return True
-        else:
-            # Multi-word alias: substring is fine (already specific)
-            if alias in school_name or school_name in alias:
+            if "\x00" in school_name:
+                if any(school_name in a for a in self._substr_aliases):
+                    return True
+            elif school_name in self._substr_haystack:
                 return True
-    return False
+        if self._word_re is not None and self._word_re.search(school_name):
+            return any(
+                _alias_matches(school_name, a)
+                for a in self._word_aliases
+                if a in school_name
+            )
+        return False
+
+
+@lru_cache(maxsize=256)
+def _school_matcher_for(aliases: tuple) -> SchoolMatcher:
+    return SchoolMatcher(aliases)
+
+
+def school_matcher(aliases) -> SchoolMatcher:
+    """Cached SchoolMatcher for an alias list (as returned by _school_aliases)."""
+    if isinstance(aliases, SchoolMatcher):
+        return aliases
+    return _school_matcher_for(tuple(aliases))
 
 
 # Common geographic words that change a school's identity when prepended
@@ -347,11 +420,13 @@ def contact_matches_school(contact: dict, aliases: list[str], strictness: str =
 
     Args:
         contact: Contact dict (PDL raw format or extracted contact format)
-        aliases: Pre-computed school aliases from _school_aliases()
+        aliases: Pre-computed school aliases from _school_aliases(), or a
+                 SchoolMatcher built from them
         strictness: "strict", "normal", or "loose"
     """
     if not aliases:
         return False
+    matcher = school_matcher(aliases)
 
     # --- Check structured education array ---
     edu = contact.get("education") or []
@@ -368,7 +443,7 @@ def contact_matches_school(contact: dict, aliases: list[str], strictness: str =
             if not school_name or len(school_name) < 3:
                 continue
 
-            if not _school_name_matches(school_name, aliases):
+            if not matcher.matches(school_name):
                 continue
 
             if strictness == "loose":
@@ -394,7 +469,7 @@ def contact_matches_school(contact: dict, aliases: list[str], strictness: str =
     # --- Fallback: top-level College field ---
     college = (contact.get("College") or contact.get("college") or "").lower()
     if college and len(college) > 2:
-        if _school_name_matches(college, aliases):
+        if matcher.matches(college):
             if strictness == "strict":
                 degree_keywords = ["bachelor", "master", "phd", "mba", "degree", "graduated", "alumni"]
                 if any(kw in college for kw in degree_keywords):
@@ -406,12 +481,22 @@ def contact_matches_school(contact: dict, aliases: list[str], strictness: str =
     if strictness != "strict":
         edu_top = (contact.get("EducationTop") or "").lower()
         if edu_top and len(edu_top) > 2:
-            if _school_name_matches(edu_top, aliases):
+            if matcher.matches(edu_top):
                 return True
 
     return False
 
 
+def filter_contacts_by_school(contacts: list, aliases: list[str], strictness: str = "normal") -> list:
+    """Batch form of contact_matches_school: the contacts that attended one of
+    the aliased schools, in order. Compiles the alias matcher once for the
+    whole list."""
+    if not aliases:
+        return []
+    matcher = school_matcher(aliases)
+    return [c for c in contacts if contact_matches_school(c, matcher, strictness=strictness)]
+
+
 # Backward-compatible aliases that delegate to the consolidated function
 def _contact_has_school_as_primary_education(contact: dict, aliases: list[str]) -> bool:
     return contact_matches_school(contact, aliases, strictness="strict")
@@ -722,7 +807,7 @@ def apply_strict_alumni_filter(contacts: list, college_alumni: str, use_strict:
     if not aliases:
         return contacts
     strictness = "strict" if use_strict else "loose"
-    filtered = [c for c in contacts if contact_matches_school(c, aliases, strictness=strictness)]
+    filtered = filter_contacts_by_school(contacts, aliases, strictness=strictness)
     if len(filtered) < len(contacts):
         print(f"🎓 Alumni filter ({strictness}): {len(contacts)} → {len(filtered)} contacts")
     return filtered
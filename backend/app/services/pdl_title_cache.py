@@ -4,6 +4,11 @@ Every unique title is enriched at most once across all callers. Backed by
 `job_title_enrichments/{slug}` in Firestore so the cache survives restarts,
 deploys, and worker rotation.
 
+Bulk callers (pipeline/title_enricher.py) cluster titles with
+`title_cluster_key`, which also drops location suffixes and requisition
+ids before slugifying, then resolve each cluster once via
+`resolve_titles`: one batched cache read, PDL only for true misses.
+
 Budget guards (we have a fixed 50k credit pool, not per-month):
   - MAX_PER_RUN: hard cap on cache misses per process invocation
   - TOTAL_BUDGET_CIRCUIT_BREAKER: refuses calls once cumulative usage
@@ -55,6 +60,60 @@ def slugify_title(title: str) -> str:
     return s
 
 
+# Words that only ever describe where a job is. A trailing title segment
+# ("- New York, NY", "(Remote)", "| London") made entirely of these, or of
+# the job's own location, is dropped when clustering.
+_LOCATION_WORDS = frozenset("""
+    remote hybrid onsite on site office in wfh virtual anywhere nationwide
+    multiple locations location global us usa u s united states uk kingdom
+    canada emea apac latam americas north south east west central greater
+    metro area bay city county new york nyc san francisco sf jose diego
+    los angeles la seattle boston chicago austin dallas houston denver
+    atlanta miami washington dc philadelphia phoenix pittsburgh minneapolis
+    detroit charlotte nashville salt lake portland raleigh st louis menlo
+    park palo alto mountain view sunnyvale redmond cambridge jersey
+    london toronto vancouver dublin paris berlin singapore hong kong tokyo
+    al ak az ar ca co ct de fl ga hi id il ia ks ky md ma mi mn ms mo
+    mt ne nv nh nj nm ny nc nd oh ok or pa ri sc sd tn tx ut vt va wa wv wi wy
+""".split())
+_TITLE_SEGMENT_RE = re.compile(r"\s+[-–—|/@]\s+|[,;()\[\]]")
+_REQ_ID_RE = re.compile(
+    r"\b(?:req(?:uisition)?|job\s*id|jr|r)[\s#:-]*\d{3,}\b|#\s*\d+|\b\d{5,}\b",
+    re.I,
+)
+
+
+def clean_title(title: str, location: str = "") -> str:
+    """Strip requisition ids and location-only trailing segments.
+
+    The first segment is always kept, and a later segment is dropped only
+    when every word in it is a location word (or part of the job's own
+    `location`), so "Software Engineer - Backend" and "Analyst, Investment
+    Banking" keep their qualifiers.
+    """
+    if not title or not isinstance(title, str):
+        return ""
+    text = _REQ_ID_RE.sub(" ", title)
+    segments = [seg.strip() for seg in _TITLE_SEGMENT_RE.split(text) if seg and seg.strip()]
+    if not segments:
+        return ""
+    local = set(slugify_title(location or "").split())
+    kept = [segments[0]]
+    for seg in segments[1:]:
+        words = slugify_title(seg).split()
+        if words and all(w in _LOCATION_WORDS or w in local for w in words):
+            continue
+        kept.append(seg)
+    return " ".join(kept)
+
+
+def title_cluster_key(title: str, location: str = "") -> str:
+    """Cache slug shared by title variants that differ only in location,
+    requisition id or punctuation. Equal to slugify_title(title) for titles
+    with neither, so existing cache docs keep hitting."""
+    return slugify_title(clean_title(title, location))
+
+
 def _empty_payload(title: str) -> dict:
     return {
         "cleaned_name": title or "",
@@ -99,6 +158,16 @@ def _increment_usage(db) -> None:
         logger.warning("pdl_title_cache: failed to increment usage counter: %s", exc)
 
 
+def _cached_payload(data: dict) -> dict:
+    return {
+        "cleaned_name": data.get("cleaned_name", ""),
+        "similar_titles": data.get("similar_titles") or [],
+        "levels": data.get("levels") or [],
+        "role": data.get("role", ""),
+        "sub_role": data.get("sub_role", ""),
+    }
+
+
 def _read_cache(db, slug: str) -> Optional[dict]:
     try:
         doc = db.collection(CACHE_COLLECTION).document(slug).get()
@@ -112,13 +181,7 @@ def _read_cache(db, slug: str) -> Optional[dict]:
             )
         except Exception:
             pass
-        return {
-            "cleaned_name": data.get("cleaned_name", ""),
-            "similar_titles": data.get("similar_titles") or [],
-            "levels": data.get("levels") or [],
-            "role": data.get("role", ""),
-            "sub_role": data.get("sub_role", ""),
-        }
+        return _cached_payload(data)
     except Exception as exc:
         logger.warning("pdl_title_cache: cache read failed for %s: %s", slug, exc)
         return None
@@ -228,13 +291,15 @@ def get_or_enrich_title(title: str) -> dict:
     with _run_lock:
         _run_misses += 1
     _write_cache(db, slug, title, payload)
+    _log_burn(_total_credits_used(db))
+    return payload
 
-    # Burn-rate alerts. Re-reading the counter after the increment is fine —
-    # this only logs once per cron miss, not per call. Coarse-grained
-    # threshold logs let us see the burn in Render logs without polling
-    # the admin endpoint.
+
+def _log_burn(used: int) -> None:
+    """Burn-rate alerts. Logged once per cron miss, not per call. Coarse-
+    grained threshold logs let us see the burn in Render logs without
+    polling the admin endpoint."""
     try:
-        used = _total_credits_used(db)
         if used > 40_000:
             logger.error(
                 "PDL_BURN_RED: %s/%s credits used (>80%%); breaker fires at %s",
@@ -253,4 +318,88 @@ def get_or_enrich_title(title: str) -> dict:
     except Exception:
         pass
 
-    return payload
+
+CACHE_READ_CHUNK = 300
+
+
+def resolve_titles(db, titles: dict) -> tuple[dict, list]:
+    """Bulk form of get_or_enrich_title for pre-clustered titles.
+
+    `titles` maps cluster slug → representative (cleaned) title. All slugs
+    are read from the cache with batched get_all calls; PDL is called once
+    per true miss, sequentially, under the same guards (MAX_PER_RUN and the
+    total-budget breaker, whose counter is read once and tracked locally).
+
+    Returns (payloads, deferred): {slug: payload} for every slug resolved
+    from cache or PDL, and the slugs MAX_PER_RUN left unresolved — callers
+    should leave those jobs pending for the next run. Once the budget
+    breaker has tripped, remaining misses get the empty payload (not
+    cached), as get_or_enrich_title returns: the breaker doesn't reset on
+    its own, so deferring them would pin them in the pending queue ahead of
+    jobs whose titles are already cached.
+    """
+    global _run_misses
+
+    payloads: dict = {}
+    slugs = [slug for slug in titles if slug]
+    collection = db.collection(CACHE_COLLECTION)
+    for i in range(0, len(slugs), CACHE_READ_CHUNK):
+        chunk = slugs[i : i + CACHE_READ_CHUNK]
+        try:
+            docs = db.get_all([collection.document(slug) for slug in chunk])
+        except Exception as exc:
+            logger.warning("pdl_title_cache: batched cache read failed: %s", exc)
+            continue
+        for doc in docs:
+            if doc.exists:
+                payloads[doc.id] = _cached_payload(doc.to_dict() or {})
+
+    if payloads:
+        # One batch of hit_count bumps instead of a write per read.
+        try:
+            batch = db.batch()
+            for slug in payloads:
+                batch.set(collection.document(slug), {"hit_count": Increment(1)}, merge=True)
+            batch.commit()
+        except Exception:
+            pass
+
+    misses = [slug for slug in slugs if slug not in payloads]
+    if not misses:
+        return payloads, []
+
+    used = _total_credits_used(db)
+    called = 0
+    deferred: list = []
+    for n, slug in enumerate(misses):
+        with _run_lock:
+            capped = _run_misses >= MAX_PER_RUN
+        if capped:
+            deferred = misses[n:]
+            logger.warning("pdl_title_cache: MAX_PER_RUN (%s) hit; deferring %d titles",
+                           MAX_PER_RUN, len(deferred))
+            break
+        if used >= TOTAL_BUDGET_CIRCUIT_BREAKER:
+            refused = misses[n:]
+            logger.error(
+                "pdl_title_cache: total-budget circuit breaker tripped at %s/%s; "
+                "refusing to enrich %d titles",
+                TOTAL_BUDGET_CIRCUIT_BREAKER, PDL_TOTAL_BUDGET, len(refused),
+            )
+            for refused_slug in refused:
+                payloads[refused_slug] = _empty_payload(titles[refused_slug])
+            break
+        title = titles[slug]
+        raw = enrich_job_title_with_pdl(title) or {}
+        payload = _normalize_pdl_response(raw, title)
+        _increment_usage(db)
+        used += 1
+        called += 1
+        with _run_lock:
+            _run_misses += 1
+        _write_cache(db, slug, title, payload)
+        payloads[slug] = payload
+
+    if called:
+        _log_burn(used)
+    return payloads, deferred
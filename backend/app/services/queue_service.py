@@ -45,14 +45,29 @@ Architecture notes (from CEO + eng + design reviews, 2026-04-08/09):
   this 15-param function — see CLAUDE.md "known fragility").
 - TTL: queues older than 14 days are deleted at generation time (cheap
   single-query cleanup, piggyback on every generate call).
+- Generation is pipelined: the dedup-key load runs while PDL searches;
+  the non-alumni fallback search can be speculated alongside the alumni
+  search (QUEUE_SPECULATIVE_FALLBACK_SEARCH, off by default because PDL
+  bills the fallback even when its results are discarded); drafts are
+  generated in chunks of QUEUE_DRAFT_CHUNK_SIZE concurrently, and each
+  chunk's queue contacts are committed in one batch as soon as its drafts
+  are back, bumping the queue's contactCount so partial progress shows.
+  The chunk size defaults to QUEUE_CONTACT_COUNT, i.e. one
+  batch_generate_emails call: its prompt varies openings across the
+  contacts of one call and carries the resume once, so splitting a queue
+  costs draft variety and tokens. Any failed chunk fails (and refunds)
+  the whole queue, as the single call did.
 """
 from __future__ import annotations
 
+import functools
 import logging
+import os
 import re
 import threading
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
@@ -61,11 +76,14 @@ from firebase_admin import firestore
 from app.config import TIER_CONFIGS
 from app.extensions import get_db
 from app.services.auth import deduct_credits_atomic, refund_credits_atomic
+from app.services.dashboard_aggregates import record_contact_change
 from app.services.pdl_client import (
     US_STATE_ABBREVIATIONS,
     search_contacts_with_smart_location_strategy,
 )
 from app.services.reply_generation import batch_generate_emails
+from app.services.suppression import suppressed_emails
+from app.utils.scoring_profile import contact_features
 from app.utils.warmth_scoring import score_contacts_for_email
 
 logger = logging.getLogger(__name__)
@@ -78,6 +96,13 @@ logger = logging.getLogger(__name__)
 QUEUE_CONTACT_COUNT = 5
 QUEUE_TTL_DAYS = 14
 QUEUE_GENERATION_CREDITS = 15  # Full price (Extend / second+ refine / Free tier)
+# Both pipelining knobs default off. The email prompt varies openers across
+# the contacts of one batch_generate_emails call, so splitting a 5-contact
+# queue trades draft quality for ~one LLM round trip. Speculating the
+# non-alumni search pays for a second PDL search on every university queue
+# to save time only when the alumni search comes back empty.
+QUEUE_DRAFT_CHUNK_SIZE = int(os.getenv("QUEUE_DRAFT_CHUNK_SIZE", str(QUEUE_CONTACT_COUNT)))
+QUEUE_SPECULATIVE_FALLBACK_SEARCH = os.getenv("QUEUE_SPECULATIVE_FALLBACK_SEARCH", "false").lower() == "true"
 
 # Status values for the parent queue doc
 STATUS_PROCESSING = "processing"
@@ -200,6 +225,12 @@ def _add_to_blocklist(db, uid: str, *, company: str = "", title: str = "") -> No
         prefs_ref.update(updates)
 
 
+# Side stages of generation (dedup-key load, speculative search) and
+# concurrent draft chunks. Generation itself runs on its own thread.
+_stage_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="queue-stage")
+_draft_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="queue-draft")
+
+
 # ---------------------------------------------------------------------------
 # Dedup + blocklist filtering
 # ---------------------------------------------------------------------------
@@ -241,9 +272,10 @@ def _filter_candidates(
     existing_pdl_ids: set[str],
     existing_emails: set[str],
     blocklist: dict,
+    suppressed: set[str] = frozenset(),
 ) -> tuple[list[dict], dict]:
     """
-    Apply dedup + blocklist filtering. Returns (filtered_list, filter_stats).
+    Apply dedup + blocklist + suppression filtering. Returns (filtered_list, filter_stats).
 
     Dedup rule (hard gate per CEO plan §Dedup):
       - If candidate.pdlId exists in existing_pdl_ids → drop
@@ -251,11 +283,16 @@ def _filter_candidates(
 
     Blocklist rule (per outside voice §OV.2):
       - Exact-match-on-normalized company OR title → drop
+
+    Suppression rule: normalized email in `suppressed` (bounced for this
+    user or globally, prefetched in one lookup) → drop, so the queue never
+    offers a draft the Gmail gate would refuse.
     """
     blocked_companies = {_normalize_text(c) for c in blocklist.get("companies", []) if c}
     blocked_titles = {_normalize_text(t) for t in blocklist.get("titles", []) if t}
 
-    stats = {"dedup_pdl": 0, "dedup_email": 0, "blocklist_company": 0, "blocklist_title": 0}
+    stats = {"dedup_pdl": 0, "dedup_email": 0, "blocklist_company": 0, "blocklist_title": 0,
+             "suppressed": 0}
     filtered: list[dict] = []
 
     for c in candidates:
@@ -276,6 +313,9 @@ def _filter_candidates(
         if title_norm and title_norm in blocked_titles:
             stats["blocklist_title"] += 1
             continue
+        if email_norm and email_norm in suppressed:
+            stats["suppressed"] += 1
+            continue
 
         filtered.append(c)
 
@@ -310,7 +350,12 @@ def cleanup_expired_queues(db, uid: str, ttl_days: int = QUEUE_TTL_DAYS) -> int:
 
 
 def _delete_queue_doc_and_subcollection(queue_ref) -> None:
-    """Delete all contacts under a queue, then the queue doc itself."""
+    """Delete all contacts under a queue, then the queue doc itself.
+
+    These are the queue's staging rows (users/{uid}/queues/{id}/contacts),
+    not saved contacts, so dashboard aggregates are unaffected. Approved
+    rows were reported when approve_queue_contact saved them.
+    """
     contacts_ref = queue_ref.collection("contacts")
     try:
         for c in contacts_ref.stream():
@@ -325,6 +370,43 @@ def _delete_queue_doc_and_subcollection(queue_ref) -> None:
 # ---------------------------------------------------------------------------
 
 
+def _queue_contact_doc(contact: dict, draft: dict, warmth: dict) -> dict:
+    """users/{uid}/weekly_queues/{queue_id}/contacts doc for one candidate."""
+    draft_subject = draft.get("subject") or draft.get("email_subject") or ""
+    draft_body = draft.get("body") or draft.get("email_body") or ""
+
+    warmth_tier = warmth.get("tier") or contact.get("warmth_tier") or "cold"
+    warmth_signals = warmth.get("signals") or contact.get("warmth_signals") or []
+
+    first_name = (contact.get("FirstName") or contact.get("firstName") or "").strip()
+    last_name = (contact.get("LastName") or contact.get("lastName") or "").strip()
+    full_name = f"{first_name} {last_name}".strip() or "Unknown"
+
+    return {
+        "pdlId": (contact.get("pdlId") or "").strip(),
+        "email": contact.get("Email") or contact.get("email") or "",
+        "name": full_name,
+        "firstName": first_name,
+        "lastName": last_name,
+        "title": contact.get("Title") or contact.get("title") or "",
+        "company": contact.get("Company") or contact.get("company") or "",
+        "college": contact.get("College") or contact.get("college") or "",
+        "city": contact.get("City") or contact.get("city") or "",
+        "state": contact.get("State") or contact.get("state") or "",
+        "linkedinUrl": contact.get("LinkedIn") or contact.get("linkedinUrl") or "",
+        "warmthTier": warmth_tier,
+        "warmthScore": int(warmth.get("score", 0)) if warmth else 0,
+        "warmthSignals": warmth_signals,
+        "draftSubject": draft_subject,
+        "draftBody": draft_body,
+        "status": "pending",
+        "dismissReason": None,
+        "approvedAt": None,
+        "gmailDraftId": None,
+        "createdAt": _now_iso(),
+    }
+
+
 def generate_queue_background(
     *,
     uid: str,
@@ -340,13 +422,16 @@ def generate_queue_background(
     Pipeline stages (mirrors coffee_chat_prep async pattern):
       1. Load queue preferences (blocklist, pause state)
       2. PDL search — up to 3x the target count to survive dedup+blocklist
+         (existing contact keys load concurrently)
       3. Dedup + blocklist filter
       4. Deduct 15 credits IF NOT ALREADY DEDUCTED (free weekly queue is
          pre-deducted as 0 by the route layer)
       5. Warmth score + sort
-      6. batch_generate_emails (named kwargs — call site #7)
-      7. Write queue doc + contacts subcollection
-      8. Mark status = pending_review or completed_partial
+      6. batch_generate_emails per chunk, concurrently (named kwargs — call
+         site #7); each chunk's contacts are written in one batch as it lands
+      7. Mark status = pending_review or completed_partial. If some chunks
+         failed after others were written, the queue keeps what was written
+         and only the undrafted share of the credits is refunded.
     """
     db = get_db()
     queue_ref = (
@@ -397,14 +482,21 @@ def generate_queue_background(
 
         queue_ref.update({"status": STATUS_PROCESSING, "stage": "searching", "updatedAt": _now_iso()})
 
+        # Dedup keys don't depend on the search — load them while PDL runs.
+        existing_keys_future = _stage_pool.submit(_fetch_existing_contact_keys, db, uid)
+
+        search = functools.partial(
+            search_contacts_with_smart_location_strategy,
+            job_title=title_keywords,
+            company=company,
+            location=location,
+            max_contacts=overshoot,
+        )
+        fallback_future = None
         try:
-            raw_candidates = search_contacts_with_smart_location_strategy(
-                job_title=title_keywords,
-                company=company,
-                location=location,
-                max_contacts=overshoot,
-                college_alumni=university or None,
-            ) or []
+            if university and QUEUE_SPECULATIVE_FALLBACK_SEARCH:
+                fallback_future = _stage_pool.submit(search, college_alumni=None)
+            raw_candidates = search(college_alumni=university or None) or []
             # Alumni verification can be over-strict (e.g. USC parenthesized
             # abbreviations, nested PDL education fields). If the alumni-only
             # search returns nothing, fall back to a non-alumni search and let
@@ -415,13 +507,12 @@ def generate_queue_background(
                     "queue_service: alumni search returned 0 for uid=%s university=%s, retrying without alumni filter",
                     uid, university,
                 )
-                raw_candidates = search_contacts_with_smart_location_strategy(
-                    job_title=title_keywords,
-                    company=company,
-                    location=location,
-                    max_contacts=overshoot,
-                    college_alumni=None,
-                ) or []
+                if fallback_future is not None:
+                    raw_candidates = fallback_future.result() or []
+                else:
+                    raw_candidates = search(college_alumni=None) or []
+            elif fallback_future is not None:
+                fallback_future.cancel()
         except Exception as search_exc:
             logger.exception("queue_service: PDL search failed uid=%s", uid)
             _fail(STATUS_FAILED_PDL, f"Contact search failed: {search_exc}")
@@ -469,9 +560,16 @@ def generate_queue_background(
             return
 
         # Stage 3 — dedup + blocklist filter
-        existing_pdl_ids, existing_emails = _fetch_existing_contact_keys(db, uid)
+        existing_pdl_ids, existing_emails = existing_keys_future.result()
+        try:
+            suppressed = suppressed_emails(
+                uid, [c.get("Email") or c.get("email") or "" for c in raw_candidates]
+            )
+        except Exception as supp_exc:
+            logger.warning("queue_service: suppression lookup failed uid=%s: %s", uid, supp_exc)
+            suppressed = set()
         filtered, filter_stats = _filter_candidates(
-            raw_candidates, existing_pdl_ids, existing_emails, blocklist
+            raw_candidates, existing_pdl_ids, existing_emails, blocklist, suppressed
         )
 
         if not filtered:
@@ -496,8 +594,10 @@ def generate_queue_background(
 
         # Stage 4 — warmth score + sort + cap to QUEUE_CONTACT_COUNT
         queue_ref.update({"stage": "scoring", "updatedAt": _now_iso()})
+        # Normalized once; both scoring passes and drafting reuse the records.
+        features = contact_features(filtered)
         try:
-            scored = score_contacts_for_email(user_profile, filtered)
+            scored = score_contacts_for_email(user_profile, filtered, features=features)
             # score_contacts_for_email returns a dict keyed by index — sort `filtered` in place
             # by (warmth tier rank, score desc)
             _tier_rank = {"warm": 0, "neutral": 1, "cold": 2}
@@ -510,17 +610,23 @@ def generate_queue_background(
             sorted_contacts = [c for _, c in indexed]
             # Re-score in order for the final batch so index-keyed warmth maps to new order
             top_contacts = sorted_contacts[:QUEUE_CONTACT_COUNT]
-            warmth_data = score_contacts_for_email(user_profile, top_contacts)
+            top_features = [features[i] for i, _ in indexed[:QUEUE_CONTACT_COUNT]]
+            warmth_data = score_contacts_for_email(user_profile, top_contacts, features=top_features)
         except Exception as score_exc:
             logger.warning("queue_service: warmth scoring failed uid=%s: %s", uid, score_exc)
             top_contacts = filtered[:QUEUE_CONTACT_COUNT]
+            top_features = features[:QUEUE_CONTACT_COUNT]
             warmth_data = {}
 
-        # Stage 5 — generate emails (call site #7 — named kwargs required)
+        # Stage 5 — generate emails (call site #7 — named kwargs required),
+        # one batch_generate_emails call per chunk (a single call by default),
+        # concurrently. Each chunk's queue contacts are written in one batch
+        # as soon as its drafts land.
         queue_ref.update({"stage": "drafting", "updatedAt": _now_iso()})
-        try:
-            email_results = batch_generate_emails(
-                contacts=top_contacts,
+
+        def _draft_chunk(indices: list[int]) -> dict:
+            return batch_generate_emails(
+                contacts=[top_contacts[i] for i in indices],
                 resume_text=resume_text or "",
                 user_profile=user_profile,
                 career_interests=(user_profile.get("careerInterests") or []),
@@ -534,70 +640,86 @@ def generate_queue_background(
                 auth_display_name=user_profile.get("displayName") or user_profile.get("name"),
                 personal_note="",
                 dream_companies=(user_profile.get("goals") or {}).get("dreamCompanies") or [],
-                warmth_data=warmth_data,
+                warmth_data={j: warmth_data[i] for j, i in enumerate(indices) if i in warmth_data},
+                contact_features=[top_features[i] for i in indices],
             ) or {}
-        except Exception as email_exc:
-            logger.exception("queue_service: email generation failed uid=%s", uid)
+
+        chunk_size = max(1, QUEUE_DRAFT_CHUNK_SIZE)
+        chunks = [
+            list(range(start, min(start + chunk_size, len(top_contacts))))
+            for start in range(0, len(top_contacts), chunk_size)
+        ]
+        draft_futures = {_draft_pool.submit(_draft_chunk, chunk): chunk for chunk in chunks}
+        contacts_sub = queue_ref.collection("contacts")
+        written = 0
+        email_exc: Optional[Exception] = None
+        write_exc: Optional[Exception] = None
+
+        # Stage 6 — write queue contacts subcollection, chunk by chunk
+        for future in as_completed(draft_futures):
+            chunk = draft_futures[future]
+            try:
+                email_results = future.result()
+            except Exception as exc:
+                logger.exception("queue_service: email generation failed uid=%s", uid)
+                email_exc = email_exc or exc
+                continue
+            try:
+                batch = db.batch()
+                for j, idx in enumerate(chunk):
+                    warmth = warmth_data.get(idx, {}) if warmth_data else {}
+                    batch.set(
+                        contacts_sub.document(),
+                        _queue_contact_doc(top_contacts[idx], email_results.get(j) or {}, warmth),
+                    )
+                batch.update(queue_ref, {"contactCount": written + len(chunk), "updatedAt": _now_iso()})
+                batch.commit()
+                written += len(chunk)
+            except Exception as exc:
+                logger.exception("queue_service: write failed uid=%s", uid)
+                write_exc = write_exc or exc
+
+        # Nothing written: fail the queue and refund, like the single call.
+        if written == 0 and email_exc is not None:
             _fail(STATUS_FAILED_EMAILS, f"Email generation failed: {email_exc}")
             return
+        if written == 0 and write_exc is not None:
+            _fail(STATUS_FAILED_WRITE, f"Saving queue failed: {write_exc}")
+            return
 
-        # Stage 6 — write queue contacts subcollection
-        queue_ref.update({"stage": "saving", "updatedAt": _now_iso()})
-        try:
-            contacts_sub = queue_ref.collection("contacts")
-            written = 0
-            for idx, contact in enumerate(top_contacts):
-                draft = email_results.get(idx) or {}
-                draft_subject = draft.get("subject") or draft.get("email_subject") or ""
-                draft_body = draft.get("body") or draft.get("email_body") or ""
-
-                warmth = warmth_data.get(idx, {}) if warmth_data else {}
-                warmth_tier = warmth.get("tier") or contact.get("warmth_tier") or "cold"
-                warmth_signals = warmth.get("signals") or contact.get("warmth_signals") or []
-
-                first_name = (contact.get("FirstName") or contact.get("firstName") or "").strip()
-                last_name = (contact.get("LastName") or contact.get("lastName") or "").strip()
-                full_name = f"{first_name} {last_name}".strip() or "Unknown"
-
-                contact_doc = {
-                    "pdlId": (contact.get("pdlId") or "").strip(),
-                    "email": contact.get("Email") or contact.get("email") or "",
-                    "name": full_name,
-                    "firstName": first_name,
-                    "lastName": last_name,
-                    "title": contact.get("Title") or contact.get("title") or "",
-                    "company": contact.get("Company") or contact.get("company") or "",
-                    "college": contact.get("College") or contact.get("college") or "",
-                    "city": contact.get("City") or contact.get("city") or "",
-                    "state": contact.get("State") or contact.get("state") or "",
-                    "linkedinUrl": contact.get("LinkedIn") or contact.get("linkedinUrl") or "",
-                    "warmthTier": warmth_tier,
-                    "warmthScore": int(warmth.get("score", 0)) if warmth else 0,
-                    "warmthSignals": warmth_signals,
-                    "draftSubject": draft_subject,
-                    "draftBody": draft_body,
-                    "status": "pending",
-                    "dismissReason": None,
-                    "approvedAt": None,
-                    "gmailDraftId": None,
-                    "createdAt": _now_iso(),
-                }
-                contacts_sub.add(contact_doc)
-                written += 1
+        # Some chunks landed and some didn't: keep the written contacts and
+        # refund the undrafted share (rounded in the user's favour).
+        chunk_exc = email_exc or write_exc
+        partial_refund = 0
+        if chunk_exc is not None and credits_charged_on_start > 0 and not credits_refunded:
+            undrafted = len(top_contacts) - written
+            partial_refund = -(-credits_charged_on_start * undrafted // len(top_contacts))
+            try:
+                refund_credits_atomic(uid, partial_refund, "queue_partial_drafts")
+                credits_refunded = True
+            except Exception as refund_exc:
+                logger.error("queue_service: partial refund failed uid=%s: %s", uid, refund_exc)
+                partial_refund = 0
 
+        try:
             final_status = (
                 STATUS_PENDING_REVIEW if written == QUEUE_CONTACT_COUNT else STATUS_COMPLETED_PARTIAL
             )
-            queue_ref.update(
-                {
-                    "status": final_status,
-                    "stage": "completed",
-                    "contactCount": written,
-                    "filterStats": filter_stats,
-                    "completedAt": _now_iso(),
-                    "updatedAt": _now_iso(),
-                }
-            )
+            final_update = {
+                "status": final_status,
+                "stage": "completed",
+                "contactCount": written,
+                "filterStats": filter_stats,
+                "completedAt": _now_iso(),
+                "updatedAt": _now_iso(),
+            }
+            if chunk_exc is not None:
+                final_update["errorMessage"] = (
+                    f"{len(top_contacts) - written} of {len(top_contacts)} drafts failed: {chunk_exc}"
+                )
+                final_update["creditsRefunded"] = credits_refunded
+                final_update["creditsRefundedAmount"] = partial_refund
+            queue_ref.update(final_update)
 
             # Bump cyclesCompleted on the preferences doc
             try:
@@ -617,9 +739,9 @@ def generate_queue_background(
             except Exception as prefs_exc:
                 logger.warning("queue_service: failed to bump cyclesCompleted: %s", prefs_exc)
 
-        except Exception as write_exc:
+        except Exception as final_exc:
             logger.exception("queue_service: write failed uid=%s", uid)
-            _fail(STATUS_FAILED_WRITE, f"Saving queue failed: {write_exc}")
+            _fail(STATUS_FAILED_WRITE, f"Saving queue failed: {final_exc}")
             return
 
     except Exception as exc:
@@ -919,6 +1041,8 @@ def approve_queue_contact(
     # contacts_ref.add() returns (update_time, doc_ref) in the Python client
     new_contact_ref = created[1] if isinstance(created, tuple) else created
     new_contact_id = getattr(new_contact_ref, "id", "")
+    if new_contact_id:
+        record_contact_change(uid, new_contact_id, None, normalized, db)
 
     q_contact_ref.update(
         {
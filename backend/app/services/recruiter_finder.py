@@ -15,6 +15,7 @@ Usage:
     )
 """
 
+import functools
 import re
 import time
 from typing import List, Dict, Optional, Literal, Any
@@ -27,6 +28,7 @@ from .pdl_client import (
 )
 from .recruiter_email_generator import generate_recruiter_emails
 from .hunter import enrich_contacts_with_hunter
+from .tiered_search import TIER_OUTCOMES, Tier, run_tiers
 from ..config import (
     PDL_BASE_URL,
     PEOPLE_DATA_LABS_API_KEY,
@@ -1206,17 +1208,27 @@ def find_recruiters(
         # rate (~30-50%) without over-fetching. For max_results=3 this is 6
         # credits/call instead of 20.
         recruiter_fetch_limit = max(max_results + 3, 6)
-        raw_recruiters, _ = execute_pdl_search(
-            headers=headers,
-            url=PDL_URL,
-            query_obj=query_obj,
-            desired_limit=recruiter_fetch_limit,
-            search_type="recruiter_search",
-            page_size=recruiter_fetch_limit,
-            verbose=False,
-            target_company=cleaned_company  # Pass target company for correct domain extraction
-        )
-        
+        # The recruiter-title search is the first tier of the recruiter
+        # chain. Companies where it keeps coming back empty go straight to
+        # the HR / executive fallbacks (see tiered_search.TIER_OUTCOMES).
+        outcome_kind = _tier_outcome_kind("recruiter", location)
+        if not titles_override and TIER_OUTCOMES.never_hits(outcome_kind, cleaned_company, "recruiter"):
+            print(f"[RecruiterSearch] Skipping recruiter titles at {cleaned_company} (no hits in recent searches)")
+            raw_recruiters = []
+        else:
+            raw_recruiters, _ = execute_pdl_search(
+                headers=headers,
+                url=PDL_URL,
+                query_obj=query_obj,
+                desired_limit=recruiter_fetch_limit,
+                search_type="recruiter_search",
+                page_size=recruiter_fetch_limit,
+                verbose=False,
+                target_company=cleaned_company  # Pass target company for correct domain extraction
+            )
+            if not titles_override:
+                TIER_OUTCOMES.record(outcome_kind, cleaned_company, "recruiter", bool(raw_recruiters))
+
         if not raw_recruiters:
             # No recruiters found - try fallback search
             print(f"[RecruiterSearch] No recruiters found for {cleaned_company}, trying fallback search...")
@@ -1354,15 +1366,21 @@ def find_recruiters(
         }
 
 
-def search_by_titles(
+def _tier_outcome_kind(base: str, location: Optional[str], job_type: str = "") -> str:
+    """TIER_OUTCOMES namespace. Tier queries are filtered by inferred
+    country (and hiring-manager titles by job type), so an empty tier only
+    predicts another empty tier for the same filters."""
+    return f"{base}:{job_type}:{infer_location_country(location) or ''}"
+
+
+def _search_by_titles_raw(
     company_name: str,
     titles: List[str],
     location: Optional[str] = None,
     max_results: int = 10
 ) -> List[Dict]:
-    """
-    Search PDL for people at a company with specific job titles.
-    """
+    """search_by_titles without the error guard, so a failed PDL call is
+    an error to the tier executor rather than an empty tier."""
     # Build title clauses
     title_should = []
     for title in titles:
@@ -1392,18 +1410,30 @@ def search_by_titles(
         "X-Api-Key": PEOPLE_DATA_LABS_API_KEY,
     }
     
+    contacts, _ = execute_pdl_search(
+        headers=headers,
+        url=PDL_URL,
+        query_obj=query_obj,
+        desired_limit=max_results,
+        search_type="title_search",
+        page_size=max_results,
+        verbose=False,
+        target_company=company_name
+    )
+    return contacts or []
+
+
+def search_by_titles(
+    company_name: str,
+    titles: List[str],
+    location: Optional[str] = None,
+    max_results: int = 10
+) -> List[Dict]:
+    """
+    Search PDL for people at a company with specific job titles.
+    """
     try:
-        contacts, _ = execute_pdl_search(
-            headers=headers,
-            url=PDL_URL,
-            query_obj=query_obj,
-            desired_limit=max_results,
-            search_type="title_search",
-            page_size=max_results,
-            verbose=False,
-            target_company=company_name
-        )
-        return contacts or []
+        return _search_by_titles_raw(company_name, titles, location, max_results)
     except Exception as e:
         print(f"[RecruiterSearch] Error in fallback search: {e}")
         return []
@@ -1424,9 +1454,7 @@ def search_recruiters_with_fallback(
     Search for recruiters with fallback to HR/founders for small companies.
     """
     cleaned_company = clean_company_name(company_name) or company_name
-    
-    # Fallback 1: Try HR titles
-    print(f"[RecruiterSearch] Fallback 1: Searching for HR contacts at {cleaned_company}...")
+
     hr_titles = [
         "HR Manager",
         "HR Director",
@@ -1438,9 +1466,50 @@ def search_recruiters_with_fallback(
         "Talent Acquisition Manager",
         "People Manager"
     ]
-    
-    hr_contacts = search_by_titles(cleaned_company, hr_titles, location, max_results)
-    
+    executive_titles = [
+        "CEO",
+        "CTO",
+        "COO",
+        "Founder",
+        "Co-Founder",
+        "President",
+        "VP Engineering",
+        "VP of Engineering",
+        "Engineering Manager",
+        "Hiring Manager",
+        "Head of Engineering",
+        "Director of Engineering"
+    ]
+
+    # Both fallbacks go through the tier executor: the executive search can
+    # start while the HR search is in flight, and is discarded if HR hits.
+    found = {}
+
+    def _accept(tier, contacts):
+        if contacts:
+            found[tier.key] = contacts
+            return True
+        if tier.key == "hr":
+            print(f"[RecruiterSearch] Fallback 2: Searching for executives at {cleaned_company}...")
+        return False
+
+    # Fallback 1: Try HR titles
+    print(f"[RecruiterSearch] Fallback 1: Searching for HR contacts at {cleaned_company}...")
+    run_tiers(
+        [
+            Tier("hr", functools.partial(_search_by_titles_raw, cleaned_company, hr_titles, location, max_results),
+                 cost=max_results),
+            # Fallback 2: Try founders/executives for small companies
+            Tier("executives", functools.partial(_search_by_titles_raw, cleaned_company, executive_titles, location, max_results // 2),
+                 cost=max_results // 2),
+        ],
+        _accept,
+        kind=_tier_outcome_kind("recruiter", location),
+        company=cleaned_company,
+        log_prefix="[RecruiterSearch]",
+    )
+
+    hr_contacts = found.get("hr") or []
     if hr_contacts and len(hr_contacts) > 0:
         print(f"[RecruiterSearch] ✅ Found {len(hr_contacts)} HR contacts")
         
@@ -1481,25 +1550,7 @@ def search_recruiters_with_fallback(
             "message": f"No dedicated recruiters found. Found {len(final_contacts)} HR contacts at {cleaned_company} who may help with hiring."
         }
     
-    # Fallback 2: Try founders/executives for small companies
-    print(f"[RecruiterSearch] Fallback 2: Searching for executives at {cleaned_company}...")
-    executive_titles = [
-        "CEO",
-        "CTO",
-        "COO",
-        "Founder",
-        "Co-Founder",
-        "President",
-        "VP Engineering",
-        "VP of Engineering",
-        "Engineering Manager",
-        "Hiring Manager",
-        "Head of Engineering",
-        "Director of Engineering"
-    ]
-    
-    exec_contacts = search_by_titles(cleaned_company, executive_titles, location, max_results // 2)
-    
+    exec_contacts = found.get("executives") or []
     if exec_contacts and len(exec_contacts) > 0:
         print(f"[RecruiterSearch] ✅ Found {len(exec_contacts)} executives")
         
@@ -1997,91 +2048,110 @@ def find_hiring_manager(
         per_tier_size = max(max_results * 2, 8)
 
     # Tiered search: Start with Tier 1, fallback to lower tiers if needed.
-    for tier in range(1, 6):  # Tiers 1-5
-        if len(candidate_pool) >= pool_target:
-            break
-        
-        # Skip Tier 5 (executives) unless company is small
-        if tier == 5:
-            # We'll check company size after we've searched other tiers
-            # For now, do a quick check: if we found many contacts, skip executives
-            if len(all_contacts_found) >= 5:
-                print(f"[HiringManagerFinder] Skipping Tier 5 (executives) - company appears large")
-                continue
-        
-        # Get titles for this tier
-        tier_titles = get_hiring_manager_titles_for_tier(tier, job_type)
-        if not tier_titles:
-            continue
-        all_search_titles.extend(tier_titles)
-        
-        print(f"[HiringManagerFinder] Searching Tier {tier} with titles: {tier_titles[:3]}...")
-        
-        # Build query for this tier. Only Tiers 2-3 (team leads, dept heads,
-        # VPs, directors) get a functional-role pin — those are the roles
-        # PDL reliably tags with a job_title_role matching the requisition.
-        # Tier 1 (recruiters, hiring-manager titles) stays title-only because
-        # recruiters cross functions in PDL's tagging (a "Consulting
-        # Recruiter" at MBB is usually role=human_resources, not
-        # role=consulting) — role-pinning Tier 1 would silently drop them.
-        # Tiers 4-5 (referral sources, execs) also stay title-only for the
-        # same reason (a founder isn't tagged as "engineering" even at an
-        # engineering-heavy startup).
+    # Tiers go through tiered_search.run_tiers: a later tier may start while
+    # an earlier one is in flight (bounded by PDL_SPECULATIVE_CREDIT_BUDGET),
+    # but results are folded in tier order, exactly as a serial loop would.
+    PDL_URL = f"{PDL_BASE_URL}/person/search"
+    headers = {
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+        "X-Api-Key": PEOPLE_DATA_LABS_API_KEY,
+    }
+
+    def _search_tier(tier_titles: List[str], pdl_role: Optional[str]) -> List[Dict]:
         query_obj = build_hiring_manager_search_query(
             company_name=cleaned_company.lower(),
             titles=tier_titles,
             location=location,
             company_aliases=company_names,
             company_website=company_website,
-            pdl_role=tight_pdl_role if tier in (2, 3) else None,
+            pdl_role=pdl_role,
         )
-        
-        # Execute PDL search
-        PDL_URL = f"{PDL_BASE_URL}/person/search"
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "X-Api-Key": PEOPLE_DATA_LABS_API_KEY,
-        }
-        
-        try:
-            raw_managers, _ = execute_pdl_search(
-                headers=headers,
-                url=PDL_URL,
-                query_obj=query_obj,
-                desired_limit=per_tier_size,  # Shrunk when tight already supplied precise candidates
-                search_type="hiring_manager_search",
-                page_size=per_tier_size,
-                verbose=False,
-                target_company=cleaned_company
-            )
+        raw_managers, _ = execute_pdl_search(
+            headers=headers,
+            url=PDL_URL,
+            query_obj=query_obj,
+            desired_limit=per_tier_size,  # Shrunk when tight already supplied precise candidates
+            search_type="hiring_manager_search",
+            page_size=per_tier_size,
+            verbose=False,
+            target_company=cleaned_company
+        )
+        return raw_managers or []
+
+    def _executives_allowed() -> bool:
+        # Skip Tier 5 (executives) unless company is small. We check company
+        # size after the other tiers: if we found many contacts, skip
+        # executives.
+        if len(all_contacts_found) >= 5:
+            print(f"[HiringManagerFinder] Skipping Tier 5 (executives) - company appears large")
+            return False
+        return True
 
-            if raw_managers:
-                all_contacts_found.extend(raw_managers)
-                highest_tier_used = tier
-
-                # ✅ FIX: Add all managers to candidate pool (up to pool size limit)
-                # Filter for current employees first
-                current_managers = [m for m in raw_managers if m.get('IsCurrentlyAtTarget', False)]
-                historical_managers = [m for m in raw_managers if not m.get('IsCurrentlyAtTarget', False)]
-
-                # Add current employees first, then historical, up to pool size
-                remaining_slots = pool_target - len(candidate_pool)
-                if remaining_slots > 0:
-                    if len(current_managers) >= remaining_slots:
-                        managers_to_add = current_managers[:remaining_slots]
-                    elif len(current_managers) > 0:
-                        managers_to_add = current_managers + historical_managers[:remaining_slots - len(current_managers)]
-                    else:
-                        managers_to_add = historical_managers[:remaining_slots]
-                    
-                    candidate_pool.extend(managers_to_add)
-                    print(f"[HiringManagerFinder] Tier {tier}: Found {len(raw_managers)} total, added {len(managers_to_add)} to candidate pool (pool size: {len(candidate_pool)})")
-            
-        except Exception as e:
-            print(f"[HiringManagerFinder] Error searching Tier {tier}: {e}")
+    titles_by_tier = {}
+    search_tiers = []
+    for tier in range(1, 6):  # Tiers 1-5
+        # Get titles for this tier
+        tier_titles = get_hiring_manager_titles_for_tier(tier, job_type)
+        if not tier_titles:
             continue
-    
+        titles_by_tier[tier] = tier_titles
+
+        # Only Tiers 2-3 (team leads, dept heads, VPs, directors) get a
+        # functional-role pin — those are the roles PDL reliably tags with a
+        # job_title_role matching the requisition. Tier 1 (recruiters,
+        # hiring-manager titles) stays title-only because recruiters cross
+        # functions in PDL's tagging (a "Consulting Recruiter" at MBB is
+        # usually role=human_resources, not role=consulting) — role-pinning
+        # Tier 1 would silently drop them. Tiers 4-5 (referral sources,
+        # execs) also stay title-only for the same reason (a founder isn't
+        # tagged as "engineering" even at an engineering-heavy startup).
+        search_tiers.append(Tier(
+            key=tier,
+            run=functools.partial(_search_tier, tier_titles, tight_pdl_role if tier in (2, 3) else None),
+            cost=per_tier_size,
+            guard=_executives_allowed if tier == 5 else None,
+        ))
+
+    def _fold_tier(search_tier: Tier, raw_managers: List[Dict]) -> bool:
+        nonlocal highest_tier_used
+        tier = search_tier.key
+        all_search_titles.extend(titles_by_tier[tier])
+        print(f"[HiringManagerFinder] Tier {tier} titles: {titles_by_tier[tier][:3]}...")
+
+        if raw_managers:
+            all_contacts_found.extend(raw_managers)
+            highest_tier_used = tier
+
+            # ✅ FIX: Add all managers to candidate pool (up to pool size limit)
+            # Filter for current employees first
+            current_managers = [m for m in raw_managers if m.get('IsCurrentlyAtTarget', False)]
+            historical_managers = [m for m in raw_managers if not m.get('IsCurrentlyAtTarget', False)]
+
+            # Add current employees first, then historical, up to pool size
+            remaining_slots = pool_target - len(candidate_pool)
+            if remaining_slots > 0:
+                if len(current_managers) >= remaining_slots:
+                    managers_to_add = current_managers[:remaining_slots]
+                elif len(current_managers) > 0:
+                    managers_to_add = current_managers + historical_managers[:remaining_slots - len(current_managers)]
+                else:
+                    managers_to_add = historical_managers[:remaining_slots]
+
+                candidate_pool.extend(managers_to_add)
+                print(f"[HiringManagerFinder] Tier {tier}: Found {len(raw_managers)} total, added {len(managers_to_add)} to candidate pool (pool size: {len(candidate_pool)})")
+
+        return len(candidate_pool) >= pool_target
+
+    if len(candidate_pool) < pool_target:
+        run_tiers(
+            search_tiers,
+            _fold_tier,
+            kind=_tier_outcome_kind("hiring_manager", location, job_type or ""),
+            company=cleaned_company,
+            log_prefix="[HiringManagerFinder]",
+        )
+
     # ✅ FIX: Rank candidate pool, then verify emails BEFORE final selection
     if candidate_pool:
         # Rank all candidates by title relevance
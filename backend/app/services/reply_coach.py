@@ -11,6 +11,7 @@ import threading
 from datetime import datetime, timezone
 
 from app.extensions import get_db
+from app.services.briefing_snapshot import invalidate_briefing
 from app.services.gmail_client import _gmail_service, _load_user_gmail_creds, get_full_thread_chain
 from app.services.reply_generation import generate_reply_to_message
 
@@ -100,6 +101,7 @@ def _generate_and_store_draft(db, uid, contact_id, contact_data, message_snippet
     }
 
     db.collection("users").document(uid).collection("replyDrafts").document(contact_id).set(draft_doc)
+    invalidate_briefing(uid)
     return draft_doc
 
 
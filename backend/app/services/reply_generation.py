@@ -426,7 +426,7 @@ def _derive_professional_persona(user_profile, user_info, pre_parsed_user_info=N
     }
 
 
-def batch_generate_emails(contacts, resume_text, user_profile, career_interests, fit_context=None, pre_parsed_user_info=None, template_instructions="", email_template_purpose=None, resume_filename=None, subject_line=None, signoff_config=None, auth_display_name=None, personal_note="", dream_companies=None, warmth_data=None, uid=None, enrichment_data=None, loop_brief_text="", loop_brief_parsed=None):
+def batch_generate_emails(contacts, resume_text, user_profile, career_interests, fit_context=None, pre_parsed_user_info=None, template_instructions="", email_template_purpose=None, resume_filename=None, subject_line=None, signoff_config=None, auth_display_name=None, personal_note="", dream_companies=None, warmth_data=None, uid=None, enrichment_data=None, loop_brief_text="", loop_brief_parsed=None, contact_features=None):
     """
     Generate all emails using the new compelling prompt template.
 
@@ -442,6 +442,9 @@ def batch_generate_emails(contacts, resume_text, user_profile, career_interests,
             industries / locations / emailPurpose / constraints) used as
             backup signal when the freeform sentence is sparse. Pass None
             for non-Loop callers.
+        contact_features: Optional ContactFeatures for ``contacts`` (same
+            order), as passed to score_contacts_for_email, so warmth and
+            personalization share one normalization per contact.
     """
     try:
         logger.info("[EMAIL-GEN] batch_generate_emails called for %d contacts (auth_display_name=%r)", len(contacts), auth_display_name)
@@ -589,7 +592,7 @@ def batch_generate_emails(contacts, resume_text, user_profile, career_interests,
                          ci, c.get('College', ''), 'present' if c.get('educationArray') else 'absent',
                          c.get('EducationTop', '')[:100])
         try:
-            strategies = build_batch_strategies(norm_user, contacts, warmth_data)
+            strategies = build_batch_strategies(norm_user, contacts, warmth_data, features=contact_features)
         except Exception as strat_err:
             logger.warning("[EMAIL-GEN] build_batch_strategies failed (non-fatal): %s", strat_err)
             strategies = {}
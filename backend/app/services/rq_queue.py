@@ -1,5 +1,5 @@
 """
-rq_queue — durable background jobs for Loop cycles.
+rq_queue — durable background jobs for Loop cycles and periodic scanners.
 
 Design:
   - In prod (REDIS_URL set), enqueue jobs onto an RQ queue; a separate Render
@@ -17,27 +17,53 @@ Use:
     from app.services.rq_queue import enqueue
     enqueue("run_loop_cycle", uid=uid, loop_id=loop_id)
 
+Every job, on either path, executes through `run_job`, which resolves the
+registry entry and records per-job timing metrics (see `job_metrics`).
+Jobs can be made idempotent with `idempotency_key=` (a second enqueue of
+the same key is a no-op while the first claim is live) and retryable with
+`retries=`. Periodic scheduling of the former wsgi.py daemon loops lives in
+job_scheduler.py on top of this module.
+
+RQ_EAGER=true runs every job inline in the caller's thread, which is what
+tests want: Redis-less, synchronous, same code path as the worker.
+
 Naming note: this file is rq_queue.py (not job_queue.py) because the latter
 is already used for the Firestore-backed analysis job tracker.
 """
 from __future__ import annotations
 
+import contextlib
 import importlib
 import logging
 import os
 import threading
-from typing import Any, Callable
+import time
+from typing import Any, Callable, Optional
 
 logger = logging.getLogger(__name__)
 
 REDIS_URL = os.getenv("REDIS_URL")
 QUEUE_NAME = os.getenv("RQ_QUEUE_NAME", "loops")
+# Periodic scanners get their own queue so a multi-minute scan never sits in
+# front of a user-triggered Loop cycle. worker.py serves each queue from its
+# own process (RQ_PERIODIC_WORKER).
+PERIODIC_QUEUE_NAME = os.getenv("RQ_PERIODIC_QUEUE_NAME", "periodic")
 JOB_TIMEOUT_SECONDS = int(os.getenv("LOOP_JOB_TIMEOUT", "900"))  # 15 min ceiling
 
+# Backoff between retry attempts (seconds). Attempts past the end of the
+# list reuse the last value.
+RETRY_BACKOFF_SECONDS = [30, 120, 600]
+
+
+def _eager() -> bool:
+    return os.getenv("RQ_EAGER", "false").lower() == "true"
+
 
 # ── RQ-backed path (prod) ───────────────────────────────────────────────────
 
 _rq_queue = None
+_rq_periodic_queue = None
+_rq_conn = None
 _rq_initialized = False
 _rq_available = False
 
@@ -48,7 +74,7 @@ def _init_rq() -> bool:
     Imports are inside the function so the dev fallback doesn't require the
     rq/redis packages to be importable at module load time.
     """
-    global _rq_queue, _rq_initialized, _rq_available
+    global _rq_queue, _rq_periodic_queue, _rq_conn, _rq_initialized, _rq_available
     if _rq_initialized:
         return _rq_available
     _rq_initialized = True
@@ -63,6 +89,8 @@ def _init_rq() -> bool:
         # Touch the server so we fail loudly here, not later inside a worker.
         conn.ping()
         _rq_queue = Queue(QUEUE_NAME, connection=conn, default_timeout=JOB_TIMEOUT_SECONDS)
+        _rq_periodic_queue = Queue(PERIODIC_QUEUE_NAME, connection=conn, default_timeout=JOB_TIMEOUT_SECONDS)
+        _rq_conn = conn
         _rq_available = True
         logger.info("rq_queue: RQ ready (queue=%s)", QUEUE_NAME)
     except Exception:
@@ -81,35 +109,95 @@ def _init_rq() -> bool:
 
 JOB_REGISTRY: dict[str, str] = {
     "run_loop_cycle": "app.services.loop_jobs.run_loop_cycle_job",
+    # User-triggered work (Loop queue).
+    "contact_import": "app.services.contact_import_jobs.run_import_job",
+    # Periodic scanners (scheduled by job_scheduler.PERIODIC_JOBS).
+    "tracker_scan": "app.services.daemon_jobs.run_tracker_scanners",
+    "gmail_watch_renewal": "app.services.daemon_jobs.renew_gmail_watches",
+    "daemon_watchdog": "app.services.daemon_jobs.check_daemon_health",
+    "agent_cycles": "app.services.agent_service.run_due_agent_cycles",
+    "loop_scheduler": "app.services.loop_scheduler.run_due_loops",
+    "agent_followups": "app.services.agent_service.run_followup_scan",
+    "agent_digests": "app.services.agent_service.send_daily_digests",
+    "fj_modified": "pipeline.main.run_fantastic_modified",
+    "fj_expired": "pipeline.main.run_sweep_expired",
 }
 
+# User-triggered jobs share the Loop queue; everything else is periodic.
+USER_JOB_NAMES = frozenset({"run_loop_cycle", "contact_import"})
 
-def enqueue(job_name: str, **kwargs: Any) -> str:
+# Jobs that go on PERIODIC_QUEUE_NAME instead of the Loop queue.
+PERIODIC_JOB_NAMES = frozenset(JOB_REGISTRY) - USER_JOB_NAMES
+
+
+def enqueue(
+    job_name: str,
+    *,
+    idempotency_key: Optional[str] = None,
+    retries: int = 0,
+    timeout: Optional[int] = None,
+    claim_ttl: Optional[int] = None,
+    **kwargs: Any,
+) -> Optional[str]:
     """Enqueue a named job. Returns the RQ job id (or a synthetic dev id).
 
     The job function is resolved by name through JOB_REGISTRY so callers
     don't have to import worker code from request handlers.
+
+    idempotency_key: when set, the job id becomes "<job_name>:<key>" and a
+    claim is taken before enqueueing. A second enqueue with the same key
+    while the claim is live returns None instead of running the job twice
+    (e.g. two web processes firing the same periodic slot).
+    claim_ttl: how long the claim holds, in seconds (default: the job
+    timeout). Periodic jobs pass the rest of their slot, so a short run
+    can't free the slot for another scheduler to fire again.
+    retries: extra attempts after a failure, spaced by RETRY_BACKOFF_SECONDS.
     """
     if job_name not in JOB_REGISTRY:
         raise ValueError(f"unknown job: {job_name}")
-    dotted = JOB_REGISTRY[job_name]
+    timeout = timeout or JOB_TIMEOUT_SECONDS
+    claim_ttl = claim_ttl or timeout
+    job_id = f"{job_name}:{idempotency_key}" if idempotency_key else None
+
+    if _eager():
+        if job_id and not _claim(job_id, claim_ttl):
+            return None
+        _run_with_retries(job_name, kwargs, retries, sleep=False)
+        return job_id or f"eager-{job_name}"
 
     if _init_rq() and _rq_queue is not None:
-        job = _rq_queue.enqueue(dotted, kwargs=kwargs, job_timeout=JOB_TIMEOUT_SECONDS)
+        if job_id and not _claim(job_id, claim_ttl):
+            logger.info("rq_queue: %s already claimed; skipping enqueue", job_id)
+            return None
+        from rq import Retry
+
+        queue = _rq_periodic_queue if job_name in PERIODIC_JOB_NAMES else _rq_queue
+        retry = None
+        if retries > 0:
+            retry = Retry(max=retries, interval=[_backoff(i) for i in range(retries)])
+        job = queue.enqueue(
+            "app.services.rq_queue.run_job",
+            args=(job_name,),
+            kwargs=kwargs,
+            job_id=job_id,
+            job_timeout=timeout,
+            retry=retry,
+        )
         logger.info("rq_queue: enqueued %s job=%s", job_name, job.id)
         return job.id
 
+    if job_id and not _claim(job_id, claim_ttl):
+        return None
     # Dev fallback — run in a daemon thread on this process. Not durable,
     # but lets devs work without Redis installed.
-    target = _resolve_dotted(dotted)
     t = threading.Thread(
-        target=_safe_call,
-        args=(target, kwargs),
+        target=_run_with_retries,
+        args=(job_name, kwargs, retries),
         daemon=True,
         name=f"job-{job_name}",
     )
     t.start()
-    synthetic_id = f"dev-{job_name}-{id(t)}"
+    synthetic_id = job_id or f"dev-{job_name}-{id(t)}"
     logger.info("rq_queue: ran %s in-process (no REDIS_URL) thread=%s", job_name, synthetic_id)
     return synthetic_id
 
@@ -121,11 +209,150 @@ def _resolve_dotted(dotted: str) -> Callable[..., Any]:
     return getattr(module, func_name)
 
 
-def _safe_call(target: Callable[..., Any], kwargs: dict) -> None:
+def _backoff(attempt: int) -> int:
+    return RETRY_BACKOFF_SECONDS[min(attempt, len(RETRY_BACKOFF_SECONDS) - 1)]
+
+
+def _run_with_retries(job_name: str, kwargs: dict, retries: int, sleep: bool = True) -> None:
+    """Thread / eager path. Mirrors RQ's Retry: run, and on failure try again
+    up to `retries` more times. Never raises — background threads have no
+    one to raise to."""
+    for attempt in range(retries + 1):
+        try:
+            run_job(job_name, **kwargs)
+            return
+        except Exception:
+            logger.exception(
+                "rq_queue: background job crashed: %s (attempt %d/%d)",
+                job_name, attempt + 1, retries + 1,
+            )
+            if attempt < retries and sleep:
+                time.sleep(_backoff(attempt))
+
+
+# ── Idempotency claims ──────────────────────────────────────────────────────
+#
+# Redis SET NX when RQ is live so the claim is shared across every web and
+# worker process; a process-local dict otherwise. Claims expire after the
+# job's timeout (or the caller's claim_ttl) so a crashed run can't wedge
+# the key forever.
+
+_local_claims: dict[str, float] = {}
+_local_claims_lock = threading.Lock()
+
+
+def _claim(job_id: str, ttl_seconds: int) -> bool:
+    if _rq_available and _rq_conn is not None:
+        try:
+            return bool(_rq_conn.set(f"rq:claim:{job_id}", "1", nx=True, ex=max(1, int(ttl_seconds))))
+        except Exception:
+            logger.exception("rq_queue: claim failed for %s; enqueueing anyway", job_id)
+            return True
+    now = time.monotonic()
+    with _local_claims_lock:
+        expires = _local_claims.get(job_id)
+        if expires is not None and expires > now:
+            return False
+        _local_claims[job_id] = now + ttl_seconds
+        return True
+
+
+# ── Execution + per-job timing metrics ──────────────────────────────────────
+
+_metrics: dict[str, dict] = {}
+_metrics_lock = threading.Lock()
+
+# Flask app whose context wraps in-process runs. The old wsgi daemons ran
+# every scanner inside app.app_context(); the web process registers its app
+# here to keep that. The RQ worker has no Flask app and runs bare, same as
+# the Loop jobs always have.
+_job_app = None
+
+
+def set_app(app) -> None:
+    global _job_app
+    _job_app = app
+
+
+def run_job(job_name: str, **kwargs: Any) -> Any:
+    """Execute a registered job and record its timing. This is the function
+    RQ actually runs, so worker and thread paths report the same metrics.
+    Exceptions propagate (RQ needs them to trigger Retry)."""
+    target = _resolve_dotted(JOB_REGISTRY[job_name])
+    ctx = _job_app.app_context() if _job_app is not None else contextlib.nullcontext()
+    started = time.monotonic()
+    ok = False
+    error: Optional[str] = None
     try:
-        target(**kwargs)
-    except Exception:
-        logger.exception("rq_queue: background job crashed: %s", target.__name__)
+        with ctx:
+            result = target(**kwargs)
+        ok = True
+        return result
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _record_run(job_name, (time.monotonic() - started) * 1000.0, ok, error)
+        # Forked work horses exit via os._exit (no atexit), so events the
+        # job logged must be written before we return.
+        from app.services.event_buffer import flush_all
+        flush_all()
+
+
+def _record_run(job_name: str, duration_ms: float, ok: bool, error: Optional[str]) -> None:
+    with _metrics_lock:
+        m = _metrics.setdefault(job_name, {
+            "runs": 0, "failures": 0, "total_ms": 0.0, "max_ms": 0.0,
+            "last_ms": 0.0, "last_ok": None, "last_error": None, "last_finished_at": None,
+        })
+        m["runs"] += 1
+        if not ok:
+            m["failures"] += 1
+            m["last_error"] = error
+        m["total_ms"] += duration_ms
+        m["max_ms"] = max(m["max_ms"], duration_ms)
+        m["last_ms"] = duration_ms
+        m["last_ok"] = ok
+        m["last_finished_at"] = time.time()
+    logger.info(
+        "rq_queue: job=%s ok=%s duration_ms=%.0f", job_name, ok, duration_ms,
+    )
+    # Mirror into Redis so the web process can report what the worker did.
+    if _rq_available and _rq_conn is not None:
+        try:
+            key = f"rq:jobmetrics:{job_name}"
+            pipe = _rq_conn.pipeline()
+            pipe.hincrby(key, "runs", 1)
+            if not ok:
+                pipe.hincrby(key, "failures", 1)
+            pipe.hincrbyfloat(key, "total_ms", duration_ms)
+            pipe.hset(key, mapping={
+                "last_ms": round(duration_ms, 1),
+                "last_ok": int(ok),
+                "last_finished_at": int(time.time()),
+            })
+            pipe.execute()
+        except Exception:
+            logger.debug("rq_queue: failed to mirror metrics for %s", job_name, exc_info=True)
+
+
+def job_metrics() -> dict[str, dict]:
+    """Per-job timing snapshot for this process: runs, failures, total/max/
+    last duration in ms, and the last error string."""
+    with _metrics_lock:
+        out = {}
+        for name, m in _metrics.items():
+            snap = dict(m)
+            snap["avg_ms"] = m["total_ms"] / m["runs"] if m["runs"] else 0.0
+            out[name] = snap
+        return out
+
+
+def reset_job_metrics() -> None:
+    with _metrics_lock:
+        _metrics.clear()
+    with _local_claims_lock:
+        _local_claims.clear()
 
 
 # ── Health / introspection ──────────────────────────────────────────────────
@@ -139,10 +366,21 @@ def is_durable() -> bool:
 def queue_info() -> dict:
     """Returns basic queue stats for /api/admin or a health endpoint."""
     if not _init_rq() or _rq_queue is None:
-        return {"durable": False, "backend": "thread"}
+        return {"durable": False, "backend": "thread", "metrics": job_metrics()}
+    metrics: dict[str, dict] = {}
+    try:
+        for name in JOB_REGISTRY:
+            raw = _rq_conn.hgetall(f"rq:jobmetrics:{name}")
+            if raw:
+                metrics[name] = {k.decode(): v.decode() for k, v in raw.items()}
+    except Exception:
+        logger.debug("rq_queue: failed to read job metrics", exc_info=True)
     return {
         "durable": True,
         "backend": "rq",
         "queue": QUEUE_NAME,
         "size": _rq_queue.count,
+        "periodic_queue": PERIODIC_QUEUE_NAME,
+        "periodic_size": _rq_periodic_queue.count if _rq_periodic_queue is not None else 0,
+        "metrics": metrics,
     }
@@ -27,6 +27,7 @@ from app.services.openai_client import (
     get_async_anthropic_client,
 )
 from app.extensions import get_db
+from app.utils.async_runner import on_shared_loop, shared_loop_resource
 from app.services.scout.page_registry import build_pages_prompt_section, get_page, page_identity
 from app.services.scout.router import try_pre_llm
 from app.services.scout.cache import (
@@ -844,9 +845,11 @@ class ScoutAssistantService:
 
     def _get_openai(self):
         """Get the appropriate async OpenAI client.
-        Returns _stream_openai if set (streaming context with fresh event loop),
-        otherwise falls back to self._openai (main event loop)."""
-        return getattr(self, "_stream_openai", None) or self._openai
+        Streams run on the shared async_runner loop and get the client bound
+        to that loop; everything else falls back to self._openai."""
+        if on_shared_loop():
+            return shared_loop_resource("openai", create_async_openai_client) or self._openai
+        return self._openai
 
     async def handle_chat(
         self,
@@ -2743,15 +2746,15 @@ class ScoutAssistantService:
 
         Scout's tool-call response is structured, not a token stream, so this
         runs handle_chat and emits the result as a single 'done' event. It runs
-        in a background thread with its own event loop, so it creates a fresh
-        OpenAI client that handle_chat picks up via _get_openai().
+        as a task on the shared async_runner loop; handle_chat picks up that
+        loop's OpenAI client via _get_openai().
+
+        `queue` only needs an awaitable `put`. The route passes a non-blocking
+        writer so a slow client can never stall the shared loop.
 
         The /chat/stream route and this shim are retired once the frontend
         moves to the plain /chat endpoint (Phase 3).
         """
-        # Fresh client bound to this thread's event loop.
-        self._stream_openai = create_async_openai_client()
-
         async def _emitter(event: str, data: Dict[str, Any]) -> None:
             """SSE bridge for live tool-call narration and mode pill.
             handle_chat calls this synchronously via self._emit; the awaited
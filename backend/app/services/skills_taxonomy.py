@@ -4,7 +4,10 @@ Skills Taxonomy for ATS Keyword Matching
 Contains:
 - SKILL_SYNONYMS: Maps variations to canonical form
 - SKILL_CATEGORIES: Groups skills by category for better matching
+- SKILL_MATCHER: Finds every taxonomy skill in a text in one pass
 """
+import re
+from typing import Dict, Iterable, List, Set, Tuple
 
 # Maps skill variations to canonical form
 # Key: canonical form, Value: list of variations
@@ -149,6 +152,74 @@ for canonical, variations in SKILL_SYNONYMS.items():
     for var in variations:
         VARIATION_TO_CANONICAL[var.lower()] = canonical
 
+
+# ---------------------------------------------------------------------------
+# Compiled matcher
+# ---------------------------------------------------------------------------
+# A variation is found in a text when r'\b' + re.escape(variation) + r'\b'
+# matches the lowercased text. Instead of one regex per variation, texts and
+# variations are split into the same tokens (runs of \w, and every other
+# character on its own), and variations are stored in a trie keyed by token.
+# Since word tokens are maximal runs, a variation that starts/ends with a
+# word character is automatically on a \b there; one that starts/ends with
+# another character (".net", "c++") needs a word token just before/after it.
+
+_TOKEN_RE = re.compile(r"\w+|\W")
+_WORD_RE = re.compile(r"\w")
+_END = None  # trie key of the (canonical, needs_word_before, needs_word_after) entries
+
+
+class SkillMatcher:
+    """Token trie over (variation, canonical) pairs, built once."""
+
+    def __init__(self, variations: Iterable[Tuple[str, str]]):
+        self._trie: dict = {}
+        for variation, canonical in variations:
+            tokens = _TOKEN_RE.findall(variation)
+            if not tokens:
+                continue
+            node = self._trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault(_END, []).append((
+                canonical,
+                not _WORD_RE.match(tokens[0]),
+                not _WORD_RE.match(tokens[-1]),
+            ))
+
+    def find(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """Canonical skill -> (start, end) spans of its variations in text.lower()."""
+        found: Dict[str, List[Tuple[int, int]]] = {}
+        if not text:
+            return found
+        matches = list(_TOKEN_RE.finditer(text.lower()))
+        tokens = [m.group() for m in matches]
+        is_word = [bool(_WORD_RE.match(t)) for t in tokens]
+        trie = self._trie
+        n = len(tokens)
+        for i in range(n):
+            node = trie.get(tokens[i])
+            j = i
+            while node is not None:
+                for canonical, word_before, word_after in node.get(_END, ()):
+                    if word_before and not (i > 0 and is_word[i - 1]):
+                        continue
+                    if word_after and not (j + 1 < n and is_word[j + 1]):
+                        continue
+                    found.setdefault(canonical, []).append((matches[i].start(), matches[j].end()))
+                j += 1
+                if j >= n:
+                    break
+                node = node.get(tokens[j])
+        return found
+
+    def canonical_skills(self, text: str) -> Set[str]:
+        """Canonical skills with at least one variation in text."""
+        return set(self.find(text))
+
+
+SKILL_MATCHER = SkillMatcher(VARIATION_TO_CANONICAL.items())
+
 # Skill categories for context-aware matching
 SKILL_CATEGORIES = {
     "programming_languages": [
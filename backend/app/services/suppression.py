@@ -11,8 +11,32 @@ bounced. Recorded by the Gmail webhook the moment a DSN comes in.
 
 Same fire-and-forget shape as cooldown_service: never raises, never blocks
 the request path.
+
+Lookups are on the hot path of every draft and send, so:
+
+  - batch callers resolve the whole batch with one suppressed_emails() call:
+    gmail_client's create_drafts_parallel / send_emails_parallel and agent
+    cycles prefetch through gmail_client.suppressed_recipients() and pass
+    the set into the per-draft gate, and queue generation drops suppressed
+    candidates before drafting. Per-user entries are read with one
+    db.get_all() instead of one .get() per email;
+  - the global set is mirrored in a process-local Bloom filter
+    (GlobalSuppressionFilter). A miss means "definitely not globally
+    suppressed" and costs no Firestore read; a hit is confirmed against
+    Firestore, so false positives never block a send. The filter is built
+    off the request thread, topped up from a lastBouncedAt watermark every
+    SUPPRESSION_FILTER_DELTA_SECONDS and rebuilt every
+    SUPPRESSION_FILTER_REBUILD_SECONDS. Until the first build finishes,
+    lookups fall back to reading global_suppression directly.
+  - record_bounce adds the address to the local filter immediately. Bounces
+    recorded by other processes show up at the next delta refresh.
 """
+import hashlib
 import logging
+import math
+import os
+import threading
+import time
 from datetime import datetime, timezone
 
 from google.cloud.firestore_v1 import Increment
@@ -22,10 +46,165 @@ from app.extensions import get_db
 logger = logging.getLogger(__name__)
 
 
+SUPPRESSION_FILTER_ENABLED = os.getenv("SUPPRESSION_FILTER_ENABLED", "true").lower() == "true"
+SUPPRESSION_FILTER_DELTA_SECONDS = int(os.getenv("SUPPRESSION_FILTER_DELTA_SECONDS", "60"))
+SUPPRESSION_FILTER_REBUILD_SECONDS = int(os.getenv("SUPPRESSION_FILTER_REBUILD_SECONDS", "3600"))
+SUPPRESSION_FILTER_ERROR_RATE = 0.001
+
+
 def _normalize(email: str) -> str:
     return (email or "").strip().lower()
 
 
+# ---------------------------------------------------------------------------
+# Global suppression filter
+# ---------------------------------------------------------------------------
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on blake2b)."""
+
+    def __init__(self, capacity: int, error_rate: float = SUPPRESSION_FILTER_ERROR_RATE):
+        capacity = max(1, capacity)
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class GlobalSuppressionFilter:
+    """Process-local mirror of global_suppression doc ids.
+
+    might_contain() returns None while the filter is not usable (never
+    built, built from a different client, or disabled) so callers fall
+    back to Firestore.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._source = None
+        self._built_at = 0.0
+        self._delta_at = 0.0
+        self._watermark = ""
+        self._refreshing = False
+        # Addresses bounced while a rebuild is streaming; merged into the
+        # new filter so they aren't lost.
+        self._pending = []
+        self.stats = {"builds": 0, "deltas": 0, "negatives": 0, "positives": 0, "fallbacks": 0}
+
+    def rebuild(self, db) -> None:
+        """Stream every global_suppression id into a fresh filter."""
+        started = datetime.now(timezone.utc).isoformat()
+        ids = [doc.id for doc in db.collection("global_suppression").select([]).stream()]
+        bloom = BloomFilter(max(len(ids) * 2, 10_000))
+        for email in ids:
+            bloom.add(email)
+        now = self._clock()
+        with self._lock:
+            # Keep anything record_bounce added while we were streaming.
+            for email in self._pending:
+                bloom.add(email)
+            self._bloom = bloom
+            self._source = db
+            self._built_at = self._delta_at = now
+            self._watermark = started
+            self._pending = []
+            self.stats["builds"] += 1
+        logger.info(f"[suppression] Global filter built: {len(ids)} addresses, {bloom.num_bits // 8} bytes")
+
+    def refresh_delta(self, db) -> None:
+        """Add addresses bounced since the last build/delta."""
+        with self._lock:
+            watermark = self._watermark
+        started = datetime.now(timezone.utc).isoformat()
+        docs = (
+            db.collection("global_suppression")
+            .where("lastBouncedAt", ">=", watermark)
+            .select([])
+            .stream()
+        )
+        new_ids = [doc.id for doc in docs]
+        with self._lock:
+            if self._bloom is None or self._source is not db:
+                return
+            for email in new_ids:
+                self._bloom.add(email)
+            self._delta_at = self._clock()
+            self._watermark = started
+            self.stats["deltas"] += 1
+
+    def add(self, email: str) -> None:
+        """Local invalidation: the address is suppressed from now on."""
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(email)
+            if self._refreshing:
+                self._pending.append(email)
+
+    def might_contain(self, db, email: str):
+        if not SUPPRESSION_FILTER_ENABLED:
+            return None
+        with self._lock:
+            if self._bloom is None or self._source is not db:
+                hit = None
+                self.stats["fallbacks"] += 1
+            else:
+                hit = email in self._bloom
+                self.stats["positives" if hit else "negatives"] += 1
+        self._maybe_refresh(db)
+        return hit
+
+    def _maybe_refresh(self, db) -> None:
+        now = self._clock()
+        with self._lock:
+            if self._refreshing:
+                return
+            if self._bloom is None or self._source is not db or now - self._built_at >= SUPPRESSION_FILTER_REBUILD_SECONDS:
+                job = self.rebuild
+            elif now - self._delta_at >= SUPPRESSION_FILTER_DELTA_SECONDS:
+                job = self.refresh_delta
+            else:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                job(db)
+            except Exception as e:
+                logger.warning(f"[suppression] Global filter refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="suppression-filter", daemon=True).start()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._bloom = None
+            self._source = None
+            self._pending = []
+            self._refreshing = False
+
+
+_global_filter = GlobalSuppressionFilter()
+
+
 def record_bounce(uid: str, contact_email: str, contact_id: str = None, reason: str = "bounce") -> None:
     """Mark an email as bounced for this user (and globally). Fire-and-forget."""
     email = _normalize(contact_email)
@@ -66,43 +245,50 @@ def record_bounce(uid: str, contact_email: str, contact_id: str = None, reason:
             merge=True,
         )
 
+        _global_filter.add(email)
         logger.info(f"[suppression] Recorded bounce email={email} uid={uid} reason={reason}")
     except Exception as e:
         logger.warning(f"[suppression] Failed to record bounce for {email}: {e}")
 
 
+def _existing(db, collection, emails) -> set:
+    """The emails that have a doc in `collection`, in one round trip."""
+    if len(emails) == 1:
+        return set(emails) if collection.document(emails[0]).get().exists else set()
+    return {snap.id for snap in db.get_all([collection.document(e) for e in emails]) if snap.exists}
+
+
+def suppressed_emails(uid: str, emails) -> set:
+    """Normalized addresses from `emails` that bounced for this user or
+    globally. One get_all for the per-user layer; the global layer only
+    reads the addresses the filter can't rule out."""
+    wanted = list(dict.fromkeys(e for e in (_normalize(x) for x in emails or []) if e))
+    if not wanted:
+        return set()
+    db = get_db()
+    if not db:
+        return set()
+
+    found = set()
+    if uid:
+        found |= _existing(db, db.collection("users").document(uid).collection("suppression"), wanted)
+
+    candidates = [
+        e for e in wanted
+        if e not in found and _global_filter.might_contain(db, e) is not False
+    ]
+    if candidates:
+        found |= _existing(db, db.collection("global_suppression"), candidates)
+    return found
+
+
 def is_suppressed(uid: str, contact_email: str) -> bool:
     """Return True if this email has bounced for this user OR globally."""
     email = _normalize(contact_email)
     if not email:
         return False
     try:
-        db = get_db()
-        if not db:
-            return False
-
-        if uid:
-            user_doc = (
-                db.collection("users")
-                .document(uid)
-                .collection("suppression")
-                .document(email)
-                .get()
-            )
-            if user_doc.exists:
-                return True
-
-        global_doc = db.collection("global_suppression").document(email).get()
-        return global_doc.exists
+        return email in suppressed_emails(uid, [email])
     except Exception as e:
         logger.warning(f"[suppression] Lookup failed for {email}: {e}")
         return False
-
-
-def filter_suppressed(uid: str, emails):
-    """Return the subset of `emails` that are NOT suppressed. Best-effort."""
-    out = []
-    for e in emails or []:
-        if not is_suppressed(uid, e):
-            out.append(e)
-    return out
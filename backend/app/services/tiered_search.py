@@ -0,0 +1,212 @@
+"""
+Tiered PDL search with bounded speculation.
+
+Recruiter and hiring-manager discovery walk a priority list of title tiers:
+run tier 1, fold its results in, and move to tier 2 only if the quota isn't
+filled yet. Each tier is a full multi-second PDL round trip, so at small
+companies, where the top tiers come back empty, the serial chain stacks
+three or four of them.
+
+run_tiers() keeps the serial semantics and overlaps the waiting:
+
+  - Results are folded strictly in priority order through the caller's
+    `accept(tier, results)` callback, which returns True once the quota is
+    filled. Given the same PDL answers, the outcome is the same as the
+    serial loop.
+  - While a tier is in flight, the next tiers may be launched early. PDL
+    bills per record returned, so every early launch reserves its
+    worst-case cost (page size) against a per-request speculation budget
+    (PDL_SPECULATIVE_CREDIT_BUDGET). A tier the serial chain would have
+    run anyway gives its reservation back when its turn comes; tiers the
+    chain never reaches are the only extra spend.
+  - Once a tier fills the quota, tiers that haven't started are cancelled
+    and results from tiers still in flight are discarded.
+  - Tiers with a `guard` depend on what earlier tiers found (e.g. "only
+    search executives at small companies"). They never run early, and they
+    are skipped if the guard fails when their turn comes.
+  - Per-company outcomes are kept in TIER_OUTCOMES (per worker, including
+    tiers whose results were discarded). A tier that came back empty
+    TIER_SKIP_AFTER_MISSES times in a row at a company is skipped by later
+    searches for TIER_OUTCOME_TTL_SECONDS after the first of those misses.
+    Errors are not counted as misses.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PDL_SPECULATIVE_CREDIT_BUDGET = int(os.getenv("PDL_SPECULATIVE_CREDIT_BUDGET", "10"))
+TIER_MAX_PARALLEL = int(os.getenv("TIER_MAX_PARALLEL", "3"))
+TIER_SKIP_AFTER_MISSES = int(os.getenv("TIER_SKIP_AFTER_MISSES", "3"))
+TIER_OUTCOME_TTL_SECONDS = int(os.getenv("TIER_OUTCOME_TTL_SECONDS", str(7 * 24 * 3600)))
+
+_tier_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="pdl-tier")
+
+
+@dataclass
+class Tier:
+    key: Hashable
+    run: Callable[[], list]
+    cost: int = 0                                # worst-case PDL credits (page size)
+    guard: Optional[Callable[[], bool]] = None   # evaluated at the tier's turn
+
+
+@dataclass
+class TierRun:
+    outcomes: Dict[Hashable, str] = field(default_factory=dict)
+    speculative_launches: int = 0
+
+    @property
+    def consumed(self) -> List[Hashable]:
+        return [k for k, v in self.outcomes.items() if v in ("hit", "miss", "error")]
+
+
+class TierOutcomes:
+    """Per-company run of consecutive empty results per search tier (per worker)."""
+
+    def __init__(self, max_companies: int = 5000, clock: Callable[[], float] = time.time):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, dict]" = OrderedDict()
+        self._max = max_companies
+        self._clock = clock
+
+    @staticmethod
+    def _key(kind: str, company: str) -> tuple:
+        return (kind, (company or "").strip().lower())
+
+    def record(self, kind: str, company: str, tier: Hashable, hit: bool) -> None:
+        if not company:
+            return
+        key = self._key(kind, company)
+        with self._lock:
+            tiers = self._entries.setdefault(key, {})
+            self._entries.move_to_end(key)
+            if hit:
+                tiers.pop(tier, None)
+            else:
+                misses, since = tiers.get(tier, (0, self._clock()))
+                tiers[tier] = (misses + 1, since)
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+
+    def never_hits(self, kind: str, company: str, tier: Hashable) -> bool:
+        if not company or TIER_SKIP_AFTER_MISSES <= 0:
+            return False
+        with self._lock:
+            tiers = self._entries.get(self._key(kind, company)) or {}
+            misses, since = tiers.get(tier, (0, 0.0))
+            if misses < TIER_SKIP_AFTER_MISSES:
+                return False
+            if self._clock() - since >= TIER_OUTCOME_TTL_SECONDS:
+                # Stale verdict: give the tier another chance.
+                del tiers[tier]
+                return False
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+TIER_OUTCOMES = TierOutcomes()
+
+
+def run_tiers(
+    tiers: List[Tier],
+    accept: Callable[[Tier, list], bool],
+    *,
+    kind: str,
+    company: str,
+    credit_budget: Optional[int] = None,
+    max_parallel: Optional[int] = None,
+    outcomes: Optional[TierOutcomes] = None,
+    log_prefix: str = "[TieredSearch]",
+) -> TierRun:
+    """Run `tiers` in priority order with bounded speculation.
+
+    `accept(tier, results)` is called once per tier whose turn comes
+    (results are [] when the tier errored) and returns True when the quota
+    is filled. Outcome per tier key: hit / miss / error / skipped (history
+    or guard) / cancelled / discarded.
+    """
+    budget = PDL_SPECULATIVE_CREDIT_BUDGET if credit_budget is None else credit_budget
+    parallel = max(1, TIER_MAX_PARALLEL if max_parallel is None else max_parallel)
+    outcomes = TIER_OUTCOMES if outcomes is None else outcomes
+    run = TierRun()
+
+    pending: List[Tier] = []
+    for tier in tiers:
+        if outcomes.never_hits(kind, company, tier.key):
+            run.outcomes[tier.key] = "skipped"
+            print(f"{log_prefix} Skipping tier {tier.key} at {company} (no hits in recent searches)")
+        else:
+            pending.append(tier)
+
+    futures: Dict[Hashable, object] = {}
+    speculative: Dict[Hashable, int] = {}  # tier key -> reserved credits
+
+    def _record(tier: Tier):
+        def _done(fut):
+            if fut.cancelled() or fut.exception() is not None:
+                return
+            outcomes.record(kind, company, tier.key, bool(fut.result()))
+        return _done
+
+    def _launch(tier: Tier) -> None:
+        futures[tier.key] = _tier_pool.submit(tier.run)
+
+    def _speculate(start: int) -> None:
+        for tier in pending[start:]:
+            if tier.key in futures or tier.guard is not None:
+                continue
+            in_flight = sum(1 for f in futures.values() if not f.done())
+            if in_flight >= parallel or sum(speculative.values()) + tier.cost > budget:
+                return
+            speculative[tier.key] = tier.cost
+            run.speculative_launches += 1
+            _launch(tier)
+
+    filled = False
+    for i, tier in enumerate(pending):
+        if filled:
+            fut = futures.get(tier.key)
+            if fut is None:
+                run.outcomes[tier.key] = "not_run"
+            elif fut.cancel():
+                run.outcomes[tier.key] = "cancelled"
+            else:
+                run.outcomes[tier.key] = "discarded"
+                fut.add_done_callback(_record(tier))  # still worth remembering
+            continue
+
+        if tier.key not in futures:
+            if tier.guard is not None and not tier.guard():
+                run.outcomes[tier.key] = "skipped"
+                continue
+            _launch(tier)
+        speculative.pop(tier.key, None)  # the serial chain needs this tier
+        _speculate(i + 1)
+
+        try:
+            results = futures[tier.key].result() or []
+            run.outcomes[tier.key] = "hit" if results else "miss"
+            outcomes.record(kind, company, tier.key, bool(results))
+        except Exception as e:
+            print(f"{log_prefix} Error searching tier {tier.key}: {e}")
+            results = []
+            run.outcomes[tier.key] = "error"
+
+        filled = bool(accept(tier, results))
+
+    if run.speculative_launches:
+        logger.info("%s %s: outcomes=%s speculative=%d", log_prefix, company,
+                    run.outcomes, run.speculative_launches)
+    return run
@@ -2,12 +2,21 @@
 Async runner utility for Flask sync routes.
 Safely runs async coroutines in a dedicated event loop within a thread pool.
 This prevents nested event loop conflicts when Flask routes call async service methods.
+
+Long-lived work (SSE streams) goes to the shared loop instead: one daemon
+thread per process runs a single event loop forever, and `submit` schedules
+coroutines on it. A stream then costs a task on that loop rather than an OS
+thread plus a freshly built loop, so concurrent streams are bounded by I/O,
+not thread count. Coroutines on the shared loop must never block - a blocking
+call stalls every other stream in the process.
 """
 from __future__ import annotations
 
 import asyncio
 import concurrent.futures
-from typing import Any, Coroutine, Optional
+import os
+import threading
+from typing import Any, Callable, Coroutine, Optional
 from functools import wraps
 
 
@@ -53,3 +62,70 @@ def run_async(coro: Coroutine, timeout: Optional[float] = None) -> Any:
     future = _thread_pool.submit(run_in_thread)
     return future.result(timeout=timeout + 5.0 if timeout else None)  # Add buffer for thread overhead
 
+
+# ---------------------------------------------------------------------------
+# Shared long-lived loop
+# ---------------------------------------------------------------------------
+
+_shared_loop: Optional[asyncio.AbstractEventLoop] = None
+_shared_loop_pid: Optional[int] = None
+_shared_loop_lock = threading.Lock()
+# Objects bound to the shared loop (e.g. AsyncOpenAI clients, whose httpx
+# pool can't cross loops). Reset together with the loop.
+_shared_resources: dict = {}
+
+
+def shared_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide background loop, starting it on first use.
+
+    Restarted after a fork (gunicorn preload): the parent's loop thread does
+    not exist in the child.
+    """
+    global _shared_loop, _shared_loop_pid
+    pid = os.getpid()
+    if _shared_loop is not None and _shared_loop_pid == pid:
+        return _shared_loop
+    with _shared_loop_lock:
+        if _shared_loop is not None and _shared_loop_pid == pid:
+            return _shared_loop
+        loop = asyncio.new_event_loop()
+        threading.Thread(
+            target=_run_shared_loop,
+            args=(loop,),
+            daemon=True,
+            name="async_runner-shared-loop",
+        ).start()
+        _shared_resources.clear()
+        _shared_loop, _shared_loop_pid = loop, pid
+        return loop
+
+
+def _run_shared_loop(loop: asyncio.AbstractEventLoop) -> None:
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+def submit(coro: Coroutine) -> concurrent.futures.Future:
+    """Schedule a coroutine on the shared loop without waiting for it.
+
+    Cancelling the returned future cancels the task on the loop.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, shared_loop())
+
+
+def on_shared_loop() -> bool:
+    """True when called from a coroutine running on the shared loop."""
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return running is _shared_loop
+
+
+def shared_loop_resource(name: str, factory: Callable[[], Any]) -> Any:
+    """Get-or-create an object bound to the shared loop. Only call from a
+    coroutine running on that loop (so no locking is needed)."""
+    if name not in _shared_resources:
+        _shared_resources[name] = factory()
+    return _shared_resources[name]
+
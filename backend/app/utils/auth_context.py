@@ -0,0 +1,191 @@
+"""
+Auth context — verified-token cache and request-scoped user-doc loader.
+
+The SPA fires many API calls per page view with the same Firebase ID token,
+and every one of them paid for a signature check (plus the network-retry
+loop around it) in require_firebase_auth. require_tier then read users/{uid},
+and most handlers read that same doc again.
+
+Token cache:
+  Keyed by SHA-256 of the raw token, so tokens are never held as dict keys.
+  An entry expires at the token's own `exp` (minus a small safety margin) or
+  after AUTH_TOKEN_CACHE_TTL seconds, whichever comes first, and is never
+  served past `exp`. Bounded LRU (AUTH_TOKEN_CACHE_MAX entries). Only tokens
+  that verified successfully are cached; failures always re-verify.
+  AUTH_TOKEN_CACHE_ENABLED=false turns it off.
+
+User-doc loader:
+  get_request_user_doc(uid) fetches users/{uid} at most once per request and
+  memoizes the snapshot on flask.g, so decorators and the handler share it.
+  Handlers that write the doc and need to re-read it call
+  invalidate_request_user_doc(uid).
+
+auth_cache_stats() exposes hit/miss counters for both.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from flask import g, has_request_context
+
+TOKEN_CACHE_MAX = int(os.getenv("AUTH_TOKEN_CACHE_MAX", "10000"))
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("AUTH_TOKEN_CACHE_TTL", "300"))
+# Stop serving a cached token this long before its exp, so a request that
+# passes here can't be handed to downstream code with an already-dead token.
+EXP_MARGIN_SECONDS = 5
+
+
+def _enabled() -> bool:
+    return os.getenv("AUTH_TOKEN_CACHE_ENABLED", "true").lower() == "true"
+
+
+class TokenCache:
+    """Bounded, expiry-aware LRU of decoded ID tokens."""
+
+    def __init__(
+        self,
+        max_entries: int = TOKEN_CACHE_MAX,
+        ttl_seconds: int = TOKEN_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(id_token: str) -> str:
+        return hashlib.sha256(id_token.encode("utf-8")).hexdigest()
+
+    def get(self, id_token: str) -> Optional[dict]:
+        k = self.key(id_token)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(k)
+            if entry is None:
+                self.misses += 1
+                return None
+            decoded, expires_at = entry
+            if now >= expires_at:
+                del self._entries[k]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(k)
+            self.hits += 1
+            # Copy so a handler mutating request.firebase_user can't
+            # change what the next request sees.
+            return dict(decoded)
+
+    def put(self, id_token: str, decoded: dict) -> None:
+        try:
+            exp = float(decoded.get("exp"))
+        except (TypeError, ValueError):
+            return  # No usable exp: never cache.
+        now = self.clock()
+        expires_at = min(exp - EXP_MARGIN_SECONDS, now + self.ttl_seconds)
+        if expires_at <= now:
+            return
+        k = self.key(id_token)
+        with self._lock:
+            self._entries[k] = (dict(decoded), expires_at)
+            self._entries.move_to_end(k)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.expired = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+
+token_cache = TokenCache()
+
+
+def verify_id_token_cached(id_token: str, verify: Callable[..., dict]) -> dict:
+    """Return the decoded token, verifying with `verify` only on a cache miss.
+
+    `verify` is fb_auth.verify_id_token (passed in so the caller's retry and
+    error handling see exactly the same exceptions as before).
+    """
+    if _enabled():
+        decoded = token_cache.get(id_token)
+        if decoded is not None:
+            return decoded
+    decoded = verify(id_token, clock_skew_seconds=5)
+    if _enabled():
+        token_cache.put(id_token, decoded)
+    return decoded
+
+
+# ---------------------------------------------------------------------------
+# Request-scoped users/{uid} loader
+# ---------------------------------------------------------------------------
+
+_user_doc_stats = {"hits": 0, "misses": 0}
+_user_doc_stats_lock = threading.Lock()
+
+
+def _bump(name: str) -> None:
+    with _user_doc_stats_lock:
+        _user_doc_stats[name] += 1
+
+
+def get_request_user_doc(uid: str, db: Any = None):
+    """users/{uid} snapshot, read at most once per request.
+
+    Outside a request context this is a plain read. Raises whatever the
+    Firestore get() raises; failures are not memoized.
+    """
+    if db is None:
+        from app.extensions import get_db
+        db = get_db()
+    if not has_request_context():
+        return db.collection("users").document(uid).get()
+    cache = g.setdefault("_user_docs", {})
+    if uid in cache:
+        _bump("hits")
+        return cache[uid]
+    _bump("misses")
+    snap = db.collection("users").document(uid).get()
+    cache[uid] = snap
+    return snap
+
+
+def invalidate_request_user_doc(uid: str) -> None:
+    if has_request_context():
+        g.get("_user_docs", {}).pop(uid, None)
+
+
+def auth_cache_stats() -> dict:
+    with _user_doc_stats_lock:
+        user_docs = dict(_user_doc_stats)
+    return {"token_cache": token_cache.stats(), "user_doc": user_docs}
+
+
+def reset_auth_cache() -> None:
+    token_cache.clear()
+    with _user_doc_stats_lock:
+        for k in _user_doc_stats:
+            _user_doc_stats[k] = 0
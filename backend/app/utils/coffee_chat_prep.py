@@ -4,27 +4,55 @@ Coffee chat prep utilities - similarity, questions, cheat sheet, strategy genera
 import json
 import logging
 import re
+from dataclasses import dataclass
 
 from app.services.openai_client import get_openai_client
+from app.utils.scoring_profile import university_variants
 from app.utils.users import (
     extract_hometown_from_resume,
     extract_companies_from_resume,
     get_university_shorthand,
     get_university_mascot,
-    get_university_variants,
 )
 
 logger = logging.getLogger(__name__)
 
 
-def detect_commonality(user_info, contact, resume_text):
+@dataclass(frozen=True)
+class CommonalityUser:
+    """User side of detect_commonality, compiled once per batch."""
+    university: str
+    university_variants: frozenset
+    hometown: str
+    companies_lower: tuple
+    resume_mentions_intern: bool
+
+
+def compile_commonality_user(user_info, resume_text):
+    """Run the resume regexes and university lookup once, not per contact."""
+    user_university = (user_info.get('university', '') or '').strip()
+    return CommonalityUser(
+        university=user_university,
+        university_variants=university_variants(user_university) if user_university else frozenset(),
+        hometown=extract_hometown_from_resume(resume_text or '') or '',
+        companies_lower=tuple(
+            uc.lower() for uc in extract_companies_from_resume(resume_text or '') if uc
+        ),
+        resume_mentions_intern='intern' in (resume_text or '').lower(),
+    )
+
+
+def detect_commonality(user_info, contact, resume_text, compiled=None):
     """
     Detect strongest commonality between user and contact.
     Handles both legacy field names (College, Company, City) and
     PDL-enriched field names (educationArray, company, city, location).
+    Pass ``compiled`` (compile_commonality_user) when scoring a batch.
     Returns: (commonality_type, details_dict)
     """
-    user_university = (user_info.get('university', '') or '').strip()
+    if compiled is None:
+        compiled = compile_commonality_user(user_info, resume_text)
+    user_university = compiled.university
 
     # Build contact education string and extract individual school names
     edu_parts = []
@@ -57,13 +85,13 @@ def detect_commonality(user_info, contact, resume_text):
 
     # 1. Check same university (STRONGEST commonality)
     if user_university:
-        user_uni_variants = get_university_variants(user_university)
+        user_uni_variants = compiled.university_variants
         # Check if any user variant is a substring of the contact education blob
         matched = any(v in contact_education for v in user_uni_variants)
         # Also check variant overlap with each individual school name
         if not matched:
             for school in contact_schools:
-                if user_uni_variants & get_university_variants(school):
+                if user_uni_variants & university_variants(school):
                     matched = True
                     break
         if matched:
@@ -74,7 +102,7 @@ def detect_commonality(user_info, contact, resume_text):
             })
 
     # 2. Check same hometown
-    user_hometown = extract_hometown_from_resume(resume_text or '')
+    user_hometown = compiled.hometown
     # PDL uses lowercase 'city'/'location', legacy uses 'City'
     contact_city = (
         contact.get('city', '') or contact.get('City', '')
@@ -86,10 +114,9 @@ def detect_commonality(user_info, contact, resume_text):
         })
 
     # 3. Check same company/internship
-    user_companies = extract_companies_from_resume(resume_text or '')
-    if contact_company and any(uc.lower() in contact_company for uc in user_companies if uc):
-        connection_type = 'interned' if 'intern' in (resume_text or '').lower() else 'worked'
-        role_type = 'Intern' if 'intern' in (resume_text or '').lower() else 'Team Member'
+    if contact_company and any(uc in contact_company for uc in compiled.companies_lower):
+        connection_type = 'interned' if compiled.resume_mentions_intern else 'worked'
+        role_type = 'Intern' if compiled.resume_mentions_intern else 'Team Member'
         return ('company', {
             'company': contact.get('company', '') or contact.get('Company', ''),
             'connection_type': connection_type,
@@ -0,0 +1,178 @@
+"""
+In-process import profiler.
+
+`python -X importtime` reports the same numbers, but only when the
+interpreter was started with the flag, and only as text on stderr. This
+hooks sys.meta_path instead, so wsgi.py and worker.py can record what their
+own boot imported (STARTUP_IMPORT_PROFILE=true logs the most expensive
+modules) and tests/test_startup.py can hold create_app to an import budget.
+
+Each imported module gets one ImportRecord:
+  cumulative_ms  time spent executing the module, including the imports
+                 it triggered
+  self_ms        cumulative_ms minus those nested imports
+  depth          nesting level among the recorded imports (0 = imported
+                 directly by the profiled code)
+
+Only module execution is timed (not path scanning), and builtin / frozen
+modules are skipped; both are small next to executing real modules.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from importlib.abc import MetaPathFinder
+from typing import List, Optional
+
+STARTUP_IMPORT_PROFILE = os.getenv("STARTUP_IMPORT_PROFILE", "false").lower() == "true"
+STARTUP_IMPORT_PROFILE_TOP = int(os.getenv("STARTUP_IMPORT_PROFILE_TOP", "25"))
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    cumulative_ms: float
+    self_ms: float
+    depth: int
+
+
+class ImportProfiler(MetaPathFinder):
+    """Times every module executed while installed. Use as a context
+    manager, or install() / uninstall() around a boot sequence."""
+
+    def __init__(self):
+        self.records: List[ImportRecord] = []
+        self.elapsed_ms = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started: Optional[float] = None
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def install(self) -> "ImportProfiler":
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+            self._started = time.perf_counter()
+        return self
+
+    def uninstall(self) -> "ImportProfiler":
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+            self.elapsed_ms = (time.perf_counter() - self._started) * 1000.0
+        return self
+
+    def __enter__(self) -> "ImportProfiler":
+        return self.install()
+
+    def __exit__(self, *exc) -> None:
+        self.uninstall()
+
+    # -- finder ------------------------------------------------------------
+
+    def find_spec(self, fullname, path=None, target=None):
+        # Ask the real finders (skipping ourselves), then time the loader.
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._local.finding = False
+
+        loader = getattr(spec, "loader", None)
+        if (
+            loader is None
+            or isinstance(loader, type)              # BuiltinImporter / FrozenImporter
+            or not hasattr(loader, "exec_module")
+            or "exec_module" in vars(loader)         # shared loader, already wrapped
+        ):
+            return spec
+
+        # Shadow exec_module on this loader instance only, so the loader's
+        # type (which importlib.resources / pkg_resources look at) is intact.
+        real_exec = loader.exec_module
+
+        def exec_module(module):
+            stack = self._stack()
+            stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                real_exec(module)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                with self._lock:
+                    self.records.append(ImportRecord(
+                        name=fullname,
+                        cumulative_ms=elapsed * 1000.0,
+                        self_ms=(elapsed - nested) * 1000.0,
+                        depth=len(stack),
+                    ))
+                try:
+                    del loader.exec_module
+                except AttributeError:
+                    pass
+
+        loader.exec_module = exec_module
+        return spec
+
+    def _stack(self) -> List[float]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    # -- reporting ---------------------------------------------------------
+
+    @property
+    def total_ms(self) -> float:
+        """Time spent importing: the sum of the top-level imports."""
+        with self._lock:
+            return sum(r.cumulative_ms for r in self.records if r.depth == 0)
+
+    def modules(self) -> List[str]:
+        with self._lock:
+            return [r.name for r in self.records]
+
+    def top(self, n: int = 25, key: str = "self_ms") -> List[ImportRecord]:
+        with self._lock:
+            return sorted(self.records, key=lambda r: getattr(r, key), reverse=True)[:n]
+
+    def summary(self) -> dict:
+        return {
+            "modules": len(self.records),
+            "import_ms": round(self.total_ms, 1),
+            "elapsed_ms": round(self.elapsed_ms, 1),
+        }
+
+    def finish(self, logger: logging.Logger, label: str) -> None:
+        """Stop recording and log the report. No-op after the first call."""
+        if self in sys.meta_path:
+            self.uninstall()
+            self.log_report(logger, label)
+
+    def log_report(self, logger: logging.Logger, label: str, n: int = STARTUP_IMPORT_PROFILE_TOP) -> None:
+        s = self.summary()
+        logger.info("%s imported %d modules in %.0f ms (%.0f ms wall)",
+                    label, s["modules"], s["import_ms"], s["elapsed_ms"])
+        for r in self.top(n):
+            logger.info("  %8.1f ms self %8.1f ms cumulative  %s", r.self_ms, r.cumulative_ms, r.name)
+
+
+def boot_profiler() -> Optional[ImportProfiler]:
+    """Installed ImportProfiler when STARTUP_IMPORT_PROFILE=true, else None."""
+    if not STARTUP_IMPORT_PROFILE:
+        return None
+    return ImportProfiler().install()
@@ -0,0 +1,228 @@
+"""
+Lazy blueprint registration for wsgi.create_app.
+
+Importing every route module at boot pulls in the whole service graph
+(job_board, pdl_client, scout_assistant_service, Stripe, OpenAI, WeasyPrint
+...) before the process can answer a health check. That cost lands on every
+deploy, every autoscale cold start and every restart.
+
+LazyBlueprints wraps app.wsgi_app instead. Route modules are declared up
+front as RouteModule entries (module, blueprint attributes, URL prefixes)
+and stay unimported until:
+
+  - a request arrives whose path falls under one of the module's prefixes:
+    the module is imported and its blueprints registered before Flask
+    matches the URL, so the request is served normally; or
+  - the background preload thread, started by the first request the
+    process serves (the port is bound by then), gets to it.
+
+Modules that share a prefix are loaded together, in declaration order,
+so registration order between them is the same as in an eager boot. A
+nested prefix (/api/contacts/import under /api/contacts) does not merge
+groups: a request under it matches both modules and loads both, again in
+declaration order, while the rest of the parent's namespace loads only the
+parent.
+
+Broken deploys must still fail loudly. At construction every module is
+located and its code compiled (from the bytecode cache when fresh), so a
+missing or syntactically broken route module still fails the boot. A
+module that compiles but raises on import (a missing dependency, a bad
+config read) is logged, its routes 404, and it is listed in `failed`,
+which /health and /healthz report as unhealthy (route_load_failures).
+
+Flask refuses setup calls once it has handled a request; registration here
+lifts that guard, since adding rules between requests is exactly what this
+is for. Werkzeug's url map is not safe to match against while rules are
+being added, so until every module is loaded, URL matching and
+registration share a lock (imports happen outside it; matching is
+microseconds). Once loaded, requests take the stock Flask path.
+"""
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+STARTUP_LAZY_ROUTES = os.getenv("STARTUP_LAZY_ROUTES", "true").lower() == "true"
+STARTUP_PRELOAD_ROUTES = os.getenv("STARTUP_PRELOAD_ROUTES", "true").lower() == "true"
+
+
+@dataclass(frozen=True)
+class RouteModule:
+    module: str                     # module name under the routes package
+    blueprints: Tuple[str, ...]     # blueprint attributes to register, in order
+    prefixes: Tuple[str, ...]       # URL prefixes every one of its rules lives under
+
+    def matches(self, path: str) -> bool:
+        return any(path == p or path.startswith(p + "/") for p in self.prefixes)
+
+
+def register_route_modules(app, modules: Sequence[RouteModule], package: str) -> None:
+    """Import and register modules now (the eager path)."""
+    for route_module in modules:
+        module = importlib.import_module(f"{package}.{route_module.module}")
+        for name in route_module.blueprints:
+            app.register_blueprint(getattr(module, name))
+
+
+def _overlap_groups(modules: Sequence[RouteModule]) -> List[List[RouteModule]]:
+    """Partition modules so any two sharing a prefix (directly or through a
+    third) land in the same group. Groups keep declaration order."""
+    parent = list(range(len(modules)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner: Dict[str, int] = {}
+    for i, m in enumerate(modules):
+        for p in m.prefixes:
+            if p in owner:
+                parent[find(i)] = find(owner[p])
+            else:
+                owner[p] = i
+
+    groups: Dict[int, List[RouteModule]] = {}
+    for i, m in enumerate(modules):
+        groups.setdefault(find(i), []).append(m)
+    return sorted(groups.values(), key=lambda g: modules.index(g[0]))
+
+
+class LazyBlueprints:
+    """Registers RouteModule blueprints on first use. See module docstring."""
+
+    def __init__(self, app, modules: Sequence[RouteModule], package: str, *, preload: bool = True):
+        self.app = app
+        self.package = package
+        self.preload = preload
+        self.loaded: Dict[str, float] = {}        # module -> import+register ms
+        self.failed: Dict[str, str] = {}          # module -> error
+        self._verify(modules)
+        self._groups = _overlap_groups(list(modules))
+        self._lock = threading.RLock()           # loading
+        self._map_lock = threading.Lock()        # url_map: matching vs adding rules
+        self._preload_thread: Optional[threading.Thread] = None
+        self._wsgi_app = app.wsgi_app
+        self._create_url_adapter = app.create_url_adapter
+        app.wsgi_app = self
+        app.create_url_adapter = self._url_adapter
+        app.extensions["lazy_blueprints"] = self
+
+    def _verify(self, modules: Sequence[RouteModule]) -> None:
+        """Fail the boot now for modules that could never load."""
+        for route_module in modules:
+            name = f"{self.package}.{route_module.module}"
+            spec = importlib.util.find_spec(name)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"Route module {name} not found", name=name)
+            get_code = getattr(spec.loader, "get_code", None)
+            if get_code is not None:
+                get_code(name)  # SyntaxError for a broken file
+
+    # -- WSGI --------------------------------------------------------------
+
+    def __call__(self, environ, start_response):
+        if self._groups:
+            self.load_for_path(environ.get("PATH_INFO", ""))
+            if self.preload:
+                self._start_preload()
+        return self._wsgi_app(environ, start_response)
+
+    def _url_adapter(self, request):
+        adapter = self._create_url_adapter(request)
+        if adapter is None or not self._groups:
+            return adapter
+        match = adapter.match
+
+        def locked_match(*args, **kwargs):
+            with self._map_lock:
+                return match(*args, **kwargs)
+
+        adapter.match = locked_match
+        return adapter
+
+    # -- loading -----------------------------------------------------------
+
+    def pending(self) -> List[str]:
+        with self._lock:
+            return [m.module for g in self._groups for m in g]
+
+    def load_for_path(self, path: str) -> None:
+        if not any(m.matches(path) for g in self._groups for m in g):
+            return
+        with self._lock:
+            for group in [g for g in self._groups if any(m.matches(path) for m in g)]:
+                self._load_group(group)
+
+    def load_all(self) -> None:
+        with self._lock:
+            for group in list(self._groups):
+                self._load_group(group)
+
+    def _load_group(self, group: List[RouteModule]) -> None:
+        if group not in self._groups:  # another caller got here first
+            return
+        for route_module in group:
+            self._load(route_module)
+        self._groups.remove(group)
+
+    def _load(self, route_module: RouteModule) -> None:
+        start = time.perf_counter()
+        try:
+            module = importlib.import_module(f"{self.package}.{route_module.module}")
+            blueprints = [getattr(module, name) for name in route_module.blueprints]
+        except Exception as e:
+            self.failed[route_module.module] = f"{type(e).__name__}: {e}"
+            logger.exception("Route module %s failed to load; its routes will 404", route_module.module)
+            return
+
+        app = self.app
+        with self._map_lock:
+            got_first_request = app._got_first_request
+            app._got_first_request = False
+            try:
+                for bp in blueprints:
+                    app.register_blueprint(bp)
+            finally:
+                app._got_first_request = got_first_request or app._got_first_request
+            app.url_map.update()
+        self.loaded[route_module.module] = (time.perf_counter() - start) * 1000.0
+        logger.info("Loaded route module %s in %.0f ms", route_module.module, self.loaded[route_module.module])
+
+    def _start_preload(self) -> None:
+        if self._preload_thread is not None:
+            return
+        with self._lock:
+            if self._preload_thread is not None:
+                return
+            self._preload_thread = threading.Thread(
+                target=self._run_preload, name="route-preload", daemon=True,
+            )
+            self._preload_thread.start()
+
+    def _run_preload(self) -> None:
+        start = time.perf_counter()
+        # One group at a time so on-demand loads can interleave.
+        while True:
+            with self._lock:
+                if not self._groups:
+                    break
+                self._load_group(self._groups[0])
+        logger.info("Preloaded route modules in %.0f ms (%d loaded, %d failed)",
+                    (time.perf_counter() - start) * 1000.0, len(self.loaded), len(self.failed))
+
+
+def route_load_failures(app) -> Dict[str, str]:
+    """Route modules that failed to import ({module: error}); {} when routes
+    were registered eagerly or everything loaded."""
+    lazy = app.extensions.get("lazy_blueprints")
+    return dict(lazy.failed) if lazy is not None else {}
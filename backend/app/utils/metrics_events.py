@@ -1,14 +1,20 @@
 """
 Fire-and-forget metrics event logging.
-All writes wrapped in try/except — never blocks request flow.
+All writes wrapped in try/except — never blocks request flow. Events are
+queued on METRICS_BUFFER (app/services/event_buffer.py) and committed in
+batches by a background flusher.
 """
 import logging
 from datetime import datetime, timezone
 from google.cloud.firestore_v1 import SERVER_TIMESTAMP
 from app.extensions import get_db
+from app.services.event_buffer import EventBuffer, PendingWrite, auto_id
 
 logger = logging.getLogger(__name__)
 
+# get_db is looked up at flush time so tests can patch it here.
+METRICS_BUFFER = EventBuffer("metrics_events", lambda: get_db())
+
 VALID_EVENT_TYPES = {
     "email_generated",
     "email_actually_sent",
@@ -31,18 +37,22 @@ VALID_EVENT_TYPES = {
 
 
 def log_event(uid, event_type, properties=None):
-    """Write a metrics event to Firestore. Swallows all errors."""
+    """Queue a metrics event for Firestore. Swallows all errors."""
     try:
         if event_type not in VALID_EVENT_TYPES:
             logger.warning("metrics log_event called with unknown event_type=%s", event_type)
             return
-        db = get_db()
-        db.collection("metrics_events").add({
-            "uid": uid or "unknown",
-            "event_type": event_type,
-            "properties": properties or {},
-            "timestamp": SERVER_TIMESTAMP,
-            "event_date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
-        })
+        METRICS_BUFFER.put(PendingWrite(
+            path=("metrics_events",),
+            doc_id=auto_id(),
+            data={
+                "uid": uid or "unknown",
+                "event_type": event_type,
+                "properties": properties or {},
+                # Resolved by Firestore at commit, i.e. flush time (seconds later).
+                "timestamp": SERVER_TIMESTAMP,
+                "event_date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+            },
+        ))
     except Exception:
         logger.exception("metrics log_event failed for event_type=%s uid=%s", event_type, uid)
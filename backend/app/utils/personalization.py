@@ -21,7 +21,13 @@ import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 
-from app.utils.users import get_university_shorthand, get_university_variants
+from app.utils.scoring_profile import (
+    ContactFeatures,
+    UserMatchers,
+    compile_user_matchers,
+    university_variants,
+)
+from app.utils.users import get_university_shorthand
 
 logger = logging.getLogger(__name__)
 
@@ -414,17 +420,23 @@ def _extract_personal_facts(note: str) -> list[str]:
     return facts
 
 
-def _schools_match(user_university: str, contact_school_name: str) -> bool:
+def _schools_match(
+    user_university: str,
+    contact_school_name: str,
+    user_variants: frozenset | None = None,
+) -> bool:
     """Exact match via university variant sets.
 
     "USC" matches "University of Southern California" (alias map).
     "University of Southern California" does NOT match "University of
     Southern Mississippi" (different variant sets, no intersection).
+    ``user_variants`` is the user's precompiled variant set, if any.
     """
     if not user_university or not contact_school_name:
         return False
-    return bool(get_university_variants(user_university)
-                & get_university_variants(contact_school_name))
+    if user_variants is None:
+        user_variants = university_variants(user_university)
+    return bool(user_variants & university_variants(contact_school_name))
 
 
 def _majors_match(user_variants: set[str], contact_variants: set[str]) -> bool:
@@ -845,19 +857,25 @@ def build_contact_profile(contact: dict) -> NormalizedContactProfile:
 def _detect_all_signals(
     user: NormalizedUserProfile,
     contact: NormalizedContactProfile,
+    matchers: UserMatchers | None = None,
 ) -> list[dict]:
     """Detect all commonality signals between user and contact.
 
     Returns list of signal dicts. NOT yet sorted by priority -- caller
     sorts via LEAD_TYPE_PRIORITY.
 
+    ``matchers`` is the user's compiled match data (compile_user_matchers);
+    batch callers build it once instead of per contact.
+
     Each signal: {type, hook, detail, instruction, avoid}
     """
+    if matchers is None:
+        matchers = compile_user_matchers(user)
     signals: list[dict] = []
 
     # 1. Alumni -----------------------------------------------------------
     for school in contact.schools:
-        if _schools_match(user.university, school["name"]):
+        if _schools_match(user.university, school["name"], matchers.university_variants):
             contact_major = school.get("major", "")
             hook_parts = [f"Fellow {user.university_short} alum"]
             if contact_major:
@@ -1222,10 +1240,7 @@ def _detect_all_signals(
         })
 
     # 9c. LinkedIn interest overlap ---------------------------------------
-    user_interest_pool = set(user.skills_lower) | set(user.extracurriculars_lower)
-    if user.career_track:
-        user_interest_pool.add(user.career_track.lower().strip())
-    li_overlap = user_interest_pool & contact.linkedin_interests_lower
+    li_overlap = matchers.interest_pool & contact.linkedin_interests_lower
     if li_overlap:
         shared = sorted(li_overlap)[:3]
         hook = f"Shared LinkedIn interests: {', '.join(shared)}"
@@ -1276,11 +1291,7 @@ def _detect_all_signals(
 
     # 10. Role match ------------------------------------------------------
     if user.career_track and contact.title_lower:
-        from app.utils.industry_classifier import (
-            INDUSTRY_KEYWORDS, normalize_career_track,
-        )
-        canonical = normalize_career_track(user.career_track)
-        keywords = INDUSTRY_KEYWORDS.get(canonical, [user.career_track])
+        keywords = matchers.industry_keywords
         searchable = f"{contact.title_lower} {contact.company_normalized}"
         if any(kw in searchable for kw in keywords):
             hook = (
@@ -1362,6 +1373,7 @@ def build_personalization_strategy(
     user: NormalizedUserProfile,
     contact: NormalizedContactProfile,
     base_warmth_tier: str = "cold",
+    matchers: UserMatchers | None = None,
 ) -> PersonalizationStrategy:
     """Build PersonalizationStrategy for one contact.
 
@@ -1370,12 +1382,13 @@ def build_personalization_strategy(
         contact: Normalized contact profile.
         base_warmth_tier: Base tier from warmth_scoring.py. Lead type
             can upgrade but never downgrade.
+        matchers: Compiled user match data, shared across a batch.
 
     Returns:
         PersonalizationStrategy. Gracefully returns a ``general``
         strategy when no signals are detected.
     """
-    signals = _detect_all_signals(user, contact)
+    signals = _detect_all_signals(user, contact, matchers)
 
     # --- General fallback ------------------------------------------------
     if not signals:
@@ -1466,6 +1479,7 @@ def build_batch_strategies(
     user: NormalizedUserProfile,
     contacts: list[dict],
     warmth_data: dict | None = None,
+    features: list[ContactFeatures] | None = None,
 ) -> dict[int, PersonalizationStrategy]:
     """Build PersonalizationStrategy for every contact in a batch.
 
@@ -1474,18 +1488,27 @@ def build_batch_strategies(
         contacts: Raw contact dicts (PDL or legacy format).
         warmth_data: Output of ``score_contacts_for_email``
             (keyed by index).
+        features: ContactFeatures for ``contacts`` (same order) when the
+            caller already normalized them, e.g. for warmth scoring.
 
     Returns:
         {0: PersonalizationStrategy, 1: ..., ...}
     """
     warmth_data = warmth_data or {}
+    if features is not None and len(features) != len(contacts):
+        features = None  # misaligned; normalize per contact instead
     result: dict[int, PersonalizationStrategy] = {}
+    try:
+        matchers = compile_user_matchers(user)
+    except Exception:
+        matchers = None  # per-contact path below surfaces the error
 
     for i, raw_contact in enumerate(contacts):
         try:
-            cp = build_contact_profile(raw_contact)
+            record = features[i] if features is not None else ContactFeatures(raw_contact)
+            cp = record.profile
             base_tier = warmth_data.get(i, {}).get("tier", "cold")
-            strategy = build_personalization_strategy(user, cp, base_tier)
+            strategy = build_personalization_strategy(user, cp, base_tier, matchers)
             result[i] = strategy
         except Exception as exc:
             logger.warning(
@@ -0,0 +1,136 @@
+"""
+Shared scoring profile for warmth scoring and personalization.
+
+Both ``warmth_scoring.score_and_sort_contacts`` and
+``personalization.build_batch_strategies`` compare one user against a
+batch of contacts. Most of the string work they did per contact was
+really user-side work repeated N times:
+
+  - university variant sets (``get_university_variants`` walks the whole
+    UNIVERSITY_SHORTCUTS table on every call),
+  - resume hometown / company extraction (regex passes over the raw resume),
+  - career-track -> INDUSTRY_KEYWORDS resolution,
+  - search-title tokenization.
+
+This module compiles those once per batch (``UserMatchers`` for
+personalization; warmth keeps its comparison dict, which now carries the
+compiled pieces) and wraps each contact in a ``ContactFeatures`` record
+whose normalized views are computed lazily and at most once — lazily so
+that a malformed field only raises where the original scorer would have
+touched it.
+
+Results are unchanged: every compiled value is exactly what the per-contact
+code computed, just hoisted out of the loop.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+
+from app.utils.industry_classifier import INDUSTRY_KEYWORDS, normalize_career_track
+from app.utils.users import get_university_variants
+
+
+# Tokens ignored when matching a search title against a contact title.
+ROLE_STOPWORDS = frozenset({"at", "of", "in", "the", "a", "an", "and", "or", "for", "to"})
+
+
+@lru_cache(maxsize=4096)
+def university_variants(name: str) -> frozenset:
+    """Cached ``get_university_variants``. School names repeat heavily
+    across contacts (and searches), so the table walk runs once per name."""
+    return frozenset(get_university_variants(name))
+
+
+@lru_cache(maxsize=256)
+def industry_keywords(career_track: str, keep_empty: bool = False) -> tuple:
+    """INDUSTRY_KEYWORDS for a career track, falling back to the track itself.
+
+    ``keep_empty`` mirrors ``INDUSTRY_KEYWORDS.get(canonical, [track])``
+    (personalization); the default mirrors warmth's ``get(...) or [track]``."""
+    if not career_track:
+        return ()
+    canonical = normalize_career_track(career_track)
+    if keep_empty:
+        return tuple(INDUSTRY_KEYWORDS.get(canonical, [career_track]))
+    return tuple(INDUSTRY_KEYWORDS.get(canonical) or [career_track])
+
+
+def compile_search_titles(search_titles) -> tuple:
+    """(title, meaningful tokens) per normalized search title."""
+    return tuple(
+        (title, frozenset(title.split()) - ROLE_STOPWORDS)
+        for title in search_titles
+    )
+
+
+@dataclass(frozen=True)
+class UserMatchers:
+    """User-side values ``_detect_all_signals`` needs for every contact."""
+    university_variants: frozenset = frozenset()
+    industry_keywords: tuple = ()
+    interest_pool: frozenset = field(default_factory=frozenset)
+
+
+def compile_user_matchers(user) -> UserMatchers:
+    """Compile a NormalizedUserProfile for a batch of contacts."""
+    pool = set(user.skills_lower) | set(user.extracurriculars_lower)
+    if user.career_track:
+        pool.add(user.career_track.lower().strip())
+    return UserMatchers(
+        university_variants=university_variants(user.university) if user.university else frozenset(),
+        industry_keywords=(
+            industry_keywords(user.career_track, keep_empty=True) if user.career_track else ()
+        ),
+        interest_pool=frozenset(pool),
+    )
+
+
+class ContactFeatures:
+    """One contact, normalized once for every scorer that reads it.
+
+    Each view is computed on first access and reused: the warmth scorer's
+    field-aliased copy, the lowered company/title it compares against, and
+    the NormalizedContactProfile personalization builds."""
+
+    def __init__(self, contact: dict, *, prenormalized: bool = False):
+        self.raw = contact
+        if prenormalized:
+            # Already in scorer field names; skip the Firestore alias pass.
+            self.scoring = contact
+
+    @cached_property
+    def scoring(self) -> dict:
+        from app.utils.warmth_scoring import _normalize_contact_for_scoring
+        return _normalize_contact_for_scoring(self.raw)
+
+    @cached_property
+    def company_lower(self) -> str:
+        from app.utils.warmth_scoring import _get_field, _normalize
+        return _normalize(_get_field(self.scoring, "company", "Company"))
+
+    @cached_property
+    def title_lower(self) -> str:
+        from app.utils.warmth_scoring import _get_field, _normalize
+        return _normalize(_get_field(self.scoring, "title", "Title"))
+
+    @cached_property
+    def industry_searchable(self) -> str:
+        from app.utils.warmth_scoring import _normalize
+        c = self.scoring
+        return " ".join([
+            self.title_lower,
+            self.company_lower,
+            _normalize(c.get("headline", "")),
+            _normalize(c.get("Headline", "")),
+        ])
+
+    @cached_property
+    def profile(self):
+        from app.utils.personalization import build_contact_profile
+        return build_contact_profile(self.raw)
+
+
+def contact_features(contacts) -> list:
+    """Feature records for a batch, preserving order."""
+    return [ContactFeatures(c) for c in contacts]
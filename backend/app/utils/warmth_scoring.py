@@ -3,11 +3,21 @@ Warmth scoring module.
 
 Scores contacts by relevance to the user based on shared identity,
 career relevance, and data richness signals. Pure functions, no API calls.
+
+The user side is compiled once per batch into the comparison dict (see
+scoring_profile.py); each contact is normalized once into a
+``ContactFeatures`` record.
 """
 
-from app.utils.coffee_chat_prep import detect_commonality
+from app.utils.coffee_chat_prep import compile_commonality_user, detect_commonality
 from app.utils.contact_analysis import _detect_career_transition, _detect_tenure
-from app.utils.industry_classifier import INDUSTRY_KEYWORDS, normalize_career_track
+from app.utils.scoring_profile import (
+    ROLE_STOPWORDS,
+    ContactFeatures,
+    compile_search_titles,
+    contact_features,
+    industry_keywords,
+)
 from app.utils.users import get_university_shorthand
 
 
@@ -169,10 +179,14 @@ def _build_user_comparison_data(user_profile, search_context=None):
         "resume_text": resume_text,
         "user_info": user_info,
         "search_titles": search_titles,
+        # Compiled once here instead of per contact.
+        "commonality": compile_commonality_user(user_info, resume_text),
+        "industry_keywords": industry_keywords(_normalize(career_track)),
+        "search_title_tokens": compile_search_titles(search_titles),
     }
 
 
-def _score_shared_identity(comparison, contact):
+def _score_shared_identity(comparison, contact, features=None):
     """
     Compute shared-identity signals.
 
@@ -183,7 +197,8 @@ def _score_shared_identity(comparison, contact):
 
     # Same university (+20) ------------------------------------------------
     commonality_type, details = detect_commonality(
-        comparison["user_info"], contact, comparison["resume_text"]
+        comparison["user_info"], contact, comparison["resume_text"],
+        compiled=comparison.get("commonality"),
     )
     if commonality_type == "university":
         points += 20
@@ -234,7 +249,10 @@ def _score_shared_identity(comparison, contact):
         signals.append({"signal": "same_past_employer", "points": 15,
                         "detail": details.get("company", "")})
     else:
-        contact_company = _normalize(_get_field(contact, "company", "Company"))
+        contact_company = (
+            features.company_lower if features is not None
+            else _normalize(_get_field(contact, "company", "Company"))
+        )
         if contact_company and contact_company in comparison["past_companies"]:
             points += 15
             signals.append({"signal": "same_past_employer", "points": 15,
@@ -247,36 +265,38 @@ def _score_shared_identity(comparison, contact):
     return points, signals
 
 
-def _role_matches_industry(contact, career_track):
-    """Check if the contact's role/company matches the user's target industry."""
+def _role_matches_industry(contact, career_track, keywords=None):
+    """Check if the contact's role/company matches the user's target industry.
+
+    ``contact`` is a contact dict or a ContactFeatures record; ``keywords``
+    is the precompiled keyword tuple for ``career_track`` when available."""
     if not career_track:
         return False
 
     # Normalize user-facing career track (e.g. "investment banking") to
-    # canonical key (e.g. "investment_banking") for INDUSTRY_KEYWORDS lookup.
-    canonical = normalize_career_track(career_track)
-    keywords = INDUSTRY_KEYWORDS.get(canonical)
-    if not keywords:
-        # Treat the career track itself as a keyword
-        keywords = [career_track]
-
-    searchable = " ".join([
-        _normalize(_get_field(contact, "title", "Title")),
-        _normalize(_get_field(contact, "company", "Company")),
-        _normalize(contact.get("headline", "")),
-        _normalize(contact.get("Headline", "")),
-    ])
+    # canonical key (e.g. "investment_banking") for INDUSTRY_KEYWORDS lookup;
+    # the career track itself is the keyword when there's no mapping.
+    if keywords is None:
+        keywords = industry_keywords(career_track)
+
+    if not isinstance(contact, ContactFeatures):
+        contact = ContactFeatures(contact, prenormalized=True)
+    searchable = contact.industry_searchable
 
     return any(kw in searchable for kw in keywords)
 
 
-def _score_career_relevance(comparison, contact):
+def _score_career_relevance(comparison, contact, features=None):
     """Compute career-relevance signals."""
     points = 0
     signals = []
 
     # Role matches target industry (+15) -----------------------------------
-    if _role_matches_industry(contact, comparison["career_track"]):
+    if _role_matches_industry(
+        features if features is not None else contact,
+        comparison["career_track"],
+        comparison.get("industry_keywords"),
+    ):
         points += 15
         signals.append({"signal": "role_matches_industry", "points": 15,
                         "detail": comparison["career_track"]})
@@ -289,7 +309,10 @@ def _score_career_relevance(comparison, contact):
                         "detail": transition.get("value", "")})
 
     # Company on dream list (+10) ------------------------------------------
-    contact_company = _normalize(_get_field(contact, "company", "Company"))
+    contact_company = (
+        features.company_lower if features is not None
+        else _normalize(_get_field(contact, "company", "Company"))
+    )
     if contact_company and contact_company in comparison["dream_companies"]:
         points += 10
         signals.append({"signal": "dream_company", "points": 10,
@@ -308,7 +331,7 @@ def _score_career_relevance(comparison, contact):
     return points, signals
 
 
-def _score_role_match(comparison, contact):
+def _score_role_match(comparison, contact, features=None):
     """
     Check if the contact's title matches the role keywords from the search query.
 
@@ -323,16 +346,19 @@ def _score_role_match(comparison, contact):
         # No search context available, skip role matching
         return 0, [], None  # None means "not evaluated"
 
-    contact_title = _normalize(_get_field(contact, "title", "Title"))
+    contact_title = (
+        features.title_lower if features is not None
+        else _normalize(_get_field(contact, "title", "Title"))
+    )
     if not contact_title:
         return 0, [], False
 
     # Tokenize and check overlap
     contact_tokens = set(contact_title.split())
-    for search_title in search_titles:
-        search_tokens = set(search_title.split())
+    compiled = comparison.get("search_title_tokens") or compile_search_titles(search_titles)
+    for search_title, search_tokens in compiled:
         # Match if any meaningful token overlaps (skip very short tokens like "at", "of")
-        meaningful_overlap = search_tokens & contact_tokens - {"at", "of", "in", "the", "a", "an", "and", "or", "for", "to"}
+        meaningful_overlap = search_tokens & contact_tokens
         if meaningful_overlap:
             return 15, [{"signal": "role_match", "points": 15,
                          "detail": search_title}], True
@@ -440,7 +466,7 @@ def _compute_warmth_label(tier, role_matched, signals):
 # Public API
 # ---------------------------------------------------------------------------
 
-def compute_warmth_score(user_comparison, contact):
+def compute_warmth_score(user_comparison, contact, features=None):
     """
     Score a single contact against pre-built user comparison data.
 
@@ -450,6 +476,8 @@ def compute_warmth_score(user_comparison, contact):
         Output of ``_build_user_comparison_data``.
     contact : dict
         Contact record (legacy, PDL, or Firestore format).
+    features : ContactFeatures, optional
+        Cached normalization of *contact*, when the caller has one.
 
     Returns
     -------
@@ -457,16 +485,18 @@ def compute_warmth_score(user_comparison, contact):
         ``{"score": int, "tier": str, "signals": [...]}"``
     """
     # Normalize field names so Firestore-saved contacts work
-    contact = _normalize_contact_for_scoring(contact)
+    if features is None:
+        features = ContactFeatures(contact)
+    contact = features.scoring
     all_signals = []
 
-    identity_pts, identity_signals = _score_shared_identity(user_comparison, contact)
+    identity_pts, identity_signals = _score_shared_identity(user_comparison, contact, features)
     all_signals.extend(identity_signals)
 
-    career_pts, career_signals = _score_career_relevance(user_comparison, contact)
+    career_pts, career_signals = _score_career_relevance(user_comparison, contact, features)
     all_signals.extend(career_signals)
 
-    role_pts, role_signals, role_matched = _score_role_match(user_comparison, contact)
+    role_pts, role_signals, role_matched = _score_role_match(user_comparison, contact, features)
     all_signals.extend(role_signals)
 
     richness_pts, richness_signals = _score_data_richness(contact)
@@ -486,7 +516,7 @@ def compute_warmth_score(user_comparison, contact):
     }
 
 
-def score_and_sort_contacts(user_profile, contacts, search_context=None):
+def score_and_sort_contacts(user_profile, contacts, search_context=None, features=None):
     """
     Score every contact against *user_profile* and return them sorted
     descending by score.  Never filters contacts out.
@@ -499,6 +529,9 @@ def score_and_sort_contacts(user_profile, contacts, search_context=None):
         Contact records (legacy or PDL format).
     search_context : dict, optional
         Parsed query payload with ``title_variations`` and ``companies``.
+    features : list[ContactFeatures], optional
+        Records for *contacts* (same order), shared with the email
+        generator. Reordered in place to follow the returned list.
 
     Returns
     -------
@@ -508,28 +541,33 @@ def score_and_sort_contacts(user_profile, contacts, search_context=None):
         List is sorted highest score first.
     """
     comparison = _build_user_comparison_data(user_profile, search_context)
+    records = features if features is not None else contact_features(contacts)
 
     scored = []
-    for contact in contacts:
-        result = compute_warmth_score(comparison, contact)
+    for contact, record in zip(contacts, records):
+        result = compute_warmth_score(comparison, contact, record)
         contact["warmth_score"] = result["score"]
         contact["warmth_tier"] = result["tier"]
         contact["warmth_label"] = result.get("label", "")
         contact["warmth_signals"] = result["signals"]
-        scored.append(contact)
+        scored.append((contact, record))
 
-    scored.sort(key=lambda c: c["warmth_score"], reverse=True)
-    return scored
+    scored.sort(key=lambda pair: pair[0]["warmth_score"], reverse=True)
+    if features is not None:
+        features[:] = [record for _, record in scored]
+    return [contact for contact, _ in scored]
 
 
-def score_contacts_for_email(user_profile, contacts, search_context=None):
+def score_contacts_for_email(user_profile, contacts, search_context=None, features=None):
     """
     Score contacts and return warmth data dict keyed by contact index.
 
     This is the orchestration helper used by all callers of
     ``batch_generate_emails``.  It runs warmth scoring once per batch
     and packages the results so the email generator can select prompt
-    variants per contact.
+    variants per contact. Pass ``features`` (ContactFeatures for
+    *contacts*, same order) to share the normalization with
+    ``batch_generate_emails(contact_features=...)``.
 
     Returns
     -------
@@ -542,7 +580,9 @@ def score_contacts_for_email(user_profile, contacts, search_context=None):
         comparison = _build_user_comparison_data(user_profile, search_context)
         warmth_data = {}
         for i, contact in enumerate(contacts):
-            result = compute_warmth_score(comparison, contact)
+            result = compute_warmth_score(
+                comparison, contact, features[i] if features is not None else None
+            )
             warmth_data[i] = {
                 "tier": result["tier"],
                 "score": result["score"],
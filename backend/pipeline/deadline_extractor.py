@@ -10,11 +10,21 @@ it's a global recruiting cycle date ("MBB summer 2027 closes Oct 1") that
 Perplexity can synthesize from web context.
 
 This module fills the gap. It targets a fixed set of cycle-driven categories
-and only runs on jobs that don't yet have a deadline extracted. One
-Perplexity sonar call per job, ~$0.005 each, cached forever on the job doc.
+and only runs on jobs that don't yet have a deadline extracted.
+
+Consulting, IB and quant firms post many near-identical requisitions for one
+program (the same summer analyst program in six offices, one per coverage
+group), and they all share one deadline. So pending jobs are grouped into
+cohorts by canonical company + category + normalized program title
+(`cohort_key`), and each cohort costs one Perplexity sonar call (~$0.005),
+made from a small thread pool. The answer is fanned out to every member job
+in batched writes and stored in `deadline_cohorts`, so postings that land
+later in the same cohort are resolved from the cache without a call.
 
 Cost guardrails:
-- MAX_PERPLEXITY_PER_RUN caps each cron tick at 50 calls (~$0.25 / hour)
+- MAX_PERPLEXITY_PER_RUN caps each cron tick at 50 calls (~$0.25 / hour);
+  cohorts past the cap stay pending for the next tick, largest cohorts first
+- Cohort cache hits are free and don't count against the cap
 - Skips jobs already marked deadline_extraction_status='completed' or 'failed'
 - Skips jobs not in the cycle-driven category set
 - No-op when PERPLEXITY_API_KEY is unset
@@ -22,8 +32,11 @@ Cost guardrails:
 from __future__ import annotations
 
 import logging
+import os
 import re
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -40,10 +53,27 @@ CYCLE_DRIVEN_CATEGORIES = frozenset({
     "year_coded_analyst",
 })
 
-# Per-run cap. Hourly cron × 50 = 1200/day max, but in practice most jobs
-# hit the skip path after the first pass.
+# Per-run cap on Perplexity calls (one per cohort). Hourly cron × 50 =
+# 1200/day max, but in practice most jobs hit the skip path or the cohort
+# cache after the first pass.
 MAX_PERPLEXITY_PER_RUN = 50
 
+# Jobs pulled per run for cohort grouping. Larger than the call cap on
+# purpose: a 50-call budget covers every member of 50 cohorts.
+MAX_DEADLINE_JOBS_PER_RUN = int(os.getenv("DEADLINE_MAX_JOBS_PER_RUN", "400"))
+
+# Cohorts resolved in parallel. Sonar calls are 2-5s of waiting each.
+DEADLINE_CONCURRENCY = int(os.getenv("DEADLINE_EXTRACTOR_CONCURRENCY", "4"))
+
+# Cohort answers are reused this long. Recruiting cycles move once a year,
+# and the program year is part of the cohort key.
+COHORT_CACHE_COLLECTION = "deadline_cohorts"
+COHORT_CACHE_TTL_DAYS = int(os.getenv("DEADLINE_COHORT_CACHE_TTL_DAYS", "30"))
+
+# Firestore caps a batch at 500 writes; match writer.BATCH_WRITE_SIZE.
+BATCH_WRITE_SIZE = 400
+CACHE_READ_CHUNK = 300
+
 # Per-call cost estimate for budget tracking.
 PERPLEXITY_DEADLINE_COST_PER_CALL = 0.005
 
@@ -82,6 +112,177 @@ def _build_prompt(company: str, title: str, category: str) -> str:
     )
 
 
+# ---------------------------------------------------------------------------
+# Cohorts
+# ---------------------------------------------------------------------------
+
+# Title segments after " - ", " | ", commas or brackets are usually the
+# office or coverage group ("... Summer Analyst - New York", "(TMT Group)").
+# They're dropped unless they carry program signal (year, season, level).
+_TITLE_SEGMENT_SPLIT_RE = re.compile(r"\s+[-–—|]\s+|[,()\[\]]")
+_PROGRAM_SIGNAL_RE = re.compile(
+    r"\b(?:(?:19|20)\d{2}|summer|winter|spring|fall|autumn|off[\s-]?cycle|"
+    r"interns?|internships?|analysts?|associates?|full[\s-]?time|"
+    r"graduates?|new\s+grads?)\b",
+    re.I,
+)
+_REQ_ID_RE = re.compile(r"\b(?:req(?:uisition)?|job\s*id)\s*[#:]?\s*\w*\d\w*|#\s*\d+|\b[a-z]?\d{5,}\b", re.I)
+_TITLE_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_TITLE_TOKEN_ALIASES = {
+    "internship": "intern", "internships": "intern", "interns": "intern",
+    "analysts": "analyst", "associates": "associate",
+    "offcycle": "off cycle", "fulltime": "full time",
+}
+_TITLE_STOPWORDS = frozenset({"the", "a", "an", "of", "for", "and", "in", "program", "programme"})
+
+
+def normalize_program_title(title: str, company: str = "") -> str:
+    """Reduce a posting title to the program it recruits for.
+
+    Drops office / coverage-group segments, requisition ids, the company's
+    own name and filler words, then sorts the remaining tokens, so
+    "Goldman Sachs 2027 Summer Analyst Program - New York" and
+    "2027 Summer Analyst (Dallas)" both become "2027 analyst summer".
+    Year and season stay in: 2026 vs 2027 or summer vs off-cycle are
+    different cycles with different deadlines.
+    """
+    if not title:
+        return ""
+    segments = [seg for seg in _TITLE_SEGMENT_SPLIT_RE.split(title) if seg and seg.strip()]
+    if not segments:
+        return ""
+    kept = [segments[0]] + [seg for seg in segments[1:] if _PROGRAM_SIGNAL_RE.search(seg)]
+    text = _REQ_ID_RE.sub(" ", " ".join(kept).lower())
+
+    company_tokens = set(_TITLE_TOKEN_RE.findall((company or "").lower()))
+    tokens = set()
+    for tok in _TITLE_TOKEN_RE.findall(text):
+        for t in _TITLE_TOKEN_ALIASES.get(tok, tok).split():
+            if t not in _TITLE_STOPWORDS:
+                tokens.add(t)
+    program = tokens - company_tokens
+    return " ".join(sorted(program or tokens))
+
+
+def cohort_key(company: str, title: str, category: str) -> str:
+    """Firestore-safe cohort id: canonical company, category, program title."""
+    from backend.pipeline.normalizer import _canonical_key
+
+    program = normalize_program_title(title, company)
+    key = "--".join((
+        _canonical_key(company or ""),
+        (category or "").strip().lower(),
+        program.replace(" ", "-"),
+    ))
+    return key.replace("/", "-")
+
+
+@dataclass
+class DeadlineCohort:
+    key: str
+    company: str          # representative (newest) member's company / title,
+    title: str            # used for the Perplexity prompt
+    category: str
+    members: list = field(default_factory=list)  # [(doc_ref, data), ...]
+
+
+def group_cohorts(candidates: list) -> tuple[list, list]:
+    """Split candidates into (cohorts, unusable) where unusable jobs lack a
+    company or title. Cohorts keep first-seen order, so with newest-first
+    candidates the representative is the freshest posting."""
+    cohorts: dict[str, DeadlineCohort] = {}
+    unusable: list = []
+    for ref, data in candidates:
+        company = (data.get("company") or "").strip()
+        title = (data.get("title") or "").strip()
+        category = (data.get("category") or "").strip()
+        if not company or not title:
+            unusable.append((ref, data))
+            continue
+        key = cohort_key(company, title, category)
+        cohort = cohorts.get(key)
+        if cohort is None:
+            cohort = cohorts[key] = DeadlineCohort(key, company, title, category)
+        cohort.members.append((ref, data))
+    return list(cohorts.values()), unusable
+
+
+def _read_cohort_cache(db, keys: list) -> dict:
+    """Return {cohort_key: deadline_value} for fresh cache entries.
+
+    deadline_value is None for cohorts Perplexity answered 'unknown' — that
+    answer is cached too, so presence of the key is what counts as a hit.
+    """
+    hits: dict = {}
+    if not keys:
+        return hits
+    cutoff = datetime.now(timezone.utc) - timedelta(days=COHORT_CACHE_TTL_DAYS)
+    collection = db.collection(COHORT_CACHE_COLLECTION)
+    for i in range(0, len(keys), CACHE_READ_CHUNK):
+        refs = [collection.document(k) for k in keys[i : i + CACHE_READ_CHUNK]]
+        try:
+            docs = db.get_all(refs)
+        except Exception as e:
+            logger.warning("deadline cohort cache read failed: %s", e)
+            continue
+        for doc in docs:
+            if not doc.exists:
+                continue
+            data = doc.to_dict() or {}
+            resolved_at = data.get("resolved_at")
+            try:
+                if resolved_at is None:
+                    continue
+                if getattr(resolved_at, "tzinfo", None) is None:
+                    resolved_at = resolved_at.replace(tzinfo=timezone.utc)
+                if resolved_at < cutoff:
+                    continue
+            except Exception:
+                continue
+            hits[doc.id] = data.get("application_deadline")
+    return hits
+
+
+def _resolve_cohort(search, cohort: DeadlineCohort) -> tuple[Optional[str], str]:
+    """One Perplexity call for the whole cohort → (deadline_value, status)."""
+    prompt = _build_prompt(cohort.company, cohort.title, cohort.category)
+    try:
+        result = search(prompt)
+        content = (result or {}).get("content") or ""
+        return _parse_response(content)
+    except Exception as e:
+        logger.warning("Perplexity call failed for %s @ %s: %s", cohort.title, cohort.company, e)
+        return None, DEADLINE_FAILED
+
+
+def _commit_writes(db, writes: list) -> dict:
+    """Apply [(ref, payload, outcome), ...] in batches of BATCH_WRITE_SIZE.
+
+    outcome is the job's counter bucket ('completed' / 'failed' / 'skipped'),
+    or None for cohort-cache sets. A failed commit counts every job in that
+    batch as failed. Returns {completed, failed, skipped}.
+    """
+    counts = {DEADLINE_COMPLETED: 0, DEADLINE_FAILED: 0, DEADLINE_SKIPPED: 0}
+    for i in range(0, len(writes), BATCH_WRITE_SIZE):
+        chunk = writes[i : i + BATCH_WRITE_SIZE]
+        batch = db.batch()
+        for ref, payload, outcome in chunk:
+            if outcome is None:
+                batch.set(ref, payload, merge=True)
+            else:
+                batch.update(ref, payload)
+        jobs = [outcome for _, _, outcome in chunk if outcome is not None]
+        try:
+            batch.commit()
+        except Exception as e:
+            logger.warning("Deadline batch write failed (%d jobs): %s", len(jobs), e)
+            counts[DEADLINE_FAILED] += len(jobs)
+            continue
+        for outcome in jobs:
+            counts[outcome] += 1
+    return counts
+
+
 def _parse_response(content: str) -> tuple[Optional[str], str]:
     """Parse Perplexity's response into (deadline_value, status).
 
@@ -153,88 +354,102 @@ def _collect_pending(db, limit: int) -> list:
 
 
 def extract_deadlines(limit: int = MAX_PERPLEXITY_PER_RUN) -> dict:
-    """Extract application deadlines for up to `limit` cycle-driven jobs.
+    """Extract application deadlines for pending cycle-driven jobs, spending
+    at most `limit` Perplexity calls (one per uncached cohort).
 
-    Returns {processed, completed, failed, skipped, cost_estimate_usd}.
+    Returns {processed, completed, failed, skipped, cohorts, cache_hits,
+    perplexity_calls, deferred, cost_estimate_usd}; the job counters cover
+    every member written this run, `deferred` counts jobs whose cohort was
+    past the call cap.
     """
     from app.config import PERPLEXITY_API_KEY
     from app.extensions import get_db
     from app.services.perplexity_client import quick_search
 
+    empty = {
+        "processed": 0, "completed": 0, "failed": 0, "skipped": 0,
+        "cohorts": 0, "cache_hits": 0, "perplexity_calls": 0, "deferred": 0,
+        "cost_estimate_usd": 0.0,
+    }
     if not PERPLEXITY_API_KEY:
         logger.warning("PERPLEXITY_API_KEY not set; deadline extractor is a no-op")
-        return {
-            "processed": 0, "completed": 0, "failed": 0, "skipped": 0,
-            "cost_estimate_usd": 0.0,
-        }
+        return empty
 
     db = get_db()
     if not db:
         raise RuntimeError("Firestore not initialized")
 
     capped = min(max(1, limit), MAX_PERPLEXITY_PER_RUN)
-    candidates = _collect_pending(db, capped)
+    candidates = _collect_pending(db, max(capped, MAX_DEADLINE_JOBS_PER_RUN))
     if not candidates:
         logger.info("No cycle-driven jobs needing deadline extraction")
-        return {
-            "processed": 0, "completed": 0, "failed": 0, "skipped": 0,
-            "cost_estimate_usd": 0.0,
-        }
+        return empty
 
-    logger.info("Extracting deadlines for %d jobs", len(candidates))
-
-    completed = 0
-    failed = 0
-    skipped = 0
+    cohorts, unusable = group_cohorts(candidates)
+    cached = _read_cohort_cache(db, [c.key for c in cohorts])
     now = datetime.now(timezone.utc)
 
-    for ref, data in candidates:
-        company = (data.get("company") or "").strip()
-        title = (data.get("title") or "").strip()
-        category = (data.get("category") or "").strip()
-        if not company or not title:
-            try:
-                ref.update({"deadline_extraction_status": DEADLINE_SKIPPED})
-            except Exception:
-                pass
-            skipped += 1
-            continue
+    # Largest cohorts first so the call budget covers as many jobs as it can;
+    # sort is stable, so ties keep newest-first order.
+    uncached = sorted((c for c in cohorts if c.key not in cached), key=lambda c: -len(c.members))
+    to_resolve = uncached[:capped]
+    deferred = sum(len(c.members) for c in uncached[capped:])
 
-        prompt = _build_prompt(company, title, category)
-        try:
-            result = quick_search(prompt)
-            content = (result or {}).get("content") or ""
-            deadline_value, status = _parse_response(content)
-        except Exception as e:
-            logger.warning("Perplexity call failed for %s @ %s: %s", title, company, e)
-            deadline_value, status = None, DEADLINE_FAILED
+    logger.info(
+        "Extracting deadlines for %d jobs in %d cohorts (%d cached, %d to resolve, %d jobs deferred)",
+        len(candidates), len(cohorts), len(cohorts) - len(uncached), len(to_resolve), deferred,
+    )
 
+    resolved: dict = {key: (value, DEADLINE_COMPLETED) for key, value in cached.items()}
+    if to_resolve:
+        workers = max(1, min(DEADLINE_CONCURRENCY, len(to_resolve)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="deadline") as pool:
+            answers = pool.map(lambda c: _resolve_cohort(quick_search, c), to_resolve)
+            for cohort, answer in zip(to_resolve, answers):
+                resolved[cohort.key] = answer
+
+    writes: list = [
+        (ref, {"deadline_extraction_status": DEADLINE_SKIPPED}, DEADLINE_SKIPPED)
+        for ref, _ in unusable
+    ]
+    cache_collection = db.collection(COHORT_CACHE_COLLECTION)
+    for cohort in cohorts:
+        if cohort.key not in resolved:
+            continue
+        deadline_value, status = resolved[cohort.key]
         update = {
             "deadline_extraction_status": status,
             "deadline_extracted_at": now,
+            "deadline_cohort": cohort.key,
         }
         if deadline_value is not None:
             update["application_deadline"] = deadline_value
             update["deadline_source"] = "perplexity"
-
-        try:
-            ref.update(update)
-        except Exception as e:
-            logger.warning("Failed to write deadline for %s @ %s: %s", title, company, e)
-            failed += 1
-            continue
-
-        if status == DEADLINE_COMPLETED:
-            completed += 1
-        else:
-            failed += 1
-
+        writes.extend((ref, update, status) for ref, _ in cohort.members)
+        # Only fresh successful answers go to the cache; failures are retried
+        # by the next cohort that shows up.
+        if status == DEADLINE_COMPLETED and cohort.key not in cached:
+            writes.append((cache_collection.document(cohort.key), {
+                "cohort_key": cohort.key,
+                "company": cohort.company,
+                "title_sample": cohort.title,
+                "category": cohort.category,
+                "application_deadline": deadline_value,
+                "resolved_at": now,
+                "member_count": len(cohort.members),
+            }, None))
+
+    counts = _commit_writes(db, writes)
     result = {
-        "processed": len(candidates),
-        "completed": completed,
-        "failed": failed,
-        "skipped": skipped,
-        "cost_estimate_usd": round(len(candidates) * PERPLEXITY_DEADLINE_COST_PER_CALL, 4),
+        "processed": sum(counts.values()),
+        "completed": counts[DEADLINE_COMPLETED],
+        "failed": counts[DEADLINE_FAILED],
+        "skipped": counts[DEADLINE_SKIPPED],
+        "cohorts": len(cohorts),
+        "cache_hits": len(cohorts) - len(uncached),
+        "perplexity_calls": len(to_resolve),
+        "deferred": deferred,
+        "cost_estimate_usd": round(len(to_resolve) * PERPLEXITY_DEADLINE_COST_PER_CALL, 4),
     }
     logger.info("Deadline extraction complete: %s", result)
     return result
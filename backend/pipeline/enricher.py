@@ -6,10 +6,28 @@ structured fields (requirements, experience_level, salary_range, etc.),
 and writes them back to the job doc under the `structured` map.
 
 Designed to run as a cron decoupled from the main fetch pipeline so it can
-work through backlog between full-fetch cycles. Cross-user cache by
-apply_url lives in `enrichment_cache` (managed inside firecrawl_client),
-so duplicate-URL postings across sources only pay Firecrawl once per
-TTL window.
+work through backlog between full-fetch cycles.
+
+Work queue: candidates are grouped by canonical apply URL
+(`canonical_apply_url` drops tracking params, fragments and `/apply`
+suffixes), so cross-posted and duplicate jobs share one scrape. The raw
+extract for each URL is kept in `job_posting_extracts` for
+ENRICH_URL_CACHE_TTL_DAYS, so a posting that gets re-ingested after its
+job doc expired reuses the prior output instead of paying Firecrawl again
+(firecrawl_client's own `enrichment_cache` entry only lives 6 hours).
+Results for all members are committed through batched writes, flushed
+every ENRICH_FLUSH_EVERY_GROUPS scraped URLs or ENRICH_FLUSH_SECONDS,
+whichever comes first, so a run killed by the workflow timeout loses at
+most that much paid Firecrawl output.
+
+Backfill works off an indexed marker, not a scan per run: legacy jobs in
+the posted_at window are stamped enrichment_status='backfill' once
+(`_mark_backfill`), and each run pulls from that queue with an equality
+query like the cron path does. Since the writer stamps every new job, a
+stamping scan never needs repeating: `pipeline_state/enrich_backfill`
+records that the whole collection was scanned (or the oldest posted_at
+cutoff scanned), and later refills skip the scan. Delete that doc to force
+a rescan.
 
 Cost guardrails:
 - MAX_FIRECRAWL_PER_RUN hard caps each cron tick at 500 scrapes
@@ -20,10 +38,13 @@ Cost guardrails:
 """
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +60,7 @@ ENRICHMENT_PENDING = "pending"
 ENRICHMENT_COMPLETED = "completed"
 ENRICHMENT_FAILED = "failed"
 ENRICHMENT_SKIPPED = "skipped"  # no apply_url to scrape
+ENRICHMENT_BACKFILL = "backfill"  # legacy job queued by _mark_backfill
 
 # Rough Firecrawl per-scrape cost for budget tracking
 FIRECRAWL_COST_PER_SCRAPE = 0.003
@@ -48,6 +70,64 @@ FIRECRAWL_COST_PER_SCRAPE = 0.003
 # description. Tune via JOB_DESC_SCRAPE_WAIT_MS.
 DESC_SCRAPE_WAIT_MS = int(os.environ.get("JOB_DESC_SCRAPE_WAIT_MS", "8000"))
 
+# Per-URL extract cache. Jobs expire after 14 days; keeping extracts a bit
+# longer lets a re-ingested posting skip its scrape.
+URL_CACHE_COLLECTION = "job_posting_extracts"
+URL_CACHE_TTL_DAYS = int(os.environ.get("ENRICH_URL_CACHE_TTL_DAYS", "21"))
+
+# Records how much of `jobs` _mark_backfill has already stamped.
+BACKFILL_STATE_COLLECTION = "pipeline_state"
+BACKFILL_STATE_DOC = "enrich_backfill"
+
+# Firestore caps a batch at 500 writes; match writer.BATCH_WRITE_SIZE.
+BATCH_WRITE_SIZE = 400
+CACHE_READ_CHUNK = 300
+# Scrapes take ~10s each on the serial cron path; don't let results wait
+# for a full batch before they're committed.
+FLUSH_EVERY_GROUPS = int(os.environ.get("ENRICH_FLUSH_EVERY_GROUPS", "25"))
+FLUSH_SECONDS = float(os.environ.get("ENRICH_FLUSH_SECONDS", "60"))
+
+# Query params that only say where the click came from. gh_jid and
+# similar ids are NOT here — on company-hosted boards they pick the job.
+_TRACKING_PARAMS = frozenset({
+    "gh_src", "source", "src", "ref", "referrer", "referer", "lever-source",
+    "lever-origin", "trk", "trackingid", "refid", "fbclid", "gclid", "iis", "iisn",
+})
+_HOST_ALIASES = {"job-boards.greenhouse.io": "boards.greenhouse.io"}
+_APPLY_SUFFIXES = ("/apply", "/application")
+
+
+def canonical_apply_url(url: str | None) -> str:
+    """Collapse URL variants of one posting to a single key.
+
+    Lowercases scheme/host, drops "www.", fragments, tracking params and a
+    trailing /apply or /application, and sorts the remaining params. The
+    path keeps its case (Workday and some ATSs use case-sensitive ids).
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url if "://" in url else f"https://{url}")
+    except ValueError:
+        return url
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    host = _HOST_ALIASES.get(host, host)
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/")
+    for suffix in _APPLY_SUFFIXES:
+        if path.lower().endswith(suffix):
+            path = path[: -len(suffix)]
+            break
+    params = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not (k.lower() in _TRACKING_PARAMS or k.lower().startswith("utm_"))
+    )
+    return urlunsplit(("https", host, path or "/", urlencode(params), ""))
+
 
 def _extract_structured(url: str, wait_for_ms: int = 0) -> dict | None:
     """Call Firecrawl on a single URL. Returns dict or None on failure.
@@ -101,78 +181,217 @@ def _collect_pending(db, limit: int) -> list:
     return [(d.reference, d.to_dict() or {}) for d in query.stream()]
 
 
-def _collect_backfill(db, limit: int, since_days: int | None = None) -> list:
-    """Return [(doc_ref, data), ...] for legacy jobs lacking enrichment_status.
+def _collect_status(db, status: str, limit: int) -> list:
+    from google.cloud.firestore_v1.base_query import FieldFilter
+    query = (
+        db.collection("jobs")
+        .where(filter=FieldFilter("enrichment_status", "==", status))
+        .limit(limit)
+    )
+    return [(d.reference, d.to_dict() or {}) for d in query.stream()]
 
-    Streams the `jobs` collection (no Firestore filter — "missing field"
-    queries aren't supported). Acceptable for one-shot backfill, NOT for
-    the regular cron path. Jobs with pre-existing `structured` payloads
-    are auto-promoted to enrichment_status=completed without burning a
-    Firecrawl scrape.
 
-    Args:
-        since_days: if set, only includes jobs with posted_at >=
-            (now - since_days). Avoids paying for jobs about to expire
-            from the 14-day TTL or stale postings.
+def _mark_backfill(db, since_days: int | None = None) -> int:
+    """Stamp legacy jobs (no enrichment_status) into the backfill queue.
+
+    With since_days this walks only the posted_at window via the automatic
+    single-field index; without it, it streams the whole collection, so
+    `--since-days` should be left on outside of one-shot migrations. Jobs
+    with pre-existing `structured` payloads are auto-promoted to
+    enrichment_status=completed without burning a Firecrawl scrape. Writes
+    are batched. Returns the number of jobs queued.
+
+    Skips the scan (returning 0) when the backfill state doc says this
+    range was already stamped; a scan whose writes all landed updates it.
     """
-    from datetime import datetime, timezone, timedelta
+    from datetime import timedelta
+
+    state_ref = db.collection(BACKFILL_STATE_COLLECTION).document(BACKFILL_STATE_DOC)
+    state = {}
+    try:
+        snap = db.get_all([state_ref])[0]
+        state = (snap.to_dict() or {}) if snap.exists else {}
+    except Exception as e:
+        logger.warning("backfill state read failed, scanning: %s", e)
+
     cutoff = None
     if since_days is not None:
         cutoff = datetime.now(timezone.utc) - timedelta(days=since_days)
+    scanned_since = state.get("scanned_since")
+    if state.get("full_scan_done") or (
+        cutoff is not None and scanned_since is not None and cutoff >= scanned_since
+    ):
+        logger.info("backfill mark: skipped, range already stamped (since_days=%s)", since_days)
+        return 0
+
+    jobs = db.collection("jobs")
+    if cutoff is not None:
+        from google.cloud.firestore_v1.base_query import FieldFilter
+        docs = jobs.where(filter=FieldFilter("posted_at", ">=", cutoff)).stream()
+    else:
+        docs = jobs.stream()
 
-    out = []
-    promoted = 0
-    skipped_old = 0
-    seen_total = 0
-    for doc in db.collection("jobs").stream():
+    writes = []
+    queued = promoted = seen_total = failed = 0
+    for doc in docs:
         seen_total += 1
         data = doc.to_dict() or {}
         if data.get("enrichment_status"):
             continue
         if data.get("structured"):
-            try:
-                doc.reference.update({"enrichment_status": ENRICHMENT_COMPLETED})
-                promoted += 1
-            except Exception:
-                pass
-            continue
-        if cutoff is not None:
-            posted = data.get("posted_at")
-            if posted is None:
-                skipped_old += 1
-                continue
-            # Normalize Firestore Timestamp / naive datetime to aware UTC
-            try:
-                if hasattr(posted, "timestamp") and posted.tzinfo is None:
-                    posted = posted.replace(tzinfo=timezone.utc)
-                if posted < cutoff:
-                    skipped_old += 1
-                    continue
-            except Exception:
-                skipped_old += 1
-                continue
-        out.append((doc.reference, data))
-        if len(out) >= limit:
-            break
+            writes.append(("update", doc.reference, {"enrichment_status": ENRICHMENT_COMPLETED}))
+            promoted += 1
+        else:
+            writes.append(("update", doc.reference, {"enrichment_status": ENRICHMENT_BACKFILL}))
+            queued += 1
+        if len(writes) >= BATCH_WRITE_SIZE:
+            failed += _commit(db, writes)
+            writes = []
+    failed += _commit(db, writes)
+
+    # Only a scan whose stamps all landed may be skipped next time.
+    if not failed:
+        if cutoff is None:
+            marker = {"full_scan_done": True}
+        else:
+            marker = {"scanned_since": min(cutoff, scanned_since) if scanned_since else cutoff}
+        _commit(db, [("set", state_ref, {**marker, "updated_at": datetime.now(timezone.utc)})])
 
     logger.info(
-        "backfill scan: %d total seen, %d eligible, %d auto-promoted, %d skipped (too old)",
-        seen_total, len(out), promoted, skipped_old,
+        "backfill mark: %d seen (since_days=%s), %d queued, %d auto-promoted, %d failed",
+        seen_total, since_days, queued, promoted, failed,
     )
+    return queued
+
+
+def _collect_backfill(db, limit: int, since_days: int | None = None) -> list:
+    """Return [(doc_ref, data), ...] from the indexed backfill queue.
+
+    Refills the queue with `_mark_backfill` only when it can't cover
+    `limit`, so steady-state backfill runs never scan the collection.
+
+    Args:
+        since_days: only queue jobs with posted_at >= (now - since_days).
+            Avoids paying for jobs about to expire from the 14-day TTL or
+            stale postings.
+    """
+    out = _collect_status(db, ENRICHMENT_BACKFILL, limit)
+    if len(out) < limit and _mark_backfill(db, since_days):
+        out = _collect_status(db, ENRICHMENT_BACKFILL, limit)
     return out
 
 
+# ---------------------------------------------------------------------------
+# URL work queue
+# ---------------------------------------------------------------------------
+
+def _url_cache_id(canonical_url: str) -> str:
+    return hashlib.sha256(canonical_url.encode()).hexdigest()[:32]
+
+
+def _read_url_cache(db, canonical_urls: list) -> dict:
+    """Return {canonical_url: extracted} for entries younger than the TTL."""
+    hits: dict = {}
+    if not canonical_urls:
+        return hits
+    by_id = {_url_cache_id(u): u for u in canonical_urls}
+    ids = list(by_id)
+    collection = db.collection(URL_CACHE_COLLECTION)
+    max_age = URL_CACHE_TTL_DAYS * 86400
+    for i in range(0, len(ids), CACHE_READ_CHUNK):
+        refs = [collection.document(doc_id) for doc_id in ids[i : i + CACHE_READ_CHUNK]]
+        try:
+            docs = db.get_all(refs)
+        except Exception as e:
+            logger.warning("URL cache read failed: %s", e)
+            continue
+        for doc in docs:
+            if not doc.exists:
+                continue
+            data = doc.to_dict() or {}
+            if time.time() - (data.get("cached_at") or 0) > max_age:
+                continue
+            if isinstance(data.get("extracted"), dict) and data["extracted"]:
+                hits[by_id[doc.id]] = data["extracted"]
+    return hits
+
+
+def _commit(db, writes: list) -> int:
+    """Apply [(op, ref, payload), ...] as one batch; op is "update" for job
+    docs or "set" (merge) for cache entries.
+
+    Returns the number of writes that failed (all of them if the commit
+    raised).
+    """
+    if not writes:
+        return 0
+    batch = db.batch()
+    for op, ref, payload in writes:
+        if op == "set":
+            batch.set(ref, payload, merge=True)
+        else:
+            batch.update(ref, payload)
+    try:
+        batch.commit()
+        return 0
+    except Exception as e:
+        logger.warning("Enrichment batch write failed (%d docs): %s", len(writes), e)
+        return len(writes)
+
+
+def _group_by_url(candidates: list) -> tuple[dict, list]:
+    """Split candidates into ({canonical_url: [(ref, data), ...]}, no_url)."""
+    groups: dict = {}
+    no_url: list = []
+    for ref, data in candidates:
+        key = canonical_apply_url(data.get("apply_url") or data.get("url"))
+        if not key:
+            no_url.append((ref, data))
+        else:
+            groups.setdefault(key, []).append((ref, data))
+    return groups, no_url
+
+
+def _needs_prose(data: dict) -> bool:
+    return not (data.get("description_raw") or "").strip()
+
+
+def _member_update(data: dict, extracted: dict | None) -> tuple[dict, str]:
+    """Job-doc update and outcome for one member of a URL group."""
+    if not extracted:
+        return {
+            "enrichment_status": ENRICHMENT_FAILED,
+            "enrichment_failed_at": datetime.now(timezone.utc),
+        }, "failed"
+    update = {
+        "structured": _build_structured_field(extracted),
+        "enrichment_status": ENRICHMENT_COMPLETED,
+    }
+    # Recover the description prose for sources (e.g. Simplify) that
+    # ingest with an empty description_raw. Never clobber existing
+    # prose from Greenhouse/Lever/Ashby/FantasticJobs.
+    if _needs_prose(data):
+        desc = (extracted.get("description") or "").strip()
+        if desc:
+            update["description_raw"] = desc
+    return update, "enriched"
+
+
 def enrich_jobs(limit: int = 200, backfill: bool = False, since_days: int | None = None) -> dict:
     """Enrich up to `limit` pending jobs (capped at MAX_FIRECRAWL_PER_RUN).
 
     Args:
         limit: max jobs to enrich this run
-        backfill: True = scan whole collection for legacy entries; False = use
-            the indexed enrichment_status='pending' query (regular cron path)
+        backfill: True = work the enrichment_status='backfill' queue of legacy
+            entries (refilled by _mark_backfill); False = use the indexed
+            enrichment_status='pending' query (regular cron path)
         since_days: backfill-only — only enrich jobs with posted_at within
             the last N days. Prevents spending on stale postings.
 
-    Returns {processed, enriched, failed, skipped, cost_estimate_usd, mode}.
+    Jobs sharing a canonical apply URL share one scrape (or one cache hit).
+
+    Returns {processed, enriched, failed, skipped, unique_urls,
+    url_cache_hits, scrapes, cost_estimate_usd, mode}.
     """
     from backend.app.extensions import get_db
     from backend.app.config import FIRECRAWL_API_KEY
@@ -198,7 +417,7 @@ def enrich_jobs(limit: int = 200, backfill: bool = False, since_days: int | None
 
     if backfill:
         logger.info(
-            "Backfill mode: scanning jobs collection (since_days=%s)",
+            "Backfill mode: reading backfill queue (since_days=%s)",
             since_days if since_days is not None else "all",
         )
         candidates = _collect_backfill(db, capped, since_days=since_days)
@@ -212,88 +431,116 @@ def enrich_jobs(limit: int = 200, backfill: bool = False, since_days: int | None
             "cost_estimate_usd": 0.0, "mode": mode,
         }
 
+    groups, no_url = _group_by_url(candidates)
+    cached = _read_url_cache(db, list(groups))
+
+    # A cached extract without prose can't serve a job that still needs its
+    # description; those groups scrape again with the render wait.
+    to_scrape = []
+    ready: list = []  # [(canonical_url, members, extracted, fresh)]
+    for key, members in groups.items():
+        hit = cached.get(key)
+        if hit and (hit.get("description") or not any(_needs_prose(d) for _, d in members)):
+            ready.append((key, members, hit, False))
+        else:
+            to_scrape.append((key, members))
+
     concurrency = BACKFILL_CONCURRENCY if backfill else DEFAULT_CONCURRENCY
-    logger.info("Enriching %d jobs (mode=%s, concurrency=%d)",
-                len(candidates), mode, concurrency)
-
-    enriched = 0
-    failed = 0
-    skipped = 0
-    processed = 0
-
-    def _process_one(ref, data):
-        url = data.get("apply_url") or data.get("url")
-        if not url:
-            try:
-                ref.update({"enrichment_status": ENRICHMENT_SKIPPED})
-            except Exception:
-                pass
-            return "skipped"
-
-        # Render-wait only for jobs that still need prose (e.g. Simplify, whose
-        # apply URLs are JS-rendered ATS pages). Postings that already arrived
-        # with a description scrape fast — no wait.
-        needs_prose = not (data.get("description_raw") or "").strip()
-        extracted = _extract_structured(url, wait_for_ms=DESC_SCRAPE_WAIT_MS if needs_prose else 0)
-        if extracted:
-            structured = _build_structured_field(extracted)
-            update = {
-                "structured": structured,
-                "enrichment_status": ENRICHMENT_COMPLETED,
-            }
-            # Recover the description prose for sources (e.g. Simplify) that
-            # ingest with an empty description_raw. Never clobber existing
-            # prose from Greenhouse/Lever/Ashby/FantasticJobs.
-            if not (data.get("description_raw") or "").strip():
-                desc = (extracted.get("description") or "").strip()
-                if desc:
-                    update["description_raw"] = desc
-            try:
-                ref.update(update)
-                return "enriched"
-            except Exception as e:
-                logger.warning("Failed to write structured for %s: %s", url, e)
-                return "failed"
+    logger.info(
+        "Enriching %d jobs: %d unique URLs (%d cached, %d to scrape), %d without URL "
+        "(mode=%s, concurrency=%d)",
+        len(candidates), len(groups), len(ready), len(to_scrape), len(no_url), mode, concurrency,
+    )
 
-        try:
-            ref.update({
-                "enrichment_status": ENRICHMENT_FAILED,
-                "enrichment_failed_at": datetime.now(timezone.utc),
+    counts = {"enriched": 0, "failed": 0, "skipped": 0}
+    writes: list = []
+    pending_outcomes: list = []
+    url_cache = db.collection(URL_CACHE_COLLECTION)
+    unflushed_groups = 0
+    last_flush = time.monotonic()
+
+    def _flush():
+        nonlocal writes, pending_outcomes, unflushed_groups, last_flush
+        failed_writes = _commit(db, writes)
+        for outcome in pending_outcomes:
+            counts["failed" if failed_writes else outcome] += 1
+        writes, pending_outcomes = [], []
+        unflushed_groups, last_flush = 0, time.monotonic()
+
+    def _scraped(key, members, extracted):
+        # Fan out one fresh scrape and commit on the group / timer cadence.
+        nonlocal unflushed_groups
+        _fan_out(key, members, extracted, fresh=True)
+        unflushed_groups += 1
+        if writes and (unflushed_groups >= FLUSH_EVERY_GROUPS
+                       or time.monotonic() - last_flush >= FLUSH_SECONDS):
+            _flush()
+
+    def _queue(ref, payload, outcome=None):
+        # Cache entries carry no outcome and are merge-set; job docs update.
+        writes.append(("update" if outcome is not None else "set", ref, payload))
+        if outcome is not None:
+            pending_outcomes.append(outcome)
+        if len(writes) >= BATCH_WRITE_SIZE:
+            _flush()
+
+    def _fan_out(key, members, extracted, fresh):
+        for ref, data in members:
+            update, outcome = _member_update(data, extracted)
+            _queue(ref, update, outcome)
+        if extracted and fresh:
+            _queue(url_cache.document(_url_cache_id(key)), {
+                "url": key,
+                "extracted": extracted,
+                "cached_at": time.time(),
             })
-        except Exception:
-            pass
-        return "failed"
 
+    def _scrape(key, members):
+        # Scrape the first member's own URL (the canonical form is only a
+        # key). Render-wait only when some member still needs prose (e.g.
+        # Simplify, whose apply URLs are JS-rendered ATS pages); postings
+        # that arrived with a description scrape fast.
+        _, first = members[0]
+        url = first.get("apply_url") or first.get("url")
+        wait = DESC_SCRAPE_WAIT_MS if any(_needs_prose(d) for _, d in members) else 0
+        return _extract_structured(url, wait_for_ms=wait)
+
+    for ref, _ in no_url:
+        _queue(ref, {"enrichment_status": ENRICHMENT_SKIPPED}, "skipped")
+    for key, members, extracted, _ in ready:
+        _fan_out(key, members, extracted, fresh=False)
+
+    done = 0
     if concurrency <= 1:
-        for ref, data in candidates:
-            outcome = _process_one(ref, data)
-            enriched += outcome == "enriched"
-            failed += outcome == "failed"
-            skipped += outcome == "skipped"
-            processed += 1
+        for key, members in to_scrape:
+            _scraped(key, members, _scrape(key, members))
     else:
         with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="enrich") as pool:
-            futures = [pool.submit(_process_one, ref, data) for ref, data in candidates]
+            futures = {pool.submit(_scrape, key, members): (key, members) for key, members in to_scrape}
             for fut in as_completed(futures):
+                key, members = futures[fut]
                 try:
-                    outcome = fut.result()
+                    extracted = fut.result()
                 except Exception as e:
                     logger.warning("worker raised: %s", e)
-                    outcome = "failed"
-                enriched += outcome == "enriched"
-                failed += outcome == "failed"
-                skipped += outcome == "skipped"
-                processed += 1
-                if processed % 100 == 0:
-                    logger.info("  progress: %d/%d (enriched=%d failed=%d skipped=%d)",
-                                processed, len(candidates), enriched, failed, skipped)
+                    extracted = None
+                _scraped(key, members, extracted)
+                done += 1
+                if done % 100 == 0:
+                    logger.info("  progress: %d/%d URLs (enriched=%d failed=%d skipped=%d)",
+                                done, len(to_scrape), counts["enriched"], counts["failed"],
+                                counts["skipped"])
+    _flush()
 
     result = {
         "processed": len(candidates),
-        "enriched": enriched,
-        "failed": failed,
-        "skipped": skipped,
-        "cost_estimate_usd": round(enriched * FIRECRAWL_COST_PER_SCRAPE, 4),
+        "enriched": counts["enriched"],
+        "failed": counts["failed"],
+        "skipped": counts["skipped"],
+        "unique_urls": len(groups),
+        "url_cache_hits": len(ready),
+        "scrapes": len(to_scrape),
+        "cost_estimate_usd": round(len(to_scrape) * FIRECRAWL_COST_PER_SCRAPE, 4),
         "mode": mode,
     }
     logger.info("Enrichment complete: %s", result)
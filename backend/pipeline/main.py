@@ -305,6 +305,8 @@ def run_enrich(limit: int = 200, backfill: bool = False, since_days: int | None
     print(f"  Enriched (structured saved): {result.get('enriched', 0)}")
     print(f"  Failed:              {result.get('failed', 0)}")
     print(f"  Skipped (no URL):    {result.get('skipped', 0)}")
+    print(f"  Unique URLs:         {result.get('unique_urls', 0)} ({result.get('url_cache_hits', 0)} from cache)")
+    print(f"  Firecrawl scrapes:   {result.get('scrapes', 0)}")
     print(f"  Estimated cost:      ${result.get('cost_estimate_usd', 0.0):.4f}")
     return result
 
@@ -327,6 +329,8 @@ def run_title_enrich(limit: int = 200, backfill: bool = False, since_days: int |
     print(f"  Enriched (signal):   {result.get('enriched', 0)}")
     print(f"  Noop (no synonyms):  {result.get('noop', 0)}")
     print(f"  Skipped (no title):  {result.get('skipped', 0)}")
+    print(f"  Deferred (budget):   {result.get('deferred', 0)}")
+    print(f"  Title clusters:      {result.get('clusters', 0)}")
     print(f"  PDL calls used:      {result.get('pdl_calls', 0)} (rest were cache hits)")
     return result
 
@@ -349,6 +353,9 @@ def run_extract_deadlines(limit: int = 50):
     print(f"  Completed:           {result.get('completed', 0)}")
     print(f"  Failed:              {result.get('failed', 0)}")
     print(f"  Skipped:             {result.get('skipped', 0)}")
+    print(f"  Deferred (over cap): {result.get('deferred', 0)}")
+    print(f"  Cohorts:             {result.get('cohorts', 0)} ({result.get('cache_hits', 0)} from cache)")
+    print(f"  Perplexity calls:    {result.get('perplexity_calls', 0)}")
     print(f"  Estimated cost:      ${result.get('cost_estimate_usd', 0.0):.4f}")
     return result
 
@@ -13,7 +13,19 @@ Why a separate pass instead of inline at write-time:
 - matches the shape of the existing Firecrawl enricher (one mental model)
 
 Cost guardrails live in `pdl_title_cache` (persistent Firestore cache,
-per-run cap, 45k circuit breaker). This module just iterates and calls.
+per-run cap, 45k circuit breaker).
+
+Thousands of ingested jobs share a few hundred distinct titles once
+location suffixes and requisition ids are stripped, so each run clusters
+its candidates by `title_cluster_key` (`cluster_titles`, a pure function),
+resolves every cluster once through `pdl_title_cache.resolve_titles` (one
+batched cache read, PDL only for true misses) and writes title_meta to all
+member jobs in batched commits. Clusters past MAX_PER_RUN stay pending
+for the next run (which finds them cached or gets the next slice of
+misses); once the total-budget breaker trips, misses are written as noop,
+as before clustering, so they can't pin the pending window forever.
+Backfill uses the same indexed-marker queue as
+enricher.py.
 """
 from __future__ import annotations
 
@@ -27,6 +39,10 @@ TITLE_ENRICHMENT_PENDING = "pending"
 TITLE_ENRICHMENT_COMPLETED = "completed"
 TITLE_ENRICHMENT_SKIPPED = "skipped"  # no usable title
 TITLE_ENRICHMENT_NOOP = "noop"        # PDL returned empty payload (no synonyms found)
+TITLE_ENRICHMENT_BACKFILL = "backfill"  # legacy job queued by _mark_backfill
+
+# Firestore caps a batch at 500 writes; match writer.BATCH_WRITE_SIZE.
+BATCH_WRITE_SIZE = 400
 
 
 def _build_title_meta(payload: dict) -> dict:
@@ -42,74 +58,140 @@ def _build_title_meta(payload: dict) -> dict:
     }
 
 
-def _collect_pending(db, limit: int) -> list:
-    """Jobs flagged `title_enrichment_status='pending'`."""
+def _collect_status(db, status: str, limit: int) -> list:
     from google.cloud.firestore_v1.base_query import FieldFilter
     query = (
         db.collection("jobs")
-        .where(filter=FieldFilter("title_enrichment_status", "==", TITLE_ENRICHMENT_PENDING))
+        .where(filter=FieldFilter("title_enrichment_status", "==", status))
         .limit(limit)
     )
     return [(d.reference, d.to_dict() or {}) for d in query.stream()]
 
 
-def _collect_backfill(db, limit: int, since_days: int | None = None) -> list:
-    """Scan for legacy jobs lacking title_enrichment_status (one-shot backfill).
+def _collect_pending(db, limit: int) -> list:
+    """Jobs flagged `title_enrichment_status='pending'`."""
+    return _collect_status(db, TITLE_ENRICHMENT_PENDING, limit)
+
 
-    Same pattern as enricher._collect_backfill — Firestore doesn't support
-    "missing field" queries, so this streams the collection. Use only for
-    the initial backfill, not on the regular cron path.
+def _commit(db, writes: list) -> int:
+    """Apply [(ref, update), ...] in batches. Returns the number of failed writes."""
+    failed = 0
+    for i in range(0, len(writes), BATCH_WRITE_SIZE):
+        chunk = writes[i : i + BATCH_WRITE_SIZE]
+        batch = db.batch()
+        for ref, update in chunk:
+            batch.update(ref, update)
+        try:
+            batch.commit()
+        except Exception as e:
+            logger.warning("title_meta batch write failed (%d jobs): %s", len(chunk), e)
+            failed += len(chunk)
+    return failed
+
+
+def _mark_backfill(db, since_days: int | None = None) -> int:
+    """Stamp legacy jobs (no title_enrichment_status) into the backfill queue.
+
+    Same shape as enricher._mark_backfill: with since_days only the
+    posted_at window is read (single-field range index); without it the
+    whole collection is streamed, once. Returns the number of jobs queued.
     """
     from datetime import timedelta
 
-    cutoff = None
+    jobs = db.collection("jobs")
     if since_days is not None:
+        from google.cloud.firestore_v1.base_query import FieldFilter
         cutoff = datetime.now(timezone.utc) - timedelta(days=since_days)
+        docs = jobs.where(filter=FieldFilter("posted_at", ">=", cutoff)).stream()
+    else:
+        docs = jobs.stream()
 
-    out = []
+    writes = []
     seen_total = 0
-    skipped_old = 0
-    for doc in db.collection("jobs").stream():
+    for doc in docs:
         seen_total += 1
-        data = doc.to_dict() or {}
-        if data.get("title_enrichment_status"):
+        if (doc.to_dict() or {}).get("title_enrichment_status"):
             continue
-        if cutoff is not None:
-            posted = data.get("posted_at")
-            if posted is None:
-                skipped_old += 1
-                continue
-            try:
-                if hasattr(posted, "timestamp") and getattr(posted, "tzinfo", None) is None:
-                    posted = posted.replace(tzinfo=timezone.utc)
-                if posted < cutoff:
-                    skipped_old += 1
-                    continue
-            except Exception:
-                skipped_old += 1
-                continue
-        out.append((doc.reference, data))
-        if len(out) >= limit:
-            break
+        writes.append((doc.reference, {"title_enrichment_status": TITLE_ENRICHMENT_BACKFILL}))
+    failed = _commit(db, writes)
 
     logger.info(
-        "title-enrich backfill scan: %d total seen, %d eligible, %d skipped (too old)",
-        seen_total, len(out), skipped_old,
+        "title-enrich backfill mark: %d seen (since_days=%s), %d queued",
+        seen_total, since_days, len(writes) - failed,
     )
+    return len(writes) - failed
+
+
+def _collect_backfill(db, limit: int, since_days: int | None = None) -> list:
+    """Return [(doc_ref, data), ...] from the indexed backfill queue,
+    refilling it with `_mark_backfill` only when it can't cover `limit`."""
+    out = _collect_status(db, TITLE_ENRICHMENT_BACKFILL, limit)
+    if len(out) < limit and _mark_backfill(db, since_days):
+        out = _collect_status(db, TITLE_ENRICHMENT_BACKFILL, limit)
     return out
 
 
+def cluster_titles(candidates: list) -> tuple[dict, list]:
+    """Group [(ref, data), ...] by title_cluster_key.
+
+    Returns ({key: (representative_title, [(ref, data), ...])}, untitled).
+    The representative is the first member's title with location and
+    requisition noise removed; that's what PDL sees on a miss. Pure — no
+    I/O — so cluster cardinality is easy to pin in tests.
+    """
+    from app.services.pdl_title_cache import clean_title, title_cluster_key
+
+    clusters: dict = {}
+    untitled: list = []
+    for ref, data in candidates:
+        title = data.get("title")
+        location = data.get("location") if isinstance(data.get("location"), str) else ""
+        key = title_cluster_key(title, location) if isinstance(title, str) else ""
+        if not key:
+            untitled.append((ref, data))
+            continue
+        if key not in clusters:
+            clusters[key] = (clean_title(title, location), [])
+        clusters[key][1].append((ref, data))
+    return clusters, untitled
+
+
+def _member_update(data: dict, payload: dict) -> tuple[dict, bool]:
+    """(update, has_signal) for one job given its cluster's payload."""
+    # Empty payload (no synonyms) is still a meaningful result — we record
+    # it as 'noop' so we don't re-pay to learn it's still empty next run.
+    has_signal = bool(
+        payload.get("similar_titles")
+        or payload.get("levels")
+        or payload.get("role")
+    )
+    updates: dict = {
+        "structured.title_meta": _build_title_meta(payload),
+        "title_enrichment_status": (
+            TITLE_ENRICHMENT_COMPLETED if has_signal else TITLE_ENRICHMENT_NOOP
+        ),
+    }
+    # Only fill structured.experience_level if Firecrawl hasn't already.
+    # Firecrawl's reading of the JD is higher fidelity than PDL's title
+    # heuristic, so we never overwrite it.
+    existing_structured = data.get("structured") or {}
+    if not existing_structured.get("experience_level") and payload.get("levels"):
+        updates["structured.experience_level"] = payload["levels"][0]
+    return updates, has_signal
+
+
 def enrich_titles(limit: int = 200, backfill: bool = False, since_days: int | None = None) -> dict:
     """Enrich up to `limit` jobs' titles via PDL (capped by the cache helper's MAX_PER_RUN).
 
-    Sequential — PDL cache is the bottleneck, not the network. Concurrency
-    would only race writes on the same cache slug for no speedup.
+    One resolution per title cluster; PDL misses stay sequential inside
+    resolve_titles so the budget guards see every call.
 
-    Returns {processed, enriched, skipped, noop, mode}.
+    Returns {processed, enriched, skipped, noop, deferred, clusters,
+    pdl_calls, mode}.
     """
     from backend.app.extensions import get_db
     from app.services.pdl_title_cache import (
-        get_or_enrich_title,
+        resolve_titles,
         reset_run_counter,
         get_run_misses,
         MAX_PER_RUN,
@@ -132,61 +214,43 @@ def enrich_titles(limit: int = 200, backfill: bool = False, since_days: int | No
         return {"processed": 0, "enriched": 0, "skipped": 0, "noop": 0, "mode": mode}
 
     reset_run_counter()
-    logger.info("Title-enriching %d jobs (mode=%s, MAX_PER_RUN=%d)",
-                len(candidates), mode, MAX_PER_RUN)
+    clusters, untitled = cluster_titles(candidates)
+    logger.info("Title-enriching %d jobs in %d title clusters (mode=%s, MAX_PER_RUN=%d)",
+                len(candidates), len(clusters), mode, MAX_PER_RUN)
 
-    enriched = 0
-    skipped = 0
-    noop = 0
+    payloads, deferred_keys = resolve_titles(
+        db, {key: title for key, (title, _) in clusters.items()}
+    )
 
-    for ref, data in candidates:
-        title = data.get("title")
-        if not title or not isinstance(title, str):
-            try:
-                ref.update({"title_enrichment_status": TITLE_ENRICHMENT_SKIPPED})
-            except Exception:
-                pass
-            skipped += 1
+    writes = [(ref, {"title_enrichment_status": TITLE_ENRICHMENT_SKIPPED}) for ref, _ in untitled]
+    signal: list = []
+    for key, (_, members) in clusters.items():
+        payload = payloads.get(key)
+        if payload is None:
             continue
-
-        payload = get_or_enrich_title(title)
-        # Empty payload (no synonyms) is still a meaningful result — we record
-        # it as 'noop' so we don't re-pay to learn it's still empty next run.
-        has_signal = (
-            payload.get("similar_titles")
-            or payload.get("levels")
-            or payload.get("role")
-        )
-
-        title_meta = _build_title_meta(payload)
-        updates: dict = {
-            "structured.title_meta": title_meta,
-            "title_enrichment_status": (
-                TITLE_ENRICHMENT_COMPLETED if has_signal else TITLE_ENRICHMENT_NOOP
-            ),
-        }
-
-        # Only fill structured.experience_level if Firecrawl hasn't already.
-        # Firecrawl's reading of the JD is higher fidelity than PDL's title
-        # heuristic, so we never overwrite it.
-        existing_structured = data.get("structured") or {}
-        if not existing_structured.get("experience_level") and payload.get("levels"):
-            updates["structured.experience_level"] = payload["levels"][0]
-
-        try:
-            ref.update(updates)
-            if has_signal:
-                enriched += 1
-            else:
-                noop += 1
-        except Exception as e:
-            logger.warning("Failed to write title_meta for %s: %s", title, e)
+        for ref, data in members:
+            update, has_signal = _member_update(data, payload)
+            writes.append((ref, update))
+            signal.append(has_signal)
+
+    # Count per batch so a failed commit doesn't count its jobs as done.
+    enriched = noop = skipped = 0
+    outcomes = ["skipped"] * len(untitled) + ["enriched" if s else "noop" for s in signal]
+    for i in range(0, len(writes), BATCH_WRITE_SIZE):
+        if _commit(db, writes[i : i + BATCH_WRITE_SIZE]):
+            continue
+        chunk = outcomes[i : i + BATCH_WRITE_SIZE]
+        enriched += chunk.count("enriched")
+        noop += chunk.count("noop")
+        skipped += chunk.count("skipped")
 
     result = {
         "processed": len(candidates),
         "enriched": enriched,
         "skipped": skipped,
         "noop": noop,
+        "deferred": sum(len(clusters[key][1]) for key in deferred_keys),
+        "clusters": len(clusters),
         "pdl_calls": get_run_misses(),
         "mode": mode,
     }
@@ -0,0 +1,138 @@
+"""
+Micro-benchmark for job fingerprinting.
+
+Compares the precomputed location index in app/routes/job_board.py against
+the previous implementation (a linear METRO_AREAS scan per job), checks the
+two produce identical fingerprints on the same corpus, and prints timings.
+Exits non-zero on any mismatch.
+
+Usage:
+    python backend/scripts/bench_job_fingerprint.py [--jobs 5000] [--repeat 5]
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+import time
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_SCRIPT_DIR, ".."))
+sys.path.insert(0, os.path.join(_SCRIPT_DIR, "..", ".."))
+
+from app.routes import job_board  # noqa: E402
+from app.routes.job_board import METRO_AREAS  # noqa: E402
+
+
+def legacy_compute_job_fingerprint(job: dict):
+    """compute_job_fingerprint as it was before the location index."""
+    company_name = job.get("company", "").strip()
+    job_title = job.get("title", "").strip()
+    location = job.get("location", "").strip()
+    if not company_name or not job_title:
+        return None
+
+    city = None
+    if location:
+        if "," in location:
+            city = location.split(",")[0].strip()
+        else:
+            words = location.split()
+            if words:
+                city = words[0].strip()
+
+    normalized_city = None
+    if city:
+        for metro_name, metro_cities in METRO_AREAS.items():
+            if city in metro_cities:
+                normalized_city = metro_name.split(",")[0].strip()
+                break
+        if not normalized_city:
+            normalized_city = city
+
+    def normalize_string(s: str) -> str:
+        if not s:
+            return ""
+        s = s.lower().strip()
+        s = re.sub(r'[^\w\s]', '', s)
+        s = re.sub(r'\s+', ' ', s)
+        return s.strip()
+
+    fingerprint_string = (
+        f"{normalize_string(company_name)}|{normalize_string(job_title)}|"
+        f"{normalize_string(normalized_city) if normalized_city else ''}"
+    )
+    return hashlib.sha256(fingerprint_string.encode('utf-8')).hexdigest()
+
+
+COMPANIES = ["Google", "Meta", "Goldman Sachs", "J.P. Morgan", "Stripe", "Acme, Inc.", "McKinsey & Company"]
+TITLES = ["Software Engineer Intern", "Investment Banking Analyst", "Data Scientist", "Product Manager - New Grad"]
+EXTRA_LOCATIONS = [
+    "", "Remote", "Remote, US", "Greater Boston Area", "Seattle, WA", "Denver", "NYC", "SF Bay Area",
+    "Arlington, VA", "Arlington Heights, IL", "  Palo Alto  ,  CA ", "Unknown City, ZZ", "London, UK",
+]
+
+
+def build_corpus(n_jobs: int = 2000) -> list:
+    """Deterministic job list covering every metro city plus off-metro,
+    remote, malformed and abbreviated locations."""
+    locations = []
+    for metro, cities in METRO_AREAS.items():
+        locations.append(metro)
+        for city in sorted(cities):
+            locations.extend([f"{city}, XX", city, f"{city} Metro"])
+    locations.extend(EXTRA_LOCATIONS)
+
+    jobs = []
+    i = 0
+    while len(jobs) < n_jobs:
+        jobs.append({
+            "company": COMPANIES[i % len(COMPANIES)],
+            "title": TITLES[(i // len(COMPANIES)) % len(TITLES)],
+            "location": locations[i % len(locations)],
+        })
+        i += 1
+    jobs.append({"company": "", "title": "Analyst", "location": "Boston, MA"})
+    jobs.append({"company": "Acme", "title": "", "location": "Boston, MA"})
+    return jobs
+
+
+def _clear_memos() -> None:
+    job_board._fingerprint_hash.cache_clear()
+    job_board.canonical_job_city.cache_clear()
+    job_board._job_city_from_location.cache_clear()
+    job_board._normalize_fingerprint_part.cache_clear()
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        _clear_memos()
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    jobs = build_corpus(args.jobs)
+    old = [legacy_compute_job_fingerprint(j) for j in jobs]
+    new = job_board.compute_job_fingerprints(jobs)
+    mismatches = sum(1 for a, b in zip(old, new) if a != b)
+
+    t_old = _time(lambda: [legacy_compute_job_fingerprint(j) for j in jobs], args.repeat)
+    t_new = _time(lambda: job_board.compute_job_fingerprints(jobs), args.repeat)
+
+    print(f"jobs={len(jobs)} metros={len(METRO_AREAS)} mismatches={mismatches}")
+    print(f"legacy scan : {t_old * 1000:8.2f} ms")
+    print(f"index (cold): {t_new * 1000:8.2f} ms  ({t_old / t_new:.1f}x)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,10 @@ os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = 'test-credentials.json'
 # app.config is first imported by any test module — config reads env at
 # module-load and the value is locked thereafter.
 os.environ.setdefault('ENABLE_INDUSTRY_EXPANSION', 'true')
+# create_app registers route modules on first request (lazy_blueprints);
+# keep tests to the on-demand path rather than a background preload thread
+# importing every route module mid-suite.
+os.environ.setdefault('STARTUP_PRELOAD_ROUTES', 'false')
 
 
 @pytest.fixture
@@ -59,3 +63,25 @@ def authenticated_request(mock_firebase_user):
             return wrapper
         mock_auth.side_effect = mock_decorator
         yield mock_auth
+
+
+@pytest.fixture(autouse=True)
+def _reset_tier_outcomes():
+    """Per-worker tier history (app/services/tiered_search.py) would
+    otherwise let one test's empty PDL tiers skip another test's search."""
+    from app.services.tiered_search import TIER_OUTCOMES
+    TIER_OUTCOMES.clear()
+    yield
+    TIER_OUTCOMES.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_event_buffers():
+    """Buffered event writes (app/services/event_buffer.py) would otherwise
+    outlive the test that queued them and flush into the next one's mocks."""
+    from app.services import event_buffer
+    for buf in list(event_buffer._BUFFERS):
+        buf.clear()
+    yield
+    for buf in list(event_buffer._BUFFERS):
+        buf.clear()
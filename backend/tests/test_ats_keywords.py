@@ -0,0 +1,109 @@
+"""
+Tests for the compiled skill matcher (skills_taxonomy.SKILL_MATCHER) and
+its use in app/services/ats_scorer.py.
+
+The matcher must agree with the per-variation regex scan it replaced:
+a variation counts when r'\\b' + re.escape(variation) + r'\\b' matches the
+lowercased text.
+"""
+import random
+import re
+
+import pytest
+
+from app.services import ats_scorer
+from app.services.skills_taxonomy import SKILL_MATCHER, VARIATION_TO_CANONICAL, SkillMatcher
+
+
+def _reference_jd(text):
+    if not text:
+        return []
+    lower = text.lower()
+    return sorted({
+        canonical for variation, canonical in VARIATION_TO_CANONICAL.items()
+        if re.search(r'\b' + re.escape(variation) + r'\b', lower)
+    })
+
+
+def _reference_resume_match(resume_text, skill):
+    lower = resume_text.lower()
+    if re.search(r'\b' + re.escape(skill) + r'\b', lower):
+        return True
+    return any(
+        re.search(r'\b' + re.escape(variation) + r'\b', lower)
+        for variation, canonical in VARIATION_TO_CANONICAL.items() if canonical == skill
+    )
+
+
+FIXTURES = [
+    "We use Python, SQL and AWS. Experience with React.js or Next.js is a plus.",
+    "Must know C++ and C#; .NET / ASP.NET shops welcome. CI/CD with GitLab-CI.",
+    "c++11 and c#9 and the.net framework, node.js/express.js, angular 2+ apps",
+    "Machine-Learning, deep-learning, scikit-learn; Power-BI dashboards; data-science team",
+    "Strong problem-solving, collaboration and project-management. Agile/Scrum, Kanban.",
+    "RESTful API design and REST API integration; microservices on Kubernetes and Docker",
+    "Financial modeling (DCF, LBO) and financial-analysis in Excel; risk-management",
+    "nothing technical here, just a friendly team player who likes people",
+    "PythonDeveloper javascript_dev r programming, R and Go (golang) and rust.",
+    "Ünïcode—dashes “quotes” and tabs\tpython\njava scala",
+    "",
+]
+
+
+class TestMatchesRegexScan:
+    @pytest.mark.parametrize("text", FIXTURES)
+    def test_jd_fixtures(self, text):
+        assert ats_scorer.extract_keywords_from_jd(text) == _reference_jd(text)
+
+    def test_random_texts(self):
+        rng = random.Random(44)
+        pieces = list(VARIATION_TO_CANONICAL) + ["x", "_", "-", ".", "/", "+", "#", " ", "  ", "\n", "2", "é"]
+        for _ in range(300):
+            text = "".join(rng.choice(pieces) + rng.choice(["", " ", ".", "x", "-"]) for _ in range(rng.randint(1, 25)))
+            assert ats_scorer.extract_keywords_from_jd(text) == _reference_jd(text), text
+
+    @pytest.mark.parametrize("resume", FIXTURES)
+    def test_resume_fixtures(self, resume):
+        jd = " ".join(FIXTURES)
+        result = ats_scorer.calculate_keyword_score(resume, jd)
+        jd_skills = _reference_jd(jd)
+        want_matched = [s for s in jd_skills if _reference_resume_match(resume, s)]
+        want_missing = [s for s in jd_skills if not _reference_resume_match(resume, s)]
+        assert result["matched"] == want_matched
+        assert result["missing"] == want_missing[:10]
+        assert result["total_keywords"] == len(jd_skills)
+
+    def test_quality_check_counts(self):
+        jd = FIXTURES[0] * 5
+        quality = ats_scorer.assess_job_description_quality(jd)
+        assert sorted(quality["found_skills"]) == _reference_jd(jd)
+        assert quality["technical_keyword_count"] == len(_reference_jd(jd))
+
+
+class TestSkillMatcher:
+    def test_positions(self):
+        text = "Used C++ and Node.js daily"
+        found = SKILL_MATCHER.find(text)
+        spans = {canonical: [text.lower()[a:b] for a, b in v] for canonical, v in found.items()}
+        assert "c++" not in spans  # "c++ " has no \b after the last "+"
+        assert sorted(spans[VARIATION_TO_CANONICAL["node.js"]]) == ["node", "node.js"]
+
+    def test_non_word_edges_need_word_neighbours(self):
+        matcher = SkillMatcher([(".net", "dotnet"), ("c#", "csharp")])
+        assert matcher.canonical_skills("asp.net core") == {"dotnet"}
+        assert matcher.canonical_skills("the .net stack") == set()
+        assert matcher.canonical_skills("c#9") == {"csharp"}
+        assert matcher.canonical_skills("c# 9") == set()
+
+    def test_overlapping_variations_are_all_found(self):
+        matcher = SkillMatcher([("react", "react"), ("react native", "react native"), ("native", "native")])
+        assert matcher.canonical_skills("react native apps") == {"react", "react native", "native"}
+
+    def test_jd_is_scanned_once_per_score(self, monkeypatch):
+        ats_scorer._jd_skills.cache_clear()
+        calls = []
+        real = SKILL_MATCHER.canonical_skills
+        monkeypatch.setattr(SKILL_MATCHER, "canonical_skills", lambda text: calls.append(text) or real(text))
+        jd = FIXTURES[1] * 3
+        ats_scorer.calculate_ats_score("resume with python", jd)
+        assert calls == [jd]
@@ -0,0 +1,177 @@
+"""Tests for the verified-token cache and request-scoped user-doc loader."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask, jsonify, request
+
+from app.utils import auth_context
+from app.utils.auth_context import (
+    TokenCache,
+    auth_cache_stats,
+    get_request_user_doc,
+    invalidate_request_user_doc,
+    verify_id_token_cached,
+)
+
+
+class FakeClock:
+    def __init__(self, t=1_000_000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    auth_context.reset_auth_cache()
+    yield
+    auth_context.reset_auth_cache()
+
+
+class TestTokenCache:
+    def test_hit_after_put(self):
+        clock = FakeClock()
+        cache = TokenCache(clock=clock)
+        cache.put("tok", {"uid": "u1", "exp": clock.t + 3600})
+        assert cache.get("tok") == {"uid": "u1", "exp": clock.t + 3600}
+        assert cache.stats()["hits"] == 1
+
+    def test_never_outlives_exp(self):
+        clock = FakeClock()
+        cache = TokenCache(ttl_seconds=3600, clock=clock)
+        cache.put("tok", {"uid": "u1", "exp": clock.t + 60})
+        clock.t += 60 - auth_context.EXP_MARGIN_SECONDS
+        assert cache.get("tok") is None
+        assert cache.stats()["expired"] == 1
+
+    def test_ttl_caps_long_lived_tokens(self):
+        clock = FakeClock()
+        cache = TokenCache(ttl_seconds=10, clock=clock)
+        cache.put("tok", {"uid": "u1", "exp": clock.t + 3600})
+        clock.t += 11
+        assert cache.get("tok") is None
+
+    def test_tokens_without_exp_or_already_expired_are_not_cached(self):
+        clock = FakeClock()
+        cache = TokenCache(clock=clock)
+        cache.put("a", {"uid": "u1"})
+        cache.put("b", {"uid": "u1", "exp": clock.t - 1})
+        assert cache.stats()["size"] == 0
+
+    def test_bounded_lru(self):
+        clock = FakeClock()
+        cache = TokenCache(max_entries=2, clock=clock)
+        for tok in ("a", "b"):
+            cache.put(tok, {"uid": tok, "exp": clock.t + 600})
+        cache.get("a")  # a is now most recent
+        cache.put("c", {"uid": "c", "exp": clock.t + 600})
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_keys_are_hashed(self):
+        cache = TokenCache(clock=FakeClock())
+        cache.put("secret-token", {"uid": "u1", "exp": 2_000_000})
+        assert "secret-token" not in cache._entries
+        assert TokenCache.key("secret-token") in cache._entries
+
+    def test_hit_returns_a_copy(self):
+        cache = TokenCache(clock=FakeClock())
+        cache.put("tok", {"uid": "u1", "exp": 2_000_000})
+        cache.get("tok")["uid"] = "mutated"
+        assert cache.get("tok")["uid"] == "u1"
+
+
+class TestVerifyCached:
+    def test_verifies_once_per_token(self, monkeypatch):
+        import time
+        verify = MagicMock(return_value={"uid": "u1", "exp": time.time() + 3600})
+        for _ in range(5):
+            assert verify_id_token_cached("tok", verify)["uid"] == "u1"
+        verify.assert_called_once_with("tok", clock_skew_seconds=5)
+        stats = auth_cache_stats()["token_cache"]
+        assert stats["hits"] == 4 and stats["misses"] == 1
+
+    def test_failures_are_not_cached(self):
+        verify = MagicMock(side_effect=ValueError("bad token"))
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                verify_id_token_cached("tok", verify)
+        assert verify.call_count == 2
+
+    def test_disabled_by_env(self, monkeypatch):
+        import time
+        monkeypatch.setenv("AUTH_TOKEN_CACHE_ENABLED", "false")
+        verify = MagicMock(return_value={"uid": "u1", "exp": time.time() + 3600})
+        verify_id_token_cached("tok", verify)
+        verify_id_token_cached("tok", verify)
+        assert verify.call_count == 2
+
+
+class TestRequestUserDoc:
+    def _db(self):
+        db = MagicMock()
+        snap = MagicMock()
+        snap.exists = True
+        snap.to_dict.return_value = {"subscriptionTier": "pro"}
+        db.collection.return_value.document.return_value.get.return_value = snap
+        return db
+
+    def test_read_once_per_request(self):
+        db = self._db()
+        app = Flask(__name__)
+        with app.test_request_context("/"):
+            a = get_request_user_doc("u1", db)
+            b = get_request_user_doc("u1", db)
+        assert a is b
+        assert db.collection.return_value.document.return_value.get.call_count == 1
+        assert auth_cache_stats()["user_doc"] == {"hits": 1, "misses": 1}
+
+    def test_not_shared_across_requests(self):
+        db = self._db()
+        app = Flask(__name__)
+        for _ in range(2):
+            with app.test_request_context("/"):
+                get_request_user_doc("u1", db)
+        assert db.collection.return_value.document.return_value.get.call_count == 2
+
+    def test_invalidate_forces_reread(self):
+        db = self._db()
+        app = Flask(__name__)
+        with app.test_request_context("/"):
+            get_request_user_doc("u1", db)
+            invalidate_request_user_doc("u1")
+            get_request_user_doc("u1", db)
+        assert db.collection.return_value.document.return_value.get.call_count == 2
+
+
+class TestDecorators:
+    def test_require_tier_and_handler_share_one_read(self):
+        import time
+        import firebase_admin
+        from app import extensions
+
+        db = TestRequestUserDoc()._db()
+        app = Flask(__name__)
+
+        @app.route("/x", methods=["POST"])
+        @extensions.require_firebase_auth
+        @extensions.require_tier(["pro"])
+        def handler():
+            snap = get_request_user_doc(request.firebase_user["uid"], db)
+            return jsonify({"tier": snap.to_dict()["subscriptionTier"]})
+
+        user = {"uid": "u1", "exp": time.time() + 3600}
+        with patch.object(firebase_admin, "_apps", {"[DEFAULT]": object()}), \
+                patch.object(extensions, "get_db", return_value=db), \
+                patch("firebase_admin.auth.verify_id_token", return_value=user) as verify, \
+                patch("app.services.lifecycle_signals.touch_last_active"):
+            client = app.test_client()
+            for _ in range(3):
+                resp = client.post("/x", headers={"Authorization": "Bearer tok"})
+                assert resp.status_code == 200
+                assert resp.get_json() == {"tier": "pro"}
+
+        assert verify.call_count == 1
+        assert db.collection.return_value.document.return_value.get.call_count == 3
@@ -0,0 +1,181 @@
+"""Tests for the background job framework: rq_queue execution + job_scheduler."""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services import job_scheduler, rq_queue
+from app.services.job_scheduler import PeriodicJob, Scheduler
+
+
+@pytest.fixture(autouse=True)
+def eager(monkeypatch):
+    monkeypatch.setenv("RQ_EAGER", "true")
+    rq_queue.reset_job_metrics()
+    yield
+    rq_queue.reset_job_metrics()
+
+
+def _register(monkeypatch, name, target):
+    """Point a registry entry at a callable in this module."""
+    monkeypatch.setitem(rq_queue.JOB_REGISTRY, name, f"{__name__}.{target.__name__}")
+
+
+CALLS = []
+
+
+def _ok_job(**kwargs):
+    CALLS.append(kwargs)
+    return "done"
+
+
+_flaky_state = {"left": 0}
+
+
+def _flaky_job():
+    CALLS.append("flaky")
+    if _flaky_state["left"] > 0:
+        _flaky_state["left"] -= 1
+        raise RuntimeError("transient")
+
+
+def _broken_job():
+    raise ValueError("nope")
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    CALLS.clear()
+    yield
+    CALLS.clear()
+
+
+class TestEagerEnqueue:
+    def test_runs_inline_and_passes_kwargs(self, monkeypatch):
+        _register(monkeypatch, "t_ok", _ok_job)
+        job_id = rq_queue.enqueue("t_ok", a=1)
+        assert job_id == "eager-t_ok"
+        assert CALLS == [{"a": 1}]
+
+    def test_unknown_job_raises(self):
+        with pytest.raises(ValueError):
+            rq_queue.enqueue("does_not_exist")
+
+    def test_idempotency_key_dedupes(self, monkeypatch):
+        _register(monkeypatch, "t_ok", _ok_job)
+        assert rq_queue.enqueue("t_ok", idempotency_key="slot-1") == "t_ok:slot-1"
+        assert rq_queue.enqueue("t_ok", idempotency_key="slot-1") is None
+        assert rq_queue.enqueue("t_ok", idempotency_key="slot-2") == "t_ok:slot-2"
+        assert len(CALLS) == 2
+
+    def test_claim_ttl_outlives_the_run(self, monkeypatch):
+        _register(monkeypatch, "t_ok", _ok_job)
+        now = [1000.0]
+        monkeypatch.setattr(rq_queue.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(rq_queue, "_local_claims", {})
+        assert rq_queue.enqueue("t_ok", idempotency_key="s", timeout=60, claim_ttl=3500)
+        now[0] += 600  # past the job timeout, still inside the slot
+        assert rq_queue.enqueue("t_ok", idempotency_key="s", timeout=60, claim_ttl=3500) is None
+        now[0] += 3000
+        assert rq_queue.enqueue("t_ok", idempotency_key="s", timeout=60, claim_ttl=3500)
+
+    def test_retries_until_success(self, monkeypatch):
+        _register(monkeypatch, "t_flaky", _flaky_job)
+        _flaky_state["left"] = 2
+        rq_queue.enqueue("t_flaky", retries=2)
+        assert CALLS == ["flaky"] * 3
+        m = rq_queue.job_metrics()["t_flaky"]
+        assert m["runs"] == 3
+        assert m["failures"] == 2
+        assert m["last_ok"] is True
+
+    def test_exhausted_retries_do_not_raise(self, monkeypatch):
+        _register(monkeypatch, "t_broken", _broken_job)
+        rq_queue.enqueue("t_broken", retries=1)
+        m = rq_queue.job_metrics()["t_broken"]
+        assert m["runs"] == 2
+        assert m["failures"] == 2
+        assert m["last_error"] == "ValueError: nope"
+
+
+class TestRunJobMetrics:
+    def test_records_timing_on_success(self, monkeypatch):
+        _register(monkeypatch, "t_ok", _ok_job)
+        assert rq_queue.run_job("t_ok") == "done"
+        m = rq_queue.job_metrics()["t_ok"]
+        assert m["runs"] == 1
+        assert m["failures"] == 0
+        assert m["avg_ms"] >= 0.0
+        assert m["max_ms"] >= m["last_ms"]
+
+    def test_propagates_failure_for_rq_retry(self, monkeypatch):
+        _register(monkeypatch, "t_broken", _broken_job)
+        with pytest.raises(ValueError):
+            rq_queue.run_job("t_broken")
+        assert rq_queue.job_metrics()["t_broken"]["last_ok"] is False
+
+    def test_periodic_jobs_are_registered(self):
+        for job in job_scheduler.PERIODIC_JOBS:
+            assert job.name in rq_queue.JOB_REGISTRY
+            assert job.name in rq_queue.PERIODIC_JOB_NAMES
+        assert "run_loop_cycle" not in rq_queue.PERIODIC_JOB_NAMES
+
+
+class FakeClock:
+    def __init__(self, t=1_000_000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+class TestScheduler:
+    def _sched(self, jobs, clock):
+        fired = []
+        sched = Scheduler(jobs, clock=clock, fire=lambda job, now: fired.append((job.name, now)))
+        return sched, fired
+
+    def test_honors_boot_delay_then_interval(self):
+        clock = FakeClock()
+        sched, fired = self._sched([PeriodicJob("a", 100, 10)], clock)
+
+        assert sched.tick() == []
+        clock.t += 10
+        assert sched.tick() == ["a"]
+        clock.t += 50
+        assert sched.tick() == []
+        clock.t += 50
+        assert sched.tick() == ["a"]
+        assert len(fired) == 2
+
+    def test_disabled_jobs_are_dropped(self, monkeypatch):
+        monkeypatch.setenv("T_JOB_ENABLED", "false")
+        sched, _ = self._sched([PeriodicJob("a", 100, 0, "T_JOB_ENABLED"), PeriodicJob("b", 100, 0)], FakeClock())
+        assert [j.name for j in sched.jobs] == ["b"]
+
+    def test_failed_fire_retries_next_tick(self):
+        clock = FakeClock()
+        fire = MagicMock(side_effect=[RuntimeError("redis down"), "id"])
+        sched = Scheduler([PeriodicJob("a", 100, 0)], clock=clock, fire=fire)
+        assert sched.tick() == []
+        clock.t += 1
+        assert sched.tick() == ["a"]
+
+    def test_fire_uses_interval_slot_as_idempotency_key(self):
+        job = PeriodicJob("tracker_scan", 3600, 0, retries=2, timeout_seconds=60)
+        with patch.object(job_scheduler, "enqueue", return_value="x") as enq:
+            job_scheduler.fire_periodic_job(job, 7300.0)
+        enq.assert_called_once_with(
+            "tracker_scan", idempotency_key="slot-2", retries=2, timeout=60, claim_ttl=3500,
+        )
+
+    def test_worker_serves_periodic_queue_in_its_own_process(self, monkeypatch):
+        import worker
+        monkeypatch.delenv("RQ_PERIODIC_WORKER", raising=False)
+        assert worker._queue_plan() == [[rq_queue.QUEUE_NAME], [rq_queue.PERIODIC_QUEUE_NAME]]
+        monkeypatch.setenv("RQ_PERIODIC_WORKER", "shared")
+        assert worker._queue_plan() == [[rq_queue.QUEUE_NAME, rq_queue.PERIODIC_QUEUE_NAME]]
+
+    def test_runs_in_web_unless_worker_mode(self, monkeypatch):
+        monkeypatch.delenv("BACKGROUND_JOBS_MODE", raising=False)
+        assert job_scheduler.scheduler_runs_in_web() is True
+        monkeypatch.setenv("BACKGROUND_JOBS_MODE", "worker")
+        assert job_scheduler.scheduler_runs_in_web() is False
@@ -0,0 +1,239 @@
+"""Tests for crawler prerendering: UA regex, HTML cache, concurrency cap.
+
+Upstream is a real HTTP server on localhost standing in for Prerender.io.
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.bot_prerender import (
+    BOT_AGENTS,
+    BotRenderer,
+    RenderedPage,
+    RenderedPageCache,
+    is_bot_user_agent,
+    normalize_url,
+    should_prerender,
+)
+
+
+class FakeClock:
+    def __init__(self, t=1_000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+class FakePrerender:
+    """Local upstream that counts hits and can be slowed or broken."""
+
+    def __init__(self):
+        self.hits = []
+        self.delay = 0.0
+        self.status = 200
+        self.release = threading.Event()
+        self.release.set()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fake.hits.append((self.path, self.headers.get("X-Prerender-Token")))
+                fake.release.wait(5)
+                time.sleep(fake.delay)
+                body = f"<html>rendered {len(fake.hits)}</html>".encode()
+                self.send_response(fake.status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture()
+def upstream():
+    fake = FakePrerender()
+    yield fake
+    fake.close()
+
+
+def _renderer(upstream, clock=None, **kw):
+    cache = RenderedPageCache(ttl=60, stale_ttl=600, clock=clock or FakeClock())
+    return BotRenderer(token="tok", service_url=upstream.url, cache=cache, timeout=5, **kw)
+
+
+GOOGLEBOT = "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"
+
+
+class TestMatching:
+    def test_regex_agrees_with_substring_scan(self):
+        uas = [
+            GOOGLEBOT, "Mozilla/5.0 (Macintosh) Safari/605.1", "facebookexternalhit/1.1",
+            "Mozilla/5.0 AppleWebKit (KHTML) Chrome-Lighthouse", "curl/8.0", "",
+            "Mozilla/5.0 (compatible; GPTBot/1.0)", "Pinterest/0.2", "WhatsApp/2.23",
+        ]
+        for ua in uas:
+            assert is_bot_user_agent(ua) == any(b in ua.lower() for b in BOT_AGENTS), ua
+
+    def test_should_prerender_filters(self):
+        assert should_prerender("GET", "/how-to/cold-email", GOOGLEBOT)
+        assert not should_prerender("POST", "/how-to/cold-email", GOOGLEBOT)
+        assert not should_prerender("GET", "/api/health", GOOGLEBOT)
+        assert not should_prerender("GET", "/assets/app.js", GOOGLEBOT)
+        assert not should_prerender("GET", "/logo.png", GOOGLEBOT)
+        assert not should_prerender("GET", "/how-to/cold-email", "Mozilla/5.0 Safari")
+
+    def test_normalize_url(self):
+        a = normalize_url("https://Offerloop.ai/blog/x/?utm_source=tw&b=2&a=1#top")
+        b = normalize_url("https://offerloop.ai/blog/x?a=1&b=2&gclid=abc")
+        assert a == b == "https://offerloop.ai/blog/x?a=1&b=2"
+        assert normalize_url("https://offerloop.ai/") == "https://offerloop.ai/"
+
+
+class TestCache:
+    def test_fresh_then_stale_then_gone(self):
+        clock = FakeClock()
+        cache = RenderedPageCache(ttl=10, stale_ttl=20, clock=clock)
+        cache.put("k", RenderedPage(b"x", 200, "text/html", clock.t))
+        assert cache.get("k")[1] is True
+        clock.t += 15
+        page, fresh = cache.get("k")
+        assert page is not None and fresh is False
+        clock.t += 20
+        assert cache.get("k") == (None, False)
+        assert len(cache) == 0
+
+    def test_byte_bound_evicts_lru(self):
+        cache = RenderedPageCache(max_bytes=10, clock=FakeClock())
+        cache.put("a", RenderedPage(b"aaaa", 200, "text/html", 0))
+        cache.put("b", RenderedPage(b"bbbb", 200, "text/html", 0))
+        cache.get("a")
+        cache.put("c", RenderedPage(b"cccc", 200, "text/html", 0))
+        assert cache.get("b")[0] is None
+        assert cache.get("a")[0] is not None
+        assert cache.bytes <= 10
+
+
+class TestRenderer:
+    def test_miss_then_hit_fetches_once(self, upstream):
+        r = _renderer(upstream)
+        first = r.render("https://offerloop.ai/p?utm_source=x", GOOGLEBOT)
+        second = r.render("https://offerloop.ai/p", GOOGLEBOT)
+        assert first.body == second.body == b"<html>rendered 1</html>"
+        assert len(upstream.hits) == 1
+        path, token = upstream.hits[0]
+        assert path == "/https://offerloop.ai/p?utm_source=x" and token == "tok"
+        assert r.stats["fresh_hits"] == 1
+
+    def test_stale_served_while_revalidating(self, upstream):
+        clock = FakeClock()
+        r = _renderer(upstream, clock=clock)
+        r.render("https://offerloop.ai/p", GOOGLEBOT)
+        clock.t += 120  # past ttl, inside stale window
+        stale = r.render("https://offerloop.ai/p", GOOGLEBOT)
+        assert stale.body == b"<html>rendered 1</html>"
+        r._refresher.shutdown(wait=True)
+        assert len(upstream.hits) == 2
+        page, fresh = r.cache.get(normalize_url("https://offerloop.ai/p"))
+        assert fresh and page.body == b"<html>rendered 2</html>"
+
+    @pytest.mark.parametrize("status", [503, 401, 403, 429])
+    def test_uncacheable_status_falls_through_and_is_not_cached(self, upstream, status):
+        upstream.status = status
+        r = _renderer(upstream)
+        assert r.render("https://offerloop.ai/p", GOOGLEBOT) is None
+        assert len(r.cache) == 0
+
+    def test_not_found_is_cached(self, upstream):
+        upstream.status = 404
+        r = _renderer(upstream)
+        assert r.render("https://offerloop.ai/p", GOOGLEBOT).status == 404
+        r.render("https://offerloop.ai/p", GOOGLEBOT)
+        assert len(upstream.hits) == 1
+
+    def test_unreachable_upstream_falls_through(self):
+        r = BotRenderer(token="tok", service_url="http://127.0.0.1:9/", timeout=0.5)
+        assert r.render("https://offerloop.ai/p", GOOGLEBOT) is None
+        assert r.stats["fetch_errors"] == 1
+
+    def test_disabled_without_token(self, upstream):
+        r = BotRenderer(token=None, service_url=upstream.url)
+        assert r.render("https://offerloop.ai/p", GOOGLEBOT) is None
+        assert upstream.hits == []
+
+    def test_concurrency_cap_sheds_misses(self, upstream):
+        upstream.release.clear()  # hold every upstream request open
+        r = _renderer(upstream, max_concurrency=2)
+        results = {}
+
+        def crawl(i):
+            results[i] = r.render(f"https://offerloop.ai/p{i}", GOOGLEBOT)
+
+        threads = [threading.Thread(target=crawl, args=(i,)) for i in range(2)]
+        for t in threads:
+            t.start()
+        deadline = time.time() + 5
+        while len(upstream.hits) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+        started = time.perf_counter()
+        assert r.render("https://offerloop.ai/p9", GOOGLEBOT) is None
+        assert time.perf_counter() - started < 0.5
+        assert r.stats["shed"] == 1
+
+        upstream.release.set()
+        for t in threads:
+            t.join(5)
+        assert all(results[i] is not None for i in range(2))
+        assert len(upstream.hits) == 2
+
+    def test_same_url_misses_do_not_stampede(self, upstream):
+        upstream.release.clear()
+        r = _renderer(upstream, max_concurrency=4)
+        t = threading.Thread(target=r.render, args=("https://offerloop.ai/p", GOOGLEBOT))
+        t.start()
+        deadline = time.time() + 5
+        while not upstream.hits and time.time() < deadline:
+            time.sleep(0.01)
+        assert r.render("https://offerloop.ai/p", GOOGLEBOT) is None
+        upstream.release.set()
+        t.join(5)
+        assert len(upstream.hits) == 1
+
+
+class TestMiddleware:
+    def test_create_app_serves_bots_from_cache(self, upstream, monkeypatch):
+        monkeypatch.setenv("PRERENDER_TOKEN", "tok")
+        # The MCP mount refuses to boot against the prod Firebase project
+        # outside production; it has nothing to do with prerendering.
+        monkeypatch.setenv("DISABLE_MCP", "1")
+        try:
+            from backend.wsgi import create_app
+        except OSError as e:  # WeasyPrint needs system libs (libpango)
+            pytest.skip(f"create_app unavailable: {e}")
+        app = create_app()
+        app.config["TESTING"] = True
+        app.extensions["bot_renderer"].service_url = upstream.url
+        client = app.test_client()
+
+        for _ in range(3):
+            resp = client.get("/how-to/cold-email", headers={"User-Agent": GOOGLEBOT})
+            assert resp.status_code == 200
+            assert resp.data == b"<html>rendered 1</html>"
+        assert len(upstream.hits) == 1
+
+        client.get("/how-to/cold-email", headers={"User-Agent": "Mozilla/5.0 Safari"})
+        assert len(upstream.hits) == 1
@@ -0,0 +1,195 @@
+"""
+Tests for /api/briefing assembly: batched reply-draft reads, concurrent
+section loaders, and the per-user briefing snapshot
+(app/services/briefing_snapshot.py).
+"""
+import pytest
+
+from app.routes import briefing
+from app.services import briefing_snapshot
+from app.services.dashboard_aggregates import record_contact_change
+
+
+class Snap:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class Ref:
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name):
+        return Coll(self.db, f"{self.path}/{name}")
+
+    def get(self):
+        self.db.reads.append(("get", self.path))
+        return Snap(self.id, self.db.docs.get(self.path))
+
+    def set(self, data, merge=False):
+        self.db.docs[self.path] = dict(data)
+
+
+class Coll:
+    def __init__(self, db, path, filters=()):
+        self.db = db
+        self.path = path
+        self.filters = filters
+
+    def document(self, doc_id):
+        return Ref(self.db, f"{self.path}/{doc_id}")
+
+    def where(self, field, op, value):
+        return Coll(self.db, self.path, self.filters + ((field, value),))
+
+    def limit(self, n):
+        return self
+
+    def stream(self):
+        self.db.reads.append(("query", self.path))
+        prefix = self.path + "/"
+        for path, data in list(self.db.docs.items()):
+            rest = path[len(prefix):]
+            if path.startswith(prefix) and "/" not in rest and all(data.get(f) == v for f, v in self.filters):
+                yield Snap(rest, data)
+
+
+class FakeDB:
+    def __init__(self, tier="pro"):
+        self.reads = []
+        self.docs = {
+            "users/u1": {"subscriptionTier": tier, "goals": {"careerTrack": "Investment Banking"}},
+            "users/u1/contacts/c1": {"firstName": "Ana", "lastName": "Li", "company": "Evercore",
+                                     "hasUnreadReply": True, "lastReplySnippet": "Happy to chat"},
+            "users/u1/contacts/c2": {"name": "Bo", "jobCompany": "Lazard", "hasUnreadReply": True},
+            "users/u1/contacts/c3": {"firstName": "Cy", "hasUnreadReply": False},
+            "users/u1/replyDrafts/c1": {"draftBody": "Thanks Ana!", "status": "ready"},
+        }
+
+    def collection(self, name):
+        return Coll(self, name)
+
+    def get_all(self, refs):
+        refs = list(refs)
+        self.reads.append(("get_all", len(refs)))
+        return [Snap(r.id, self.docs.get(r.path)) for r in refs]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from flask import Flask
+    import firebase_admin
+    from app import extensions
+
+    monkeypatch.setattr(firebase_admin, "_apps", {"[DEFAULT]": object()})
+    monkeypatch.setattr(extensions, "verify_id_token_cached", lambda *a, **k: {"uid": "u1"})
+    monkeypatch.setattr("app.services.lifecycle_signals.touch_last_active", lambda uid: None)
+
+    state = {"db": FakeDB(), "events": [], "roadmap": 0}
+    monkeypatch.setattr(briefing, "get_db", lambda: state["db"])
+    monkeypatch.setattr(briefing, "_get_eligible_contacts", lambda db, uid, followup_days: [
+        {"id": "c9", "firstName": "Dee", "company": "Moelis"},
+    ])
+    monkeypatch.setattr(briefing, "get_outbox_stats", lambda uid: {
+        "total": 12, "doneCount": 4, "needsAttentionCount": 2,
+    })
+
+    def roadmap(uid):
+        state["roadmap"] += 1
+        return {"completed": 3, "total": 10}
+
+    monkeypatch.setattr(briefing, "compute_roadmap_progress", roadmap)
+    monkeypatch.setattr(briefing, "log_event", lambda uid, name, props: state["events"].append(props))
+    briefing_snapshot.clear_briefing_snapshots()
+
+    app = Flask(__name__)
+    app.register_blueprint(briefing.briefing_bp)
+    yield app.test_client(), state
+    briefing_snapshot.clear_briefing_snapshots()
+
+
+def get(c):
+    return c.get("/api/briefing", headers={"Authorization": "Bearer t"})
+
+
+class TestAssembly:
+    def test_reply_drafts_come_from_one_get_all(self, client):
+        c, state = client
+        data = get(c).get_json()
+        replies = {r["contactId"]: r for r in data["replies"]}
+        assert replies["c1"]["replyDraftBody"] == "Thanks Ana!"
+        assert replies["c1"]["contactName"] == "Ana Li"
+        assert "replyDraftBody" not in replies["c2"]
+        assert replies["c2"]["company"] == "Lazard"
+
+        reads = state["db"].reads
+        assert ("get_all", 2) in reads
+        assert not any(kind == "get" and "replyDrafts" in path for kind, path in reads)
+
+        assert data["followUps"][0]["contactName"] == "Dee"
+        assert data["pipelineStats"] == {"active": 8, "needsAttention": 2, "done": 4, "totalContacts": 12}
+        assert data["roadmapProgress"] == {"completed": 3, "total": 10}
+        assert data["meta"]["tier"] == "pro" and data["meta"]["hasRoadmap"] is True
+        assert len(data["deadlines"]) > 0
+        assert state["events"][0]["sections_with_content"][:2] == ["replies", "followUps"]
+
+    def test_free_tier_skips_drafts_and_roadmap(self, client):
+        c, state = client
+        state["db"] = FakeDB(tier="free")
+        data = get(c).get_json()
+        assert not any(kind == "get_all" for kind, *_ in state["db"].reads)
+        assert state["roadmap"] == 0
+        assert data["roadmapProgress"] is None and data["meta"]["hasRoadmap"] is False
+
+    def test_loader_error_is_a_500(self, client, monkeypatch):
+        c, _ = client
+
+        def broken(uid):
+            raise RuntimeError("roadmap down")
+
+        monkeypatch.setattr(briefing, "compute_roadmap_progress", broken)
+        assert get(c).status_code == 500
+
+
+class TestSnapshot:
+    def test_repeat_view_is_served_from_snapshot(self, client):
+        c, state = client
+        first = get(c).get_json()
+        state["db"].reads.clear()
+        assert get(c).get_json() == first
+        assert state["db"].reads == []
+        assert len(state["events"]) == 2  # every view is still logged
+
+    def test_contact_write_invalidates(self, client):
+        c, state = client
+        get(c)
+        state["db"].docs["users/u1/contacts/c2"]["hasUnreadReply"] = False
+        record_contact_change("u1", "c2", {"hasUnreadReply": True}, {"hasUnreadReply": False}, state["db"])
+        assert [r["contactId"] for r in get(c).get_json()["replies"]] == ["c1"]
+
+    def test_invalidation_during_build_is_not_overwritten(self, client, monkeypatch):
+        c, state = client
+        real = briefing._get_follow_ups
+
+        def follow_ups_then_reply_arrives(db, uid):
+            briefing_snapshot.invalidate_briefing(uid)
+            return real(db, uid)
+
+        monkeypatch.setattr(briefing, "_get_follow_ups", follow_ups_then_reply_arrives)
+        get(c)
+        assert briefing_snapshot.get_snapshot("u1") is None
+
+    def test_ttl_zero_disables(self, client, monkeypatch):
+        c, state = client
+        monkeypatch.setattr(briefing_snapshot, "BRIEFING_SNAPSHOT_TTL_SECONDS", 0)
+        get(c)
+        state["db"].reads.clear()
+        get(c)
+        assert state["db"].reads
@@ -0,0 +1,295 @@
+"""
+Tests for the background contact import pipeline (app/services/contact_import_jobs.py):
+batching, bounded-concurrency enrichment, dedup, atomic credit charging and
+job doc lifecycle. Runs against an in-memory Firestore stand-in.
+"""
+import itertools
+import threading
+import time
+
+import pytest
+
+from app.services import contact_import_jobs as jobs
+from app.services.contact_import_jobs import EnrichResult
+
+
+class FakeSnap:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDoc:
+    _ids = itertools.count(1)
+
+    def __init__(self, db, path):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name):
+        return FakeCollection(self._db, f"{self.path}/{name}")
+
+    def get(self):
+        return FakeSnap(self.id, self._db.docs.get(self.path))
+
+    def set(self, data, merge=False):
+        self._db.docs[self.path] = dict(data)
+
+    def update(self, data):
+        if self.path not in self._db.docs:
+            raise KeyError(self.path)
+        self._db.docs[self.path].update(data)
+
+
+class FakeCollection:
+    def __init__(self, db, path):
+        self._db = db
+        self.path = path
+
+    def document(self, doc_id=None):
+        return FakeDoc(self._db, f"{self.path}/{doc_id or f'auto{next(FakeDoc._ids)}'}")
+
+    def select(self, fields):
+        self._db.selects.append(list(fields))
+        return self
+
+    def stream(self):
+        prefix = self.path + "/"
+        for path, data in list(self._db.docs.items()):
+            rest = path[len(prefix):]
+            if path.startswith(prefix) and "/" not in rest:
+                yield FakeSnap(rest, data)
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self._db = db
+        self._ops = []
+
+    def set(self, ref, data):
+        self._ops.append(("set", ref, data))
+
+    def update(self, ref, data):
+        self._ops.append(("update", ref, data))
+
+    def commit(self):
+        if self._db.fail_commits:
+            raise RuntimeError("commit failed")
+        self._db.commits.append(len(self._ops))
+        for op, ref, data in self._ops:
+            getattr(ref, op)(data)
+
+
+class FakeDB:
+    def __init__(self):
+        self.docs = {}
+        self.commits = []
+        self.selects = []
+        self.fail_commits = False
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def contacts(self, uid="u1"):
+        prefix = f"users/{uid}/contacts/"
+        return [d for p, d in self.docs.items() if p.startswith(prefix)]
+
+
+class FakeLedger:
+    def __init__(self, balance):
+        self.balance = balance
+        self.calls = []
+        self.refunds = []
+
+    def deduct(self, uid, amount, op):
+        self.calls.append(amount)
+        if amount > self.balance:
+            return False, self.balance
+        self.balance -= amount
+        return True, self.balance
+
+    def refund(self, uid, amount, op):
+        self.refunds.append(amount)
+        self.balance += amount
+
+
+def row(first="", last="", email="", linkedin="", company=""):
+    return {"firstName": first, "lastName": last, "email": email,
+            "linkedinUrl": linkedin, "company": company}
+
+
+@pytest.fixture
+def db():
+    return FakeDB()
+
+
+def run(db, rows, credits=10_000, enrich=None, ledger=None):
+    ledger = ledger or FakeLedger(credits)
+    stats = jobs.import_rows(
+        "u1", rows, credits, db=db,
+        enrich=enrich or (lambda url: EnrichResult()),
+        deduct=ledger.deduct, refund=ledger.refund,
+    )
+    return stats, ledger
+
+
+class TestPipeline:
+    def test_creates_contacts_with_one_commit_per_batch(self, db, monkeypatch):
+        monkeypatch.setattr(jobs, "IMPORT_BATCH_SIZE", 10)
+        rows = [row(f"F{i}", f"L{i}", f"p{i}@x.com") for i in range(25)]
+        stats, ledger = run(db, rows)
+        assert stats.created == 25
+        assert len(db.contacts()) == 25
+        assert db.commits == [10, 10, 5]
+        assert ledger.calls == [100, 100, 50]
+        assert stats.result()["credits"] == {"spent": 250, "remaining": 10_000 - 250}
+        assert len(stats.for_drafting) == 25
+
+    def test_dedup_against_existing_and_within_file(self, db):
+        db.docs["users/u1/contacts/old"] = {"email": "Old@X.com", "linkedinUrl": "",
+                                            "firstName": "", "lastName": "", "company": ""}
+        rows = [
+            row("A", "B", "old@x.com"),
+            row("C", "D", "new@x.com"),
+            row("E", "F", "NEW@x.com"),
+            row("G", "H", company="Acme"),
+            row("g", "h", company="acme"),
+            row(),
+        ]
+        stats, _ = run(db, rows)
+        assert stats.created == 2
+        assert stats.duplicate == 3
+        assert stats.invalid == 1
+        assert db.selects == [jobs._DedupIndex.FIELDS]
+
+    def test_budget_limits_created(self, db):
+        rows = [row(f"F{i}", f"L{i}", f"p{i}@x.com") for i in range(5)]
+        stats, ledger = run(db, rows, credits=30)
+        assert stats.created == 3
+        assert stats.no_credits == 2
+        assert ledger.balance == 0
+
+    def test_balance_drop_mid_job_shrinks_batch(self, db):
+        rows = [row(f"F{i}", f"L{i}", f"p{i}@x.com") for i in range(5)]
+        ledger = FakeLedger(20)  # user spent credits elsewhere after the job started
+        stats, ledger = run(db, rows, credits=100, ledger=ledger)
+        assert stats.created == 2
+        assert stats.no_credits == 3
+        assert ledger.calls == [50, 20]
+
+    def test_failed_commit_refunds(self, db):
+        db.fail_commits = True
+        ledger = FakeLedger(100)
+        with pytest.raises(RuntimeError):
+            run(db, [row("A", "B", "a@x.com")], credits=100, ledger=ledger)
+        assert ledger.refunds == [10]
+        assert ledger.balance == 100
+
+    def test_enrichment_is_concurrent_capped_and_ordered(self, db, monkeypatch):
+        monkeypatch.setattr(jobs, "ENRICHMENT_CAP", 4)
+        monkeypatch.setattr(jobs, "IMPORT_ENRICH_CONCURRENCY", 4)
+        active = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def enrich(url):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            n = url.rsplit("/", 1)[-1]
+            if n == "p1":
+                return EnrichResult(pdl_id="pdl-1")
+            return EnrichResult(email=f"{n}@found.com", pdl_id=f"pdl-{n}", ok=True)
+
+        rows = [row(f"F{i}", f"L{i}", linkedin=f"linkedin.com/in/p{i}") for i in range(6)]
+        stats, _ = run(db, rows, enrich=enrich)
+        assert active["peak"] > 1
+        assert stats.enriched == 3
+        assert stats.enrichment_failed == 1
+        assert stats.enrichment_capped == 2
+        by_first = {c["firstName"]: c for c in stats.created_contacts}
+        assert by_first["F0"]["email"] == "p0@found.com"
+        assert by_first["F0"]["emailSource"] == "enriched"
+        assert by_first["F1"]["email"] == "" and by_first["F1"]["pdlId"] == "pdl-1"
+        assert by_first["F5"]["email"] == ""
+
+    def test_post_enrichment_duplicate_is_not_charged(self, db):
+        db.docs["users/u1/contacts/old"] = {"email": "dup@x.com"}
+        rows = [row("A", "B", linkedin="linkedin.com/in/a")]
+        stats, ledger = run(db, rows, enrich=lambda url: EnrichResult(email="dup@x.com", ok=True))
+        assert stats.created == 0
+        assert stats.duplicate == 1
+        assert ledger.calls == []
+
+
+class TestJob:
+    def test_run_import_job_lifecycle(self, db, monkeypatch):
+        monkeypatch.setattr(jobs, "draft_imported_contacts", lambda *a, **k: None)
+        db.docs["users/u1"] = {"credits": 100}
+        ledger = FakeLedger(100)
+        ref = jobs.import_job_ref(db, "u1", "j1")
+        ref.set({"status": jobs.JOB_QUEUED})
+        result = jobs.run_import_job(
+            "u1", "j1", [row("A", "B", "a@x.com"), row()], db=db,
+            deduct=ledger.deduct, refund=ledger.refund,
+        )
+        job = jobs.get_import_job("u1", "j1", db=db)
+        assert job["status"] == jobs.JOB_COMPLETED
+        assert job["result"] == result
+        assert result["created"] == 1
+        assert result["skipped"] == {"duplicate": 0, "invalid": 1, "no_credits": 0, "total": 1}
+        assert job["progress"]["processed"] == 2
+        assert "contacts" not in result
+        assert result["contactIds"] == [k.rsplit("/", 1)[-1] for k in db.docs
+                                        if k.startswith("users/u1/contacts/")]
+        assert result["contactIdsTruncated"] is False
+
+    def test_result_caps_contact_ids(self, db, monkeypatch):
+        monkeypatch.setattr(jobs, "draft_imported_contacts", lambda *a, **k: None)
+        monkeypatch.setattr(jobs, "RESULT_CONTACT_ID_LIMIT", 2)
+        db.docs["users/u1"] = {"credits": 100}
+        ledger = FakeLedger(100)
+        jobs.import_job_ref(db, "u1", "j1").set({"status": jobs.JOB_QUEUED})
+        rows = [row(f"F{i}", "L", f"f{i}@x.com") for i in range(5)]
+        result = jobs.run_import_job("u1", "j1", rows, db=db,
+                                     deduct=ledger.deduct, refund=ledger.refund)
+        assert result["created"] == 5
+        assert len(result["contactIds"]) == 2
+        assert result["contactIdsTruncated"] is True
+
+    def test_run_import_job_failure_marks_doc(self, db):
+        db.docs["users/u1"] = {"credits": 100}
+        db.fail_commits = True
+        ledger = FakeLedger(100)
+        jobs.import_job_ref(db, "u1", "j1").set({"status": jobs.JOB_QUEUED})
+        with pytest.raises(RuntimeError):
+            jobs.run_import_job("u1", "j1", [row("A", "B", "a@x.com")], db=db,
+                                deduct=ledger.deduct, refund=ledger.refund)
+        assert jobs.get_import_job("u1", "j1", db=db)["status"] == jobs.JOB_FAILED
+
+    def test_start_import_job_enqueues(self, db, monkeypatch):
+        calls = []
+        import app.services.rq_queue as rq_queue
+        monkeypatch.setattr(rq_queue, "enqueue", lambda name, **kw: calls.append((name, kw)))
+        job_id = jobs.start_import_job("u1", [row("A", "B", "a@x.com")], db=db)
+        assert calls[0][0] == "contact_import"
+        assert calls[0][1]["job_id"] == job_id
+        assert jobs.get_import_job("u1", job_id, db=db)["status"] == jobs.JOB_QUEUED
+
+    def test_registered_on_user_queue(self):
+        from app.services.rq_queue import JOB_REGISTRY, PERIODIC_JOB_NAMES
+        assert JOB_REGISTRY["contact_import"] == "app.services.contact_import_jobs.run_import_job"
+        assert "contact_import" not in PERIODIC_JOB_NAMES
+
+    def test_get_missing_job(self, db):
+        assert jobs.get_import_job("u1", "nope", db=db) is None
@@ -82,12 +82,13 @@ class TestWatchdogStaleness:
 # Tracker daemon loop wiring — C2 coordination PR
 # ---------------------------------------------------------------------------
 #
-# These tests are source-level: they read wsgi.py and assert that the
-# three scanners are wired into the shared daemon loop with:
+# These tests are source-level: they read app/services/daemon_jobs.py (the
+# tracker scan job body, formerly inline in wsgi.py) and assert that the
+# three scanners are wired into it with:
 #   1. Per-scanner kill switch env var
 #   2. Per-scanner try/except isolation (one crash must not block others)
 #   3. The exact scanner function names from the daemon contract
-#   4. app_context() around each invocation
+#   4. app_context() around each invocation (via rq_queue.run_job)
 #
 # Contract: docs/designs/tracker-daemon-contract.md
 
@@ -95,33 +96,33 @@ import pathlib
 
 
 class TestDaemonLoopWiring:
-    """Assert wsgi.py wires all three scanners per daemon contract."""
+    """Assert the tracker scan job wires all three scanners per daemon contract."""
 
     @staticmethod
     def _read_wsgi() -> str:
-        wsgi_path = pathlib.Path(__file__).resolve().parents[1] / "wsgi.py"
-        return wsgi_path.read_text()
+        path = pathlib.Path(__file__).resolve().parents[1] / "app" / "services" / "daemon_jobs.py"
+        return path.read_text()
 
     def test_nudge_scanner_wired(self):
         """Nudge scanner imports scan_and_generate_nudges under NUDGES_ENABLED."""
         src = self._read_wsgi()
         assert "NUDGES_ENABLED" in src
         assert "scan_and_generate_nudges" in src
-        assert "from .app.services.nudge_service import scan_and_generate_nudges" in src
+        assert "from app.services.nudge_service import scan_and_generate_nudges" in src
 
     def test_queue_scanner_wired(self):
         """Queue scanner imports scan_and_generate_queues under QUEUE_SCANNER_ENABLED."""
         src = self._read_wsgi()
         assert "QUEUE_SCANNER_ENABLED" in src
         assert "scan_and_generate_queues" in src
-        assert "from .app.services.queue_service import scan_and_generate_queues" in src
+        assert "from app.services.queue_service import scan_and_generate_queues" in src
 
     def test_aggregation_scanner_wired(self):
         """Aggregation scanner imports aggregate_email_outcomes under AGGREGATION_SCANNER_ENABLED."""
         src = self._read_wsgi()
         assert "AGGREGATION_SCANNER_ENABLED" in src
         assert "aggregate_email_outcomes" in src
-        assert "from .app.services.email_baseline import aggregate_email_outcomes" in src
+        assert "from app.services.email_baseline import aggregate_email_outcomes" in src
 
     def test_each_scanner_has_try_except_isolation(self):
         """
@@ -135,7 +136,7 @@ class TestDaemonLoopWiring:
         queue_idx = src.find("QUEUE_SCANNER_ENABLED")
         agg_idx = src.find("AGGREGATION_SCANNER_ENABLED")
         assert nudge_idx < queue_idx < agg_idx, \
-            "Scanners should be ordered nudge → queue → aggregation in wsgi.py"
+            "Scanners should be ordered nudge → queue → aggregation in daemon_jobs.py"
 
         # Between nudge and queue markers: exactly one try: and one except
         nudge_block = src[nudge_idx:queue_idx]
@@ -147,9 +148,9 @@ class TestDaemonLoopWiring:
         assert queue_block.count("try:") == 1
         assert "except Exception:" in queue_block
 
-        # From aggregation to end of the scanner loop (approximated by
-        # watchdog / Gmail renewal marker)
-        next_marker = src.find("Gmail watch renewal", agg_idx)
+        # From aggregation to end of the tracker scan job (the next job
+        # body is the Gmail watch renewal)
+        next_marker = src.find("def renew_gmail_watches", agg_idx)
         if next_marker < 0:
             next_marker = len(src)
         agg_block = src[agg_idx:next_marker]
@@ -158,19 +159,25 @@ class TestDaemonLoopWiring:
 
     def test_each_scanner_wrapped_in_app_context(self):
         """Every scanner invocation must run inside app.app_context()."""
-        src = self._read_wsgi()
-        for scanner in (
-            "scan_and_generate_nudges",
-            "scan_and_generate_queues",
-            "aggregate_email_outcomes",
-        ):
-            idx = src.find(scanner + "()")
-            assert idx > 0, f"{scanner}() call site not found in wsgi.py"
-            # The nearest preceding 500 chars should contain "app.app_context()"
-            preceding = src[max(0, idx - 500):idx]
-            assert "app.app_context()" in preceding, (
-                f"{scanner}() must be called inside app.app_context()"
-            )
+        from flask import Flask, has_app_context
+        from app.services import rq_queue
+
+        seen = []
+
+        def record():
+            seen.append(has_app_context())
+
+        with patch("app.services.nudge_service.scan_and_generate_nudges", record), \
+                patch("app.services.queue_service.scan_and_generate_queues", record), \
+                patch("app.services.email_baseline.aggregate_email_outcomes", record), \
+                patch.object(rq_queue, "_job_app", Flask(__name__)):
+            rq_queue.run_job("tracker_scan")
+        assert seen == [True, True, True]
+
+    def test_wsgi_hands_app_to_scheduler(self):
+        """The web process registers its app so job runs get a context."""
+        src = (pathlib.Path(__file__).resolve().parents[1] / "wsgi.py").read_text()
+        assert "start_scheduler_thread(app)" in src
 
     def test_watchdog_staleness_covers_all_three_scanners(self):
         """_STALENESS dict must list all three scanner health doc names."""
@@ -0,0 +1,523 @@
+"""Tests for the incrementally maintained dashboard aggregates.
+
+The aggregates must describe exactly what the old per-request scans over
+the contacts subcollection computed, both when rebuilt from scratch and
+after a sequence of incremental create/draft/send/reply/delete changes.
+"""
+import copy
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from firebase_admin import firestore as _fs
+from google.cloud.firestore_v1 import Increment
+
+from app.services import dashboard_aggregates as da
+from app.services.dashboard_aggregates import (
+    contact_contribution,
+    dashboard_stats,
+    firm_locations,
+    fold_contributions,
+    load_dashboard_aggregates,
+    rebuild_dashboard_aggregates,
+    record_contact_change,
+    record_contact_changes,
+    recommendations,
+)
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+
+# ---------------------------------------------------------------------------
+# Fixture corpus + in-memory Firestore
+# ---------------------------------------------------------------------------
+
+def build_corpus(n=400, seed=7):
+    rng = random.Random(seed)
+    companies = ["Goldman Sachs", "McKinsey & Company", "Google", "J.P. Morgan", "Acme, Inc.", "a.b"]
+    locations = ["New York, NY", "San Francisco, CA", "Boston, Massachusetts", "Chicago, IL",
+                 "Remote", "", "Austin, TX, USA", "Miami, FL"]
+    statuses = [None, "new_reply", "waiting_on_you", "replied", "no_reply", "waiting_on_reply"]
+    contacts = {}
+    for i in range(n):
+        d = {"firstName": f"F{i}", "lastName": f"L{i}", "email": f"p{i}@x.com"}
+        if rng.random() < 0.85:
+            d["company"] = companies[i % len(companies)] if i % 7 else companies[0]
+        d["location"] = rng.choice(locations)
+        when = NOW - timedelta(days=rng.randint(0, 200))
+        r = rng.random()
+        if r < 0.25:
+            d["gmailDraftId"] = f"d{i}"
+        elif r < 0.35:
+            d["gmail_draft_id"] = f"d{i}"
+        elif r < 0.55:
+            d["gmailThreadId"] = f"t{i}"
+        elif r < 0.6:
+            d["gmailDraftUrl"] = f"https://mail/{i}"
+        if rng.random() < 0.7:
+            d["draftCreatedAt"] = when.isoformat() + "Z"
+        if rng.random() < 0.5:
+            d["lastActivityAt"] = (when + timedelta(days=1)).isoformat()
+        d["createdAt"] = "garbage" if i % 23 == 0 else when.isoformat()
+        d["threadStatus"] = rng.choice(statuses)
+        d["hasUnreadReply"] = rng.random() < 0.1
+        contacts[f"c{i:04d}"] = d
+    return contacts
+
+
+class FakeSnap:
+    def __init__(self, id, data):
+        self.id = id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return copy.deepcopy(self._data)
+
+
+def _merge(target, patch):
+    for k, v in patch.items():
+        if isinstance(v, dict):
+            _merge(target.setdefault(k, {}), v)
+        elif v is _fs.DELETE_FIELD:
+            target.pop(k, None)
+        elif isinstance(v, Increment):
+            target[k] = target.get(k, 0) + v.value
+        else:
+            target[k] = v
+
+
+class FakeDoc:
+    def __init__(self, store, path):
+        self.store, self.path = store, path
+        self.id = path[-1]
+
+    def get(self):
+        return FakeSnap(self.id, self.store.docs.get(self.path))
+
+    def set(self, data, merge=False):
+        self.store.writes += 1
+        if merge:
+            _merge(self.store.docs.setdefault(self.path, {}), data)
+        else:
+            self.store.docs[self.path] = copy.deepcopy(data)
+
+    def collection(self, name):
+        return FakeCollection(self.store, self.path + (name,))
+
+
+class FakeCollection:
+    def __init__(self, store, path):
+        self.store, self.path = store, path
+
+    def document(self, id):
+        return FakeDoc(self.store, self.path + (id,))
+
+    def stream(self):
+        self.store.streams += 1
+        return self._docs()
+
+    def _docs(self):
+        n = len(self.path) + 1
+        return [FakeSnap(p[-1], copy.deepcopy(d)) for p, d in sorted(self.store.docs.items())
+                if len(p) == n and p[:-1] == self.path]
+
+    def where(self, filter):
+        return FakeQuery(self).where(filter)
+
+
+_OPS = {"==": lambda a, b: a == b, "<=": lambda a, b: a <= b}
+
+
+class FakeQuery:
+    """where(FieldFilter) / order_by / limit over a FakeCollection. Like
+    Firestore, a filter or order on a field skips docs whose value is
+    missing or of another type."""
+
+    def __init__(self, coll):
+        self.coll, self.filters, self.order, self.n = coll, [], None, None
+
+    def where(self, filter):
+        self.filters.append(filter)
+        return self
+
+    def order_by(self, field, direction="ASCENDING"):
+        self.order = (field, direction == "DESCENDING")
+        return self
+
+    def limit(self, n):
+        self.n = n
+        return self
+
+    def stream(self):
+        self.coll.store.queries += 1
+        snaps = []
+        for snap in self.coll._docs():
+            d = snap._data
+            ok = True
+            for f in self.filters:
+                v = d.get(f.field_path)
+                ok = ok and v is not None and type(v) is type(f.value) and _OPS[f.op_string](v, f.value)
+            if ok:
+                snaps.append(snap)
+        if self.order:
+            field, desc = self.order
+            snaps.sort(key=lambda sn: sn._data[field], reverse=desc)
+        return snaps[:self.n] if self.n is not None else snaps
+
+
+class FakeDB:
+    def __init__(self, contacts=None, uid="u1"):
+        self.docs = {}
+        self.writes = 0
+        self.streams = 0
+        self.queries = 0
+        for cid, d in (contacts or {}).items():
+            self.docs[("users", uid, "contacts", cid)] = copy.deepcopy(d)
+
+    def collection(self, name):
+        return FakeCollection(self, (name,))
+
+    def get_all(self, refs):
+        return [r.get() for r in refs]
+
+    def contacts(self, uid="u1"):
+        return {p[-1]: d for p, d in self.docs.items() if p[:3] == ("users", uid, "contacts") and len(p) == 4}
+
+
+# ---------------------------------------------------------------------------
+# The scans the aggregates replaced
+# ---------------------------------------------------------------------------
+
+def _legacy_month_key(date_str):
+    try:
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00')).strftime('%Y-%m')
+    except Exception:
+        return None
+
+
+def legacy_stats_tallies(contacts):
+    months = defaultdict(lambda: {"outreach": 0, "replies": 0})
+    firms = defaultdict(lambda: {"contacts": 0, "replies": 0})
+    total_sent = total_replies = 0
+    for data in contacts.values():
+        has_draft = bool(data.get("gmailDraftId") or data.get("gmail_draft_id") or data.get("gmailDraftUrl"))
+        has_thread = bool(data.get("gmailThreadId") or data.get("gmail_thread_id"))
+        if not (has_draft or has_thread):
+            continue
+        total_sent += 1
+        sent_date = data.get("draftCreatedAt") or data.get("lastActivityAt") or data.get("createdAt")
+        mk = _legacy_month_key(sent_date) if sent_date else None
+        if mk:
+            months[mk]["outreach"] += 1
+        has_reply = bool(
+            data.get("hasUnreadReply") or data.get("threadStatus") in ["new_reply", "waiting_on_you"]
+            or (data.get("threadStatus") and "reply" in data.get("threadStatus", "").lower())
+        )
+        if has_reply:
+            total_replies += 1
+            if mk:
+                months[mk]["replies"] += 1
+        company = data.get("company") or ""
+        if company:
+            firms[company]["contacts"] += 1
+            if has_reply:
+                firms[company]["replies"] += 1
+    return total_sent, total_replies, dict(months), {k: dict(v) for k, v in firms.items()}
+
+
+def legacy_recommendations(contacts, now, scan_limit=da.RECOMMENDATION_SCAN_LIMIT):
+    """The old full scan, with the two deliberate changes: follow-ups are
+    the most recently active eligible contacts (not the first by id), and
+    the unread contactIds list stops at scan_limit."""
+    recs = []
+    for cid, data in sorted(contacts.items(), reverse=True,
+                            key=lambda kv: (kv[1].get("lastActivityAt") or kv[1].get("draftCreatedAt") or "", kv[0])):
+        has_draft = bool(data.get("gmailDraftId") or data.get("gmailDraftUrl"))
+        has_thread = bool(data.get("gmailThreadId"))
+        has_reply = bool(data.get("hasUnreadReply") or data.get("threadStatus") in ["new_reply", "waiting_on_you"])
+        if (has_draft or has_thread) and not has_reply:
+            last_activity = data.get("lastActivityAt") or data.get("draftCreatedAt")
+            if last_activity:
+                try:
+                    last_date = datetime.fromisoformat(last_activity.replace('Z', '+00:00'))
+                    days_ago = (now - last_date.replace(tzinfo=None)).days
+                    if days_ago >= 3:
+                        name = f"{data.get('firstName', '')} {data.get('lastName', '')}".strip() or data.get('email', '').split('@')[0]
+                        company = data.get('company', 'Unknown Company')
+                        recs.append({"type": "follow_up", "title": f"Follow up with {name} at {company}",
+                                     "description": f"You reached out {days_ago} days ago - a follow-up could help",
+                                     "action": "Draft follow-up", "contactId": cid, "priority": "high"})
+                except Exception:
+                    pass
+    unread = [(cid, d) for cid, d in sorted(contacts.items())
+              if d.get("hasUnreadReply") or d.get("threadStatus") == "new_reply"]
+    if unread:
+        names = [d.get("company", "contacts") for _, d in unread[:2]]
+        companies_str = " and ".join(names) if len(names) <= 2 else f"{names[0]} and {len(unread) - 1} others"
+        recs.append({"type": "unread_replies",
+                     "title": f"You have {len(unread)} unread {'reply' if len(unread) == 1 else 'replies'} to review",
+                     "description": f"Recent responses from {companies_str}", "action": "View replies",
+                     "contactIds": [cid for cid, _ in unread][:scan_limit], "priority": "high"})
+    firms = defaultdict(int)
+    for _, d in sorted(contacts.items()):
+        if d.get("company"):
+            firms[d["company"]] += 1
+    # Ties used to fall in contact-id order; the aggregates break them by name.
+    top = sorted(firms.items(), key=lambda x: (-x[1], x[0]))[:5]
+    if len(top) >= 3:
+        recs.append({"type": "explore_firms", "title": "Students like you often target these firms next",
+                     "description": f"Based on your search history: {', '.join([f[0] for f in top[:3]])}",
+                     "action": "Explore firms", "priority": "medium"})
+    recs.sort(key=lambda x: {"high": 0, "medium": 1, "low": 2}.get(x.get("priority", "low"), 2))
+    return recs[:3]
+
+
+def legacy_locations(contacts):
+    out = defaultdict(int)
+    for data in contacts.values():
+        company, loc = data.get("company") or "", data.get("location") or ""
+        if company and loc:
+            parts = loc.split(",")
+            if len(parts) >= 2:
+                out[(company, parts[0].strip(), parts[1].strip())] += 1
+    return dict(out)
+
+
+def _agg_tallies(agg):
+    months = {k: {"outreach": v.get("outreach", 0), "replies": v.get("replies", 0)}
+              for k, v in agg["months"].items() if v.get("outreach", 0) or v.get("replies", 0)}
+    firms = {f["name"]: {"contacts": f.get("contacts", 0), "replies": f.get("replies", 0)}
+             for f in agg["firms"].values() if f.get("contacts", 0)}
+    return agg["totalSent"], agg["totalReplies"], months, firms
+
+
+def _agg_locations(agg):
+    return {(l["name"], l["city"], l["state"]): l["contacts"]
+            for l in agg["locations"].values() if l.get("contacts", 0)}
+
+
+def _fold(contacts):
+    return fold_contributions(contact_contribution(cid, d) for cid, d in contacts.items())
+
+
+def _recommendations(contacts):
+    db = FakeDB(contacts)
+    agg = _fold(contacts)
+    return recommendations(agg, da.follow_up_contacts(db, "u1", agg, NOW),
+                           da.unread_reply_contacts(db, "u1", agg), NOW)
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestRebuildEquivalence:
+    def test_tallies_match_legacy_scan(self):
+        contacts = build_corpus()
+        agg = _fold(contacts)
+        assert _agg_tallies(agg) == legacy_stats_tallies(contacts)
+        assert agg["totalSent"] > 50 and agg["totalReplies"] > 5
+
+    def test_locations_match_legacy_scan(self):
+        contacts = build_corpus()
+        assert _agg_locations(_fold(contacts)) == legacy_locations(contacts)
+
+    def test_recommendations_match_legacy(self):
+        contacts = build_corpus()
+        assert _recommendations(contacts) == legacy_recommendations(contacts, NOW)
+
+    def test_recommendations_with_few_follow_ups(self):
+        contacts = {cid: d for cid, d in build_corpus().items()
+                    if not (d.get("gmailDraftId") or d.get("gmailDraftUrl") or d.get("gmailThreadId"))}
+        contacts["c9998"] = {"gmailThreadId": "t", "lastActivityAt": (NOW - timedelta(days=5)).isoformat(),
+                             "firstName": "Ann", "company": "Stripe"}
+        got = _recommendations(contacts)
+        assert got == legacy_recommendations(contacts, NOW)
+        assert [r["type"] for r in got][:2] == ["follow_up", "unread_replies"]
+
+    def test_stats_payload_shape(self):
+        contacts = build_corpus()
+        stats = dashboard_stats(_fold(contacts), NOW)
+        sent, replies, months, firms = legacy_stats_tallies(contacts)
+        assert stats["replyStats"] == {"totalReplies": replies, "totalSent": sent,
+                                       "responseRate": round(replies / sent * 100, 1)}
+        assert [m["month"] for m in stats["outreachByMonth"]][-1] == "Oct"
+        assert stats["outreachByMonth"][-1]["outreach"] == months.get("2026-10", {}).get("outreach", 0)
+        top = stats["topFirms"][0]
+        best = max(firms.items(), key=lambda kv: kv[1]["contacts"])
+        assert (top["name"], top["contacts"]) == (best[0], best[1]["contacts"])
+
+    def test_firm_locations_payload(self):
+        locs = firm_locations(_fold(build_corpus()))
+        assert len(locs) <= 20
+        assert locs == sorted(locs, key=lambda x: -x["contacts"])
+        by_state = {l["state"]: l["coordinates"] for l in locs}
+        assert by_state.get("NY") == {"x": 82, "y": 35}
+        assert by_state.get("Massachusetts") == {"x": 50, "y": 40}
+
+
+class TestIncremental:
+    def test_sequence_of_changes_matches_rebuild(self):
+        contacts = build_corpus(150)
+        db = FakeDB(contacts)
+        rebuild_dashboard_aggregates("u1", db)
+        rng = random.Random(3)
+        live = db.contacts()
+
+        def write(cid, after):
+            before = live.get(cid)
+            record_contact_change("u1", cid, before, after, db)
+            if after is None:
+                live.pop(cid, None)
+            else:
+                live[cid] = after
+
+        for step in range(300):
+            cid = rng.choice(sorted(live))
+            d = dict(live[cid])
+            op = step % 6
+            if op == 0:
+                write(f"n{step:04d}", {"company": rng.choice(["Google", "NewCo"]), "location": "Seattle, WA"})
+            elif op == 1:
+                d.update(gmailDraftId=f"x{step}", draftCreatedAt=(NOW - timedelta(days=step % 40)).isoformat())
+                write(cid, d)
+            elif op == 2:
+                d.update(gmailThreadId=f"t{step}", pipelineStage="waiting_on_reply")
+                write(cid, d)
+            elif op == 3:
+                d.update(hasUnreadReply=True, threadStatus="new_reply")
+                write(cid, d)
+            elif op == 4:
+                d.update(hasUnreadReply=False)
+                write(cid, d)
+            else:
+                write(cid, None)
+
+        agg = db.docs[("users", "u1", "aggregates", "dashboard")]
+        expected = _fold(live)
+        assert _agg_tallies(agg) == _agg_tallies(expected) == legacy_stats_tallies(live)
+        assert _agg_locations(agg) == legacy_locations(live)
+        assert agg["unreadCount"] == expected["unreadCount"]
+        assert agg["awaitingCount"] == expected["awaitingCount"]
+
+    def test_batch_is_one_write_and_matches_rebuild(self):
+        contacts = build_corpus(300)
+        db = FakeDB()
+        assert record_contact_changes("u1", [(cid, None, d) for cid, d in contacts.items()], db)
+        assert db.writes == 1
+        assert _agg_tallies(db.docs[("users", "u1", "aggregates", "dashboard")]) == legacy_stats_tallies(contacts)
+
+    def test_batch_splits_past_the_transform_limit(self, monkeypatch):
+        monkeypatch.setattr(da, "MAX_TRANSFORMS_PER_WRITE", 10)
+        contacts = {f"c{i}": {"company": f"Co{i}", "gmailDraftId": "d", "draftCreatedAt": NOW.isoformat()}
+                    for i in range(12)}
+        payloads = da.changes_delta([(cid, None, d) for cid, d in contacts.items()])
+        assert len(payloads) > 1
+        db = FakeDB()
+        rebuild_dashboard_aggregates("u1", db)
+        record_contact_changes("u1", [(cid, None, d) for cid, d in contacts.items()], db)
+        assert db.writes == 1 + len(payloads)
+        assert _agg_tallies(db.docs[("users", "u1", "aggregates", "dashboard")]) == legacy_stats_tallies(contacts)
+
+    def test_aggregates_hold_no_contact_ids(self):
+        agg = _fold(build_corpus())
+        assert not any(cid in repr(agg) for cid in build_corpus())
+        assert agg["unreadCount"] > 0 and agg["awaitingCount"] > 0
+
+    def test_delete_field_is_not_an_after_value(self):
+        before = {"company": "Google", "gmailDraftId": "d", "hasUnreadReply": True}
+        after = da.apply_contact_update(before, {"hasUnreadReply": _fs.DELETE_FIELD, "notes": "x"})
+        assert after == {"company": "Google", "gmailDraftId": "d", "notes": "x"}
+        assert contact_contribution("c1", after)["counters"][("unreadCount",)] == 0
+
+    def test_irrelevant_change_writes_nothing(self):
+        db = FakeDB()
+        before = {"company": "Google", "gmailDraftId": "d", "notes": "a"}
+        assert record_contact_change("u1", "c1", before, {**before, "notes": "b"}, db) is False
+        assert db.writes == 0
+
+    def test_failures_never_raise(self):
+        db = MagicMock()
+        db.collection.side_effect = RuntimeError("firestore down")
+        assert record_contact_change("u1", "c1", None, {"company": "Google"}, db) is False
+
+    def test_company_names_stay_out_of_field_paths(self):
+        c = contact_contribution("c1", {"company": "a.b`c", "location": "X, Y", "gmailDraftId": "d"})
+        for path in list(c["counters"]) + list(c["labels"]):
+            assert all("." not in part for part in path)
+
+
+class TestLoad:
+    def test_missing_doc_is_rebuilt_once(self):
+        db = FakeDB(build_corpus(50))
+        first = load_dashboard_aggregates("u1", db)
+        load_dashboard_aggregates("u1", db)
+        assert db.streams == 1
+        assert first["version"] == da.AGGREGATES_VERSION
+
+    def test_concurrent_loads_rebuild_once(self):
+        import threading
+        db = FakeDB(build_corpus(50))
+        threads = [threading.Thread(target=load_dashboard_aggregates, args=("u1", db)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert db.streams == 1
+
+    def test_stale_or_old_version_is_rebuilt(self, monkeypatch):
+        db = FakeDB(build_corpus(20))
+        load_dashboard_aggregates("u1", db)
+        ref = ("users", "u1", "aggregates", "dashboard")
+        db.docs[ref]["builtAt"] = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
+        load_dashboard_aggregates("u1", db)
+        assert db.streams == 2
+        db.docs[ref]["version"] = 0
+        load_dashboard_aggregates("u1", db)
+        assert db.streams == 3
+
+
+class TestRoutes:
+    @pytest.fixture()
+    def client(self, monkeypatch):
+        from flask import Flask
+        from app.routes import dashboard
+
+        db = FakeDB(build_corpus(120))
+        monkeypatch.setattr(dashboard, "get_db", lambda: db)
+        app = Flask(__name__)
+        app.register_blueprint(dashboard.dashboard_bp)
+
+        import firebase_admin
+        from app import extensions
+        monkeypatch.setattr(firebase_admin, "_apps", {"[DEFAULT]": object()})
+        monkeypatch.setattr(extensions, "verify_id_token_cached", lambda *a, **k: {"uid": "u1"})
+        monkeypatch.setattr("app.services.lifecycle_signals.touch_last_active", lambda uid: None)
+        return app.test_client(), db
+
+    def test_endpoints_read_aggregates_not_contacts(self, client):
+        c, db = client
+        headers = {"Authorization": "Bearer t"}
+        for path in ("/api/dashboard/stats", "/api/dashboard/recommendations", "/api/dashboard/firm-locations"):
+            for _ in range(2):
+                resp = c.get(path, headers=headers)
+                assert resp.status_code == 200, resp.get_json()
+        assert db.streams == 1  # the one-time build
+        assert db.queries <= 2 * 4  # bounded follow-up / unread id queries
+
+    def test_manual_rebuild_has_a_cooldown(self, client, monkeypatch):
+        c, db = client
+        headers = {"Authorization": "Bearer t"}
+        resp = c.post("/api/dashboard/aggregates/rebuild", headers=headers)
+        assert resp.status_code == 200 and resp.get_json()["rebuilt"] is True
+        resp = c.post("/api/dashboard/aggregates/rebuild", headers=headers)
+        assert resp.status_code == 429 and resp.headers["Retry-After"]
+        assert db.streams == 1
+
+        monkeypatch.setattr(da, "DASHBOARD_AGG_REBUILD_COOLDOWN", 0)
+        resp = c.post("/api/dashboard/aggregates/rebuild", headers=headers)
+        assert resp.status_code == 200
+        assert db.streams == 2
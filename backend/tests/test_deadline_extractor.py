@@ -0,0 +1,299 @@
+"""
+Tests for cohort-deduplicated deadline extraction
+(backend/pipeline/deadline_extractor.py).
+
+Pins:
+  1. Office / group / requisition variants of one program share a cohort;
+     different years, seasons, categories and companies don't.
+  2. One Perplexity call per cohort, fanned out to every member job in
+     batched writes, with calls capped by MAX_PERPLEXITY_PER_RUN.
+  3. A cached cohort answers new postings without a call; stale entries
+     and failed answers are not reused.
+
+Uses a fake Perplexity client and a minimal fake Firestore; no network.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.pipeline import deadline_extractor as de
+
+
+class _FakeRef:
+    def __init__(self, db, collection, doc_id):
+        self._db = db
+        self.collection = collection
+        self.id = doc_id
+
+    def update(self, payload):  # the extractor should only write via batches
+        raise AssertionError("unbatched write")
+
+
+class _FakeDoc:
+    def __init__(self, ref, data):
+        self.reference = ref
+        self.id = ref.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class _FakeQuery:
+    def __init__(self, db, name):
+        self._db = db
+        self._name = name
+
+    def order_by(self, *_a, **_k):
+        return self
+
+    def limit(self, *_a, **_k):
+        return self
+
+    def stream(self):
+        return [_FakeDoc(_FakeRef(self._db, self._name, k), v)
+                for k, v in self._db.store[self._name].items()]
+
+
+class _FakeCollection(_FakeQuery):
+    def document(self, doc_id):
+        return _FakeRef(self._db, self._name, doc_id)
+
+
+class _FakeBatch:
+    def __init__(self, db):
+        self._db = db
+        self._ops = []
+
+    def update(self, ref, payload):
+        self._ops.append((ref, payload))
+
+    def set(self, ref, payload, merge=False):
+        self._ops.append((ref, payload))
+
+    def commit(self):
+        self._db.commits.append(len(self._ops))
+        for ref, payload in self._ops:
+            self._db.store[ref.collection].setdefault(ref.id, {}).update(payload)
+
+
+class _FakeDb:
+    def __init__(self, jobs, cache=None):
+        self.store = {
+            "jobs": {k: dict(v) for k, v in jobs.items()},
+            de.COHORT_CACHE_COLLECTION: {k: dict(v) for k, v in (cache or {}).items()},
+        }
+        self.commits = []
+
+    def collection(self, name):
+        self.store.setdefault(name, {})
+        return _FakeCollection(self, name)
+
+    def get_all(self, refs):
+        return [_FakeDoc(r, self.store[r.collection].get(r.id)) for r in refs]
+
+    def batch(self):
+        return _FakeBatch(self)
+
+
+class FakePerplexity:
+    """Answers by company; records prompts and peak concurrency."""
+
+    def __init__(self, answers, delay=0.0):
+        self.answers = answers
+        self.delay = delay
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt, recency=None):
+        with self._lock:
+            self.prompts.append(prompt)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            for company, answer in self.answers.items():
+                if f"at {company} " in prompt:
+                    if isinstance(answer, Exception):
+                        raise answer
+                    return {"content": answer, "citations": []}
+            return {"content": "unknown", "citations": []}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _job(company, title, category="ib_summer_analyst", **extra):
+    return {"company": company, "title": title, "category": category, **extra}
+
+
+GS_OFFICES = {
+    f"gs-{i}": _job("Goldman Sachs", f"2027 Summer Analyst Program - {city}")
+    for i, city in enumerate(["New York", "Dallas", "Salt Lake City", "Chicago"])
+}
+
+
+@pytest.fixture
+def run(monkeypatch):
+    import app.config
+    import app.extensions
+    import app.services.perplexity_client
+
+    monkeypatch.setattr(app.config, "PERPLEXITY_API_KEY", "test-key")
+
+    def _run(db, client, **kw):
+        monkeypatch.setattr(app.extensions, "get_db", lambda: db)
+        monkeypatch.setattr(app.services.perplexity_client, "quick_search", client)
+        return de.extract_deadlines(**kw)
+    return _run
+
+
+# ── 1. Cohort keys ───────────────────────────────────────────────────────────
+
+
+class TestCohortKey:
+    @pytest.mark.parametrize("title", [
+        "2027 Summer Analyst Program - New York",
+        "2027 Summer Analyst (Dallas)",
+        "Goldman Sachs 2027 Summer Analyst - Technology, Media & Telecom Group",
+        "Summer 2027 Analyst, Req #12345",
+        "2027 Summer Analysts | R0034567",
+    ])
+    def test_office_and_group_variants_collapse(self, title):
+        base = de.cohort_key("Goldman Sachs", "2027 Summer Analyst", "ib_summer_analyst")
+        assert de.cohort_key("Goldman Sachs", title, "ib_summer_analyst") == base
+
+    def test_company_suffixes_collapse(self):
+        assert (de.cohort_key("Goldman Sachs Group, Inc.", "2027 Summer Analyst", "ib_summer_analyst")
+                == de.cohort_key("Goldman Sachs", "2027 Summer Analyst", "ib_summer_analyst"))
+
+    @pytest.mark.parametrize("company,title,category", [
+        ("Goldman Sachs", "2026 Summer Analyst", "ib_summer_analyst"),
+        ("Goldman Sachs", "2027 Off-Cycle Analyst", "ib_summer_analyst"),
+        ("Goldman Sachs", "2027 Summer Analyst", "year_coded_analyst"),
+        ("Morgan Stanley", "2027 Summer Analyst", "ib_summer_analyst"),
+        ("Goldman Sachs", "2027 Summer Analyst - Full-Time", "ib_summer_analyst"),
+    ])
+    def test_different_cycles_stay_apart(self, company, title, category):
+        base = de.cohort_key("Goldman Sachs", "2027 Summer Analyst", "ib_summer_analyst")
+        assert de.cohort_key(company, title, category) != base
+
+    def test_key_is_a_valid_document_id(self):
+        key = de.cohort_key("AC/DC Capital", "2027 Summer Analyst / Trading", "quant_intern")
+        assert "/" not in key and key
+
+
+# ── 2. Resolution and fan-out ────────────────────────────────────────────────
+
+
+class TestExtract:
+    def test_one_call_per_cohort_fanned_out(self, run):
+        jobs = {**GS_OFFICES, "ms-0": _job("Morgan Stanley", "2027 Summer Analyst - NY")}
+        db = _FakeDb(jobs)
+        client = FakePerplexity({"Goldman Sachs": "2026-10-01", "Morgan Stanley": "rolling"})
+
+        result = run(db, client)
+
+        assert len(client.prompts) == 2
+        assert result["perplexity_calls"] == 2 and result["cohorts"] == 2
+        assert result["completed"] == 5 and result["processed"] == 5
+        assert result["cost_estimate_usd"] == pytest.approx(2 * de.PERPLEXITY_DEADLINE_COST_PER_CALL)
+        for jid in GS_OFFICES:
+            assert db.store["jobs"][jid]["application_deadline"] == "2026-10-01"
+            assert db.store["jobs"][jid]["deadline_source"] == "perplexity"
+        assert db.store["jobs"]["ms-0"]["application_deadline"] == "rolling"
+        assert db.commits == [len(jobs) + 2]  # members + two cache entries, one batch
+
+    def test_writes_are_chunked(self, run, monkeypatch):
+        monkeypatch.setattr(de, "BATCH_WRITE_SIZE", 2)
+        db = _FakeDb(GS_OFFICES)
+        run(db, FakePerplexity({"Goldman Sachs": "2026-10-01"}))
+        assert db.commits == [2, 2, 1]
+
+    def test_call_cap_prefers_large_cohorts_and_defers_the_rest(self, run):
+        jobs = {
+            **GS_OFFICES,
+            "ms-0": _job("Morgan Stanley", "2027 Summer Analyst"),
+            "jpm-0": _job("JPMorgan", "2027 Summer Analyst"),
+        }
+        db = _FakeDb(jobs)
+        client = FakePerplexity({"Goldman Sachs": "2026-10-01"})
+
+        result = run(db, client, limit=1)
+
+        assert len(client.prompts) == 1 and "Goldman Sachs" in client.prompts[0]
+        assert result["deferred"] == 2
+        assert "deadline_extraction_status" not in db.store["jobs"]["ms-0"]
+        assert "deadline_extraction_status" not in db.store["jobs"]["jpm-0"]
+
+    def test_cohorts_resolve_concurrently_within_bound(self, run, monkeypatch):
+        monkeypatch.setattr(de, "DEADLINE_CONCURRENCY", 3)
+        jobs = {f"c{i}": _job(f"Firm{i}", "2027 Summer Analyst") for i in range(8)}
+        client = FakePerplexity({}, delay=0.05)
+        run(_FakeDb(jobs), client)
+        assert len(client.prompts) == 8
+        assert client.max_in_flight == 3
+
+    def test_failures_and_unusable_jobs(self, run):
+        jobs = {
+            "gs-0": _job("Goldman Sachs", "2027 Summer Analyst"),
+            "bad-0": _job("Evercore", "2027 Summer Analyst"),
+            "notitle": _job("Lazard", ""),
+        }
+        db = _FakeDb(jobs)
+        client = FakePerplexity({"Goldman Sachs": "unknown", "Evercore": RuntimeError("503")})
+
+        result = run(db, client)
+
+        assert result == {**result, "completed": 1, "failed": 1, "skipped": 1}
+        assert db.store["jobs"]["gs-0"]["deadline_extraction_status"] == de.DEADLINE_COMPLETED
+        assert "application_deadline" not in db.store["jobs"]["gs-0"]
+        assert db.store["jobs"]["bad-0"]["deadline_extraction_status"] == de.DEADLINE_FAILED
+        assert db.store["jobs"]["notitle"]["deadline_extraction_status"] == de.DEADLINE_SKIPPED
+        # 'unknown' is a real answer and is cached; the error is not.
+        assert list(db.store[de.COHORT_CACHE_COLLECTION]) == [
+            de.cohort_key("Goldman Sachs", "2027 Summer Analyst", "ib_summer_analyst")
+        ]
+
+    def test_no_api_key_is_a_noop(self, run, monkeypatch):
+        import app.config
+        monkeypatch.setattr(app.config, "PERPLEXITY_API_KEY", None)
+        client = FakePerplexity({})
+        result = run(_FakeDb(GS_OFFICES), client)
+        assert result["processed"] == 0 and client.prompts == []
+
+
+# ── 3. Cohort cache ──────────────────────────────────────────────────────────
+
+
+class TestCohortCache:
+    def test_new_postings_hit_the_cache(self, run):
+        db = _FakeDb(GS_OFFICES)
+        run(db, FakePerplexity({"Goldman Sachs": "2026-10-01"}))
+
+        db.store["jobs"]["gs-new"] = _job("Goldman Sachs, Inc.", "2027 Summer Analyst (Boston)")
+        client = FakePerplexity({"Goldman Sachs": "2026-11-15"})
+        result = run(db, client)
+
+        assert client.prompts == []
+        assert result["cache_hits"] == 1 and result["perplexity_calls"] == 0
+        assert result["completed"] == 1 and result["cost_estimate_usd"] == 0.0
+        assert db.store["jobs"]["gs-new"]["application_deadline"] == "2026-10-01"
+
+    def test_stale_entries_are_resolved_again(self, run):
+        key = de.cohort_key("Goldman Sachs", "2027 Summer Analyst", "ib_summer_analyst")
+        old = datetime.now(timezone.utc) - timedelta(days=de.COHORT_CACHE_TTL_DAYS + 1)
+        db = _FakeDb(GS_OFFICES, cache={key: {"application_deadline": "2025-10-01", "resolved_at": old}})
+        client = FakePerplexity({"Goldman Sachs": "2026-10-01"})
+
+        run(db, client)
+
+        assert len(client.prompts) == 1
+        assert db.store[de.COHORT_CACHE_COLLECTION][key]["application_deadline"] == "2026-10-01"
+        assert db.store["jobs"]["gs-0"]["application_deadline"] == "2026-10-01"
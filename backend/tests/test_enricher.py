@@ -0,0 +1,356 @@
+"""
+Tests for the URL-deduplicated enrichment queue (backend/pipeline/enricher.py).
+
+Pins:
+  1. canonical_apply_url collapses tracking / fragment / /apply variants but
+     keeps params that pick the job.
+  2. Jobs sharing a canonical URL share one Firecrawl scrape, and every
+     member is written through batched commits (no per-doc updates).
+  3. The per-URL cache serves re-ingested postings until its TTL, except
+     when a member still needs prose the cached extract doesn't have.
+  4. Backfill reads the indexed enrichment_status='backfill' queue and only
+     walks the posted_at window to refill it, skipping ranges a prior
+     scan already stamped.
+
+Uses a minimal fake Firestore and a fake Firecrawl extractor; no network.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.pipeline import enricher
+
+
+class _FakeRef:
+    def __init__(self, collection, doc_id):
+        self.collection = collection
+        self.id = doc_id
+
+    def update(self, payload):
+        raise AssertionError("unbatched write")
+
+
+class _FakeDoc:
+    def __init__(self, ref, data):
+        self.reference = ref
+        self.id = ref.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+_OPS = {
+    "==": lambda a, b: a == b,
+    ">=": lambda a, b: a is not None and a >= b,
+}
+
+
+class _FakeQuery:
+    def __init__(self, db, name, filters=()):
+        self._db = db
+        self._name = name
+        self._filters = list(filters)
+        self._limit = None
+
+    def where(self, filter):
+        return type(self)(self._db, self._name, self._filters + [filter])
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def stream(self):
+        self._db.queries.append((self._name, [(f.field_path, f.op_string) for f in self._filters]))
+        out = []
+        for doc_id, data in self._db.store[self._name].items():
+            if all(_OPS[f.op_string](data.get(f.field_path), f.value) for f in self._filters):
+                out.append(_FakeDoc(_FakeRef(self._name, doc_id), data))
+        return out[: self._limit] if self._limit else out
+
+
+class _FakeCollection(_FakeQuery):
+    def document(self, doc_id):
+        return _FakeRef(self._name, doc_id)
+
+
+class _FakeBatch:
+    def __init__(self, db):
+        self._db = db
+        self._ops = []
+
+    def update(self, ref, payload):
+        self._ops.append(("update", ref, payload))
+
+    def set(self, ref, payload, merge=False):
+        self._ops.append(("set", ref, payload))
+
+    def commit(self):
+        self._db.commits.append(len(self._ops))
+        for _, ref, payload in self._ops:
+            self._db.store[ref.collection].setdefault(ref.id, {}).update(payload)
+
+
+class _FakeDb:
+    def __init__(self, jobs):
+        self.store = {"jobs": {k: dict(v) for k, v in jobs.items()}}
+        self.commits = []
+        self.queries = []
+
+    def collection(self, name):
+        self.store.setdefault(name, {})
+        return _FakeCollection(self, name)
+
+    def get_all(self, refs):
+        return [_FakeDoc(r, self.store[r.collection].get(r.id)) for r in refs]
+
+    def batch(self):
+        return _FakeBatch(self)
+
+
+class FakeFirecrawl:
+    def __init__(self, description="Full posting prose", fail=()):
+        self.calls = []
+        self.description = description
+        self.fail = set(fail)
+        self._lock = threading.Lock()
+
+    def __call__(self, url, wait_for_ms=0):
+        with self._lock:
+            self.calls.append((url, wait_for_ms))
+        if url in self.fail:
+            return None
+        return {
+            "requirements": [f"req for {url}"],
+            "experience_level": "entry",
+            "description": self.description,
+        }
+
+
+def _job(url, status="pending", **extra):
+    return {"apply_url": url, "enrichment_status": status, "description_raw": "has prose", **extra}
+
+
+@pytest.fixture
+def run(monkeypatch):
+    import backend.app.config
+    import backend.app.extensions
+
+    monkeypatch.setattr(backend.app.config, "FIRECRAWL_API_KEY", "test-key")
+
+    def _run(db, firecrawl, **kw):
+        monkeypatch.setattr(backend.app.extensions, "get_db", lambda: db)
+        monkeypatch.setattr(enricher, "_extract_structured", firecrawl)
+        return enricher.enrich_jobs(**kw)
+    return _run
+
+
+# ── 1. URL canonicalization ──────────────────────────────────────────────────
+
+
+class TestCanonicalUrl:
+    @pytest.mark.parametrize("variant", [
+        "https://jobs.lever.co/acme/abc-123",
+        "https://www.jobs.lever.co/acme/abc-123/",
+        "http://JOBS.LEVER.CO/acme/abc-123/apply?lever-source=LinkedIn",
+        "jobs.lever.co/acme/abc-123?utm_source=x&utm_campaign=y#apply",
+    ])
+    def test_variants_collapse(self, variant):
+        assert enricher.canonical_apply_url(variant) == "https://jobs.lever.co/acme/abc-123"
+
+    def test_greenhouse_hosts_collapse(self):
+        assert (enricher.canonical_apply_url("https://job-boards.greenhouse.io/acme/jobs/42?gh_src=a")
+                == enricher.canonical_apply_url("https://boards.greenhouse.io/acme/jobs/42"))
+
+    def test_job_identifying_params_are_kept(self):
+        a = enricher.canonical_apply_url("https://acme.com/careers?gh_jid=1&utm_medium=z")
+        b = enricher.canonical_apply_url("https://acme.com/careers?gh_jid=2")
+        assert a == "https://acme.com/careers?gh_jid=1" and a != b
+
+    def test_path_case_is_kept(self):
+        assert enricher.canonical_apply_url("https://acme.wd5.myworkdayjobs.com/Ext/job/R-1").endswith("/Ext/job/R-1")
+
+
+# ── 2. Shared scrapes and batched writes ─────────────────────────────────────
+
+
+class TestQueue:
+    def test_duplicate_urls_share_one_scrape(self, run):
+        db = _FakeDb({
+            "a": _job("https://jobs.lever.co/acme/1"),
+            "b": _job("https://jobs.lever.co/acme/1/apply?lever-source=indeed"),
+            "c": _job("https://boards.greenhouse.io/beta/jobs/9"),
+            "d": {"enrichment_status": "pending"},
+        })
+        firecrawl = FakeFirecrawl()
+
+        result = run(db, firecrawl)
+
+        assert len(firecrawl.calls) == 2
+        assert result == {**result, "processed": 4, "enriched": 3, "skipped": 1, "failed": 0,
+                          "unique_urls": 2, "scrapes": 2}
+        assert result["cost_estimate_usd"] == pytest.approx(2 * enricher.FIRECRAWL_COST_PER_SCRAPE)
+        jobs = db.store["jobs"]
+        assert jobs["a"]["structured"]["requirements"] == jobs["b"]["structured"]["requirements"]
+        assert jobs["a"]["enrichment_status"] == enricher.ENRICHMENT_COMPLETED
+        assert jobs["d"]["enrichment_status"] == enricher.ENRICHMENT_SKIPPED
+        assert db.commits == [4 + 2]  # four jobs + two cache entries
+
+    def test_prose_is_recovered_only_where_missing(self, run):
+        db = _FakeDb({
+            "a": _job("https://jobs.lever.co/acme/1"),
+            "b": _job("https://jobs.lever.co/acme/1", description_raw=""),
+        })
+        firecrawl = FakeFirecrawl()
+        run(db, firecrawl)
+        assert firecrawl.calls == [("https://jobs.lever.co/acme/1", enricher.DESC_SCRAPE_WAIT_MS)]
+        assert db.store["jobs"]["a"]["description_raw"] == "has prose"
+        assert db.store["jobs"]["b"]["description_raw"] == "Full posting prose"
+
+    def test_failed_scrape_marks_every_member(self, run):
+        url = "https://jobs.lever.co/acme/1"
+        db = _FakeDb({"a": _job(url), "b": _job(url + "/")})
+        result = run(db, FakeFirecrawl(fail={url}))
+        assert result["failed"] == 2
+        assert {j["enrichment_status"] for j in db.store["jobs"].values()} == {enricher.ENRICHMENT_FAILED}
+        assert db.store[enricher.URL_CACHE_COLLECTION] == {}
+
+    def test_writes_are_chunked(self, run, monkeypatch):
+        monkeypatch.setattr(enricher, "BATCH_WRITE_SIZE", 3)
+        db = _FakeDb({f"j{i}": _job(f"https://jobs.lever.co/acme/{i % 2}") for i in range(6)})
+        run(db, FakeFirecrawl())
+        assert sum(db.commits) == 6 + 2
+        assert max(db.commits) <= 3
+
+    def test_scrapes_flush_every_few_groups(self, run, monkeypatch):
+        monkeypatch.setattr(enricher, "FLUSH_EVERY_GROUPS", 2)
+        db = _FakeDb({f"j{i}": _job(f"https://jobs.lever.co/acme/{i}") for i in range(5)})
+        firecrawl = FakeFirecrawl()
+        flushed_at = []
+        commit = _FakeBatch.commit
+        monkeypatch.setattr(_FakeBatch, "commit",
+                            lambda self: (flushed_at.append(len(firecrawl.calls)), commit(self)))
+        result = run(db, firecrawl)
+        assert result["enriched"] == 5
+        assert flushed_at == [2, 4, 5]  # results land before the run ends
+
+    def test_scrapes_flush_on_a_timer(self, run, monkeypatch):
+        monkeypatch.setattr(enricher, "FLUSH_SECONDS", 0)
+        db = _FakeDb({f"j{i}": _job(f"https://jobs.lever.co/acme/{i}") for i in range(3)})
+        run(db, FakeFirecrawl())
+        assert db.commits == [2, 2, 2]
+
+    def test_failed_commit_counts_as_failed(self, run, monkeypatch):
+        db = _FakeDb({"a": _job("https://jobs.lever.co/acme/1")})
+        monkeypatch.setattr(_FakeBatch, "commit", lambda self: (_ for _ in ()).throw(RuntimeError("quota")))
+        result = run(db, FakeFirecrawl())
+        assert result["failed"] == 1 and result["enriched"] == 0
+
+    def test_backfill_scrapes_concurrently(self, run):
+        db = _FakeDb({f"j{i}": _job(f"https://jobs.lever.co/acme/{i}", status="backfill") for i in range(5)})
+        firecrawl = FakeFirecrawl()
+        result = run(db, firecrawl, backfill=True, since_days=None)
+        assert result["enriched"] == 5 and len(firecrawl.calls) == 5
+
+
+# ── 3. Per-URL cache ─────────────────────────────────────────────────────────
+
+
+class TestUrlCache:
+    def test_reingested_posting_reuses_prior_extract(self, run):
+        db = _FakeDb({"a": _job("https://jobs.lever.co/acme/1")})
+        run(db, FakeFirecrawl())
+
+        db.store["jobs"]["a2"] = _job("https://www.jobs.lever.co/acme/1?utm_source=x")
+        firecrawl = FakeFirecrawl()
+        result = run(db, firecrawl)
+
+        assert firecrawl.calls == []
+        assert result["url_cache_hits"] == 1 and result["cost_estimate_usd"] == 0.0
+        assert db.store["jobs"]["a2"]["structured"]["requirements"] == ["req for https://jobs.lever.co/acme/1"]
+
+    def test_expired_entry_is_scraped_again(self, run, monkeypatch):
+        db = _FakeDb({"a": _job("https://jobs.lever.co/acme/1")})
+        run(db, FakeFirecrawl())
+        for entry in db.store[enricher.URL_CACHE_COLLECTION].values():
+            entry["cached_at"] = time.time() - enricher.URL_CACHE_TTL_DAYS * 86400 - 1
+
+        db.store["jobs"]["a2"] = _job("https://jobs.lever.co/acme/1")
+        firecrawl = FakeFirecrawl()
+        run(db, firecrawl)
+        assert len(firecrawl.calls) == 1
+
+    def test_cached_extract_without_prose_rescrapes_for_prose(self, run):
+        db = _FakeDb({"a": _job("https://jobs.lever.co/acme/1")})
+        run(db, FakeFirecrawl(description=""))
+
+        db.store["jobs"]["a2"] = _job("https://jobs.lever.co/acme/1", description_raw="")
+        firecrawl = FakeFirecrawl()
+        run(db, firecrawl)
+        assert firecrawl.calls == [("https://jobs.lever.co/acme/1", enricher.DESC_SCRAPE_WAIT_MS)]
+        assert db.store["jobs"]["a2"]["description_raw"] == "Full posting prose"
+
+
+# ── 4. Indexed backfill queue ────────────────────────────────────────────────
+
+
+class TestBackfillQueue:
+    def _legacy_db(self):
+        now = datetime.now(timezone.utc)
+        return _FakeDb({
+            "new": {"apply_url": "https://a.co/1", "posted_at": now - timedelta(days=1)},
+            "old": {"apply_url": "https://a.co/2", "posted_at": now - timedelta(days=40)},
+            "has-structured": {"apply_url": "https://a.co/3", "posted_at": now, "structured": {"x": 1}},
+            "done": {"apply_url": "https://a.co/4", "posted_at": now, "enrichment_status": "completed"},
+        })
+
+    def test_mark_queues_window_and_promotes_structured(self):
+        db = self._legacy_db()
+        assert enricher._mark_backfill(db, since_days=14) == 1
+        jobs = db.store["jobs"]
+        assert jobs["new"]["enrichment_status"] == enricher.ENRICHMENT_BACKFILL
+        assert "enrichment_status" not in jobs["old"]
+        assert jobs["has-structured"]["enrichment_status"] == enricher.ENRICHMENT_COMPLETED
+        assert db.queries == [("jobs", [("posted_at", ">=")])]
+
+    def test_full_queue_skips_the_refill_scan(self):
+        db = _FakeDb({f"j{i}": {"enrichment_status": "backfill"} for i in range(3)})
+        out = enricher._collect_backfill(db, 2, since_days=14)
+        assert len(out) == 2
+        assert db.queries == [("jobs", [("enrichment_status", "==")])]
+
+    def test_short_queue_is_refilled_then_read(self):
+        db = self._legacy_db()
+        out = enricher._collect_backfill(db, 10, since_days=14)
+        assert [ref.id for ref, _ in out] == ["new"]
+        assert [q[1] for q in db.queries] == [
+            [("enrichment_status", "==")], [("posted_at", ">=")], [("enrichment_status", "==")],
+        ]
+
+    def test_full_scan_is_not_repeated(self):
+        db = self._legacy_db()
+        assert enricher._mark_backfill(db) == 2
+        assert db.store["pipeline_state"]["enrich_backfill"]["full_scan_done"] is True
+        db.store["jobs"]["late"] = {"apply_url": "https://a.co/5"}
+        assert enricher._mark_backfill(db) == 0
+        assert enricher._mark_backfill(db, since_days=14) == 0
+        assert db.queries == [("jobs", [])]
+
+    def test_window_inside_scanned_range_skips_the_scan(self):
+        db = self._legacy_db()
+        assert enricher._mark_backfill(db, since_days=14) == 1
+        assert enricher._mark_backfill(db, since_days=7) == 0
+        assert len(db.queries) == 1
+        # A wider window still scans, and widens the watermark.
+        assert enricher._mark_backfill(db, since_days=60) == 1
+        assert len(db.queries) == 2
+        assert enricher._mark_backfill(db, since_days=30) == 0
+
+    def test_failed_stamp_leaves_the_scan_enabled(self, monkeypatch):
+        db = self._legacy_db()
+        monkeypatch.setattr(enricher, "_commit", lambda db, writes: len(writes))
+        enricher._mark_backfill(db)
+        assert "enrich_backfill" not in db.store.get("pipeline_state", {})
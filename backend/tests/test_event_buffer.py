@@ -0,0 +1,238 @@
+"""
+Tests for buffered event writes (app/services/event_buffer.py) and the two
+log_event entry points that use it.
+
+Pins:
+  1. Writes are committed in WriteBatches of at most flush_size, either on
+     an explicit flush, when the queue fills a batch, or once the oldest
+     write has waited flush_seconds.
+  2. Idempotency keys stay document ids: a duplicate fails only itself,
+     the rest of its batch is replayed and written.
+  3. Backpressure: past max_pending, put() drops and counts instead of
+     growing; commit errors are counted, never raised.
+  4. events_service.log_event returns the queued id and stamps lifecycle
+     signals only after the event is written.
+
+Minimal fake Firestore batch; no network.
+"""
+import os
+import threading
+
+import pytest
+
+from app.services import event_buffer as eb
+
+
+class _FakeRef:
+    def __init__(self, path):
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def document(self, doc_id):
+        return _FakeRef(f"{self.path}/{doc_id}")
+
+    def collection(self, name):
+        return _FakeRef(f"{self.path}/{name}")
+
+
+class _FakeBatch:
+    def __init__(self, db):
+        self._db = db
+        self._ops = []
+
+    def create(self, ref, data):
+        self._ops.append(("create", ref.path, data))
+
+    def set(self, ref, data):
+        self._ops.append(("set", ref.path, data))
+
+    def commit(self):
+        with self._db.lock:
+            if self._db.fail:
+                raise RuntimeError(self._db.fail)
+            dupes = [p for op, p, _ in self._ops if op == "create" and p in self._db.docs]
+            if dupes:
+                raise RuntimeError(f"409 ALREADY_EXISTS: Document already exists: {dupes[0]}")
+            for _, path, data in self._ops:
+                self._db.docs[path] = data
+            self._db.commits.append(len(self._ops))
+            self._db.committed.set()
+
+
+class _FakeDb:
+    def __init__(self):
+        self.docs = {}
+        self.commits = []
+        self.fail = None
+        self.lock = threading.Lock()
+        self.committed = threading.Event()
+
+    def collection(self, name):
+        return _FakeRef(name)
+
+    def batch(self):
+        return _FakeBatch(self)
+
+
+def _write(doc_id, create=False, **kw):
+    return eb.PendingWrite(path=("metrics_events",), doc_id=doc_id, data={"n": doc_id}, create=create, **kw)
+
+
+@pytest.fixture
+def db():
+    return _FakeDb()
+
+
+def _buffer(db, **kw):
+    kw.setdefault("flush_seconds", 60)
+    return eb.EventBuffer("test", lambda: db, **kw)
+
+
+# ── 1. Batching ──────────────────────────────────────────────────────────────
+
+
+class TestBatching:
+    def test_flush_commits_in_chunks(self, db):
+        buf = _buffer(db, flush_size=500)
+        for i in range(5):
+            assert buf.put(_write(f"e{i}"))
+        buf.flush_size = 2
+        assert buf.flush() == 5
+        assert db.commits == [2, 2, 1]
+        assert sorted(db.docs) == [f"metrics_events/e{i}" for i in range(5)]
+        assert buf.stats() == {**buf.stats(), "enqueued": 5, "written": 5, "flushes": 3, "pending": 0}
+
+    def test_full_batch_flushes_in_the_background(self, db):
+        buf = _buffer(db, flush_size=3)
+        for i in range(3):
+            buf.put(_write(f"e{i}"))
+        assert db.committed.wait(2)
+        assert db.commits == [3]
+
+    def test_old_writes_flush_on_time(self, db):
+        buf = _buffer(db, flush_seconds=0.05)
+        buf.put(_write("e0"))
+        assert db.committed.wait(2)
+        assert "metrics_events/e0" in db.docs and buf.pending() == 0
+
+    def test_nested_collection_path(self, db):
+        buf = _buffer(db)
+        buf.put(eb.PendingWrite(path=("users", "u1", "events"), doc_id="k", data={}))
+        buf.flush()
+        assert list(db.docs) == ["users/u1/events/k"]
+
+    def test_disabled_buffer_writes_inline(self, db):
+        buf = _buffer(db, enabled=False)
+        assert buf.put(_write("e0"))
+        assert db.commits == [1] and buf.pending() == 0
+
+    def test_flush_all_drains_every_buffer(self, db):
+        a, b = _buffer(db), _buffer(db)
+        a.put(_write("a"))
+        b.put(_write("b"))
+        eb.flush_all()
+        assert sorted(db.docs) == ["metrics_events/a", "metrics_events/b"]
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+    def test_fork_child_starts_empty(self, db):
+        # A real fork: resetting in-process would swap the locks under this
+        # (and every other live) buffer's flusher thread.
+        buf = _buffer(db)
+        buf.put(_write("e0"))
+        pid = os.fork()
+        if pid == 0:
+            ok = buf.pending() == 0 and buf.stats()["enqueued"] == 0 and buf.put(_write("e1"))
+            os._exit(0 if ok and buf.pending() == 1 else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert buf.pending() == 1  # the parent keeps what it queued
+
+
+# ── 2. Idempotency ───────────────────────────────────────────────────────────
+
+
+class TestIdempotency:
+    def test_duplicate_key_skips_only_itself(self, db):
+        db.docs["metrics_events/dup"] = {"n": "original"}
+        called = []
+        buf = _buffer(db)
+        buf.put(_write("a", create=True, on_commit=lambda: called.append("a")))
+        buf.put(_write("dup", create=True, on_commit=lambda: called.append("dup")))
+        buf.put(_write("b"))
+        buf.flush()
+        assert db.docs["metrics_events/dup"] == {"n": "original"}
+        assert "metrics_events/a" in db.docs and "metrics_events/b" in db.docs
+        assert called == ["a"]
+        assert buf.stats() == {**buf.stats(), "written": 2, "duplicates": 1, "failed": 0}
+
+    def test_keyless_writes_use_set(self, db):
+        buf = _buffer(db)
+        buf.put(_write("x"))
+        buf.flush()
+        buf.put(_write("x"))  # a retried flush overwrites instead of failing
+        buf.flush()
+        assert buf.stats()["written"] == 2
+
+
+# ── 3. Backpressure and failures ─────────────────────────────────────────────
+
+
+class TestBackpressure:
+    def test_full_buffer_drops_and_counts(self, db):
+        buf = _buffer(db, max_pending=2, flush_size=500)
+        results = [buf.put(_write(f"e{i}")) for i in range(4)]
+        assert results == [True, True, False, False]
+        assert buf.stats() == {**buf.stats(), "enqueued": 2, "dropped": 2, "pending": 2}
+
+    def test_commit_errors_are_counted_not_raised(self, db):
+        db.fail = "503 unavailable"
+        buf = _buffer(db)
+        buf.put(_write("e0"))
+        buf.put(_write("e1"))
+        assert buf.flush() == 2
+        assert buf.stats() == {**buf.stats(), "failed": 2, "written": 0}
+
+    def test_missing_db_is_a_failure(self):
+        buf = eb.EventBuffer("test", lambda: None, flush_seconds=60)
+        buf.put(_write("e0"))
+        buf.flush()
+        assert buf.stats()["failed"] == 1
+
+
+# ── 4. events_service.log_event ──────────────────────────────────────────────
+
+
+class TestEventsService:
+    @pytest.fixture
+    def service(self, monkeypatch, db):
+        from app.services import events_service
+        stamped = []
+        monkeypatch.setattr(events_service, "get_db", lambda: db)
+        monkeypatch.setattr(events_service, "is_enabled", lambda *a, **k: True)
+        monkeypatch.setattr(events_service, "_stamp_lifecycle_signal", lambda uid, et: stamped.append(uid))
+        return events_service, stamped
+
+    def test_returns_key_and_stamps_after_write(self, service, db):
+        service, stamped = service
+        event = next(iter(service.FRONTEND_ALLOWLIST)).value
+        doc_id = service.log_event("u1", event, idempotency_key="k1", source="frontend")
+        assert doc_id == "k1" and stamped == []
+        service.EVENTS_BUFFER.flush()
+        assert "users/u1/events/k1" in db.docs and stamped == ["u1"]
+
+        assert service.log_event("u1", event, idempotency_key="k1", source="frontend") == "k1"
+        service.EVENTS_BUFFER.flush()
+        assert stamped == ["u1"]  # duplicate: no second stamp
+
+    def test_generated_id_is_the_written_doc(self, service, db):
+        service, _ = service
+        event = next(iter(service.FRONTEND_ALLOWLIST)).value
+        doc_id = service.log_event("u1", event, source="frontend")
+        service.EVENTS_BUFFER.flush()
+        assert len(doc_id) == 20 and f"users/u1/events/{doc_id}" in db.docs
+
+    def test_dropped_event_returns_none(self, service, monkeypatch):
+        service, _ = service
+        monkeypatch.setattr(service.EVENTS_BUFFER, "max_pending", 0)
+        event = next(iter(service.FRONTEND_ALLOWLIST)).value
+        assert service.log_event("u1", event, source="frontend") is None
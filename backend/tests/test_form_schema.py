@@ -0,0 +1,291 @@
+"""
+Tests for the single-evaluate form snapshot (app/services/auto_apply/form_schema.py)
+and the filler passes that read from it.
+
+The pass tests use a fake page that serves the snapshot payload and records
+every other round trip. The equivalence test renders the captured ATS
+fixtures in headless Chromium and checks the snapshot against the per-field
+helpers it replaces; it skips when no browser is installed.
+"""
+import pathlib
+
+import pytest
+
+from app.services.auto_apply import _form_filler_common as common
+from app.services.auto_apply import ashby, form_schema, greenhouse, lever
+
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures" / "auto_apply"
+
+
+def field(id="", name="", type="", tag="input", fieldType="text", options=None,
+          required=False, markedRequired=False, label="", invalid=False,
+          validationMessage="", primaryId=None, primaryName=None):
+    return {
+        "id": id, "name": name, "type": type, "tag": tag, "fieldType": fieldType,
+        "options": options, "required": required, "markedRequired": markedRequired,
+        "label": label, "invalid": invalid, "validationMessage": validationMessage,
+        "primaryId": bool(id) if primaryId is None else primaryId,
+        "primaryName": bool(name) if primaryName is None else primaryName,
+    }
+
+
+class FakePage:
+    """Serves the snapshot payload; any other round trip is recorded."""
+
+    def __init__(self, payload, fail_snapshot=False):
+        self.payload = payload
+        self.fail_snapshot = fail_snapshot
+        self.snapshots = 0
+        self.round_trips = []
+
+    def evaluate(self, script, arg=None):
+        if script is form_schema._SCHEMA_JS:
+            self.snapshots += 1
+            if self.fail_snapshot:
+                raise RuntimeError("target closed")
+            return self.payload
+        self.round_trips.append(("evaluate", arg))
+        return None
+
+    def query_selector(self, selector):
+        self.round_trips.append(("query_selector", selector))
+        return None
+
+    def query_selector_all(self, selector):
+        self.round_trips.append(("query_selector_all", selector))
+        return []
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    calls = []
+
+    def fake_answer(**kwargs):
+        calls.append(kwargs["classified_fields"])
+        return {}
+
+    monkeypatch.setattr(
+        "app.services.auto_apply.screening_answers.auto_answer_form_questions", fake_answer,
+    )
+    return calls
+
+
+def run_filler(module, page):
+    unmapped, prepared = [], []
+    kwargs = dict(uid="u1", resume_summary="", job={})
+    if module is greenhouse:
+        module._fill_custom_questions(page, {}, {}, {}, unmapped, prepared_answers=prepared, **kwargs)
+    else:
+        module._fill_custom_questions(page, {}, {}, {}, unmapped, prepared, **kwargs)
+    return unmapped
+
+
+LEVER_PAYLOAD = {
+    "fields": [
+        field(id="email", name="email", required=True, markedRequired=True),
+        field(name="cards[a][field0]", type="radio", fieldType="radio", required=True, markedRequired=True),
+        field(name="cards[a][field0]", type="radio", fieldType="radio", primaryName=False),
+        field(id="q2", name="cards[a][field1]", tag="textarea", fieldType="textarea"),
+        field(id="eeo", tag="select", fieldType="select", options=["Yes", "No"],
+              markedRequired=True, required=True, label="Veteran status"),
+    ],
+    "radioGroups": {"cards[a][field0]": ["NYC", "Toronto"]},
+    "invalidIds": [],
+    "questionLabels": [],
+    "blocks": [
+        {"label": "Where are you based?", "fieldPath": "", "inputs": [1, 2]},
+        {"label": "Why us?", "fieldPath": "", "inputs": [3]},
+        {"label": "Empty", "fieldPath": "", "inputs": []},
+    ],
+}
+
+
+class TestFillerPasses:
+    def test_lever_classifies_from_one_snapshot(self, captured):
+        page = FakePage(LEVER_PAYLOAD)
+        run_filler(lever, page)
+        assert page.snapshots == 1
+        assert page.round_trips == []
+        assert captured[0] == [
+            {"field_id": "name:cards[a][field0]", "label": "Where are you based?",
+             "field_type": "radio", "options": ["NYC", "Toronto"], "required": True},
+            {"field_id": "q2", "label": "Why us?", "field_type": "textarea",
+             "options": None, "required": False},
+            {"field_id": "eeo", "label": "Veteran status", "field_type": "select",
+             "options": ["Yes", "No"], "required": True},
+        ]
+
+    def test_ashby_skips_system_blocks_and_keys_radios_by_name(self, captured):
+        payload = {
+            "fields": [
+                field(id="_systemfield_name", name="_systemfield_name", markedRequired=True),
+                field(id="r-0", name="grp", type="radio", fieldType="radio"),
+                field(id="r-1", name="grp", type="radio", fieldType="radio", primaryName=False),
+            ],
+            "radioGroups": {"grp": ["Yes", "No"]},
+            "blocks": [
+                {"label": "Name", "fieldPath": "_systemfield_name", "inputs": [0]},
+                {"label": "Sponsorship?", "fieldPath": "abc", "inputs": [1, 2]},
+            ],
+        }
+        page = FakePage(payload)
+        run_filler(ashby, page)
+        assert page.round_trips == []
+        assert [(f["field_id"], f["options"]) for f in captured[0]] == [("name:grp", ["Yes", "No"])]
+
+    def test_greenhouse_question_labels_and_wider_pass(self, captured):
+        payload = {
+            "fields": [
+                field(id="first_name", markedRequired=True),
+                field(id="phone", label="Phone"),
+                field(id="question_1", tag="textarea", fieldType="textarea", required=True),
+                field(id="question_2", fieldType="select", required=True, markedRequired=True,
+                      options=["A", "B"], label="Pick one"),
+            ],
+            "questionLabels": [
+                {"for": "question_1", "text": "Why SpaceX?"},
+                {"for": "", "text": "orphan"},
+            ],
+        }
+        page = FakePage(payload)
+        run_filler(greenhouse, page)
+        assert page.round_trips == []
+        assert [(f["field_id"], f["label"]) for f in captured[0]] == [
+            ("question_1", "Why SpaceX?"),
+            ("phone", "Phone"),
+            ("question_2", "Pick one"),
+        ]
+
+    def test_non_control_target_falls_back_to_live_lookup(self, captured):
+        payload = {
+            "fields": [],
+            "questionLabels": [
+                {"for": "question_9", "text": "Custom widget"},
+                {"for": "question_10", "text": "Gone"},
+            ],
+            "otherIds": ["question_9"],
+        }
+        page = FakePage(payload)
+        unmapped = run_filler(greenhouse, page)
+        lookups = [arg for kind, arg in page.round_trips if kind == "query_selector"]
+        assert lookups == ['[id="question_9"]']
+        assert [u["field_id"] for u in unmapped] == ["question_9", "question_10"]
+
+    def test_failed_snapshot_uses_live_helpers(self, captured):
+        page = FakePage(None, fail_snapshot=True)
+        run_filler(lever, page)
+        kinds = [k for k, _ in page.round_trips]
+        assert kinds[0] == "query_selector_all"
+        assert "evaluate" in kinds  # collect_unclassified_required_ids
+        assert captured == []
+
+
+class TestSchema:
+    def test_lookups_follow_first_element_with_attribute(self):
+        schema = form_schema.FormSchema.from_payload({"fields": [
+            field(id="dup", name="n", fieldType="radio", primaryName=True),
+            field(id="dup", name="n", primaryId=False, primaryName=False),
+        ]})
+        assert schema.find(field_id="dup").field_type == "radio"
+        assert schema.find(name="n") is schema.fields[0]
+        assert schema.find(field_id="other") is None
+
+    def test_required_ids_mirrors_collector(self):
+        schema = form_schema.FormSchema.from_payload({"fields": [
+            field(id="email", markedRequired=True),
+            field(name="consent", markedRequired=True),
+            field(name="consent", markedRequired=True, primaryName=False),
+            field(id="phone"),
+            field(id="phone2", tag="select"),
+            field(id="done", markedRequired=True),
+        ]})
+        assert schema.required_ids(form_schema.COMMON_HANDLED_IDS, {"done"}) == ["consent"]
+        assert schema.required_ids(
+            form_schema.GREENHOUSE_HANDLED_IDS, set(), include_ids=("phone",),
+        ) == ["consent", "phone", "done"]
+
+    def test_invalid_fields_carry_validation_text(self):
+        payload = {
+            "fields": [
+                field(id="a", fieldType="select", invalid=True, label="Country",
+                      validationMessage="This field is required"),
+                field(id="b", invalid=True),
+            ],
+            "invalidIds": ["a", "b"],
+        }
+        page = FakePage(payload)
+        harvested = []
+        schema = form_schema.read_form_schema(page)
+        out = form_schema.invalid_field_questions(
+            page, schema, harvest=lambda p, sel: harvested.append(sel) or ["US", "CA"],
+        )
+        assert harvested == ['[id="a"]']
+        assert out[0] == {
+            "field_id": "a", "label": "Country", "field_type": "select",
+            "options": ["US", "CA"], "required": True,
+            "validation_message": "This field is required",
+        }
+        assert out[1]["label"] == "b"
+        assert page.round_trips == []
+
+    def test_common_extract_uses_snapshot(self):
+        page = FakePage({"fields": [field(id="x", invalid=True, label="Salary")], "invalidIds": ["x"]})
+        out = common.extract_invalid_field_questions(page)
+        assert page.snapshots == 1
+        assert [q["label"] for q in out] == ["Salary"]
+
+
+# ---------------------------------------------------------------------------
+# Equivalence with the per-field helpers on the captured fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def browser():
+    sync_api = pytest.importorskip("playwright.sync_api")
+    try:
+        pw = sync_api.sync_playwright().start()
+    except Exception as exc:
+        pytest.skip(f"playwright unavailable: {exc}")
+    try:
+        b = pw.chromium.launch(headless=True)
+    except Exception as exc:
+        pw.stop()
+        pytest.skip(f"no headless chromium: {exc}")
+    yield b
+    b.close()
+    pw.stop()
+
+
+@pytest.mark.parametrize("fixture_name", ["New_LEVER.html", "New_Ashby.html"])
+def test_snapshot_matches_per_field_helpers(browser, fixture_name):
+    path = FIXTURES / fixture_name
+    if not path.exists():
+        pytest.skip(f"fixture not present: {fixture_name}")
+    page = browser.new_page(java_script_enabled=True)
+    try:
+        page.route("**/*", lambda route: route.abort())
+        page.set_content(path.read_text(encoding="utf-8"), wait_until="domcontentloaded")
+        schema = form_schema.read_form_schema(
+            page, question_label_selector='label[id^="question_"][id$="-label"]',
+        )
+        assert schema.ok and schema.fields
+
+        for f in schema.fields:
+            if not f.id or schema.find(field_id=f.id) is not f:
+                continue
+            sel = common.id_selector(f.id)
+            assert f.field_type == common.detect_field_type(page, sel), f.id
+            assert f.options == common.detect_options(page, sel), f.id
+            assert f.required == common.detect_required(page, sel), f.id
+            assert f.label == common.resolve_label_text(page, f.id), f.id
+        for group in schema.radio_groups:
+            assert (schema.radio_groups[group] or None) == common.harvest_radio_options(page, group)
+
+        assert schema.required_ids(form_schema.COMMON_HANDLED_IDS, set()) == \
+            common.collect_unclassified_required_ids(page, set())
+        assert schema.required_ids(
+            form_schema.GREENHOUSE_HANDLED_IDS, set(), include_ids=("phone",),
+        ) == greenhouse._collect_unclassified_required_ids(page, set())
+    finally:
+        page.close()
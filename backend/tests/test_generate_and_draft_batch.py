@@ -0,0 +1,313 @@
+"""
+Tests for batched draft assembly in /api/emails/generate-and-draft:
+Gmail batch create, the batched id lookup pass, and the single Firestore
+commit for drafted contacts.
+"""
+import base64
+import email
+
+import pytest
+
+from app.routes import emails
+
+
+class FakeRequest:
+    def __init__(self, gmail, kind, **kwargs):
+        self.gmail = gmail
+        self.kind = kind
+        self.kwargs = kwargs
+
+    def _respond(self):
+        if self.kind == "create":
+            n = len(self.gmail.created) + 1
+            self.gmail.created.append(self.kwargs["body"]["message"]["raw"])
+            if n in self.gmail.fail:
+                raise RuntimeError("quota")
+            message = {"id": f"m{n}"}
+            if n not in self.gmail.no_thread:
+                message["threadId"] = f"t{n}"
+            return {"id": f"d{n}", "message": message}
+        if self.kind == "get":
+            n = self.kwargs["id"][1:]
+            return {"id": self.kwargs["id"], "message": {"id": f"m{n}", "threadId": f"t{n}"}}
+        return {"emailAddress": "me@gmail.com"}
+
+    def execute(self):
+        self.gmail.http_calls.append(self.kind)
+        return self._respond()
+
+
+class FakeBatch:
+    def __init__(self, gmail, callback):
+        self.gmail = gmail
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.gmail.http_calls.append(f"batch[{len(self.requests)}]")
+        for rid, req in self.requests:
+            try:
+                self.callback(rid, req._respond(), None)
+            except Exception as e:
+                self.callback(rid, None, e)
+
+
+class FakeGmail:
+    """Chainable stand-in for the discovery client."""
+
+    def __init__(self, fail=(), no_thread=()):
+        self.http_calls = []
+        self.created = []
+        self.fail = set(fail)
+        self.no_thread = set(no_thread)
+
+    def users(self):
+        return self
+
+    def drafts(self):
+        return self
+
+    def getProfile(self, userId):
+        return FakeRequest(self, "profile")
+
+    def create(self, userId, body):
+        return FakeRequest(self, "create", body=body)
+
+    def get(self, userId, id, format):
+        return FakeRequest(self, "get", id=id, format=format)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+class Snap:
+    def __init__(self, ref, data):
+        self.reference = ref
+        self.id = ref.id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class Ref:
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name):
+        return Coll(self.db, f"{self.path}/{name}")
+
+    def get(self):
+        return Snap(self, self.db.docs.get(self.path))
+
+    def set(self, data, merge=False):
+        if merge:
+            self.db.docs.setdefault(self.path, {}).update(data)
+        else:
+            self.db.docs[self.path] = dict(data)
+
+    def update(self, data):
+        self.db.docs[self.path].update(data)
+
+
+class Coll:
+    def __init__(self, db, path, filters=()):
+        self.db = db
+        self.path = path
+        self.filters = filters
+
+    def document(self, doc_id=None):
+        if doc_id is None:
+            self.db.auto += 1
+            doc_id = f"new{self.db.auto}"
+        return Ref(self.db, f"{self.path}/{doc_id}")
+
+    def where(self, field, op, value):
+        return Coll(self.db, self.path, self.filters + ((field, op, value),))
+
+    def limit(self, n):
+        return self
+
+    def stream(self):
+        self.db.queries += 1
+        prefix = self.path + "/"
+        for path, data in list(self.db.docs.items()):
+            rest = path[len(prefix):]
+            if not path.startswith(prefix) or "/" in rest:
+                continue
+            ok = all(
+                (data.get(f) in v) if op == "in" else (data.get(f) == v)
+                for f, op, v in self.filters
+            )
+            if ok:
+                yield Snap(Ref(self.db, path), data)
+
+
+class WriteBatch:
+    def __init__(self, db):
+        self.db = db
+        self.ops = []
+
+    def set(self, ref, data):
+        self.ops.append(lambda: ref.set(data))
+
+    def update(self, ref, data):
+        self.ops.append(lambda: ref.update(data))
+
+    def commit(self):
+        self.db.commits += 1
+        for op in self.ops:
+            op()
+
+
+class FakeDB:
+    def __init__(self):
+        self.docs = {"users/u1": {"name": "Sam Student", "email": "sam@school.edu"}}
+        self.auto = 0
+        self.queries = 0
+        self.commits = 0
+
+    def collection(self, name):
+        return Coll(self, name)
+
+    def batch(self):
+        return WriteBatch(self)
+
+    def contacts(self):
+        prefix = "users/u1/contacts/"
+        return {p[len(prefix):]: d for p, d in self.docs.items() if p.startswith(prefix)}
+
+
+def contact(n, **extra):
+    return {"FirstName": f"Person{n}", "LastName": "Doe", "Email": f"p{n}@acme.com",
+            "Company": "Acme", "Title": "Analyst",
+            "emailSubject": f"Hello {n}", "emailBody": f"Body {n}", **extra}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from flask import Flask
+    import firebase_admin
+    from app import extensions
+
+    monkeypatch.setattr(firebase_admin, "_apps", {"[DEFAULT]": object()})
+    monkeypatch.setattr(extensions, "verify_id_token_cached", lambda *a, **k: {"uid": "u1", "name": "Sam"})
+    monkeypatch.setattr("app.services.lifecycle_signals.touch_last_active", lambda uid: None)
+    # Contacts with subject/body skip generation; no LLM in these tests.
+    monkeypatch.setattr(emails, "batch_generate_emails", lambda *a, **k: pytest.fail("unexpected generation"))
+
+    db = FakeDB()
+    monkeypatch.setattr(emails, "get_db", lambda: db)
+    app = Flask(__name__)
+    app.register_blueprint(emails.emails_bp)
+    return app.test_client(), db, monkeypatch
+
+
+def post(c, contacts):
+    return c.post("/api/emails/generate-and-draft", json={"contacts": contacts},
+                  headers={"Authorization": "Bearer t"})
+
+
+class TestGenerateAndDraftBatching:
+    def test_drafts_go_through_one_batch_and_one_commit(self, client):
+        c, db, monkeypatch = client
+        gmail = FakeGmail(no_thread={2})
+        monkeypatch.setattr(emails, "get_user_gmail_service_strict", lambda uid: gmail)
+        db.docs["users/u1/contacts/old"] = {"email": "p1@acme.com", "status": "Not Contacted"}
+
+        res = post(c, [contact(1), contact(2), contact(3)])
+        assert res.status_code == 200
+        data = res.get_json()
+        assert data["draft_count"] == 3
+        assert [d["index"] for d in data["drafts"]] == [0, 1, 2]
+        assert data["drafts"][1]["threadId"] == "t2"  # recovered in the lookup pass
+
+        # profile + one create batch + one lookup for the draft missing a thread
+        assert gmail.http_calls == ["profile", "batch[3]", "get"]
+        assert db.commits == 1
+        assert db.queries == 1
+
+        saved = db.contacts()
+        assert saved["old"]["gmailDraftId"] == "d1"
+        assert saved["old"]["status"] == "Not Contacted"
+        new = sorted(v["email"] for k, v in saved.items() if k != "old")
+        assert new == ["p2@acme.com", "p3@acme.com"]
+        for v in saved.values():
+            assert v["seniorityBucket"]
+            assert v["inOutbox"] is True
+        assert saved["old"]["gmailThreadId"] == "t1"
+
+    def test_failed_drafts_are_skipped(self, client):
+        c, db, monkeypatch = client
+        gmail = FakeGmail(fail={2})
+        monkeypatch.setattr(emails, "get_user_gmail_service_strict", lambda uid: gmail)
+        data = post(c, [contact(1), contact(2), contact(3)]).get_json()
+        assert data["draft_ids"] == ["d1", "d3"]
+        assert data["skipped_count"] == 1
+        assert sorted(v["email"] for v in db.contacts().values()) == ["p1@acme.com", "p3@acme.com"]
+
+    def test_same_address_twice_is_one_contact(self, client):
+        c, db, monkeypatch = client
+        gmail = FakeGmail()
+        monkeypatch.setattr(emails, "get_user_gmail_service_strict", lambda uid: gmail)
+        post(c, [contact(1), contact(1, emailSubject="Second")])
+        saved = list(db.contacts().values())
+        assert len(saved) == 1
+        assert saved[0]["emailSubject"] == "Second"
+
+    def test_fallback_mode_batches_contact_writes(self, client):
+        c, db, monkeypatch = client
+        monkeypatch.setattr(emails, "get_user_gmail_service_strict", lambda uid: None)
+        data = post(c, [contact(1), contact(2)]).get_json()
+        assert data["deliveryMode"] == "fallback"
+        assert db.commits == 1
+        assert all(v["inOutbox"] is False for v in db.contacts().values())
+
+
+class TestHelpers:
+    def test_execute_gmail_requests_chunks(self, monkeypatch):
+        monkeypatch.setattr(emails, "GMAIL_DRAFT_BATCH_SIZE", 2)
+        gmail = FakeGmail()
+        reqs = {str(i): gmail.create(userId="me", body={"message": {"raw": "x"}}) for i in range(5)}
+        out = emails._execute_gmail_requests(gmail, reqs)
+        assert gmail.http_calls == ["batch[2]", "batch[2]", "batch[1]"]
+        assert all(err is None for _, err in out.values())
+
+    def test_execute_gmail_requests_single_skips_batch(self):
+        gmail = FakeGmail()
+        out = emails._execute_gmail_requests(gmail, {"0": gmail.create(userId="me", body={"message": {"raw": "x"}})})
+        assert gmail.http_calls == ["create"]
+        assert out["0"][0]["id"] == "d1"
+
+    def test_failed_batch_maps_every_id_to_an_error(self):
+        gmail = FakeGmail()
+
+        class Boom(FakeBatch):
+            def execute(self):
+                raise RuntimeError("network")
+
+        gmail.new_batch_http_request = lambda callback: Boom(gmail, callback)
+        reqs = {str(i): gmail.create(userId="me", body={}) for i in range(3)}
+        out = emails._execute_gmail_requests(gmail, reqs)
+        assert all(resp is None and err is not None for resp, err in out.values())
+
+    def test_resume_part_is_encoded_once_and_shared(self):
+        part = emails._build_resume_part(b"%PDF-1.4 resume", "application/pdf", "Resume")
+        assert part.get_filename() == "Resume.pdf"
+        from email.mime.multipart import MIMEMultipart
+        raws = []
+        for to in ("a@x.com", "b@x.com"):
+            msg = MIMEMultipart("mixed")
+            msg["to"] = to
+            msg.attach(part)
+            raws.append(base64.urlsafe_b64encode(msg.as_bytes()))
+        for raw in raws:
+            parsed = email.message_from_bytes(base64.urlsafe_b64decode(raw))
+            attachment = [p for p in parsed.walk() if p.get_filename()][0]
+            assert attachment.get_payload(decode=True) == b"%PDF-1.4 resume"
@@ -0,0 +1,83 @@
+"""Tests for the job board's precomputed location index."""
+from app.routes import job_board
+from app.routes.job_board import (
+    METRO_AREAS,
+    apply_hard_gate_location,
+    canonical_job_city,
+    compute_job_fingerprint,
+    compute_job_fingerprints,
+    deduplicate_jobs,
+)
+from scripts.bench_job_fingerprint import build_corpus, legacy_compute_job_fingerprint
+
+
+class TestLocationIndex:
+    def test_every_metro_city_maps_to_its_metro(self):
+        for metro, cities in METRO_AREAS.items():
+            metro_city = metro.split(",")[0]
+            for city in cities:
+                owner = next(m for m, cs in METRO_AREAS.items() if city in cs)
+                assert canonical_job_city(f"{city}, XX") == owner.split(",")[0]
+            assert canonical_job_city(metro) == metro_city
+
+    def test_non_metro_city_kept_as_is(self):
+        assert canonical_job_city("Seattle, WA") == "Seattle"
+        assert canonical_job_city("Denver") == "Denver"
+        assert canonical_job_city("") is None
+
+    def test_first_word_used_without_comma(self):
+        assert canonical_job_city("Palo Alto") == "Palo"
+        assert canonical_job_city("Oakland Hills") == "San Francisco"
+
+
+class TestFingerprintEquivalence:
+    def test_matches_legacy_scan_on_corpus(self):
+        jobs = build_corpus(3000)
+        assert [legacy_compute_job_fingerprint(j) for j in jobs] == compute_job_fingerprints(jobs)
+
+    def test_batch_matches_single(self):
+        jobs = build_corpus(200)
+        assert compute_job_fingerprints(jobs) == [compute_job_fingerprint(j) for j in jobs]
+
+    def test_metro_members_share_a_fingerprint(self):
+        a = compute_job_fingerprint({"company": "Stripe", "title": "SWE", "location": "Palo Alto, CA"})
+        b = compute_job_fingerprint({"company": "Stripe", "title": "SWE", "location": "San Francisco, CA"})
+        assert a == b
+
+    def test_missing_fields_return_none(self):
+        assert compute_job_fingerprint({"company": "", "title": "x"}) is None
+        assert compute_job_fingerprints([{"title": "x"}]) == [None]
+
+    def test_dedup_uses_batch_fingerprints(self):
+        jobs = [
+            {"company": "Meta", "title": "SWE", "location": "Menlo Park, CA"},
+            {"company": "Meta", "title": "SWE", "location": "San Francisco, CA"},
+            {"company": "Meta", "title": "PM", "location": "Menlo Park, CA"},
+        ]
+        deduped, stats = deduplicate_jobs(jobs)
+        assert stats["before"] == 3
+        assert stats["after"] == 2
+
+    def test_fingerprint_memo_is_bounded(self):
+        assert job_board._fingerprint_hash.cache_info().maxsize is not None
+
+
+class TestLocationGate:
+    def _gate(self, location, preferred):
+        return apply_hard_gate_location({"location": location}, {"preferred_locations": preferred})
+
+    def test_metro_member_passes(self):
+        ok, reason = self._gate("Cambridge, MA", ["Boston, MA"])
+        assert ok and reason.startswith("location_metro_match")
+
+    def test_greater_area_passes(self):
+        ok, reason = self._gate("Greater Chicago Area", ["Chicago, IL"])
+        assert ok and reason.startswith("location_metro_greater_area")
+
+    def test_abbreviation_passes(self):
+        ok, reason = self._gate("SF Bay", ["San Francisco"])
+        assert ok and reason.startswith("location_abbrev_match")
+
+    def test_mismatch_rejected(self):
+        ok, reason = self._gate("Seattle, WA", ["Boston, MA"])
+        assert not ok and reason.startswith("location_mismatch")
@@ -0,0 +1,229 @@
+"""Tests for the single-pass lifecycle campaign engine."""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from app.services import lifecycle_emails
+from app.services.lifecycle_engine import Campaign, log_key, run_campaigns
+
+
+NOW = datetime(2026, 10, 14, 12, 0, tzinfo=timezone.utc)  # a Wednesday
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat().replace('+00:00', 'Z')
+
+
+def _run(campaigns, users, *, done=None, send_ok=True, now=NOW):
+    sends = []
+
+    def send(cand, campaign, content):
+        sends.append((cand.uid, campaign.name, cand.step, content))
+        return {'sent': send_ok, 'reason': 'ok' if send_ok else 'send_failed'}
+
+    results = run_campaigns(
+        campaigns,
+        users,
+        now=now,
+        send=send,
+        sent_keys=lambda keys: {k for k in keys if k in (done or set())},
+    )
+    return results, sends
+
+
+class CountingUsers:
+    """Iterable over (uid, user) pairs that counts how often it is walked."""
+
+    def __init__(self, users):
+        self.users = users
+        self.passes = 0
+
+    def __iter__(self):
+        self.passes += 1
+        return iter(self.users)
+
+
+class TestEngine:
+    def test_users_walked_once_for_all_campaigns(self):
+        users = CountingUsers([
+            ('u1', {'email': 'a@x.com', 'flag': True}),
+            ('u2', {'email': 'b@x.com', 'flag': False}),
+        ])
+        seen = []
+
+        def sel(uid, user, now):
+            seen.append(uid)
+            return 'only' if user['flag'] else None
+
+        campaigns = [
+            Campaign(name='a', select=sel, compose=lambda c, n: {'subject': 's', 'body_paragraphs': []}, counters=('only',)),
+            Campaign(name='b', select=sel, compose=lambda c, n: {'subject': 's', 'body_paragraphs': []}, counters=('only',)),
+        ]
+        results, sends = _run(campaigns, users)
+
+        assert users.passes == 1
+        assert seen == ['u1', 'u1', 'u2', 'u2']
+        assert results['a'] == {'ok': True, 'sent': {'only': 1}}
+        assert [(uid, name) for uid, name, _, _ in sends] == [('u1', 'a'), ('u1', 'b')]
+
+    def test_users_without_email_are_skipped(self):
+        sel = MagicMock(return_value='s')
+        campaign = Campaign(name='a', select=sel, compose=lambda c, n: {'subject': 's', 'body_paragraphs': []}, counters=('s',))
+        _run([campaign], [('u1', {}), ('u2', None)])
+        sel.assert_not_called()
+
+    def test_already_logged_keys_are_deduped_before_prepare(self):
+        prepared = []
+
+        def prepare(cands, now):
+            prepared.extend(c.uid for c in cands)
+            return cands
+
+        campaign = Campaign(
+            name='c', select=lambda u, d, n: 'step', prepare=prepare,
+            compose=lambda c, n: {'subject': 's', 'body_paragraphs': []},
+            counters=('step',), report_eligible='total',
+        )
+        users = [('u1', {'email': 'a@x.com'}), ('u2', {'email': 'b@x.com'})]
+        results, sends = _run([campaign], users, done={log_key('u1', 'c', 'step')})
+
+        assert prepared == ['u2']
+        assert results['c']['eligible'] == 1
+        assert [s[0] for s in sends] == ['u2']
+
+    def test_prepare_error_is_isolated_to_one_campaign(self):
+        def prepare(cands, now):
+            raise RuntimeError('firestore down')
+
+        compose = lambda c, n: {'subject': 's', 'body_paragraphs': []}
+        campaigns = [
+            Campaign(name='bad', select=lambda u, d, n: 'x', prepare=prepare, compose=compose, counters=('x',)),
+            Campaign(name='good', select=lambda u, d, n: 'x', compose=compose, counters=('x',)),
+        ]
+        results, sends = _run(campaigns, [('u1', {'email': 'a@x.com'})])
+
+        assert results['bad']['ok'] is False
+        assert 'firestore down' in results['bad']['error']
+        assert results['good'] == {'ok': True, 'sent': {'x': 1}}
+        assert [(uid, name) for uid, name, _, _ in sends] == [('u1', 'good')]
+
+    def test_closed_window_skips_without_selecting(self):
+        sel = MagicMock(return_value='s')
+        campaign = Campaign(
+            name='w', select=sel, compose=lambda c, n: {},
+            counters=('weekly',), counter='weekly', window=lambda now: False,
+        )
+        results, _ = _run([campaign], [('u1', {'email': 'a@x.com'})])
+        sel.assert_not_called()
+        assert results['w'] == {'ok': True, 'sent': {'weekly': 0}, 'skipped': 'not_send_window'}
+
+    def test_max_sends_per_run_caps_campaign(self):
+        campaign = Campaign(
+            name='cap', select=lambda u, d, n: 'x',
+            compose=lambda c, n: {'subject': 's', 'body_paragraphs': []},
+            counters=('x',), max_sends_per_run=2,
+        )
+        users = [(f'u{i}', {'email': f'{i}@x.com'}) for i in range(5)]
+        results, sends = _run([campaign], users)
+        assert len(sends) == 2
+        assert results['cap']['sent'] == {'x': 2}
+        assert results['cap']['capped'] == 3
+
+    def test_failed_sends_are_not_counted(self):
+        campaign = Campaign(
+            name='f', select=lambda u, d, n: 'x',
+            compose=lambda c, n: {'subject': 's', 'body_paragraphs': []},
+            counters=('x',),
+        )
+        results, sends = _run([campaign], [('u1', {'email': 'a@x.com'})], send_ok=False)
+        assert len(sends) == 1
+        assert results['f']['sent'] == {'x': 0}
+
+    def test_select_error_is_isolated_to_one_user(self):
+        def sel(uid, user, now):
+            if uid == 'bad':
+                raise ValueError('boom')
+            return 'x'
+
+        campaign = Campaign(
+            name='e', select=sel, compose=lambda c, n: {'subject': 's', 'body_paragraphs': []},
+            counters=('x',),
+        )
+        results, _ = _run([campaign], [('bad', {'email': 'a@x.com'}), ('ok', {'email': 'b@x.com'})])
+        assert results['e']['sent'] == {'x': 1}
+
+
+class TestDeclaredCampaigns:
+    def test_onboarding_dropoff_steps(self):
+        launch = lifecycle_emails.ONBOARDING_DROPOFF_LAUNCH_DATE
+        now = max(NOW, launch + timedelta(days=10))
+        users = [
+            ('d1', {'email': 'a@x.com', 'signupAt': _iso(now - timedelta(hours=30))}),
+            ('d3', {'email': 'b@x.com', 'signupAt': _iso(now - timedelta(hours=80))}),
+            ('done', {'email': 'c@x.com', 'signupAt': _iso(now - timedelta(hours=30)), 'profileConfirmedAt': 'x'}),
+            ('pro', {'email': 'd@x.com', 'signupAt': _iso(now - timedelta(hours=30)), 'subscriptionTier': 'pro'}),
+            ('early', {'email': 'e@x.com', 'signupAt': _iso(launch - timedelta(days=1))}),
+        ]
+        results, sends = _run([lifecycle_emails.ONBOARDING_DROPOFF], users, now=now)
+        assert results['onboarding_dropoff']['sent'] == {'day_1': 1, 'day_3': 1}
+        assert {(uid, step) for uid, _, step, _ in sends} == {('d1', 'day_1'), ('d3', 'day_3')}
+
+    def test_free_ceiling_month_step_and_counter(self):
+        now = max(NOW, lifecycle_emails.FREE_CEILING_LAUNCH_DATE + timedelta(days=2))
+        signup = _iso(now - timedelta(days=1))
+        users = [
+            ('hit', {'email': 'a@x.com', 'signupAt': signup, 'maxCredits': 300, 'credits': 10}),
+            ('ok', {'email': 'b@x.com', 'signupAt': signup, 'maxCredits': 300, 'credits': 200}),
+        ]
+        results, sends = _run([lifecycle_emails.FREE_CEILING], users, now=now)
+        assert results['free_ceiling']['sent'] == {'month': 1}
+        uid, _, step, content = sends[0]
+        assert uid == 'hit'
+        assert step == f"month_{now.strftime('%Y_%m')}"
+        assert content['subject'] == "you've used 97% of your credits"
+
+    def test_dormancy_reports_eligible_per_tier(self):
+        now = max(NOW, lifecycle_emails.DORMANCY_NUDGE_LAUNCH_DATE + timedelta(days=90))
+        signup = _iso(now - timedelta(days=80))
+        users = [
+            ('t14', {'email': 'a@x.com', 'signupAt': signup, 'lastActiveAt': _iso(now - timedelta(days=15))}),
+            ('t30', {'email': 'b@x.com', 'signupAt': signup, 'lastActiveAt': _iso(now - timedelta(days=31))}),
+            ('gap', {'email': 'c@x.com', 'signupAt': signup, 'lastActiveAt': _iso(now - timedelta(days=25))}),
+        ]
+        results, _ = _run([lifecycle_emails.DORMANCY_NUDGE], users, now=now)
+        assert results['dormancy_nudge']['eligible'] == {'14d': 1, '30d': 1, '60d': 0}
+        assert results['dormancy_nudge']['sent'] == {'14d': 1, '30d': 1, '60d': 0}
+
+    def test_all_scan_campaigns_have_unique_names(self):
+        names = [c.name for c in lifecycle_emails.USER_SCAN_CAMPAIGNS]
+        assert len(names) == len(set(names))
+
+
+class TestFirestoreWiring:
+    def test_run_user_scan_campaigns_streams_users_once(self):
+        db = MagicMock()
+        snap = MagicMock()
+        snap.id = 'u1'
+        snap.to_dict.return_value = {'email': 'a@x.com'}
+        db.collection.return_value.stream.return_value = iter([snap])
+        db.get_all.return_value = []
+
+        with patch.object(lifecycle_emails, 'get_db', return_value=db):
+            results = lifecycle_emails.run_user_scan_campaigns()
+
+        stream_calls = [c for c in db.mock_calls if c[0] == 'collection().stream']
+        assert len(stream_calls) == 1
+        assert set(results) == {c.name for c in lifecycle_emails.USER_SCAN_CAMPAIGNS}
+
+    def test_no_db_returns_unavailable_per_campaign(self):
+        with patch.object(lifecycle_emails, 'get_db', return_value=None):
+            assert lifecycle_emails.process_welcome_drips() == {'ok': False, 'error': 'db_unavailable'}
+
+    def test_rate_limit_uses_count_aggregation(self):
+        db = MagicMock()
+        agg = MagicMock()
+        agg.value = 2
+        q = db.collection.return_value.where.return_value.where.return_value.limit.return_value
+        q.count.return_value.get.return_value = [[agg]]
+        with patch.object(lifecycle_emails, 'get_db', return_value=db):
+            assert lifecycle_emails._rate_limit_exceeded('u1') is True
+        q.stream.assert_not_called()
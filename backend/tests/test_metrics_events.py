@@ -4,6 +4,13 @@ from unittest.mock import patch, Mock, call
 from datetime import datetime
 
 
+def _flushed_writes(mock_db):
+    """log_event queues; flush METRICS_BUFFER and return the written docs."""
+    from app.utils.metrics_events import METRICS_BUFFER
+    METRICS_BUFFER.flush()
+    return [c[0][1] for c in mock_db.batch.return_value.set.call_args_list]
+
+
 class TestLogEvent:
     """Tests for app.utils.metrics_events.log_event."""
 
@@ -15,8 +22,8 @@ class TestLogEvent:
 
         log_event("user123", "email_generated", {"contact_id": "c1", "email_length": 50})
 
+        add_call = _flushed_writes(mock_db)[-1]
         mock_db.collection.assert_called_once_with("metrics_events")
-        add_call = mock_db.collection().add.call_args[0][0]
         assert add_call["uid"] == "user123"
         assert add_call["event_type"] == "email_generated"
         assert add_call["properties"]["contact_id"] == "c1"
@@ -43,6 +50,7 @@ class TestLogEvent:
         log_event("user123", "emial_generated", {"key": "val"})
 
         # Should not write to Firestore
+        assert _flushed_writes(mock_db) == []
         mock_db.collection.assert_not_called()
 
     @patch("app.utils.metrics_events.get_db")
@@ -53,7 +61,7 @@ class TestLogEvent:
 
         log_event(None, "email_generated", {})
 
-        add_call = mock_db.collection().add.call_args[0][0]
+        add_call = _flushed_writes(mock_db)[-1]
         assert add_call["uid"] == "unknown"
 
     @patch("app.utils.metrics_events.get_db")
@@ -64,7 +72,7 @@ class TestLogEvent:
 
         log_event("user123", "reply_received")
 
-        add_call = mock_db.collection().add.call_args[0][0]
+        add_call = _flushed_writes(mock_db)[-1]
         assert add_call["properties"] == {}
 
     @patch("app.utils.metrics_events.get_db")
@@ -82,4 +90,4 @@ class TestLogEvent:
         for et in event_types:
             log_event("user123", et, {"key": "val"})
 
-        assert mock_db.collection().add.call_count == len(event_types)
+        assert len(_flushed_writes(mock_db)) == len(event_types)
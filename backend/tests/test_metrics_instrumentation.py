@@ -3,6 +3,13 @@ import pytest
 from unittest.mock import patch, Mock, MagicMock, call
 
 
+def _flushed_writes(mock_db):
+    """log_event queues; flush METRICS_BUFFER and return the written docs."""
+    from app.utils.metrics_events import METRICS_BUFFER
+    METRICS_BUFFER.flush()
+    return [c[0][1] for c in mock_db.batch.return_value.set.call_args_list]
+
+
 @pytest.fixture
 def mock_metrics_log():
     """Patch log_event and return the mock."""
@@ -107,8 +114,9 @@ class TestSearchPerformedInstrumentation:
             "top_warmth_tier": top_tier,
         })
 
-        assert mock_db.collection().add.call_count == 1
-        add_call = mock_db.collection().add.call_args[0][0]
+        writes = _flushed_writes(mock_db)
+        assert len(writes) == 1
+        add_call = writes[0]
         assert add_call["event_type"] == "search_performed"
         assert add_call["properties"]["results_count"] == 2
         assert add_call["properties"]["top_warmth_tier"] == "warm"
@@ -145,7 +153,7 @@ class TestWebhookInstrumentation:
 
         log_event("uid123", "email_actually_sent", {"contact_id": "contact-abc"})
 
-        add_call = mock_db.collection().add.call_args[0][0]
+        add_call = _flushed_writes(mock_db)[-1]
         assert add_call["event_type"] == "email_actually_sent"
         assert add_call["properties"]["contact_id"] == "contact-abc"
 
@@ -162,7 +170,7 @@ class TestWebhookInstrumentation:
             "hours_since_send": 48.5,
         })
 
-        add_call = mock_db.collection().add.call_args[0][0]
+        add_call = _flushed_writes(mock_db)[-1]
         assert add_call["event_type"] == "reply_received"
         assert add_call["properties"]["contact_id"] == "contact-xyz"
         assert add_call["properties"]["hours_since_send"] == 48.5
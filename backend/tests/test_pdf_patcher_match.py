@@ -0,0 +1,128 @@
+"""
+Tests for the indexed matcher in app/services/pdf_patcher.py.
+
+TextMatchIndex must pick the same unit (and, for matches, the same ratio)
+as the original scan: every unit in order, exact/substring first, then the
+first unit with the best SequenceMatcher ratio.
+"""
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from app.services.pdf_patcher import TextMatchIndex, TextUnit, find_match, normalize_text
+
+
+def _unit(text, page=0):
+    return TextUnit(full_text=text, spans=[], merged_bbox=(0, 0, 0, 0), page_num=page)
+
+
+def _reference(target, units, threshold):
+    """find_match as it was before the index."""
+    normalized_target = normalize_text(target)
+    if not normalized_target:
+        return (None, 0.0)
+    best_match, best_ratio = None, 0.0
+    for unit in units:
+        unit_norm = normalize_text(unit.full_text)
+        if normalized_target == unit_norm:
+            return (unit, 1.0)
+        if normalized_target in unit_norm or unit_norm in normalized_target:
+            return (unit, 1.0)
+        ratio = SequenceMatcher(None, normalized_target, unit_norm).ratio()
+        if ratio > best_ratio:
+            best_ratio, best_match = ratio, unit
+    if best_ratio >= threshold:
+        return (best_match, best_ratio)
+    return (None, best_ratio)
+
+
+RESUME = [
+    "EXPERIENCE",
+    "Goldman Sachs — Summer Analyst",
+    "• Built a DCF model for a $2B healthcare acquisition, presenting findings to MDs",
+    "• Automated weekly pipeline reports with Python, saving 6 hours per week",
+    "• Led diligence on 3 ﬁntech targets across payments and lending",
+    "SKILLS",
+    "Technical: Python, SQL, Excel, PowerPoint",
+    "Languages: English, Spanish",
+    "• Automated weekly pipeline reports with Python, saving 6 hours per week",
+]
+
+
+class TestSameAsScan:
+    @pytest.mark.parametrize("target", [
+        "Automated weekly pipeline reports with Python, saving 6 hours per week",
+        "Led diligence on 3 fintech targets across payments and lending",
+        "Built a DCF model for a $2B healthcare acquisition, presenting findings to MD",
+        "Built a DCF model for a 2 billion healthcare acquisition and presented to MDs",
+        "Technical: Python, SQL, Excel",
+        "SKILLS",
+        "Completely unrelated sentence about gardening",
+        "x",
+        "",
+    ])
+    @pytest.mark.parametrize("threshold", [0.75, 0.85])
+    def test_resume_targets(self, target, threshold):
+        units = [_unit(t) for t in RESUME]
+        got_unit, got_ratio = find_match(target, units, threshold=threshold)
+        want_unit, want_ratio = _reference(target, units, threshold)
+        assert got_unit is want_unit
+        if want_unit is not None:
+            assert got_ratio == want_ratio
+
+    def test_random_documents(self):
+        rng = random.Random(7)
+        words = ["model", "python", "revenue", "led", "team", "of", "5", "built",
+                 "growth", "–", "analysis", "sql", "clients", "ﬁnance", "a"]
+
+        def sentence(n):
+            return " ".join(rng.choice(words) for _ in range(n))
+
+        for _ in range(40):
+            units = [_unit(sentence(rng.randint(1, 12))) for _ in range(30)]
+            index = TextMatchIndex(units)
+            for _ in range(10):
+                if rng.random() < 0.5:
+                    base = rng.choice(units).full_text.split()
+                    base[rng.randrange(len(base))] = rng.choice(words)
+                    target = " ".join(base)
+                else:
+                    target = sentence(rng.randint(1, 12))
+                threshold = rng.choice([0.5, 0.75, 0.85])
+                got_unit, got_ratio = index.find(target, threshold)
+                want_unit, want_ratio = _reference(target, units, threshold)
+                assert got_unit is want_unit, target
+                if want_unit is not None:
+                    assert got_ratio == want_ratio
+
+    def test_first_unit_wins_substring_ties(self):
+        units = [_unit("Python and SQL"), _unit("SQL"), _unit("Python")]
+        assert find_match("Python", units)[0] is units[0]
+        assert find_match("Python and SQL and Excel", units)[0] is units[0]
+
+
+class TestBatch:
+    def test_find_all_reuses_results_and_matchers(self):
+        units = [_unit(t) for t in RESUME]
+        index = TextMatchIndex(units)
+        target = "Built a DCF model for a 2 billion healthcare acquisition and presented to MDs"
+        results = index.find_all([(target, 0.75), (target, 0.75), ("SKILLS", 0.85)])
+        assert results[0] == results[1]
+        assert results[2][0] is units[5]
+        assert len(index._cache) == 2
+
+    def test_pruning_skips_full_ratio_for_far_units(self, monkeypatch):
+        calls = []
+        real_ratio = SequenceMatcher.ratio
+
+        def counting_ratio(self):
+            calls.append(self.b)
+            return real_ratio(self)
+
+        monkeypatch.setattr(SequenceMatcher, "ratio", counting_ratio)
+        units = [_unit(t) for t in RESUME] + [_unit("Languages") for _ in range(50)]
+        target = "Automated weekly pipeline reports in Python, saving six hours each week"
+        unit, _ = TextMatchIndex(units).find(target, 0.75)
+        assert unit is units[3]
+        assert len(calls) < 5
@@ -28,6 +28,7 @@ from app.services.queue_service import (
     QUEUE_TUESDAY_WEEKDAY,
     STATUS_ARCHIVED,
     STATUS_COMPLETED_PARTIAL,
+    STATUS_FAILED_EMAILS,
     STATUS_PENDING_REVIEW,
     _InsufficientCredits,
     _filter_candidates,
@@ -886,8 +887,12 @@ def test_background_happy_path_writes_5_contacts(
         credits_charged_on_start=QUEUE_GENERATION_CREDITS,
     )
 
-    # 5 contacts added to the queue subcollection
-    assert qc_ref.add.call_count == QUEUE_CONTACT_COUNT
+    # 5 contacts written to the queue subcollection, in chunked batches
+    contact_sets = [
+        c for c in db.batch.return_value.set.call_args_list
+        if c[0][0] is qc_ref.document.return_value
+    ]
+    assert len(contact_sets) == QUEUE_CONTACT_COUNT
 
     # Final status should be pending_review
     statuses = [
@@ -898,7 +903,7 @@ def test_background_happy_path_writes_5_contacts(
     assert STATUS_PENDING_REVIEW in statuses
 
     # Each queue contact doc has the expected shape
-    first_written = qc_ref.add.call_args_list[0][0][0]
+    first_written = contact_sets[0][0][1]
     assert "pdlId" in first_written
     assert "email" in first_written
     assert "firstName" in first_written
@@ -1278,3 +1283,217 @@ def test_scan_per_user_error_does_not_kill_scan(
     assert payload["usersProcessed"] == 2
     # Both raised via is_queue_feature_enabled side_effect
     assert payload["errorCount"] == 2
+
+
+# ---------------------------------------------------------------------------
+# Pipelined generation — overlapped stages, chunked drafts, batched writes
+# ---------------------------------------------------------------------------
+
+
+def _run_generate(filters=None, credits=QUEUE_GENERATION_CREDITS):
+    generate_queue_background(
+        uid="uid1",
+        queue_id="q1",
+        filters=filters or {"company": "Acme"},
+        user_profile={},
+        resume_text="",
+        credits_charged_on_start=credits,
+    )
+
+
+def _statuses(queue_ref):
+    return [c[0][0].get("status") for c in queue_ref.update.call_args_list if "status" in c[0][0]]
+
+
+def _five():
+    return [_candidate(pdl_id=f"pdl-{i}", email=f"u{i}@acme.com", first=f"U{i}") for i in range(5)]
+
+
+@pytest.mark.unit
+@patch("app.services.queue_service.batch_generate_emails", return_value={})
+@patch("app.services.queue_service.score_contacts_for_email", return_value={})
+@patch("app.services.queue_service.search_contacts_with_smart_location_strategy")
+@patch("app.services.queue_service.get_db")
+def test_pipeline_loads_dedup_keys_during_search(mock_get_db, mock_search, _score, _batch):
+    """The existing-contacts stream starts before the PDL search returns."""
+    import threading
+
+    db, queue_ref, _qc, contacts_ref_user, _prefs = _build_generate_db()
+    mock_get_db.return_value = db
+    keys_loading = threading.Event()
+
+    def _stream():
+        keys_loading.set()
+        return iter([])
+
+    contacts_ref_user.stream.side_effect = _stream
+
+    def _search(**kwargs):
+        assert keys_loading.wait(2), "dedup keys were not loading while PDL searched"
+        return _five()
+
+    mock_search.side_effect = _search
+    _run_generate()
+    assert STATUS_PENDING_REVIEW in _statuses(queue_ref)
+
+
+@pytest.mark.unit
+@patch("app.services.queue_service.batch_generate_emails", return_value={})
+@patch("app.services.queue_service.score_contacts_for_email", return_value={})
+@patch("app.services.queue_service.search_contacts_with_smart_location_strategy")
+@patch("app.services.queue_service.get_db")
+def test_pipeline_speculative_fallback_search(mock_get_db, mock_search, _score, _batch, monkeypatch):
+    """With speculation on, the non-alumni search runs alongside the alumni
+    one and is used (not re-run) when the alumni search is empty."""
+    from app.services import queue_service
+
+    monkeypatch.setattr(queue_service, "QUEUE_SPECULATIVE_FALLBACK_SEARCH", True)
+    db, queue_ref, _qc, _cu, _prefs = _build_generate_db()
+    mock_get_db.return_value = db
+    mock_search.side_effect = lambda **kw: [] if kw.get("college_alumni") else _five()
+
+    _run_generate({"company": "Acme", "university": "USC"})
+
+    alumni_args = sorted(str(c.kwargs.get("college_alumni")) for c in mock_search.call_args_list)
+    assert alumni_args == ["None", "USC"]
+    assert STATUS_PENDING_REVIEW in _statuses(queue_ref)
+
+
+@pytest.mark.unit
+@patch("app.services.queue_service.search_contacts_with_smart_location_strategy")
+@patch("app.services.queue_service.get_db")
+def test_pipeline_fallback_not_speculated_by_default(mock_get_db, mock_search):
+    """Off by default: an alumni hit never pays for the non-alumni search."""
+    db, _queue_ref, _qc, _cu, _prefs = _build_generate_db()
+    mock_get_db.return_value = db
+    mock_search.return_value = []  # stop after the search stage
+
+    _run_generate({"company": "Acme", "university": "USC"})
+    mock_search.return_value = [_candidate()]
+    mock_search.reset_mock()
+    with patch("app.services.queue_service.batch_generate_emails", return_value={}):
+        _run_generate({"company": "Acme", "university": "USC"})
+    assert [c.kwargs.get("college_alumni") for c in mock_search.call_args_list] == ["USC"]
+
+
+@pytest.mark.unit
+@patch("app.services.queue_service.refund_credits_atomic", return_value=(True, 100))
+@patch("app.services.queue_service.batch_generate_emails")
+@patch("app.services.queue_service.score_contacts_for_email")
+@patch("app.services.queue_service.search_contacts_with_smart_location_strategy")
+@patch("app.services.queue_service.get_db")
+def test_pipeline_drafts_in_chunks_and_commits_each(
+    mock_get_db, mock_search, mock_score, mock_batch, mock_refund, monkeypatch
+):
+    from app.services import queue_service
+
+    monkeypatch.setattr(queue_service, "QUEUE_DRAFT_CHUNK_SIZE", 2)
+    db, queue_ref, qc_ref, _cu, _prefs = _build_generate_db()
+    mock_get_db.return_value = db
+    mock_search.return_value = _five()
+    mock_score.side_effect = lambda profile, contacts, features=None: {
+        i: {"tier": "warm", "score": 50, "signals": [c["FirstName"]]} for i, c in enumerate(contacts)
+    }
+    mock_batch.side_effect = lambda **kw: {
+        j: {"subject": f"Hi {c['FirstName']}", "body": f"warmth {kw['warmth_data'][j]['signals'][0]}"}
+        for j, c in enumerate(kw["contacts"])
+    }
+
+    _run_generate()
+
+    assert sorted(len(c.kwargs["contacts"]) for c in mock_batch.call_args_list) == [1, 2, 2]
+    # Each chunk gets the same ContactFeatures the scorer saw, aligned.
+    for c in mock_batch.call_args_list:
+        assert [f.raw for f in c.kwargs["contact_features"]] == c.kwargs["contacts"]
+    batch = db.batch.return_value
+    assert batch.commit.call_count == 3
+    progress = [c[0][1]["contactCount"] for c in batch.update.call_args_list]
+    assert progress == sorted(progress) and progress[-1] == QUEUE_CONTACT_COUNT
+    docs = [c[0][1] for c in batch.set.call_args_list]
+    assert len(docs) == QUEUE_CONTACT_COUNT
+    # Each draft landed on its own contact, warmth re-indexed per chunk.
+    for doc in docs:
+        assert doc["draftSubject"] == f"Hi {doc['firstName']}"
+        assert doc["draftBody"] == f"warmth {doc['firstName']}"
+    assert STATUS_PENDING_REVIEW in _statuses(queue_ref)
+    mock_refund.assert_not_called()
+
+
+@pytest.mark.unit
+@patch("app.services.queue_service.refund_credits_atomic", return_value=(True, 100))
+@patch("app.services.queue_service.batch_generate_emails")
+@patch("app.services.queue_service.score_contacts_for_email", return_value={})
+@patch("app.services.queue_service.search_contacts_with_smart_location_strategy")
+@patch("app.services.queue_service.get_db")
+def test_pipeline_failed_chunk_keeps_written_and_refunds_the_rest(
+    mock_get_db, mock_search, _score, mock_batch, mock_refund, monkeypatch
+):
+    """A chunk failing after others were written keeps the written contacts,
+    marks the queue partial and refunds only the undrafted share."""
+    from app.services import queue_service
+
+    monkeypatch.setattr(queue_service, "QUEUE_DRAFT_CHUNK_SIZE", 2)
+    db, queue_ref, _qc, _cu, _prefs = _build_generate_db()
+    mock_get_db.return_value = db
+    mock_search.return_value = _five()
+
+    def _batch(**kw):
+        if kw["contacts"][0]["FirstName"] == "U2":
+            raise RuntimeError("LLM timeout")
+        return {j: {"subject": "s", "body": "b"} for j in range(len(kw["contacts"]))}
+
+    mock_batch.side_effect = _batch
+    _run_generate()
+
+    statuses = _statuses(queue_ref)
+    assert STATUS_COMPLETED_PARTIAL in statuses and STATUS_FAILED_EMAILS not in statuses
+    assert db.batch.return_value.commit.call_count == 2
+    final = [c[0][0] for c in queue_ref.update.call_args_list if c[0][0].get("status") == STATUS_COMPLETED_PARTIAL][-1]
+    assert final["contactCount"] == 3
+    # 2 of 5 undrafted -> ceil(15 * 2 / 5) = 6 credits back.
+    mock_refund.assert_called_once_with("uid1", 6, "queue_partial_drafts")
+    assert final["creditsRefundedAmount"] == 6
+
+
+@pytest.mark.unit
+@patch("app.services.queue_service.refund_credits_atomic", return_value=(True, 100))
+@patch("app.services.queue_service.batch_generate_emails", side_effect=RuntimeError("LLM down"))
+@patch("app.services.queue_service.score_contacts_for_email", return_value={})
+@patch("app.services.queue_service.search_contacts_with_smart_location_strategy")
+@patch("app.services.queue_service.get_db")
+def test_pipeline_all_chunks_failed_fails_and_refunds(
+    mock_get_db, mock_search, _score, _batch, mock_refund, monkeypatch
+):
+    from app.services import queue_service
+
+    monkeypatch.setattr(queue_service, "QUEUE_DRAFT_CHUNK_SIZE", 2)
+    db, queue_ref, _qc, _cu, _prefs = _build_generate_db()
+    mock_get_db.return_value = db
+    mock_search.return_value = _five()
+
+    _run_generate()
+
+    statuses = _statuses(queue_ref)
+    assert STATUS_FAILED_EMAILS in statuses and STATUS_COMPLETED_PARTIAL not in statuses
+    mock_refund.assert_called_once_with("uid1", QUEUE_GENERATION_CREDITS, f"queue_{STATUS_FAILED_EMAILS}")
+
+
+@pytest.mark.unit
+@patch("app.services.queue_service.batch_generate_emails")
+@patch("app.services.queue_service.score_contacts_for_email", return_value={})
+@patch("app.services.queue_service.search_contacts_with_smart_location_strategy")
+@patch("app.services.queue_service.get_db")
+def test_pipeline_drafts_the_whole_queue_in_one_call_by_default(
+    mock_get_db, mock_search, _score, mock_batch
+):
+    """The prompt varies openers across one call's batch, so by default the
+    whole queue goes through a single batch_generate_emails call."""
+    db, queue_ref, _qc, _cu, _prefs = _build_generate_db()
+    mock_get_db.return_value = db
+    mock_search.return_value = _five()
+    mock_batch.side_effect = lambda **kw: {j: {"subject": "s", "body": "b"} for j in range(len(kw["contacts"]))}
+
+    _run_generate()
+
+    assert [len(c.kwargs["contacts"]) for c in mock_batch.call_args_list] == [QUEUE_CONTACT_COUNT]
+    assert STATUS_PENDING_REVIEW in _statuses(queue_ref)
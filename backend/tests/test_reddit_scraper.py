@@ -0,0 +1,201 @@
+"""
+Tests for the shared Reddit fetch layer in
+app/services/interview_prep/reddit_scraper.py, against a local stub server
+serving recorded-style JSON.
+
+Pins:
+  1. search_reddit returns the same posts/comments shape as before, with
+     comment fetches running concurrently.
+  2. Listings and comment trees are cached across generations.
+  3. Simultaneous generations (separate event loops, as the background
+     workers run them) share one request per URL.
+  4. The token bucket spaces requests and a 429 pauses everyone.
+"""
+import asyncio
+import threading
+import time
+import zlib
+
+import pytest
+from aiohttp import web
+
+from app.services.interview_prep import reddit_scraper as rs
+
+
+NOW = time.time()
+
+
+def _listing(subreddit, query):
+    slug = "p%x" % zlib.crc32(f"{subreddit}/{query}".encode())
+    return {"data": {"children": [
+        {"kind": "t3", "data": {
+            "id": f"{slug}{i}", "title": f"{query} story {i}", "selftext": "body",
+            "ups": 100 - i, "created_utc": NOW - 86400, "subreddit": subreddit,
+            "permalink": f"/r/{subreddit}/comments/{slug}{i}/t",
+        }}
+        for i in range(4)
+    ]}}
+
+
+def _comments(post_id):
+    return [
+        {"data": {"children": []}},
+        {"data": {"children": [
+            {"kind": "t1", "data": {"body": f"{post_id} comment {n}", "ups": 10 - n}} for n in range(5)
+        ] + [{"kind": "more", "data": {}}]}},
+    ]
+
+
+class StubReddit:
+    """aiohttp server on its own thread and loop."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.paths = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.throttle_next = 0
+        self._lock = threading.Lock()
+
+    async def search(self, request):
+        return await self._serve(request, lambda: _listing(request.match_info["sub"], request.query["q"]))
+
+    async def comments(self, request):
+        return await self._serve(request, lambda: _comments(request.match_info["pid"]))
+
+    async def _serve(self, request, body):
+        with self._lock:
+            self.paths.append(request.path_qs)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            throttled = self.throttle_next > 0
+            if throttled:
+                self.throttle_next -= 1
+        try:
+            await asyncio.sleep(self.delay)
+            if throttled:
+                return web.Response(status=429)
+            return web.json_response(body())
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def start(self):
+        app = web.Application()
+        app.router.add_get("/r/{sub}/search.json", self.search)
+        app.router.add_get("/r/{sub}/comments/{pid}/{slug}.json", self.comments)
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            self.runner = web.AppRunner(app)
+            self.loop.run_until_complete(self.runner.setup())
+            site = web.TCPSite(self.runner, "127.0.0.1", 0)
+            self.loop.run_until_complete(site.start())
+            self.port = site._server.sockets[0].getsockname()[1]
+            ready.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        ready.wait(5)
+        return f"http://127.0.0.1:{self.port}"
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+
+@pytest.fixture
+def reddit(monkeypatch):
+    stub = StubReddit()
+    monkeypatch.setattr(rs, "REDDIT_BASE_URL", stub.start())
+    monkeypatch.setattr(rs, "REDDIT_LIMITER", rs.TokenBucket(rate=0, burst=1))
+    rs.clear_reddit_cache()
+    yield stub
+    rs.clear_reddit_cache()
+    stub.stop()
+
+
+JOB = {"company_name": "Acme", "job_title": "Analyst", "role_category": "Finance"}
+
+
+def _search(job=JOB):
+    return asyncio.run(rs.search_reddit(job, timeout_seconds=10))
+
+
+def _comment_paths(stub):
+    return [p for p in stub.paths if "/comments/" in p]
+
+
+class TestSearch:
+    def test_posts_and_comments(self, reddit):
+        posts = _search()
+        # 3 queries x 4 posts = 12 unique posts in the first subreddit, 8 more
+        # from the second; the third subreddit is skipped by the early exit.
+        assert len(posts) == 20
+        assert sum("/search.json" in p for p in reddit.paths) == 6
+        assert posts[0]["upvotes"] == 100
+        first = posts[0]
+        assert first["top_comments"] == [
+            {"body": f"{first['post_id']} comment {n}", "upvotes": 10 - n} for n in range(3)
+        ]
+        assert first["url"] == f"https://www.reddit.com/r/FinancialCareers/comments/{first['post_id']}/t"
+        assert all(p["top_comments"] for p in posts[:15])
+        assert all(p["top_comments"] == [] for p in posts[15:])
+
+    def test_comment_fetches_run_concurrently(self, reddit, monkeypatch):
+        reddit.delay = 0.05
+        monkeypatch.setattr(rs, "REDDIT_COMMENT_CONCURRENCY", 5)
+        _search()
+        assert reddit.max_in_flight == 5
+
+
+class TestSharing:
+    def test_second_generation_is_served_from_cache(self, reddit):
+        first = _search()
+        reddit.paths.clear()
+        assert _search() == first
+        assert reddit.paths == []
+
+    def test_simultaneous_generations_share_requests(self, reddit):
+        reddit.delay = 0.05
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(_search())) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(20)
+        assert len(results) == 3 and results[0] == results[1] == results[2]
+        assert len(reddit.paths) == len(set(reddit.paths))
+        assert len(_comment_paths(reddit)) == 15
+
+    def test_failed_fetch_is_not_cached(self, reddit):
+        reddit.throttle_next = 100
+        assert _search() == []
+        reddit.throttle_next = 0
+        assert len(_search()) == 20
+
+
+class TestTokenBucket:
+    def test_burst_then_spacing(self):
+        now = [0.0]
+        bucket = rs.TokenBucket(rate=2.0, burst=2, clock=lambda: now[0])
+        assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+        now[0] = 1.5
+        assert bucket.reserve() == 0.0
+
+    def test_penalty_pauses_everyone(self):
+        now = [0.0]
+        bucket = rs.TokenBucket(rate=1.0, burst=3, clock=lambda: now[0])
+        bucket.penalize(2.0)
+        assert bucket.reserve() == pytest.approx(3.0)
+
+    def test_429_penalizes_shared_limiter(self, reddit, monkeypatch):
+        penalties = []
+        monkeypatch.setattr(rs.REDDIT_LIMITER, "penalize", penalties.append)
+        reddit.throttle_next = 1
+        _search()
+        assert penalties == [rs.REDDIT_RATE_LIMIT_BACKOFF_SECONDS]
@@ -0,0 +1,139 @@
+"""Tests for the compiled school-alias matcher in pdl_client.
+
+The corpus in fixtures/school_match/corpus.json mixes PDL-shaped education
+records, College / EducationTop strings and the usual false-positive traps
+(british columbia, george washington, penn state, ...). Every verdict must
+match the per-alias loop the matcher replaced.
+"""
+import json
+import os
+import re
+
+import pytest
+
+from app.services.pdl_client import (
+    _GEOGRAPHIC_QUALIFIERS,
+    SchoolMatcher,
+    _school_aliases,
+    _school_name_matches,
+    apply_strict_alumni_filter,
+    contact_matches_school,
+    filter_contacts_by_school,
+    school_matcher,
+)
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "school_match", "corpus.json")
+
+
+def _legacy_school_name_matches(school_name, aliases):
+    """The per-alias loop as it was before SchoolMatcher."""
+    if not school_name:
+        return False
+    for alias in aliases:
+        if not alias:
+            continue
+        if alias == school_name:
+            return True
+        alias_words = alias.split()
+        if len(alias_words) == 1 and len(alias) < 15:
+            pattern = r'\b' + re.escape(alias) + r'\b'
+            if re.search(pattern, school_name):
+                if school_name != alias and alias in school_name:
+                    before = school_name[:school_name.index(alias)].strip()
+                    if before and before.split()[-1] in _GEOGRAPHIC_QUALIFIERS:
+                        continue
+                return True
+        else:
+            if alias in school_name or school_name in alias:
+                return True
+    return False
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    with open(CORPUS_PATH) as f:
+        return json.load(f)
+
+
+def _school_strings(contact):
+    out = []
+    for e in contact.get("education") or []:
+        school = e.get("school") or {}
+        name = school.get("name") if isinstance(school, dict) else school
+        out.append((name or "").lower())
+    out.append((contact.get("College") or "").lower())
+    out.append((contact.get("EducationTop") or "").lower())
+    return [s for s in out if s]
+
+
+class TestExactEquivalence:
+    def test_name_matches_equal_legacy_on_corpus(self, corpus):
+        names = sorted({s for c in corpus["contacts"] for s in _school_strings(c)})
+        checked = 0
+        for query in corpus["queries"]:
+            aliases = _school_aliases(query)
+            for name in names:
+                assert _school_name_matches(name, aliases) == _legacy_school_name_matches(name, aliases), (query, name)
+                checked += 1
+        assert checked > 1000
+
+    def test_contact_verdicts_stable_across_strictness(self, corpus, monkeypatch):
+        from app.services import pdl_client
+
+        for strictness in ("strict", "normal", "loose"):
+            for query in corpus["queries"]:
+                aliases = _school_aliases(query)
+                new = [contact_matches_school(c, aliases, strictness) for c in corpus["contacts"]]
+                with monkeypatch.context() as m:
+                    m.setattr(pdl_client, "school_matcher", _LegacyMatcher)
+                    old = [contact_matches_school(c, aliases, strictness) for c in corpus["contacts"]]
+                assert new == old, (query, strictness)
+
+    def test_corpus_has_both_verdicts(self, corpus):
+        aliases = _school_aliases("Columbia")
+        verdicts = {contact_matches_school(c, aliases, "loose") for c in corpus["contacts"]}
+        assert verdicts == {True, False}
+
+
+class _LegacyMatcher:
+    def __init__(self, aliases):
+        self.aliases = list(aliases)
+
+    def matches(self, school_name):
+        return _legacy_school_name_matches(school_name, self.aliases)
+
+
+class TestMatcher:
+    def test_geographic_qualifier_guard(self):
+        assert not _school_name_matches("university of british columbia", ["columbia"])
+        assert not _school_name_matches("george washington university", ["washington"])
+        assert _school_name_matches("columbia university", ["columbia"])
+
+    def test_multi_word_reverse_substring(self):
+        assert _school_name_matches("stanford", ["stanford university"])
+
+    def test_empty_inputs(self):
+        assert not _school_name_matches("", ["mit"])
+        assert not SchoolMatcher([]).matches("mit")
+        assert not SchoolMatcher(["", "mit"]).matches("")
+
+    def test_matcher_is_cached_per_alias_list(self):
+        aliases = _school_aliases("MIT")
+        assert school_matcher(aliases) is school_matcher(list(aliases))
+        m = school_matcher(aliases)
+        assert school_matcher(m) is m
+
+
+class TestBatchFilter:
+    def test_filter_equals_per_contact_calls(self, corpus):
+        aliases = _school_aliases("University of Southern California")
+        expected = [c for c in corpus["contacts"] if contact_matches_school(c, aliases, "normal")]
+        assert filter_contacts_by_school(corpus["contacts"], aliases, "normal") == expected
+
+    def test_filter_without_aliases_returns_nothing(self):
+        assert filter_contacts_by_school([{"College": "MIT"}], []) == []
+
+    def test_strict_alumni_filter_uses_batch(self, corpus):
+        aliases = _school_aliases("Stanford")
+        expected = [c for c in corpus["contacts"] if contact_matches_school(c, aliases, "strict")]
+        assert apply_strict_alumni_filter(corpus["contacts"], "Stanford") == expected
@@ -0,0 +1,158 @@
+"""
+Tests for the shared scoring profile (app/utils/scoring_profile.py).
+
+The corpus test pins warmth scoring and personalization output to
+fixtures/scoring_profile/expected.json, recorded from the scorers before
+the user side was compiled out of the per-contact loop: 160 mixed-format
+contacts x 3 users x 3 search contexts, compared by a digest of the full
+output (scores, signals, labels, strategies) plus a readable summary.
+"""
+import copy
+import dataclasses
+import datetime as _dt
+import hashlib
+import json
+import pathlib
+
+import pytest
+
+from app.utils import coffee_chat_prep, contact_analysis, personalization, scoring_profile
+from app.utils.personalization import build_batch_strategies, build_user_profile
+from app.utils.scoring_profile import ContactFeatures
+from app.utils.warmth_scoring import score_and_sort_contacts, score_contacts_for_email
+
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures" / "scoring_profile"
+
+
+class FrozenDatetime(_dt.datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 6, 15, 12, 0, 0)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    # Tenure / recent-transition signals depend on the current date.
+    monkeypatch.setattr(contact_analysis, "datetime", FrozenDatetime)
+    monkeypatch.setattr(personalization, "datetime", FrozenDatetime)
+
+
+def run_case(user, search, contacts):
+    contacts = copy.deepcopy(contacts)
+    warmth = score_contacts_for_email(user, contacts, search_context=search)
+    ranked = score_and_sort_contacts(user, copy.deepcopy(contacts), search_context=search)
+    norm_user = build_user_profile(user.get("resumeParsed"), user)
+    strategies = build_batch_strategies(norm_user, contacts, warmth)
+    return {
+        "warmth": {str(i): w for i, w in warmth.items()},
+        "ranked": [[c["id"], c["warmth_score"], c["warmth_tier"], c["warmth_label"]] for c in ranked],
+        "strategies": {str(i): dataclasses.asdict(s) for i, s in strategies.items()},
+    }
+
+
+def test_corpus_output_matches_recorded(frozen_now):
+    corpus = json.loads((FIXTURES / "corpus.json").read_text())
+    expected = json.loads((FIXTURES / "expected.json").read_text())
+    cases = [(u, s) for u in corpus["users"] for s in corpus["searches"]]
+    assert len(cases) == len(expected)
+
+    for (user, search), want in zip(cases, expected):
+        got = run_case(user, search, corpus["contacts"])
+        assert [r[:2] for r in got["ranked"]] == want["ranked"]
+        assert [got["strategies"][str(i)]["lead_type"] for i in range(len(got["strategies"]))] \
+            == want["lead_types"]
+        digest = hashlib.sha256(json.dumps(got, sort_keys=True).encode()).hexdigest()
+        assert digest == want["sha256"]
+
+
+USER = {
+    "academics": {"university": "USC", "major": "Economics"},
+    "goals": {"careerTrack": "Investment Banking"},
+    "resumeParsed": {"rawText": "Based in Los Angeles, CA\nAnalyst Intern, Goldman Sachs"},
+}
+
+
+def contacts(n):
+    return [{"FirstName": f"C{i}", "Company": "Goldman Sachs", "Title": "Analyst",
+             "College": "University of Southern California", "City": "Los Angeles"}
+            for i in range(n)]
+
+
+class TestCompiledOnce:
+    def test_resume_is_parsed_once_per_batch(self, monkeypatch):
+        calls = {"hometown": 0, "companies": 0}
+        real_h = coffee_chat_prep.extract_hometown_from_resume
+        real_c = coffee_chat_prep.extract_companies_from_resume
+
+        def hometown(text):
+            calls["hometown"] += 1
+            return real_h(text)
+
+        def companies(text):
+            calls["companies"] += 1
+            return real_c(text)
+
+        monkeypatch.setattr(coffee_chat_prep, "extract_hometown_from_resume", hometown)
+        monkeypatch.setattr(coffee_chat_prep, "extract_companies_from_resume", companies)
+        scored = score_and_sort_contacts(USER, contacts(25))
+        assert calls == {"hometown": 1, "companies": 1}
+        assert all(c["warmth_signals"][0]["signal"] == "same_university" for c in scored)
+
+    def test_university_variants_are_cached(self, monkeypatch):
+        scoring_profile.university_variants.cache_clear()
+        calls = []
+        real = scoring_profile.get_university_variants
+        monkeypatch.setattr(scoring_profile, "get_university_variants",
+                            lambda name: calls.append(name) or real(name))
+        norm_user = build_user_profile(USER.get("resumeParsed"), USER)
+        strategies = build_batch_strategies(norm_user, contacts(30))
+        assert {s.lead_type for s in strategies.values()} == {"alumni"}
+        assert sorted(calls) == ["USC", "University of Southern California"]
+        scoring_profile.university_variants.cache_clear()
+
+    def test_shared_features_build_profile_once(self, monkeypatch):
+        batch = contacts(3)
+        features = scoring_profile.contact_features(batch)
+        built = []
+        real = personalization.build_contact_profile
+        monkeypatch.setattr(personalization, "build_contact_profile",
+                            lambda c: built.append(c) or real(c))
+        norm_user = build_user_profile(None, USER)
+        first = build_batch_strategies(norm_user, batch, features=features)
+        second = build_batch_strategies(norm_user, batch, features=features)
+        assert len(built) == 3
+        assert first == second
+
+    def test_sorted_features_follow_sorted_contacts(self):
+        batch = contacts(12)
+        expected = score_and_sort_contacts(USER, copy.deepcopy(batch))
+        features = scoring_profile.contact_features(batch)
+        scored = score_and_sort_contacts(USER, batch, features=features)
+        assert [f.raw for f in features] == scored
+        assert [c["warmth_score"] for c in scored] == [c["warmth_score"] for c in expected]
+
+    def test_misaligned_features_are_ignored(self):
+        batch = contacts(3)
+        norm_user = build_user_profile(None, USER)
+        stale = scoring_profile.contact_features(batch[:1])
+        assert (build_batch_strategies(norm_user, batch, features=stale)
+                == build_batch_strategies(norm_user, batch))
+
+
+class TestContactFeatures:
+    def test_firestore_aliases_applied_once(self):
+        f = ContactFeatures({"jobTitle": "Associate", "company": "Evercore", "college": "NYU"})
+        assert f.scoring["title"] == "Associate"
+        assert f.scoring["College"] == "NYU"
+        assert f.scoring is f.scoring
+        assert f.industry_searchable == "associate evercore associate at evercore "
+
+    def test_prenormalized_skips_alias_pass(self):
+        raw = {"jobTitle": "Associate"}
+        assert ContactFeatures(raw, prenormalized=True).scoring is raw
+
+    def test_search_titles_drop_stopwords(self):
+        assert scoring_profile.compile_search_titles(["head of data"]) == (
+            ("head of data", frozenset({"head", "data"})),
+        )
@@ -0,0 +1,135 @@
+"""Tests for Scout SSE streams served from the shared async loop.
+
+Each stream is a task on async_runner's long-lived loop rather than a thread
+with its own event loop, so opening many streams must not grow the thread
+count, and a client disconnect must cancel the producer.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+from app.routes import scout_assistant
+from app.routes.scout_assistant import _sse_response
+from app.utils import async_runner
+
+
+def _frames(response, limit: int = 50):
+    out = []
+    for frame in response.response:
+        out.append(frame)
+        if len(out) >= limit:
+            break
+    return out
+
+
+def _events(frames):
+    return [f.split("\n", 1)[0].removeprefix("event: ") for f in frames]
+
+
+def test_stream_runs_on_shared_loop_and_terminates():
+    seen_loops = []
+
+    async def produce(out):
+        seen_loops.append(asyncio.get_running_loop())
+        await out.put({"event": "token", "data": {"text": "hi"}})
+        await out.put({"event": "done", "data": {"message": "hi"}})
+
+    frames = _frames(_sse_response(produce))
+
+    assert _events(frames) == ["token", "done"]
+    assert json.loads(frames[0].split("data: ")[1]) == {"text": "hi"}
+    assert seen_loops == [async_runner.shared_loop()]
+
+
+def test_producer_error_becomes_error_event():
+    async def produce(out):
+        raise RuntimeError("boom")
+
+    frames = _frames(_sse_response(produce, error_message="nope"))
+    assert _events(frames) == ["error"]
+    assert json.loads(frames[0].split("data: ")[1]) == {"message": "nope"}
+
+
+def test_many_concurrent_streams_do_not_add_threads():
+    async_runner.shared_loop()  # start the loop thread up front
+    before = threading.active_count()
+    release = threading.Event()
+
+    async def produce(out):
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        await out.put({"event": "done", "data": {}})
+
+    responses = [_sse_response(produce) for _ in range(300)]
+    assert threading.active_count() == before
+
+    release.set()
+    for r in responses:
+        assert _events(_frames(r)) == ["done"]
+
+
+def test_client_disconnect_cancels_producer():
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    async def produce(out):
+        await out.put({"event": "token", "data": {"text": "a"}})
+        started.set()
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    gen = _sse_response(produce).response
+    assert next(gen).startswith("event: token")
+    assert started.wait(2)
+    gen.close()  # what the WSGI server does when the client goes away
+    assert cancelled.wait(2)
+
+
+def test_writer_drops_items_after_close():
+    q = scout_assistant.queue.Queue()
+    writer = scout_assistant._SSEWriter(q)
+    writer.put_nowait({"event": "token"})
+    writer.closed = True
+    writer.put_nowait({"event": "token"})
+    assert q.qsize() == 1
+
+
+def test_chat_stream_client_is_bound_to_shared_loop(monkeypatch):
+    from app.services import scout_assistant_service as svc_mod
+
+    made = []
+
+    def factory():
+        made.append(object())
+        return made[-1]
+
+    monkeypatch.setattr(svc_mod, "create_async_openai_client", factory)
+    async_runner._shared_resources.pop("openai", None)
+    service = svc_mod.scout_assistant_service
+
+    async def grab():
+        return service._get_openai()
+
+    a = async_runner.submit(grab()).result(2)
+    b = async_runner.submit(grab()).result(2)
+    assert a is b is made[0]
+
+    # Off the shared loop the service keeps its default client.
+    assert asyncio.run(grab()) is service._openai
+    async_runner._shared_resources.pop("openai", None)
+
+
+def test_shared_loop_is_reused_across_calls():
+    assert async_runner.shared_loop() is async_runner.shared_loop()
+    fut = async_runner.submit(asyncio.sleep(0, result=7))
+    assert fut.result(2) == 7
+    assert async_runner.submit(_on_shared()).result(2) is True
+
+
+async def _on_shared():
+    return async_runner.on_shared_loop()
@@ -0,0 +1,274 @@
+"""
+Tests for app startup: lazy blueprint registration
+(app/utils/lazy_blueprints.py), the import profiler
+(app/utils/import_profiler.py) and the create_app import budget.
+
+Pins:
+  1. A route module is imported only when a request falls under one of its
+     prefixes (or the preload thread reaches it), and is then served on
+     that same request, including after Flask has handled other requests.
+  2. Modules sharing a prefix load together, in declared order, and a
+     nested prefix loads only with requests under it;
+     a module that fails to import 404s and turns /healthz unhealthy, and
+     one that is missing or doesn't compile fails the boot.
+  3. The ROUTE_MODULES prefixes cover every rule the modules register.
+  4. ImportProfiler attributes self / cumulative time to nested imports.
+  5. Importing backend.wsgi (which builds the app) stays under the import
+     budget and doesn't pull in the heavy route / service graph.
+"""
+import importlib
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+from app.routes import CORE_ROUTE_MODULES, ROUTE_MODULES
+from app.utils.import_profiler import ImportProfiler
+from app.utils.lazy_blueprints import LazyBlueprints, RouteModule, _overlap_groups, route_load_failures
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Budget for importing backend.wsgi, which runs create_app(). The lazy boot
+# measures ~600 ms / ~900 modules; the eager one was several seconds.
+STARTUP_IMPORT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "2000"))
+STARTUP_MODULE_BUDGET = int(os.getenv("STARTUP_MODULE_BUDGET", "1100"))
+
+
+def _route_module(name, prefix, body=""):
+    return textwrap.dedent(f"""
+        from flask import Blueprint
+        {name}_bp = Blueprint({name!r}, __name__, url_prefix={prefix!r})
+
+        @{name}_bp.route("/x")
+        def x():
+            return {name!r}
+        {body}
+    """)
+
+
+@pytest.fixture
+def routes(tmp_path, monkeypatch):
+    """A throwaway routes package: alpha, beta (both /api/a), gamma, broken."""
+    pkg_name = f"lazy_routes_{tmp_path.name}"
+    pkg = tmp_path / pkg_name
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "alpha.py").write_text(_route_module("alpha", "/api/a"))
+    (pkg / "beta.py").write_text(_route_module("beta", "/api/a/beta"))
+    (pkg / "gamma.py").write_text(_route_module("gamma", "/api/g"))
+    (pkg / "broken.py").write_text("raise OSError('cannot load library')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield pkg_name, [
+        RouteModule("alpha", ("alpha_bp",), ("/api/a",)),
+        RouteModule("beta", ("beta_bp",), ("/api/a",)),
+        RouteModule("gamma", ("gamma_bp",), ("/api/g",)),
+        RouteModule("broken", ("broken_bp",), ("/api/broken",)),
+    ]
+    for name in [m for m in sys.modules if m.startswith(pkg_name)]:
+        del sys.modules[name]
+
+
+def _app(routes, preload=False):
+    pkg_name, modules = routes
+    app = Flask(__name__)
+
+    @app.route("/ping")
+    def ping():
+        return "pong"
+
+    return app, LazyBlueprints(app, modules, pkg_name, preload=preload)
+
+
+# ── 1. On-demand loading ─────────────────────────────────────────────────────
+
+
+class TestLazyBlueprints:
+    def test_loads_on_first_request_to_prefix(self, routes):
+        app, lazy = _app(routes)
+        client = app.test_client()
+        assert client.get("/ping").data == b"pong"
+        assert lazy.loaded == {}
+
+        # Flask has handled a request; registering must still work.
+        assert client.get("/api/g/x").data == b"gamma"
+        assert set(lazy.loaded) == {"gamma"}
+        assert f"{routes[0]}.alpha" not in sys.modules
+
+    def test_overlapping_prefixes_load_together_in_order(self, routes):
+        app, lazy = _app(routes)
+        assert app.test_client().get("/api/a/beta/x").data == b"beta"
+        assert list(lazy.loaded) == ["alpha", "beta"]
+        assert [bp for bp in app.blueprints] == ["alpha", "beta"]
+
+    def test_nested_prefix_loads_parent_and_child(self, routes):
+        pkg_name, modules = routes
+        modules = [modules[0], RouteModule("beta", ("beta_bp",), ("/api/a/beta",))] + modules[2:]
+        app, lazy = _app((pkg_name, modules))
+        assert app.test_client().get("/api/a/x").data == b"alpha"
+        assert list(lazy.loaded) == ["alpha"]
+        assert app.test_client().get("/api/a/beta/x").data == b"beta"
+        assert list(lazy.loaded) == ["alpha", "beta"]
+
+    def test_prefix_match_respects_segments(self, routes):
+        app, lazy = _app(routes)
+        assert app.test_client().get("/api/gx").status_code == 404
+        assert lazy.loaded == {}
+
+    def test_broken_module_404s(self, routes):
+        app, lazy = _app(routes)
+        client = app.test_client()
+        assert client.get("/api/broken/x").status_code == 404
+        assert "OSError" in lazy.failed["broken"]
+        assert client.get("/api/g/x").data == b"gamma"
+        assert "broken" not in lazy.pending()
+        assert list(route_load_failures(app)) == ["broken"]
+
+    def test_failed_module_fails_health_checks(self, routes):
+        from app.routes.health import health_bp
+        app, lazy = _app(routes)
+        app.register_blueprint(health_bp)
+        client = app.test_client()
+        assert client.get("/healthz").status_code == 200
+        client.get("/api/broken/x")
+        resp = client.get("/healthz")
+        assert resp.status_code == 503
+        assert "OSError" in resp.get_json()["failed_route_modules"]["broken"]
+
+    @pytest.mark.parametrize("source", [None, "def broken(:\n"], ids=["missing", "syntax_error"])
+    def test_unloadable_module_fails_boot(self, routes, source):
+        pkg_name, modules = routes
+        if source is not None:
+            (Path(importlib.import_module(pkg_name).__path__[0]) / "gamma.py").write_text(source)
+        else:
+            modules = modules + [RouteModule("nope", ("nope_bp",), ("/api/nope",))]
+        with pytest.raises((ImportError, SyntaxError)):
+            LazyBlueprints(Flask(__name__), modules, pkg_name, preload=False)
+
+    def test_preload_starts_with_first_request(self, routes):
+        app, lazy = _app(routes, preload=True)
+        assert lazy.pending() == ["alpha", "beta", "gamma", "broken"]
+        app.test_client().get("/ping")
+        lazy._preload_thread.join(10)
+        assert lazy.pending() == []
+        assert set(lazy.loaded) == {"alpha", "beta", "gamma"}
+        assert app.test_client().get("/api/a/x").data == b"alpha"
+
+    def test_overlap_groups_are_transitive(self):
+        a = RouteModule("a", (), ("/api/x",))
+        b = RouteModule("b", (), ("/api/y",))
+        c = RouteModule("c", (), ("/api/x", "/api/y"))
+        d = RouteModule("d", (), ("/api/z",))
+        assert _overlap_groups([a, b, c, d]) == [[a, b, c], [d]]
+
+
+# ── 2. Route registry ────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("route_module", CORE_ROUTE_MODULES + ROUTE_MODULES, ids=lambda m: m.module)
+def test_prefixes_cover_registered_rules(route_module):
+    try:
+        module = importlib.import_module(f"backend.app.routes.{route_module.module}")
+    except Exception as e:  # e.g. WeasyPrint's native libs missing here
+        pytest.skip(f"{route_module.module} unavailable: {e}")
+    app = Flask(__name__)
+    for name in route_module.blueprints:
+        app.register_blueprint(getattr(module, name))
+    rules = [r.rule for r in app.url_map.iter_rules() if r.endpoint != "static"]
+    assert rules
+    assert [r for r in rules if not route_module.matches(r)] == []
+
+
+def test_registry_names_each_module_once():
+    names = [m.module for m in CORE_ROUTE_MODULES + ROUTE_MODULES]
+    assert len(names) == len(set(names))
+
+
+@pytest.mark.parametrize("name", ["job_board", "scout_assistant", "contacts", "admin", "users"])
+def test_heavy_modules_load_alone(name):
+    # A shared prefix pulls every module on it into one first request.
+    group = next(g for g in _overlap_groups(ROUTE_MODULES) if any(m.module == name for m in g))
+    assert [m.module for m in group] == [name]
+
+
+# ── 3. Import profiler ───────────────────────────────────────────────────────
+
+
+def test_import_profiler_attributes_nested_time(tmp_path, monkeypatch):
+    pkg = tmp_path / "profiled_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "outer.py").write_text("import time\ntime.sleep(0.02)\nfrom profiled_pkg import inner\n")
+    (pkg / "inner.py").write_text("import time\ntime.sleep(0.05)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    with ImportProfiler() as profiler:
+        import profiled_pkg.outer  # noqa: F401
+    for name in ("profiled_pkg", "profiled_pkg.outer", "profiled_pkg.inner"):
+        monkeypatch.delitem(sys.modules, name)
+
+    records = {r.name: r for r in profiler.records}
+    outer, inner = records["profiled_pkg.outer"], records["profiled_pkg.inner"]
+    assert inner.depth == outer.depth + 1
+    assert inner.cumulative_ms >= 45
+    assert outer.cumulative_ms >= inner.cumulative_ms + 15
+    assert 15 <= outer.self_ms < outer.cumulative_ms - 40
+    assert profiler.top(1)[0].name == "profiled_pkg.inner"
+    assert profiler not in sys.meta_path
+
+
+# ── 4. Startup budget ────────────────────────────────────────────────────────
+
+
+HEAVY_MODULES = [
+    "backend.app.routes.job_board",
+    "app.routes.job_board",
+    "app.services.pdl_client",
+    "app.services.scout_assistant_service",
+    "stripe",
+    "openai",
+    "anthropic",
+    "weasyprint",
+]
+
+_BOOT_SCRIPT = """
+import json, sys
+import backend.wsgi as wsgi
+print(json.dumps({
+    "summary": wsgi.BOOT_PROFILE.summary(),
+    "top": [(r.name, round(r.cumulative_ms)) for r in wsgi.BOOT_PROFILE.top(10, key="cumulative_ms")],
+    "heavy": [m for m in %r if m in sys.modules],
+    "pending": len(wsgi.app.extensions["lazy_blueprints"].pending()),
+}))
+""" % (HEAVY_MODULES,)
+
+
+def test_create_app_import_budget():
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(REPO_ROOT), str(REPO_ROOT / "backend")]),
+        "STARTUP_IMPORT_PROFILE": "true",
+        "STARTUP_LAZY_ROUTES": "true",
+        "STARTUP_PRELOAD_ROUTES": "false",
+        "MCP_LOCAL_DEV_OK": "1",
+        "FLASK_ENV": "testing",
+    }
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", _BOOT_SCRIPT], cwd=REPO_ROOT, env=env,
+        capture_output=True, text=True, timeout=300,
+    )
+    assert proc.returncode == 0, proc.stderr[-3000:]
+    report = json.loads(proc.stdout.strip().splitlines()[-1])
+    summary = report["summary"]
+    detail = f"{summary}, slowest: {report['top']} (wall {time.perf_counter() - started:.1f}s)"
+
+    assert report["heavy"] == [], detail
+    assert report["pending"] == len(ROUTE_MODULES), detail
+    assert summary["modules"] <= STARTUP_MODULE_BUDGET, detail
+    assert summary["import_ms"] <= STARTUP_IMPORT_BUDGET_MS, detail
@@ -125,3 +125,189 @@ class TestIsSuppressed:
         db.collection.side_effect = RuntimeError("firestore down")
         with patch.object(suppression, "get_db", return_value=db):
             assert suppression.is_suppressed("uid-1", "bad@example.com") is False
+
+
+class _Snap:
+    def __init__(self, doc_id, exists):
+        self.id = doc_id
+        self.exists = exists
+
+
+class _FakeStore:
+    """Just enough Firestore for suppression: docs keyed by path, read counts."""
+
+    def __init__(self, user=(), global_=()):
+        self.docs = {f"users/uid-1/suppression/{e}": {"email": e} for e in user}
+        self.docs.update({f"global_suppression/{e}": {"email": e, "lastBouncedAt": "2026-01-01T00:00:00+00:00"} for e in global_})
+        self.reads = []
+        self.get_all_calls = 0
+
+    def collection(self, name):
+        return _FakeColl(self, name)
+
+    def get_all(self, refs):
+        self.get_all_calls += 1
+        for ref in refs:
+            yield ref.get()
+
+
+class _FakeRef:
+    def __init__(self, store, path):
+        self._store = store
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name):
+        return _FakeColl(self._store, f"{self.path}/{name}")
+
+    def get(self):
+        self._store.reads.append(self.path)
+        return _Snap(self.id, self.path in self._store.docs)
+
+    def set(self, data, merge=False):
+        self._store.docs[self.path] = dict(data)
+
+
+class _FakeColl:
+    def __init__(self, store, path, since=None):
+        self._store = store
+        self.path = path
+        self._since = since
+
+    def document(self, doc_id):
+        return _FakeRef(self._store, f"{self.path}/{doc_id}")
+
+    def where(self, field, op, value):
+        return _FakeColl(self._store, self.path, since=value)
+
+    def select(self, fields):
+        return self
+
+    def stream(self):
+        prefix = self.path + "/"
+        for path, data in list(self._store.docs.items()):
+            rest = path[len(prefix):]
+            if path.startswith(prefix) and "/" not in rest:
+                if self._since is None or str(data.get("lastBouncedAt", "")) >= self._since:
+                    yield _Snap(rest, True)
+
+
+class TestBloomFilter:
+    def test_no_false_negatives_and_low_false_positive_rate(self):
+        bloom = suppression.BloomFilter(5000)
+        members = [f"user{i}@bounce.com" for i in range(5000)]
+        for m in members:
+            bloom.add(m)
+        assert all(m in bloom for m in members)
+        false_positives = sum(f"other{i}@clean.com" in bloom for i in range(20000))
+        assert false_positives / 20000 < 0.005
+
+
+class TestBatchedLookups:
+    def setup_method(self):
+        suppression._global_filter.reset()
+
+    def teardown_method(self):
+        suppression._global_filter.reset()
+
+    def test_user_layer_is_one_get_all(self):
+        store = _FakeStore(user=["a@x.com"])
+        suppression._global_filter.rebuild(store)
+        with patch.object(suppression, "get_db", return_value=store):
+            found = suppression.suppressed_emails("uid-1", ["A@x.com", "b@x.com", "c@x.com", "b@x.com"])
+        assert found == {"a@x.com"}
+        assert store.get_all_calls == 1
+        # Clean addresses are ruled out by the filter: no global reads.
+        assert not [r for r in store.reads if r.startswith("global_suppression/")]
+
+    def test_global_hit_is_confirmed(self):
+        store = _FakeStore(global_=["g@x.com"])
+        suppression._global_filter.rebuild(store)
+        with patch.object(suppression, "get_db", return_value=store):
+            assert suppression.is_suppressed("uid-1", "g@x.com") is True
+        assert "global_suppression/g@x.com" in store.reads
+
+    def test_filter_positive_without_doc_is_not_suppressed(self):
+        store = _FakeStore()
+        suppression._global_filter.rebuild(store)
+        suppression._global_filter.add("ghost@x.com")  # e.g. a false positive
+        with patch.object(suppression, "get_db", return_value=store):
+            assert suppression.is_suppressed("uid-1", "ghost@x.com") is False
+
+    def test_falls_back_to_firestore_until_built(self):
+        store = _FakeStore(global_=["g@x.com"])
+        with patch.object(suppression, "get_db", return_value=store), \
+                patch.object(suppression.GlobalSuppressionFilter, "_maybe_refresh"):
+            assert suppression.suppressed_emails("uid-1", ["g@x.com", "ok@x.com"]) == {"g@x.com"}
+        assert "global_suppression/ok@x.com" in store.reads
+
+    def test_record_bounce_invalidates_locally(self):
+        store = _FakeStore()
+        suppression._global_filter.rebuild(store)
+        with patch.object(suppression, "get_db", return_value=store):
+            assert suppression.is_suppressed("uid-2", "new@x.com") is False
+            suppression.record_bounce("uid-1", "New@x.com")
+            # Different user: only the global layer can catch it.
+            assert suppression.is_suppressed("uid-2", "new@x.com") is True
+
+    def test_delta_refresh_picks_up_other_processes(self):
+        store = _FakeStore()
+        suppression._global_filter.rebuild(store)
+        store.docs["global_suppression/late@x.com"] = {
+            "email": "late@x.com", "lastBouncedAt": "2999-01-01T00:00:00+00:00",
+        }
+        assert suppression._global_filter.might_contain(store, "late@x.com") is False
+        suppression._global_filter.refresh_delta(store)
+        assert suppression._global_filter.might_contain(store, "late@x.com") is True
+
+
+class TestBatchCallSites:
+    """Batch drafts / sends / queue generation resolve suppression once."""
+
+    def setup_method(self):
+        suppression._global_filter.reset()
+
+    def teardown_method(self):
+        suppression._global_filter.reset()
+
+    def _contacts(self):
+        return [{"FirstName": n, "Email": f"{n}@x.com"} for n in ("a", "b", "c")]
+
+    def test_parallel_drafts_prefetch_once(self):
+        from app.services import gmail_client
+
+        store = _FakeStore(user=["b@x.com"])
+        suppression._global_filter.rebuild(store)
+        recipients = []
+        with patch.object(suppression, "get_db", return_value=store), \
+                patch.object(gmail_client, "get_gmail_service_for_user", return_value=MagicMock()), \
+                patch.object(gmail_client, "_build_outreach_mime",
+                             side_effect=lambda **kw: recipients.append(kw["recipient_email"]) or MagicMock(as_bytes=lambda: b"x")), \
+                patch.object(suppression, "is_suppressed", side_effect=AssertionError("per-draft lookup")):
+            results = gmail_client.create_drafts_parallel(
+                [{"contact": c, "email_subject": "s", "email_body": "b", "index": i}
+                 for i, c in enumerate(self._contacts())],
+                user_id="uid-1",
+            )
+        assert store.get_all_calls == 1
+        assert results[1] == "suppressed_free_draft_b"
+        assert sorted(recipients) == ["a@x.com", "c@x.com"]
+
+    def test_send_path_is_gated(self):
+        from app.services import gmail_client
+
+        with patch.object(gmail_client, "get_gmail_service_for_user", return_value=MagicMock()), \
+                patch.object(gmail_client, "_build_outreach_mime", side_effect=AssertionError("sent")):
+            result = gmail_client.send_gmail_email_for_user(
+                self._contacts()[0], "s", "b", user_id="uid-1", suppressed={"a@x.com"},
+            )
+        assert result == "suppressed_free_send_a"
+
+    def test_queue_filter_drops_suppressed(self):
+        from app.services.queue_service import _filter_candidates
+
+        filtered, stats = _filter_candidates(
+            [{"Email": "A@x.com"}, {"Email": "c@x.com"}], set(), set(), {}, {"a@x.com"},
+        )
+        assert filtered == [{"Email": "c@x.com"}]
+        assert stats["suppressed"] == 1
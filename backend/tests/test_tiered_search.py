@@ -0,0 +1,259 @@
+"""
+Tests for tiered PDL search with bounded speculation
+(app/services/tiered_search.py) and its use in recruiter_finder.
+
+Pins:
+  1. Results are folded in tier order, so the outcome matches the serial
+     chain no matter which tier finishes first.
+  2. Early launches stay inside the credit budget and the parallel limit;
+     guarded tiers never launch early.
+  3. Tiers past the one that filled the quota are cancelled or discarded.
+  4. A tier that keeps coming back empty at a company is skipped until
+     its verdict expires; errors don't count as misses.
+"""
+import threading
+import time
+
+import pytest
+
+from app.services import tiered_search
+from app.services.tiered_search import Tier, TierOutcomes, run_tiers
+
+
+class FakeClock:
+    def __init__(self, t=1_000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def _tier(key, results, cost=1, delay=0.0, started=None, **kw):
+    def run():
+        if started is not None:
+            started.append(key)
+        if delay:
+            time.sleep(delay)
+        if isinstance(results, Exception):
+            raise results
+        return list(results)
+    return Tier(key, run, cost=cost, **kw)
+
+
+def _quota(n, folded):
+    def accept(tier, results):
+        folded.append((tier.key, list(results)))
+        return sum(len(r) for _, r in folded) >= n
+    return accept
+
+
+@pytest.fixture
+def outcomes():
+    return TierOutcomes(clock=FakeClock())
+
+
+# ── 1. Ordering ──────────────────────────────────────────────────────────────
+
+
+class TestOrdering:
+    def test_slow_first_tier_is_still_folded_first(self, outcomes):
+        folded = []
+        run = run_tiers(
+            [_tier(1, ["a"], delay=0.05), _tier(2, ["b"]), _tier(3, ["c"])],
+            _quota(2, folded), kind="k", company="Acme", outcomes=outcomes,
+            credit_budget=10,
+        )
+        assert folded == [(1, ["a"]), (2, ["b"])]
+        assert run.consumed == [1, 2]
+        assert run.speculative_launches >= 1
+
+    def test_same_result_with_and_without_speculation(self, outcomes):
+        def tiers():
+            return [_tier(1, []), _tier(2, ["x", "y"]), _tier(3, ["z"]), _tier(4, ["w"])]
+
+        serial, speculative = [], []
+        run_tiers(tiers(), _quota(3, serial), kind="k", company="Acme",
+                  outcomes=TierOutcomes(), credit_budget=0)
+        run_tiers(tiers(), _quota(3, speculative), kind="k", company="Acme",
+                  outcomes=outcomes, credit_budget=100)
+        assert serial == speculative == [(1, []), (2, ["x", "y"]), (3, ["z"])]
+
+    def test_error_tier_folds_as_empty(self, outcomes):
+        folded = []
+        run = run_tiers([_tier(1, RuntimeError("pdl 500")), _tier(2, ["b"])],
+                        _quota(1, folded), kind="k", company="Acme", outcomes=outcomes)
+        assert folded == [(1, []), (2, ["b"])]
+        assert run.outcomes == {1: "error", 2: "hit"}
+
+
+# ── 2. Speculation limits ────────────────────────────────────────────────────
+
+
+class TestSpeculation:
+    def test_zero_budget_is_the_serial_chain(self, outcomes):
+        started = []
+        run = run_tiers([_tier(k, [], started=started) for k in (1, 2, 3)],
+                        _quota(1, []), kind="k", company="Acme", outcomes=outcomes,
+                        credit_budget=0)
+        assert run.speculative_launches == 0
+        assert started == [1, 2, 3]
+
+    def test_budget_caps_early_launches(self, outcomes):
+        gate = threading.Event()
+
+        def blocked():
+            gate.wait(2)
+            return ["a"]
+
+        started = []
+        tiers = [Tier(1, blocked, cost=5)] + [_tier(k, ["x"], cost=5, started=started) for k in (2, 3, 4)]
+        t = threading.Thread(target=run_tiers, args=(tiers, _quota(1, [])),
+                             kwargs=dict(kind="k", company="Acme", outcomes=outcomes,
+                                         credit_budget=10, max_parallel=10))
+        t.start()
+        deadline = time.time() + 2
+        while len(started) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        assert sorted(started) == [2, 3]  # two tiers of 5 credits fit in 10
+        gate.set()
+        t.join(2)
+
+    def test_guarded_tier_never_launches_early(self, outcomes):
+        started = []
+        guard_calls = []
+
+        def guard():
+            guard_calls.append(True)
+            return False
+
+        run = run_tiers(
+            [_tier(1, [], delay=0.05), _tier(2, ["x"], started=started, guard=guard)],
+            _quota(5, []), kind="k", company="Acme", outcomes=outcomes, credit_budget=100,
+        )
+        assert started == [] and guard_calls == [True]
+        assert run.outcomes[2] == "skipped"
+
+    def test_tiers_after_the_quota_are_not_consumed(self, outcomes):
+        folded = []
+        run = run_tiers(
+            [_tier(1, ["a", "b"]), _tier(2, ["c"], delay=0.1), _tier(3, ["d"], delay=0.1),
+             _tier(4, ["e"])],
+            _quota(2, folded), kind="k", company="Acme", outcomes=outcomes,
+            credit_budget=2, max_parallel=2,
+        )
+        assert folded == [(1, ["a", "b"])]
+        assert run.outcomes[1] == "hit"
+        assert {run.outcomes[k] for k in (2, 3, 4)} <= {"cancelled", "discarded", "not_run"}
+        assert run.outcomes[4] == "not_run"
+
+
+# ── 3. Outcome history ───────────────────────────────────────────────────────
+
+
+class TestOutcomes:
+    def test_repeated_misses_skip_the_tier_until_ttl(self, monkeypatch):
+        monkeypatch.setattr(tiered_search, "TIER_SKIP_AFTER_MISSES", 2)
+        clock = FakeClock()
+        history = TierOutcomes(clock=clock)
+        for _ in range(2):
+            history.record("k", "Acme", 1, False)
+        assert history.never_hits("k", "acme ", 1)
+        assert not history.never_hits("k", "Other", 1)
+        assert not history.never_hits("other-kind", "Acme", 1)
+
+        clock.t += tiered_search.TIER_OUTCOME_TTL_SECONDS
+        assert not history.never_hits("k", "Acme", 1)
+
+    def test_a_hit_resets_the_run(self, monkeypatch):
+        monkeypatch.setattr(tiered_search, "TIER_SKIP_AFTER_MISSES", 2)
+        history = TierOutcomes(clock=FakeClock())
+        history.record("k", "Acme", 1, False)
+        history.record("k", "Acme", 1, True)
+        history.record("k", "Acme", 1, False)
+        assert not history.never_hits("k", "Acme", 1)
+
+    def test_skipped_tier_is_not_run(self, monkeypatch, outcomes):
+        monkeypatch.setattr(tiered_search, "TIER_SKIP_AFTER_MISSES", 2)
+        for _ in range(2):
+            run_tiers([_tier(1, []), _tier(2, ["b"])], _quota(1, []),
+                      kind="k", company="Acme", outcomes=outcomes)
+        started = []
+        folded = []
+        run = run_tiers([_tier(1, [], started=started), _tier(2, ["b"], started=started)],
+                        _quota(1, folded), kind="k", company="Acme", outcomes=outcomes)
+        assert run.outcomes[1] == "skipped"
+        assert started == [2] and folded == [(2, ["b"])]
+
+    def test_errors_are_not_misses(self, monkeypatch, outcomes):
+        monkeypatch.setattr(tiered_search, "TIER_SKIP_AFTER_MISSES", 1)
+        run_tiers([_tier(1, RuntimeError("timeout"))], _quota(1, []),
+                  kind="k", company="Acme", outcomes=outcomes)
+        assert not outcomes.never_hits("k", "Acme", 1)
+
+
+# ── 4. recruiter_finder wiring ───────────────────────────────────────────────
+
+
+def _person(first, title="Recruiter"):
+    return {"FirstName": first, "LastName": "X", "Title": title, "Company": "Acme",
+            "Email": f"{first.lower()}@acme.com", "IsCurrentlyAtTarget": True}
+
+
+class TestRecruiterFinder:
+    def test_hr_wins_over_executives_even_if_slower(self, monkeypatch):
+        from app.services import recruiter_finder as rf
+
+        calls = []
+
+        def fake_search(headers, url, query_obj, desired_limit, search_type, **k):
+            titles = str(query_obj)
+            if "HR Manager" in titles:
+                calls.append("hr")
+                time.sleep(0.05)
+                return [_person("Hana", "HR Manager")], None
+            calls.append("executives")
+            return [_person("Cory", "CEO")], None
+
+        monkeypatch.setattr(rf, "execute_pdl_search", fake_search)
+        monkeypatch.setattr(rf, "PEOPLE_DATA_LABS_API_KEY", "test-key")
+        result = rf.search_recruiters_with_fallback("Acme", max_results=4)
+        assert [c["FirstName"] for c in result["recruiters"]] == ["Hana"]
+        assert sorted(calls) == ["executives", "hr"]  # executives ran alongside
+
+    def test_hiring_manager_tiers_match_serial(self, monkeypatch):
+        from app.services import recruiter_finder as rf
+        from app.services import perplexity_client as pc
+
+        rows = {1: [], 2: [_person("Lee", "Engineering Manager")], 3: [_person("Dana", "Director")],
+                4: [], 5: []}
+
+        def fake_search(headers, url, query_obj, desired_limit, search_type, **k):
+            text = str(query_obj).lower()
+            for tier in (1, 2, 3, 4, 5):
+                titles = rf.get_hiring_manager_titles_for_tier(tier, "engineering")
+                if titles and titles[0].lower() in text:
+                    return list(rows[tier]), None
+            return [], None
+
+        monkeypatch.setattr(rf, "execute_pdl_search", fake_search)
+        monkeypatch.setattr(rf, "_run_tight_pdl_query", lambda company, role, size=3, **k: [])
+        monkeypatch.setattr(rf, "enrich_contacts_with_hunter", lambda contacts, **k: [
+            {**c, "EmailVerified": True, "is_verified_email": True} for c in contacts
+        ])
+        monkeypatch.setattr(rf, "generate_recruiter_emails", lambda recruiters, **k: [])
+        monkeypatch.setattr(rf, "PEOPLE_DATA_LABS_API_KEY", "test-key")
+        monkeypatch.setattr(pc, "verify_hiring_managers_v2", lambda hms, company, job_title: [
+            {"still_at_company": "unknown", "current_title": "", "actively_hiring": "unknown",
+             "recent_hiring_signal": "", "confidence": "low"} for _ in hms
+        ])
+        monkeypatch.setattr(pc, "batch_enrich_company_news", lambda contacts: {})
+
+        def names(budget):
+            monkeypatch.setattr(tiered_search, "PDL_SPECULATIVE_CREDIT_BUDGET", budget)
+            tiered_search.TIER_OUTCOMES.clear()
+            result = rf.find_hiring_manager(company_name="Acme", job_type="engineering",
+                                            job_title="SE", max_results=3)
+            return [(c["FirstName"], c["Title"]) for c in result["hiringManagers"]]
+
+        assert names(0) == names(100)
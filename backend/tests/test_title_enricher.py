@@ -0,0 +1,263 @@
+"""
+Tests for title-clustered bulk resolution (backend/pipeline/title_enricher.py
++ pdl_title_cache.resolve_titles).
+
+Pins:
+  1. cluster_titles collapses location / requisition / punctuation variants
+     and keeps real qualifiers apart (pure function, no I/O).
+  2. One batched cache read per run, PDL only for true misses, title_meta
+     fanned out to every member in batched writes.
+  3. Misses past MAX_PER_RUN are deferred: their jobs stay pending instead
+     of being written as noop. Once the budget breaker trips, misses are
+     written as noop so they don't block the pending queue.
+
+Minimal fake Firestore; PDL is a stub. No network.
+"""
+import pytest
+
+from app.services import pdl_title_cache
+from backend.pipeline import title_enricher as te
+
+
+class _FakeRef:
+    def __init__(self, db, collection, doc_id):
+        self._db = db
+        self.collection = collection
+        self.id = doc_id
+
+    def update(self, payload):
+        raise AssertionError("unbatched write")
+
+    def get(self):
+        self._db.single_reads.append(self.id)
+        return _FakeDoc(self, self._db.store[self.collection].get(self.id))
+
+    def set(self, payload, merge=False):
+        self._db.store[self.collection].setdefault(self.id, {}).update(payload)
+
+
+class _FakeDoc:
+    def __init__(self, ref, data):
+        self.reference = ref
+        self.id = ref.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class _FakeQuery:
+    def __init__(self, db, name, filters=()):
+        self._db = db
+        self._name = name
+        self._filters = list(filters)
+        self._limit = None
+
+    def where(self, filter):
+        return type(self)(self._db, self._name, self._filters + [filter])
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def stream(self):
+        out = [
+            _FakeDoc(_FakeRef(self._db, self._name, k), v)
+            for k, v in self._db.store[self._name].items()
+            if all(v.get(f.field_path) == f.value for f in self._filters)
+        ]
+        return out[: self._limit] if self._limit else out
+
+
+class _FakeCollection(_FakeQuery):
+    def document(self, doc_id):
+        return _FakeRef(self._db, self._name, doc_id)
+
+
+class _FakeBatch:
+    def __init__(self, db):
+        self._db = db
+        self._ops = []
+
+    def update(self, ref, payload):
+        self._ops.append((ref, payload))
+
+    def set(self, ref, payload, merge=False):
+        self._ops.append((ref, payload))
+
+    def commit(self):
+        self._db.commits.append(len(self._ops))
+        for ref, payload in self._ops:
+            self._db.store[ref.collection].setdefault(ref.id, {}).update(payload)
+
+
+class _FakeDb:
+    def __init__(self, jobs, cache=None):
+        self.store = {
+            "jobs": {k: dict(v) for k, v in jobs.items()},
+            pdl_title_cache.CACHE_COLLECTION: {k: dict(v) for k, v in (cache or {}).items()},
+        }
+        self.commits = []
+        self.get_all_calls = []
+        self.single_reads = []
+
+    def collection(self, name):
+        self.store.setdefault(name, {})
+        return _FakeCollection(self, name)
+
+    def get_all(self, refs):
+        refs = list(refs)
+        self.get_all_calls.append(len(refs))
+        return [_FakeDoc(r, self.store[r.collection].get(r.id)) for r in refs]
+
+    def batch(self):
+        return _FakeBatch(self)
+
+
+class _Calls(list):
+    """Titles sent to PDL, plus the fake credit counter."""
+
+
+@pytest.fixture
+def pdl(monkeypatch):
+    calls = _Calls()
+
+    def fake_enrich(title):
+        calls.append(title)
+        if "barista" in title.lower():
+            return {}
+        return {"cleaned_name": title.lower(), "levels": ["entry"],
+                "categories": [{"role": "engineering", "sub_role": "software"}]}
+
+    usage = {"used": 0}
+    monkeypatch.setattr(pdl_title_cache, "enrich_job_title_with_pdl", fake_enrich)
+    monkeypatch.setattr(pdl_title_cache, "_total_credits_used", lambda db: usage["used"])
+    monkeypatch.setattr(pdl_title_cache, "_increment_usage", lambda db: usage.__setitem__("used", usage["used"] + 1))
+    calls.usage = usage
+    return calls
+
+
+@pytest.fixture
+def run(monkeypatch, pdl):
+    import backend.app.extensions
+
+    def _run(db, **kw):
+        monkeypatch.setattr(backend.app.extensions, "get_db", lambda: db)
+        return te.enrich_titles(**kw)
+    return _run
+
+
+def _job(title, location="", status="pending", **extra):
+    return {"title": title, "location": location, "title_enrichment_status": status, **extra}
+
+
+# ── 1. Clustering ────────────────────────────────────────────────────────────
+
+
+class TestClusterTitles:
+    def test_variants_share_a_key(self):
+        jobs = [(i, _job(t, loc)) for i, (t, loc) in enumerate([
+            ("Software Engineer", ""),
+            ("Software Engineer - New York, NY", "New York, NY"),
+            ("Software Engineer (Remote)", "Remote"),
+            ("Software Engineer | R0012345", ""),
+            ("software-engineer", ""),
+            ("Software Engineer - Boise", "Boise, ID"),
+            ("Software Engineer, Req #4411", ""),
+        ])]
+        clusters, untitled = te.cluster_titles(jobs)
+        assert list(clusters) == ["software engineer"]
+        title, members = clusters["software engineer"]
+        assert title == "Software Engineer" and len(members) == 7
+        assert untitled == []
+
+    @pytest.mark.parametrize("title", [
+        "Software Engineer - Backend",
+        "Software Engineer II",
+        "Senior Software Engineer",
+        "Software Engineer, New Grad",
+        "2027 Software Engineer",
+    ])
+    def test_qualifiers_stay_apart(self, title):
+        clusters, _ = te.cluster_titles([(0, _job("Software Engineer")), (1, _job(title, "New York, NY"))])
+        assert len(clusters) == 2
+
+    def test_plain_titles_keep_their_existing_slug(self):
+        for title in ["Sr. SWE II", "Data Analyst (SQL/Python)", "Analyst, Investment Banking"]:
+            clusters, _ = te.cluster_titles([(0, _job(title))])
+            assert list(clusters) == [pdl_title_cache.slugify_title(title)]
+
+    def test_untitled_jobs_are_split_out(self):
+        clusters, untitled = te.cluster_titles([(0, _job("")), (1, {"title": None}), (2, _job("#123"))])
+        assert clusters == {} and [r for r, _ in untitled] == [0, 1, 2]
+
+
+# ── 2. Bulk resolution ───────────────────────────────────────────────────────
+
+
+class TestEnrichTitles:
+    def test_one_call_per_cluster_and_batched_writes(self, run, pdl):
+        db = _FakeDb({
+            "a": _job("Software Engineer - Austin, TX", "Austin, TX"),
+            "b": _job("Software Engineer (Remote)"),
+            "c": _job("Barista"),
+            "d": _job("Data Analyst", structured={"experience_level": "senior"}),
+            "e": _job(""),
+        }, cache={"data analyst": {"cleaned_name": "data analyst", "levels": ["mid"], "role": "analytics"}})
+
+        result = run(db)
+
+        assert sorted(pdl) == ["Barista", "Software Engineer"]
+        assert db.get_all_calls == [3] and db.single_reads == []
+        assert result == {**result, "processed": 5, "enriched": 3, "noop": 1, "skipped": 1,
+                          "clusters": 3, "pdl_calls": 2, "deferred": 0}
+        jobs = db.store["jobs"]
+        assert jobs["a"]["structured.title_meta"]["role"] == "engineering"
+        assert jobs["a"]["structured.title_meta"] == {**jobs["b"]["structured.title_meta"],
+                                                      "enriched_at": jobs["a"]["structured.title_meta"]["enriched_at"]}
+        assert jobs["a"]["structured.experience_level"] == "entry"
+        assert "structured.experience_level" not in jobs["d"]  # Firecrawl's value wins
+        assert jobs["c"]["title_enrichment_status"] == te.TITLE_ENRICHMENT_NOOP
+        assert jobs["e"]["title_enrichment_status"] == te.TITLE_ENRICHMENT_SKIPPED
+        assert "software engineer" in db.store[pdl_title_cache.CACHE_COLLECTION]
+
+    def test_writes_are_chunked(self, run, monkeypatch):
+        monkeypatch.setattr(te, "BATCH_WRITE_SIZE", 2)
+        db = _FakeDb({f"j{i}": _job(f"Software Engineer - Office {i}") for i in range(5)})
+        run(db)
+        assert db.commits == [2, 2, 1]
+
+    def test_per_run_cap_defers_clusters(self, run, pdl, monkeypatch):
+        monkeypatch.setattr(pdl_title_cache, "MAX_PER_RUN", 1)
+        db = _FakeDb({
+            "a": _job("Software Engineer"),
+            "b": _job("Product Manager"),
+            "c": _job("Product Manager - Seattle"),
+        })
+        result = run(db)
+        assert len(pdl) == 1
+        assert result["deferred"] == 2
+        pending = [k for k, v in db.store["jobs"].items() if v["title_enrichment_status"] == "pending"]
+        assert pending == ["b", "c"]
+
+    def test_budget_breaker_drains_misses_as_noop(self, run, pdl):
+        pdl.usage["used"] = pdl_title_cache.TOTAL_BUDGET_CIRCUIT_BREAKER
+        db = _FakeDb({
+            "a": _job("Software Engineer"),
+            "b": _job("Data Analyst"),
+        }, cache={"data analyst": {"cleaned_name": "data analyst", "levels": ["mid"], "role": "analytics"}})
+        result = run(db)
+        assert pdl == [] and result["deferred"] == 0
+        jobs = db.store["jobs"]
+        assert jobs["a"]["title_enrichment_status"] == te.TITLE_ENRICHMENT_NOOP
+        assert jobs["b"]["title_enrichment_status"] == te.TITLE_ENRICHMENT_COMPLETED
+        assert "software engineer" not in db.store.get(pdl_title_cache.CACHE_COLLECTION, {})
+
+    def test_backfill_reads_the_marker_queue(self, run, pdl):
+        db = _FakeDb({
+            "q": _job("Software Engineer", status="backfill"),
+            "p": _job("Product Manager"),  # pending: the cron path's job
+        })
+        result = run(db, backfill=True, since_days=None)
+        assert result["processed"] == 1 and pdl == ["Software Engineer"]
@@ -15,10 +15,37 @@ Why a separate process?
   see "Running…" forever. Pulling cycle execution into a dedicated worker
   process makes it survive everything except the worker itself crashing,
   and RQ requeues failed jobs.
+
+Modes (RQ_WORKER_MODE):
+  fork     Stock RQ Worker. Forks a fresh child per job. The job modules are
+           imported once in the parent before the first fork
+           (RQ_FORK_PRELOAD_IMPORTS, default on), so children inherit them
+           instead of paying the import graph per job; each child still
+           re-creates its Firestore / LLM clients.
+  preload  Imports every registered job module, initializes Firebase and warms
+           the OpenAI / Anthropic clients once, then runs a non-forking
+           SimpleWorker so those stay warm across jobs. One job at a time per
+           process; scale with more worker processes, not forks.
+
+With BACKGROUND_JOBS_MODE=worker this process also runs the periodic job
+scheduler (app/services/job_scheduler.py) that the web service otherwise
+owns.
+
+Queues (RQ_PERIODIC_WORKER):
+  separate  (default) The Loop queue (Loop cycles, contact imports) and the
+            periodic queue (tracker scan, watch renewal, ...) each get their
+            own worker process, so a multi-hour scan never holds up a
+            user-triggered job. Size the service for two concurrent jobs.
+  shared    One worker drains both, Loop queue first. Cheaper, but a
+            running scan blocks user jobs until it finishes.
+
+STARTUP_IMPORT_PROFILE=true logs the per-module import cost of the boot
+(app/utils/import_profiler.py).
 """
 from __future__ import annotations
 
 import logging
+import multiprocessing
 import os
 import sys
 
@@ -28,8 +55,11 @@ _HERE = os.path.dirname(os.path.abspath(__file__))
 if _HERE not in sys.path:
     sys.path.insert(0, _HERE)
 
+from app.utils.import_profiler import boot_profiler
+BOOT_PROFILE = boot_profiler()
+
 from redis import Redis
-from rq import Connection, Worker
+from rq import Connection, SimpleWorker, Worker
 
 logging.basicConfig(
     level=logging.INFO,
@@ -38,16 +68,51 @@ logging.basicConfig(
 logger = logging.getLogger("rq_worker")
 
 
-def main() -> None:
-    redis_url = os.getenv("REDIS_URL")
-    if not redis_url:
-        raise SystemExit(
-            "REDIS_URL is not set. The RQ worker needs Redis to pull jobs. "
-            "Add REDIS_URL to your Render service env vars."
-        )
+RQ_FORK_PRELOAD_IMPORTS = os.getenv("RQ_FORK_PRELOAD_IMPORTS", "true").lower() == "true"
+
+
+def _import_job_modules() -> None:
+    """Import every registered job target. Module import only: no clients
+    are created, so it is also safe to run in a forking worker's parent."""
+    from app.services.rq_queue import JOB_REGISTRY, _resolve_dotted
+
+    for name, dotted in JOB_REGISTRY.items():
+        try:
+            _resolve_dotted(dotted)
+        except Exception:
+            logger.exception("Preload failed for job %s (%s)", name, dotted)
+    logger.info("Imported %d job module(s)", len(JOB_REGISTRY))
+
+
+def _preload() -> None:
+    """Import every registered job target and warm shared clients so the
+    first job on a non-forking worker doesn't pay cold-start cost."""
+    _import_job_modules()
+    try:
+        from app.services.openai_client import get_anthropic_client, get_openai_client
+        get_openai_client()
+        get_anthropic_client()
+    except Exception:
+        logger.exception("Preload failed to warm LLM clients")
+
+
+def _periodic_worker_mode() -> str:
+    mode = os.getenv("RQ_PERIODIC_WORKER", "separate").lower()
+    return mode if mode in ("separate", "shared") else "separate"
 
-    queue_names = [os.getenv("RQ_QUEUE_NAME", "loops")]
-    logger.info("Starting RQ worker on queue(s): %s", queue_names)
+
+def _queue_plan() -> list[list[str]]:
+    """Queue lists to serve, one RQ worker process each. The first entry
+    runs in this process."""
+    from app.services.rq_queue import PERIODIC_QUEUE_NAME, QUEUE_NAME
+
+    if _periodic_worker_mode() == "shared":
+        return [[QUEUE_NAME, PERIODIC_QUEUE_NAME]]
+    return [[QUEUE_NAME], [PERIODIC_QUEUE_NAME]]
+
+
+def _run_worker(queue_names: list[str], mode: str, redis_url: str) -> None:
+    logger.info("Starting RQ worker (mode=%s) on queue(s): %s", mode, queue_names)
 
     # Initialize Firebase eagerly so the first job doesn't pay the cost.
     # init_firebase takes an `app` param that it doesn't actually use; pass
@@ -60,10 +125,49 @@ def main() -> None:
     except Exception:
         logger.exception("Worker failed to initialize Firebase; jobs will likely fail")
 
+    if mode == "preload":
+        _preload()
+    elif RQ_FORK_PRELOAD_IMPORTS:
+        _import_job_modules()
+
     conn = Redis.from_url(redis_url)
+    worker_cls = SimpleWorker if mode == "preload" else Worker
     with Connection(conn):
-        worker = Worker(queue_names)
-        worker.work(with_scheduler=False)
+        worker = worker_cls(queue_names)
+        # with_scheduler=True so RQ's own scheduler promotes Retry-delayed jobs.
+        worker.work(with_scheduler=True)
+
+
+def main() -> None:
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        raise SystemExit(
+            "REDIS_URL is not set. The RQ worker needs Redis to pull jobs. "
+            "Add REDIS_URL to your Render service env vars."
+        )
+
+    mode = os.getenv("RQ_WORKER_MODE", "fork").lower()
+    own_queues, *other_pools = _queue_plan()
+
+    # Other pools are forked before Firebase / Redis clients exist here, so
+    # no gRPC channel or socket is shared across the fork.
+    for queue_names in other_pools:
+        proc = multiprocessing.get_context("fork").Process(
+            target=_run_worker, args=(queue_names, mode, redis_url),
+            name=f"rq-worker-{'-'.join(queue_names)}", daemon=True,
+        )
+        proc.start()
+        logger.info("Started RQ worker pid=%s for queue(s): %s", proc.pid, queue_names)
+
+    if BOOT_PROFILE is not None:
+        BOOT_PROFILE.finish(logger, "worker boot")
+
+    from app.services.job_scheduler import scheduler_runs_in_web, start_scheduler_thread
+    if not scheduler_runs_in_web():
+        start_scheduler_thread()
+        logger.info("Periodic job scheduler started in worker process")
+
+    _run_worker(own_queues, mode, redis_url)
 
 
 if __name__ == "__main__":
@@ -35,6 +35,12 @@ import { auth } from '@/lib/firebase';
 
 import { BACKEND_URL as API_BASE } from '@/services/api';
 
+// How often to check on a running import job
+const IMPORT_POLL_INTERVAL_MS = 1500;
+// Stop polling after this long. The backend job times out after 15 minutes;
+// the extra margin covers time spent waiting in the queue.
+const IMPORT_POLL_MAX_MS = 20 * 60 * 1000;
+
 // Our schema fields that can be mapped
 const SCHEMA_FIELDS = [
   { value: 'firstName', label: 'First Name' },
@@ -95,6 +101,10 @@ interface ImportResult {
     failed: number;
     total_eligible: number;
   };
+  // Ids only (capped server-side); the contact list itself is reloaded
+  // through onImportComplete.
+  contactIds?: string[];
+  contactIdsTruncated?: boolean;
   warnings?: string[];
 }
 
@@ -233,14 +243,41 @@ const ContactImport: React.FC<ContactImportProps> = ({ onImportComplete, onSwitc
         body: formData,
       });
       
-      const data = await response.json();
+      const queued = await response.json();
       
       if (!response.ok) {
-        if (data.upgrade_required) {
+        if (queued.upgrade_required) {
           setShowUpgradeDialog(true);
           return;
         }
-        throw new Error(data.error || 'Failed to import contacts');
+        throw new Error(queued.error || 'Failed to import contacts');
+      }
+
+      // The import runs as a background job; poll until it finishes or we
+      // give up waiting on it.
+      let data: any = null;
+      const pollStartedAt = Date.now();
+      while (!data) {
+        if (Date.now() - pollStartedAt > IMPORT_POLL_MAX_MS) {
+          onImportComplete?.();
+          throw new Error(
+            'The import is taking longer than expected. Contacts saved so far will appear in My Network — check back in a few minutes.'
+          );
+        }
+        await new Promise((resolve) => setTimeout(resolve, IMPORT_POLL_INTERVAL_MS));
+        const pollToken = await getIdToken();
+        const jobResponse = await fetch(`${API_BASE}/api/contacts/import/jobs/${queued.jobId}`, {
+          headers: {
+            'Authorization': `Bearer ${pollToken}`,
+          },
+        });
+        const job = await jobResponse.json();
+        if (!jobResponse.ok || job.status === 'failed') {
+          throw new Error(job.error || 'Failed to import contacts');
+        }
+        if (job.status === 'completed') {
+          data = job.result;
+        }
       }
       
       setImportResult(data);